@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: SSE token frames per second on one core.
+
+Compares the per-token serialization the streams used before precompiled
+templates (Pydantic chunk -> model_dump -> json.dumps, or dict -> json.dumps)
+against ``opta_lmx.inference.sse_encoder`` for the OpenAI chat, Anthropic and
+Responses formats. Pure CPU, no server or model needed.
+
+Usage:
+    python scripts/bench_sse_encoder.py [--events 200000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable
+
+from opta_lmx.inference.schema import ChatCompletionChunk, ChunkChoice, DeltaMessage
+from opta_lmx.inference.sse_encoder import DELTA, SSEFrameTemplate, chat_content_template
+
+TOKENS = ["Hello", ",", " wörld", " the", " quick", " 日本", ' "fox"', "\n"]
+
+
+def _legacy_chat(token: str) -> str:
+    chunk = ChatCompletionChunk(
+        id="chatcmpl-bench",
+        created=1700000000,
+        model="mlx-community/Bench-7B",
+        choices=[ChunkChoice(index=0, delta=DeltaMessage(content=token), finish_reason=None)],
+    )
+    payload = chunk.model_dump()
+    for choice in payload["choices"]:
+        choice["logprobs"] = None
+    return "data: " + json.dumps(payload) + "\n\n"
+
+
+def _legacy_anthropic(token: str) -> str:
+    delta = {
+        "type": "content_block_delta",
+        "index": 0,
+        "delta": {"type": "text_delta", "text": token},
+    }
+    return f"event: content_block_delta\ndata: {json.dumps(delta)}\n\n"
+
+
+def _legacy_responses(token: str) -> str:
+    return f"event: response.output_text.delta\ndata: {json.dumps({'delta': token})}\n\n"
+
+
+def _measure(encode: Callable[[str], str], events: int, repeat: int) -> float:
+    """Best-of-``repeat`` events/sec for ``encode``."""
+    tokens = (TOKENS * (events // len(TOKENS) + 1))[:events]
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for token in tokens:
+            encode(token)
+        best = min(best, time.perf_counter() - started)
+    return events / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    chat = chat_content_template(
+        "chatcmpl-bench",
+        "mlx-community/Bench-7B",
+        1700000000,
+        include_logprobs_placeholder=True,
+    )
+    anthropic = SSEFrameTemplate.from_payload(
+        {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": DELTA}},
+        event="content_block_delta",
+    )
+    responses = SSEFrameTemplate.from_payload({"delta": DELTA}, event="response.output_text.delta")
+    cases = [
+        ("openai-chat", _legacy_chat, chat.encode),
+        ("anthropic", _legacy_anthropic, anthropic.encode),
+        ("responses", _legacy_responses, responses.encode),
+    ]
+
+    sys.stdout.write(f"{'format':<14}{'legacy ev/s':>14}{'template ev/s':>16}{'speedup':>10}\n")
+    for name, legacy, fast in cases:
+        for token in TOKENS:
+            assert legacy(token) == fast(token), name
+        legacy_rate = _measure(legacy, args.events, args.repeat)
+        fast_rate = _measure(fast, args.events, args.repeat)
+        sys.stdout.write(
+            f"{name:<14}{legacy_rate:>14,.0f}{fast_rate:>16,.0f}{fast_rate / legacy_rate:>9.1f}x\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import asyncio
 import time
-from collections.abc import Awaitable, Callable, Mapping
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from dataclasses import dataclass
 
 from opta_lmx.agents.models import (
     AgentRun,
@@ -17,7 +18,9 @@ from opta_lmx.agents.models import (
 from opta_lmx.agents.tracing import NullTracer, TraceEvent, Tracer
 
 StepRunner = Callable[[str, str], Awaitable[str]]
+StreamingStepRunner = Callable[[AgentStep, "StepInput"], AsyncIterator[str]]
 StepUpdateHook = Callable[[AgentStep], Awaitable[None]]
+StepDeltaHook = Callable[[AgentStep, str], Awaitable[None]]
 CancelCheck = Callable[[], bool]
 
 _ROLE_ORDER = {
@@ -28,6 +31,68 @@ _ROLE_ORDER = {
 }
 
 
+class StepInput:
+    """Input text for a step, possibly still being produced upstream.
+
+    Consumers that can work incrementally iterate the deltas as they arrive;
+    everything else awaits :meth:`text` for the complete input. Iteration
+    always replays from the start, so late consumers see the whole text.
+    """
+
+    def __init__(self, text: str | None = None) -> None:
+        self._chunks: list[str] = []
+        self._done = False
+        self._error: BaseException | None = None
+        self._changed = asyncio.Condition()
+        if text is not None:
+            self._chunks.append(text)
+            self._done = True
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    async def feed(self, delta: str) -> None:
+        async with self._changed:
+            self._chunks.append(delta)
+            self._changed.notify_all()
+
+    async def close(self) -> None:
+        async with self._changed:
+            self._done = True
+            self._changed.notify_all()
+
+    async def fail(self, error: BaseException) -> None:
+        async with self._changed:
+            self._error = error
+            self._done = True
+            self._changed.notify_all()
+
+    async def text(self) -> str:
+        """Wait for the upstream step to finish and return the full input."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._done)
+        if self._error is not None:
+            raise RuntimeError("Upstream step failed") from self._error
+        return "".join(self._chunks)
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        index = 0
+        while True:
+            async with self._changed:
+                while index >= len(self._chunks) and not self._done:
+                    await self._changed.wait()
+                pending = self._chunks[index:]
+                index = len(self._chunks)
+                finished = self._done
+            for chunk in pending:
+                yield chunk
+            if finished and index >= len(self._chunks):
+                if self._error is not None:
+                    raise RuntimeError("Upstream step failed") from self._error
+                return
+
+
 class GraphExecutor:
     """Execute run steps according to the selected strategy."""
 
@@ -48,40 +113,40 @@ class GraphExecutor:
         on_step_update: StepUpdateHook | None = None,
         should_cancel: CancelCheck | None = None,
         trace_metadata: Mapping[str, str] | None = None,
+        stream_runner: StreamingStepRunner | None = None,
+        on_step_delta: StepDeltaHook | None = None,
     ) -> RunResult:
+        """Run every step of ``run``.
+
+        When ``stream_runner`` is given, steps stream their output through
+        ``on_step_delta`` instead of calling ``runner``. Handoff runs that set
+        ``pipeline_handoff`` then start all steps at once, each consuming the
+        previous step's output as it is produced.
+        """
         update_hook = on_step_update or _noop_update
         cancel_check = should_cancel or _never_cancel
         inherited_metadata = dict(trace_metadata or {})
+        execution = _StepExecution(
+            runner=runner,
+            stream_runner=stream_runner,
+            update_hook=update_hook,
+            delta_hook=on_step_delta or _noop_delta,
+            cancel_check=cancel_check,
+            trace_metadata=inherited_metadata,
+        )
 
         if not run.steps:
             run.steps = build_steps_for_request(run.request)
 
         if run.request.strategy == ExecutionStrategy.PARALLEL_MAP:
-            return await self._parallel_map(
-                run,
-                runner,
-                update_hook,
-                cancel_check,
-                inherited_metadata,
-            )
+            return await self._parallel_map(run, execution)
         if run.request.strategy == ExecutionStrategy.ROUTER:
-            return await self._router(
-                run,
-                runner,
-                update_hook,
-                cancel_check,
-                inherited_metadata,
-            )
-        return await self._handoff(run, runner, update_hook, cancel_check, inherited_metadata)
+            return await self._router(run, execution)
+        if stream_runner is not None and run.request.pipeline_handoff:
+            return await self._pipelined_handoff(run, execution)
+        return await self._handoff(run, execution)
 
-    async def _parallel_map(
-        self,
-        run: AgentRun,
-        runner: StepRunner,
-        update_hook: StepUpdateHook,
-        cancel_check: CancelCheck,
-        trace_metadata: Mapping[str, str],
-    ) -> dict[str, str]:
+    async def _parallel_map(self, run: AgentRun, execution: _StepExecution) -> dict[str, str]:
         semaphore = asyncio.Semaphore(run.request.max_parallelism)
         outputs: dict[str, str] = {}
 
@@ -90,11 +155,8 @@ class GraphExecutor:
                 output = await self._execute_step(
                     run_id=run.id,
                     step=step,
-                    input_text=run.request.prompt,
-                    runner=runner,
-                    update_hook=update_hook,
-                    cancel_check=cancel_check,
-                    trace_metadata=trace_metadata,
+                    step_input=StepInput(run.request.prompt),
+                    execution=execution,
                 )
                 outputs[step.role] = output
 
@@ -104,107 +166,147 @@ class GraphExecutor:
 
         return outputs
 
-    async def _router(
-        self,
-        run: AgentRun,
-        runner: StepRunner,
-        update_hook: StepUpdateHook,
-        cancel_check: CancelCheck,
-        trace_metadata: Mapping[str, str],
-    ) -> dict[str, str]:
+    async def _router(self, run: AgentRun, execution: _StepExecution) -> dict[str, str]:
         ordered = sorted(run.steps, key=_router_sort_key)
         outputs: dict[str, str] = {}
         for step in ordered:
             outputs[step.role] = await self._execute_step(
                 run_id=run.id,
                 step=step,
-                input_text=run.request.prompt,
-                runner=runner,
-                update_hook=update_hook,
-                cancel_check=cancel_check,
-                trace_metadata=trace_metadata,
+                step_input=StepInput(run.request.prompt),
+                execution=execution,
             )
         return outputs
 
-    async def _handoff(
-        self,
-        run: AgentRun,
-        runner: StepRunner,
-        update_hook: StepUpdateHook,
-        cancel_check: CancelCheck,
-        trace_metadata: Mapping[str, str],
-    ) -> str:
+    async def _handoff(self, run: AgentRun, execution: _StepExecution) -> str:
         next_input = run.request.prompt
         for step in run.steps:
             next_input = await self._execute_step(
                 run_id=run.id,
                 step=step,
-                input_text=next_input,
-                runner=runner,
-                update_hook=update_hook,
-                cancel_check=cancel_check,
-                trace_metadata=trace_metadata,
+                step_input=StepInput(next_input),
+                execution=execution,
             )
         return next_input
 
+    async def _pipelined_handoff(self, run: AgentRun, execution: _StepExecution) -> str:
+        inputs = [StepInput(run.request.prompt)] + [StepInput() for _ in run.steps[1:]]
+        tasks: list[asyncio.Task[str]] = []
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for index, step in enumerate(run.steps):
+                    downstream = inputs[index + 1] if index + 1 < len(inputs) else None
+                    tasks.append(
+                        task_group.create_task(
+                            self._execute_step(
+                                run_id=run.id,
+                                step=step,
+                                step_input=inputs[index],
+                                execution=execution,
+                                downstream=downstream,
+                            )
+                        )
+                    )
+        except BaseExceptionGroup:
+            # Surface the earliest failing step's error, as a sequential handoff would.
+            for task in tasks:
+                error = task.exception() if task.done() and not task.cancelled() else None
+                if error is not None:
+                    raise error from None
+            raise
+        return tasks[-1].result()
+
     async def _execute_step(
         self,
         *,
         run_id: str,
         step: AgentStep,
-        input_text: str,
-        runner: StepRunner,
-        update_hook: StepUpdateHook,
-        cancel_check: CancelCheck,
-        trace_metadata: Mapping[str, str],
+        step_input: StepInput,
+        execution: _StepExecution,
+        downstream: StepInput | None = None,
     ) -> str:
-        if cancel_check():
+        if execution.cancel_check():
             raise asyncio.CancelledError
 
-        step.input = input_text
+        if step_input.done:
+            step.input = await step_input.text()
         step.status = StepStatus.RUNNING
         step.started_at = time.time()
-        await update_hook(step)
+        await execution.update_hook(step)
         self._tracer.emit(
             TraceEvent(
                 run_id=run_id,
                 step_id=step.id,
                 event="step_started",
-                metadata=dict(trace_metadata),
+                metadata=dict(execution.trace_metadata),
             )
         )
 
         try:
-            output = await runner(step.role, input_text)
+            if execution.stream_runner is None:
+                output = await execution.runner(step.role, await step_input.text())
+                if downstream is not None:
+                    await downstream.feed(output)
+            else:
+                step.output = ""
+                async for delta in execution.stream_runner(step, step_input):
+                    step.output += delta
+                    if downstream is not None:
+                        await downstream.feed(delta)
+                    await execution.delta_hook(step, delta)
+                output = step.output
+            step.input = await step_input.text()
             step.output = output
             step.status = StepStatus.COMPLETED
+            if downstream is not None:
+                await downstream.close()
             return output
-        except asyncio.CancelledError:
+        except asyncio.CancelledError as exc:
             step.status = StepStatus.CANCELLED
             step.error = "Step cancelled"
+            if downstream is not None:
+                await downstream.fail(exc)
             raise
         except Exception as exc:
             step.status = StepStatus.FAILED
             step.error = str(exc)
+            if downstream is not None:
+                await downstream.fail(exc)
             raise
         finally:
             step.completed_at = time.time()
-            await update_hook(step)
+            await execution.update_hook(step)
             self._tracer.emit(
                 TraceEvent(
                     run_id=run_id,
                     step_id=step.id,
                     event="step_finished",
                     status=step.status,
-                    metadata=dict(trace_metadata),
+                    metadata=dict(execution.trace_metadata),
                 )
             )
 
 
+@dataclass(frozen=True)
+class _StepExecution:
+    """Per-run callbacks shared by every step of one ``execute`` call."""
+
+    runner: StepRunner
+    stream_runner: StreamingStepRunner | None
+    update_hook: StepUpdateHook
+    delta_hook: StepDeltaHook
+    cancel_check: CancelCheck
+    trace_metadata: Mapping[str, str]
+
+
 async def _noop_update(step: AgentStep) -> None:
     return
 
 
+async def _noop_delta(step: AgentStep, delta: str) -> None:
+    return
+
+
 def _never_cancel() -> bool:
     return False
 
@@ -76,6 +76,17 @@ class AgentRequest(BaseModel):
         gt=0.0,
         description="Max estimated cost in USD for this run",
     )
+    stream_steps: bool = Field(
+        default=False,
+        description="Stream each step's tokens as step deltas instead of waiting per step",
+    )
+    pipeline_handoff: bool = Field(
+        default=False,
+        description=(
+            "With stream_steps and the handoff strategy, start every step at once and "
+            "feed each one the previous step's output as it is produced"
+        ),
+    )
 
     @field_validator("roles")
     @classmethod
@@ -136,6 +147,10 @@ class AgentStep(BaseModel):
     created_at: float = Field(default_factory=time.time)
     started_at: float | None = None
     completed_at: float | None = None
+    ttft_sec: float | None = Field(
+        default=None,
+        description="Time from issuing the step's generation to its first token (streaming only)",
+    )
 
 
 RunResult = str | dict[str, str]
@@ -3,17 +3,19 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
 import time
 import uuid
-from collections.abc import Callable, Mapping
+from collections.abc import AsyncIterator, Callable, Mapping
 from typing import Any, Protocol, cast
 
-from opta_lmx.agents.graph import GraphExecutor
+from opta_lmx.agents.graph import GraphExecutor, StepInput
 from opta_lmx.agents.models import (
     TERMINAL_RUN_STATES,
     AgentRequest,
     AgentRun,
+    AgentStep,
     BudgetExhaustedError,
     RunPriority,
     RunStatus,
@@ -22,6 +24,7 @@ from opta_lmx.agents.models import (
 from opta_lmx.agents.scheduler import RunQueueFullError, RunScheduler
 from opta_lmx.agents.state_store import AgentsStateStore
 from opta_lmx.agents.tracing import NullTracer, TraceEvent, Tracer
+from opta_lmx.inference.context import estimate_prompt_tokens
 from opta_lmx.inference.schema import ChatMessage
 from opta_lmx.monitoring.metrics import AgentRunMetric
 
@@ -60,6 +63,24 @@ class EngineProtocol(Protocol):
     ) -> object:
         """Generate a non-streaming response."""
 
+    def stream_generate(
+        self,
+        model_id: str,
+        messages: list[ChatMessage],
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        top_p: float = 0.95,
+        stop: list[str] | None = None,
+        tools: list[dict[str, Any]] | None = None,
+        response_format: dict[str, Any] | None = None,
+        frequency_penalty: float = 0.0,
+        presence_penalty: float = 0.0,
+        priority: str = "normal",
+        num_ctx: int | None = None,
+        client_id: str | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream response tokens as they are generated."""
+
 
 class RouterProtocol(Protocol):
     """Subset of router used by the agents runtime."""
@@ -99,6 +120,8 @@ class AgentsRuntime:
         retain_completed_runs: int = 500,
         step_retry_attempts: int = 2,
         step_retry_backoff_sec: float = 0.5,
+        stream_persist_interval_sec: float = 0.25,
+        step_delta_queue_size: int = 1024,
     ) -> None:
         self._engine = engine
         self._router = router
@@ -111,6 +134,12 @@ class AgentsRuntime:
         self._retain_completed_runs = retain_completed_runs
         self._step_retry_attempts = max(0, step_retry_attempts)
         self._step_retry_backoff_sec = max(0.0, step_retry_backoff_sec)
+        self._stream_persist_interval_sec = max(0.0, stream_persist_interval_sec)
+        self._step_delta_queue_size = max(1, step_delta_queue_size)
+        # Streaming-step bookkeeping, keyed by run ID.
+        self._delta_subscribers: dict[str, set[asyncio.Queue[dict[str, Any]]]] = {}
+        self._last_persisted_at: dict[str, float] = {}
+        self._first_token_at: dict[str, float] = {}
         self._started = False
         self._run_tasks: dict[str, asyncio.Task[None]] = {}
         self._submit_lock = asyncio.Lock()
@@ -243,6 +272,26 @@ class AgentsRuntime:
         runs.sort(key=lambda run: run.created_at, reverse=True)
         return runs
 
+    def subscribe_step_deltas(self, run_id: str) -> asyncio.Queue[dict[str, Any]]:
+        """Return a queue receiving ``step.delta`` payloads for a streaming run.
+
+        The queue is bounded; when a slow consumer falls behind, further deltas
+        are dropped for it. Each payload carries the delta's ``offset`` into the
+        step output so consumers can detect the gap and re-read the run.
+        """
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=self._step_delta_queue_size)
+        self._delta_subscribers.setdefault(run_id, set()).add(queue)
+        return queue
+
+    def unsubscribe_step_deltas(self, run_id: str, queue: asyncio.Queue[dict[str, Any]]) -> None:
+        """Detach a queue returned by :meth:`subscribe_step_deltas`."""
+        subscribers = self._delta_subscribers.get(run_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            self._delta_subscribers.pop(run_id, None)
+
     async def cancel(self, run_id: str) -> bool:
         """Cancel a queued or running run."""
         run = self._runs.get(run_id)
@@ -303,12 +352,18 @@ class AgentsRuntime:
             run.resolved_model = self._resolve_model_for_requested(run.request.model)
             self._record_run(run)
 
+            stream_runner = None
+            stream_generate = getattr(self._engine, "stream_generate", None)
+            if run.request.stream_steps and callable(stream_generate):
+                stream_runner = functools.partial(self._stream_step, run)
             graph_coro = self._graph.execute(
                 run,
                 runner=lambda role, step_input: self._run_step(run, role, step_input),
                 on_step_update=lambda _step: self._on_step_update(run),
                 should_cancel=lambda: run.status == RunStatus.CANCELLED,
                 trace_metadata=self._trace_metadata(run),
+                stream_runner=stream_runner,
+                on_step_delta=lambda step, delta: self._on_step_delta(run, step, delta),
             )
             if run.request.timeout_sec is not None:
                 result = await asyncio.wait_for(graph_coro, timeout=run.request.timeout_sec)
@@ -338,6 +393,8 @@ class AgentsRuntime:
         finally:
             run.updated_at = time.time()
             self._record_run(run)
+            self._last_persisted_at.pop(run.id, None)
+            first_token_at = self._first_token_at.pop(run.id, None)
             self._tracer.emit(
                 TraceEvent(
                     run_id=run.id,
@@ -360,6 +417,16 @@ class AgentsRuntime:
                             duration_sec=max(0.0, time.monotonic() - started_at),
                             model_id=run.resolved_model or run.request.model,
                             role_count=len(run.request.roles),
+                            step_ttft_sec={
+                                step.id: step.ttft_sec
+                                for step in run.steps
+                                if step.ttft_sec is not None
+                            },
+                            first_token_sec=(
+                                max(0.0, first_token_at - started_at)
+                                if first_token_at is not None
+                                else None
+                            ),
                         )
                     )
 
@@ -371,6 +438,30 @@ class AgentsRuntime:
             run.checkpoint_pointer = completed_steps[-1].id
         self._record_run(run)
 
+    async def _on_step_delta(self, run: AgentRun, step: AgentStep, delta: str) -> None:
+        """Fan a token delta out to subscribers; persist the run at most every interval."""
+        subscribers = self._delta_subscribers.get(run.id)
+        if subscribers:
+            output = step.output or ""
+            payload: dict[str, Any] = {
+                "type": "step.delta",
+                "run_id": run.id,
+                "step_id": step.id,
+                "role": step.role,
+                "offset": len(output) - len(delta),
+                "delta": delta,
+            }
+            for queue in subscribers:
+                if not queue.full():
+                    queue.put_nowait(payload)
+
+        now = time.monotonic()
+        last = self._last_persisted_at.get(run.id)
+        if last is None or now - last >= self._stream_persist_interval_sec:
+            self._last_persisted_at[run.id] = now
+            run.updated_at = time.time()
+            self._record_run(run)
+
     def _check_budget(self, run: AgentRun) -> None:
         """Check if run has exceeded its budget constraints."""
         if run.request.token_budget is not None and run.tokens_used >= run.request.token_budget:
@@ -416,20 +507,7 @@ class AgentsRuntime:
                 is_last_attempt = attempt_index >= attempts_total - 1
                 if is_last_attempt or not self._is_retryable_step_error(exc):
                     raise
-                delay_sec = self._step_retry_backoff_sec * (2**attempt_index)
-                metadata = self._trace_metadata(run)
-                metadata["retry_attempt"] = str(attempt_index + 1)
-                metadata["retry_delay_sec"] = f"{delay_sec:.3f}"
-                self._tracer.emit(
-                    TraceEvent(
-                        run_id=run.id,
-                        event="step_retry",
-                        status=run.status,
-                        message=str(exc),
-                        metadata=metadata,
-                    )
-                )
-                await asyncio.sleep(delay_sec)
+                await self._backoff_step_retry(run, attempt_index, exc)
 
         if response is not None:
             usage = getattr(response, "usage", None)
@@ -451,6 +529,81 @@ class AgentsRuntime:
             return content
         return ""
 
+    async def _stream_step(
+        self,
+        run: AgentRun,
+        step: AgentStep,
+        step_input: StepInput,
+    ) -> AsyncIterator[str]:
+        """Streaming counterpart of :meth:`_run_step`, yielding token deltas.
+
+        Model resolution happens before waiting on the input, so a pipelined
+        handoff step is ready the moment its upstream finishes. Only attempts
+        that fail before the first token are retried; once deltas have been
+        handed downstream the step cannot be replayed.
+        """
+        self._check_budget(run)
+
+        model_id = self._resolve_model_for_role(run, step.role)
+        priority = self._inference_priority_for_run(run)
+        system_prompt = self._system_prompt_for_role(run, step.role)
+        role_tools = self._tools_for_role(run, step.role)
+        messages = [
+            ChatMessage(role="system", content=system_prompt),
+            ChatMessage(role="user", content=await step_input.text()),
+        ]
+        attempts_total = self._step_retry_attempts + 1
+        completion_tokens = 0
+
+        for attempt_index in range(attempts_total):
+            issued_at = time.monotonic()
+            try:
+                async for delta in self._engine.stream_generate(
+                    model_id=model_id,
+                    messages=messages,
+                    priority=priority,
+                    tools=role_tools,
+                    client_id=run.request.submitted_by,
+                ):
+                    if not delta:
+                        continue
+                    if completion_tokens == 0:
+                        now = time.monotonic()
+                        step.ttft_sec = now - issued_at
+                        self._first_token_at.setdefault(run.id, now)
+                    completion_tokens += 1
+                    yield delta
+                break
+            except Exception as exc:
+                is_last_attempt = attempt_index >= attempts_total - 1
+                if completion_tokens or is_last_attempt or not self._is_retryable_step_error(exc):
+                    raise
+                await self._backoff_step_retry(run, attempt_index, exc)
+
+        run.tokens_used += estimate_prompt_tokens(messages) + completion_tokens
+        self._record_run(run)
+
+    async def _backoff_step_retry(
+        self,
+        run: AgentRun,
+        attempt_index: int,
+        exc: Exception,
+    ) -> None:
+        delay_sec = self._step_retry_backoff_sec * (2**attempt_index)
+        metadata = self._trace_metadata(run)
+        metadata["retry_attempt"] = str(attempt_index + 1)
+        metadata["retry_delay_sec"] = f"{delay_sec:.3f}"
+        self._tracer.emit(
+            TraceEvent(
+                run_id=run.id,
+                event="step_retry",
+                status=run.status,
+                message=str(exc),
+                metadata=metadata,
+            )
+        )
+        await asyncio.sleep(delay_sec)
+
     def _resolve_model_for_role(self, run: AgentRun, role: str) -> str:
         direct = run.request.role_models.get(role)
         if isinstance(direct, str) and direct:
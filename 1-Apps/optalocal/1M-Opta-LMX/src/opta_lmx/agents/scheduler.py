@@ -6,17 +6,27 @@ import asyncio
 import logging
 import sqlite3
 import time
+from collections import deque
 from collections.abc import Awaitable, Callable
 from itertools import count
 from pathlib import Path
 from threading import Lock
-from typing import Literal
+from typing import Any, Literal
+
+from opta_lmx.runtime.sqlite_queue import (
+    ClaimLease,
+    LatencyWindow,
+    QueueWakeup,
+    connect_queue_db,
+)
 
 logger = logging.getLogger(__name__)
 
 RunHandler = Callable[[str], Awaitable[None]]
-_QueueItem = tuple[int, int, str | None]
-_ClaimedItem = tuple[int, str]
+# (priority, sequence, run_id, enqueued_at monotonic)
+_QueueItem = tuple[int, int, str | None, float]
+# (row id, run_id, enqueued_at wall clock)
+_ClaimedItem = tuple[int, str, float]
 
 _PRIORITY_ORDER: dict[str, int] = {
     "interactive": 0,
@@ -38,6 +48,15 @@ class RunScheduler:
     """Bounded queue worker scheduler for run IDs.
 
     Supports in-memory queueing (default) and SQLite-backed persistent queueing.
+
+    The SQLite backend keeps one WAL-tuned connection open and wakes idle
+    workers on submit (and across processes sharing the database) rather
+    than polling; ``poll_interval_sec`` is only the idle re-check interval.
+    Idle workers claim runs in one ``UPDATE ... RETURNING`` batch sized to
+    the number of workers waiting. Claimed rows record this scheduler as
+    owner under a lease renewed while it runs (see
+    :class:`~opta_lmx.runtime.sqlite_queue.ClaimLease`); recovery requeues
+    only its own rows and rows whose lease expired after ``lease_sec``.
     """
 
     def __init__(
@@ -47,7 +66,8 @@ class RunScheduler:
         worker_count: int = 2,
         backend: Literal["memory", "sqlite"] = "memory",
         persist_path: Path | None = None,
-        poll_interval_sec: float = 0.05,
+        poll_interval_sec: float = 1.0,
+        lease_sec: float = 60.0,
     ) -> None:
         if max_queue_size < 1:
             raise ValueError("max_queue_size must be >= 1")
@@ -70,12 +90,24 @@ class RunScheduler:
         self._queue: asyncio.PriorityQueue[_QueueItem] | None = None
         self._persist_path: Path | None = None
         self._db_lock = Lock()
+        self._con: sqlite3.Connection | None = None
+        self._wakeup: QueueWakeup | None = None
+        self._lease: ClaimLease | None = None
+        self._lease_task: asyncio.Task[None] | None = None
+        self._claimed: deque[_ClaimedItem] = deque()
+        self._claim_lock: asyncio.Lock | None = None
+        self._idle_workers = 0
+        self._claim_batches_total = 0
+        self._claimed_total = 0
+        self._start_latency = LatencyWindow()
         if backend == "memory":
             self._queue = asyncio.PriorityQueue(maxsize=max_queue_size)
         else:
             if persist_path is None:
                 raise ValueError("persist_path is required when backend='sqlite'")
             self._persist_path = Path(persist_path).expanduser()
+            self._wakeup = QueueWakeup(str(self._persist_path.resolve()))
+            self._lease = ClaimLease("run_queue", lease_sec=lease_sec)
             self._init_db()
             self._recover_running_rows()
 
@@ -105,6 +137,12 @@ class RunScheduler:
             return
         self._handler = handler
         self._running = True
+        if self._wakeup is not None:
+            self._wakeup.open()
+            self._claim_lock = asyncio.Lock()
+            self._lease_task = asyncio.create_task(
+                self._lease_loop(), name="agents-scheduler-lease"
+            )
         self._workers = [
             asyncio.create_task(
                 self._worker_loop(index),
@@ -123,16 +161,26 @@ class RunScheduler:
             queue = self._queue
             if queue is not None:
                 for _ in self._workers:
-                    await queue.put((99, next(self._sequence), None))
+                    await queue.put((99, next(self._sequence), None, 0.0))
         else:
             for worker in self._workers:
                 worker.cancel()
+            if self._lease_task is not None:
+                self._lease_task.cancel()
 
         await asyncio.gather(*self._workers, return_exceptions=True)
+        if self._lease_task is not None:
+            await asyncio.gather(self._lease_task, return_exceptions=True)
+            self._lease_task = None
         self._workers = []
         self._handler = None
         if self._backend == "sqlite":
-            self._recover_running_rows()
+            # Claimed-but-unstarted runs go back to the queue with the rest.
+            self._claimed.clear()
+            self._recover_running_rows(own=True)
+            self._close_db()
+            if self._wakeup is not None:
+                self._wakeup.close()
 
     async def submit(self, run_id: str, *, priority: str = "normal") -> None:
         """Queue a run ID for workers to execute."""
@@ -144,7 +192,7 @@ class RunScheduler:
             queue = self._queue
             if queue is None:
                 raise RuntimeError("Scheduler queue unavailable")
-            entry = (queue_priority, next(self._sequence), run_id)
+            entry = (queue_priority, next(self._sequence), run_id, time.monotonic())
             try:
                 queue.put_nowait(entry)
             except asyncio.QueueFull as exc:
@@ -159,6 +207,25 @@ class RunScheduler:
             raise RunQueueFullError(size=size, capacity=self._max_queue_size)
         sequence = next(self._sequence)
         await asyncio.to_thread(self._db_enqueue, run_id, queue_priority, sequence)
+        if self._wakeup is not None:
+            await self._wakeup.notify()
+
+    def stats(self) -> dict[str, Any]:
+        """Run queue backend, batched claims, and how long runs waited to start."""
+        stats: dict[str, Any] = {
+            "sqlite_backend": int(self._backend == "sqlite"),
+            "workers": self._worker_count,
+            **self._start_latency.snapshot("enqueue_to_start"),
+        }
+        if self._wakeup is not None:
+            stats.update(
+                claim_batches_total=self._claim_batches_total,
+                claimed_total=self._claimed_total,
+                **self._wakeup.stats(),
+            )
+        if self._lease is not None:
+            stats.update(self._lease.stats())
+        return stats
 
     async def _worker_loop(self, worker_index: int) -> None:
         if self._backend == "memory":
@@ -171,10 +238,11 @@ class RunScheduler:
         if queue is None:
             return
         while True:
-            _, _, run_id = await queue.get()
+            _, _, run_id, enqueued_at = await queue.get()
             try:
                 if run_id is None:
                     return
+                self._start_latency.observe(time.monotonic() - enqueued_at)
                 handler = self._handler
                 if handler is None:
                     continue
@@ -193,12 +261,12 @@ class RunScheduler:
                 return
             try:
                 if claimed is None:
-                    claimed = await asyncio.to_thread(self._db_claim_next)
+                    claimed = await self._next_claimed()
                     if claimed is None:
-                        await asyncio.sleep(self._poll_interval_sec)
                         continue
 
-                row_id, run_id = claimed
+                row_id, run_id, enqueued_at = claimed
+                self._start_latency.observe(time.time() - enqueued_at)
                 handler = self._handler
                 if handler is not None:
                     await handler(run_id)
@@ -217,143 +285,184 @@ class RunScheduler:
                     await asyncio.to_thread(self._db_complete_claimed, claimed[0])
                     claimed = None
 
+    async def _next_claimed(self) -> _ClaimedItem | None:
+        """Next claimed run, or None after an idle wait (so the caller re-checks state)."""
+        if self._claimed:
+            return self._claimed.popleft()
+        wakeup = self._wakeup
+        claim_lock = self._claim_lock
+        if wakeup is None or claim_lock is None:
+            return None
+        seen = wakeup.generation
+        self._idle_workers += 1
+        try:
+            async with claim_lock:
+                if not self._claimed:
+                    batch = await asyncio.to_thread(self._db_claim_batch, self._idle_workers)
+                    self._claimed.extend(batch)
+            if self._claimed:
+                if len(self._claimed) > 1:
+                    # Hand the rest of the batch to the other idle workers.
+                    await wakeup.wake_local()
+                return self._claimed.popleft()
+            await wakeup.wait(seen, max_wait=self._poll_interval_sec)
+            return None
+        finally:
+            self._idle_workers -= 1
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._con is None:
+            self._con = connect_queue_db(self._require_persist_path())
+        return self._con
+
+    def _close_db(self) -> None:
+        with self._db_lock:
+            if self._con is not None:
+                self._con.close()
+                self._con = None
+
     def _init_db(self) -> None:
         path = self._require_persist_path()
         path.parent.mkdir(parents=True, exist_ok=True)
         with self._db_lock:
-            con = sqlite3.connect(path)
-            try:
-                con.execute("PRAGMA journal_mode=WAL;")
-                con.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS run_queue (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        run_id TEXT NOT NULL,
-                        priority INTEGER NOT NULL,
-                        sequence INTEGER NOT NULL,
-                        status TEXT NOT NULL DEFAULT 'queued',
-                        enqueued_at REAL NOT NULL,
-                        claimed_at REAL
-                    )
-                    """
-                )
-                con.execute(
-                    """
-                    CREATE INDEX IF NOT EXISTS idx_run_queue_status_priority
-                    ON run_queue(status, priority, sequence, id)
-                    """
+            con = self._connection()
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS run_queue (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id TEXT NOT NULL,
+                    priority INTEGER NOT NULL,
+                    sequence INTEGER NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    enqueued_at REAL NOT NULL,
+                    claimed_at REAL,
+                    owner TEXT,
+                    lease_until REAL
                 )
-                con.commit()
-            finally:
-                con.close()
+                """
+            )
+            self._require_lease().ensure_columns(con)
+            con.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_run_queue_status_priority
+                ON run_queue(status, priority, sequence, id)
+                """
+            )
+            con.commit()
 
-    def _recover_running_rows(self) -> None:
-        path = self._require_persist_path()
+    def _recover_running_rows(self, *, own: bool = False) -> int:
+        """Requeue rows whose claim lease lapsed, plus this instance's own if ``own``.
+
+        Rows claimed by another live process keep running.
+        """
         with self._db_lock:
-            con = sqlite3.connect(path)
+            con = self._connection()
+            reclaimed = self._require_lease().reclaim(con, own=own)
+            con.commit()
+        if reclaimed:
+            logger.warning(
+                "agents_queue_rows_reclaimed",
+                extra={"rows": reclaimed, "own": own},
+            )
+        return reclaimed
+
+    async def _lease_loop(self) -> None:
+        """Renew leases on held rows and pick up rows from crashed peers."""
+        lease = self._require_lease()
+        while True:
+            await asyncio.sleep(lease.renew_interval_sec)
             try:
-                con.execute(
-                    """
-                    UPDATE run_queue
-                    SET status='queued', claimed_at=NULL
-                    WHERE status='running'
-                    """
-                )
-                con.commit()
-            finally:
-                con.close()
+                await asyncio.to_thread(self._db_renew_leases)
+                reclaimed = await asyncio.to_thread(self._recover_running_rows)
+            except sqlite3.Error:
+                logger.warning("agents_queue_lease_renewal_failed", exc_info=True)
+                continue
+            if reclaimed and self._wakeup is not None:
+                await self._wakeup.notify()
+
+    def _db_renew_leases(self) -> None:
+        with self._db_lock:
+            con = self._connection()
+            self._require_lease().renew(con)
+            con.commit()
 
     def _db_count_queued(self) -> int:
-        path = self._require_persist_path()
         with self._db_lock:
-            con = sqlite3.connect(path)
-            try:
-                row = con.execute("SELECT COUNT(1) FROM run_queue WHERE status='queued'").fetchone()
-                if row is None:
-                    return 0
-                return int(row[0])
-            finally:
-                con.close()
+            row = (
+                self._connection()
+                .execute("SELECT COUNT(1) FROM run_queue WHERE status='queued'")
+                .fetchone()
+            )
+            if row is None:
+                return 0
+            return int(row[0])
 
     def _db_enqueue(self, run_id: str, priority: int, sequence: int) -> None:
-        path = self._require_persist_path()
         with self._db_lock:
-            con = sqlite3.connect(path)
-            try:
-                con.execute(
-                    """
-                    INSERT INTO run_queue(run_id, priority, sequence, status, enqueued_at)
-                    VALUES (?, ?, ?, 'queued', ?)
-                    """,
-                    (run_id, priority, sequence, time.time()),
-                )
-                con.commit()
-            finally:
-                con.close()
+            con = self._connection()
+            con.execute(
+                """
+                INSERT INTO run_queue(run_id, priority, sequence, status, enqueued_at)
+                VALUES (?, ?, ?, 'queued', ?)
+                """,
+                (run_id, priority, sequence, time.time()),
+            )
+            con.commit()
 
-    def _db_claim_next(self) -> _ClaimedItem | None:
-        path = self._require_persist_path()
+    def _db_claim_batch(self, limit: int) -> list[_ClaimedItem]:
+        """Claim up to ``limit`` queued runs in priority order with one statement."""
         with self._db_lock:
-            con = sqlite3.connect(path)
+            con = self._connection()
             try:
-                con.execute("BEGIN IMMEDIATE")
-                row = con.execute(
-                    """
-                    SELECT id, run_id
-                    FROM run_queue
-                    WHERE status='queued'
-                    ORDER BY priority ASC, sequence ASC, id ASC
-                    LIMIT 1
-                    """
-                ).fetchone()
-                if row is None:
-                    con.commit()
-                    return None
-
-                row_id = int(row[0])
-                run_id = str(row[1])
-                con.execute(
+                rows = con.execute(
                     """
                     UPDATE run_queue
-                    SET status='running', claimed_at=?
-                    WHERE id=?
+                    SET status='running', claimed_at=?, owner=?, lease_until=?
+                    WHERE id IN (
+                        SELECT id FROM run_queue
+                        WHERE status='queued'
+                        ORDER BY priority ASC, sequence ASC, id ASC
+                        LIMIT ?
+                    )
+                    RETURNING id, run_id, enqueued_at, priority, sequence
                     """,
-                    (time.time(), row_id),
-                )
+                    (time.time(), *self._require_lease().claim_values(), max(1, limit)),
+                ).fetchall()
                 con.commit()
-                return (row_id, run_id)
             except Exception:
                 con.rollback()
                 raise
-            finally:
-                con.close()
+        if rows:
+            self._claim_batches_total += 1
+            self._claimed_total += len(rows)
+        # RETURNING order is unspecified; restore queue order.
+        rows.sort(key=lambda row: (row[3], row[4], row[0]))
+        return [(int(row[0]), str(row[1]), float(row[2])) for row in rows]
 
     def _db_complete_claimed(self, row_id: int) -> None:
-        path = self._require_persist_path()
         with self._db_lock:
-            con = sqlite3.connect(path)
-            try:
-                con.execute("DELETE FROM run_queue WHERE id=?", (row_id,))
-                con.commit()
-            finally:
-                con.close()
+            con = self._connection()
+            con.execute("DELETE FROM run_queue WHERE id=?", (row_id,))
+            con.commit()
 
     def _db_requeue_claimed(self, row_id: int) -> None:
-        path = self._require_persist_path()
         with self._db_lock:
-            con = sqlite3.connect(path)
-            try:
-                con.execute(
-                    """
-                    UPDATE run_queue
-                    SET status='queued', claimed_at=NULL
-                    WHERE id=?
-                    """,
-                    (row_id,),
-                )
-                con.commit()
-            finally:
-                con.close()
+            con = self._connection()
+            con.execute(
+                """
+                UPDATE run_queue
+                SET status='queued', claimed_at=NULL, owner=NULL, lease_until=NULL
+                WHERE id=?
+                """,
+                (row_id,),
+            )
+            con.commit()
+
+    def _require_lease(self) -> ClaimLease:
+        lease = self._lease
+        if lease is None:
+            raise RuntimeError("SQLite scheduler backend requires a claim lease")
+        return lease
 
     def _require_persist_path(self) -> Path:
         path = self._persist_path
@@ -124,16 +124,30 @@ async def reload_config(
     request.app.state.inference_api_key = new_config.security.inference_api_key
     request.app.state.supabase_jwt_enabled = new_config.security.supabase_jwt_enabled
     request.app.state.supabase_jwt_require = new_config.security.supabase_jwt_require
-    request.app.state.supabase_jwt_verifier = (
+    old_verifier = getattr(request.app.state, "supabase_jwt_verifier", None)
+    if isinstance(old_verifier, SupabaseJWTVerifier):
+        await old_verifier.stop_background_refresh()
+    new_verifier = (
         SupabaseJWTVerifier(
             issuer=new_config.security.supabase_jwt_issuer,
             audience=new_config.security.supabase_jwt_audience,
             jwks_url=new_config.security.supabase_jwt_jwks_url,
             user_id_claim=new_config.security.supabase_jwt_claim_user_id,
+            cache_ttl_sec=new_config.security.supabase_jwt_jwks_cache_ttl_sec,
+            token_cache_size=new_config.security.supabase_jwt_token_cache_size,
         )
         if new_config.security.supabase_jwt_enabled
         else None
     )
+    request.app.state.supabase_jwt_verifier = new_verifier
+    metrics = getattr(request.app.state, "metrics", None)
+    if new_verifier is not None:
+        if new_config.security.supabase_jwt_background_refresh:
+            new_verifier.start_background_refresh()
+        if metrics is not None:
+            metrics.register_source("jwt", new_verifier.stats)
+    elif metrics is not None:
+        metrics.unregister_source("jwt")
 
     # Update logging level
     import logging as _logging
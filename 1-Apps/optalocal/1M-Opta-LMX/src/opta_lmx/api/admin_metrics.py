@@ -3,14 +3,13 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import time
 from collections.abc import AsyncIterator
 from typing import Any
 
 from fastapi import APIRouter, Request
-from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
 from opta_lmx.api.deps import (
     AdminAuth,
@@ -19,7 +18,9 @@ from opta_lmx.api.deps import (
     Memory,
     Metrics,
 )
+from opta_lmx.api.errors import openai_error
 from opta_lmx.inference.schema import ErrorResponse
+from opta_lmx.monitoring.events import encode_sse
 
 logger = logging.getLogger(__name__)
 
@@ -133,32 +134,47 @@ async def metrics_json(
     return metrics.summary()
 
 
-@admin_metrics_router.get("/admin/events", responses={403: {"model": ErrorResponse}})
+@admin_metrics_router.get(
+    "/admin/events",
+    response_model=None,
+    responses={403: {"model": ErrorResponse}},
+)
 async def admin_event_stream(
     _auth: AdminAuth,
     event_bus: Events,
     request: Request,
-) -> StreamingResponse:
+) -> StreamingResponse | JSONResponse:
     """Server-Sent Events feed for real-time admin monitoring.
 
     Streams events for: model_loaded, model_unloaded, download_progress,
     download_completed, download_failed, request_completed, memory_warning,
     config_reloaded. Sends heartbeat every 30 seconds.
+
+    Frames carry sequence ids; a reconnecting client's ``Last-Event-ID``
+    replays what it missed from the bus's ring buffer.
     """
     heartbeat_sec = getattr(request.app.state.config.server, "sse_heartbeat_interval_sec", 30)
+    try:
+        stream = event_bus.open_stream(request.headers.get("last-event-id"))
+    except ValueError as e:
+        return openai_error(
+            status_code=503,
+            message=str(e),
+            error_type="server_error",
+            code="sse_subscriber_limit",
+        )
 
     async def generate() -> AsyncIterator[str]:
-        queue = event_bus.subscribe()
         try:
             while True:
                 try:
-                    event = await asyncio.wait_for(queue.get(), timeout=heartbeat_sec)
-                    yield (f"event: {event.event_type}\ndata: {json.dumps(event.data)}\n\n")
+                    frames = await stream.next_frames(max_wait=heartbeat_sec)
+                    yield "".join(frame.text for frame in frames)
                 except TimeoutError:
-                    yield f"event: heartbeat\ndata: {json.dumps({'timestamp': time.time()})}\n\n"
+                    yield encode_sse("heartbeat", {"timestamp": time.time()})
         except asyncio.CancelledError:
             pass
         finally:
-            event_bus.unsubscribe(queue)
+            event_bus.close_stream(stream)
 
     return StreamingResponse(generate(), media_type="text/event-stream")
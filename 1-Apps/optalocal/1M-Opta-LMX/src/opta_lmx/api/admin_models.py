@@ -14,6 +14,7 @@ if TYPE_CHECKING:
     from opta_lmx.inference.engine import InferenceEngine
     from opta_lmx.manager.model import ModelManager
     from opta_lmx.monitoring.journal import RuntimeJournalManager
+    from opta_lmx.presets.manager import PresetManager
 
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
@@ -77,7 +78,7 @@ _pending_lock = asyncio.Lock()
 # Strong references to background tasks (prevents GC before completion)
 _background_tasks: set[asyncio.Task[None]] = set()
 
-_ALLOWED_LOAD_BACKENDS = frozenset({"vllm-mlx", "mlx-lm", "gguf"})
+_ALLOWED_LOAD_BACKENDS = frozenset({"vllm-mlx", "mlx-lm", "gguf", "fake"})
 _LEGACY_LOAD_BACKEND_ALIASES: dict[str, str] = {
     "mlx": "vllm-mlx",
 }
@@ -386,9 +387,13 @@ async def load_model(
             code="invalid_value",
         )
 
+    # The simulated backend needs neither Apple Silicon nor local weights.
+    simulated = (preferred_backend or engine.resolve_autotune_backend(body.model_id)) == "fake"
+
     # Admission gate: architecture/backend compatibility.
     try:
-        validate_architecture(body.model_id)
+        if not simulated:
+            validate_architecture(body.model_id)
     except AdmissionFailure as e:
         return openai_error(
             status_code=e.status_code,
@@ -450,9 +455,9 @@ async def load_model(
         )
 
     # Check if model is on disk
-    is_available = await manager.is_model_available(body.model_id)
+    is_available = simulated or await manager.is_model_available(body.model_id)
     snapshot_incomplete = False
-    if is_available:
+    if is_available and not simulated:
         # A repo can appear in cache scans while still missing required blobs.
         # Guard this before engine load to avoid opaque 500 errors and crash loops.
         is_complete = await manager.is_local_snapshot_complete(body.model_id)
@@ -767,7 +772,14 @@ async def autotune_model(
     metrics: Metrics,
     preset_mgr: Presets,
 ) -> AdminAutotuneResponse | JSONResponse:
-    """Benchmark candidate load profiles and persist best profile for this model/backend."""
+    """Benchmark candidate load profiles and persist best profile for this model/backend.
+
+    With ``search`` set, candidates come from the knob search space and are
+    narrowed by successive halving under ``concurrency`` simultaneous streams.
+    """
+    if body.search:
+        return await _autotune_search(body, engine, preset_mgr)
+
     # Import benchmark_model from the admin module to avoid circular dependency.
     # This function is defined in admin.py (the composing module) and re-exported.
     from opta_lmx.api.admin import benchmark_model as _benchmark_model
@@ -917,6 +929,129 @@ async def autotune_model(
     )
 
 
+async def _autotune_search(
+    body: AdminAutotuneRequest,
+    engine: InferenceEngine,
+    preset_mgr: PresetManager,
+) -> AdminAutotuneResponse | JSONResponse:
+    from opta_lmx.inference.autotune_search import (
+        DEFAULT_SEARCH_SPACE,
+        AutotuneSearch,
+        candidate_profiles,
+        search_space_from_spec,
+    )
+
+    original_loaded = engine.is_model_loaded(body.model_id)
+    original_perf: dict[str, Any] | None = None
+    if original_loaded:
+        with contextlib.suppress(Exception):
+            original_perf = dict(engine.get_model(body.model_id).performance_overrides or {})
+
+    # A profile tuned on an older backend version is the natural first guess.
+    seeds = list(body.profiles)
+    stale = engine.get_stale_tuned_profile(
+        body.model_id, allow_failed=body.allow_unsupported_runtime
+    )
+    if isinstance(stale, dict) and isinstance(stale.get("profile"), dict):
+        seeds.insert(0, stale["profile"])
+    space = (
+        search_space_from_spec(body.search_space)
+        if body.search_space is not None
+        else DEFAULT_SEARCH_SPACE
+    )
+    candidates = candidate_profiles(space, max_candidates=body.max_candidates, seeds=seeds)
+    search = AutotuneSearch(
+        engine,
+        compose=lambda candidate: preset_mgr.compose_performance_for_load(
+            body.model_id, tuned=None, explicit=candidate
+        ),
+        eta=body.eta,
+        concurrency=body.concurrency,
+        base_requests=body.runs * body.concurrency,
+        prompt=body.prompt,
+        max_tokens=body.max_tokens,
+        temperature=body.temperature,
+        allow_unsupported_runtime=body.allow_unsupported_runtime,
+    )
+
+    try:
+        outcome = await search.run(body.model_id, candidates)
+        backend_name = engine.resolve_autotune_backend(
+            body.model_id,
+            allow_failed=body.allow_unsupported_runtime,
+        )
+    except ModelRuntimeCompatibilityError as e:
+        return openai_error(
+            status_code=422,
+            message=str(e),
+            error_type="not_supported_error",
+            param="model_id",
+            code=ErrorCodes.MODEL_UNSUPPORTED_BACKEND,
+        )
+    finally:
+        if engine.is_model_loaded(body.model_id):
+            with contextlib.suppress(Exception):
+                await engine.unload_model(body.model_id, reason="autotune_cleanup")
+        if original_loaded:
+            try:
+                await engine.load_model(
+                    body.model_id,
+                    performance_overrides=original_perf or None,
+                    allow_unsupported_runtime=body.allow_unsupported_runtime,
+                )
+            except Exception as _restore_exc:
+                logger.warning(
+                    "autotune_model_restore_failed",
+                    extra={"model_id": body.model_id, "error": str(_restore_exc)},
+                )
+
+    best = outcome.best
+    if best is None:
+        return internal_error("Autotune search did not produce benchmark results.")
+
+    backend_version_value = engine.autotune_backend_version(backend_name)
+    best_score = engine.save_tuned_profile(
+        model_id=body.model_id,
+        backend=backend_name,
+        backend_version_value=backend_version_value,
+        profile=best.profile,
+        metrics=best.metrics,
+    )
+    logger.info(
+        "autotune_search_complete",
+        extra={
+            "model_id": body.model_id,
+            "candidates": len(candidates),
+            "trials": len(outcome.trials),
+            "reloads": outcome.reloads,
+            "hot_applies": outcome.hot_applies,
+            "best_score": best_score,
+        },
+    )
+    return AdminAutotuneResponse.model_validate(
+        {
+            "model_id": body.model_id,
+            "backend": backend_name,
+            "backend_version": backend_version_value,
+            "best_profile": best.profile,
+            "best_metrics": best.metrics,
+            "best_score": best_score,
+            "candidates": [
+                {
+                    "profile": trial.profile,
+                    "metrics": trial.metrics,
+                    "score": trial.score,
+                    "rung": trial.rung,
+                }
+                for trial in outcome.trials
+                if not trial.failed
+            ],
+            "reloads": outcome.reloads,
+            "hot_applies": outcome.hot_applies,
+        },
+    )
+
+
 @admin_models_router.get(
     "/admin/models/{model_id:path}/autotune",
     response_model=None,
@@ -258,6 +258,7 @@ def _run_snapshot_payload(run: AgentRun) -> dict[str, Any]:
                 "status": step.status.value,
                 "error": step.error,
                 "completed_at": step.completed_at,
+                "ttft_sec": step.ttft_sec,
             }
             for step in run.steps
         ],
@@ -271,43 +272,70 @@ async def _run_events_stream(
     poll_interval_sec: float = 0.25,
     heartbeat_interval_sec: float = 10.0,
 ) -> AsyncIterator[str]:
-    """SSE stream of run snapshots until terminal state."""
+    """SSE stream of run snapshots until terminal state.
+
+    Runs submitted with ``stream_steps`` also emit ``step.delta`` events as
+    tokens arrive; the snapshot poll then wakes on deltas instead of sleeping.
+    """
     started = time.monotonic()
     next_heartbeat = started + heartbeat_interval_sec
     last_payload: dict[str, Any] | None = None
+    subscribe = getattr(runtime, "subscribe_step_deltas", None)
+    deltas: asyncio.Queue[dict[str, Any]] | None = (
+        subscribe(run_id) if callable(subscribe) else None
+    )
 
-    while True:
-        run = runtime.get(run_id)
-        if run is None:
-            error_payload: dict[str, Any] = {
-                "type": "run.error",
-                "run_id": run_id,
-                "error": "Run not found",
-                "code": "run_not_found",
-            }
-            yield f"event: run.error\ndata: {json.dumps(error_payload)}\n\n"
-            break
-
-        snapshot = _run_snapshot_payload(run)
-        if snapshot != last_payload:
-            update_payload: dict[str, Any] = {"type": "run.update", "run": snapshot}
-            yield f"event: run.update\ndata: {json.dumps(update_payload)}\n\n"
-            last_payload = snapshot
-
-        if run.status in TERMINAL_RUN_STATES:
-            done_payload: dict[str, Any] = {"type": "run.completed", "run": snapshot}
-            yield f"event: run.completed\ndata: {json.dumps(done_payload)}\n\n"
-            break
-
-        now = time.monotonic()
-        if now >= next_heartbeat:
-            yield ": keep-alive\n\n"
-            next_heartbeat = now + heartbeat_interval_sec
-        await asyncio.sleep(poll_interval_sec)
+    try:
+        while True:
+            while deltas is not None and not deltas.empty():
+                yield _step_delta_event(deltas.get_nowait())
+
+            run = runtime.get(run_id)
+            if run is None:
+                error_payload: dict[str, Any] = {
+                    "type": "run.error",
+                    "run_id": run_id,
+                    "error": "Run not found",
+                    "code": "run_not_found",
+                }
+                yield f"event: run.error\ndata: {json.dumps(error_payload)}\n\n"
+                break
+
+            snapshot = _run_snapshot_payload(run)
+            if snapshot != last_payload:
+                update_payload: dict[str, Any] = {"type": "run.update", "run": snapshot}
+                yield f"event: run.update\ndata: {json.dumps(update_payload)}\n\n"
+                last_payload = snapshot
+
+            if run.status in TERMINAL_RUN_STATES:
+                done_payload: dict[str, Any] = {"type": "run.completed", "run": snapshot}
+                yield f"event: run.completed\ndata: {json.dumps(done_payload)}\n\n"
+                break
+
+            now = time.monotonic()
+            if now >= next_heartbeat:
+                yield ": keep-alive\n\n"
+                next_heartbeat = now + heartbeat_interval_sec
+            if deltas is None:
+                await asyncio.sleep(poll_interval_sec)
+                continue
+            try:
+                delta = await asyncio.wait_for(deltas.get(), timeout=poll_interval_sec)
+            except TimeoutError:
+                continue
+            yield _step_delta_event(delta)
+    finally:
+        unsubscribe = getattr(runtime, "unsubscribe_step_deltas", None)
+        if deltas is not None and callable(unsubscribe):
+            unsubscribe(run_id, deltas)
 
     yield "data: [DONE]\n\n"
 
 
+def _step_delta_event(payload: dict[str, Any]) -> str:
+    return f"event: step.delta\ndata: {json.dumps(payload)}\n\n"
+
+
 @router.post("/v1/agents/runs", response_model=AgentRunResponse, status_code=201)
 async def create_agent_run(
     body: AgentRunCreateRequest,
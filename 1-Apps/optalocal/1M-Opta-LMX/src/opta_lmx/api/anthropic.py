@@ -21,6 +21,7 @@ from starlette.responses import Response
 
 from opta_lmx.api.deps import Engine, Metrics, Presets, Router, verify_inference_key
 from opta_lmx.inference.schema import ChatMessage
+from opta_lmx.inference.sse_encoder import DELTA, SSEFrameTemplate
 from opta_lmx.monitoring.metrics import MetricsCollector, RequestMetric
 from opta_lmx.presets.manager import PRESET_PREFIX
 
@@ -157,6 +158,16 @@ def _anthropic_error(
 
 # ─── Streaming ────────────────────────────────────────────────────────────────
 
+# Text deltas carry no per-request fields, so one template serves every stream.
+_TEXT_DELTA_FRAME = SSEFrameTemplate.from_payload(
+    {
+        "type": "content_block_delta",
+        "index": 0,
+        "delta": {"type": "text_delta", "text": DELTA},
+    },
+    event="content_block_delta",
+)
+
 
 async def _anthropic_sse_stream(
     token_stream: AsyncIterator[str],
@@ -199,12 +210,7 @@ async def _anthropic_sse_stream(
     try:
         async for token in token_stream:
             output_tokens += 1
-            delta = {
-                "type": "content_block_delta",
-                "index": 0,
-                "delta": {"type": "text_delta", "text": token},
-            }
-            yield f"event: content_block_delta\ndata: {json.dumps(delta)}\n\n"
+            yield _TEXT_DELTA_FRAME.encode(token)
     except Exception:
         error_occurred = True
         raise
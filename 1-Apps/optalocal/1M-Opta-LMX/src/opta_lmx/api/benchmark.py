@@ -7,7 +7,7 @@ import logging
 import statistics
 import time
 from datetime import UTC, datetime
-from typing import Any, Literal, cast
+from typing import Annotated, Any, Literal, cast
 
 from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel, Field
@@ -20,6 +20,7 @@ from opta_lmx.monitoring.benchmark import (
     BenchmarkResult,
     BenchmarkResultStore,
     BenchmarkRunStats,
+    LoadTestSLO,
     classify_coherence,
     compute_repetition_ratio,
 )
@@ -42,6 +43,34 @@ class BenchmarkRunRequest(BaseModel):
     warmup_runs: int = Field(1, ge=0, le=3)
 
 
+class LoadTestWorkloadItem(BaseModel):
+    prompt: str = Field(..., min_length=1)
+    max_tokens: int = Field(128, ge=1, le=4096)
+
+
+class LoadTestRequest(BaseModel):
+    model_id: str
+    target: Literal["engine", "simulated"] = Field(
+        "engine", description="'simulated' exercises the harness without a model."
+    )
+    arrival: Literal["closed", "poisson", "constant"] = "closed"
+    concurrency: list[Annotated[int, Field(ge=1, le=512)]] = Field(
+        default_factory=lambda: [1, 8, 32], min_length=1
+    )
+    rate_rps: list[Annotated[float, Field(gt=0, le=1000)]] = Field(
+        default_factory=lambda: [1.0, 2.0, 4.0], min_length=1
+    )
+    requests_per_point: int = Field(32, ge=1, le=2000)
+    max_tokens: int = Field(128, ge=1, le=4096)
+    workload: list[LoadTestWorkloadItem] | None = Field(
+        None, description="Replayed trace; defaults to a mixed prompt-length workload."
+    )
+    slo: LoadTestSLO = Field(default_factory=LoadTestSLO)
+    temperature: float = Field(0.0, ge=0.0, le=2.0)
+    seed: int = 0
+    save: bool = True
+
+
 def _percentile(values: list[float], p: float) -> float:
     if not values:
         return 0.0
@@ -254,6 +283,57 @@ async def run_benchmark(
     return result.model_dump()
 
 
+@router.post("/admin/benchmark/loadtest")
+async def run_load_test(
+    request_body: LoadTestRequest,
+    request: Request,
+    _auth: AdminAuth,
+    engine: Engine,
+) -> dict[str, Any]:
+    """Closed- or open-loop load test with latency percentiles and SLO goodput."""
+    from opta_lmx.monitoring import loadgen
+
+    target: loadgen.LoadTarget
+    if request_body.target == "simulated":
+        target = loadgen.SimulatedTarget()
+        backend = "simulated"
+    else:
+        if not engine.is_model_loaded(request_body.model_id):
+            raise HTTPException(status_code=409, detail="model_not_loaded")
+        target = loadgen.EngineTarget(
+            engine, request_body.model_id, temperature=request_body.temperature
+        )
+        backend = engine.get_loaded_backend_label(request_body.model_id) or "unknown"
+
+    items = (
+        [loadgen.WorkloadItem(i.prompt, i.max_tokens) for i in request_body.workload]
+        if request_body.workload
+        else loadgen.mixed_workload(request_body.max_tokens)
+    )
+    report = await loadgen.run_load_test(
+        target,
+        items,
+        arrival=request_body.arrival,
+        concurrency_levels=request_body.concurrency,
+        rate_levels=request_body.rate_rps,
+        requests_per_point=request_body.requests_per_point,
+        slo=request_body.slo,
+        seed=request_body.seed,
+        workload="trace" if request_body.workload else "mixed",
+    )
+    result = loadgen.report_to_benchmark_result(
+        report,
+        model_id=request_body.model_id,
+        backend=backend,
+        hardware=await asyncio.to_thread(_detect_hardware),
+        lmx_version=__version__,
+    )
+    if request_body.save:
+        store: BenchmarkResultStore = request.app.state.benchmark_store
+        store.save(result)
+    return result.model_dump()
+
+
 @router.get("/admin/benchmark/results")
 async def get_benchmark_results(
     request: Request,
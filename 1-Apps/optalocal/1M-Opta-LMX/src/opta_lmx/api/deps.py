@@ -7,6 +7,7 @@ Depends() injection pattern.
 
 from __future__ import annotations
 
+import hashlib
 import secrets
 from typing import Annotated, cast
 
@@ -14,6 +15,7 @@ from fastapi import Depends, Header, HTTPException, Query, Request
 
 from opta_lmx.agents.runtime import AgentsRuntime
 from opta_lmx.helpers.client import HelperNodeClient
+from opta_lmx.helpers.pool import HelperNodePool
 from opta_lmx.inference.embedding_engine import EmbeddingEngine
 from opta_lmx.inference.engine import InferenceEngine
 from opta_lmx.manager.memory import MemoryMonitor
@@ -79,12 +81,12 @@ def get_embedding_engine(request: Request) -> EmbeddingEngine | None:
     return getattr(request.app.state, "embedding_engine", None)
 
 
-def get_remote_embedding(request: Request) -> HelperNodeClient | None:
+def get_remote_embedding(request: Request) -> HelperNodeClient | HelperNodePool | None:
     """Get the helper node embedding client, or None if not configured."""
     return getattr(request.app.state, "remote_embedding", None)
 
 
-def get_remote_reranking(request: Request) -> HelperNodeClient | None:
+def get_remote_reranking(request: Request) -> HelperNodeClient | HelperNodePool | None:
     """Get the helper node reranking client, or None if not configured."""
     return getattr(request.app.state, "remote_reranking", None)
 
@@ -143,6 +145,12 @@ def verify_admin_key(
         raise HTTPException(status_code=403, detail="Invalid or missing admin key")
 
 
+def _key_principal(credential: str) -> str:
+    """Rate-limit principal for an accepted API key, without storing the key itself."""
+    digest = hashlib.blake2b(credential.encode("utf-8"), digest_size=12).hexdigest()
+    return f"key:{digest}"
+
+
 def verify_inference_key(
     request: Request,
     authorization: str | None = Header(None),
@@ -157,6 +165,9 @@ def verify_inference_key(
          Otherwise fall through to API key check.
     2. Check bearer token / X-Api-Key against inference_api_key.
        If inference_api_key is None (LAN mode), allow through.
+
+    The credential that was actually accepted is recorded on
+    request.state.inference_principal for per-principal token budgets.
     """
     jwt_enabled: bool = getattr(request.app.state, "supabase_jwt_enabled", False)
     token: str | None = None
@@ -169,6 +180,7 @@ def verify_inference_key(
             result = verifier.verify(token)
             if result.valid:
                 request.state.supabase_user_id = result.user_id
+                request.state.inference_principal = f"sub:{result.user_id}"
                 return
             # JWT failed
             jwt_require: bool = getattr(request.app.state, "supabase_jwt_require", False)
@@ -182,15 +194,18 @@ def verify_inference_key(
 
     candidate = token or x_api_key
     if candidate is not None and secrets.compare_digest(candidate, inference_api_key):
+        request.state.inference_principal = _key_principal(candidate)
         return
 
     # Allow admin key to be used for inference routes
     admin_key: str | None = getattr(request.app.state, "admin_key", None)
     if admin_key is not None:
         if candidate is not None and secrets.compare_digest(candidate, admin_key):
+            request.state.inference_principal = _key_principal(candidate)
             return
         x_admin_key = request.headers.get("x-admin-key")
         if x_admin_key is not None and secrets.compare_digest(x_admin_key, admin_key):
+            request.state.inference_principal = _key_principal(x_admin_key)
             return
 
     raise HTTPException(status_code=401, detail="Invalid or missing API key")
@@ -217,8 +232,8 @@ Manager = Annotated[ModelManager, Depends(get_model_manager)]
 Presets = Annotated[PresetManager, Depends(get_preset_manager)]
 Events = Annotated[EventBus, Depends(get_event_bus)]
 Embeddings = Annotated[EmbeddingEngine | None, Depends(get_embedding_engine)]
-RemoteEmbedding = Annotated[HelperNodeClient | None, Depends(get_remote_embedding)]
-RemoteReranking = Annotated[HelperNodeClient | None, Depends(get_remote_reranking)]
+RemoteEmbedding = Annotated[HelperNodeClient | HelperNodePool | None, Depends(get_remote_embedding)]
+RemoteReranking = Annotated[HelperNodeClient | HelperNodePool | None, Depends(get_remote_reranking)]
 SessionStoreDep = Annotated[SessionStore, Depends(get_session_store)]
 RagStore = Annotated[VectorStore | None, Depends(get_rag_store)]
 RerankerDep = Annotated[RerankerEngine | None, Depends(get_reranker_engine)]
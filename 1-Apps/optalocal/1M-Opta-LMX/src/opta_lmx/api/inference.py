@@ -15,11 +15,17 @@ from starlette.responses import Response
 
 from opta_lmx.api.deps import Embeddings, Engine, Metrics, Presets, Router, verify_inference_key
 from opta_lmx.api.errors import internal_error, model_not_found, openai_error
-from opta_lmx.api.rate_limit import _chat_completions_limit, limiter
+from opta_lmx.api.rate_limit import (
+    TokenBudgetExceededError,
+    _chat_completions_limit,
+    limiter,
+    reserve_tokens,
+)
 from opta_lmx.api.stream_handlers import (
     _chat_completions_sse_stream_n,
     _counting_stream,
     _legacy_completions_sse_stream,
+    _prime_stream,
     _responses_sse_stream,
 )
 from opta_lmx.api.validation import (
@@ -27,6 +33,7 @@ from opta_lmx.api.validation import (
     _parse_responses_input_messages,
     _parse_responses_max_tokens,
 )
+from opta_lmx.inference.coalescing import StreamCoalescer
 from opta_lmx.inference.context import estimate_prompt_tokens as _estimate_prompt_tokens
 from opta_lmx.inference.schema import (
     ChatCompletionRequest,
@@ -39,7 +46,7 @@ from opta_lmx.inference.streaming import format_sse_stream, format_sse_tool_stre
 from opta_lmx.inference.tool_parser import StreamChunk, wrap_stream_with_tool_parsing
 from opta_lmx.monitoring.metrics import RequestMetric
 from opta_lmx.presets.manager import PRESET_PREFIX
-from opta_lmx.proxy.keychain_reader import get_subscription_token
+from opta_lmx.proxy.keychain_reader import aget_subscription_token
 from opta_lmx.proxy.subscription_proxy import proxy_chat_completion
 from opta_lmx.proxy.subscription_providers import resolve_subscription_route
 
@@ -112,6 +119,38 @@ def _resolve_serving_lane_and_priority(
     return serving_lane, priority
 
 
+def _token_budget_exceeded(exc: TokenBudgetExceededError) -> JSONResponse:
+    """429 for a principal whose token bucket cannot cover the request yet."""
+    response = openai_error(
+        status_code=429,
+        message=str(exc),
+        error_type="rate_limit_error",
+        code="rate_limit_exceeded",
+    )
+    response.headers["Retry-After"] = str(exc.retry_after_sec)
+    return response
+
+
+def _busy_retry_after(exc: RuntimeError) -> str:
+    """Retry-After for a busy rejection: admission control's drain estimate, else 5s."""
+    return str(getattr(exc, "retry_after_sec", 5))
+
+
+def _server_busy(exc: RuntimeError) -> JSONResponse:
+    """429 for a request shed by admission control or the slot timeout."""
+    return JSONResponse(
+        status_code=429,
+        content={
+            "error": {
+                "message": str(exc),
+                "type": "server_error",
+                "code": "rate_limit_exceeded",
+            },
+        },
+        headers={"Retry-After": _busy_retry_after(exc)},
+    )
+
+
 router = APIRouter(dependencies=[Depends(verify_inference_key)])
 
 
@@ -132,10 +171,13 @@ async def chat_completions(
     x_openclaw_agent_id: str | None = Header(None),
     x_serving_lane: str | None = Header(None),
     x_priority: str | None = Header(None),
+    x_request_timeout: float | None = Header(None, gt=0),
 ) -> Response:
     """OpenAI-compatible chat completion.
 
-    Supports both streaming (SSE) and non-streaming modes.
+    Supports both streaming (SSE) and non-streaming modes. ``X-Request-Timeout``
+    (seconds) lets admission control reject up front a request that is
+    predicted to miss the client's deadline.
     """
     # Resolve preset (e.g. "preset:code-assistant") — applies defaults + swaps model ID
     if body.model.startswith(PRESET_PREFIX):
@@ -152,7 +194,7 @@ async def chat_completions(
     _sub_match = resolve_subscription_route(body.model)
     if _sub_match is not None:
         _sub_route, _sub_model = _sub_match
-        _sub_token = get_subscription_token(_sub_route.provider_id)
+        _sub_token = await aget_subscription_token(_sub_route.provider_id)
         if _sub_token is None:
             return openai_error(
                 status_code=401,
@@ -172,6 +214,7 @@ async def chat_completions(
             token=_sub_token,
             request_body=_proxy_body,
             stream=body.stream,
+            clients=getattr(request.app.state, "subscription_clients", None),
         )
         if body.stream and _resp_stream is not None:
             return StreamingResponse(_resp_stream, media_type="text/event-stream")
@@ -183,9 +226,12 @@ async def chat_completions(
         )
     # ── End subscription provider intercept ──────────────────────────────────
 
+    # x-openclaw-agent-id is the OpenClaw equivalent of X-Client-ID
+    effective_client_id = x_client_id or x_openclaw_agent_id
+
     # Resolve alias (e.g. "auto", "code") to a real loaded model ID
     loaded_ids = [m.model_id for m in engine.get_loaded_models()]
-    resolved_model = task_router.resolve(body.model, loaded_ids)
+    resolved_model = task_router.resolve(body.model, loaded_ids, client_id=effective_client_id)
 
     # Check model is loaded
     if not engine.is_model_loaded(resolved_model):
@@ -205,17 +251,41 @@ async def chat_completions(
             param="x-serving-lane",
             code="invalid_header",
         )
-    # x-openclaw-agent-id is the OpenClaw equivalent of X-Client-ID
-    effective_client_id = x_client_id or x_openclaw_agent_id
+
+    # Approximate prompt tokens for metrics and token budgets (4 chars ≈ 1 token)
+    est_prompt_tokens = max(1, _estimate_prompt_tokens(body.messages))
+    try:
+        reservation = reserve_tokens(
+            request, prompt_tokens=est_prompt_tokens, max_tokens=body.max_tokens, n=body.n
+        )
+    except TokenBudgetExceededError as e:
+        return _token_budget_exceeded(e)
 
     if body.stream:
         request_id = f"chatcmpl-{secrets.token_urlsafe(16)}"
         created = int(time.time())
         include_logprobs_placeholder = _chat_stream_include_logprobs_placeholder(body)
         try:
-            # Approximate prompt tokens for metrics (4 chars ≈ 1 token)
-            est_prompt_tokens = max(1, _estimate_prompt_tokens(body.messages))
             include_usage = bool(body.stream_options and body.stream_options.get("include_usage"))
+            # Primed so admission rejections become a 429 before any SSE is sent.
+            token_stream = await _prime_stream(
+                engine.stream_generate(
+                    model_id=resolved_model,
+                    messages=body.messages,
+                    temperature=body.temperature,
+                    max_tokens=body.max_tokens,
+                    top_p=body.top_p,
+                    stop=[body.stop] if isinstance(body.stop, str) else body.stop,
+                    tools=body.tools,
+                    response_format=body.response_format,
+                    frequency_penalty=body.frequency_penalty,
+                    presence_penalty=body.presence_penalty,
+                    priority=priority,
+                    num_ctx=body.num_ctx,
+                    client_id=effective_client_id,
+                    deadline_sec=x_request_timeout,
+                )
+            )
 
             if body.n > 1:
                 return StreamingResponse(
@@ -232,25 +302,12 @@ async def chat_completions(
                         priority=priority,
                         client_id=effective_client_id,
                         include_logprobs_placeholder=include_logprobs_placeholder,
+                        reservation=reservation,
+                        first_stream=token_stream,
                     ),
                     media_type="text/event-stream",
                 )
 
-            token_stream = engine.stream_generate(
-                model_id=resolved_model,
-                messages=body.messages,
-                temperature=body.temperature,
-                max_tokens=body.max_tokens,
-                top_p=body.top_p,
-                stop=[body.stop] if isinstance(body.stop, str) else body.stop,
-                tools=body.tools,
-                response_format=body.response_format,
-                frequency_penalty=body.frequency_penalty,
-                presence_penalty=body.presence_penalty,
-                priority=priority,
-                num_ctx=body.num_ctx,
-                client_id=effective_client_id,
-            )
             # Wrap stream to count tokens and record final metrics
             counted_stream = _counting_stream(
                 token_stream,
@@ -259,6 +316,7 @@ async def chat_completions(
                 est_prompt_tokens,
                 metrics,
                 client_id=effective_client_id,
+                reservation=reservation,
             )
 
             if body.tools:
@@ -277,8 +335,14 @@ async def chat_completions(
                     include_logprobs_placeholder=include_logprobs_placeholder,
                 )
             else:
+                coalescer: StreamCoalescer | None = getattr(
+                    request.app.state, "stream_coalescer", None
+                )
                 sse_stream = format_sse_stream(
-                    cast(AsyncIterator[str], counted_stream),
+                    cast(
+                        AsyncIterator[str],
+                        coalescer.wrap(counted_stream) if coalescer else counted_stream,
+                    ),
                     request_id,
                     resolved_model,
                     include_usage=include_usage,
@@ -288,7 +352,8 @@ async def chat_completions(
                 )
             return StreamingResponse(sse_stream, media_type="text/event-stream")
         except Exception as e:
-            logger.error("stream_error", extra={"model": resolved_model, "error": str(e)})
+            if reservation is not None:
+                reservation.settle(0)
             metrics.record(
                 RequestMetric(
                     model_id=resolved_model,
@@ -300,8 +365,12 @@ async def chat_completions(
                     client_id=effective_client_id,
                 )
             )
+            if isinstance(e, RuntimeError) and "Server is busy" in str(e):
+                return _server_busy(e)
+            logger.error("stream_error", extra={"model": resolved_model, "error": str(e)})
             return internal_error(str(e))
     else:
+        used_tokens = 0
         try:
             response = await engine.generate(
                 model_id=resolved_model,
@@ -317,6 +386,7 @@ async def chat_completions(
                 priority=priority,
                 num_ctx=body.num_ctx,
                 client_id=effective_client_id,
+                deadline_sec=x_request_timeout,
             )
             choices = [response.choices[0].model_dump()]
             prompt_tokens_total = response.usage.prompt_tokens
@@ -343,6 +413,7 @@ async def chat_completions(
                 choices.append(choice)
                 prompt_tokens_total += alt.usage.prompt_tokens
                 completion_tokens_total += alt.usage.completion_tokens
+            used_tokens = prompt_tokens_total + completion_tokens_total
 
             # Compatibility: accept logprobs/top_logprobs requests, returning null
             # placeholders when backend token-level stats are unavailable.
@@ -382,17 +453,7 @@ async def chat_completions(
                         client_id=effective_client_id,
                     )
                 )
-                return JSONResponse(
-                    status_code=429,
-                    content={
-                        "error": {
-                            "message": err_msg,
-                            "type": "server_error",
-                            "code": "rate_limit_exceeded",
-                        },
-                    },
-                    headers={"Retry-After": "5"},
-                )
+                return _server_busy(e)
             logger.error("completion_error", extra={"model": resolved_model, "error": err_msg})
             metrics.record(
                 RequestMetric(
@@ -420,6 +481,9 @@ async def chat_completions(
                 )
             )
             return internal_error(str(e))
+        finally:
+            if reservation is not None:
+                reservation.settle(used_tokens)
 
 
 @router.get("/v1/models")
@@ -528,8 +592,9 @@ async def responses_endpoint(
             code="invalid_input",
         )
 
+    effective_client_id = x_client_id or x_openclaw_agent_id
     loaded_ids = [m.model_id for m in engine.get_loaded_models()]
-    resolved_model = task_router.resolve(model_id, loaded_ids)
+    resolved_model = task_router.resolve(model_id, loaded_ids, client_id=effective_client_id)
     try:
         _, priority = _resolve_serving_lane_and_priority(
             route="/v1/responses",
@@ -544,7 +609,6 @@ async def responses_endpoint(
             param="x-serving-lane",
             code="invalid_header",
         )
-    effective_client_id = x_client_id or x_openclaw_agent_id
 
     if not engine.is_model_loaded(resolved_model):
         return model_not_found(model_id)
@@ -560,8 +624,37 @@ async def responses_endpoint(
             code="invalid_input",
         )
     request_id = f"resp-{secrets.token_urlsafe(16)}"
+    est_prompt_tokens = max(1, _estimate_prompt_tokens(messages))
+    try:
+        reservation = reserve_tokens(
+            request, prompt_tokens=est_prompt_tokens, max_tokens=max_tokens
+        )
+    except TokenBudgetExceededError as e:
+        return _token_budget_exceeded(e)
 
     if stream:
+        try:
+            token_stream = await _prime_stream(
+                engine.stream_generate(
+                    model_id=resolved_model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    top_p=top_p,
+                    stop=None,
+                    tools=tools,
+                    response_format=None,
+                    priority=priority,
+                    client_id=effective_client_id,
+                )
+            )
+        except Exception as e:
+            if reservation is not None:
+                reservation.settle(0)
+            if isinstance(e, RuntimeError) and "Server is busy" in str(e):
+                return _server_busy(e)
+            logger.error("responses_error", extra={"model": resolved_model, "error": str(e)})
+            return internal_error(str(e))
         sse = _responses_sse_stream(
             engine=engine,
             model_id=resolved_model,
@@ -573,10 +666,20 @@ async def responses_endpoint(
             tools=tools,
             priority=priority,
             client_id=effective_client_id,
+            token_stream=_counting_stream(
+                token_stream,
+                model_id=resolved_model,
+                start_time=time.monotonic(),
+                prompt_tokens=est_prompt_tokens,
+                metrics=None,
+                client_id=effective_client_id,
+                reservation=reservation,
+            ),
         )
         return StreamingResponse(sse, media_type="text/event-stream")
 
     # Non-streaming: call generate and return response object
+    used_tokens = 0
     try:
         response = await engine.generate(
             model_id=resolved_model,
@@ -590,6 +693,7 @@ async def responses_endpoint(
             priority=priority,
             client_id=effective_client_id,
         )
+        used_tokens = response.usage.prompt_tokens + response.usage.completion_tokens
         output_text = response.choices[0].message.content or ""
         return JSONResponse(
             content={
@@ -603,22 +707,15 @@ async def responses_endpoint(
     except RuntimeError as e:
         err_msg = str(e)
         if "Server is busy" in err_msg:
-            return JSONResponse(
-                status_code=429,
-                content={
-                    "error": {
-                        "message": err_msg,
-                        "type": "server_error",
-                        "code": "rate_limit_exceeded",
-                    },
-                },
-                headers={"Retry-After": "5"},
-            )
+            return _server_busy(e)
         logger.error("responses_error", extra={"model": resolved_model, "error": err_msg})
         return internal_error(err_msg)
     except Exception as e:
         logger.error("responses_error", extra={"model": resolved_model, "error": str(e)})
         return internal_error(str(e))
+    finally:
+        if reservation is not None:
+            reservation.settle(used_tokens)
 
 
 @router.post("/v1/completions", response_model=None)
@@ -635,8 +732,9 @@ async def legacy_completions(
     x_priority: str | None = Header(None),
 ) -> Response:
     """OpenAI-compatible legacy /v1/completions endpoint."""
+    effective_client_id = x_client_id or x_openclaw_agent_id or body.user
     loaded_ids = [m.model_id for m in engine.get_loaded_models()]
-    resolved_model = task_router.resolve(body.model, loaded_ids)
+    resolved_model = task_router.resolve(body.model, loaded_ids, client_id=effective_client_id)
     if not engine.is_model_loaded(resolved_model):
         return model_not_found(body.model)
 
@@ -664,14 +762,70 @@ async def legacy_completions(
             param="x-serving-lane",
             code="invalid_header",
         )
-    effective_client_id = x_client_id or x_openclaw_agent_id or body.user
     stop = [body.stop] if isinstance(body.stop, str) else body.stop
+    # Every prompt is charged as the longest one; the refund settles the difference.
+    est_prompt_tokens = max(
+        _estimate_prompt_tokens([ChatMessage(role="user", content=prompt)]) for prompt in prompts
+    )
+    try:
+        reservation = reserve_tokens(
+            request,
+            prompt_tokens=max(1, est_prompt_tokens),
+            max_tokens=body.max_tokens,
+            n=body.n * len(prompts),
+        )
+    except TokenBudgetExceededError as e:
+        return _token_budget_exceeded(e)
 
     if body.stream:
         request_id = f"cmpl-{secrets.token_urlsafe(16)}"
         created = int(time.time())
         start_time = time.monotonic()
 
+        def start_choice(messages: list[ChatMessage]) -> AsyncIterator[str]:
+            return engine.stream_generate(
+                model_id=resolved_model,
+                messages=messages,
+                temperature=body.temperature,
+                max_tokens=body.max_tokens,
+                top_p=body.top_p,
+                stop=stop,
+                tools=None,
+                response_format=None,
+                frequency_penalty=body.frequency_penalty,
+                presence_penalty=body.presence_penalty,
+                priority=priority,
+                num_ctx=body.num_ctx,
+                client_id=effective_client_id,
+            )
+
+        # Start the first choice before responding, so a shed request gets a 429.
+        try:
+            first_stream = await _prime_stream(
+                start_choice([ChatMessage(role="user", content=prompts[0])])
+            )
+        except Exception as e:
+            if reservation is not None:
+                reservation.settle(0)
+            metrics.record(
+                RequestMetric(
+                    model_id=resolved_model,
+                    latency_sec=time.monotonic() - start_time,
+                    prompt_tokens=0,
+                    completion_tokens=0,
+                    stream=True,
+                    error=True,
+                    client_id=effective_client_id,
+                )
+            )
+            if isinstance(e, RuntimeError) and "Server is busy" in str(e):
+                return _server_busy(e)
+            logger.error(
+                "legacy_completion_stream_error",
+                extra={"model": resolved_model, "error": str(e)},
+            )
+            return internal_error(str(e))
+
         async def legacy_stream() -> AsyncIterator[str]:
             choice_index = 0
             usage_totals: dict[str, int] = {"prompt_tokens": 0, "completion_tokens": 0}
@@ -680,21 +834,7 @@ async def legacy_completions(
                     for _ in range(body.n):
                         messages = [ChatMessage(role="user", content=prompt)]
                         est_prompt_tokens = max(1, _estimate_prompt_tokens(messages))
-                        token_stream = engine.stream_generate(
-                            model_id=resolved_model,
-                            messages=messages,
-                            temperature=body.temperature,
-                            max_tokens=body.max_tokens,
-                            top_p=body.top_p,
-                            stop=stop,
-                            tools=None,
-                            response_format=None,
-                            frequency_penalty=body.frequency_penalty,
-                            presence_penalty=body.presence_penalty,
-                            priority=priority,
-                            num_ctx=body.num_ctx,
-                            client_id=effective_client_id,
-                        )
+                        token_stream = first_stream if choice_index == 0 else start_choice(messages)
                         counted_stream = _counting_stream(
                             token_stream=token_stream,
                             model_id=resolved_model,
@@ -747,6 +887,11 @@ async def legacy_completions(
                     )
                 )
                 yield "data: [DONE]\n\n"
+            finally:
+                if reservation is not None:
+                    reservation.settle(
+                        usage_totals["prompt_tokens"] + usage_totals["completion_tokens"]
+                    )
 
         try:
             return StreamingResponse(
@@ -854,17 +999,7 @@ async def legacy_completions(
                     client_id=effective_client_id,
                 )
             )
-            return JSONResponse(
-                status_code=429,
-                content={
-                    "error": {
-                        "message": err_msg,
-                        "type": "server_error",
-                        "code": "rate_limit_exceeded",
-                    },
-                },
-                headers={"Retry-After": "5"},
-            )
+            return _server_busy(e)
         metrics.record(
             RequestMetric(
                 model_id=resolved_model,
@@ -891,3 +1026,6 @@ async def legacy_completions(
         )
         logger.error("legacy_completion_error", extra={"model": resolved_model, "error": str(e)})
         return internal_error(str(e))
+    finally:
+        if reservation is not None:
+            reservation.settle(prompt_tokens_total + completion_tokens_total)
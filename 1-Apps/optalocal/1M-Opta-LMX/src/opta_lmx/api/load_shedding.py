@@ -1,4 +1,11 @@
-"""Load shedding middleware — reject requests when memory is critically high."""
+"""Load shedding middleware — reject requests when memory is critically high.
+
+Queue-depth and latency-based shedding happens per request in the engine's
+:class:`~opta_lmx.inference.admission.AdmissionController`; this middleware
+only guards memory, but borrows the admission backlog estimate for its
+``Retry-After`` so clients back off for as long as in-flight work needs to
+drain.
+"""
 
 from __future__ import annotations
 
@@ -11,6 +18,8 @@ from starlette.types import ASGIApp, Receive, Scope, Send
 logger = logging.getLogger(__name__)
 
 EXEMPT_PATHS = {"/healthz", "/readyz", "/admin/health"}
+# Retry-After when no engine backlog estimate is available.
+DEFAULT_RETRY_AFTER_SEC = 30
 
 
 class _MemoryMonitorLike(Protocol):
@@ -20,12 +29,25 @@ class _MemoryMonitorLike(Protocol):
         """Return memory usage percentage."""
 
 
+class _AdmissionEstimatorLike(Protocol):
+    """Subset of the inference engine used to size ``Retry-After``."""
+
+    def admission_retry_after_sec(self) -> int | None:
+        """Return predicted seconds for queued inference work to drain."""
+
+
 class LoadSheddingMiddleware:
     """Reject requests with 503 when system memory exceeds threshold."""
 
-    def __init__(self, app: ASGIApp, threshold_percent: float = 95.0) -> None:
+    def __init__(
+        self,
+        app: ASGIApp,
+        threshold_percent: float = 95.0,
+        default_retry_after_sec: int = DEFAULT_RETRY_AFTER_SEC,
+    ) -> None:
         self.app = app
         self.threshold = threshold_percent
+        self.default_retry_after_sec = default_retry_after_sec
 
     def _get_memory_percent(self, scope: Scope) -> float:
         """Get current memory usage percent, preferring app state monitor over psutil."""
@@ -36,25 +58,37 @@ class LoadSheddingMiddleware:
                 return cast(_MemoryMonitorLike, monitor).usage_percent()
         return float(psutil.virtual_memory().percent)
 
+    def _retry_after_sec(self, scope: Scope) -> int:
+        """Predicted backlog drain time from the engine, else the static default."""
+        app = scope.get("app")
+        engine = getattr(getattr(app, "state", None), "engine", None)
+        if callable(getattr(engine, "admission_retry_after_sec", None)):
+            predicted = cast(_AdmissionEstimatorLike, engine).admission_retry_after_sec()
+            if predicted is not None:
+                return predicted
+        return self.default_retry_after_sec
+
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         if scope["type"] == "http":
             path = scope.get("path", "")
             if path not in EXEMPT_PATHS:
                 mem_percent = self._get_memory_percent(scope)
                 if mem_percent >= self.threshold:
+                    retry_after = self._retry_after_sec(scope)
                     logger.warning(
                         "load_shedding_triggered",
                         extra={
                             "memory_percent": mem_percent,
                             "threshold": self.threshold,
                             "path": path,
+                            "retry_after_sec": retry_after,
                         },
                     )
-                    await self._send_503(send)
+                    await self._send_503(send, retry_after)
                     return
         await self.app(scope, receive, send)
 
-    async def _send_503(self, send: Send) -> None:
+    async def _send_503(self, send: Send, retry_after_sec: int) -> None:
         body = (
             b'{"error": {"message": "Server under memory pressure",'
             b' "type": "server_error", "code": "overloaded"}}'
@@ -65,7 +99,7 @@ class LoadSheddingMiddleware:
                 "status": 503,
                 "headers": [
                     [b"content-type", b"application/json"],
-                    [b"retry-after", b"30"],
+                    [b"retry-after", str(retry_after_sec).encode()],
                 ],
             }
         )
@@ -7,6 +7,7 @@ the in-memory vector store for similarity search.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 from typing import Any
@@ -27,8 +28,18 @@ from opta_lmx.api.deps import (
 )
 from opta_lmx.api.errors import internal_error, openai_error
 from opta_lmx.helpers.client import HelperNodeClient, HelperNodeError
+from opta_lmx.helpers.pool import HelperNodePool
+from opta_lmx.inference.context import token_counter
 from opta_lmx.inference.embedding_engine import EmbeddingEngine
+from opta_lmx.rag.assembly import (
+    ContextCandidate,
+    PackedContext,
+    fan_out_search,
+    pack_context,
+    select_diverse,
+)
 from opta_lmx.rag.chunker import chunk_code, chunk_markdown, chunk_text
+from opta_lmx.rag.reranker import rerank_off_loop
 from opta_lmx.rag.store import SearchResult, VectorStore
 from opta_lmx.rag.watch_registry import WatchEntry
 
@@ -141,6 +152,18 @@ class ContextAssemblyRequest(BaseModel):
     max_context_tokens: int = Field(4096, ge=256, le=32768, description="Max total context tokens")
     model: str | None = Field(None, description="Embedding model")
     rerank: bool = Field(False, description="Apply reranking to context assembly results")
+    target_model: str | None = Field(
+        None, description="Model whose tokenizer measures the token budget (default: estimate)"
+    )
+    diversity: float = Field(
+        0.7,
+        ge=0.0,
+        le=1.0,
+        description="MMR trade-off: 1.0 ranks purely by relevance, lower favours novel chunks",
+    )
+    dedup_threshold: float = Field(
+        0.95, gt=0.0, le=1.0, description="Cosine similarity at which chunks count as duplicates"
+    )
 
 
 class ContextAssemblyResponse(BaseModel):
@@ -151,6 +174,10 @@ class ContextAssemblyResponse(BaseModel):
     total_chunks: int
     estimated_tokens: int
     duration_ms: float
+    token_count_method: str = "estimate"
+    candidates: int = 0
+    duplicates_suppressed: int = 0
+    timings_ms: dict[str, float] = Field(default_factory=dict)
 
 
 # ── Helper: embed texts ─────────────────────────────────────────────────
@@ -160,7 +187,7 @@ async def _embed_texts(
     texts: list[str],
     model: str | None,
     embedding_engine: EmbeddingEngine | None,
-    remote_client: HelperNodeClient | None,
+    remote_client: HelperNodeClient | HelperNodePool | None,
 ) -> list[list[float]]:
     """Embed texts using helper node (if available) or local engine."""
     # Try remote first
@@ -345,7 +372,9 @@ async def query_collection(
         if reranker is not None:
             try:
                 doc_texts = [r.document.text for r in results]
-                ranked = reranker.rerank(body.query, doc_texts, top_n=body.rerank_top_k)
+                ranked = await rerank_off_loop(
+                    reranker, body.query, doc_texts, top_n=body.rerank_top_k
+                )
                 # Reorder results based on reranker scores
                 reranked_results = []
                 for entry in ranked:
@@ -420,13 +449,22 @@ async def assemble_context(
 ) -> Response:
     """Assemble RAG context from multiple collections.
 
-    Searches across specified collections, deduplicates, ranks by
-    relevance, and assembles a formatted context string ready for
-    injection into a system or user prompt. Respects token budget.
-    Optionally applies cross-encoder reranking for improved relevance.
+    Searches the collections concurrently, merges the best candidates,
+    optionally reranks them with the cross-encoder, then selects a diverse
+    set by MMR (dropping near-duplicate and overlapping chunks) and packs
+    it into the token budget using the target model's tokenizer. Per-stage
+    latency is reported in ``timings_ms``.
     """
     store = _require_store(rag_store)
     start = time.monotonic()
+    timings: dict[str, float] = {}
+    stage_start = start
+
+    def _lap(stage: str) -> None:
+        nonlocal stage_start
+        now = time.monotonic()
+        timings[stage] = round((now - stage_start) * 1000, 2)
+        stage_start = now
 
     # Embed query once
     try:
@@ -438,100 +476,84 @@ async def assemble_context(
         )
     except RuntimeError as e:
         return internal_error(str(e))
-
-    # If reranking, fetch more candidates per collection
-    fetch_k = body.top_k_per_collection * 5 if body.rerank else body.top_k_per_collection
-
-    # Search each collection
-    all_results: list[tuple[str, SearchResult]] = []
-    for collection in body.collections:
-        results = store.search(
-            collection=collection,
-            query_embedding=query_embeddings[0],
-            top_k=fetch_k,
-            min_score=body.min_score,
-        )
-        for r in results:
-            all_results.append((collection, r))
+    _lap("embed")
+
+    # Over-fetch so MMR (and the reranker, if requested) has room to choose
+    final_k = body.top_k_per_collection * len(set(body.collections))
+    overfetch = 5 if body.rerank else 2
+    candidates = await fan_out_search(
+        store,
+        body.collections,
+        query_embeddings[0],
+        top_k=body.top_k_per_collection * overfetch,
+        min_score=body.min_score,
+        limit=final_k * overfetch,
+    )
+    _lap("search")
 
     # Apply reranking if requested
-    if body.rerank and all_results and reranker is not None:
+    if body.rerank and candidates and reranker is not None:
         try:
-            doc_texts = [r.document.text for collection, r in all_results]
-            top_n = body.top_k_per_collection * len(body.collections)
-            ranked = reranker.rerank(body.query, doc_texts, top_n=top_n)
-            reranked: list[tuple[str, SearchResult]] = []
+            doc_texts = [c.result.document.text for c in candidates]
+            ranked = await rerank_off_loop(reranker, body.query, doc_texts, top_n=len(doc_texts))
+            reranked: list[ContextCandidate] = []
             for entry in ranked:
                 idx = entry["index"]
-                if 0 <= idx < len(all_results):
-                    collection, original = all_results[idx]
+                if 0 <= idx < len(candidates):
+                    original = candidates[idx]
                     reranked.append(
-                        (
-                            collection,
-                            type(original)(
-                                document=original.document,
+                        ContextCandidate(
+                            collection=original.collection,
+                            result=SearchResult(
+                                document=original.result.document,
                                 score=entry["score"],
                             ),
                         )
                     )
-            all_results = reranked
+            candidates = sorted(reranked, key=lambda c: c.result.score, reverse=True)
             logger.info(
                 "rag_context_rerank_applied",
                 extra={
                     "candidates": len(doc_texts),
-                    "reranked": len(all_results),
+                    "reranked": len(candidates),
                 },
             )
         except Exception as e:
             logger.warning("rag_context_rerank_failed_fallback", extra={"error": str(e)})
+        _lap("rerank")
     elif body.rerank and reranker is None:
         logger.warning("rag_context_rerank_requested_but_no_engine")
 
-    # Sort by score descending (cross-collection ranking)
-    all_results.sort(key=lambda x: x[1].score, reverse=True)
-
-    # Assemble context within token budget (~4 chars/token)
-    max_chars = body.max_context_tokens * 4
-    context_parts: list[str] = []
-    sources: list[dict[str, Any]] = []
-    total_chars = 0
-
-    for collection, result in all_results:
-        chunk_text_str = result.document.text
-        # Add header for context source
-        header = f"[Source: {collection}"
-        if result.document.metadata.get("source"):
-            header += f" / {result.document.metadata['source']}"
-        header += f" | relevance: {result.score:.2f}]"
-
-        context_entry = f"{header}\n{chunk_text_str}"
-        entry_chars = len(context_entry) + 2  # +2 for separators
-
-        if total_chars + entry_chars > max_chars:
-            break
-
-        context_parts.append(context_entry)
-        sources.append(
-            {
-                "collection": collection,
-                "id": result.document.id,
-                "score": round(result.score, 4),
-                "metadata": result.document.metadata,
-            }
-        )
-        total_chars += entry_chars
+    selected, suppressed = await asyncio.to_thread(
+        select_diverse,
+        candidates,
+        k=final_k,
+        diversity=body.diversity,
+        dedup_threshold=body.dedup_threshold,
+    )
+    _lap("select")
+
+    def _pack() -> tuple[PackedContext, str]:
+        count_tokens, method = token_counter(body.target_model)
+        return pack_context(
+            selected, max_tokens=body.max_context_tokens, count_tokens=count_tokens
+        ), method
 
-    context = "\n\n---\n\n".join(context_parts)
-    estimated_tokens = max(1, len(context) // 4)
+    packed, token_method = await asyncio.to_thread(_pack)
+    _lap("pack")
     elapsed_ms = (time.monotonic() - start) * 1000
 
     return JSONResponse(
         content=ContextAssemblyResponse(
-            context=context,
-            sources=sources,
-            total_chunks=len(context_parts),
-            estimated_tokens=estimated_tokens,
+            context=packed.context,
+            sources=packed.sources,
+            total_chunks=len(packed.sources),
+            estimated_tokens=packed.tokens,
             duration_ms=round(elapsed_ms, 1),
+            token_count_method=token_method,
+            candidates=len(candidates),
+            duplicates_suppressed=suppressed,
+            timings_ms=timings,
         ).model_dump()
     )
 
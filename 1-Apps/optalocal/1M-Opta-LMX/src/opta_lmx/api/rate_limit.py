@@ -1,19 +1,39 @@
-"""Rate limiting for inference endpoints via slowapi.
+"""Rate limiting for inference endpoints.
 
-The limiter is a module-level singleton. Limits are configured per-endpoint
-via decorators, with dynamic callables that read from app state config.
+Two independent, opt-in layers:
 
-Rate limiting is opt-in: disabled by default, enabled via config.security.rate_limit.enabled.
+- Request-count limits via slowapi. The limiter is a module-level singleton;
+  limits are configured per-endpoint via decorators, with dynamic callables
+  that read from app state config. Enabled via config.security.rate_limit.enabled.
+- Token budgets: chat, legacy and Responses API completions are charged
+  their estimated prompt plus ``max_tokens`` against a per-principal token
+  bucket (the JWT subject or API key that ``verify_inference_key`` accepted,
+  else the client address), and unused tokens are refunded when the request
+  finishes. The buckets are shared by all worker processes on the host (see
+  :class:`~opta_lmx.runtime.token_buckets.SharedTokenBuckets`). Enabled via
+  config.security.rate_limit.token_budget_enabled.
 """
 
 from __future__ import annotations
 
 import contextvars
+import logging
+import math
 from collections.abc import Callable
-from typing import Any, Protocol, TypeVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Protocol, TypeVar
 
 from starlette.requests import Request
 
+from opta_lmx.runtime.token_buckets import SharedTokenBuckets
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+    from opta_lmx.config import LMXConfig
+
+logger = logging.getLogger(__name__)
+
 request_ctx: contextvars.ContextVar[Request] = contextvars.ContextVar("request_ctx")
 _DecoratedFunc = TypeVar("_DecoratedFunc", bound=Callable[..., Any])
 
@@ -135,3 +155,105 @@ def _embeddings_limit(key: str) -> str:
     except LookupError:
         pass
     return "60/minute"
+
+
+# ─── Token budgets ───────────────────────────────────────────────────────────
+
+TOKEN_BUCKETS_FILE = "token-buckets.bin"
+# Output budget charged when the client sets no max_tokens.
+DEFAULT_MAX_TOKENS_CHARGE = 1024
+
+
+class TokenBudgetExceededError(Exception):
+    """The principal's token bucket cannot cover the request yet."""
+
+    def __init__(self, retry_after_sec: int) -> None:
+        super().__init__(f"Token rate limit exceeded. Retry after {retry_after_sec}s.")
+        self.retry_after_sec = retry_after_sec
+
+
+@dataclass
+class TokenReservation:
+    """Tokens taken from a bucket up front, settled once usage is known."""
+
+    buckets: SharedTokenBuckets
+    key: str
+    charged: int
+    capacity: float
+    refill_per_sec: float
+    settled: bool = False
+
+    def settle(self, used_tokens: int) -> None:
+        """Refund whatever the request did not use. Later calls are no-ops."""
+        if self.settled:
+            return
+        self.settled = True
+        self.buckets.refund(
+            self.key,
+            self.charged - max(0, used_tokens),
+            capacity=self.capacity,
+            refill_per_sec=self.refill_per_sec,
+        )
+
+
+def configure_token_budget(app: FastAPI, config: LMXConfig) -> None:
+    """Attach the shared token buckets to ``app.state`` when enabled."""
+    rl = config.security.rate_limit
+    if not rl.token_budget_enabled:
+        return
+    path = rl.token_state_path or config.server.ipc_dir.expanduser() / TOKEN_BUCKETS_FILE
+    app.state.token_buckets = SharedTokenBuckets(path, slots=rl.token_state_slots)
+
+
+def _principal_key(request: Request) -> str:
+    """Bucket key: the principal auth verified, else the client address.
+
+    Unverified credentials are ignored so that a client in LAN mode cannot
+    mint a fresh bucket per request by sending a new bearer token.
+    """
+    principal = getattr(request.state, "inference_principal", None)
+    if principal:
+        return str(principal)
+    return f"ip:{_remote_address(request)}"
+
+
+def reserve_tokens(
+    request: Request,
+    *,
+    prompt_tokens: int,
+    max_tokens: int | None,
+    n: int = 1,
+) -> TokenReservation | None:
+    """Charge a request's worst-case token cost to its principal's bucket.
+
+    Returns:
+        The reservation to settle with actual usage, or None when token
+        budgets are disabled.
+
+    Raises:
+        TokenBudgetExceededError: The bucket cannot cover the charge yet.
+    """
+    buckets: SharedTokenBuckets | None = getattr(request.app.state, "token_buckets", None)
+    if buckets is None:
+        return None
+    rl = request.app.state.config.security.rate_limit
+    capacity = float(rl.token_burst or rl.tokens_per_minute)
+    refill_per_sec = rl.tokens_per_minute / 60.0
+    charge = max(1, n) * (prompt_tokens + (max_tokens or DEFAULT_MAX_TOKENS_CHARGE))
+    key = _principal_key(request)
+
+    wait_sec = buckets.try_acquire(key, charge, capacity=capacity, refill_per_sec=refill_per_sec)
+    if wait_sec > 0:
+        retry_after = max(1, math.ceil(min(wait_sec, 3600.0)))
+        logger.info(
+            "rate_limit_token_budget_exceeded",
+            extra={"principal": key, "charge": charge, "retry_after_sec": retry_after},
+        )
+        raise TokenBudgetExceededError(retry_after)
+    return TokenReservation(
+        buckets=buckets,
+        key=key,
+        charged=int(min(charge, capacity)),
+        capacity=capacity,
+        refill_per_sec=refill_per_sec,
+    )
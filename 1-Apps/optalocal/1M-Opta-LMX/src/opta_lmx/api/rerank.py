@@ -21,6 +21,7 @@ from starlette.responses import Response
 from opta_lmx.api.deps import RemoteReranking, RerankerDep, verify_inference_key
 from opta_lmx.api.errors import openai_error
 from opta_lmx.helpers.client import HelperNodeError
+from opta_lmx.rag.reranker import rerank_off_loop
 
 logger = logging.getLogger(__name__)
 
@@ -186,7 +187,7 @@ async def rerank_documents(
         )
 
     try:
-        local_results = rerank_fn(body.query, body.documents, top_n=top_n)
+        local_results = await rerank_off_loop(reranker, body.query, body.documents, top_n)
     except Exception as e:
         logger.warning("local_rerank_failed", extra={"error": str(e)})
         return openai_error(
@@ -54,13 +54,14 @@ async def search_sessions(
     store: SessionStoreDep,
     q: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(20, ge=1, le=100, description="Max results"),
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
 ) -> list[SessionSummary]:
-    """Search sessions by title, model, tags, and first user message.
+    """Search sessions by title, model, tags, and message text.
 
     NOTE: This route MUST be defined before ``/{session_id}`` to prevent
     FastAPI from interpreting ``"search"`` as a session ID.
     """
-    return await asyncio.to_thread(store.search_sessions, q, limit=limit)
+    return await asyncio.to_thread(store.search_sessions, q, limit=limit, offset=offset)
 
 
 @router.get("/{session_id}", response_model=SessionFull)
@@ -10,8 +10,10 @@ from dataclasses import dataclass
 from typing import Any, cast
 
 from opta_lmx.api.deps import Engine
+from opta_lmx.api.rate_limit import TokenReservation
 from opta_lmx.inference.engine import InferenceEngine
 from opta_lmx.inference.schema import ChatCompletionRequest, ChatMessage
+from opta_lmx.inference.sse_encoder import DELTA, SSEFrameTemplate
 from opta_lmx.inference.streaming import format_sse_stream, format_sse_tool_stream
 from opta_lmx.inference.tool_parser import StreamChunk, wrap_stream_with_tool_parsing
 from opta_lmx.monitoring.metrics import MetricsCollector, RequestMetric
@@ -31,6 +33,36 @@ class _StreamEndMarker:
     hit_max_tokens: bool = False
 
 
+async def _prime_stream(token_stream: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Start ``token_stream`` and wait for its first token.
+
+    Admission control runs when generation starts, so priming the stream
+    before returning a ``StreamingResponse`` turns a shed request into a 429
+    with ``Retry-After`` instead of an error inside a 200 stream.
+
+    Raises:
+        Exception: Whatever starting the generation raised.
+    """
+    try:
+        first: str | None = await anext(token_stream)
+    except StopAsyncIteration:
+        first = None
+    return _resume_stream(first, token_stream)
+
+
+async def _resume_stream(first: str | None, rest: AsyncIterator[str]) -> AsyncIterator[str]:
+    try:
+        if first is not None:
+            yield first
+        async for token in rest:
+            yield token
+    finally:
+        # Closing early must still release the slot the primed generation holds.
+        aclose = getattr(rest, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
 async def _counting_stream(
     token_stream: AsyncIterator[str],
     model_id: str,
@@ -38,11 +70,13 @@ async def _counting_stream(
     prompt_tokens: int,
     metrics: MetricsCollector | None,
     client_id: str | None = None,
+    reservation: TokenReservation | None = None,
 ) -> AsyncIterator[str | _StreamEndMarker]:
     """Wrap a token stream to count tokens and record metrics when complete.
 
     Yields all tokens from the source stream, then a _StreamEndMarker with
     final completion_tokens so downstream SSE formatters can emit usage data.
+    A token-budget ``reservation`` is settled with the tokens actually used.
     """
     completion_tokens = 0
     error_occurred = False
@@ -54,6 +88,8 @@ async def _counting_stream(
         error_occurred = True
         raise
     finally:
+        if reservation is not None:
+            reservation.settle(prompt_tokens + completion_tokens)
         if metrics is not None:
             metrics.record(
                 RequestMetric(
@@ -84,28 +120,37 @@ async def _chat_completions_sse_stream_n(
     priority: str,
     client_id: str | None,
     include_logprobs_placeholder: bool,
+    reservation: TokenReservation | None = None,
+    first_stream: AsyncIterator[str] | None = None,
 ) -> AsyncIterator[str]:
-    """Emit chat SSE stream for multi-choice (`n>1`) requests."""
+    """Emit chat SSE stream for multi-choice (`n>1`) requests.
+
+    ``first_stream`` is choice 0's generation when the caller already started
+    it with :func:`_prime_stream`.
+    """
     from opta_lmx.inference.schema import ChatCompletionChunk, Usage
 
     usage_totals: dict[str, int] = {"prompt_tokens": 0, "completion_tokens": 0}
     try:
         for choice_index in range(body.n):
-            token_stream = engine.stream_generate(
-                model_id=resolved_model,
-                messages=body.messages,
-                temperature=body.temperature,
-                max_tokens=body.max_tokens,
-                top_p=body.top_p,
-                stop=[body.stop] if isinstance(body.stop, str) else body.stop,
-                tools=body.tools,
-                response_format=body.response_format,
-                frequency_penalty=body.frequency_penalty,
-                presence_penalty=body.presence_penalty,
-                priority=priority,
-                num_ctx=body.num_ctx,
-                client_id=client_id,
-            )
+            if choice_index == 0 and first_stream is not None:
+                token_stream = first_stream
+            else:
+                token_stream = engine.stream_generate(
+                    model_id=resolved_model,
+                    messages=body.messages,
+                    temperature=body.temperature,
+                    max_tokens=body.max_tokens,
+                    top_p=body.top_p,
+                    stop=[body.stop] if isinstance(body.stop, str) else body.stop,
+                    tools=body.tools,
+                    response_format=body.response_format,
+                    frequency_penalty=body.frequency_penalty,
+                    presence_penalty=body.presence_penalty,
+                    priority=priority,
+                    num_ctx=body.num_ctx,
+                    client_id=client_id,
+                )
             counted_stream = _counting_stream(
                 token_stream,
                 resolved_model,
@@ -188,6 +233,9 @@ async def _chat_completions_sse_stream_n(
                 client_id=client_id,
             )
         )
+    finally:
+        if reservation is not None:
+            reservation.settle(usage_totals["prompt_tokens"] + usage_totals["completion_tokens"])
     yield "data: [DONE]\n\n"
 
 
@@ -301,6 +349,11 @@ async def _legacy_completions_sse_stream(
         yield "data: [DONE]\n\n"
 
 
+_RESPONSES_TEXT_DELTA_FRAME = SSEFrameTemplate.from_payload(
+    {"delta": DELTA}, event="response.output_text.delta"
+)
+
+
 async def _responses_sse_stream(
     engine: InferenceEngine,
     model_id: str,
@@ -312,31 +365,36 @@ async def _responses_sse_stream(
     tools: list[dict[str, Any]] | None,
     priority: str = "normal",
     client_id: str | None = None,
+    token_stream: AsyncIterator[str | _StreamEndMarker] | None = None,
 ) -> AsyncIterator[str]:
     """Emit SSE for the /v1/responses streaming endpoint.
 
     Uses named SSE events (``event: xxx``) matching OpenAI's Responses API format,
     enabling clients to distinguish created/delta/completed lifecycle events.
     For tool calls, emits output_item.added and function_call_arguments.delta events.
+    ``token_stream`` is the generation when the caller already started it with
+    :func:`_prime_stream`.
     """
     created_payload = json.dumps({"id": request_id, "object": "response", "status": "in_progress"})
     yield f"event: response.created\ndata: {created_payload}\n\n"
 
-    token_stream = engine.stream_generate(
-        model_id=model_id,
-        messages=messages,
-        temperature=temperature,
-        max_tokens=max_tokens,
-        top_p=top_p,
-        stop=None,
-        tools=tools,
-        response_format=None,
-        priority=priority,
-        client_id=client_id,
-    )
+    if token_stream is None:
+        token_stream = engine.stream_generate(
+            model_id=model_id,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p,
+            stop=None,
+            tools=tools,
+            response_format=None,
+            priority=priority,
+            client_id=client_id,
+        )
 
     content_parts: list[str] = []
     tool_calls: dict[int, dict[str, Any]] = {}
+    args_frames: dict[int, SSEFrameTemplate] = {}
 
     if tools:
         from opta_lmx.inference.tool_parser import wrap_stream_with_tool_parsing
@@ -347,8 +405,7 @@ async def _responses_sse_stream(
                 continue
             if chunk.content is not None:
                 content_parts.append(chunk.content)
-                delta_data = json.dumps({"delta": chunk.content})
-                yield f"event: response.output_text.delta\ndata: {delta_data}\n\n"
+                yield _RESPONSES_TEXT_DELTA_FRAME.encode(chunk.content)
             elif chunk.tool_call_delta is not None:
                 delta = chunk.tool_call_delta
                 idx = delta.index
@@ -369,21 +426,19 @@ async def _responses_sse_stream(
                         }
                     )
                     yield f"event: response.output_item.added\ndata: {item_data}\n\n"
+                    args_frames[idx] = SSEFrameTemplate.from_payload(
+                        {"item_id": tool_calls[idx]["id"], "delta": DELTA},
+                        event="response.function_call_arguments.delta",
+                    )
                 if delta.arguments_delta:
                     tool_calls[idx]["arguments"] += delta.arguments_delta
-                    arg_data = json.dumps(
-                        {
-                            "item_id": tool_calls[idx]["id"],
-                            "delta": delta.arguments_delta,
-                        }
-                    )
-                    yield f"event: response.function_call_arguments.delta\ndata: {arg_data}\n\n"
+                    yield args_frames[idx].encode(delta.arguments_delta)
     else:
         async for token in token_stream:
             if isinstance(token, _StreamEndMarker):
                 continue
             content_parts.append(token)
-            yield f"event: response.output_text.delta\ndata: {json.dumps({'delta': token})}\n\n"
+            yield _RESPONSES_TEXT_DELTA_FRAME.encode(token)
 
     output_text = "".join(content_parts)
     output: list[dict[str, Any]] = []
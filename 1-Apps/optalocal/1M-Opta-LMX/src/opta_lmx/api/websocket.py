@@ -1,4 +1,24 @@
-"""WebSocket streaming endpoint — bidirectional chat with cancellation support."""
+"""WebSocket streaming endpoint — bidirectional chat with cancellation support.
+
+Several requests can stream over one connection at once, so sending is
+flow-controlled to keep a client that stops reading from making the server
+buffer without bound:
+
+- All frames leave through one writer task fed by a bounded per-connection
+  queue (``websocket_send_queue_frames``). Concurrent requests per
+  connection are capped (``websocket_max_concurrent_requests``).
+- A request may opt into credit-based flow control by sending
+  ``"credits": N`` with ``chat.request``: the server then sends at most N
+  ``chat.token``/``chat.tool_call`` frames until the client grants more
+  with ``chat.credit``. Control frames (``chat.done``, ``chat.error``) never
+  need credit.
+- While a request cannot send (no credit or a full queue), tokens are
+  coalesced into one pending frame. Once that holds
+  ``websocket_max_pending_chars`` characters the request stops pulling from
+  the engine, pausing generation; if it makes no progress for
+  ``websocket_stall_timeout_sec`` it is shed with a ``slow_consumer`` error
+  and its inference slot is released.
+"""
 
 from __future__ import annotations
 
@@ -7,6 +27,7 @@ import contextlib
 import logging
 import secrets
 import time
+from dataclasses import dataclass
 from typing import Any
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
@@ -39,6 +60,183 @@ def _message_text(message: ChatMessage) -> str:
     return ""
 
 
+@dataclass(frozen=True)
+class WebSocketFlowLimits:
+    """Per-connection flow-control limits for ``/v1/chat/stream``."""
+
+    max_concurrent_requests: int = 8
+    send_queue_frames: int = 64
+    max_pending_chars: int = 8192
+    stall_timeout_sec: float = 30.0
+
+    @classmethod
+    def from_app(cls, app: Any) -> WebSocketFlowLimits:
+        """Read limits from ``app.state.config.server``, defaulting when absent."""
+        config = getattr(app.state, "config", None)
+        server = getattr(config, "server", None)
+        if server is None:
+            return cls()
+        return cls(
+            max_concurrent_requests=server.websocket_max_concurrent_requests,
+            send_queue_frames=server.websocket_send_queue_frames,
+            max_pending_chars=server.websocket_max_pending_chars,
+            stall_timeout_sec=server.websocket_stall_timeout_sec,
+        )
+
+
+class SlowConsumerError(RuntimeError):
+    """A stream could not send for ``stall_timeout_sec`` because the client stopped reading."""
+
+
+class _Connection:
+    """Single writer for one WebSocket, fed by a bounded frame queue."""
+
+    def __init__(self, websocket: WebSocket, limits: WebSocketFlowLimits) -> None:
+        self.websocket = websocket
+        self.limits = limits
+        self._outbound: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(
+            maxsize=max(1, limits.send_queue_frames)
+        )
+        self._writer: asyncio.Task[None] | None = None
+        self.frames_sent = 0
+
+    def start(self) -> None:
+        self._writer = asyncio.create_task(self._write_loop())
+
+    async def close(self) -> None:
+        """Flush queued frames (bounded by the stall timeout) and stop the writer."""
+        writer = self._writer
+        if writer is None:
+            return
+        with contextlib.suppress(asyncio.QueueFull):
+            self._outbound.put_nowait(None)
+        if not writer.done():
+            # A writer that failed (client gone mid-send) must not fail shutdown.
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(asyncio.shield(writer), self.limits.stall_timeout_sec)
+        writer.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await writer
+
+    @property
+    def full(self) -> bool:
+        return self._outbound.full()
+
+    def try_send(self, frame: dict[str, Any]) -> bool:
+        """Queue a frame if there is room; returns False (frame dropped) otherwise."""
+        try:
+            self._outbound.put_nowait(frame)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def send(self, frame: dict[str, Any], *, deadline: float) -> None:
+        """Queue a frame, waiting for room until ``deadline`` (monotonic).
+
+        Raises:
+            SlowConsumerError: The queue stayed full until the deadline.
+        """
+        try:
+            await asyncio.wait_for(self._outbound.put(frame), max(0.0, deadline - time.monotonic()))
+        except TimeoutError:
+            raise SlowConsumerError("client is not reading the WebSocket") from None
+
+    async def send_control(self, frame: dict[str, Any]) -> None:
+        """Queue a control frame, dropping it if the client stays unreadable."""
+        with contextlib.suppress(SlowConsumerError):
+            await self.send(frame, deadline=time.monotonic() + self.limits.stall_timeout_sec)
+
+    async def _write_loop(self) -> None:
+        while True:
+            frame = await self._outbound.get()
+            if frame is None:
+                return
+            await self.websocket.send_json(frame)
+            self.frames_sent += 1
+
+
+class _RequestStream:
+    """Credit window and pending-text coalescing for one streamed request."""
+
+    def __init__(self, connection: _Connection, request_id: str, credits: int | None) -> None:
+        self.connection = connection
+        self.request_id = request_id
+        self._credits = credits
+        self._credit_granted = asyncio.Event()
+        self._pending: list[str] = []
+        self._pending_chars = 0
+        self.pauses = 0
+
+    def grant(self, credits: int) -> None:
+        """Add ``credits`` to the window (ignored when credits are not in use)."""
+        if self._credits is None or credits <= 0:
+            return
+        self._credits += credits
+        self._credit_granted.set()
+
+    def _can_send(self) -> bool:
+        return (self._credits is None or self._credits > 0) and not self.connection.full
+
+    def _use_credit(self) -> None:
+        if self._credits is not None:
+            self._credits -= 1
+
+    async def text(self, content: str) -> None:
+        """Send a text delta now if possible, else coalesce it; pause when the buffer is full."""
+        self._pending.append(content)
+        self._pending_chars += len(content)
+        if self._can_send():
+            self._use_credit()
+            self.connection.try_send(self._take_token_frame())
+        elif self._pending_chars >= self.connection.limits.max_pending_chars:
+            # Stop pulling tokens from the engine until the client catches up.
+            self.pauses += 1
+            await self.flush()
+
+    async def frame(self, frame: dict[str, Any]) -> None:
+        """Send a credited non-text frame after any pending text."""
+        await self.flush()
+        await self._send_credited(frame)
+
+    async def flush(self) -> None:
+        """Send pending text, waiting for credit and queue room (bounded by the stall timeout)."""
+        if self._pending:
+            await self._send_credited(None)
+
+    def _take_token_frame(self) -> dict[str, Any]:
+        content = "".join(self._pending)
+        self._pending.clear()
+        self._pending_chars = 0
+        return {"type": "chat.token", "request_id": self.request_id, "content": content}
+
+    async def _send_credited(self, frame: dict[str, Any] | None) -> None:
+        """Send ``frame`` (None = the pending text) once credit allows.
+
+        Raises:
+            SlowConsumerError: No credit or queue room within the stall timeout.
+        """
+        deadline = time.monotonic() + self.connection.limits.stall_timeout_sec
+        while self._credits is not None and self._credits <= 0:
+            self._credit_granted.clear()
+            try:
+                await asyncio.wait_for(
+                    self._credit_granted.wait(), max(0.0, deadline - time.monotonic())
+                )
+            except TimeoutError:
+                raise SlowConsumerError("client granted no credit") from None
+        self._use_credit()
+        await self.connection.send(
+            frame if frame is not None else self._take_token_frame(), deadline=deadline
+        )
+
+
+def _initial_credits(data: dict[str, Any]) -> int | None:
+    credits = data.get("credits")
+    if isinstance(credits, bool) or not isinstance(credits, int):
+        return None
+    return max(1, credits)
+
+
 @router.websocket("/v1/chat/stream")
 async def websocket_chat(websocket: WebSocket) -> None:
     """WebSocket endpoint for bidirectional streaming chat.
@@ -46,17 +244,29 @@ async def websocket_chat(websocket: WebSocket) -> None:
     Protocol messages (JSON):
 
     Client → Server:
-        {"type": "chat.request", "model": "...", "messages": [...], ...}
+        {"type": "chat.request", "model": "...", "messages": [...], "credits": 32, ...}
+        {"type": "chat.credit", "request_id": "chatcmpl-abc123", "credits": 16}
         {"type": "chat.cancel", "request_id": "chatcmpl-abc123"}
 
     Server → Client:
+        {"type": "chat.accepted", "request_id": "...", "client_request_id": "..."}
         {"type": "chat.token", "request_id": "...", "content": "..."}
         {"type": "chat.done", "request_id": "...", "finish_reason": "stop", "usage": {...}}
-        {"type": "chat.error", "request_id": "...", "error": "..."}
+        {"type": "chat.error", "request_id": "...", "error": "...", "code": "..."}
+
+    ``credits`` is optional; without it a request is only bounded by the
+    connection's send queue. A request may also carry a ``client_request_id``:
+    the server then answers with ``chat.accepted`` mapping it to the assigned
+    ``request_id`` before any other frame of that request, or echoes it on the
+    ``too_many_requests`` error when the request is rejected.
     """
     await websocket.accept()
     engine: InferenceEngine = websocket.app.state.engine
+    limits = WebSocketFlowLimits.from_app(websocket.app)
+    connection = _Connection(websocket, limits)
+    connection.start()
     active_tasks: dict[str, asyncio.Task[None]] = {}
+    streams: dict[str, _RequestStream] = {}
 
     try:
         while True:
@@ -69,18 +279,43 @@ async def websocket_chat(websocket: WebSocket) -> None:
             msg_type = data.get("type")
 
             if msg_type == "chat.request":
+                if len(active_tasks) >= limits.max_concurrent_requests:
+                    # No request_id was assigned; echo the client's own id instead.
+                    connection.try_send(
+                        {
+                            "type": "chat.error",
+                            "request_id": None,
+                            "client_request_id": data.get("client_request_id"),
+                            "code": "too_many_requests",
+                            "error": (
+                                f"At most {limits.max_concurrent_requests} concurrent "
+                                "requests per connection"
+                            ),
+                        }
+                    )
+                    continue
                 request_id = f"chatcmpl-{secrets.token_urlsafe(16)}"
+                stream = _RequestStream(connection, request_id, _initial_credits(data))
+                streams[request_id] = stream
                 task = asyncio.create_task(
-                    _handle_chat_request(websocket, request_id, data, engine)
+                    _handle_chat_request(websocket, request_id, data, engine, stream)
                 )
                 active_tasks[request_id] = task
 
                 # Clean up completed tasks
                 def _cleanup(t: asyncio.Task[None], rid: str = request_id) -> None:
                     active_tasks.pop(rid, None)
+                    streams.pop(rid, None)
 
                 task.add_done_callback(_cleanup)
 
+            elif msg_type == "chat.credit":
+                credits = data.get("credits")
+                if (credit_stream := streams.get(data.get("request_id", ""))) and isinstance(
+                    credits, int
+                ):
+                    credit_stream.grant(credits)
+
             elif msg_type == "chat.cancel":
                 request_id = data.get("request_id", "")
                 if cancel_task := active_tasks.pop(request_id, None):
@@ -88,7 +323,7 @@ async def websocket_chat(websocket: WebSocket) -> None:
                     logger.info("ws_generation_cancelled", extra={"request_id": request_id})
 
             else:
-                await websocket.send_json(
+                connection.try_send(
                     {
                         "type": "chat.error",
                         "request_id": None,
@@ -107,9 +342,12 @@ async def websocket_chat(websocket: WebSocket) -> None:
         logger.error("ws_connection_error", extra={"error": str(e)})
     finally:
         # Cancel all active generation tasks on disconnect
-        for task in active_tasks.values():
+        tasks = list(active_tasks.values())
+        for task in tasks:
             task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
         active_tasks.clear()
+        await connection.close()
         with contextlib.suppress(Exception):
             await websocket.close()
 
@@ -119,8 +357,19 @@ async def _handle_chat_request(
     request_id: str,
     data: dict[str, Any],
     engine: InferenceEngine,
+    stream_out: _RequestStream,
 ) -> None:
     """Handle a single chat request — stream tokens back via WebSocket."""
+    connection = stream_out.connection
+    client_request_id = data.get("client_request_id")
+    if client_request_id is not None:
+        await connection.send_control(
+            {
+                "type": "chat.accepted",
+                "request_id": request_id,
+                "client_request_id": client_request_id,
+            }
+        )
     model = data.get("model", "")
     raw_messages = data.get("messages", [])
     temperature = data.get("temperature", 0.7)
@@ -139,7 +388,7 @@ async def _handle_chat_request(
         preset_mgr = websocket.app.state.preset_manager
         preset = preset_mgr.get(preset_name)
         if preset is None:
-            await websocket.send_json(
+            await connection.send_control(
                 {
                     "type": "chat.error",
                     "request_id": request_id,
@@ -168,7 +417,7 @@ async def _handle_chat_request(
             model = task_router.resolve(model, loaded_ids)
 
             if not engine.is_model_loaded(model):
-                await websocket.send_json(
+                await connection.send_control(
                     {
                         "type": "chat.error",
                         "request_id": request_id,
@@ -194,45 +443,42 @@ async def _handle_chat_request(
                 response_format=response_format,
             )
 
-            if tools:
-                chunk_stream = wrap_stream_with_tool_parsing(token_stream, tools=tools)
-                async for chunk in chunk_stream:
-                    if isinstance(chunk, _StreamEndMarker):
-                        continue
-                    completion_tokens += 1
-                    if chunk.content is not None:
-                        await websocket.send_json(
-                            {
-                                "type": "chat.token",
-                                "request_id": request_id,
-                                "content": chunk.content,
-                            }
-                        )
-                    elif chunk.tool_call_delta is not None:
-                        saw_tool_calls = True
-                        tc = chunk.tool_call_delta
-                        await websocket.send_json(
-                            {
-                                "type": "chat.tool_call",
-                                "request_id": request_id,
-                                "tool_call": {
-                                    "index": tc.index,
-                                    "id": tc.id,
-                                    "name": tc.name,
-                                    "arguments": tc.arguments_delta,
-                                },
-                            }
-                        )
-            else:
-                async for token in token_stream:
-                    completion_tokens += 1
-                    await websocket.send_json(
-                        {
-                            "type": "chat.token",
-                            "request_id": request_id,
-                            "content": token,
-                        }
-                    )
+            # Tokens are pulled only as fast as the client reads (see
+            # _RequestStream); closing the stream releases the inference slot
+            # if the request is shed or cancelled mid-generation.
+            try:
+                if tools:
+                    chunk_stream = wrap_stream_with_tool_parsing(token_stream, tools=tools)
+                    async for chunk in chunk_stream:
+                        if isinstance(chunk, _StreamEndMarker):
+                            continue
+                        completion_tokens += 1
+                        if chunk.content is not None:
+                            await stream_out.text(chunk.content)
+                        elif chunk.tool_call_delta is not None:
+                            saw_tool_calls = True
+                            tc = chunk.tool_call_delta
+                            await stream_out.frame(
+                                {
+                                    "type": "chat.tool_call",
+                                    "request_id": request_id,
+                                    "tool_call": {
+                                        "index": tc.index,
+                                        "id": tc.id,
+                                        "name": tc.name,
+                                        "arguments": tc.arguments_delta,
+                                    },
+                                }
+                            )
+                else:
+                    async for token in token_stream:
+                        completion_tokens += 1
+                        await stream_out.text(token)
+                await stream_out.flush()
+            finally:
+                aclose = getattr(token_stream, "aclose", None)
+                if aclose is not None:
+                    await aclose()
 
             websocket.app.state.metrics.record(
                 RequestMetric(
@@ -244,7 +490,7 @@ async def _handle_chat_request(
                 )
             )
 
-            await websocket.send_json(
+            await connection.send_control(
                 {
                     "type": "chat.done",
                     "request_id": request_id,
@@ -277,7 +523,7 @@ async def _handle_chat_request(
                 )
             )
 
-            await websocket.send_json(
+            await connection.send_control(
                 {
                     "type": "chat.done",
                     "request_id": request_id,
@@ -292,15 +538,43 @@ async def _handle_chat_request(
 
     except asyncio.CancelledError:
         # Client cancelled — send acknowledgment if connection still open
+        connection.try_send(
+            {
+                "type": "chat.done",
+                "request_id": request_id,
+                "finish_reason": "cancelled",
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0},
+            }
+        )
+    except SlowConsumerError as e:
+        logger.warning(
+            "ws_slow_consumer_shed",
+            extra={
+                "request_id": request_id,
+                "model": model,
+                "stall_timeout_sec": connection.limits.stall_timeout_sec,
+                "pauses": stream_out.pauses,
+            },
+        )
         with contextlib.suppress(Exception):
-            await websocket.send_json(
-                {
-                    "type": "chat.done",
-                    "request_id": request_id,
-                    "finish_reason": "cancelled",
-                    "usage": {"prompt_tokens": 0, "completion_tokens": 0},
-                }
+            websocket.app.state.metrics.record(
+                RequestMetric(
+                    model_id=model,
+                    latency_sec=time.monotonic() - start_time,
+                    prompt_tokens=0,
+                    completion_tokens=0,
+                    stream=stream,
+                    error=True,
+                )
             )
+        connection.try_send(
+            {
+                "type": "chat.error",
+                "request_id": request_id,
+                "code": "slow_consumer",
+                "error": f"Stream shed: {e}",
+            }
+        )
     except Exception as e:
         logger.error(
             "ws_chat_error",
@@ -320,11 +594,10 @@ async def _handle_chat_request(
                     error=True,
                 )
             )
-        with contextlib.suppress(Exception):
-            await websocket.send_json(
-                {
-                    "type": "chat.error",
-                    "request_id": request_id,
-                    "error": str(e),
-                }
-            )
+        await connection.send_control(
+            {
+                "type": "chat.error",
+                "request_id": request_id,
+                "error": str(e),
+            }
+        )
@@ -32,18 +32,98 @@ def _default_routing_aliases() -> dict[str, list[str]]:
     }
 
 
+def _default_sse_coalesce_keys() -> dict[str, str | None]:
+    return {"download_progress": "download_id"}
+
+
 class ServerConfig(BaseModel):
     """Server binding and timeout settings."""
 
     host: str = "0.0.0.0"
     port: int = Field(1234, ge=1, le=65535, description="Port 1234 = drop-in LM Studio replacement")
-    workers: int = Field(1, ge=1)
+    workers: int = Field(
+        1,
+        ge=1,
+        description=(
+            "HTTP front-end processes. Above 1, a single engine process owns the models "
+            "and the front-ends reach it over a Unix socket in ipc_dir"
+        ),
+    )
+    ipc_dir: Path = Field(
+        default_factory=lambda: Path.home() / ".opta-lmx" / "run",
+        description="Directory for the engine IPC and engine HTTP Unix sockets",
+    )
     timeout_sec: int = Field(300, ge=1)
     websocket_enabled: bool = Field(True, description="Enable WebSocket streaming endpoint")
+    websocket_max_concurrent_requests: int = Field(
+        8, ge=1, description="Concurrent chat requests allowed on one WebSocket connection"
+    )
+    websocket_send_queue_frames: int = Field(
+        64, ge=1, description="Frames queued per WebSocket connection before senders wait"
+    )
+    websocket_max_pending_chars: int = Field(
+        8192,
+        ge=1,
+        description=(
+            "Text coalesced per request while the client is not reading; beyond it, "
+            "generation pauses until the client catches up"
+        ),
+    )
+    websocket_stall_timeout_sec: float = Field(
+        30.0,
+        gt=0,
+        description="Shed a WebSocket stream that could not send for this long (slow consumer)",
+    )
     sse_events_enabled: bool = Field(True, description="Enable /admin/events SSE endpoint")
     sse_heartbeat_interval_sec: int = Field(
         30, ge=1, description="SSE heartbeat interval in seconds"
     )
+    sse_replay_buffer_size: int = Field(
+        1024,
+        ge=16,
+        le=65536,
+        description="Encoded events kept for Last-Event-ID replay on /admin/events",
+    )
+    sse_coalesce_event_keys: dict[str, str | None] = Field(
+        default_factory=_default_sse_coalesce_keys,
+        description=(
+            "High-frequency event types collapsed to the newest per key (data field) "
+            "when a slow SSE client catches up; a null key collapses the whole type."
+        ),
+    )
+
+
+class StreamingConfig(BaseModel):
+    """Adaptive coalescing of streamed tokens into SSE and WebSocket frames.
+
+    The first token is always sent alone and immediately; later tokens are
+    merged only while the client's socket is backpressured or during bursts,
+    and are never held longer than ``coalesce_window_ms``.
+    """
+
+    coalesce_enabled: bool = Field(True, description="Merge token deltas under pressure")
+    coalesce_burst_tokens: int = Field(
+        8,
+        ge=1,
+        description="More than this many tokens within one window counts as a burst",
+    )
+    coalesce_window_ms: float = Field(
+        25.0,
+        ge=0.0,
+        le=1000.0,
+        description="Burst detection window and the longest a token may be held",
+    )
+    coalesce_max_frame_tokens: int = Field(64, ge=1, description="Most tokens merged per frame")
+    coalesce_buffer_frames: int = Field(
+        4,
+        ge=1,
+        description="Full frames read ahead of a slow client before the source is paused",
+    )
+    stall_threshold_ms: float = Field(
+        20.0,
+        ge=0.0,
+        description="A frame send blocking this long counts as a send-buffer stall",
+    )
 
 
 class DiscoveryConfig(BaseModel):
@@ -63,6 +143,42 @@ class DiscoveryConfig(BaseModel):
     )
 
 
+class FakeBackendConfig(BaseModel):
+    """Timing and failure model for the simulated ``fake`` inference backend."""
+
+    prefill_tokens_per_sec: float = Field(
+        2000.0, gt=0, description="Prompt tokens processed per second (prefill is serialized)"
+    )
+    decode_tokens_per_sec: float = Field(
+        40.0, gt=0, description="Tokens generated per second by a single stream"
+    )
+    jitter: float = Field(
+        0.1, ge=0.0, lt=1.0, description="Per-token decode time varies by +/- this fraction"
+    )
+    batch_slowdown: float = Field(
+        0.15,
+        ge=0.0,
+        description="Extra per-token decode time for each other concurrent stream (fraction)",
+    )
+    completion_tokens: int = Field(
+        128, ge=1, description="Typical completion length (+/- 25%, capped by max_tokens)"
+    )
+    load_sec: float = Field(0.5, ge=0.0, description="Simulated model load time")
+    memory_gb: float | None = Field(
+        None,
+        ge=0.0,
+        description="Reported model footprint (None = estimate from size/bits in the model ID)",
+    )
+    resident_memory: bool = Field(
+        False, description="Actually allocate the footprint so memory pressure is real"
+    )
+    context_length: int = Field(8192, ge=512, description="Reported context window")
+    failure_rate: float = Field(
+        0.0, ge=0.0, le=1.0, description="Share of requests that fail before or mid-stream"
+    )
+    seed: int = Field(0, description="Seed for deterministic text, timing jitter and failures")
+
+
 class ModelsConfig(BaseModel):
     """Model loading and directory settings."""
 
@@ -95,10 +211,78 @@ class ModelsConfig(BaseModel):
         le=900,
         description="Timeout in seconds for child-process loader probe.",
     )
+    loader_pool_size: int = Field(
+        2,
+        ge=0,
+        le=16,
+        description=(
+            "Warm loader worker processes (0 = spawn a fresh worker per probe). Workers are "
+            "forked by the first loads and then kept warm; this also bounds how many "
+            "backends are probed in parallel."
+        ),
+    )
+    loader_pool_max_jobs_per_worker: int = Field(
+        32,
+        ge=1,
+        le=10000,
+        description="Recycle a warm loader worker after this many jobs.",
+    )
+    loader_pool_preload_modules: list[str] = Field(
+        default_factory=lambda: ["mlx.core", "mlx_lm", "vllm_mlx"],
+        description="Modules imported once by each warm loader worker (missing ones are skipped).",
+    )
     warmup_on_load: bool = Field(
         True,
         description="Run a small inference after model load to prime JIT/KV cache",
     )
+    download_engine: str = Field(
+        "parallel",
+        pattern="^(parallel|hub)$",
+        description=(
+            "parallel = concurrent, range-chunked, resumable downloads with hash checks; "
+            "hub = huggingface_hub.snapshot_download"
+        ),
+    )
+    download_workers: int = Field(
+        8, ge=1, le=64, description="Concurrent HTTP transfers per download"
+    )
+    download_chunk_mb: int = Field(
+        64, ge=1, description="Files larger than this are fetched as parallel byte ranges (MB)"
+    )
+    download_max_mb_per_sec: float | None = Field(
+        None, gt=0, description="Global download bandwidth cap in MB/s (None = unlimited)"
+    )
+    prewarm_enabled: bool = Field(
+        True,
+        description=(
+            "Pull safetensors shards into the OS page cache in parallel while the "
+            "backend starts up, and ahead of time for predicted models "
+            "(see prewarm_predicted_models)."
+        ),
+    )
+    prewarm_method: str = Field(
+        "auto",
+        pattern="^(auto|fadvise|madvise|read)$",
+        description=(
+            "auto = posix_fadvise(WILLNEED) where available, else mmap + "
+            "madvise(WILLNEED), else sequential reads"
+        ),
+    )
+    prewarm_workers: int = Field(4, ge=1, le=32, description="Shards warmed in parallel")
+    prewarm_predicted_models: int = Field(
+        0,
+        ge=0,
+        le=10,
+        description=(
+            "Models the usage predictor expects next to warm ahead of load (0 = off). "
+            "Warming unloaded models competes with running ones for page cache."
+        ),
+    )
+    prewarm_interval_sec: float = Field(
+        60.0,
+        ge=5.0,
+        description="How often to warm predicted models (seconds)",
+    )
     semaphore_timeout_sec: float = Field(
         30.0,
         ge=1.0,
@@ -194,7 +378,14 @@ class ModelsConfig(BaseModel):
     # Backend routing
     backend_preference_order: list[str] | None = Field(
         None,
-        description="Ordered list of inference backends (e.g. ['vllm-mlx', 'mlx-lm'])",
+        description=(
+            "Ordered list of inference backends (e.g. ['vllm-mlx', 'mlx-lm']). "
+            "Put 'fake' first to serve every model from the simulated backend."
+        ),
+    )
+    fake_backend: FakeBackendConfig = Field(
+        default_factory=lambda: FakeBackendConfig.model_validate({}),
+        description="Simulated backend settings (used when 'fake' is selected)",
     )
     gguf_fallback_enabled: bool = Field(
         False,
@@ -233,6 +424,31 @@ class ModelsConfig(BaseModel):
         ge=1,
         description="Minimum concurrent requests even under high latency",
     )
+    admission_control_enabled: bool = Field(
+        True,
+        description=(
+            "Reject inference requests up front (429 + Retry-After) when predicted queue "
+            "wait or the client's X-Request-Timeout cannot be met"
+        ),
+    )
+    admission_max_queue_depth: int = Field(
+        64,
+        ge=1,
+        le=10000,
+        description="Max requests waiting for inference slots (low priority gets half)",
+    )
+    admission_codel_target_ms: float = Field(
+        1000.0,
+        ge=10.0,
+        le=60000.0,
+        description="Acceptable standing queue delay before CoDel-style shedding starts",
+    )
+    admission_codel_interval_ms: float = Field(
+        10000.0,
+        ge=100.0,
+        le=600000.0,
+        description="Window over which the minimum queue delay is compared to the target",
+    )
     # Warm pool / prefetch
     warm_pool_enabled: bool = Field(
         False,
@@ -301,6 +517,56 @@ class RoutingConfig(BaseModel):
         None,
         description="Model ID for 'auto' alias. If None, uses first loaded model.",
     )
+    default_policy: str = Field(
+        "first_loaded",
+        pattern="^(first_loaded|least_outstanding|power_of_two|latency_ewma)$",
+        description=(
+            "Policy for choosing among loaded alias candidates: first_loaded, "
+            "least_outstanding, power_of_two, or latency_ewma"
+        ),
+    )
+    policies: dict[str, str] = Field(
+        default_factory=dict,
+        description="Per-alias policy overrides {alias: policy} (includes 'auto')",
+    )
+    model_weights: dict[str, float] = Field(
+        default_factory=dict,
+        description="Relative capacity weight per model for load-aware policies (default 1.0)",
+    )
+    sticky_sessions: bool = Field(
+        False,
+        description="Pin a client to the model it was last routed to (preserves prefix cache)",
+    )
+    sticky_ttl_sec: float = Field(
+        900.0,
+        ge=1.0,
+        description="Idle seconds before a client's alias affinity expires",
+    )
+    sticky_max_entries: int = Field(
+        4096,
+        ge=1,
+        description="Max client affinity entries retained (LRU eviction)",
+    )
+
+    @field_validator("policies")
+    @classmethod
+    def _validate_policies(cls, value: dict[str, str]) -> dict[str, str]:
+        allowed = {"first_loaded", "least_outstanding", "power_of_two", "latency_ewma"}
+        for alias, policy in value.items():
+            if policy not in allowed:
+                raise ValueError(
+                    f"Unknown routing policy '{policy}' for alias '{alias}' "
+                    f"(expected one of: {', '.join(sorted(allowed))})"
+                )
+        return value
+
+    @field_validator("model_weights")
+    @classmethod
+    def _validate_model_weights(cls, value: dict[str, float]) -> dict[str, float]:
+        for model_id, weight in value.items():
+            if weight <= 0:
+                raise ValueError(f"model_weights['{model_id}'] must be > 0 (got {weight})")
+        return value
 
 
 class PresetsConfig(BaseModel):
@@ -331,6 +597,65 @@ class HelperNodeEndpoint(BaseModel):
         pattern="^(local|skip)$",
         description="On failure: 'local' = use local model, 'skip' = return error",
     )
+    weight: float = Field(
+        1.0, gt=0.0, le=100.0, description="Relative share of pool traffic for this node"
+    )
+    max_connections: int = Field(
+        4, ge=1, le=256, description="Max open HTTP connections to this node"
+    )
+    max_keepalive_connections: int = Field(
+        2, ge=0, le=256, description="Idle keep-alive connections retained for this node"
+    )
+    keepalive_expiry_sec: float = Field(
+        30.0, ge=1.0, le=600.0, description="Seconds an idle keep-alive connection is kept"
+    )
+    circuit_failure_threshold: int = Field(
+        3, ge=1, le=100, description="Consecutive failures before this node's circuit opens"
+    )
+    circuit_reset_timeout_sec: float = Field(
+        60.0, ge=1.0, le=3600.0, description="Seconds before an open circuit is retried"
+    )
+
+
+class HelperNodePoolConfig(BaseModel):
+    """A pool of helper node endpoints sharing one capability.
+
+    Requests are balanced across nodes whose circuit is closed. Large
+    embedding batches are sharded across nodes, and slow requests can be
+    hedged onto a second node.
+    """
+
+    endpoints: list[HelperNodeEndpoint] = Field(
+        ..., min_length=1, description="Helper node endpoints in this pool"
+    )
+    strategy: str = Field(
+        "least_latency",
+        pattern="^(weighted|least_latency)$",
+        description="Balancing: 'weighted' round-robin or 'least_latency' (p95 / weight)",
+    )
+    shard_min_batch: int = Field(
+        64,
+        ge=1,
+        description="Embedding batches larger than this are split across available nodes",
+    )
+    hedge_enabled: bool = Field(
+        False,
+        description="Send a duplicate request to a second node when the first is slow",
+    )
+    hedge_percentile: float = Field(
+        95.0,
+        ge=50.0,
+        le=99.9,
+        description="Latency percentile of the primary node after which a hedge is sent",
+    )
+    hedge_min_delay_ms: float = Field(
+        50.0, ge=0.0, le=60000.0, description="Minimum wait before sending a hedged request"
+    )
+    fallback: str = Field(
+        "local",
+        pattern="^(local|skip)$",
+        description="When every node fails: 'local' = use local model, 'skip' = return error",
+    )
 
 
 class HelperNodesConfig(BaseModel):
@@ -348,6 +673,44 @@ class HelperNodesConfig(BaseModel):
         None,
         description="Helper node reranking endpoint",
     )
+    embedding_pool: HelperNodePoolConfig | None = Field(
+        None,
+        description="Pool of helper node embedding endpoints (replaces 'embedding')",
+    )
+    reranking_pool: HelperNodePoolConfig | None = Field(
+        None,
+        description="Pool of helper node reranking endpoints (replaces 'reranking')",
+    )
+
+    @model_validator(mode="after")
+    def _validate_single_or_pool(self) -> HelperNodesConfig:
+        if self.embedding is not None and self.embedding_pool is not None:
+            raise ValueError("Configure either helper_nodes.embedding or embedding_pool, not both")
+        if self.reranking is not None and self.reranking_pool is not None:
+            raise ValueError("Configure either helper_nodes.reranking or reranking_pool, not both")
+        return self
+
+
+class SubscriptionProxyConfig(BaseModel):
+    """Upstream connection settings for OAuth subscription providers."""
+
+    max_connections: int = Field(
+        32, ge=1, le=1024, description="Max open HTTP connections per subscription provider"
+    )
+    max_keepalive_connections: int = Field(
+        16, ge=0, le=1024, description="Idle keep-alive connections retained per provider"
+    )
+    keepalive_expiry_sec: float = Field(
+        90.0, ge=1.0, le=3600.0, description="Seconds an idle keep-alive connection is kept"
+    )
+    http2: bool = Field(
+        True,
+        description="Negotiate HTTP/2 with providers (requires the optional 'h2' package)",
+    )
+    token_background_refresh: bool = Field(
+        True,
+        description="Re-read provider tokens in the background ahead of cache expiry",
+    )
 
 
 class RAGConfig(BaseModel):
@@ -395,6 +758,24 @@ class RAGConfig(BaseModel):
         50, ge=5, le=200, description="Candidates to retrieve before reranking"
     )
     rerank_final_k: int = Field(5, ge=1, le=50, description="Results to return after reranking")
+    rerank_batch_window_ms: float = Field(
+        5.0,
+        ge=0.0,
+        le=100.0,
+        description="Window to coalesce concurrent local rerank calls into one batch",
+    )
+    rerank_max_batch_docs: int = Field(
+        256, ge=1, le=4096, description="Max documents scored per local rerank batch"
+    )
+    rerank_cache_size: int = Field(
+        4096, ge=0, le=1_000_000, description="Cached (query, document) scores (0 = disabled)"
+    )
+    rerank_prefilter_k: int | None = Field(
+        None,
+        ge=1,
+        le=1000,
+        description="Keep only the top-K candidates by lexical overlap before reranking",
+    )
 
     # Phase 9: Chunking strategy
     chunking_strategy: str = Field(
@@ -443,6 +824,26 @@ class RAGConfig(BaseModel):
         description="Path to persist the folder watch registry",
     )
 
+    # Document extraction (PDF/HTML/Markdown/code -> text) for file ingestion
+    extraction_workers: int = Field(
+        2,
+        ge=1,
+        le=32,
+        description="Worker processes that extract text from files off the event loop",
+    )
+    extraction_pdf_parallel_min_pages: int = Field(
+        32,
+        ge=1,
+        le=100_000,
+        description="PDFs with at least this many pages are split across extraction workers",
+    )
+    extraction_pdf_pages_per_task: int = Field(
+        8,
+        ge=1,
+        le=1024,
+        description="Pages per extraction task when a PDF is split across workers",
+    )
+
     @model_validator(mode="after")
     def _validate_chunk_overlap(self) -> RAGConfig:
         if self.default_chunk_overlap >= self.default_chunk_size:
@@ -489,6 +890,29 @@ class RateLimitConfig(BaseModel):
         None,
         description="Override limit for /v1/embeddings (None = use default)",
     )
+    token_budget_enabled: bool = Field(
+        False,
+        description=(
+            "Charge chat completions against a per-principal token bucket "
+            "(estimated prompt + max_tokens, unused tokens refunded)"
+        ),
+    )
+    tokens_per_minute: int = Field(
+        100_000, ge=1, description="Token bucket refill rate per principal"
+    )
+    token_burst: int | None = Field(
+        None, ge=1, description="Token bucket capacity (None = tokens_per_minute)"
+    )
+    token_state_path: Path | None = Field(
+        None,
+        description=(
+            "File holding the buckets shared by all workers on this host "
+            "(None = token-buckets.bin in server.ipc_dir)"
+        ),
+    )
+    token_state_slots: int = Field(
+        4096, ge=16, description="Principals tracked at once in the shared bucket table"
+    )
 
 
 class SkillsConfig(BaseModel):
@@ -570,6 +994,18 @@ class SecurityConfig(BaseModel):
     supabase_jwt_audience: str = ""
     supabase_jwt_jwks_url: str = ""
     supabase_jwt_claim_user_id: str = "sub"
+    supabase_jwt_jwks_cache_ttl_sec: float = Field(
+        300.0, ge=10.0, le=86400.0, description="JWKS cache lifetime before refetch"
+    )
+    supabase_jwt_background_refresh: bool = Field(
+        True, description="Refresh the JWKS in the background ahead of its TTL"
+    )
+    supabase_jwt_token_cache_size: int = Field(
+        1024,
+        ge=0,
+        le=1_000_000,
+        description="Verified tokens remembered until exp (0 = verify every request)",
+    )
     honor_x_forwarded_for: bool = Field(
         False,
         description="Trust X-Forwarded-For header from trusted proxies for client IP resolution",
@@ -625,6 +1061,26 @@ class AgentsConfig(BaseModel):
     state_store_path: Path | None = None
     step_retry_attempts: int = 2
     step_retry_backoff_sec: float = 1.0
+    stream_persist_interval_sec: float = Field(
+        0.25,
+        ge=0.0,
+        description="Minimum seconds between state-store writes while a step streams tokens",
+    )
+
+
+class SessionsConfig(BaseModel):
+    """Configuration for serving CLI session files (/admin/sessions)."""
+
+    search_index_enabled: bool = Field(
+        True, description="Serve session listing and search from a SQLite FTS5 index"
+    )
+    search_index_path: Path = Field(
+        default_factory=lambda: Path.home() / ".opta-lmx" / "sessions-index.sqlite",
+        description="Sidecar index file; safe to delete, it is rebuilt from the sessions",
+    )
+    index_sync_interval_sec: float = Field(
+        5.0, gt=0.0, description="How often the index rescans session files for changes"
+    )
 
 
 class ObservabilityConfig(BaseModel):
@@ -676,6 +1132,27 @@ class WorkersConfig(BaseModel):
         pattern="^(sqlite|redis|memory)$",
         description="Queue backend type",
     )
+    skill_process_isolation: bool = Field(
+        True,
+        description=(
+            "Run entrypoint skills in a pool of warm worker processes (one per "
+            "concurrent call) that are killed and replaced on timeout"
+        ),
+    )
+    skill_worker_max_calls: int = Field(
+        256,
+        ge=1,
+        description="Calls served by a skill worker process before it is recycled",
+    )
+    per_skill_max_concurrency: int | None = Field(
+        None,
+        ge=1,
+        description="Max worker processes one skill may occupy at once (None = no cap)",
+    )
+    per_skill_concurrency: dict[str, int] = Field(
+        default_factory=dict,
+        description="Per-skill overrides of per_skill_max_concurrency, keyed by skill name",
+    )
 
 
 class DeviceConfig(BaseModel):
@@ -709,6 +1186,7 @@ class LMXConfig(BaseSettings):
     server: ServerConfig = Field(default_factory=lambda: ServerConfig.model_validate({}))
     discovery: DiscoveryConfig = Field(default_factory=lambda: DiscoveryConfig.model_validate({}))
     models: ModelsConfig = Field(default_factory=lambda: ModelsConfig.model_validate({}))
+    streaming: StreamingConfig = Field(default_factory=lambda: StreamingConfig.model_validate({}))
     memory: MemoryConfig = Field(default_factory=lambda: MemoryConfig.model_validate({}))
     logging: LoggingConfig = Field(default_factory=lambda: LoggingConfig.model_validate({}))
     routing: RoutingConfig = Field(default_factory=lambda: RoutingConfig.model_validate({}))
@@ -716,9 +1194,13 @@ class LMXConfig(BaseSettings):
     helper_nodes: HelperNodesConfig = Field(
         default_factory=lambda: HelperNodesConfig.model_validate({})
     )
+    subscription_proxy: SubscriptionProxyConfig = Field(
+        default_factory=lambda: SubscriptionProxyConfig.model_validate({})
+    )
     rag: RAGConfig = Field(default_factory=lambda: RAGConfig.model_validate({}))
     security: SecurityConfig = Field(default_factory=lambda: SecurityConfig.model_validate({}))
-    agents: AgentsConfig = Field(default_factory=AgentsConfig)
+    agents: AgentsConfig = Field(default_factory=lambda: AgentsConfig.model_validate({}))
+    sessions: SessionsConfig = Field(default_factory=lambda: SessionsConfig.model_validate({}))
     skills: SkillsConfig = Field(default_factory=SkillsConfig)
     observability: ObservabilityConfig = Field(default_factory=ObservabilityConfig)
     workers: WorkersConfig = Field(
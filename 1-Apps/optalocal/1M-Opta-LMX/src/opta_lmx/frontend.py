@@ -0,0 +1,276 @@
+"""Stateless HTTP front-end processes for multi-worker serving.
+
+With ``server.workers > 1`` the CLI runs the full app (engine, agents, RAG,
+admin) in one model-owning process bound to a private Unix socket, and starts
+``workers`` uvicorn front-end processes on the public host/port. Each front-end:
+
+- serves the OpenAI-compatible inference routes and the ``/v1/chat/stream``
+  WebSocket itself, so JSON parsing, Pydantic validation and SSE formatting run
+  on every core, and forwards only generation to the engine over
+  :mod:`opta_lmx.runtime.engine_ipc`;
+- serves ``/admin/events`` from a local EventBus fed by one IPC subscription,
+  so SSE clients fan out per front-end rather than per engine connection;
+  events keep the engine's ids, so ``Last-Event-ID`` resumes on any front-end;
+- forwards request metrics to the engine, so ``/admin/metrics`` is aggregated;
+- reverse-proxies every other HTTP route to the engine's HTTP socket unchanged.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import subprocess
+import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, cast
+
+import httpx
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from opta_lmx.api.admin_metrics import admin_event_stream
+from opta_lmx.api.inference import router as inference_router
+from opta_lmx.api.rate_limit import configure_token_budget
+from opta_lmx.api.websocket import router as websocket_router
+from opta_lmx.config import LMXConfig, load_config
+from opta_lmx.inference.coalescing import StreamCoalescer
+from opta_lmx.monitoring.events import EventBus
+from opta_lmx.monitoring.metrics import MetricsCollector, RequestMetric
+from opta_lmx.presets.manager import PresetManager
+from opta_lmx.proxy import keychain_reader
+from opta_lmx.proxy.subscription_providers import SUBSCRIPTION_ROUTES
+from opta_lmx.proxy.subscription_proxy import SubscriptionClientPool
+from opta_lmx.router.strategy import TaskRouter
+from opta_lmx.runtime.engine_ipc import RemoteEngine, engine_socket_paths
+from opta_lmx.security.jwt_verifier import SupabaseJWTVerifier
+
+logger = logging.getLogger(__name__)
+
+ENV_CONFIG = "OPTA_LMX_CONFIG"
+ENV_IPC_DIR = "OPTA_LMX_IPC_DIR"
+
+# Hop-by-hop headers (RFC 9110 §7.6.1) plus host, which httpx sets itself.
+_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+        "host",
+    }
+)
+
+
+class ForwardingMetricsCollector(MetricsCollector):
+    """Local collector that also ships every request metric to the engine process."""
+
+    def __init__(self, remote: RemoteEngine) -> None:
+        super().__init__()
+        self._remote = remote
+
+    def record(self, metric: RequestMetric) -> None:
+        super().record(metric)
+        self._remote.record_metric(metric)
+
+
+def create_frontend_app(
+    config: LMXConfig | None = None,
+    *,
+    ipc_dir: Path | None = None,
+) -> FastAPI:
+    """Build a front-end app. With no arguments, reads the CLI's environment."""
+    if config is None:
+        config_path = os.environ.get(ENV_CONFIG)
+        config = load_config(Path(config_path) if config_path else None)
+    if ipc_dir is None:
+        ipc_dir = Path(os.environ.get(ENV_IPC_DIR) or config.server.ipc_dir)
+    ipc_path, http_path = engine_socket_paths(ipc_dir)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        event_bus = EventBus(
+            ring_size=config.server.sse_replay_buffer_size,
+            coalesce_keys=config.server.sse_coalesce_event_keys,
+        )
+        remote = RemoteEngine(ipc_path, event_bus=event_bus)
+        await remote.connect()
+        app.state.engine = remote
+        app.state.event_bus = event_bus
+        app.state.metrics = ForwardingMetricsCollector(remote)
+        app.state.stream_coalescer = StreamCoalescer.from_config(config.streaming)
+        app.state.router = TaskRouter(
+            config.routing,
+            stats_provider=remote.get_model_routing_stats,
+        )
+        preset_manager = PresetManager(config.presets.directory)
+        if config.presets.enabled:
+            preset_manager.load_presets()
+        app.state.preset_manager = preset_manager
+        app.state.embedding_engine = None
+        app.state.admin_key = config.security.admin_key
+        app.state.inference_api_key = config.security.inference_api_key
+        app.state.supabase_jwt_enabled = config.security.supabase_jwt_enabled
+        app.state.supabase_jwt_require = config.security.supabase_jwt_require
+        jwt_verifier = (
+            SupabaseJWTVerifier(
+                issuer=config.security.supabase_jwt_issuer,
+                audience=config.security.supabase_jwt_audience,
+                jwks_url=config.security.supabase_jwt_jwks_url,
+                user_id_claim=config.security.supabase_jwt_claim_user_id,
+                cache_ttl_sec=config.security.supabase_jwt_jwks_cache_ttl_sec,
+                token_cache_size=config.security.supabase_jwt_token_cache_size,
+            )
+            if config.security.supabase_jwt_enabled
+            else None
+        )
+        app.state.supabase_jwt_verifier = jwt_verifier
+        if jwt_verifier is not None and config.security.supabase_jwt_background_refresh:
+            jwt_verifier.start_background_refresh()
+        # Subscription proxy: each front-end keeps its own upstream pool and token cache.
+        subscription_clients = SubscriptionClientPool(
+            max_connections=config.subscription_proxy.max_connections,
+            max_keepalive_connections=config.subscription_proxy.max_keepalive_connections,
+            keepalive_expiry_sec=config.subscription_proxy.keepalive_expiry_sec,
+            http2=config.subscription_proxy.http2,
+        )
+        app.state.subscription_clients = subscription_clients
+        if config.subscription_proxy.token_background_refresh:
+            keychain_reader.start_background_refresh(r.provider_id for r in SUBSCRIPTION_ROUTES)
+        app.state.engine_http = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(uds=str(http_path)),
+            base_url="http://opta-lmx-engine",
+            timeout=httpx.Timeout(config.server.timeout_sec, connect=10.0),
+        )
+        logger.info("frontend_started", extra={"pid": os.getpid(), "ipc": str(ipc_path)})
+        try:
+            yield
+        finally:
+            if jwt_verifier is not None:
+                await jwt_verifier.stop_background_refresh()
+            await keychain_reader.stop_background_refresh()
+            await subscription_clients.aclose()
+            await app.state.engine_http.aclose()
+            await remote.close()
+
+    app = FastAPI(title="Opta-LMX", lifespan=lifespan)
+    app.state.config = config
+    if config.security.rate_limit.enabled:
+        from opta_lmx.api.rate_limit import SLOWAPI_AVAILABLE, limiter
+
+        if SLOWAPI_AVAILABLE:
+            from slowapi import _rate_limit_exceeded_handler
+            from slowapi.errors import RateLimitExceeded
+
+            limiter.enabled = True
+            app.state.limiter = limiter
+            app.add_exception_handler(
+                RateLimitExceeded,
+                cast(Any, _rate_limit_exceeded_handler),
+            )
+
+    configure_token_budget(app, config)
+
+    local_router = APIRouter()
+    local_router.add_api_route(
+        "/admin/events", admin_event_stream, methods=["GET"], response_model=None
+    )
+    app.include_router(local_router)
+    app.include_router(inference_router)
+    if config.server.websocket_enabled:
+        app.include_router(websocket_router)
+    app.add_api_route(
+        "/{path:path}",
+        _proxy_to_engine,
+        methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD"],
+        include_in_schema=False,
+    )
+    return app
+
+
+async def _proxy_to_engine(request: Request, path: str) -> StreamingResponse:
+    """Forward a request to the engine process, streaming both bodies."""
+    client: httpx.AsyncClient = request.app.state.engine_http
+    headers = [(k, v) for k, v in request.headers.items() if k.lower() not in _HOP_HEADERS]
+    upstream_request = client.build_request(
+        request.method,
+        httpx.URL(path="/" + path, query=request.url.query.encode()),
+        headers=headers,
+        content=request.stream(),
+    )
+    upstream = await client.send(upstream_request, stream=True)
+    response_headers = {k: v for k, v in upstream.headers.items() if k.lower() not in _HOP_HEADERS}
+    return StreamingResponse(
+        upstream.aiter_raw(),
+        status_code=upstream.status_code,
+        headers=response_headers,
+        background=BackgroundTask(upstream.aclose),
+    )
+
+
+def run_split_server(
+    app: FastAPI,
+    config: LMXConfig,
+    *,
+    config_path: Path | None,
+    log_level: str,
+) -> None:
+    """Run ``app`` as the engine process behind ``server.workers`` front-ends.
+
+    Blocks until the engine process exits; the front-end supervisor is
+    terminated with it.
+    """
+    import uvicorn
+
+    ipc_dir = Path(config.server.ipc_dir).expanduser()
+    ipc_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+    _, http_path = engine_socket_paths(ipc_dir)
+    with contextlib.suppress(FileNotFoundError):
+        http_path.unlink()
+
+    env = {**os.environ, ENV_IPC_DIR: str(ipc_dir)}
+    if config_path is not None:
+        env[ENV_CONFIG] = str(config_path)
+    command: list[Any] = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "opta_lmx.frontend:create_frontend_app",
+        "--factory",
+        "--host",
+        config.server.host,
+        "--port",
+        str(config.server.port),
+        "--workers",
+        str(config.server.workers),
+        "--timeout-keep-alive",
+        str(config.server.timeout_sec),
+        "--log-level",
+        log_level.lower(),
+    ]
+    frontends = subprocess.Popen([str(part) for part in command], env=env)
+    logger.info(
+        "frontends_started",
+        extra={"workers": config.server.workers, "supervisor_pid": frontends.pid},
+    )
+    try:
+        uvicorn.run(
+            app,
+            uds=str(http_path),
+            timeout_keep_alive=config.server.timeout_sec,
+            log_level=log_level.lower(),
+            ws_max_size=1_048_576,
+        )
+    finally:
+        frontends.terminate()
+        try:
+            frontends.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            frontends.kill()
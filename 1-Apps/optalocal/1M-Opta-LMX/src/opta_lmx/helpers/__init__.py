@@ -1,5 +1,6 @@
 """Helper node client for distributed embedding and reranking on LAN devices."""
 
 from opta_lmx.helpers.client import HelperNodeClient
+from opta_lmx.helpers.pool import HelperNodePool
 
-__all__ = ["HelperNodeClient"]
+__all__ = ["HelperNodeClient", "HelperNodePool"]
@@ -48,7 +48,13 @@ class HelperNodeClient:
         self._client = httpx.AsyncClient(
             base_url=config.url,
             timeout=httpx.Timeout(config.timeout_sec, connect=5.0),
-            limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=min(
+                    config.max_keepalive_connections, config.max_connections
+                ),
+                keepalive_expiry=config.keepalive_expiry_sec,
+            ),
         )
         self._healthy = True
         self._total_requests = 0
@@ -57,7 +63,11 @@ class HelperNodeClient:
         self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
         self._last_check_at: float = 0.0
         self._last_error: str | None = None
-        self.circuit_breaker = CircuitBreaker()
+        self._in_flight = 0
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=config.circuit_failure_threshold,
+            reset_timeout_sec=config.circuit_reset_timeout_sec,
+        )
         logger.info(
             "helper_node_created",
             extra={
@@ -82,11 +92,29 @@ class HelperNodeClient:
         """Fallback strategy: 'local' or 'skip'."""
         return self._config.fallback
 
+    @property
+    def weight(self) -> float:
+        """Relative share of pool traffic for this node."""
+        return self._config.weight
+
     @property
     def is_healthy(self) -> bool:
         """Whether the last request succeeded."""
         return self._healthy
 
+    @property
+    def in_flight(self) -> int:
+        """Requests currently outstanding against this node."""
+        return self._in_flight
+
+    def latency_percentile(self, percentile: float) -> float | None:
+        """Return the given latency percentile in seconds, or None without samples."""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(int(len(ordered) * percentile / 100.0), len(ordered) - 1)
+        return ordered[index]
+
     async def embed(self, texts: list[str]) -> list[list[float]]:
         """Send an embedding request to the helper node.
 
@@ -112,6 +140,7 @@ class HelperNodeClient:
                 fallback=self._config.fallback,
             )
         start = time.monotonic()
+        self._in_flight += 1
         try:
             resp = await self._client.post("/v1/embeddings", json=payload)
             resp.raise_for_status()
@@ -149,6 +178,8 @@ class HelperNodeClient:
                 f"Helper node embedding failed at {self._config.url}: {e}",
                 fallback=self._config.fallback,
             ) from e
+        finally:
+            self._in_flight -= 1
 
     async def rerank(
         self,
@@ -185,6 +216,7 @@ class HelperNodeClient:
                 fallback=self._config.fallback,
             )
         start = time.monotonic()
+        self._in_flight += 1
         try:
             resp = await self._client.post("/v1/rerank", json=payload)
             resp.raise_for_status()
@@ -227,6 +259,8 @@ class HelperNodeClient:
                 f"Helper node reranking failed at {self._config.url}: {e}",
                 fallback=self._config.fallback,
             ) from e
+        finally:
+            self._in_flight -= 1
 
     async def health_check(self) -> bool:
         """Check if the helper node is reachable.
@@ -253,9 +287,7 @@ class HelperNodeClient:
         latency_list = list(self._latencies)
         avg_latency = sum(latency_list) / len(latency_list) if latency_list else 0.0
         if len(latency_list) >= 2:
-            sorted_latencies = sorted(latency_list)
-            p95_idx = min(int(len(sorted_latencies) * 0.95), len(sorted_latencies) - 1)
-            p95_latency = sorted_latencies[p95_idx]
+            p95_latency = self.latency_percentile(95.0) or 0.0
         else:
             p95_latency = avg_latency
 
@@ -277,6 +309,8 @@ class HelperNodeClient:
             "last_check_at": self._last_check_at,
             "last_error": self._last_error,
             "circuit_state": self.circuit_breaker.state.value,
+            "weight": self._config.weight,
+            "in_flight": self._in_flight,
         }
 
     async def close(self) -> None:
@@ -0,0 +1,288 @@
+"""Helper node pool — balance embedding/reranking across several LAN devices.
+
+A pool wraps one HelperNodeClient per configured endpoint and exposes the
+same surface as a single client (``embed``, ``rerank``, ``health_check``,
+``get_health_stats``, ``close``), so API handlers do not care whether one
+node or many are configured.
+
+Per request the pool:
+- Skips nodes whose circuit breaker is open.
+- Picks a node by weighted round-robin or least p95 latency per unit weight.
+- Shards large embedding batches across available nodes, proportional to weight.
+- Optionally hedges: if the primary has not answered by its latency
+  percentile, the same request is sent to a second node and the first
+  answer wins.
+- Fails over to the next node on error before giving up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from opta_lmx.config import HelperNodePoolConfig
+from opta_lmx.helpers.circuit_breaker import CircuitBreaker, CircuitState
+from opta_lmx.helpers.client import HelperNodeClient, HelperNodeError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HelperNodePool:
+    """Load-balanced pool of helper node clients for a single capability."""
+
+    def __init__(
+        self,
+        config: HelperNodePoolConfig,
+        clients: list[HelperNodeClient] | None = None,
+    ) -> None:
+        self._config = config
+        self._clients = clients or [HelperNodeClient(ep) for ep in config.endpoints]
+        # Smooth weighted round-robin state (nginx style), one entry per client.
+        self._rr_current: list[float] = [0.0] * len(self._clients)
+        self._shard_count = 0
+        self._hedge_count = 0
+        self._hedge_wins = 0
+        self._failover_count = 0
+        logger.info(
+            "helper_pool_created",
+            extra={
+                "nodes": [c.url for c in self._clients],
+                "strategy": config.strategy,
+                "hedge_enabled": config.hedge_enabled,
+            },
+        )
+
+    # ── Client-compatible properties ──────────────────────────────────────
+
+    @property
+    def clients(self) -> list[HelperNodeClient]:
+        """Underlying per-node clients (for health checks)."""
+        return list(self._clients)
+
+    @property
+    def url(self) -> str:
+        """Comma-separated base URLs of every node in the pool."""
+        return ",".join(c.url for c in self._clients)
+
+    @property
+    def model(self) -> str:
+        """Model name served by the pool (taken from the first endpoint)."""
+        return self._clients[0].model
+
+    @property
+    def fallback(self) -> str:
+        """Fallback strategy once every node has failed: 'local' or 'skip'."""
+        return self._config.fallback
+
+    @property
+    def is_healthy(self) -> bool:
+        """Whether at least one node is healthy."""
+        return any(c.is_healthy for c in self._clients)
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Breaker of the best-state node (closed > half-open > open)."""
+        rank = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+        best = min(self._clients, key=lambda c: rank[c.circuit_breaker.state])
+        return best.circuit_breaker
+
+    # ── Node selection ────────────────────────────────────────────────────
+
+    def _available(self, exclude: set[int]) -> list[int]:
+        return [
+            i
+            for i, client in enumerate(self._clients)
+            if i not in exclude and client.circuit_breaker.allows_request
+        ]
+
+    def _pick(self, exclude: set[int]) -> int | None:
+        """Choose the next node index, or None if no node is available."""
+        available = self._available(exclude)
+        if not available:
+            return None
+        if len(available) == 1:
+            return available[0]
+        if self._config.strategy == "weighted":
+            return self._pick_weighted(available)
+        return min(available, key=self._latency_score)
+
+    def _pick_weighted(self, available: list[int]) -> int:
+        total = 0.0
+        best = available[0]
+        for i in available:
+            weight = self._clients[i].weight
+            self._rr_current[i] += weight
+            total += weight
+            if self._rr_current[i] > self._rr_current[best]:
+                best = i
+        self._rr_current[best] -= total
+        return best
+
+    def _latency_score(self, index: int) -> tuple[float, int]:
+        client = self._clients[index]
+        p95 = client.latency_percentile(95.0)
+        # Unmeasured nodes score zero so they receive traffic and get a latency signal.
+        latency = 0.0 if p95 is None else p95 * (client.in_flight + 1)
+        return (latency / client.weight, client.in_flight)
+
+    def _hedge_delay_sec(self, index: int) -> float:
+        floor = self._config.hedge_min_delay_ms / 1000.0
+        observed = self._clients[index].latency_percentile(self._config.hedge_percentile)
+        return max(floor, observed or 0.0)
+
+    # ── Request execution ─────────────────────────────────────────────────
+
+    async def _call(
+        self,
+        op: Callable[[HelperNodeClient], Awaitable[T]],
+        exclude: set[int] | None = None,
+    ) -> T:
+        """Run ``op`` on one node with hedging and failover across the pool."""
+        tried: set[int] = set(exclude or ())
+        last_error: Exception | None = None
+
+        while True:
+            primary = self._pick(tried)
+            if primary is None:
+                break
+            tried.add(primary)
+            try:
+                if self._config.hedge_enabled:
+                    return await self._call_hedged(op, primary, tried)
+                return await op(self._clients[primary])
+            except HelperNodeError as e:
+                last_error = e
+                self._failover_count += 1
+                logger.warning(
+                    "helper_pool_failover",
+                    extra={"url": self._clients[primary].url, "error": str(e)},
+                )
+
+        raise HelperNodeError(
+            f"All helper nodes failed ({len(self._clients)} configured): {last_error}",
+            fallback=self._config.fallback,
+        )
+
+    async def _call_hedged(
+        self,
+        op: Callable[[HelperNodeClient], Awaitable[T]],
+        primary: int,
+        tried: set[int],
+    ) -> T:
+        """Race the primary against a delayed hedge on a second node."""
+        primary_task = asyncio.ensure_future(op(self._clients[primary]))
+        tasks: list[asyncio.Future[T]] = [primary_task]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self._hedge_delay_sec(primary))
+            if done:
+                return primary_task.result()
+
+            secondary = self._pick(tried)
+            if secondary is None:
+                return await primary_task
+            tried.add(secondary)
+            self._hedge_count += 1
+            hedge_task = asyncio.ensure_future(op(self._clients[secondary]))
+            tasks.append(hedge_task)
+
+            pending: set[asyncio.Future[T]] = set(tasks)
+            first_error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is hedge_task:
+                            self._hedge_wins += 1
+                        return task.result()
+                    first_error = first_error or error
+            if first_error is None:
+                raise HelperNodeError("Hedged request returned no result", fallback=self.fallback)
+            raise first_error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _shard(self, texts: list[str], nodes: list[int]) -> list[tuple[int, list[str]]]:
+        """Split texts into contiguous shards sized proportionally to node weight."""
+        total_weight = sum(self._clients[i].weight for i in nodes)
+        shards: list[tuple[int, list[str]]] = []
+        start = 0
+        for position, node in enumerate(nodes):
+            if position == len(nodes) - 1:
+                end = len(texts)
+            else:
+                share = self._clients[node].weight / total_weight
+                end = min(len(texts), start + max(1, round(len(texts) * share)))
+            if end > start:
+                shards.append((node, texts[start:end]))
+            start = end
+        return shards
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts across the pool, sharding large batches.
+
+        Raises:
+            HelperNodeError: If no node could serve (part of) the batch.
+        """
+        available = self._available(set())
+        if len(texts) <= self._config.shard_min_batch or len(available) < 2:
+            return await self._call(lambda client: client.embed(texts))
+
+        shards = self._shard(texts, available)
+        self._shard_count += 1
+        logger.info(
+            "helper_pool_embed_sharded",
+            extra={"count": len(texts), "shards": [len(chunk) for _, chunk in shards]},
+        )
+
+        async def _run_shard(node: int, chunk: list[str]) -> list[list[float]]:
+            try:
+                return await self._clients[node].embed(chunk)
+            except HelperNodeError:
+                self._failover_count += 1
+                return await self._call(lambda client: client.embed(chunk), exclude={node})
+
+        results = await asyncio.gather(*(_run_shard(node, chunk) for node, chunk in shards))
+        return [vector for shard_vectors in results for vector in shard_vectors]
+
+    async def rerank(
+        self,
+        query: str,
+        documents: list[str],
+        top_n: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Rerank documents on one node of the pool (with hedging/failover)."""
+        return await self._call(lambda client: client.rerank(query, documents, top_n=top_n))
+
+    async def health_check(self) -> bool:
+        """Probe every node; True if at least one responds."""
+        results = await asyncio.gather(*(c.health_check() for c in self._clients))
+        return any(results)
+
+    def get_health_stats(self) -> dict[str, Any]:
+        """Return pool-level counters plus per-node health stats."""
+        nodes = [c.get_health_stats() for c in self._clients]
+        return {
+            "url": self.url,
+            "model": self.model,
+            "healthy": self.is_healthy,
+            "fallback": self.fallback,
+            "strategy": self._config.strategy,
+            "total_requests": sum(n["total_requests"] for n in nodes),
+            "sharded_batches": self._shard_count,
+            "hedged_requests": self._hedge_count,
+            "hedge_wins": self._hedge_wins,
+            "failovers": self._failover_count,
+            "circuit_state": self.circuit_breaker.state.value,
+            "nodes": nodes,
+        }
+
+    async def close(self) -> None:
+        """Close every node client."""
+        await asyncio.gather(*(c.close() for c in self._clients))
@@ -0,0 +1,393 @@
+"""Latency-aware admission control for inference requests.
+
+Requests are admitted against a prediction of how long they would queue and
+run, so a burst fails fast with a useful ``Retry-After`` instead of piling up
+in the slot semaphores until ``semaphore_timeout_sec`` expires:
+
+- Per-model service times are learned as an EWMA of seconds per *cost unit*
+  (output tokens plus a prefill-discounted share of prompt tokens), so a
+  request's predicted run time scales with its size. Output length is
+  predicted from an EWMA of observed completions (capped by ``max_tokens``),
+  not the worst-case budget.
+- Queued and running requests are tracked per model, and each model's queue
+  is judged against that model's own slot capacity and queue depth, so a
+  backlog on one model does not shed requests for another.
+- Predicted queue wait is zero while a slot is free. Otherwise each queued
+  request takes the next slot to free up, and a new request waits until the
+  earliest slot frees after those.
+- Priority classes: ``high`` bypasses the queue entirely (see
+  :class:`~opta_lmx.inference.engine_concurrency.ConcurrencyController`),
+  ``low`` may only fill half of its model's queue and is shed first under
+  overload.
+- A CoDel-style controller tracks the minimum queue delay per interval. When
+  even the best-case delay stays above target for a whole interval (a
+  standing queue), queue waits are capped at twice the target and requests
+  that already waited longer are shed when they reach a slot.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# A prompt token costs roughly a tenth of a generated token (prefill is batched).
+_PREFILL_COST_RATIO = 0.1
+_SERVICE_EWMA_ALPHA = 0.3
+# Output budget assumed when the client sets no max_tokens (fit_to_context's reserve).
+_DEFAULT_MAX_TOKENS = 1024
+# Share of the queue depth each priority class may fill before it is rejected.
+_PRIORITY_QUEUE_SHARE: dict[str, float] = {"high": 1.0, "normal": 1.0, "low": 0.5}
+_MIN_RETRY_AFTER_SEC = 1
+_MAX_RETRY_AFTER_SEC = 120
+# Used when there is no service-time history to estimate the drain time from.
+_FALLBACK_RETRY_AFTER_SEC = 5
+
+
+class AdmissionRejectedError(RuntimeError):
+    """A request was shed by admission control.
+
+    The message keeps the ``Server is busy`` prefix that the API layer maps to
+    HTTP 429; ``retry_after_sec`` is the suggested ``Retry-After`` value.
+    """
+
+    def __init__(self, reason: str, detail: str, retry_after_sec: int) -> None:
+        super().__init__(f"Server is busy — {detail}. Retry after {retry_after_sec}s.")
+        self.reason = reason
+        self.retry_after_sec = retry_after_sec
+
+
+@dataclass(eq=False)
+class AdmissionTicket:
+    """One admitted request, tracked from enqueue until it finishes."""
+
+    model_id: str
+    priority: str
+    predicted_service_sec: float | None
+    enqueued_at: float
+    started_at: float | None = None
+
+
+class AdmissionController:
+    """Admit, shed, and time inference requests queued for slots.
+
+    Args:
+        max_queue_depth: Requests allowed to wait for a slot at once, per model.
+        max_queue_wait_sec: Longest acceptable queue wait (the slot timeout).
+        codel_target_sec: Acceptable standing queue delay.
+        codel_interval_sec: Window over which the minimum delay is judged.
+        clock: Monotonic clock, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_queue_depth: int = 64,
+        max_queue_wait_sec: float = 30.0,
+        codel_target_sec: float = 1.0,
+        codel_interval_sec: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_queue_depth = max(1, max_queue_depth)
+        self._max_queue_wait_sec = max_queue_wait_sec
+        self._codel_target_sec = codel_target_sec
+        self._codel_interval_sec = codel_interval_sec
+        self._clock = clock
+
+        # model_id -> tickets; empty sets are dropped
+        self._queued: dict[str, set[AdmissionTicket]] = {}
+        self._running: dict[str, set[AdmissionTicket]] = {}
+        self._sec_per_unit: dict[str, float] = {}
+        self._output_tokens: dict[str, float] = {}
+
+        self._codel_interval_ends = clock() + codel_interval_sec
+        self._codel_min_delay: float | None = None
+        self._overloaded = False
+
+        self._admitted_total = 0
+        self._rejected_by_reason: dict[str, int] = {}
+
+    # ── Service-time model ─────────────────────────────────────────────
+
+    @staticmethod
+    def cost_units(prompt_tokens: int, output_tokens: int) -> float:
+        """Relative cost of a request: output tokens plus discounted prefill."""
+        return max(0, output_tokens) + max(0, prompt_tokens) * _PREFILL_COST_RATIO
+
+    def predict_service_sec(
+        self, model_id: str, prompt_tokens: int, max_tokens: int | None
+    ) -> float | None:
+        """Predicted run time for a request, or None without history for the model."""
+        rate = self._sec_per_unit.get(model_id)
+        if rate is None:
+            return None
+        output_tokens = max_tokens or _DEFAULT_MAX_TOKENS
+        typical = self._output_tokens.get(model_id)
+        if typical is not None:
+            output_tokens = min(output_tokens, math.ceil(typical))
+        return rate * self.cost_units(prompt_tokens, output_tokens)
+
+    def record_service(
+        self,
+        model_id: str,
+        service_sec: float,
+        *,
+        prompt_tokens: int,
+        completion_tokens: int,
+    ) -> None:
+        """Feed one completed request's slot-held time and output length into the EWMAs."""
+        units = self.cost_units(prompt_tokens, completion_tokens)
+        if units <= 0 or service_sec <= 0:
+            return
+        _ewma_update(self._sec_per_unit, model_id, service_sec / units)
+        _ewma_update(self._output_tokens, model_id, float(max(0, completion_tokens)))
+
+    def _remaining_sec(self, ticket: AdmissionTicket, now: float) -> float:
+        if ticket.predicted_service_sec is None or ticket.started_at is None:
+            return 0.0
+        return max(0.0, ticket.predicted_service_sec - (now - ticket.started_at))
+
+    def pending_work_sec(self) -> float:
+        """Predicted seconds of work queued plus the remainder of running requests."""
+        now = self._clock()
+        work = sum(t.predicted_service_sec or 0.0 for q in self._queued.values() for t in q)
+        return work + sum(self._remaining_sec(t, now) for r in self._running.values() for t in r)
+
+    def predicted_queue_wait_sec(self, model_id: str | None, capacity: int) -> float:
+        """Predicted wait for a slot if a request for ``model_id`` were queued now.
+
+        Zero while the model's running plus queued requests leave a slot free.
+        Otherwise its queue is replayed onto the slots in arrival order, each
+        queued request taking whichever slot frees first. ``None`` gives the
+        longest wait across models.
+        """
+        if model_id is None:
+            models = self._queued.keys() | self._running.keys()
+            return max((self.predicted_queue_wait_sec(m, capacity) for m in models), default=0.0)
+        capacity = max(1, capacity)
+        queued = self._queued.get(model_id, set())
+        running = self._running.get(model_id, set())
+        if len(running) + len(queued) < capacity:
+            return 0.0
+        now = self._clock()
+        free_at = [self._remaining_sec(t, now) for t in running]
+        free_at += [0.0] * max(0, capacity - len(free_at))
+        heapq.heapify(free_at)
+        # More running than slots (capacity shrank): the earliest finishers
+        # only bring the count back down to capacity.
+        while len(free_at) > capacity:
+            heapq.heappop(free_at)
+        for ticket in sorted(queued, key=lambda t: t.enqueued_at):
+            slot_free = heapq.heappop(free_at)
+            heapq.heappush(free_at, slot_free + (ticket.predicted_service_sec or 0.0))
+        return free_at[0]
+
+    def retry_after_sec(self, model_id: str | None, capacity: int) -> int:
+        """Suggested ``Retry-After``: predicted time for the model's backlog to drain.
+
+        ``None`` uses the slowest-draining model.
+        """
+        drain = self.predicted_queue_wait_sec(model_id, capacity)
+        if drain <= 0:
+            return _FALLBACK_RETRY_AFTER_SEC
+        return max(_MIN_RETRY_AFTER_SEC, min(_MAX_RETRY_AFTER_SEC, math.ceil(drain)))
+
+    # ── Queue lifecycle ────────────────────────────────────────────────
+
+    @property
+    def overloaded(self) -> bool:
+        """Whether CoDel has detected a standing queue."""
+        return self._overloaded
+
+    @property
+    def queued_count(self) -> int:
+        """Requests admitted and still waiting for a slot, across all models."""
+        return sum(len(q) for q in self._queued.values())
+
+    @property
+    def running_count(self) -> int:
+        """Requests holding their slots, across all models."""
+        return sum(len(r) for r in self._running.values())
+
+    def queue_timeout_sec(self) -> float:
+        """Slot wait budget for a newly queued request."""
+        if self._overloaded:
+            return min(self._max_queue_wait_sec, 2 * self._codel_target_sec)
+        return self._max_queue_wait_sec
+
+    def admit(
+        self,
+        *,
+        model_id: str,
+        priority: str,
+        prompt_tokens: int,
+        max_tokens: int | None,
+        capacity: int,
+        deadline_sec: float | None = None,
+    ) -> AdmissionTicket:
+        """Queue a request or raise :class:`AdmissionRejectedError`.
+
+        Args:
+            model_id: Model the request targets.
+            priority: Priority class (``high``, ``normal`` or ``low``).
+            prompt_tokens: Estimated prompt size.
+            max_tokens: Requested output budget (None = server default).
+            capacity: Slots currently available to this model.
+            deadline_sec: Client timeout; requests predicted to miss it are rejected.
+        """
+        depth_limit = max(1, int(self._max_queue_depth * _PRIORITY_QUEUE_SHARE.get(priority, 1.0)))
+        queued = len(self._queued.get(model_id, ()))
+        if queued >= depth_limit:
+            raise self._rejection(
+                "queue_full",
+                f"{queued} requests already queued for {model_id}",
+                model_id,
+                capacity,
+            )
+        if priority == "low" and self._overloaded:
+            raise self._rejection(
+                "overloaded",
+                "shedding low-priority work under a standing queue",
+                model_id,
+                capacity,
+            )
+
+        predicted_wait = self.predicted_queue_wait_sec(model_id, capacity)
+        if predicted_wait > self._max_queue_wait_sec:
+            raise self._rejection(
+                "predicted_queue_wait",
+                f"predicted queue wait {predicted_wait:.1f}s exceeds "
+                f"{self._max_queue_wait_sec:.0f}s",
+                model_id,
+                capacity,
+            )
+        predicted_service = self.predict_service_sec(model_id, prompt_tokens, max_tokens)
+        if deadline_sec is not None:
+            predicted_total = predicted_wait + (predicted_service or 0.0)
+            if predicted_total > deadline_sec:
+                raise self._rejection(
+                    "deadline_unreachable",
+                    f"predicted completion in {predicted_total:.1f}s exceeds "
+                    f"the request timeout of {deadline_sec:.1f}s",
+                    model_id,
+                    capacity,
+                )
+
+        ticket = AdmissionTicket(
+            model_id=model_id,
+            priority=priority,
+            predicted_service_sec=predicted_service,
+            enqueued_at=self._clock(),
+        )
+        self._queued.setdefault(model_id, set()).add(ticket)
+        self._admitted_total += 1
+        return ticket
+
+    def start(self, ticket: AdmissionTicket, *, capacity: int) -> None:
+        """Move a ticket from the queue to running once it holds its slots.
+
+        Raises:
+            AdmissionRejectedError: CoDel sheds the request because it waited
+                past the overload budget.
+        """
+        _discard(self._queued, ticket)
+        now = self._clock()
+        sojourn = now - ticket.enqueued_at
+        self._observe_queue_delay(sojourn, now)
+        if self._overloaded and sojourn > 2 * self._codel_target_sec:
+            raise self._rejection(
+                "codel_shed",
+                f"queued {sojourn:.1f}s under a standing queue",
+                ticket.model_id,
+                capacity,
+            )
+        ticket.started_at = now
+        self._running.setdefault(ticket.model_id, set()).add(ticket)
+
+    def expire(self, ticket: AdmissionTicket, *, capacity: int) -> AdmissionRejectedError:
+        """Drop a ticket whose slot wait timed out; returns the error to raise."""
+        _discard(self._queued, ticket)
+        now = self._clock()
+        self._observe_queue_delay(now - ticket.enqueued_at, now)
+        return self._rejection(
+            "queue_timeout", "all inference slots occupied", ticket.model_id, capacity
+        )
+
+    def finish(self, ticket: AdmissionTicket) -> None:
+        """Forget a ticket (completed, failed, cancelled or shed)."""
+        _discard(self._queued, ticket)
+        _discard(self._running, ticket)
+
+    def _observe_queue_delay(self, delay: float, now: float) -> None:
+        if self._codel_min_delay is None or delay < self._codel_min_delay:
+            self._codel_min_delay = delay
+        if now < self._codel_interval_ends:
+            return
+        overloaded = self._codel_min_delay > self._codel_target_sec
+        if overloaded != self._overloaded:
+            logger.warning(
+                "admission_overload_changed",
+                extra={
+                    "overloaded": overloaded,
+                    "min_queue_delay_sec": round(self._codel_min_delay, 3),
+                    "target_sec": self._codel_target_sec,
+                },
+            )
+        self._overloaded = overloaded
+        self._codel_min_delay = None
+        self._codel_interval_ends = now + self._codel_interval_sec
+
+    def _rejection(
+        self, reason: str, detail: str, model_id: str, capacity: int
+    ) -> AdmissionRejectedError:
+        self._rejected_by_reason[reason] = self._rejected_by_reason.get(reason, 0) + 1
+        retry_after = self.retry_after_sec(model_id, capacity)
+        logger.warning(
+            "admission_rejected",
+            extra={
+                "reason": reason,
+                "detail": detail,
+                "model_id": model_id,
+                "queued": len(self._queued.get(model_id, ())),
+                "running": len(self._running.get(model_id, ())),
+                "retry_after_sec": retry_after,
+            },
+        )
+        return AdmissionRejectedError(reason, detail, retry_after)
+
+    def stats(self) -> dict[str, int | float]:
+        """Queue/running counts, overload flag, pending work, and admit/reject totals."""
+        stats: dict[str, int | float] = {
+            "queued": self.queued_count,
+            "running": self.running_count,
+            "overloaded": int(self._overloaded),
+            "pending_work_sec": round(self.pending_work_sec(), 3),
+            "admitted_total": self._admitted_total,
+            "rejected_total": sum(self._rejected_by_reason.values()),
+        }
+        for reason, count in sorted(self._rejected_by_reason.items()):
+            stats[f"rejected_{reason}_total"] = count
+        return stats
+
+
+def _discard(tickets: dict[str, set[AdmissionTicket]], ticket: AdmissionTicket) -> None:
+    bucket = tickets.get(ticket.model_id)
+    if bucket is None:
+        return
+    bucket.discard(ticket)
+    if not bucket:
+        del tickets[ticket.model_id]
+
+
+def _ewma_update(values: dict[str, float], key: str, sample: float) -> None:
+    previous = values.get(key)
+    values[key] = (
+        sample
+        if previous is None
+        else _SERVICE_EWMA_ALPHA * sample + (1.0 - _SERVICE_EWMA_ALPHA) * previous
+    )
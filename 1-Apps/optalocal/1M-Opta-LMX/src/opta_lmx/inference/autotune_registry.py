@@ -109,6 +109,32 @@ class AutotuneRegistry:
         value = data.get(key)
         return dict(value) if isinstance(value, dict) else None
 
+    def find_stale(
+        self,
+        *,
+        model_id: str,
+        backend: str,
+        backend_version: str,
+    ) -> dict[str, Any] | None:
+        """Return the newest record for model/backend tuned on another backend version.
+
+        None when the current version already has a record (nothing to re-tune)
+        or when the model was never tuned on this backend.
+        """
+        if self.get_best(model_id=model_id, backend=backend, backend_version=backend_version):
+            return None
+        stale: list[dict[str, Any]] = [
+            value
+            for value in self._load().values()
+            if value.get("model_id") == model_id
+            and value.get("backend") == backend
+            and value.get("backend_version") != backend_version
+        ]
+        if not stale:
+            return None
+        newest = max(stale, key=lambda value: float(value.get("ts", 0.0) or 0.0))
+        return dict(newest)
+
     def save_scored_profile(
         self,
         *,
@@ -0,0 +1,410 @@
+"""Automatic autotune search over performance knobs.
+
+``/admin/models/autotune`` used to benchmark only the profiles the caller
+listed, one full unload/reload per profile, with a single stream each. This
+module searches a declared knob space instead:
+
+- **Successive halving** — every candidate gets a short measurement; the best
+  ``1/eta`` survive to the next rung, which measures ``eta`` times as many
+  requests. Most of the budget goes to the few profiles that matter.
+- **Hot knobs** — knobs the live engine can take without a reload (stream
+  interval, scheduler sequence cap) are applied in place. Candidates are
+  ordered so ones sharing the same reload-requiring ("cold") settings run
+  back to back on one load.
+- **Concurrent measurement** — each measurement drives ``concurrency``
+  simultaneous streams, so throughput reflects the batching scheduler rather
+  than a single request.
+
+Scores come from :func:`score_profile`; the winner is persisted through the
+engine's ``AutotuneRegistry`` under the current backend version.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from opta_lmx.inference.autotune_scoring import score_profile
+from opta_lmx.inference.engine_lifecycle import ModelRuntimeCompatibilityError
+from opta_lmx.inference.schema import ChatMessage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Knob:
+    """One tunable setting.
+
+    ``path`` is dotted into the performance-overrides dict
+    (``"scheduler.max_num_seqs"``). A ``None`` value leaves the setting at the
+    server default.
+    """
+
+    path: str
+    values: tuple[Any, ...]
+    hot: bool = False
+
+
+DEFAULT_SEARCH_SPACE: tuple[Knob, ...] = (
+    Knob("kv_bits", (None, 8, 4)),
+    Knob("scheduler.prefill_batch_size", (4, 8, 16)),
+    Knob("scheduler.max_num_seqs", (8, 32, 128), hot=True),
+    Knob("stream_interval", (1, 2, 4), hot=True),
+    Knob("speculative.num_tokens", (None, 3, 6)),
+    Knob("scheduler.cache_memory_percent", (0.2, 0.3, 0.4)),
+)
+
+HOT_KNOBS = frozenset(k.path for k in DEFAULT_SEARCH_SPACE if k.hot)
+
+
+def search_space_from_spec(spec: Mapping[str, Sequence[Any]]) -> tuple[Knob, ...]:
+    """Build a search space from ``{"dotted.path": [values...]}``."""
+    return tuple(
+        Knob(path, tuple(values), hot=path in HOT_KNOBS) for path, values in spec.items() if values
+    )
+
+
+def _set_path(profile: dict[str, Any], path: str, value: Any) -> None:
+    *parents, leaf = path.split(".")
+    node = profile
+    for part in parents:
+        child = node.get(part)
+        if not isinstance(child, dict):
+            child = {}
+            node[part] = child
+        node = child
+    node[leaf] = value
+
+
+def _pop_path(profile: dict[str, Any], path: str) -> tuple[bool, Any]:
+    *parents, leaf = path.split(".")
+    node: Any = profile
+    trail: list[tuple[dict[str, Any], str]] = []
+    for part in parents:
+        if not isinstance(node, dict) or not isinstance(node.get(part), dict):
+            return False, None
+        trail.append((node, part))
+        node = node[part]
+    if not isinstance(node, dict) or leaf not in node:
+        return False, None
+    value = node.pop(leaf)
+    for parent, part in reversed(trail):
+        if parent[part]:
+            break
+        del parent[part]
+    return True, value
+
+
+def _profile_key(profile: dict[str, Any]) -> str:
+    return json.dumps(profile, sort_keys=True, default=str)
+
+
+def split_hot(
+    profile: dict[str, Any], hot_paths: Iterable[str] = HOT_KNOBS
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Split a profile into (cold, hot) parts; cold settings need a reload."""
+    cold = json.loads(json.dumps(profile, default=str))
+    hot: dict[str, Any] = {}
+    for path in hot_paths:
+        found, value = _pop_path(cold, path)
+        if found:
+            _set_path(hot, path, value)
+    return cold, hot
+
+
+def _grid_profile(space: Sequence[Knob], index: int) -> dict[str, Any]:
+    """Decode a mixed-radix grid index; the last knob varies fastest."""
+    values: list[Any] = []
+    for knob in reversed(space):
+        index, digit = divmod(index, len(knob.values))
+        values.append(knob.values[digit])
+    profile: dict[str, Any] = {}
+    for knob, value in zip(space, reversed(values), strict=True):
+        if value is not None:
+            _set_path(profile, knob.path, value)
+    return profile
+
+
+def candidate_profiles(
+    space: Sequence[Knob],
+    *,
+    max_candidates: int,
+    seeds: Iterable[dict[str, Any]] = (),
+    rng_seed: int = 0,
+) -> list[dict[str, Any]]:
+    """Seed profiles first, then a deterministic sample of the knob grid.
+
+    Grid points are numbered in ``itertools.product`` order and only the
+    sampled indices are decoded, so a large space is never materialized.
+    """
+    total = math.prod(len(knob.values) for knob in space)
+    indices: Sequence[int] = range(total)
+    if total > max_candidates:
+        indices = random.Random(rng_seed).sample(indices, max_candidates)
+    grid = [_grid_profile(space, index) for index in indices]
+
+    out: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    for profile in [*seeds, *grid]:
+        key = _profile_key(profile)
+        if key not in seen:
+            seen.add(key)
+            out.append(profile)
+    return out[:max_candidates]
+
+
+async def measure_under_load(
+    engine: Any,
+    model_id: str,
+    *,
+    requests: int,
+    concurrency: int,
+    prompt: str,
+    max_tokens: int,
+    temperature: float,
+) -> dict[str, float]:
+    """Run ``requests`` streams, ``concurrency`` at a time, and summarize them.
+
+    ``avg_tokens_per_second`` is aggregate throughput (all tokens over wall
+    time), which is what the batching scheduler is tuned for.
+    ``queue_wait_ms`` is the engine's own slot wait, read back per stream
+    with ``pop_queue_wait_seconds`` when the engine reports it.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    pop_queue_wait = getattr(engine, "pop_queue_wait_seconds", None)
+
+    async def _one() -> tuple[float, float, int, float] | None:
+        async with semaphore:
+            start = time.monotonic()
+            ttft_ms: float | None = None
+            tokens = 0
+            try:
+                async for _token in engine.stream_generate(
+                    model_id=model_id,
+                    messages=[ChatMessage(role="user", content=prompt)],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                ):
+                    tokens += 1
+                    if ttft_ms is None:
+                        ttft_ms = (time.monotonic() - start) * 1000
+            except Exception as exc:
+                logger.debug("autotune_request_failed", extra={"error": str(exc)})
+                return None
+            total_ms = (time.monotonic() - start) * 1000
+            # Each stream runs in its own task, so this is this stream's wait.
+            queue_wait_sec = pop_queue_wait() if pop_queue_wait is not None else None
+            return (
+                (ttft_ms if ttft_ms is not None else total_ms),
+                total_ms,
+                tokens,
+                (queue_wait_sec or 0.0) * 1000,
+            )
+
+    started = time.monotonic()
+    results = await asyncio.gather(*(_one() for _ in range(requests)))
+    wall_sec = max(time.monotonic() - started, 1e-3)
+    ok = [r for r in results if r is not None and r[2] > 0]
+    metrics: dict[str, float] = {
+        "concurrency": float(concurrency),
+        "requests": float(requests),
+        "error_rate": round(1.0 - len(ok) / requests, 4) if requests else 1.0,
+        "queue_wait_ms": 0.0,
+    }
+    if not ok:
+        metrics.update(avg_tokens_per_second=0.0, avg_ttft_ms=0.0, avg_total_ms=0.0)
+        return metrics
+    ttfts = sorted(r[0] for r in ok)
+    metrics.update(
+        avg_tokens_per_second=round(sum(r[2] for r in ok) / wall_sec, 2),
+        per_stream_tokens_per_second=round(
+            sum(r[2] / max(r[1] / 1000, 1e-3) for r in ok) / len(ok), 2
+        ),
+        avg_ttft_ms=round(sum(ttfts) / len(ttfts), 2),
+        p95_ttft_ms=round(ttfts[min(len(ttfts) - 1, math.ceil(0.95 * len(ttfts)) - 1)], 2),
+        avg_total_ms=round(sum(r[1] for r in ok) / len(ok), 2),
+        queue_wait_ms=round(sum(r[3] for r in ok) / len(ok), 2),
+    )
+    return metrics
+
+
+@dataclass
+class AutotuneTrial:
+    """One measurement of one candidate at one rung."""
+
+    profile: dict[str, Any]
+    metrics: dict[str, float]
+    score: float
+    sort_key: tuple[float, float, float]
+    rung: int
+    failed: bool = False
+
+
+@dataclass
+class AutotuneOutcome:
+    trials: list[AutotuneTrial] = field(default_factory=list)
+    best: AutotuneTrial | None = None
+    reloads: int = 0
+    hot_applies: int = 0
+
+
+class AutotuneSearch:
+    """Successive-halving search for one model.
+
+    Args:
+        engine: The ``InferenceEngine``.
+        compose: Turns a candidate into the effective load profile (presets
+            underneath, candidate on top).
+        eta: Survivor fraction per rung is ``1/eta``.
+        concurrency: Simultaneous streams per measurement.
+        base_requests: Requests per candidate on rung 0; multiplied by ``eta``
+            on each later rung. Never fewer than ``concurrency``.
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        *,
+        compose: Callable[[dict[str, Any]], dict[str, Any]],
+        hot_paths: Iterable[str] = HOT_KNOBS,
+        eta: int = 2,
+        concurrency: int = 4,
+        base_requests: int = 4,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        allow_unsupported_runtime: bool = False,
+    ) -> None:
+        self._engine = engine
+        self._compose = compose
+        self._hot_paths = tuple(hot_paths)
+        self._eta = max(2, eta)
+        self._concurrency = max(1, concurrency)
+        self._base_requests = max(base_requests, self._concurrency)
+        self._prompt = prompt
+        self._max_tokens = max_tokens
+        self._temperature = temperature
+        self._allow_unsupported_runtime = allow_unsupported_runtime
+        self._loaded_cold_key: str | None = None
+
+    async def run(self, model_id: str, candidates: list[dict[str, Any]]) -> AutotuneOutcome:
+        """Search ``candidates``; load failures drop a candidate, not the search."""
+        outcome = AutotuneOutcome()
+        survivors = [self._compose(candidate) for candidate in candidates]
+        rung = 0
+        while survivors:
+            requests = self._base_requests * self._eta**rung
+            rung_trials: list[AutotuneTrial] = []
+            for profile in self._evaluation_order(survivors):
+                trial = await self._evaluate(model_id, profile, requests, rung, outcome)
+                rung_trials.append(trial)
+                outcome.trials.append(trial)
+            ranked = sorted((t for t in rung_trials if not t.failed), key=lambda t: t.sort_key)
+            logger.info(
+                "autotune_rung_complete",
+                extra={
+                    "model_id": model_id,
+                    "rung": rung,
+                    "candidates": len(rung_trials),
+                    "requests_per_candidate": requests,
+                    "best_score": ranked[0].score if ranked else None,
+                },
+            )
+            if not ranked:
+                break
+            outcome.best = ranked[0]
+            if len(ranked) == 1:
+                break
+            keep = math.ceil(len(ranked) / self._eta)
+            survivors = [t.profile for t in ranked[:keep]]
+            rung += 1
+        return outcome
+
+    def _evaluation_order(self, profiles: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Group candidates by cold settings, currently loaded group first."""
+
+        def _key(profile: dict[str, Any]) -> tuple[bool, str]:
+            cold_key = _profile_key(split_hot(profile, self._hot_paths)[0])
+            return cold_key != self._loaded_cold_key, cold_key
+
+        return sorted(profiles, key=_key)
+
+    async def _evaluate(
+        self,
+        model_id: str,
+        profile: dict[str, Any],
+        requests: int,
+        rung: int,
+        outcome: AutotuneOutcome,
+    ) -> AutotuneTrial:
+        cold, hot = split_hot(profile, self._hot_paths)
+        cold_key = _profile_key(cold)
+        applied_hot = (
+            cold_key == self._loaded_cold_key
+            and self._engine.is_model_loaded(model_id)
+            and self._engine.apply_hot_overrides(model_id, hot)
+        )
+        if applied_hot:
+            outcome.hot_applies += 1
+        else:
+            try:
+                await self._load(model_id, profile)
+            except ModelRuntimeCompatibilityError:
+                raise
+            except (MemoryError, OSError, RuntimeError) as exc:
+                logger.warning(
+                    "autotune_candidate_load_failed",
+                    extra={"model_id": model_id, "profile": profile, "error": str(exc)},
+                )
+                self._loaded_cold_key = None
+                return AutotuneTrial(
+                    profile=profile,
+                    metrics={"error_rate": 1.0},
+                    score=float("-inf"),
+                    sort_key=(float("inf"), float("inf"), float("inf")),
+                    rung=rung,
+                    failed=True,
+                )
+            outcome.reloads += 1
+            self._loaded_cold_key = cold_key
+
+        metrics = await measure_under_load(
+            self._engine,
+            model_id,
+            requests=requests,
+            concurrency=self._concurrency,
+            prompt=self._prompt,
+            max_tokens=self._max_tokens,
+            temperature=self._temperature,
+        )
+        result = score_profile(
+            avg_tokens_per_second=metrics["avg_tokens_per_second"],
+            avg_ttft_ms=metrics["avg_ttft_ms"],
+            error_rate=metrics["error_rate"],
+            avg_total_ms=metrics["avg_total_ms"],
+            queue_wait_ms=metrics["queue_wait_ms"],
+        )
+        return AutotuneTrial(
+            profile=profile,
+            metrics=metrics,
+            score=result.score,
+            sort_key=result.sort_key,
+            rung=rung,
+            failed=metrics["error_rate"] >= 1.0,
+        )
+
+    async def _load(self, model_id: str, profile: dict[str, Any]) -> None:
+        if self._engine.is_model_loaded(model_id):
+            await self._engine.unload_model(model_id, reason="autotune_candidate_swap")
+        await self._engine.load_model(
+            model_id,
+            performance_overrides=profile or None,
+            allow_unsupported_runtime=self._allow_unsupported_runtime,
+        )
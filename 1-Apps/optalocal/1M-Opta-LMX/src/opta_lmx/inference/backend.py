@@ -5,11 +5,11 @@ from __future__ import annotations
 from collections.abc import AsyncIterator
 from typing import Any, Literal, Protocol
 
-BackendName = Literal["vllm-mlx", "mlx-lm", "gguf"]
+BackendName = Literal["vllm-mlx", "mlx-lm", "gguf", "fake"]
 
 
 class InferenceBackend(Protocol):
-    """Protocol for inference backends (MLX, GGUF).
+    """Protocol for inference backends (MLX, GGUF, simulated ``fake``).
 
     Each backend handles raw inference for a single loaded model.
     Lifecycle management (load, unload, LRU eviction, memory checks)
@@ -13,7 +13,7 @@ from opta_lmx.inference._model_config import (
 )
 from opta_lmx.model_safety import CompatibilityRegistry
 
-_ALLOWED_BACKENDS = ("vllm-mlx", "mlx-lm", "gguf")
+_ALLOWED_BACKENDS = ("vllm-mlx", "mlx-lm", "gguf", "fake")
 _GLM_MODEL_HINTS = ("glm-5", "glm5")
 
 
@@ -66,6 +66,8 @@ def backend_candidates(
     """Return candidate backend order for a model load attempt.
 
     Rules:
+    - The simulated ``fake`` backend takes any model ID when it is the
+      preferred backend or first in the configured order.
     - Explicit GGUF model IDs are routed directly to GGUF.
     - Otherwise order follows configured backend preference.
     - Runtime-sensitive GLM signatures prefer mlx-lm over vllm-mlx.
@@ -78,19 +80,25 @@ def backend_candidates(
             f"Unsupported backend override. Expected one of {', '.join(_ALLOWED_BACKENDS)}."
         )
 
-    lowered_model_id = model_id.lower()
-    if lowered_model_id.endswith(".gguf") or "gguf" in lowered_model_id:
-        if preferred_backend is not None and preferred_backend != "gguf":
-            raise ValueError("GGUF model IDs can only be loaded with backend='gguf'.")
-        return ["gguf"]
-
     configured = list(
         getattr(
             cfg,
             "backend_preference_order",
             getattr(cfg, "_backend_preference_order", ["vllm-mlx", "mlx-lm"]),
         )
+        or []
     )
+    if preferred_backend == "fake" or (
+        preferred_backend is None and configured and configured[0] == "fake"
+    ):
+        return ["fake"]
+
+    lowered_model_id = model_id.lower()
+    if lowered_model_id.endswith(".gguf") or "gguf" in lowered_model_id:
+        if preferred_backend is not None and preferred_backend != "gguf":
+            raise ValueError("GGUF model IDs can only be loaded with backend='gguf'.")
+        return ["gguf"]
+
     normalized = [value for value in configured if value in _ALLOWED_BACKENDS and value != "gguf"]
     if not normalized:
         normalized = ["vllm-mlx", "mlx-lm"]
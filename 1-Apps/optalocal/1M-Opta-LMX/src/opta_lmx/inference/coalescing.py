@@ -0,0 +1,217 @@
+"""Adaptive token coalescing for streamed responses.
+
+Streams normally send one frame per token. Two situations make that wasteful:
+
+- **Backpressure** — the client (slow Wi-Fi, a busy proxy) is not draining the
+  socket, so the previous send blocked. Tokens that arrive meanwhile are merged
+  into the next frame instead of queueing one frame each.
+- **Bursts** — more than ``burst_tokens`` tokens arrive within ``window_ms``
+  (fast models, speculative decoding, replayed output). Tokens are then held
+  for at most ``window_ms`` and flushed as one frame.
+
+The first token is always flushed on its own and immediately, so coalescing
+never adds to time-to-first-token, and no later token is held longer than
+``window_ms``. Non-text items (end-of-stream markers) are passed through after
+flushing any text buffered before them, preserving order.
+
+At most ``buffer_frames`` full frames (``buffer_frames * max_frame_tokens``
+items) are read ahead of the client. Once that is buffered the source is not
+pulled again until a frame is sent, so a stalled client pauses generation
+instead of growing the buffer without limit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from opta_lmx.config import StreamingConfig
+
+
+@dataclass(frozen=True)
+class CoalescePolicy:
+    """Thresholds for :class:`StreamCoalescer`."""
+
+    enabled: bool = True
+    burst_tokens: int = 8
+    window_ms: float = 25.0
+    max_frame_tokens: int = 64
+    stall_threshold_ms: float = 20.0
+    buffer_frames: int = 4
+
+
+class StreamCoalescer:
+    """Applies a :class:`CoalescePolicy` to token streams and aggregates stats."""
+
+    def __init__(self, policy: CoalescePolicy | None = None) -> None:
+        self.policy = policy or CoalescePolicy()
+        self._lock = threading.Lock()
+        self._streams_total = 0
+        self._tokens_total = 0
+        self._frames_total = 0
+        self._coalesced_frames_total = 0
+        self._stalls_total = 0
+        self._stall_seconds_total = 0.0
+
+    @classmethod
+    def from_config(cls, config: StreamingConfig) -> StreamCoalescer:
+        """Build a coalescer from the ``streaming`` config section."""
+        return cls(
+            CoalescePolicy(
+                enabled=config.coalesce_enabled,
+                burst_tokens=config.coalesce_burst_tokens,
+                window_ms=config.coalesce_window_ms,
+                max_frame_tokens=config.coalesce_max_frame_tokens,
+                buffer_frames=config.coalesce_buffer_frames,
+                stall_threshold_ms=config.stall_threshold_ms,
+            )
+        )
+
+    def wrap(self, source: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """Return ``source`` with text deltas merged per the policy.
+
+        Returns ``source`` unchanged when coalescing is disabled.
+        """
+        if not self.policy.enabled:
+            return source
+        return self._coalesce(source)
+
+    def stats(self) -> dict[str, float | int]:
+        """Frames sent versus tokens streamed, and time spent stalled on sends."""
+        with self._lock:
+            tokens = self._tokens_total
+            frames = self._frames_total
+            return {
+                "streams_total": self._streams_total,
+                "tokens_total": tokens,
+                "frames_total": frames,
+                "coalesced_frames_total": self._coalesced_frames_total,
+                "frames_per_token": round(frames / tokens, 4) if tokens else 1.0,
+                "send_stalls_total": self._stalls_total,
+                "send_stall_seconds_total": round(self._stall_seconds_total, 6),
+            }
+
+    def _record_frame(self, tokens: int) -> None:
+        with self._lock:
+            self._tokens_total += tokens
+            self._frames_total += 1
+            if tokens > 1:
+                self._coalesced_frames_total += 1
+
+    def _record_stall(self, seconds: float) -> None:
+        with self._lock:
+            self._stalls_total += 1
+            self._stall_seconds_total += seconds
+
+    async def _coalesce(self, source: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        policy = self.policy
+        window_sec = policy.window_ms / 1000.0
+        stall_sec = policy.stall_threshold_ms / 1000.0
+        # (item, arrival time); text arrivals also feed the burst detector
+        buffer: deque[tuple[Any, float]] = deque()
+        capacity = policy.buffer_frames * policy.max_frame_tokens
+        room = asyncio.Condition()
+        recent: deque[float] = deque(maxlen=policy.burst_tokens + 1)
+        wake = asyncio.Event()
+        finished = False
+        error: Exception | None = None
+
+        async def _produce() -> None:
+            nonlocal finished, error
+            try:
+                while True:
+                    # Wait for room before pulling so a full buffer pauses the source
+                    async with room:
+                        await room.wait_for(lambda: len(buffer) < capacity)
+                    try:
+                        item = await anext(source)
+                    except StopAsyncIteration:
+                        break
+                    now = time.monotonic()
+                    buffer.append((item, now))
+                    if isinstance(item, str):
+                        recent.append(now)
+                    wake.set()
+            except Exception as exc:
+                error = exc
+            finally:
+                finished = True
+                wake.set()
+
+        def _bursting() -> bool:
+            # More than burst_tokens arrivals within the last window
+            return len(recent) == recent.maxlen and time.monotonic() - recent[0] <= window_sec
+
+        def _leading_text() -> int:
+            count = 0
+            for item, _ in buffer:
+                if not isinstance(item, str) or count >= policy.max_frame_tokens:
+                    break
+                count += 1
+            return count
+
+        async def _take(count: int) -> list[Any]:
+            items = [buffer.popleft()[0] for _ in range(count)]
+            async with room:
+                room.notify()
+            return items
+
+        with self._lock:
+            self._streams_total += 1
+        producer = asyncio.create_task(_produce())
+        first = True
+        stalled = False
+        try:
+            while True:
+                if not buffer:
+                    if finished:
+                        break
+                    wake.clear()
+                    await wake.wait()
+                    continue
+
+                if not isinstance(buffer[0][0], str):
+                    yield (await _take(1))[0]
+                    continue
+
+                take = 1
+                if not first and (stalled or _bursting()):
+                    if not stalled:
+                        # Burst: hold until the oldest buffered token has waited
+                        # one window, the frame is full, or a marker arrives.
+                        deadline = buffer[0][1] + window_sec
+                        while not finished:
+                            text = _leading_text()
+                            if text < len(buffer) or text >= policy.max_frame_tokens:
+                                break
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                break
+                            wake.clear()
+                            with contextlib.suppress(TimeoutError):
+                                await asyncio.wait_for(wake.wait(), remaining)
+                    take = _leading_text()
+
+                frame = "".join(await _take(take))
+                self._record_frame(take)
+                first = False
+                sent_at = time.monotonic()
+                yield frame
+                blocked = time.monotonic() - sent_at
+                stalled = blocked >= stall_sec
+                if stalled:
+                    self._record_stall(blocked)
+
+            if error is not None:
+                raise error
+        finally:
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
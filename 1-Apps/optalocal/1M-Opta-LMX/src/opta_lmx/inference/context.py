@@ -8,20 +8,80 @@ preserving the system prompt and most recent turns.
 from __future__ import annotations
 
 import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
 
 from opta_lmx.inference.schema import ChatMessage, ContentPart, ImageContentPart, TextContentPart
+from opta_lmx.utils.snapshots import resolve_snapshot_path
 
 logger = logging.getLogger(__name__)
 
 # Characters per token heuristic (consistent with chunker.py)
 _CHARS_PER_TOKEN = 4
 
+# Loaded tokenizers, most recently used last (misses are not cached, so a
+# model downloaded later is picked up on the next call).
+_TOKENIZER_CACHE_SIZE = 8
+_tokenizers: OrderedDict[str, Any] = OrderedDict()
+_tokenizers_lock = threading.Lock()
+
+TokenCounter = Callable[[list[str]], list[int]]
+
 
 def estimate_tokens(text: str) -> int:
     """Estimate token count for a string (~4 chars/token)."""
     return max(1, len(text) // _CHARS_PER_TOKEN)
 
 
+def token_counter(model_id: str | None) -> tuple[TokenCounter, str]:
+    """Batch token counter for ``model_id``'s own tokenizer.
+
+    Uses the ``tokenizer.json`` in the model's local snapshot via the
+    ``tokenizers`` package (installed alongside mlx-lm, or with the ``rag``
+    extra). Falls back to the ~4 chars/token estimate when there is no
+    model, no local tokenizer, or no ``tokenizers`` package.
+
+    Returns:
+        Tuple of (counter, method) where method is "tokenizer" or "estimate".
+    """
+    tokenizer = _load_tokenizer(model_id) if model_id else None
+    if tokenizer is None:
+        return (lambda texts: [estimate_tokens(t) for t in texts]), "estimate"
+
+    def _count(texts: list[str]) -> list[int]:
+        encoded = tokenizer.encode_batch(texts, add_special_tokens=False)
+        return [len(e.ids) for e in encoded]
+
+    return _count, "tokenizer"
+
+
+def _load_tokenizer(model_id: str) -> Any | None:
+    with _tokenizers_lock:
+        if model_id in _tokenizers:
+            _tokenizers.move_to_end(model_id)
+            return _tokenizers[model_id]
+    try:
+        from tokenizers import Tokenizer
+    except ImportError:
+        return None
+    snapshot = resolve_snapshot_path(model_id)
+    path = snapshot / "tokenizer.json" if snapshot is not None else None
+    if path is None or not path.is_file():
+        return None
+    try:
+        tokenizer = Tokenizer.from_file(str(path))
+    except Exception as e:
+        logger.warning("tokenizer_load_failed", extra={"model_id": model_id, "error": str(e)})
+        return None
+    with _tokenizers_lock:
+        _tokenizers[model_id] = tokenizer
+        while len(_tokenizers) > _TOKENIZER_CACHE_SIZE:
+            _tokenizers.popitem(last=False)
+    return tokenizer
+
+
 def estimate_prompt_tokens(messages: list[ChatMessage]) -> int:
     """Estimate prompt token count from messages (~4 chars/token).
 
@@ -28,19 +28,22 @@ from opta_lmx.inference.engine_lifecycle import (
     _resolve_engine_model_name,
     _runtime_backend_versions,
 )
+from opta_lmx.inference.fake_backend import FakeBackendProfile
 from opta_lmx.inference.predictor import UsagePredictor
 from opta_lmx.inference.schema import (
     ChatCompletionResponse,
     ChatMessage,
 )
-from opta_lmx.inference.types import LoadedModel, ModelInfo
+from opta_lmx.inference.types import LoadedModel, ModelInfo, ModelRoutingStats
 from opta_lmx.manager.memory import MemoryMonitor
+from opta_lmx.manager.prewarm import ModelPrewarmer
 from opta_lmx.model_safety import (
     CompatibilityRegistry,
     ReadinessTracker,
     backend_version,
 )
 from opta_lmx.monitoring.events import EventBus
+from opta_lmx.runtime.child_loader_pool import LoaderWorkerPool
 
 logger = logging.getLogger(__name__)
 
@@ -103,6 +106,13 @@ class InferenceEngine:
         adaptive_latency_target_ms: float = 2500.0,
         adaptive_latency_window: int = 128,
         adaptive_min_concurrent_requests: int = 1,
+        admission_control_enabled: bool = True,
+        admission_max_queue_depth: int = 64,
+        admission_codel_target_ms: float = 1000.0,
+        admission_codel_interval_ms: float = 10000.0,
+        loader_pool: LoaderWorkerPool | None = None,
+        prewarmer: ModelPrewarmer | None = None,
+        fake_backend_profile: FakeBackendProfile | None = None,
     ) -> None:
         # Shared mutable state
         self._models: dict[str, LoadedModel] = {}
@@ -136,6 +146,10 @@ class InferenceEngine:
             adaptive_latency_target_ms=adaptive_latency_target_ms,
             adaptive_latency_window=adaptive_latency_window,
             adaptive_min_concurrent_requests=adaptive_min_concurrent_requests,
+            admission_control_enabled=admission_control_enabled,
+            admission_max_queue_depth=admission_max_queue_depth,
+            admission_codel_target_ms=admission_codel_target_ms,
+            admission_codel_interval_ms=admission_codel_interval_ms,
         )
 
         # Store config values needed by lifecycle and misc methods
@@ -152,6 +166,8 @@ class InferenceEngine:
         self._prefix_cache_enabled = prefix_cache_enabled
         self._loader_isolation_enabled = loader_isolation_enabled
         self._loader_timeout_sec = loader_timeout_sec
+        self._loader_pool = loader_pool
+        self._prewarmer = prewarmer
         self._gguf_fallback_enabled = gguf_fallback_enabled
         self._warmup_on_load = warmup_on_load
         self._stream_interval = stream_interval
@@ -199,6 +215,9 @@ class InferenceEngine:
             adapt_concurrency_fn=self.adapt_concurrency,
             resolve_autotune_backend_fn=self.resolve_autotune_backend,
             autotune_backend_version_fn=self.autotune_backend_version,
+            loader_pool=loader_pool,
+            prewarmer=prewarmer,
+            fake_backend_profile=fake_backend_profile,
         )
 
         # ── Generation executor ────────────────────────────────────────
@@ -264,6 +283,14 @@ class InferenceEngine:
         candidates = model_ids if model_ids is not None else self.get_loaded_model_ids()
         return self._concurrency.get_model_load_snapshot(candidates)
 
+    def get_model_routing_stats(
+        self,
+        model_ids: list[str] | None = None,
+    ) -> dict[str, ModelRoutingStats]:
+        """Return per-model active/waiting counts and latency for load-aware routing."""
+        candidates = model_ids if model_ids is not None else self.get_loaded_model_ids()
+        return self._concurrency.get_model_routing_stats(candidates)
+
     # Expose private helpers for backward compat (tests may reference them)
     @staticmethod
     def _increment_counter(counter: dict[str, int], key: str) -> None:
@@ -286,8 +313,8 @@ class InferenceEngine:
     def _model_semaphore_for(self, model_id: str) -> asyncio.Semaphore | None:
         return self._concurrency._model_semaphore_for(model_id)
 
-    def _record_latency_sample(self, latency_sec: float) -> None:
-        self._concurrency._record_latency_sample(latency_sec)
+    def _record_latency_sample(self, latency_sec: float, model_id: str | None = None) -> None:
+        self._concurrency._record_latency_sample(latency_sec, model_id=model_id)
 
     # ── Internal concurrency wiring used by _acquire_request_slots ────
     def _acquire_request_slots(
@@ -296,6 +323,9 @@ class InferenceEngine:
         model_id: str,
         priority: str,
         client_id: str | None,
+        prompt_tokens: int = 0,
+        max_tokens: int | None = None,
+        deadline_sec: float | None = None,
     ) -> AbstractAsyncContextManager[None]:
         """Acquire global/model/client slots for one request."""
         return self._concurrency._acquire_request_slots(
@@ -303,8 +333,20 @@ class InferenceEngine:
             priority=priority,
             client_id=client_id,
             queue_wait_sec_ctx=self._queue_wait_sec_ctx,
+            prompt_tokens=prompt_tokens,
+            max_tokens=max_tokens,
+            deadline_sec=deadline_sec,
         )
 
+    def admission_stats(self) -> dict[str, int | float]:
+        """Admission control counters for ``MetricsCollector.register_source``."""
+        admission = self._concurrency.admission
+        return admission.stats() if admission is not None else {}
+
+    def admission_retry_after_sec(self) -> int | None:
+        """Predicted seconds for queued inference work to drain, if admission is enabled."""
+        return self._concurrency.admission_retry_after_sec()
+
     # ══════════════════════════════════════════════════════════════════
     #  Lifecycle — delegated methods
     # ══════════════════════════════════════════════════════════════════
@@ -337,6 +379,16 @@ class InferenceEngine:
         """Unload models idle longer than their TTL."""
         return await self._lifecycle.evict_idle_models(ttl_seconds)
 
+    @property
+    def loader_pool(self) -> LoaderWorkerPool | None:
+        """Warm child loader worker pool, if configured."""
+        return self._loader_pool
+
+    @property
+    def prewarmer(self) -> ModelPrewarmer | None:
+        """Page-cache shard prewarmer, if configured."""
+        return self._prewarmer
+
     async def probe_model_backends(
         self,
         model_id: str,
@@ -515,6 +567,7 @@ class InferenceEngine:
         priority: str = "normal",
         num_ctx: int | None = None,
         client_id: str | None = None,
+        deadline_sec: float | None = None,
     ) -> ChatCompletionResponse:
         """Non-streaming chat completion."""
         return await self._generator.generate(
@@ -531,6 +584,7 @@ class InferenceEngine:
             priority=priority,
             num_ctx=num_ctx,
             client_id=client_id,
+            deadline_sec=deadline_sec,
         )
 
     async def stream_generate(
@@ -548,6 +602,7 @@ class InferenceEngine:
         priority: str = "normal",
         num_ctx: int | None = None,
         client_id: str | None = None,
+        deadline_sec: float | None = None,
     ) -> AsyncIterator[str]:
         """Streaming chat completion — yields token strings."""
         async for token in self._generator.stream_generate(
@@ -564,6 +619,7 @@ class InferenceEngine:
             priority=priority,
             num_ctx=num_ctx,
             client_id=client_id,
+            deadline_sec=deadline_sec,
         ):
             yield token
 
@@ -727,6 +783,22 @@ class InferenceEngine:
             metrics=metrics,
         )
 
+    def get_stale_tuned_profile(
+        self,
+        model_id: str,
+        *,
+        backend: str | None = None,
+        allow_failed: bool = False,
+    ) -> dict[str, Any] | None:
+        """Return a tuned record made under an older backend version, if re-tune is due."""
+        return self._autotune_delegator.get_stale_tuned_profile(
+            model_id, backend=backend, allow_failed=allow_failed
+        )
+
+    def apply_hot_overrides(self, model_id: str, overrides: dict[str, Any]) -> bool:
+        """Apply reload-free performance knobs to a loaded model in place."""
+        return self._autotune_delegator.apply_hot_overrides(model_id, overrides)
+
     @property
     def predictor(self) -> UsagePredictor:
         """Access the usage predictor for stats and manual preloading."""
@@ -95,3 +95,81 @@ class EngineAutotuneDelegator:
             profile=profile,
             metrics=metrics,
         )
+
+    def get_stale_tuned_profile(
+        self,
+        model_id: str,
+        *,
+        backend: str | None = None,
+        allow_failed: bool = False,
+    ) -> dict[str, Any] | None:
+        """Return a tuned record made under an older backend version, if re-tune is due."""
+        resolved_backend = backend or self.resolve_autotune_backend(
+            model_id,
+            allow_failed=allow_failed,
+        )
+        return self._engine._autotune.find_stale(
+            model_id=model_id,
+            backend=resolved_backend,
+            backend_version=self.autotune_backend_version(resolved_backend),
+        )
+
+    def apply_hot_overrides(self, model_id: str, overrides: dict[str, Any]) -> bool:
+        """Set a loaded model's reload-free knobs to ``overrides`` in place.
+
+        Supports ``stream_interval`` and ``scheduler.max_num_seqs`` when the
+        engine exposes them. A supported knob missing from ``overrides`` is
+        reset to the server default, so the live engine matches a fresh load
+        with the same profile. Returns False, changing nothing, if any key
+        cannot be applied in place; the caller should reload instead.
+        """
+        loaded = self._engine._models.get(model_id)
+        if loaded is None or loaded.backend is not None:
+            return False
+
+        live = loaded.engine
+        scheduler_config = getattr(getattr(live, "scheduler", None), "config", None)
+        # overrides path -> (live object, attribute, server default)
+        knobs: dict[tuple[str, ...], tuple[Any, str, Any]] = {
+            ("stream_interval",): (live, "stream_interval", self._engine._stream_interval),
+            ("scheduler", "max_num_seqs"): (
+                scheduler_config,
+                "max_num_seqs",
+                self._engine._scheduler_max_num_seqs,
+            ),
+        }
+        requested: dict[tuple[str, ...], Any] = {}
+        for key, value in overrides.items():
+            if key == "scheduler" and isinstance(value, dict):
+                requested.update({(key, name): v for name, v in value.items()})
+            else:
+                requested[(key,)] = value
+        if not requested.keys() <= knobs.keys():
+            return False
+
+        updates: list[tuple[Any, str, Any]] = []
+        for path, (target, attr, default) in knobs.items():
+            supported = target is not None and hasattr(target, attr)
+            if path in requested:
+                if not supported:
+                    return False
+                updates.append((target, attr, requested[path]))
+            elif supported:
+                updates.append((target, attr, default))
+
+        for target, attr, new_value in updates:
+            setattr(target, attr, new_value)
+        merged = dict(loaded.performance_overrides)
+        merged.pop("stream_interval", None)
+        scheduler = {
+            k: v for k, v in (merged.pop("scheduler", None) or {}).items() if k != "max_num_seqs"
+        }
+        if scheduler:
+            merged["scheduler"] = scheduler
+        for key, value in overrides.items():
+            if isinstance(value, dict):
+                merged[key] = {**(merged.get(key) or {}), **value}
+            else:
+                merged[key] = value
+        loaded.performance_overrides = merged
+        return True
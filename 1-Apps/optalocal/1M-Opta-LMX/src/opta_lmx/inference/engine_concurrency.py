@@ -1,8 +1,8 @@
 """Concurrency control for the inference engine.
 
 Manages global, per-model, and per-client request slot acquisition,
-adaptive concurrency adjustment based on memory pressure and latency,
-and graceful drain for shutdown.
+latency-aware admission control, adaptive concurrency adjustment based on
+memory pressure and latency, and graceful drain for shutdown.
 """
 
 from __future__ import annotations
@@ -15,8 +15,14 @@ from collections import deque
 from collections.abc import AsyncIterator
 from typing import Any
 
+from opta_lmx.inference.admission import AdmissionController, AdmissionTicket
+from opta_lmx.inference.types import ModelRoutingStats
+
 logger = logging.getLogger(__name__)
 
+# Smoothing factor for per-model latency EWMA (higher = reacts faster).
+_LATENCY_EWMA_ALPHA = 0.3
+
 
 class ConcurrencyController:
     """Manages inference request concurrency slots and adaptive limits.
@@ -37,6 +43,10 @@ class ConcurrencyController:
         adaptive_latency_target_ms: float = 2500.0,
         adaptive_latency_window: int = 128,
         adaptive_min_concurrent_requests: int = 1,
+        admission_control_enabled: bool = True,
+        admission_max_queue_depth: int = 64,
+        admission_codel_target_ms: float = 1000.0,
+        admission_codel_interval_ms: float = 10000.0,
     ) -> None:
         self._max_concurrent = max_concurrent_requests
         self._inference_semaphore = asyncio.Semaphore(max_concurrent_requests)
@@ -71,6 +81,22 @@ class ConcurrencyController:
         self._adaptive_min_concurrent = max(1, adaptive_min_concurrent_requests)
         self._last_adapt_reason = "startup"
 
+        # Per-model latency signals for load-aware routing.
+        self._model_latency_window = max(8, adaptive_latency_window)
+        self._model_latency_samples: dict[str, deque[float]] = {}
+        self._model_latency_ewma: dict[str, float] = {}
+
+        self._admission = (
+            AdmissionController(
+                max_queue_depth=admission_max_queue_depth,
+                max_queue_wait_sec=semaphore_timeout_sec,
+                codel_target_sec=admission_codel_target_ms / 1000.0,
+                codel_interval_sec=admission_codel_interval_ms / 1000.0,
+            )
+            if admission_control_enabled
+            else None
+        )
+
     # ── Properties ─────────────────────────────────────────────────────
 
     @property
@@ -88,6 +114,11 @@ class ConcurrencyController:
         """Number of requests currently waiting for any inference slot."""
         return self._waiting_global_slot + self._waiting_model_slot + self._waiting_client_slot
 
+    @property
+    def admission(self) -> AdmissionController | None:
+        """Latency-aware admission controller, when enabled."""
+        return self._admission
+
     @property
     def latency_p95_sec(self) -> float | None:
         """Rolling p95 latency for adaptive concurrency calculations."""
@@ -178,8 +209,10 @@ class ConcurrencyController:
         queue_kind: str,
         model_id: str,
         client_key: str,
+        timeout_sec: float | None = None,
     ) -> None:
         """Acquire one semaphore slot with timeout and queue-depth tracking."""
+        timeout = self._semaphore_timeout if timeout_sec is None else timeout_sec
         if queue_kind == "global":
             self._waiting_global_slot += 1
         elif queue_kind == "model":
@@ -188,7 +221,7 @@ class ConcurrencyController:
             self._waiting_client_slot += 1
 
         try:
-            await asyncio.wait_for(semaphore.acquire(), timeout=self._semaphore_timeout)
+            await asyncio.wait_for(semaphore.acquire(), timeout=max(0.0, timeout))
         except TimeoutError:
             logger.warning(
                 "semaphore_timeout",
@@ -196,7 +229,7 @@ class ConcurrencyController:
                     "queue_kind": queue_kind,
                     "model_id": model_id,
                     "client_id": client_key,
-                    "timeout_sec": self._semaphore_timeout,
+                    "timeout_sec": timeout,
                     "in_flight": self._in_flight,
                     "waiting_total": self.waiting_queue_count,
                 },
@@ -218,6 +251,9 @@ class ConcurrencyController:
         priority: str,
         client_id: str | None,
         queue_wait_sec_ctx: Any,
+        prompt_tokens: int = 0,
+        max_tokens: int | None = None,
+        deadline_sec: float | None = None,
     ) -> AsyncIterator[None]:
         """Acquire global/model/client slots for one request.
 
@@ -226,64 +262,147 @@ class ConcurrencyController:
             priority: Request priority ("high" bypasses slot acquisition).
             client_id: Optional client identity for fairness.
             queue_wait_sec_ctx: ContextVar to store measured queue wait time.
+            prompt_tokens: Estimated prompt size, for admission control.
+            max_tokens: Requested output budget, for admission control.
+            deadline_sec: Client timeout, for admission control.
+
+        Raises:
+            AdmissionRejectedError: Shed by admission control (a RuntimeError
+                whose message starts with "Server is busy").
         """
         if priority == "high":
             queue_wait_sec_ctx.set(0.0)
             yield
             return
 
+        capacity = self._admission_capacity(model_id)
+        ticket: AdmissionTicket | None = None
+        wait_budget = self._semaphore_timeout
+        if self._admission is not None:
+            ticket = self._admission.admit(
+                model_id=model_id,
+                priority=priority,
+                prompt_tokens=prompt_tokens,
+                max_tokens=max_tokens,
+                capacity=capacity,
+                deadline_sec=deadline_sec,
+            )
+            wait_budget = min(wait_budget, self._admission.queue_timeout_sec())
+
         acquired: list[asyncio.Semaphore] = []
         client_key = self._normalize_client_key(client_id)
         model_semaphore = self._model_semaphore_for(model_id)
         client_semaphore = self._client_semaphore_for(client_key)
         wait_started = time.monotonic()
+        wait_deadline = wait_started + wait_budget
         self._increment_counter(self._waiting_requests_by_model, model_id)
 
         try:
-            await self._acquire_slot(
-                self._inference_semaphore,
-                queue_kind="global",
-                model_id=model_id,
-                client_key=client_key,
-            )
-            acquired.append(self._inference_semaphore)
-
-            if model_semaphore is not None:
+            try:
                 await self._acquire_slot(
-                    model_semaphore,
-                    queue_kind="model",
+                    self._inference_semaphore,
+                    queue_kind="global",
                     model_id=model_id,
                     client_key=client_key,
+                    timeout_sec=wait_deadline - time.monotonic(),
                 )
-                acquired.append(model_semaphore)
-
-            if client_semaphore is not None:
-                await self._acquire_slot(
-                    client_semaphore,
-                    queue_kind="client",
-                    model_id=model_id,
-                    client_key=client_key,
-                )
-                acquired.append(client_semaphore)
+                acquired.append(self._inference_semaphore)
+
+                if model_semaphore is not None:
+                    await self._acquire_slot(
+                        model_semaphore,
+                        queue_kind="model",
+                        model_id=model_id,
+                        client_key=client_key,
+                        timeout_sec=wait_deadline - time.monotonic(),
+                    )
+                    acquired.append(model_semaphore)
+
+                if client_semaphore is not None:
+                    await self._acquire_slot(
+                        client_semaphore,
+                        queue_kind="client",
+                        model_id=model_id,
+                        client_key=client_key,
+                        timeout_sec=wait_deadline - time.monotonic(),
+                    )
+                    acquired.append(client_semaphore)
+            except TimeoutError:
+                queue_wait_sec_ctx.set(max(0.0, time.monotonic() - wait_started))
+                if ticket is not None and self._admission is not None:
+                    raise self._admission.expire(ticket, capacity=capacity) from None
+                raise RuntimeError(
+                    "Server is busy — all inference slots occupied. Try again shortly."
+                ) from None
 
             queue_wait_sec_ctx.set(max(0.0, time.monotonic() - wait_started))
+            if ticket is not None and self._admission is not None:
+                self._admission.start(ticket, capacity=capacity)
             yield
-        except TimeoutError:
-            queue_wait_sec_ctx.set(max(0.0, time.monotonic() - wait_started))
-            raise RuntimeError(
-                "Server is busy — all inference slots occupied. Try again shortly."
-            ) from None
         finally:
             self._decrement_counter(self._waiting_requests_by_model, model_id)
+            if ticket is not None and self._admission is not None:
+                self._admission.finish(ticket)
             for semaphore in reversed(acquired):
                 semaphore.release()
 
+    def _admission_capacity(self, model_id: str) -> int:
+        return max(1, min(self._current_concurrency_limit, self._model_capacity(model_id)))
+
+    def record_service_time(
+        self,
+        model_id: str,
+        service_sec: float,
+        *,
+        prompt_tokens: int,
+        completion_tokens: int,
+    ) -> None:
+        """Feed one request's slot-held time into admission control's service model."""
+        if self._admission is not None:
+            self._admission.record_service(
+                model_id,
+                service_sec,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+            )
+
+    def admission_retry_after_sec(self) -> int | None:
+        """Predicted seconds for the slowest model's backlog to drain, if admission is enabled."""
+        if self._admission is None:
+            return None
+        return self._admission.retry_after_sec(None, self._current_concurrency_limit)
+
     # ── Adaptive concurrency ───────────────────────────────────────────
 
-    def _record_latency_sample(self, latency_sec: float) -> None:
+    def _record_latency_sample(self, latency_sec: float, model_id: str | None = None) -> None:
         if latency_sec < 0:
             return
         self._adaptive_latency_samples.append(latency_sec)
+        if model_id is None:
+            return
+
+        samples = self._model_latency_samples.get(model_id)
+        if samples is None:
+            samples = deque(maxlen=self._model_latency_window)
+            self._model_latency_samples[model_id] = samples
+        samples.append(latency_sec)
+
+        previous = self._model_latency_ewma.get(model_id)
+        if previous is None:
+            self._model_latency_ewma[model_id] = latency_sec
+        else:
+            self._model_latency_ewma[model_id] = (
+                _LATENCY_EWMA_ALPHA * latency_sec + (1.0 - _LATENCY_EWMA_ALPHA) * previous
+            )
+
+    def model_latency_p95_sec(self, model_id: str) -> float | None:
+        """Rolling p95 latency observed for a single model."""
+        samples = self._model_latency_samples.get(model_id)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = max(0, int((len(ordered) - 1) * 0.95))
+        return float(ordered[index])
 
     def adapt_concurrency(
         self,
@@ -405,6 +524,28 @@ class ConcurrencyController:
 
     # ── Load snapshot ──────────────────────────────────────────────────
 
+    def _model_capacity(self, model_id: str) -> int:
+        model_limit = self._per_model_concurrency_limits.get(model_id, self._max_concurrent)
+        if model_limit is None:
+            model_limit = self._max_concurrent
+        return max(1, min(max(1, int(model_limit)), self._max_concurrent))
+
+    def get_model_routing_stats(
+        self,
+        model_ids: list[str],
+    ) -> dict[str, ModelRoutingStats]:
+        """Return per-model active/waiting counts and observed latency."""
+        return {
+            model_id: ModelRoutingStats(
+                active=self._active_requests_by_model.get(model_id, 0),
+                waiting=self._waiting_requests_by_model.get(model_id, 0),
+                capacity=self._model_capacity(model_id),
+                latency_p95_sec=self.model_latency_p95_sec(model_id),
+                latency_ewma_sec=self._model_latency_ewma.get(model_id),
+            )
+            for model_id in model_ids
+        }
+
     def get_model_load_snapshot(
         self,
         model_ids: list[str],
@@ -420,10 +561,7 @@ class ConcurrencyController:
         for model_id in model_ids:
             active = self._active_requests_by_model.get(model_id, 0)
             waiting = self._waiting_requests_by_model.get(model_id, 0)
-            model_limit = self._per_model_concurrency_limits.get(model_id, self._max_concurrent)
-            if model_limit is None:
-                model_limit = self._max_concurrent
-            capacity = max(1, min(max(1, int(model_limit)), self._max_concurrent))
+            capacity = self._model_capacity(model_id)
             utilization = active / capacity
             queue_ratio = waiting / capacity
             snapshot[model_id] = (
@@ -311,6 +311,7 @@ class GenerationExecutor:
         priority: str = "normal",
         num_ctx: int | None = None,
         client_id: str | None = None,
+        deadline_sec: float | None = None,
     ) -> ChatCompletionResponse:
         """Non-streaming chat completion."""
         loaded = self._get_model(model_id)
@@ -329,6 +330,7 @@ class GenerationExecutor:
             )
 
         msg_dicts = _resolve_messages(messages)
+        prompt_tokens_estimate = estimate_prompt_tokens(messages)
 
         async def _run_inference() -> tuple[str, int, int, dict[str, Any]]:
             self._concurrency.enter_inference(model_id)
@@ -380,15 +382,28 @@ class GenerationExecutor:
                 model_id=model_id,
                 priority=priority,
                 client_id=client_id,
+                prompt_tokens=prompt_tokens_estimate,
+                max_tokens=max_tokens,
+                deadline_sec=deadline_sec,
             ):
+                service_started = time.monotonic()
                 (
                     content,
                     prompt_tokens,
                     completion_tokens,
                     speculative_telemetry,
                 ) = await _run_inference()
+                self._concurrency.record_service_time(
+                    model_id,
+                    time.monotonic() - service_started,
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens,
+                )
         finally:
-            self._concurrency._record_latency_sample(time.monotonic() - request_started)
+            self._concurrency._record_latency_sample(
+                time.monotonic() - request_started,
+                model_id=model_id,
+            )
             self._adapt_concurrency()
         self._speculative_telemetry_ctx.set(speculative_telemetry)
 
@@ -562,6 +577,7 @@ class GenerationExecutor:
         priority: str = "normal",
         num_ctx: int | None = None,
         client_id: str | None = None,
+        deadline_sec: float | None = None,
     ) -> AsyncIterator[str]:
         """Streaming chat completion -- yields token strings."""
         loaded = self._get_model(model_id)
@@ -587,6 +603,7 @@ class GenerationExecutor:
             json_instruction = build_json_system_prompt(response_format)
             if json_instruction:
                 msg_dicts = inject_json_instruction(msg_dicts, json_instruction)
+        prompt_tokens_estimate = estimate_prompt_tokens(messages)
 
         request_started = time.monotonic()
         try:
@@ -594,8 +611,12 @@ class GenerationExecutor:
                 model_id=model_id,
                 priority=priority,
                 client_id=client_id,
+                prompt_tokens=prompt_tokens_estimate,
+                max_tokens=max_tokens,
+                deadline_sec=deadline_sec,
             ):
                 self._concurrency.enter_inference(model_id)
+                service_started = time.monotonic()
                 try:
                     async with asyncio.timeout(self._inference_timeout):
                         if loaded.backend is not None:
@@ -648,6 +669,12 @@ class GenerationExecutor:
                                 if delta:
                                     completion_units += 1
                                     yield delta
+                    self._concurrency.record_service_time(
+                        model_id,
+                        time.monotonic() - service_started,
+                        prompt_tokens=prompt_tokens_estimate,
+                        completion_tokens=completion_units,
+                    )
                 except asyncio.CancelledError:
                     logger.info("stream_cancelled", extra={"model_id": model_id})
                     raise
@@ -683,5 +710,8 @@ class GenerationExecutor:
                 completion_units,
             )
             self._speculative_telemetry_ctx.set(speculative_telemetry)
-            self._concurrency._record_latency_sample(time.monotonic() - request_started)
+            self._concurrency._record_latency_sample(
+                time.monotonic() - request_started,
+                model_id=model_id,
+            )
             self._adapt_concurrency()
@@ -23,10 +23,12 @@ from opta_lmx.inference._model_config import (
     _normalize_signature,
 )
 from opta_lmx.inference.backend_policy import backend_candidates
+from opta_lmx.inference.fake_backend import FakeBackend, FakeBackendProfile
 from opta_lmx.inference.gguf_resolver import resolve_local_gguf_equivalents
 from opta_lmx.inference.mlx_lm_backend import MLXLMBackend
 from opta_lmx.inference.types import LoadedModel, ModelInfo
 from opta_lmx.manager.memory import MemoryMonitor
+from opta_lmx.manager.prewarm import ModelPrewarmer, PrewarmJob
 from opta_lmx.model_safety import (
     CompatibilityRegistry,
     ErrorCodes,
@@ -34,6 +36,7 @@ from opta_lmx.model_safety import (
     backend_version,
 )
 from opta_lmx.monitoring.events import EventBus, ServerEvent
+from opta_lmx.runtime.child_loader_pool import LoaderWorkerPool
 from opta_lmx.runtime.child_loader_supervisor import run_loader_supervisor
 from opta_lmx.runtime.loader_protocol import LoaderFailure, LoadSpec
 
@@ -43,6 +46,9 @@ _READINESS_TELEMETRY_STATES = frozenset(
     {"admitted", "loading", "canary_pending", "routable", "quarantined"}
 )
 
+# Upper bound on waiting for a cancelled prewarm to report after a load.
+_PREWARM_SETTLE_SEC = 1.0
+
 _MOE_ARCHITECTURE_SIGNATURES: tuple[str, ...] = (
     "moe",
     "mixtral",
@@ -249,6 +255,9 @@ class ModelLifecycleManager:
         adapt_concurrency_fn: Any,
         resolve_autotune_backend_fn: Any,
         autotune_backend_version_fn: Any,
+        loader_pool: LoaderWorkerPool | None = None,
+        prewarmer: ModelPrewarmer | None = None,
+        fake_backend_profile: FakeBackendProfile | None = None,
     ) -> None:
         self._memory = memory_monitor
         self._models = models
@@ -272,6 +281,9 @@ class ModelLifecycleManager:
         self._prefix_cache_enabled = prefix_cache_enabled
         self._loader_isolation_enabled = loader_isolation_enabled
         self._loader_timeout_sec = loader_timeout_sec
+        self._loader_pool = loader_pool
+        self._prewarmer = prewarmer
+        self._fake_backend_profile = fake_backend_profile
         self._backend_preference_order = list(backend_preference_order)
         self._gguf_fallback_enabled = gguf_fallback_enabled
         self._warmup_on_load = warmup_on_load
@@ -285,6 +297,33 @@ class ModelLifecycleManager:
         self._resolve_autotune_backend = resolve_autotune_backend_fn
         self._autotune_backend_version = autotune_backend_version_fn
 
+    # ── Page-cache prewarm ─────────────────────────────────────────────
+
+    async def _finish_prewarm(
+        self,
+        model_id: str,
+        job: PrewarmJob | None,
+        mode: str,
+        elapsed: float,
+    ) -> dict[str, Any]:
+        """Collect the load-time warm and file the load under its warmth bucket."""
+        if self._prewarmer is None:
+            return {}
+        result = None
+        if job is not None:
+            # Cancelled read workers stop within a chunk; never hold the load on them.
+            with contextlib.suppress(TimeoutError, OSError):
+                result = await asyncio.wait_for(job.result(), timeout=_PREWARM_SETTLE_SEC)
+        if result is not None and mode == "cold":
+            mode = "concurrent"
+        self._prewarmer.record_load(model_id, elapsed, mode=mode)
+        info: dict[str, Any] = {"prewarm_mode": mode}
+        if result is not None:
+            info["prewarm_bytes"] = result.bytes_warmed
+            info["prewarm_sec"] = round(result.duration_sec, 3)
+            info["prewarm_hinted"] = result.hinted
+        return info
+
     # ── Memory helpers ─────────────────────────────────────────────────
 
     def _memory_percent_from_gb(self, value_gb: float) -> float:
@@ -532,6 +571,12 @@ class ModelLifecycleManager:
 
     # ── Backend probing ────────────────────────────────────────────────
 
+    def _probe_concurrency(self) -> int:
+        """Backends probed at once: one per warm worker, else sequential."""
+        if self._loader_pool is not None and self._loader_pool.is_running:
+            return self._loader_pool.size
+        return 1
+
     async def probe_model_backends(
         self,
         model_id: str,
@@ -540,111 +585,131 @@ class ModelLifecycleManager:
         allow_unsupported_runtime: bool = False,
         engine_ref: Any = None,
     ) -> dict[str, Any]:
-        """Probe backend candidates for a model without fully loading it."""
+        """Probe backend candidates for a model without fully loading it.
+
+        Candidates are probed concurrently, up to one per warm loader worker;
+        results keep candidate preference order.
+        """
         candidates = backend_candidates(
             model_id,
             engine_ref,
             self._compatibility,
             allow_failed=allow_unsupported_runtime,
         )
-        outcomes: list[dict[str, Any]] = []
-
-        for bkend in candidates:
-            if bkend == "vllm-mlx":
-                if not self._loader_isolation_enabled:
-                    outcomes.append(
-                        {
-                            "backend": bkend,
-                            "outcome": "unknown",
-                            "reason": "loader_isolation_disabled",
-                        }
-                    )
-                    continue
-                try:
-                    outcome = await run_loader_supervisor(
-                        LoadSpec(
-                            model_id=model_id,
-                            backend=bkend,
-                            use_batching=self._use_batching,
-                            performance_overrides={},
-                            probe_only=True,
-                        ),
-                        timeout_sec=float(timeout_sec),
-                    )
-                except Exception as exc:
-                    outcomes.append(
-                        {
-                            "backend": bkend,
-                            "outcome": "fail",
-                            "reason": f"{ErrorCodes.MODEL_PROBE_FAILED}:{exc}",
-                        }
-                    )
-                    continue
-                if outcome.ok:
-                    outcomes.append({"backend": bkend, "outcome": "pass", "reason": None})
-                else:
-                    failure = outcome.failure
-                    reason = (
-                        f"{failure.code}:{failure.message}"
-                        if failure is not None
-                        else ErrorCodes.MODEL_PROBE_FAILED
-                    )
-                    outcomes.append({"backend": bkend, "outcome": "fail", "reason": reason})
-                continue
+        limiter = asyncio.Semaphore(self._probe_concurrency())
 
-            if bkend == "gguf":
-                resolved = resolve_local_gguf_equivalents(model_id)
-                if resolved:
-                    outcomes.append({"backend": bkend, "outcome": "pass", "reason": None})
-                else:
-                    outcomes.append(
-                        {
-                            "backend": bkend,
-                            "outcome": "fail",
-                            "reason": "no_local_gguf_equivalent",
-                        }
-                    )
-                continue
-
-            if bkend == "mlx-lm":
-                backend_instance: MLXLMBackend | None = None
-                try:
-                    backend_instance = MLXLMBackend(model_id=model_id)
-                    async with asyncio.timeout(float(timeout_sec)):
-                        await backend_instance.probe()
-                    outcomes.append({"backend": bkend, "outcome": "pass", "reason": None})
-                except TimeoutError:
-                    outcomes.append(
-                        {
-                            "backend": bkend,
-                            "outcome": "fail",
-                            "reason": f"{ErrorCodes.MODEL_PROBE_FAILED}:probe_timeout",
-                        }
-                    )
-                except Exception as exc:
-                    outcomes.append(
-                        {
-                            "backend": bkend,
-                            "outcome": "fail",
-                            "reason": f"{ErrorCodes.MODEL_PROBE_FAILED}:{exc}",
-                        }
-                    )
-                finally:
-                    if backend_instance is not None:
-                        backend_instance.close()
-                continue
+        async def _timed_probe(bkend: str) -> dict[str, Any]:
+            async with limiter:
+                started = time.monotonic()
+                row = await self._probe_backend(model_id, bkend, float(timeout_sec))
+                row["duration_ms"] = round((time.monotonic() - started) * 1000, 3)
+                return row
 
-            outcomes.append({"backend": bkend, "outcome": "unknown", "reason": "not_probed"})
+        wall_started = time.monotonic()
+        outcomes = list(await asyncio.gather(*(_timed_probe(b) for b in candidates)))
+        probe_wall_ms = round((time.monotonic() - wall_started) * 1000, 3)
 
         recommended_backend = next(
             (row["backend"] for row in outcomes if row.get("outcome") in {"pass", "unknown"}),
             None,
         )
-        return {
+        logger.info(
+            "backend_probe_completed",
+            extra={
+                "model_id": model_id,
+                "candidates": len(outcomes),
+                "probe_wall_ms": probe_wall_ms,
+                "recommended_backend": recommended_backend,
+            },
+        )
+        result: dict[str, Any] = {
             "model_id": model_id,
             "recommended_backend": recommended_backend,
             "candidates": outcomes,
+            "probe_wall_ms": probe_wall_ms,
         }
+        if self._loader_pool is not None:
+            result["loader_pool"] = self._loader_pool.stats()
+        return result
+
+    async def _probe_backend(
+        self,
+        model_id: str,
+        bkend: str,
+        timeout_sec: float,
+    ) -> dict[str, Any]:
+        """Probe a single backend candidate and return its outcome row."""
+        if bkend == "vllm-mlx":
+            if not self._loader_isolation_enabled:
+                return {
+                    "backend": bkend,
+                    "outcome": "unknown",
+                    "reason": "loader_isolation_disabled",
+                }
+            try:
+                outcome = await run_loader_supervisor(
+                    LoadSpec(
+                        model_id=model_id,
+                        backend=bkend,
+                        use_batching=self._use_batching,
+                        performance_overrides={},
+                        probe_only=True,
+                    ),
+                    timeout_sec=timeout_sec,
+                    pool=self._loader_pool,
+                )
+            except Exception as exc:
+                return {
+                    "backend": bkend,
+                    "outcome": "fail",
+                    "reason": f"{ErrorCodes.MODEL_PROBE_FAILED}:{exc}",
+                }
+            if outcome.ok:
+                return {"backend": bkend, "outcome": "pass", "reason": None}
+            failure = outcome.failure
+            reason = (
+                f"{failure.code}:{failure.message}"
+                if failure is not None
+                else ErrorCodes.MODEL_PROBE_FAILED
+            )
+            return {"backend": bkend, "outcome": "fail", "reason": reason}
+
+        if bkend == "gguf":
+            if resolve_local_gguf_equivalents(model_id):
+                return {"backend": bkend, "outcome": "pass", "reason": None}
+            return {
+                "backend": bkend,
+                "outcome": "fail",
+                "reason": "no_local_gguf_equivalent",
+            }
+
+        if bkend == "fake":
+            return {"backend": bkend, "outcome": "pass", "reason": None}
+
+        if bkend == "mlx-lm":
+            backend_instance: MLXLMBackend | None = None
+            try:
+                backend_instance = MLXLMBackend(model_id=model_id)
+                async with asyncio.timeout(timeout_sec):
+                    await backend_instance.probe()
+                return {"backend": bkend, "outcome": "pass", "reason": None}
+            except TimeoutError:
+                return {
+                    "backend": bkend,
+                    "outcome": "fail",
+                    "reason": f"{ErrorCodes.MODEL_PROBE_FAILED}:probe_timeout",
+                }
+            except Exception as exc:
+                return {
+                    "backend": bkend,
+                    "outcome": "fail",
+                    "reason": f"{ErrorCodes.MODEL_PROBE_FAILED}:{exc}",
+                }
+            finally:
+                if backend_instance is not None:
+                    backend_instance.close()
+
+        return {"backend": bkend, "outcome": "unknown", "reason": "not_probed"}
 
     # ── Load ───────────────────────────────────────────────────────────
 
@@ -784,6 +849,8 @@ class ModelLifecycleManager:
                 )
             gguf_model_path = gguf_candidates[0]
             fmt = "gguf"
+        elif selected_backend == "fake":
+            fmt = "fake"
         runtime_backend = "mlx" if selected_backend in {"vllm-mlx", "mlx-lm"} else selected_backend
         runtime_issue = (
             _detect_runtime_incompatibility(model_id)
@@ -867,9 +934,31 @@ class ModelLifecycleManager:
                 perf = performance_overrides or {}
         else:
             perf = performance_overrides or {}
+            stale = self._autotune.find_stale(
+                model_id=model_id,
+                backend=selected_backend,
+                backend_version=self._autotune_backend_version(selected_backend),
+            )
+            if stale is not None:
+                logger.info(
+                    "autotune_profile_stale",
+                    extra={
+                        "model_id": model_id,
+                        "backend": selected_backend,
+                        "tuned_backend_version": stale.get("backend_version"),
+                    },
+                )
 
         await self._set_readiness_state(model_id, "loading")
 
+        # Fault shards into the page cache while the probe and backend start up.
+        prewarm_job: PrewarmJob | None = None
+        prewarm_mode = "cold"
+        if self._prewarmer is not None and fmt == "mlx":
+            if self._prewarmer.warmed_ahead(model_id):
+                prewarm_mode = "ahead"
+            prewarm_job = self._prewarmer.begin(model_id, trigger="load")
+
         if fmt == "mlx" and selected_backend == "vllm-mlx" and self._loader_isolation_enabled:
             try:
                 outcome = await run_loader_supervisor(
@@ -881,6 +970,7 @@ class ModelLifecycleManager:
                         probe_only=True,
                     ),
                     timeout_sec=float(self._loader_timeout_sec),
+                    pool=self._loader_pool,
                 )
             except Exception as exc:
                 outcome = None
@@ -916,6 +1006,8 @@ class ModelLifecycleManager:
                         "loader_timeout_sec": self._loader_timeout_sec,
                     },
                 )
+                if prewarm_job is not None:
+                    prewarm_job.cancel()
                 raise RuntimeError(failure_reason)
 
         spec_requested, draft_model, spec_num_tokens, spec_require_supported = (
@@ -962,6 +1054,13 @@ class ModelLifecycleManager:
                     backend_kwargs["num_draft_tokens"] = spec_num_tokens
                 backend_instance = MLXLMBackend(**backend_kwargs)
                 engine = None
+            elif fmt == "fake":
+                if spec_requested:
+                    speculative_status["active"] = False
+                    speculative_status["reason"] = "backend_unsupported:fake"
+                backend_instance = FakeBackend(model_id, self._fake_backend_profile)
+                await backend_instance.load()
+                engine = None
             elif fmt == "gguf":
                 if spec_requested and spec_require_supported:
                     raise RuntimeError(
@@ -1020,10 +1119,17 @@ class ModelLifecycleManager:
                 },
             )
             raise RuntimeError(f"Failed to load model {model_id}: {e}") from e
+        finally:
+            # Whatever is still unread is no longer worth reading.
+            if prewarm_job is not None:
+                prewarm_job.cancel()
 
         elapsed = time.monotonic() - start
+        prewarm_info = await self._finish_prewarm(model_id, prewarm_job, prewarm_mode, elapsed)
         memory_after = self._memory.used_memory_gb()
         model_memory_gb = max(0, memory_after - memory_before)
+        if fmt == "fake":
+            model_memory_gb = backend_instance.memory_footprint_gb
 
         if self._memory.usage_percent() >= self._memory.threshold_percent:
             logger.warning(
@@ -1041,7 +1147,12 @@ class ModelLifecycleManager:
             )
 
         ctx_len: int | None = None
-        ctx_len = self._gguf_context_length if fmt == "gguf" else _resolve_context_length(model_id)
+        if fmt == "gguf":
+            ctx_len = self._gguf_context_length
+        elif fmt == "fake":
+            ctx_len = backend_instance.context_length
+        else:
+            ctx_len = _resolve_context_length(model_id)
 
         loaded_at = time.time()
         loaded = LoadedModel(
@@ -1078,6 +1189,7 @@ class ModelLifecycleManager:
                 "speculative_active": loaded.speculative_active,
                 "speculative_requested": loaded.speculative_requested,
                 "speculative_reason": loaded.speculative_reason,
+                **prewarm_info,
             },
         )
 
@@ -1322,7 +1434,7 @@ class ModelLifecycleManager:
 
             engine = BatchedEngine(
                 model_name=resolved_model_name,
-                stream_interval=self._stream_interval,
+                stream_interval=perf.get("stream_interval", self._stream_interval),
                 scheduler_config=scheduler_config,
                 **engine_kwargs,
             )
@@ -1597,8 +1709,8 @@ class ModelLifecycleManager:
 
     @staticmethod
     def _loaded_backend_name(loaded: LoadedModel) -> str:
-        if loaded.backend_type == "gguf":
-            return "gguf"
+        if loaded.backend_type in {"gguf", "fake"}:
+            return loaded.backend_type
         if loaded.backend is not None and loaded.backend.__class__.__name__ == "MLXLMBackend":
             return "mlx-lm"
         return "vllm-mlx"
@@ -0,0 +1,231 @@
+"""Deterministic simulated backend for load testing and profiling without MLX.
+
+``FakeBackend`` implements the :class:`InferenceBackend` protocol with
+realistic timing instead of a model:
+
+- Prefill costs ``prompt_tokens / prefill_tokens_per_sec`` and is serialized
+  per model, like compute-bound prompt processing on a single GPU.
+- Decode emits tokens at ``decode_tokens_per_sec`` with +/- ``jitter``, slowed
+  by ``batch_slowdown`` for each other stream decoding concurrently.
+- Loading takes ``load_sec`` and reports a memory footprint (configured, or
+  estimated from a ``<N>B``/``<N>bit`` hint in the model id). With
+  ``resident_memory`` the footprint is actually allocated so the memory
+  monitor, eviction and admission see it.
+- ``failure_rate`` makes a share of requests fail, either before the first
+  token or part-way through a stream.
+
+Output text, lengths, jitter and failures are drawn from an RNG seeded by
+``(seed, model_id, prompt, max_tokens)``, so identical requests behave
+identically no matter how many run concurrently.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import re
+import zlib
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from opta_lmx.inference.mlx_lm_backend import _messages_to_prompt
+
+logger = logging.getLogger(__name__)
+
+_PAGE_BYTES = 4096
+_PARAMS_RE = re.compile(r"(\d+(?:\.\d+)?)b(?![a-z])")
+_BITS_RE = re.compile(r"(\d+)-?bit")
+_TEXT = (
+    "the model returns a simulated token stream for load testing while the server "
+    "schedules requests in batches with prefill and decode under realistic timing "
+    "so latency throughput and memory behave like a real deployment"
+)
+_VOCABULARY = tuple(_TEXT.split())
+
+
+class FakeBackendError(RuntimeError):
+    """A failure injected by ``FakeBackendProfile.failure_rate``."""
+
+
+@dataclass(frozen=True)
+class FakeBackendProfile:
+    """Timing, memory and failure model shared by every fake-loaded model."""
+
+    prefill_tokens_per_sec: float = 2000.0
+    decode_tokens_per_sec: float = 40.0
+    jitter: float = 0.1
+    batch_slowdown: float = 0.15
+    completion_tokens: int = 128
+    load_sec: float = 0.5
+    memory_gb: float | None = None
+    resident_memory: bool = False
+    context_length: int = 8192
+    failure_rate: float = 0.0
+    seed: int = 0
+
+
+def estimate_memory_gb(model_id: str, default_gb: float = 1.0) -> float:
+    """Estimate weight memory from ``<N>B`` and ``<N>bit`` hints in a model id."""
+    lowered = model_id.lower()
+    params = _PARAMS_RE.search(lowered)
+    if params is None:
+        return default_gb
+    bits_match = _BITS_RE.search(lowered)
+    bits = int(bits_match.group(1)) if bits_match else 16
+    # ~10% on top of the raw weights for embeddings, norms and runtime buffers.
+    return round(float(params.group(1)) * bits / 8 * 1.1, 2)
+
+
+class FakeBackend:
+    """Simulated inference backend with deterministic, realistic timing."""
+
+    def __init__(
+        self,
+        model_id: str,
+        profile: FakeBackendProfile | None = None,
+        *,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._model_id = model_id
+        self._profile = profile or FakeBackendProfile()
+        self._sleep = sleep
+        self._prefill_lock = asyncio.Lock()
+        self._decoding = 0
+        self._ballast: bytearray | None = None
+        self.memory_footprint_gb = (
+            self._profile.memory_gb
+            if self._profile.memory_gb is not None
+            else estimate_memory_gb(model_id)
+        )
+        self.context_length = self._profile.context_length
+
+    async def load(self) -> None:
+        """Simulate weight loading: wait ``load_sec`` and claim the footprint."""
+        await self._sleep(self._profile.load_sec)
+        if self._profile.resident_memory and self.memory_footprint_gb > 0:
+            size = int(self.memory_footprint_gb * 1024**3)
+            self._ballast = await asyncio.to_thread(_resident_buffer, size)
+        logger.info(
+            "fake_backend_loaded",
+            extra={
+                "model_id": self._model_id,
+                "memory_gb": self.memory_footprint_gb,
+                "resident": self._ballast is not None,
+            },
+        )
+
+    async def generate(
+        self,
+        messages: list[dict[str, Any]],
+        temperature: float,
+        max_tokens: int,
+        top_p: float,
+        stop: list[str] | None,
+        tools: list[dict[str, Any]] | None,
+        response_format: dict[str, Any] | None = None,
+    ) -> tuple[str, int, int]:
+        """Non-streaming generation: the full prefill and decode time, then the text."""
+        parts: list[str] = []
+        prompt_tokens = 0
+        async for piece in self._run(messages, max_tokens, stop, response_format):
+            if isinstance(piece, int):
+                prompt_tokens = piece
+            else:
+                parts.append(piece)
+        return "".join(parts), prompt_tokens, len(parts)
+
+    async def stream(
+        self,
+        messages: list[dict[str, Any]],
+        temperature: float,
+        max_tokens: int,
+        top_p: float,
+        stop: list[str] | None,
+        tools: list[dict[str, Any]] | None,
+        response_format: dict[str, Any] | None = None,
+    ) -> AsyncIterator[str]:
+        """Streaming generation — yields one token string per simulated decode step."""
+        async for piece in self._run(messages, max_tokens, stop, response_format):
+            if isinstance(piece, str):
+                yield piece
+
+    async def _run(
+        self,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        stop: list[str] | None,
+        response_format: dict[str, Any] | None,
+    ) -> AsyncIterator[str | int]:
+        """Yield the prompt token count, then tokens at the simulated pace."""
+        profile = self._profile
+        prompt = _messages_to_prompt(messages)
+        rng = random.Random(
+            zlib.crc32(f"{profile.seed}\0{self._model_id}\0{prompt}\0{max_tokens}".encode())
+        )
+        prompt_tokens = max(1, len(prompt.split()))
+        tokens = _completion(rng, profile, max_tokens, stop, response_format)
+        fail_at = rng.randint(0, len(tokens)) if rng.random() < profile.failure_rate else None
+
+        async with self._prefill_lock:
+            await self._sleep(prompt_tokens / profile.prefill_tokens_per_sec)
+        yield prompt_tokens
+
+        self._decoding += 1
+        try:
+            for index, token in enumerate(tokens):
+                if index == fail_at:
+                    raise FakeBackendError(f"Injected fake backend failure after {index} tokens")
+                contention = 1.0 + profile.batch_slowdown * (self._decoding - 1)
+                wobble = 1.0 + rng.uniform(-profile.jitter, profile.jitter)
+                await self._sleep(contention * wobble / profile.decode_tokens_per_sec)
+                yield token
+            if fail_at == len(tokens):
+                raise FakeBackendError("Injected fake backend failure at end of stream")
+        finally:
+            self._decoding -= 1
+
+    def close(self) -> None:
+        """Release the simulated weights."""
+        self._ballast = None
+        logger.info("fake_backend_closed", extra={"model_id": self._model_id})
+
+
+def _completion(
+    rng: random.Random,
+    profile: FakeBackendProfile,
+    max_tokens: int,
+    stop: list[str] | None,
+    response_format: dict[str, Any] | None,
+) -> list[str]:
+    """Draw the token strings for one completion (cut at any stop sequence)."""
+    target = max(1, int(profile.completion_tokens * (1.0 + rng.uniform(-0.25, 0.25))))
+    count = max(1, min(max_tokens, target))
+    words = [rng.choice(_VOCABULARY) for _ in range(count)]
+    tokens = [words[0], *(" " + word for word in words[1:])]
+    if response_format and response_format.get("type") in {"json_object", "json_schema"}:
+        # The vocabulary never needs escaping, so this stays valid JSON.
+        tokens = ['{"response": "', *tokens[: max(0, count - 2)], '"}'] if count > 1 else ["{}"]
+
+    text = "".join(tokens)
+    cuts = [text.find(s) for s in stop or () if s and s in text]
+    if not cuts:
+        return tokens
+    remaining = min(cuts)
+    kept: list[str] = []
+    for token in tokens:
+        if len(token) >= remaining:
+            if remaining:
+                kept.append(token[:remaining])
+            break
+        kept.append(token)
+        remaining -= len(token)
+    return kept
+
+
+def _resident_buffer(size: int) -> bytearray:
+    """Allocate ``size`` bytes and touch every page so they count as resident."""
+    buffer = bytearray(size)
+    buffer[::_PAGE_BYTES] = b"\x01" * len(range(0, size, _PAGE_BYTES))
+    return buffer
@@ -282,12 +282,15 @@ class AdminProbeCandidate(BaseModel):
     backend: str
     outcome: str
     reason: str | None = None
+    duration_ms: float | None = None
 
 
 class AdminProbeResponse(BaseModel):
     model_id: str
     recommended_backend: str | None = None
     candidates: list[AdminProbeCandidate] = Field(default_factory=list)
+    probe_wall_ms: float | None = None
+    loader_pool: dict[str, float | int] | None = None
 
 
 class AdminCompatibilityRecord(BaseModel):
@@ -325,12 +328,32 @@ class AdminAutotuneRequest(BaseModel):
         False,
         description="Allow evaluating candidates on otherwise blocked backends.",
     )
+    search: bool = Field(
+        False,
+        description=(
+            "Search the knob space with successive halving instead of benchmarking "
+            "only `profiles` (which, with any stale tuned profile, seed the search)."
+        ),
+    )
+    search_space: dict[str, list[Any]] | None = Field(
+        None,
+        description=(
+            "Knob values to search, keyed by dotted override path "
+            "(e.g. 'scheduler.max_num_seqs'). None uses the built-in space."
+        ),
+    )
+    max_candidates: int = Field(8, ge=1, le=64, description="Candidates entering the search.")
+    concurrency: int = Field(
+        4, ge=1, le=64, description="Simultaneous streams per search measurement."
+    )
+    eta: int = Field(2, ge=2, le=4, description="Keep the best 1/eta candidates per rung.")
 
 
 class AdminAutotuneCandidate(BaseModel):
     profile: dict[str, Any] = Field(default_factory=dict)
     metrics: dict[str, float] = Field(default_factory=dict)
     score: float
+    rung: int | None = None
 
 
 class AdminAutotuneResponse(BaseModel):
@@ -341,6 +364,8 @@ class AdminAutotuneResponse(BaseModel):
     best_metrics: dict[str, float] = Field(default_factory=dict)
     best_score: float
     candidates: list[AdminAutotuneCandidate] = Field(default_factory=list)
+    reloads: int | None = None
+    hot_applies: int | None = None
 
 
 class AdminAutotuneRecordResponse(BaseModel):
@@ -0,0 +1,125 @@
+"""Precompiled SSE frame templates for per-token streaming events.
+
+Every token frame of a stream differs from its neighbours only in the delta
+text: the id, model, created timestamp and every other field are fixed for the
+life of the request. A :class:`SSEFrameTemplate` serializes one frame up front
+with a placeholder, splits it into a fixed prefix and suffix, and afterwards
+encodes each token by splicing the JSON-escaped delta between them — no model
+construction, ``model_dump()`` or dict walk per token.
+
+Templates are built through the exact serializer the slow path uses
+(``json.dumps`` with its default separators and ``ensure_ascii=True``), and the
+delta is escaped with the same C routine ``json.dumps`` applies to a bare
+string, so output is byte-for-byte identical.
+"""
+
+from __future__ import annotations
+
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Any
+
+from opta_lmx.inference.schema import (
+    ChatCompletionChunk,
+    ChunkChoice,
+    DeltaMessage,
+    FunctionCallDelta,
+    ToolCallDelta,
+)
+
+# Placeholder for the delta while a template is serialized. The NULs escape to
+# ``\u0000`` so it cannot collide with ordinary ids or model names, and it sits
+# after them in every payload, so the last occurrence is always the delta.
+DELTA = "\x00opta-lmx-sse-delta\x00"
+_ENCODED_DELTA = encode_basestring_ascii(DELTA)
+
+
+class SSEFrameTemplate:
+    """A serialized SSE frame with one variable string field."""
+
+    __slots__ = ("_prefix", "_suffix")
+
+    def __init__(self, prefix: str, suffix: str) -> None:
+        self._prefix = prefix
+        self._suffix = suffix
+
+    @classmethod
+    def from_json(cls, payload_json: str, *, event: str | None = None) -> SSEFrameTemplate:
+        """Build a template from JSON containing the delta placeholder once."""
+        head, sep, tail = payload_json.rpartition(_ENCODED_DELTA)
+        if not sep:
+            raise ValueError("SSE template payload does not contain the delta placeholder")
+        prefix = f"event: {event}\ndata: {head}" if event else f"data: {head}"
+        return cls(prefix, tail + "\n\n")
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any], *, event: str | None = None) -> SSEFrameTemplate:
+        """Build a template from a dict with ``DELTA`` in the variable slot."""
+        return cls.from_json(json.dumps(payload), event=event)
+
+    def encode(self, delta: str) -> str:
+        """Return the complete SSE frame for ``delta``."""
+        return self._prefix + encode_basestring_ascii(delta) + self._suffix
+
+
+def _chat_template(
+    request_id: str,
+    model: str,
+    created: int,
+    delta: DeltaMessage,
+    *,
+    choice_index: int,
+    include_logprobs_placeholder: bool,
+) -> SSEFrameTemplate:
+    # Serialized by the slow path's own encoder so the two cannot drift apart.
+    from opta_lmx.inference.streaming import _dump_chat_chunk_json
+
+    chunk = ChatCompletionChunk(
+        id=request_id,
+        created=created,
+        model=model,
+        choices=[ChunkChoice(index=choice_index, delta=delta, finish_reason=None)],
+    )
+    return SSEFrameTemplate.from_json(
+        _dump_chat_chunk_json(chunk, include_logprobs_placeholder=include_logprobs_placeholder)
+    )
+
+
+def chat_content_template(
+    request_id: str,
+    model: str,
+    created: int,
+    *,
+    choice_index: int = 0,
+    include_logprobs_placeholder: bool = False,
+) -> SSEFrameTemplate:
+    """Template for an OpenAI ``chat.completion.chunk`` content delta."""
+    return _chat_template(
+        request_id,
+        model,
+        created,
+        DeltaMessage(content=DELTA),
+        choice_index=choice_index,
+        include_logprobs_placeholder=include_logprobs_placeholder,
+    )
+
+
+def chat_tool_arguments_template(
+    request_id: str,
+    model: str,
+    created: int,
+    tool_index: int,
+    *,
+    choice_index: int = 0,
+    include_logprobs_placeholder: bool = False,
+) -> SSEFrameTemplate:
+    """Template for a tool call delta that carries only an arguments fragment."""
+    tool_call = ToolCallDelta(index=tool_index, function=FunctionCallDelta(arguments=DELTA))
+    return _chat_template(
+        request_id,
+        model,
+        created,
+        DeltaMessage(tool_calls=[tool_call]),
+        choice_index=choice_index,
+        include_logprobs_placeholder=include_logprobs_placeholder,
+    )
@@ -14,6 +14,11 @@ from opta_lmx.inference.schema import (
     FunctionCallDelta,
     ToolCallDelta,
 )
+from opta_lmx.inference.sse_encoder import (
+    SSEFrameTemplate,
+    chat_content_template,
+    chat_tool_arguments_template,
+)
 from opta_lmx.inference.tool_parser import StreamChunk
 
 logger = logging.getLogger(__name__)
@@ -92,6 +97,15 @@ async def format_sse_stream(
         + "\n\n"
     )
 
+    # Every content chunk differs only in the delta text
+    content_frame = chat_content_template(
+        request_id,
+        model,
+        created,
+        choice_index=choice_index,
+        include_logprobs_placeholder=include_logprobs_placeholder,
+    )
+
     # Content chunks — wrapped in try/except for GUARDRAIL G-LMX-05
     try:
         async for item in token_stream:
@@ -101,26 +115,7 @@ async def format_sse_stream(
                 hit_max_tokens = item.hit_max_tokens
                 continue
             completion_tokens += 1
-            chunk = ChatCompletionChunk(
-                id=request_id,
-                created=created,
-                model=model,
-                choices=[
-                    ChunkChoice(
-                        index=choice_index,
-                        delta=DeltaMessage(content=item),
-                        finish_reason=None,
-                    )
-                ],
-            )
-            yield (
-                "data: "
-                + _dump_chat_chunk_json(
-                    chunk,
-                    include_logprobs_placeholder=include_logprobs_placeholder,
-                )
-                + "\n\n"
-            )
+            yield content_frame.encode(item)
     except Exception as e:
         logger.error(
             "stream_mid_generation_error",
@@ -267,6 +262,15 @@ async def format_sse_tool_stream(
         + "\n\n"
     )
 
+    content_frame = chat_content_template(
+        request_id,
+        model,
+        created,
+        choice_index=choice_index,
+        include_logprobs_placeholder=include_logprobs_placeholder,
+    )
+    args_frames: dict[int, SSEFrameTemplate] = {}
+
     try:
         async for stream_chunk in chunk_stream:
             # Check for end marker from _counting_stream
@@ -277,30 +281,25 @@ async def format_sse_tool_stream(
 
             if stream_chunk.content is not None:
                 completion_tokens += 1
-                chunk = ChatCompletionChunk(
-                    id=request_id,
-                    created=created,
-                    model=model,
-                    choices=[
-                        ChunkChoice(
-                            index=choice_index,
-                            delta=DeltaMessage(content=stream_chunk.content),
-                            finish_reason=None,
-                        )
-                    ],
-                )
-                yield (
-                    "data: "
-                    + _dump_chat_chunk_json(
-                        chunk,
-                        include_logprobs_placeholder=include_logprobs_placeholder,
-                    )
-                    + "\n\n"
-                )
+                yield content_frame.encode(stream_chunk.content)
 
             elif stream_chunk.tool_call_delta is not None:
                 saw_tool_calls = True
                 tc = stream_chunk.tool_call_delta
+                if tc.id is None and tc.name is None and tc.arguments_delta is not None:
+                    # Argument fragments after the header chunk: template path.
+                    args_frame = args_frames.get(tc.index)
+                    if args_frame is None:
+                        args_frame = args_frames[tc.index] = chat_tool_arguments_template(
+                            request_id,
+                            model,
+                            created,
+                            tc.index,
+                            choice_index=choice_index,
+                            include_logprobs_placeholder=include_logprobs_placeholder,
+                        )
+                    yield args_frame.encode(tc.arguments_delta)
+                    continue
                 chunk = ChatCompletionChunk(
                     id=request_id,
                     created=created,
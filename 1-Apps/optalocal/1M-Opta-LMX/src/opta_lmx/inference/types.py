@@ -60,3 +60,19 @@ class LoadedModel:
     speculative_reason: str | None = None
     speculative_draft_model: str | None = None
     speculative_num_tokens: int | None = None
+
+
+@dataclass(frozen=True)
+class ModelRoutingStats:
+    """Live per-model load and latency signals used by load-aware routing."""
+
+    active: int = 0
+    waiting: int = 0
+    capacity: int = 1
+    latency_p95_sec: float | None = None
+    latency_ewma_sec: float | None = None
+
+    @property
+    def outstanding(self) -> int:
+        """Requests either running on or queued for this model."""
+        return self.active + self.waiting
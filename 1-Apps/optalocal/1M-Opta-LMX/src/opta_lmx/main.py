@@ -47,15 +47,24 @@ from opta_lmx.api.sessions import router as sessions_router
 from opta_lmx.api.skills import router as skills_router
 from opta_lmx.api.websocket import router as websocket_router
 from opta_lmx.config import LMXConfig, load_config
+from opta_lmx.inference.coalescing import StreamCoalescer
 from opta_lmx.inference.engine import InferenceEngine
+from opta_lmx.inference.fake_backend import FakeBackendProfile
+from opta_lmx.manager.downloader import ParallelDownloader
 from opta_lmx.manager.memory import MemoryMonitor
 from opta_lmx.manager.model import ModelManager
+from opta_lmx.manager.prewarm import ModelPrewarmer
 from opta_lmx.monitoring.events import EventBus, ServerEvent
 from opta_lmx.monitoring.journal import RuntimeJournalManager
 from opta_lmx.monitoring.logging import setup_logging
 from opta_lmx.monitoring.metrics import MetricsCollector
 from opta_lmx.presets.manager import PresetManager
+from opta_lmx.proxy import keychain_reader
+from opta_lmx.proxy.subscription_providers import SUBSCRIPTION_ROUTES
+from opta_lmx.proxy.subscription_proxy import SubscriptionClientPool
 from opta_lmx.router.strategy import TaskRouter
+from opta_lmx.runtime.child_loader_pool import LoaderWorkerPool
+from opta_lmx.runtime.engine_ipc import EngineIPCServer, engine_socket_paths
 from opta_lmx.runtime_state import RuntimeState
 from opta_lmx.security.jwt_verifier import SupabaseJWTVerifier
 from opta_lmx.sessions.store import SessionStore
@@ -65,6 +74,7 @@ from opta_lmx.skills.executors import SkillExecutor
 from opta_lmx.skills.mcp_bridge import RemoteMCPBridge
 from opta_lmx.skills.policy import SkillsPolicy
 from opta_lmx.skills.registry import SkillsRegistry
+from opta_lmx.skills.worker_pool import SkillWorkerPool
 
 logger = logging.getLogger(__name__)
 _RUNTIME_STATE_SNAPSHOT_INTERVAL_SEC = 10.0
@@ -85,8 +95,6 @@ class _AgentsTaskRouterAdapter:
         client_id: str | None = None,
         model_load_snapshot: Mapping[str, float | int] | None = None,
     ) -> str:
-        # Current TaskRouter does not use client affinity, but runtime may pass it.
-        del client_id
         snapshot: dict[str, float] | None = None
         if model_load_snapshot is not None:
             snapshot = {
@@ -98,6 +106,7 @@ class _AgentsTaskRouterAdapter:
             model_id,
             loaded_model_ids,
             model_load_snapshot=snapshot,
+            client_id=client_id,
         )
 
 
@@ -196,6 +205,8 @@ def _build_supabase_jwt_verifier(config: LMXConfig) -> SupabaseJWTVerifier | Non
         audience=config.security.supabase_jwt_audience,
         jwks_url=config.security.supabase_jwt_jwks_url,
         user_id_claim=config.security.supabase_jwt_claim_user_id,
+        cache_ttl_sec=config.security.supabase_jwt_jwks_cache_ttl_sec,
+        token_cache_size=config.security.supabase_jwt_token_cache_size,
     )
 
 
@@ -244,7 +255,10 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     # Initialize core services
     memory_monitor = MemoryMonitor(max_percent=config.memory.max_memory_percent)
-    event_bus = EventBus()
+    event_bus = EventBus(
+        ring_size=config.server.sse_replay_buffer_size,
+        coalesce_keys=config.server.sse_coalesce_event_keys,
+    )
     journal_manager: RuntimeJournalManager | None = None
     journal_event_queue: asyncio.Queue[ServerEvent] | None = None
     journal_event_task: asyncio.Task[None] | None = None
@@ -266,6 +280,22 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     except Exception:
         logger.warning("metal_limits_failed", exc_info=True)
 
+    loader_pool: LoaderWorkerPool | None = None
+    if config.models.loader_isolation_enabled and config.models.loader_pool_size > 0:
+        loader_pool = LoaderWorkerPool(
+            size=config.models.loader_pool_size,
+            max_jobs_per_worker=config.models.loader_pool_max_jobs_per_worker,
+            preload_modules=config.models.loader_pool_preload_modules,
+        )
+        # Workers are forked by the first loads, not at start-up.
+        await loader_pool.start(prefork=False)
+
+    prewarmer = ModelPrewarmer(
+        enabled=config.models.prewarm_enabled,
+        method=config.models.prewarm_method,
+        workers=config.models.prewarm_workers,
+    )
+
     engine = InferenceEngine(
         memory_monitor=memory_monitor,
         use_batching=config.models.use_batching,
@@ -300,15 +330,44 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         adaptive_latency_target_ms=config.models.adaptive_latency_target_ms,
         adaptive_latency_window=config.models.adaptive_latency_window,
         adaptive_min_concurrent_requests=config.models.adaptive_min_concurrent_requests,
+        admission_control_enabled=config.models.admission_control_enabled,
+        admission_max_queue_depth=config.models.admission_max_queue_depth,
+        admission_codel_target_ms=config.models.admission_codel_target_ms,
+        admission_codel_interval_ms=config.models.admission_codel_interval_ms,
+        loader_pool=loader_pool,
+        prewarmer=prewarmer,
+        fake_backend_profile=FakeBackendProfile(**config.models.fake_backend.model_dump()),
     )
 
+    downloader: ParallelDownloader | None = None
+    if config.models.download_engine == "parallel":
+        downloader = ParallelDownloader(
+            max_workers=config.models.download_workers,
+            chunk_bytes=config.models.download_chunk_mb * 1024 * 1024,
+            max_bytes_per_sec=(
+                config.models.download_max_mb_per_sec * 1024 * 1024
+                if config.models.download_max_mb_per_sec
+                else None
+            ),
+        )
+
     model_manager = ModelManager(
         models_directory=config.models.models_directory,
         event_bus=event_bus,
+        downloader=downloader,
     )
 
-    task_router = TaskRouter(config.routing)
+    task_router = TaskRouter(config.routing, stats_provider=engine.get_model_routing_stats)
     metrics = MetricsCollector()
+    if loader_pool is not None:
+        metrics.register_source("loader_pool", loader_pool.stats)
+    metrics.register_source("prewarm", prewarmer.stats)
+    metrics.register_source("admission", engine.admission_stats)
+    metrics.register_source("event_bus", event_bus.stats)
+    if downloader is not None:
+        metrics.register_source("downloads", downloader.stats)
+    stream_coalescer = StreamCoalescer.from_config(config.streaming)
+    metrics.register_source("stream_coalescing", stream_coalescer.stats)
 
     if config.journaling.enabled:
         try:
@@ -396,6 +455,17 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         approval_required_tags=set(getattr(config.skills, "require_approval_tags", [])),
         allow_shell_exec=bool(getattr(config.skills, "allow_shell", True)),
     )
+    skill_worker_pool: SkillWorkerPool | None = None
+    if config.workers.skill_process_isolation:
+        skill_worker_pool = SkillWorkerPool(
+            size=config.workers.max_concurrent_skill_calls,
+            module_search_paths=skill_directories,
+            per_skill_max_concurrency=config.workers.per_skill_max_concurrency,
+            per_skill_concurrency=config.workers.per_skill_concurrency,
+            max_calls_per_worker=config.workers.skill_worker_max_calls,
+        )
+        await asyncio.to_thread(skill_worker_pool.start, prewarm=config.skills.enabled)
+        metrics.register_source("skill_workers", skill_worker_pool.stats)
     skill_executor = SkillExecutor(
         policy=skills_policy,
         default_timeout_sec=config.agents.default_timeout_sec,
@@ -405,6 +475,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         sandbox_allowed_entrypoint_modules=config.skills.sandbox_allowed_entrypoint_modules,
         otel_enabled=config.observability.opentelemetry_enabled,
         otel_service_name=config.observability.service_name,
+        worker_pool=skill_worker_pool,
     )
     skill_dispatcher: SkillDispatcher
     if config.workers.enabled:
@@ -424,6 +495,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             persist_path=skills_queue_path,
         )
         await queued_dispatcher.start()
+        metrics.register_source("skill_queue", queued_dispatcher.stats)
         skill_dispatcher = queued_dispatcher
     else:
         skill_dispatcher = LocalSkillDispatcher(skill_executor)
@@ -443,6 +515,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             Path.home() / ".opta-lmx" / "agents-queue.db",
         ),
     )
+    metrics.register_source("agents_queue", scheduler.stats)
     agent_runtime = AgentsRuntime(
         engine=engine,
         router=_AgentsTaskRouterAdapter(task_router),
@@ -454,6 +527,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         retain_completed_runs=config.agents.retain_completed_runs,
         step_retry_attempts=config.agents.step_retry_attempts,
         step_retry_backoff_sec=config.agents.step_retry_backoff_sec,
+        stream_persist_interval_sec=config.agents.stream_persist_interval_sec,
     )
     await agent_runtime.start()
 
@@ -472,6 +546,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     app.state.model_manager = model_manager
     app.state.router = task_router
     app.state.metrics = metrics
+    app.state.stream_coalescer = stream_coalescer
     app.state.preset_manager = preset_manager
     app.state.event_bus = event_bus
     app.state.journal_manager = journal_manager
@@ -482,7 +557,12 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     app.state.inference_api_key = config.security.inference_api_key
     app.state.supabase_jwt_enabled = config.security.supabase_jwt_enabled
     app.state.supabase_jwt_require = config.security.supabase_jwt_require
-    app.state.supabase_jwt_verifier = _build_supabase_jwt_verifier(config)
+    supabase_jwt_verifier = _build_supabase_jwt_verifier(config)
+    app.state.supabase_jwt_verifier = supabase_jwt_verifier
+    if supabase_jwt_verifier is not None:
+        if config.security.supabase_jwt_background_refresh:
+            supabase_jwt_verifier.start_background_refresh()
+        metrics.register_source("jwt", supabase_jwt_verifier.stats)
     app.state.honor_x_forwarded_for = config.security.honor_x_forwarded_for
     app.state.trusted_proxy_networks = _parse_trusted_proxy_networks(
         config.security.trusted_proxies
@@ -528,34 +608,65 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     )
 
     # Initialize session store for CLI session file access
-    session_store = SessionStore()
+    session_store = SessionStore(
+        search_index_path=(
+            config.sessions.search_index_path if config.sessions.search_index_enabled else None
+        )
+    )
+    if session_store.search_index is not None:
+        session_store.start_background_sync(config.sessions.index_sync_interval_sec)
+        metrics.register_source("session_index", session_store.search_index.stats)
+    metrics.register_source("session_summary_cache", session_store.summary_cache.stats)
     app.state.session_store = session_store
     logger.info("session_store_initialized")
 
     # Initialize helper node clients (embedding/reranking on LAN devices)
     from opta_lmx.helpers.client import HelperNodeClient
+    from opta_lmx.helpers.pool import HelperNodePool
 
-    remote_embedding: HelperNodeClient | None = None
-    remote_reranking: HelperNodeClient | None = None
+    remote_embedding: HelperNodeClient | HelperNodePool | None = None
+    remote_reranking: HelperNodeClient | HelperNodePool | None = None
 
-    if config.helper_nodes.embedding:
+    if config.helper_nodes.embedding_pool:
+        remote_embedding = HelperNodePool(config.helper_nodes.embedding_pool)
+        logger.info("helper_pool_embedding_configured")
+    elif config.helper_nodes.embedding:
         remote_embedding = HelperNodeClient(config.helper_nodes.embedding)
         logger.info("helper_node_embedding_configured")
-    if config.helper_nodes.reranking:
+    if config.helper_nodes.reranking_pool:
+        remote_reranking = HelperNodePool(config.helper_nodes.reranking_pool)
+        logger.info("helper_pool_reranking_configured")
+    elif config.helper_nodes.reranking:
         remote_reranking = HelperNodeClient(config.helper_nodes.reranking)
         logger.info("helper_node_reranking_configured")
 
     app.state.remote_embedding = remote_embedding
     app.state.remote_reranking = remote_reranking
 
+    # Subscription proxy: keep-alive upstream clients + off-loop token reads
+    subscription_clients = SubscriptionClientPool(
+        max_connections=config.subscription_proxy.max_connections,
+        max_keepalive_connections=config.subscription_proxy.max_keepalive_connections,
+        keepalive_expiry_sec=config.subscription_proxy.keepalive_expiry_sec,
+        http2=config.subscription_proxy.http2,
+    )
+    app.state.subscription_clients = subscription_clients
+    metrics.register_source("subscription_proxy", subscription_clients.stats)
+    token_buckets = getattr(app.state, "token_buckets", None)
+    if token_buckets is not None:
+        metrics.register_source("token_budget", token_buckets.stats)
+    if config.subscription_proxy.token_background_refresh:
+        keychain_reader.start_background_refresh(r.provider_id for r in SUBSCRIPTION_ROUTES)
+
     # Start background health check loop for helper nodes
     from opta_lmx.helpers.health import health_check_loop
 
     health_clients: list[HelperNodeClient] = []
-    if remote_embedding:
-        health_clients.append(remote_embedding)
-    if remote_reranking:
-        health_clients.append(remote_reranking)
+    for remote in (remote_embedding, remote_reranking):
+        if isinstance(remote, HelperNodePool):
+            health_clients.extend(remote.clients)
+        elif remote is not None:
+            health_clients.append(remote)
 
     health_task: asyncio.Task[None] | None = None
     if health_clients:
@@ -658,13 +769,21 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             )
             await workspace_watcher.start()
             app.state.workspace_watcher = workspace_watcher
+            metrics.register_source("rag_extraction", workspace_watcher.extractor.stats)
             logger.info("workspace_watcher_initialized")
 
     # Initialize reranker engine (lazy-load — only loads model on first rerank request)
     from opta_lmx.rag.reranker import RerankerEngine
 
-    reranker_engine = RerankerEngine(model_id=config.rag.reranker_model)
+    reranker_engine = RerankerEngine(
+        model_id=config.rag.reranker_model,
+        batch_window_ms=config.rag.rerank_batch_window_ms,
+        max_batch_docs=config.rag.rerank_max_batch_docs,
+        cache_size=config.rag.rerank_cache_size,
+        prefilter_k=config.rag.rerank_prefilter_k,
+    )
     app.state.reranker_engine = reranker_engine
+    metrics.register_source("rerank", reranker_engine.stats)
 
     # Pre-load embedding model if configured
     if config.models.embedding_model:
@@ -716,6 +835,16 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         prefetch_task = asyncio.create_task(_prefetch_loop(), name="model-prefetch-loop")
         logger.info("model_prefetch_loop_started")
 
+    # Page-cache warm the models the predictor expects next (cheap: no load).
+    if config.models.prewarm_predicted_models > 0:
+        prewarmer.start_background_predictive(
+            candidates_fn=engine.suggest_prefetch_models,
+            is_loaded_fn=engine.is_model_loaded,
+            memory_ok_fn=lambda: memory_monitor.usage_percent() < config.memory.max_memory_percent,
+            interval_sec=config.models.prewarm_interval_sec,
+            max_models=config.models.prewarm_predicted_models,
+        )
+
     # Start Metal cache maintenance background task
     metal_task: asyncio.Task[None] | None = None
     if config.memory.metal_cache_maintenance and config.models.metal_cache_limit_gb is not None:
@@ -748,8 +877,36 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         ttl_task = asyncio.create_task(_ttl_loop())
         logger.info("ttl_enabled")
 
+    # Multi-worker mode: this process owns the models and serves generation,
+    # state and events to the HTTP front-end processes over a Unix socket.
+    engine_ipc: EngineIPCServer | None = None
+    if config.server.workers > 1:
+        ipc_path, _ = engine_socket_paths(config.server.ipc_dir)
+        engine_ipc = EngineIPCServer(engine, ipc_path, metrics=metrics, event_bus=event_bus)
+        await engine_ipc.start()
+        metrics.register_source("engine_ipc", engine_ipc.stats)
+    app.state.engine_ipc = engine_ipc
+
     yield
 
+    # Cleanup: stop serving front-ends first so no new generation starts
+    if engine_ipc is not None:
+        metrics.unregister_source("engine_ipc")
+        await engine_ipc.close()
+
+    # Cleanup: stop warm loader workers
+    if loader_pool is not None:
+        await loader_pool.close()
+
+    # Cleanup: stop background JWKS refresh
+    jwt_verifier_ref = getattr(app.state, "supabase_jwt_verifier", None)
+    if isinstance(jwt_verifier_ref, SupabaseJWTVerifier):
+        await jwt_verifier_ref.stop_background_refresh()
+
+    # Cleanup: stop session search index sync
+    await session_store.stop_background_sync()
+    session_store.close()
+
     # Cleanup: cancel Metal cache maintenance task
     if metal_task is not None:
         metal_task.cancel()
@@ -771,6 +928,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         prefetch_task.cancel()
         with contextlib.suppress(asyncio.CancelledError):
             await prefetch_task
+    await prewarmer.stop_background_predictive()
 
     if metrics_event_task is not None:
         metrics_event_task.cancel()
@@ -792,9 +950,15 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Cleanup: stop agents runtime
     await agent_runtime.stop()
     await skill_dispatcher.close()
+    if skill_worker_pool is not None:
+        await asyncio.to_thread(skill_worker_pool.close)
     if remote_mcp_bridge is not None:
         await remote_mcp_bridge.close()
 
+    # Cleanup: close subscription proxy clients and token refresher
+    await keychain_reader.stop_background_refresh()
+    await subscription_clients.aclose()
+
     # Cleanup: close helper node clients
     if remote_embedding:
         await remote_embedding.close()
@@ -813,8 +977,8 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     # Cleanup: unload reranker
     reranker_ref = getattr(app.state, "reranker_engine", None)
-    if reranker_ref is not None and reranker_ref.is_loaded:
-        reranker_ref.unload()
+    if reranker_ref is not None:
+        reranker_ref.shutdown()
 
     # Cleanup: unload embedding model
     if embedding_engine.is_loaded:
@@ -906,6 +1070,11 @@ def create_app(config: LMXConfig | None = None) -> FastAPI:
                 "rate_limit_enabled_but_slowapi_missing",
             )
 
+    # Token budgets on chat completions, shared by all workers on this host (opt-in)
+    from opta_lmx.api.rate_limit import configure_token_budget
+
+    configure_token_budget(app, config)
+
     # OpenTelemetry spans — wraps each request in a trace span (opt-in)
     app.add_middleware(
         cast(Any, OpenTelemetryMiddleware),
@@ -1011,6 +1180,15 @@ def cli() -> None:
         help="Quantization mode",
     )
 
+    # Load test subcommand
+    from opta_lmx.monitoring.loadgen import add_cli_arguments as _add_loadtest_arguments
+
+    loadtest_parser = subparsers.add_parser(
+        "loadtest",
+        help="Closed/open-loop load test against a running server (or a simulated target)",
+    )
+    _add_loadtest_arguments(loadtest_parser)
+
     # Global args for default serve behavior
     parser.add_argument(
         "--config",
@@ -1040,6 +1218,11 @@ def cli() -> None:
 
     args = parser.parse_args()
 
+    if args.command == "loadtest":
+        from opta_lmx.monitoring.loadgen import run_cli as _run_loadtest
+
+        sys.exit(_run_loadtest(args))
+
     if args.command == "quantize":
         from opta_lmx.manager.quantize import _do_quantize, validate_quantize_settings
 
@@ -1116,6 +1299,11 @@ def cli() -> None:
 
     # Create and run app
     app = create_app(config)
+    if config.server.workers > 1:
+        from opta_lmx.frontend import run_split_server
+
+        run_split_server(app, config, config_path=args.config, log_level=log_level)
+        return
     uvicorn.run(
         app,
         host=config.server.host,
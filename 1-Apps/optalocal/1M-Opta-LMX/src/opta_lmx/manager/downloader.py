@@ -0,0 +1,674 @@
+"""Parallel, resumable model downloads into the Hugging Face cache layout.
+
+``snapshot_download`` fetches a repo a few files at a time over one connection
+each and owns resume behaviour internally. :class:`ParallelDownloader` drives
+the transfer itself:
+
+- Files are fetched concurrently by a bounded worker pool. Files larger than
+  ``chunk_bytes`` on servers that accept byte ranges are split into parts,
+  and each part is its own ``Range`` request.
+- Data lands in ``blobs/<etag>.part`` with a ``.part.json`` sidecar that
+  records the bytes written per part. A restarted download continues each
+  part from its recorded offset, and a resumed ``206`` response must start at
+  exactly that offset.
+- Integrity is checked with a running hash that advances over the contiguous
+  completed prefix as parts finish: sha256 for LFS files, the git blob sha1
+  otherwise, plus the size. A mismatch discards the partial file.
+- One token bucket caps the combined bandwidth of every worker.
+
+Finished blobs are linked into ``snapshots/<commit>/`` and ``refs/<revision>``
+is written, so ``try_to_load_from_cache``, ``scan_cache_dir`` and backends see
+a normal cache entry.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from opta_lmx.inference.types import DownloadTask
+
+logger = logging.getLogger(__name__)
+
+_READ_BYTES = 1024 * 1024
+# Persist part progress at most this often (bytes written per part).
+_SIDECAR_FLUSH_BYTES = 8 * 1024 * 1024
+_RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class DownloadIntegrityError(RuntimeError):
+    """A downloaded file did not match its expected size or hash."""
+
+
+class DownloadCancelledError(RuntimeError):
+    """The download was cancelled by its caller."""
+
+
+class _RetryableStatusError(RuntimeError):
+    """Transient HTTP status worth retrying (rate limit or upstream error)."""
+
+
+@dataclass(frozen=True)
+class RemoteFile:
+    """One file of a repo revision, as described by the Hub."""
+
+    path: str
+    url: str
+    size: int
+    sha256: str | None = None
+    blob_id: str | None = None
+
+    @property
+    def etag(self) -> str:
+        """Blob name in the HF cache (LFS sha256, else git blob id)."""
+        return self.sha256 or self.blob_id or hashlib.sha256(self.path.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class RepoManifest:
+    """The files to fetch for one resolved repo revision."""
+
+    repo_id: str
+    commit: str
+    files: tuple[RemoteFile, ...]
+
+
+ManifestFn = Callable[[str, "str | None", "list[str] | None", "list[str] | None"], RepoManifest]
+
+
+def hub_manifest_fn(token: str | None = None) -> ManifestFn:
+    """Manifest resolver backed by ``HfApi.model_info(files_metadata=True)``."""
+
+    def _resolve(
+        repo_id: str,
+        revision: str | None,
+        allow_patterns: list[str] | None,
+        ignore_patterns: list[str] | None,
+    ) -> RepoManifest:
+        from huggingface_hub import HfApi, hf_hub_url
+        from huggingface_hub.utils._paths import filter_repo_objects
+
+        info = HfApi(token=token).model_info(repo_id, revision=revision, files_metadata=True)
+        commit = str(info.sha)
+        siblings = list(
+            filter_repo_objects(
+                info.siblings or [],
+                allow_patterns=allow_patterns,
+                ignore_patterns=ignore_patterns,
+                key=lambda s: s.rfilename,
+            )
+        )
+        files: list[RemoteFile] = []
+        for sibling in siblings:
+            lfs: Any = sibling.lfs
+            sha256 = lfs.get("sha256") if isinstance(lfs, dict) else getattr(lfs, "sha256", None)
+            files.append(
+                RemoteFile(
+                    path=sibling.rfilename,
+                    url=hf_hub_url(repo_id, sibling.rfilename, revision=commit),
+                    size=int(sibling.size or 0),
+                    sha256=sha256,
+                    blob_id=sibling.blob_id,
+                )
+            )
+        return RepoManifest(repo_id=repo_id, commit=commit, files=tuple(files))
+
+    return _resolve
+
+
+class BandwidthLimiter:
+    """Token bucket shared by every download worker thread.
+
+    Args:
+        bytes_per_sec: Sustained cap; None or 0 disables limiting.
+        burst_bytes: Bucket size; defaults to one second of traffic.
+    """
+
+    def __init__(
+        self,
+        bytes_per_sec: float | None,
+        *,
+        burst_bytes: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.bytes_per_sec = bytes_per_sec or 0.0
+        self.burst_bytes = float(burst_bytes or max(self.bytes_per_sec, 1.0))
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.burst_bytes
+        self._updated = clock()
+
+    def acquire(self, nbytes: int, cancel: threading.Event | None = None) -> None:
+        """Block until ``nbytes`` may be sent."""
+        if self.bytes_per_sec <= 0:
+            return
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.burst_bytes, self._tokens + (now - self._updated) * self.bytes_per_sec
+            )
+            self._updated = now
+            # Reserve now, even into debt, so concurrent callers queue up fairly.
+            self._tokens -= nbytes
+            wait_sec = -self._tokens / self.bytes_per_sec if self._tokens < 0 else 0.0
+        while wait_sec > 0:
+            if cancel is not None and cancel.is_set():
+                return
+            step = min(wait_sec, 0.25)
+            self._sleep(step)
+            wait_sec -= step
+
+
+def _git_blob_hasher(size: int) -> Any:
+    hasher = hashlib.sha1(usedforsecurity=False)
+    hasher.update(f"blob {size}\0".encode())
+    return hasher
+
+
+def _expected_digest(remote: RemoteFile) -> tuple[Any, str] | None:
+    if remote.sha256:
+        return hashlib.sha256(), remote.sha256
+    if remote.blob_id:
+        return _git_blob_hasher(remote.size), remote.blob_id
+    return None
+
+
+class _FileJob:
+    """Parts, progress and running hash for one file being downloaded."""
+
+    def __init__(self, remote: RemoteFile, blobs_dir: Path, chunk_bytes: int | None) -> None:
+        self.remote = remote
+        self.blob_path = blobs_dir / remote.etag
+        self.part_path = blobs_dir / f"{remote.etag}.part"
+        self.sidecar_path = blobs_dir / f"{remote.etag}.part.json"
+        size = remote.size
+        if chunk_bytes and size > chunk_bytes:
+            self.parts = [(s, min(s + chunk_bytes, size)) for s in range(0, size, chunk_bytes)]
+        else:
+            self.parts = [(0, size)]
+        self.chunk_bytes = chunk_bytes or 0
+        self.done = [0] * len(self.parts)
+        self._unflushed = [0] * len(self.parts)
+        self._lock = threading.Lock()
+        # Held by the one worker hashing parts; never taken while holding _lock.
+        self._hash_lock = threading.Lock()
+        digest = _expected_digest(remote)
+        self._hasher: Any = digest[0] if digest else None
+        self._expected: str | None = digest[1] if digest else None
+        self._hashed_parts = 0
+        self._finished = False
+
+    # ── Resume state ──────────────────────────────────────────────────────
+
+    def prepare(self) -> int:
+        """Open or create the partial file; returns bytes reused from a prior run."""
+        resumed = 0
+        if self.part_path.exists() and self.sidecar_path.exists():
+            try:
+                meta = json.loads(self.sidecar_path.read_text())
+            except (OSError, ValueError):
+                meta = {}
+            if (
+                meta.get("etag") == self.remote.etag
+                and meta.get("size") == self.remote.size
+                and meta.get("chunk_bytes") == self.chunk_bytes
+                and self.part_path.stat().st_size == self.remote.size
+                and isinstance(meta.get("done"), list)
+                and len(meta["done"]) == len(self.parts)
+            ):
+                for i, (start, end) in enumerate(self.parts):
+                    self.done[i] = max(0, min(int(meta["done"][i]), end - start))
+                resumed = sum(self.done)
+        if not resumed:
+            self.discard()
+            with self.part_path.open("wb") as fh:
+                fh.truncate(self.remote.size)
+            self._write_sidecar()
+        return resumed
+
+    def _write_sidecar(self) -> None:
+        tmp = self.sidecar_path.with_name(self.sidecar_path.name + ".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "etag": self.remote.etag,
+                    "size": self.remote.size,
+                    "chunk_bytes": self.chunk_bytes,
+                    "done": self.done,
+                }
+            )
+        )
+        os.replace(tmp, self.sidecar_path)
+
+    def discard(self) -> None:
+        for path in (self.part_path, self.sidecar_path):
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+
+    # ── Progress ──────────────────────────────────────────────────────────
+
+    def record(self, part: int, nbytes: int) -> None:
+        with self._lock:
+            self.done[part] += nbytes
+            self._unflushed[part] += nbytes
+            if self._unflushed[part] >= _SIDECAR_FLUSH_BYTES:
+                self._unflushed[part] = 0
+                self._write_sidecar()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._finished and self.part_path.exists():
+                self._write_sidecar()
+
+    def part_complete(self, part: int) -> bool:
+        """Mark ``part`` finished; returns True when the whole file is verified.
+
+        Hashing happens outside ``_lock`` so other parts keep recording
+        progress meanwhile. Whichever worker holds ``_hash_lock`` hashes
+        every part that extends the verified prefix, in order; a worker that
+        finds it taken returns, and the holder re-checks for newly completed
+        parts after releasing it, so no completion is missed.
+        """
+        with self._lock:
+            if self._finished:
+                # Another part's worker saw every byte land and finalized first.
+                return False
+            self._write_sidecar()
+        while self._next_part_ready():
+            if not self._hash_lock.acquire(blocking=False):
+                return False
+            try:
+                self._advance_hash()
+                if self._hashed_parts == len(self.parts) and not self._finished:
+                    self._finalize()
+                    return True
+            finally:
+                self._hash_lock.release()
+        return False
+
+    def _next_part_ready(self) -> bool:
+        with self._lock:
+            index = self._hashed_parts
+            if self._finished or index >= len(self.parts):
+                return False
+            start, end = self.parts[index]
+            return self.done[index] >= end - start
+
+    def _finalize(self) -> None:
+        self._verify()
+        os.replace(self.part_path, self.blob_path)
+        with self._lock:
+            with contextlib.suppress(FileNotFoundError):
+                self.sidecar_path.unlink()
+            self._finished = True
+
+    def _advance_hash(self) -> None:
+        """Hash every completed part that extends the contiguous verified prefix."""
+        with self.part_path.open("rb", buffering=0) as fh:
+            while self._next_part_ready():
+                start, end = self.parts[self._hashed_parts]
+                if self._hasher is not None:
+                    fh.seek(start)
+                    remaining = end - start
+                    while remaining:
+                        data = fh.read(min(_READ_BYTES, remaining))
+                        if not data:
+                            break
+                        self._hasher.update(data)
+                        remaining -= len(data)
+                with self._lock:
+                    self._hashed_parts += 1
+
+    def _verify(self) -> None:
+        actual_size = self.part_path.stat().st_size
+        if actual_size != self.remote.size:
+            self.discard()
+            raise DownloadIntegrityError(
+                f"{self.remote.path}: size {actual_size} != expected {self.remote.size}"
+            )
+        if self._hasher is not None and self._hasher.hexdigest() != self._expected:
+            self.discard()
+            raise DownloadIntegrityError(
+                f"{self.remote.path}: hash {self._hasher.hexdigest()} != expected {self._expected}"
+            )
+
+
+@dataclass
+class _Progress:
+    """Thread-safe mirror of transfer progress into a DownloadTask."""
+
+    task: DownloadTask | None
+    total_bytes: int
+    files_total: int
+    done_bytes: int = 0
+    files_done: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add(self, nbytes: int = 0, files: int = 0) -> None:
+        with self.lock:
+            self.done_bytes += nbytes
+            self.files_done += files
+            if self.task is None:
+                return
+            self.task.downloaded_bytes = self.done_bytes
+            self.task.total_bytes = self.total_bytes
+            self.task.files_completed = self.files_done
+            self.task.files_total = self.files_total
+            if self.total_bytes:
+                self.task.progress_percent = round(self.done_bytes / self.total_bytes * 100, 1)
+
+
+class ParallelDownloader:
+    """Concurrent, range-chunked, resumable repo downloader.
+
+    Args:
+        max_workers: Concurrent HTTP transfers (files and parts combined).
+        chunk_bytes: Files larger than this are fetched as parallel ranges.
+        max_bytes_per_sec: Global bandwidth cap across all workers (None = off).
+        retries: Attempts per part for transient HTTP/transport failures.
+        manifest_fn: Resolves a repo revision to its file list.
+        token: Hugging Face token for authenticated repos.
+        transport: Optional httpx transport (tests).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 8,
+        chunk_bytes: int | None = 64 * 1024 * 1024,
+        max_bytes_per_sec: float | None = None,
+        retries: int = 3,
+        timeout_sec: float = 60.0,
+        manifest_fn: ManifestFn | None = None,
+        token: str | None = None,
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.chunk_bytes = chunk_bytes
+        self.retries = retries
+        self.timeout_sec = timeout_sec
+        self.limiter = BandwidthLimiter(max_bytes_per_sec)
+        self._manifest_fn = manifest_fn or hub_manifest_fn(token)
+        self._token = token
+        self._transport = transport
+        self._stats_lock = threading.Lock()
+        self._active = 0
+        self._bytes_downloaded_total = 0
+        self._bytes_resumed_total = 0
+        self._files_completed_total = 0
+        self._files_skipped_total = 0
+        self._retries_total = 0
+        self._integrity_failures_total = 0
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def download(
+        self,
+        repo_id: str,
+        *,
+        cache_dir: Path,
+        revision: str | None = None,
+        allow_patterns: list[str] | None = None,
+        ignore_patterns: list[str] | None = None,
+        task: DownloadTask | None = None,
+        cancel: threading.Event | None = None,
+    ) -> str:
+        """Download a repo revision into ``cache_dir``; returns the snapshot path.
+
+        Blocking — run it with ``asyncio.to_thread`` and set ``cancel`` to stop.
+        """
+        from huggingface_hub.file_download import repo_folder_name
+
+        stop = cancel or threading.Event()
+        manifest = self._manifest_fn(repo_id, revision, allow_patterns, ignore_patterns)
+        repo_dir = Path(cache_dir) / repo_folder_name(repo_id=repo_id, repo_type="model")
+        blobs_dir = repo_dir / "blobs"
+        snapshot_dir = repo_dir / "snapshots" / manifest.commit
+        blobs_dir.mkdir(parents=True, exist_ok=True)
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+
+        progress = _Progress(
+            task=task,
+            total_bytes=sum(f.size for f in manifest.files),
+            files_total=len(manifest.files),
+        )
+        pending: list[RemoteFile] = []
+        for remote in manifest.files:
+            blob = blobs_dir / remote.etag
+            if blob.exists() and blob.stat().st_size == remote.size:
+                self._link(snapshot_dir, remote, blob)
+                progress.add(remote.size, files=1)
+                self._bump(files_skipped=1)
+            else:
+                pending.append(remote)
+
+        with self._stats_lock:
+            self._active += 1
+        try:
+            if pending:
+                self._fetch(pending, blobs_dir, snapshot_dir, progress, stop)
+        finally:
+            with self._stats_lock:
+                self._active -= 1
+
+        if revision is None or revision != manifest.commit:
+            refs_dir = repo_dir / "refs"
+            refs_dir.mkdir(parents=True, exist_ok=True)
+            (refs_dir / (revision or "main")).write_text(manifest.commit)
+        return str(snapshot_dir)
+
+    def stats(self) -> dict[str, float | int]:
+        """Active downloads plus byte, file, retry and integrity-failure totals."""
+        with self._stats_lock:
+            return {
+                "active_downloads": self._active,
+                "bytes_downloaded_total": self._bytes_downloaded_total,
+                "bytes_resumed_total": self._bytes_resumed_total,
+                "files_completed_total": self._files_completed_total,
+                "files_skipped_total": self._files_skipped_total,
+                "retries_total": self._retries_total,
+                "integrity_failures_total": self._integrity_failures_total,
+            }
+
+    # ── Transfer ──────────────────────────────────────────────────────────
+
+    def _bump(self, **counters: int) -> None:
+        with self._stats_lock:
+            for name, value in counters.items():
+                attr = f"_{name}_total"
+                setattr(self, attr, getattr(self, attr) + value)
+
+    def _client(self) -> httpx.Client:
+        from huggingface_hub.utils._headers import build_hf_headers
+
+        return httpx.Client(
+            headers=build_hf_headers(token=self._token),
+            follow_redirects=True,
+            timeout=httpx.Timeout(self.timeout_sec, connect=min(self.timeout_sec, 10.0)),
+            transport=self._transport,
+            limits=httpx.Limits(max_connections=self.max_workers),
+        )
+
+    def _supports_ranges(self, client: httpx.Client, remote: RemoteFile) -> bool:
+        try:
+            response = client.head(remote.url)
+        except httpx.HTTPError:
+            return False
+        return response.is_success and "bytes" in response.headers.get("accept-ranges", "")
+
+    def _fetch(
+        self,
+        pending: list[RemoteFile],
+        blobs_dir: Path,
+        snapshot_dir: Path,
+        progress: _Progress,
+        stop: threading.Event,
+    ) -> None:
+        with (
+            self._client() as client,
+            ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="download") as pool,
+        ):
+
+            def _plan(remote: RemoteFile) -> _FileJob:
+                chunked = (
+                    self.chunk_bytes is not None
+                    and remote.size > self.chunk_bytes
+                    and self._supports_ranges(client, remote)
+                )
+                job = _FileJob(remote, blobs_dir, self.chunk_bytes if chunked else None)
+                resumed = job.prepare()
+                if resumed:
+                    progress.add(resumed)
+                    self._bump(bytes_resumed=resumed)
+                    logger.info(
+                        "download_resumed",
+                        extra={"file": remote.path, "resumed_bytes": resumed},
+                    )
+                return job
+
+            jobs = list(pool.map(_plan, pending))
+            futures: list[Future[None]] = []
+            for job in jobs:
+                pending_parts = [i for i, (s, e) in enumerate(job.parts) if job.done[i] < e - s]
+                if not pending_parts:
+                    # Every part was already on disk; verify and finish now.
+                    futures.append(pool.submit(self._complete, job, 0, snapshot_dir, progress))
+                for index in pending_parts:
+                    futures.append(
+                        pool.submit(
+                            self._run_part, client, job, index, snapshot_dir, progress, stop
+                        )
+                    )
+
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            failed = next((f for f in done if f.exception() is not None), None)
+            if failed is not None:
+                stop.set()
+                wait(futures)
+            for job in jobs:
+                job.flush()
+            if failed is not None:
+                raise failed.exception()  # type: ignore[misc]
+            if stop.is_set():
+                raise DownloadCancelledError("Download cancelled")
+
+    def _run_part(
+        self,
+        client: httpx.Client,
+        job: _FileJob,
+        index: int,
+        snapshot_dir: Path,
+        progress: _Progress,
+        stop: threading.Event,
+    ) -> None:
+        attempt = 0
+        while True:
+            if stop.is_set():
+                return
+            try:
+                self._transfer(client, job, index, progress, stop)
+                break
+            except (httpx.TransportError, _RetryableStatusError) as exc:
+                attempt += 1
+                if attempt > self.retries:
+                    raise
+                self._bump(retries=1)
+                logger.info(
+                    "download_part_retry",
+                    extra={"file": job.remote.path, "part": index, "error": str(exc)},
+                )
+                stop.wait(min(0.25 * 2 ** (attempt - 1), 5.0))
+        if not stop.is_set():
+            self._complete(job, index, snapshot_dir, progress)
+
+    def _complete(self, job: _FileJob, index: int, snapshot_dir: Path, progress: _Progress) -> None:
+        try:
+            finished = job.part_complete(index)
+        except DownloadIntegrityError:
+            self._bump(integrity_failures=1)
+            raise
+        if finished:
+            self._link(snapshot_dir, job.remote, job.blob_path)
+            progress.add(files=1)
+            self._bump(files_completed=1)
+
+    def _transfer(
+        self,
+        client: httpx.Client,
+        job: _FileJob,
+        index: int,
+        progress: _Progress,
+        stop: threading.Event,
+    ) -> None:
+        start, end = job.parts[index]
+        offset = start + job.done[index]
+        if offset >= end:
+            return
+        whole_file = len(job.parts) == 1
+        headers = {} if whole_file and offset == 0 else {"Range": f"bytes={offset}-{end - 1}"}
+        with client.stream("GET", job.remote.url, headers=headers) as response:
+            if response.status_code in _RETRYABLE_STATUS:
+                raise _RetryableStatusError(f"HTTP {response.status_code}")
+            response.raise_for_status()
+            if response.status_code == 206:
+                content_range = response.headers.get("content-range", "")
+                if not content_range.startswith(f"bytes {offset}-"):
+                    raise DownloadIntegrityError(
+                        f"{job.remote.path}: asked for offset {offset}, got '{content_range}'"
+                    )
+            elif headers:
+                if not whole_file:
+                    raise DownloadIntegrityError(
+                        f"{job.remote.path}: server ignored range request for part {index}"
+                    )
+                # Server ignored the resume range: start the file over.
+                progress.add(-job.done[index])
+                job.done[index] = 0
+                offset = start
+
+            fd = os.open(job.part_path, os.O_WRONLY)
+            try:
+                for chunk in response.iter_bytes(_READ_BYTES):
+                    if stop.is_set():
+                        return
+                    chunk = chunk[: end - offset]
+                    if not chunk:
+                        break
+                    self.limiter.acquire(len(chunk), stop)
+                    os.pwrite(fd, chunk, offset)
+                    offset += len(chunk)
+                    job.record(index, len(chunk))
+                    progress.add(len(chunk))
+                    self._bump(bytes_downloaded=len(chunk))
+            finally:
+                os.close(fd)
+        if offset < end:
+            raise httpx.RemoteProtocolError(
+                f"{job.remote.path}: stream ended at {offset}, expected {end}"
+            )
+
+    @staticmethod
+    def _link(snapshot_dir: Path, remote: RemoteFile, blob: Path) -> None:
+        """Point ``snapshots/<commit>/<path>`` at the blob, as the HF cache does."""
+        target = snapshot_dir / remote.path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        relative = os.path.relpath(blob, target.parent)
+        if target.is_symlink() or target.exists():
+            if target.is_symlink() and os.readlink(target) == relative:
+                return
+            target.unlink()
+        os.symlink(relative, target)
@@ -16,6 +16,7 @@ from huggingface_hub.constants import HUGGINGFACE_HUB_CACHE
 from tqdm import tqdm
 
 from opta_lmx.inference.types import DownloadTask
+from opta_lmx.manager.downloader import ParallelDownloader
 from opta_lmx.monitoring.events import EventBus, ServerEvent
 
 logger = logging.getLogger(__name__)
@@ -89,6 +90,7 @@ class ModelManager:
         models_directory: Path | None = None,
         hf_token: str | None = None,
         event_bus: EventBus | None = None,
+        downloader: ParallelDownloader | None = None,
     ) -> None:
         self._hf_api = HfApi(token=hf_token)
         self._hf_token = hf_token
@@ -97,6 +99,12 @@ class ModelManager:
         )
         self._downloads: dict[str, DownloadTask] = {}
         self._event_bus = event_bus
+        self._downloader = downloader
+
+    @property
+    def downloader(self) -> ParallelDownloader | None:
+        """Parallel download engine; None means ``snapshot_download`` is used."""
+        return self._downloader
 
     def _resolved_cache_dir(self) -> Path:
         """Resolve effective HF cache directory used by manager operations."""
@@ -231,10 +239,23 @@ class ModelManager:
                     extra={"download_id": download_id, "event_type": event_type, "error": str(exc)},
                 )
 
+        cancel = threading.Event()
         try:
-            # Set the task in the worker thread via thread-local storage so
-            # _DownloadProgressTracker can find it without a dynamic subclass.
+            # The parallel engine reports into ``task`` directly. For
+            # snapshot_download, set the task in the worker thread via
+            # thread-local storage so _DownloadProgressTracker can find it
+            # without a dynamic subclass.
             def _run() -> str:
+                if self._downloader is not None:
+                    return self._downloader.download(
+                        repo_id,
+                        cache_dir=self._resolved_cache_dir(),
+                        revision=revision,
+                        allow_patterns=allow_patterns,
+                        ignore_patterns=ignore_patterns,
+                        task=task,
+                        cancel=cancel,
+                    )
                 _task_local.task = task
                 try:
                     return snapshot_download(
@@ -286,6 +307,8 @@ class ModelManager:
                 },
             )
         except asyncio.CancelledError:
+            # The worker thread keeps running until it sees the flag.
+            cancel.set()
             task.status = "cancelled"
             task.error = "Download cancelled"
             task.error_code = "download_cancelled"
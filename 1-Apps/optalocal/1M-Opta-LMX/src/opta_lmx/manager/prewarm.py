@@ -0,0 +1,453 @@
+"""Page-cache pre-warming of safetensors shards ahead of model load.
+
+A cold ``load_model`` spends most of its time faulting weight shards in from
+disk one at a time. :class:`ModelPrewarmer` pulls every shard listed in
+``model.safetensors.index.json`` into the OS page cache in parallel, so the
+backend's own reads hit memory:
+
+- ``fadvise``: ``posix_fadvise(POSIX_FADV_WILLNEED)`` per shard (Linux).
+- ``madvise``: ``mmap`` + ``madvise(MADV_WILLNEED)`` per shard.
+- ``read``: sequential reads of each shard into a reused buffer, one worker
+  thread per shard. Works everywhere and completes only once the data is
+  resident, so it is the portable fallback.
+- ``auto``: ``fadvise`` where available, then ``madvise``, otherwise ``read``.
+
+``fadvise`` and ``madvise`` only ask the kernel to start readahead and return
+immediately, so their byte counts and durations are hints (reported as
+``bytes_hinted`` / ``hint_seconds``), not proof the shards are resident. Only
+``read`` reports ``bytes_warmed``.
+
+Warming is triggered at load time (concurrently with backend bring-up) and,
+through :meth:`ModelPrewarmer.start_background_predictive`, ahead of time for
+models the ``UsagePredictor`` expects next. Load durations are bucketed by how
+warm the shards were so the resulting load-time reduction is reported.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import mmap
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from opta_lmx.utils.snapshots import resolve_snapshot_path
+
+logger = logging.getLogger(__name__)
+
+PREWARM_METHODS = ("auto", "fadvise", "madvise", "read")
+
+# Methods that only advise the kernel; their byte counts are not residency.
+_HINT_METHODS = frozenset({"fadvise", "madvise"})
+
+# Load-time buckets: shards warmed before the load began, warmed alongside it,
+# or not warmed at all (prewarm disabled or no safetensors shards found).
+_LOAD_MODES = ("ahead", "concurrent", "cold")
+
+
+def weight_files(snapshot_path: Path) -> list[Path]:
+    """Shards named by ``model.safetensors.index.json``, else ``*.safetensors``.
+
+    Only files that exist are returned, in index order, without duplicates.
+    """
+    index_path = snapshot_path / "model.safetensors.index.json"
+    names: list[str] = []
+    try:
+        payload = json.loads(index_path.read_text())
+    except (OSError, ValueError):
+        payload = None
+    weight_map = payload.get("weight_map") if isinstance(payload, dict) else None
+    if isinstance(weight_map, dict):
+        names = [name for name in dict.fromkeys(weight_map.values()) if isinstance(name, str)]
+    if not names:
+        names = sorted(p.name for p in snapshot_path.glob("*.safetensors"))
+    files = [snapshot_path / name for name in names]
+    return [f for f in files if f.is_file()]
+
+
+def resolve_method(method: str) -> str:
+    """Map ``auto`` to the best method this platform supports."""
+    if method == "auto":
+        if hasattr(os, "posix_fadvise"):
+            return "fadvise"
+        return "madvise" if hasattr(mmap, "MADV_WILLNEED") else "read"
+    if method == "fadvise" and not hasattr(os, "posix_fadvise"):
+        return "read"
+    if method == "madvise" and not hasattr(mmap, "MADV_WILLNEED"):
+        return "read"
+    return method
+
+
+def _warm_one(path: Path, method: str, chunk_bytes: int, cancel: threading.Event) -> int:
+    """Warm one shard and return how many bytes were covered."""
+    size = path.stat().st_size
+    if size == 0:
+        return 0
+    if method == "fadvise":
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+        return size
+    if method == "madvise":
+        with path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            mm.madvise(mmap.MADV_WILLNEED)
+        return size
+
+    warmed = 0
+    buf = bytearray(chunk_bytes)
+    view = memoryview(buf)
+    with path.open("rb", buffering=0) as raw:
+        while not cancel.is_set():
+            n = raw.readinto(view)
+            if not n:
+                break
+            warmed += n
+    return warmed
+
+
+def warm_files(
+    paths: list[Path],
+    *,
+    method: str = "auto",
+    workers: int = 4,
+    chunk_bytes: int = 8 * 1024 * 1024,
+    cancel: threading.Event | None = None,
+) -> tuple[int, int]:
+    """Warm ``paths`` in parallel. Returns ``(bytes_warmed, errors)``."""
+    resolved = resolve_method(method)
+    stop = cancel or threading.Event()
+    if not paths:
+        return 0, 0
+
+    def _task(path: Path) -> int | None:
+        if stop.is_set():
+            return 0
+        try:
+            return _warm_one(path, resolved, chunk_bytes, stop)
+        except (OSError, ValueError) as exc:
+            logger.debug("prewarm_file_failed", extra={"file": str(path), "error": str(exc)})
+            return None
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(workers, len(paths))), thread_name_prefix="prewarm"
+    ) as pool:
+        results = list(pool.map(_task, paths))
+    return sum(r for r in results if r), sum(1 for r in results if r is None)
+
+
+@dataclass
+class PrewarmResult:
+    """Outcome of warming one model's shards."""
+
+    model_id: str
+    trigger: str
+    method: str
+    files: int = 0
+    bytes_total: int = 0
+    bytes_warmed: int = 0
+    errors: int = 0
+    duration_sec: float = 0.0
+    cancelled: bool = False
+    finished_at: float | None = None
+
+    @property
+    def complete(self) -> bool:
+        return not self.cancelled and self.errors == 0 and self.bytes_warmed >= self.bytes_total
+
+    @property
+    def hinted(self) -> bool:
+        """Whether ``bytes_warmed`` and ``duration_sec`` are readahead hints only."""
+        return self.method in _HINT_METHODS
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "model_id": self.model_id,
+            "trigger": self.trigger,
+            "method": self.method,
+            "files": self.files,
+            "bytes_total": self.bytes_total,
+            "bytes_hinted" if self.hinted else "bytes_warmed": self.bytes_warmed,
+            "errors": self.errors,
+            "hint_sec" if self.hinted else "duration_sec": round(self.duration_sec, 4),
+            "cancelled": self.cancelled,
+        }
+
+
+@dataclass
+class PrewarmJob:
+    """An in-flight warm; ``cancel()`` stops read workers between chunks."""
+
+    model_id: str
+    task: asyncio.Task[PrewarmResult | None]
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    async def result(self) -> PrewarmResult | None:
+        return await asyncio.shield(self.task)
+
+
+@dataclass
+class _LoadBucket:
+    count: int = 0
+    total_sec: float = 0.0
+
+    @property
+    def avg_sec(self) -> float:
+        return self.total_sec / self.count if self.count else 0.0
+
+
+class ModelPrewarmer:
+    """Warms model shards into the page cache and reports what it bought.
+
+    Args:
+        enabled: When False, loads are still timed (as ``cold``) but nothing
+            is warmed, which gives the baseline for the reduction metric.
+        method: One of :data:`PREWARM_METHODS`.
+        workers: Shards warmed in parallel.
+        chunk_bytes: Read size for the ``read`` method.
+        resolve_fn: Maps a model ID to its local snapshot directory.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        method: str = "auto",
+        workers: int = 4,
+        chunk_bytes: int = 8 * 1024 * 1024,
+        resolve_fn: Callable[[str], Path | None] = resolve_snapshot_path,
+    ) -> None:
+        if method not in PREWARM_METHODS:
+            raise ValueError(f"Unknown prewarm method: {method!r}")
+        self.enabled = enabled
+        self.method = method
+        self.workers = workers
+        self.chunk_bytes = chunk_bytes
+        self._resolve = resolve_fn
+        self._jobs: dict[str, PrewarmJob] = {}
+        self._last: dict[str, PrewarmResult] = {}
+        self._prewarms_total = 0
+        self._bytes_warmed_total = 0
+        self._warm_seconds_total = 0.0
+        self._bytes_hinted_total = 0
+        self._hint_seconds_total = 0.0
+        self._loads = {mode: _LoadBucket() for mode in _LOAD_MODES}
+        self._predictive_task: asyncio.Task[None] | None = None
+
+    # ── Warming ───────────────────────────────────────────────────────────
+
+    def begin(self, model_id: str, *, trigger: str = "load") -> PrewarmJob | None:
+        """Start warming ``model_id`` in the background; joins an in-flight warm."""
+        if not self.enabled:
+            return None
+        existing = self._jobs.get(model_id)
+        if existing is not None and not existing.task.done():
+            return existing
+        cancel = threading.Event()
+        task = asyncio.create_task(self._run(model_id, trigger, cancel))
+        job = PrewarmJob(model_id=model_id, task=task, cancel_event=cancel)
+        self._jobs[model_id] = job
+        task.add_done_callback(lambda _t: self._forget(job))
+        return job
+
+    async def prewarm(self, model_id: str, *, trigger: str = "manual") -> PrewarmResult | None:
+        """Warm ``model_id`` and wait for it to finish."""
+        job = self.begin(model_id, trigger=trigger)
+        return None if job is None else await job.result()
+
+    def _forget(self, job: PrewarmJob) -> None:
+        if self._jobs.get(job.model_id) is job:
+            self._jobs.pop(job.model_id, None)
+
+    async def _run(
+        self, model_id: str, trigger: str, cancel: threading.Event
+    ) -> PrewarmResult | None:
+        snapshot = await asyncio.to_thread(self._resolve, model_id)
+        if snapshot is None:
+            return None
+        files = await asyncio.to_thread(weight_files, snapshot)
+        if not files:
+            return None
+
+        result = PrewarmResult(
+            model_id=model_id,
+            trigger=trigger,
+            method=resolve_method(self.method),
+            files=len(files),
+        )
+        started = time.monotonic()
+        try:
+            result.bytes_total = sum(f.stat().st_size for f in files)
+            result.bytes_warmed, result.errors = await asyncio.to_thread(
+                warm_files,
+                files,
+                method=self.method,
+                workers=self.workers,
+                chunk_bytes=self.chunk_bytes,
+                cancel=cancel,
+            )
+        except OSError as exc:
+            result.errors += 1
+            logger.debug("prewarm_failed", extra={"model_id": model_id, "error": str(exc)})
+        result.duration_sec = time.monotonic() - started
+        result.cancelled = cancel.is_set() and result.bytes_warmed < result.bytes_total
+        result.finished_at = time.monotonic()
+
+        self._last[model_id] = result
+        self._prewarms_total += 1
+        if result.hinted:
+            self._bytes_hinted_total += result.bytes_warmed
+            self._hint_seconds_total += result.duration_sec
+        else:
+            self._bytes_warmed_total += result.bytes_warmed
+            self._warm_seconds_total += result.duration_sec
+        logger.info("model_prewarmed", extra=result.as_dict())
+        return result
+
+    def last_result(self, model_id: str) -> PrewarmResult | None:
+        return self._last.get(model_id)
+
+    def warmed_ahead(self, model_id: str) -> bool:
+        """Whether a complete warm of ``model_id`` finished before now."""
+        last = self._last.get(model_id)
+        in_flight = self._jobs.get(model_id)
+        return (
+            last is not None
+            and last.trigger != "load"
+            and last.complete
+            and (in_flight is None or in_flight.task.done())
+        )
+
+    # ── Load-time accounting ──────────────────────────────────────────────
+
+    def record_load(self, model_id: str, duration_sec: float, *, mode: str) -> None:
+        """Attribute one load's duration to ``ahead``, ``concurrent`` or ``cold``."""
+        bucket = self._loads.get(mode)
+        if bucket is None:
+            raise ValueError(f"Unknown load mode: {mode!r}")
+        bucket.count += 1
+        bucket.total_sec += duration_sec
+
+    def load_time_reduction_pct(self) -> float | None:
+        """Average warm load time vs cold, as a percentage saved."""
+        cold = self._loads["cold"]
+        warm_count = self._loads["ahead"].count + self._loads["concurrent"].count
+        if not cold.count or not warm_count or cold.avg_sec <= 0:
+            return None
+        warm_avg = (self._loads["ahead"].total_sec + self._loads["concurrent"].total_sec) / (
+            warm_count
+        )
+        return round((1.0 - warm_avg / cold.avg_sec) * 100.0, 2)
+
+    def stats(self) -> dict[str, float | int]:
+        """Prewarm counts, bytes read vs. only hinted, and load times per warmth bucket."""
+        out: dict[str, float | int] = {
+            "enabled": int(self.enabled),
+            "prewarms_total": self._prewarms_total,
+            "in_flight": sum(1 for job in self._jobs.values() if not job.task.done()),
+            "bytes_warmed_total": self._bytes_warmed_total,
+            "warm_seconds_total": round(self._warm_seconds_total, 3),
+            "bytes_hinted_total": self._bytes_hinted_total,
+            "hint_seconds_total": round(self._hint_seconds_total, 3),
+        }
+        for mode, bucket in self._loads.items():
+            out[f"loads_{mode}_total"] = bucket.count
+            out[f"load_{mode}_avg_sec"] = round(bucket.avg_sec, 3)
+        reduction = self.load_time_reduction_pct()
+        if reduction is not None:
+            out["load_time_reduction_pct"] = reduction
+        return out
+
+    # ── Predictive warming ────────────────────────────────────────────────
+
+    def start_background_predictive(
+        self,
+        *,
+        candidates_fn: Callable[[int], list[str]],
+        is_loaded_fn: Callable[[str], bool],
+        memory_ok_fn: Callable[[], bool] = lambda: True,
+        interval_sec: float = 60.0,
+        max_models: int = 1,
+    ) -> None:
+        """Warm the models the usage predictor expects next on the running loop."""
+        if not self.enabled or self._predictive_task is not None:
+            return
+        self._predictive_task = asyncio.create_task(
+            self._predictive_loop(
+                candidates_fn, is_loaded_fn, memory_ok_fn, interval_sec, max_models
+            )
+        )
+
+    async def stop_background_predictive(self) -> None:
+        """Stop predictive warming and any warm it has in flight."""
+        task = self._predictive_task
+        self._predictive_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        for job in list(self._jobs.values()):
+            job.cancel()
+
+    async def warm_predicted(
+        self,
+        candidates: list[str],
+        *,
+        is_loaded_fn: Callable[[str], bool],
+        memory_ok_fn: Callable[[], bool] = lambda: True,
+        rewarm_after_sec: float = 0.0,
+    ) -> list[PrewarmResult]:
+        """Warm each unloaded candidate not already warmed recently."""
+        results: list[PrewarmResult] = []
+        now = time.monotonic()
+        for model_id in candidates:
+            if is_loaded_fn(model_id):
+                continue
+            if not memory_ok_fn():
+                logger.debug("model_prewarm_skipped_memory_pressure")
+                break
+            last = self._last.get(model_id)
+            if (
+                last is not None
+                and last.complete
+                and last.finished_at is not None
+                and now - last.finished_at < rewarm_after_sec
+            ):
+                continue
+            result = await self.prewarm(model_id, trigger="predicted")
+            if result is not None:
+                results.append(result)
+        return results
+
+    async def _predictive_loop(
+        self,
+        candidates_fn: Callable[[int], list[str]],
+        is_loaded_fn: Callable[[str], bool],
+        memory_ok_fn: Callable[[], bool],
+        interval_sec: float,
+        max_models: int,
+    ) -> None:
+        while True:
+            await asyncio.sleep(interval_sec)
+            try:
+                await self.warm_predicted(
+                    candidates_fn(max_models),
+                    is_loaded_fn=is_loaded_fn,
+                    memory_ok_fn=memory_ok_fn,
+                    # Page cache is reclaimed under pressure; re-check a few
+                    # intervals later rather than re-reading every tick.
+                    rewarm_after_sec=interval_sec * 5,
+                )
+            except Exception:
+                logger.warning("model_prewarm_loop_error", exc_info=True)
@@ -277,6 +277,56 @@ class BenchmarkRunStats(BaseModel):
     skills: list[SkillsBenchmark]
 
 
+class LatencyPercentiles(BaseModel):
+    mean: float = 0.0
+    p50: float = 0.0
+    p90: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+
+
+class LoadTestSLO(BaseModel):
+    """Per-request latency targets; None disables a target."""
+
+    ttft_ms: float | None = 2000.0
+    tpot_ms: float | None = 100.0
+    e2e_ms: float | None = None
+
+
+class LoadTestPoint(BaseModel):
+    """Results at one sweep level (a concurrency or an arrival rate)."""
+
+    mode: Literal["closed", "open"]
+    concurrency: int | None = None
+    rate_rps: float | None = None
+    requests: int
+    completed: int
+    errors: int
+    duration_sec: float
+    throughput_rps: float
+    output_tokens_per_sec: float
+    ttft_ms: LatencyPercentiles
+    itl_ms: LatencyPercentiles
+    tpot_ms: LatencyPercentiles
+    e2e_ms: LatencyPercentiles
+    # Queue-wait breakdown: client-side lag behind the arrival schedule, and
+    # time spent waiting for an engine slot (in-process targets only).
+    schedule_lag_ms: LatencyPercentiles
+    server_queue_wait_ms: LatencyPercentiles | None = None
+    slo_attainment: float
+    goodput_rps: float
+    goodput_tokens_per_sec: float
+
+
+class LoadTestReport(BaseModel):
+    target: str
+    workload: str
+    arrival: Literal["closed", "poisson", "constant"]
+    seed: int
+    slo: LoadTestSLO
+    points: list[LoadTestPoint]
+
+
 class BenchmarkResult(BaseModel):
     model_id: str
     backend: str
@@ -286,6 +336,7 @@ class BenchmarkResult(BaseModel):
     lmx_version: str
     prompt_preview: str
     stats: BenchmarkRunStats
+    load_test: LoadTestReport | None = None
 
 
 _MODEL_SLUG_RE = re.compile(r"[^a-zA-Z0-9_-]")
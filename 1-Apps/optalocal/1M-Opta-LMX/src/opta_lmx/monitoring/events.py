@@ -1,15 +1,42 @@
-"""Event bus for admin SSE feed — publish-subscribe for real-time monitoring."""
+"""Event bus for admin SSE feed — publish-subscribe for real-time monitoring.
+
+Two ways to consume events:
+
+- ``subscribe()`` returns a per-subscriber ``asyncio.Queue`` of
+  :class:`ServerEvent` objects, for in-process consumers (journal, metrics,
+  engine IPC). A subscriber whose queue fills is dropped.
+- ``open_stream()`` returns an :class:`EventStream` cursor over a shared ring
+  buffer of pre-encoded :class:`SSEFrame` objects, for ``/admin/events``.
+  Each event is JSON-encoded once no matter how many streams read it. A
+  stream that falls behind is never dropped: it skips ahead to the oldest
+  retained frame and gets a ``resync`` frame saying how many it missed.
+  Frame ids are sequence numbers, so a reconnecting EventSource resumes
+  from its ``Last-Event-ID``. A front-end process republishes the engine's
+  events under the engine's ids, so that id stays valid across front-ends.
+  When a stream catches up on a backlog, frames of coalesced types
+  (``download_progress`` by default) are collapsed to the newest per key.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import bisect
+import itertools
+import json
 import logging
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+_MAX_SUBSCRIBERS = 50
+
+# Event type -> data field that identifies the stream of updates to collapse
+# (None collapses every event of that type into one).
+DEFAULT_COALESCE_KEYS: dict[str, str | None] = {"download_progress": "download_id"}
+
 
 @dataclass
 class ServerEvent:
@@ -18,21 +45,84 @@ class ServerEvent:
     event_type: str  # "model_loaded", "download_progress", etc.
     data: dict[str, Any]
     timestamp: float = field(default_factory=time.time)
+    seq: int = 0  # assigned by EventBus.publish()
+
+
+@dataclass(frozen=True, slots=True)
+class SSEFrame:
+    """One event, encoded once as a complete SSE message."""
+
+    seq: int
+    event_type: str
+    text: str
+    coalesce_key: tuple[str, Any] | None = None
+
+
+def encode_sse(event_type: str, data: Any, *, event_id: int | None = None) -> str:
+    """Encode an SSE message (``id``/``event``/``data`` lines plus blank line)."""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    # default=str: a stray non-JSON value must not make publish() raise.
+    return f"{head}event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _frame_seq(frame: SSEFrame) -> int:
+    return frame.seq
+
+
+class EventStream:
+    """A reader's cursor into the bus's shared frame ring."""
+
+    def __init__(self, bus: EventBus, next_seq: int) -> None:
+        self._bus = bus
+        self.next_seq = next_seq
+
+    async def next_frames(self, max_wait: float | None = None) -> list[SSEFrame]:
+        """Frames published since the last call, waiting up to ``max_wait`` seconds.
+
+        Raises:
+            TimeoutError: Nothing was published within ``max_wait``.
+        """
+        while True:
+            # Grab the wakeup before reading so a publish in between is not lost.
+            wakeup = self._bus._wakeup
+            frames = self._bus._read(self)
+            if frames:
+                return frames
+            await asyncio.wait_for(wakeup.wait(), timeout=max_wait)
 
 
 class EventBus:
     """Publish-subscribe event bus for admin SSE feed.
 
-    Each subscriber gets their own asyncio.Queue so slow
-    consumers don't block the event bus or other subscribers.
-
-    When a subscriber's queue is full, the subscription is dropped
-    (the client's EventSource will auto-reconnect).
+    Args:
+        max_queue_size: Capacity of each ``subscribe()`` queue.
+        ring_size: Encoded frames retained for ``open_stream()`` readers and
+            ``Last-Event-ID`` replay.
+        coalesce_keys: Event types collapsed to their newest frame per key
+            when a stream reads a backlog (see :data:`DEFAULT_COALESCE_KEYS`).
     """
 
-    def __init__(self, max_queue_size: int = 100) -> None:
+    def __init__(
+        self,
+        max_queue_size: int = 100,
+        *,
+        ring_size: int = 1024,
+        coalesce_keys: dict[str, str | None] | None = None,
+    ) -> None:
         self._subscribers: list[asyncio.Queue[ServerEvent]] = []
         self._max_queue_size = max_queue_size
+        self._ring: deque[SSEFrame] = deque(maxlen=ring_size)
+        self._coalesce_keys = dict(
+            DEFAULT_COALESCE_KEYS if coalesce_keys is None else coalesce_keys
+        )
+        self._last_seq = 0
+        self._evicted_seq = 0  # newest id pushed out of the ring
+        self._published_total = 0
+        self._wakeup = asyncio.Event()
+        self._streams: set[EventStream] = set()
+        self._frames_read_total = 0
+        self._coalesced_total = 0
+        self._resyncs_total = 0
 
     def subscribe(self) -> asyncio.Queue[ServerEvent]:
         """Create a new subscription queue.
@@ -43,7 +133,7 @@ class EventBus:
         Raises:
             ValueError: If subscriber limit (50) is reached.
         """
-        if len(self._subscribers) >= 50:
+        if self._total_subscribers() >= _MAX_SUBSCRIBERS:
             raise ValueError("Maximum SSE subscriber limit reached")
         queue: asyncio.Queue[ServerEvent] = asyncio.Queue(maxsize=self._max_queue_size)
         self._subscribers.append(queue)
@@ -55,13 +145,79 @@ class EventBus:
         self._subscribers = [q for q in self._subscribers if q is not queue]
         logger.debug("sse_subscriber_removed", extra={"total": len(self._subscribers)})
 
-    async def publish(self, event: ServerEvent) -> None:
+    def is_subscribed(self, queue: asyncio.Queue[ServerEvent]) -> bool:
+        """Whether ``queue`` is still subscribed (full queues get dropped)."""
+        return any(q is queue for q in self._subscribers)
+
+    def open_stream(self, last_event_id: str | int | None = None) -> EventStream:
+        """Open a ring-buffer reader, resuming after ``last_event_id`` if given.
+
+        Without an id (or with one this bus never issued, e.g. from before a
+        restart) the stream starts with the next published event.
+
+        Raises:
+            ValueError: If subscriber limit (50) is reached.
+        """
+        if self._total_subscribers() >= _MAX_SUBSCRIBERS:
+            raise ValueError("Maximum SSE subscriber limit reached")
+        next_seq = self._last_seq + 1
+        if last_event_id is not None:
+            try:
+                resume_from = int(last_event_id) + 1
+            except (TypeError, ValueError):
+                resume_from = None
+            if resume_from is not None and 0 < resume_from <= next_seq:
+                next_seq = resume_from
+        stream = EventStream(self, next_seq)
+        self._streams.add(stream)
+        logger.debug("sse_stream_opened", extra={"total": len(self._streams)})
+        return stream
+
+    def close_stream(self, stream: EventStream) -> None:
+        """Stop tracking a ring-buffer reader."""
+        self._streams.discard(stream)
+        logger.debug("sse_stream_closed", extra={"total": len(self._streams)})
+
+    async def publish(self, event: ServerEvent, *, seq: int | None = None) -> None:
         """Publish an event to all subscribers.
 
-        Slow consumers (full queues) are silently dropped.
+        The event is encoded once into the shared frame ring for streams.
+        Queue subscribers whose queue is full are silently dropped.
         Iterates over a copy of the subscriber list to avoid mutation
         during iteration.
+
+        ``seq`` relays an event under the id an upstream bus gave it. Ids
+        skipped upstream are just absent here; an id that does not advance
+        means the upstream bus restarted, so the ring is cleared and open
+        streams continue from the new id.
         """
+        if seq is None:
+            seq = self._last_seq + 1
+        elif seq <= self._last_seq:
+            self._ring.clear()
+            self._evicted_seq = 0
+            for stream in self._streams:
+                stream.next_seq = seq
+        self._last_seq = seq
+        self._published_total += 1
+        event.seq = seq
+        coalesce_key: tuple[str, Any] | None = None
+        if event.event_type in self._coalesce_keys:
+            key_field = self._coalesce_keys[event.event_type]
+            coalesce_key = (event.event_type, event.data.get(key_field) if key_field else None)
+        if len(self._ring) == self._ring.maxlen:
+            self._evicted_seq = self._ring[0].seq
+        self._ring.append(
+            SSEFrame(
+                seq=self._last_seq,
+                event_type=event.event_type,
+                text=encode_sse(event.event_type, event.data, event_id=self._last_seq),
+                coalesce_key=coalesce_key,
+            )
+        )
+        wakeup, self._wakeup = self._wakeup, asyncio.Event()
+        wakeup.set()
+
         dead: list[asyncio.Queue[ServerEvent]] = []
         for queue in self._subscribers[:]:  # Iterate over copy
             try:
@@ -78,7 +234,68 @@ class EventBus:
         for q in dead:
             self._subscribers.remove(q)
 
+    def _read(self, stream: EventStream) -> list[SSEFrame]:
+        """Advance ``stream`` past every retained frame it has not seen."""
+        if not self._ring or stream.next_seq > self._last_seq:
+            return []
+        first_seq = self._ring[0].seq
+        out: list[SSEFrame] = []
+        if stream.next_seq <= self._evicted_seq:
+            missed = self._evicted_seq - stream.next_seq + 1
+            self._resyncs_total += 1
+            out.append(
+                SSEFrame(
+                    seq=self._evicted_seq,
+                    event_type="resync",
+                    text=encode_sse("resync", {"missed": missed, "resume_id": first_seq}),
+                )
+            )
+            stream.next_seq = first_seq
+        # Relayed ids may have gaps, so locate the cursor by id, not offset.
+        start = bisect.bisect_left(self._ring, stream.next_seq, key=_frame_seq)
+        frames = list(itertools.islice(self._ring, start, None))
+        stream.next_seq = self._last_seq + 1
+        if len(frames) > 1:
+            frames = self._coalesce(frames)
+        self._frames_read_total += len(frames)
+        out.extend(frames)
+        return out
+
+    def _coalesce(self, frames: list[SSEFrame]) -> list[SSEFrame]:
+        """Keep only the newest frame per coalesce key, preserving order."""
+        newest: dict[tuple[str, Any], int] = {}
+        for index, frame in enumerate(frames):
+            if frame.coalesce_key is not None:
+                newest[frame.coalesce_key] = index
+        kept = [
+            frame
+            for index, frame in enumerate(frames)
+            if frame.coalesce_key is None or newest[frame.coalesce_key] == index
+        ]
+        self._coalesced_total += len(frames) - len(kept)
+        return kept
+
+    def _total_subscribers(self) -> int:
+        return len(self._subscribers) + len(self._streams)
+
     @property
     def subscriber_count(self) -> int:
         """Number of active subscribers."""
         return len(self._subscribers)
+
+    @property
+    def last_event_id(self) -> int:
+        """Sequence number of the most recently published event."""
+        return self._last_seq
+
+    def stats(self) -> dict[str, float | int]:
+        """Published events, subscriber counts, and ring read/coalesce/resync totals."""
+        return {
+            "events_published_total": self._published_total,
+            "queue_subscribers": len(self._subscribers),
+            "stream_subscribers": len(self._streams),
+            "ring_frames": len(self._ring),
+            "frames_read_total": self._frames_read_total,
+            "frames_coalesced_total": self._coalesced_total,
+            "stream_resyncs_total": self._resyncs_total,
+        }
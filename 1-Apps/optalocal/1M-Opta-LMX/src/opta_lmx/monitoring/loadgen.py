@@ -0,0 +1,633 @@
+"""Load generator: closed- and open-loop load tests with SLO reporting.
+
+``/admin/benchmark/run`` measures one request at a time. This module drives a
+target with many at once:
+
+- **Closed loop** — ``concurrency`` clients each send their next request as
+  soon as the previous one finishes. Swept over several concurrency levels.
+- **Open loop** — requests arrive on a schedule (``constant`` spacing or
+  ``poisson``) at a target rate regardless of how fast they complete, which
+  exposes queueing that closed loops hide. Swept over several rates.
+
+Each sweep level reports TTFT, inter-token latency (ITL), time per output
+token (TPOT) and end-to-end percentiles, throughput, goodput (requests meeting
+every SLO target) and a queue-wait breakdown. Reports convert to
+:class:`BenchmarkResult` so they persist in :class:`BenchmarkResultStore`
+next to single-stream benchmarks.
+
+Targets: the in-process engine (admin endpoint), a running server over HTTP
+(CLI), or :class:`SimulatedTarget` — a deterministic, model-free stand-in so
+CI can track harness and reporting regressions without Apple Silicon.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import random
+import sys
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Literal, Protocol
+
+import httpx
+
+from opta_lmx.inference.schema import ChatMessage
+from opta_lmx.monitoring.benchmark import (
+    STANDARD_PROMPTS,
+    BenchmarkResult,
+    BenchmarkResultStore,
+    BenchmarkRunStats,
+    LatencyPercentiles,
+    LoadTestPoint,
+    LoadTestReport,
+    LoadTestSLO,
+)
+
+logger = logging.getLogger(__name__)
+
+Arrival = Literal["closed", "poisson", "constant"]
+
+
+# ── Workload ──────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class WorkloadItem:
+    prompt: str
+    max_tokens: int
+
+
+def mixed_workload(max_tokens: int = 128) -> list[WorkloadItem]:
+    """Mixed prompt and output lengths built from the standard benchmark prompts."""
+    output_scale = {"short": 0.25, "medium": 1.0, "long": 2.0, "code": 1.5, "reasoning": 1.0}
+    return [
+        WorkloadItem(prompt=prompt, max_tokens=max(1, int(max_tokens * output_scale[name])))
+        for name, prompt in STANDARD_PROMPTS.items()
+    ]
+
+
+def load_trace(path: Path, *, default_max_tokens: int = 128) -> list[WorkloadItem]:
+    """Read a captured trace: JSONL with ``prompt`` or chat ``messages`` per line.
+
+    ``max_tokens`` (or the captured ``completion_tokens``) sets the output
+    length; malformed lines are skipped.
+    """
+    items: list[WorkloadItem] = []
+    skipped = 0
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            skipped += 1
+            continue
+        if not isinstance(row, dict):
+            skipped += 1
+            continue
+        prompt = row.get("prompt")
+        if not isinstance(prompt, str):
+            messages = row.get("messages")
+            prompt = (
+                "\n".join(
+                    m["content"]
+                    for m in messages
+                    if isinstance(m, dict) and isinstance(m.get("content"), str)
+                )
+                if isinstance(messages, list)
+                else ""
+            )
+        max_tokens = row.get("max_tokens", row.get("completion_tokens", default_max_tokens))
+        if not prompt or not isinstance(max_tokens, int) or max_tokens < 1:
+            skipped += 1
+            continue
+        items.append(WorkloadItem(prompt=prompt, max_tokens=max_tokens))
+    if skipped:
+        logger.warning("loadgen_trace_lines_skipped", extra={"path": str(path), "count": skipped})
+    return items
+
+
+# ── Targets ───────────────────────────────────────────────────────────────
+
+
+class OnToken(Protocol):
+    """Receives streamed output as it arrives.
+
+    Each call records a chunk arriving now that carries ``count`` tokens.
+    ``chunk=False`` only adds to the token count, for targets that learn it
+    after the fact (e.g. from a final usage report).
+    """
+
+    def __call__(self, count: int = 1, *, chunk: bool = True) -> None: ...
+
+
+class LoadTarget(Protocol):
+    """Something that streams a completion for a workload item."""
+
+    name: str
+
+    async def execute(self, item: WorkloadItem, on_token: OnToken) -> float | None:
+        """Stream one completion, calling ``on_token`` as output arrives.
+
+        Returns seconds spent queued for an engine slot, when known.
+        """
+        ...
+
+
+class EngineTarget:
+    """The in-process ``InferenceEngine``."""
+
+    def __init__(self, engine: Any, model_id: str, *, temperature: float = 0.0) -> None:
+        self.name = f"engine:{model_id}"
+        self._engine = engine
+        self._model_id = model_id
+        self._temperature = temperature
+
+    async def execute(self, item: WorkloadItem, on_token: OnToken) -> float | None:
+        async for _token in self._engine.stream_generate(
+            model_id=self._model_id,
+            messages=[ChatMessage(role="user", content=item.prompt)],
+            max_tokens=item.max_tokens,
+            temperature=self._temperature,
+        ):
+            on_token()
+        # Queue wait is recorded per request context; each request is its own task.
+        queue_wait: float | None = self._engine.pop_queue_wait_seconds()
+        return queue_wait
+
+
+class HTTPTarget:
+    """A running server, via streaming ``/v1/chat/completions``.
+
+    The server may coalesce several tokens into one SSE frame, so frames only
+    time arrivals; the token count comes from the final usage chunk
+    (``stream_options.include_usage``), falling back to one per frame.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        *,
+        api_key: str | None = None,
+        temperature: float = 0.0,
+        timeout_sec: float = 300.0,
+    ) -> None:
+        self.name = f"http:{base_url}"
+        self._model = model
+        self._temperature = temperature
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"} if api_key else None,
+            timeout=timeout_sec,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+        )
+
+    async def execute(self, item: WorkloadItem, on_token: OnToken) -> float | None:
+        body = {
+            "model": self._model,
+            "messages": [{"role": "user", "content": item.prompt}],
+            "max_tokens": item.max_tokens,
+            "temperature": self._temperature,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+        frames = 0
+        completion_tokens: int | None = None
+        async with self._client.stream("POST", "/v1/chat/completions", json=body) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data: {"):
+                    continue
+                payload = json.loads(line[6:])
+                usage = payload.get("usage")
+                if isinstance(usage, dict) and isinstance(usage.get("completion_tokens"), int):
+                    completion_tokens = usage["completion_tokens"]
+                for choice in payload.get("choices") or []:
+                    if (choice.get("delta") or {}).get("content"):
+                        frames += 1
+                        on_token(0)
+        on_token(completion_tokens if completion_tokens is not None else frames, chunk=False)
+        return None
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class SimulatedTarget:
+    """Deterministic model-free target for CI.
+
+    ``slots`` sequences run at once (others queue). Prefill costs
+    ``base_ttft_ms`` plus ``prefill_ms_per_word`` per prompt word; decode runs
+    at ``decode_tokens_per_sec``, slowed by ``batch_slowdown`` per extra active
+    sequence, like a batching scheduler.
+    """
+
+    def __init__(
+        self,
+        *,
+        slots: int = 8,
+        base_ttft_ms: float = 10.0,
+        prefill_ms_per_word: float = 0.2,
+        decode_tokens_per_sec: float = 500.0,
+        batch_slowdown: float = 0.05,
+    ) -> None:
+        self.name = "simulated"
+        self._slots = asyncio.Semaphore(slots)
+        self._base_ttft_sec = base_ttft_ms / 1000
+        self._prefill_sec_per_word = prefill_ms_per_word / 1000
+        self._token_sec = 1.0 / decode_tokens_per_sec
+        self._batch_slowdown = batch_slowdown
+        self._active = 0
+
+    async def execute(self, item: WorkloadItem, on_token: OnToken) -> float | None:
+        queued_at = time.perf_counter()
+        async with self._slots:
+            queue_wait = time.perf_counter() - queued_at
+            self._active += 1
+            try:
+                words = len(item.prompt.split())
+                await asyncio.sleep(self._base_ttft_sec + self._prefill_sec_per_word * words)
+                for _ in range(item.max_tokens):
+                    on_token()
+                    slowdown = 1.0 + self._batch_slowdown * (self._active - 1)
+                    await asyncio.sleep(self._token_sec * slowdown)
+            finally:
+                self._active -= 1
+        return queue_wait
+
+
+# ── Measurement ───────────────────────────────────────────────────────────
+
+
+@dataclass(slots=True)
+class _Sample:
+    ok: bool
+    e2e_ms: float = 0.0
+    ttft_ms: float = 0.0
+    gaps_ms: list[float] = field(default_factory=list)
+    output_tokens: int = 0
+    schedule_lag_ms: float = 0.0
+    server_queue_ms: float | None = None
+
+    @property
+    def tpot_ms(self) -> float:
+        if self.output_tokens < 2:
+            return 0.0
+        return (self.e2e_ms - self.ttft_ms) / (self.output_tokens - 1)
+
+    def meets(self, slo: LoadTestSLO) -> bool:
+        return (
+            self.ok
+            and (slo.ttft_ms is None or self.ttft_ms <= slo.ttft_ms)
+            and (slo.tpot_ms is None or self.tpot_ms <= slo.tpot_ms)
+            and (slo.e2e_ms is None or self.e2e_ms <= slo.e2e_ms)
+        )
+
+
+def percentiles(values: Sequence[float]) -> LatencyPercentiles:
+    """Nearest-rank percentiles."""
+    if not values:
+        return LatencyPercentiles()
+    ordered = sorted(values)
+    n = len(ordered)
+
+    def _rank(p: float) -> float:
+        return round(ordered[min(n - 1, max(0, math.ceil(p / 100 * n) - 1))], 3)
+
+    return LatencyPercentiles(
+        mean=round(sum(ordered) / n, 3),
+        p50=_rank(50),
+        p90=_rank(90),
+        p95=_rank(95),
+        p99=_rank(99),
+    )
+
+
+async def _issue(target: LoadTarget, item: WorkloadItem, scheduled_at: float | None) -> _Sample:
+    start = time.perf_counter()
+    lag_ms = (start - scheduled_at) * 1000 if scheduled_at is not None else 0.0
+    stamps: list[float] = []
+    tokens = 0
+
+    def on_token(count: int = 1, *, chunk: bool = True) -> None:
+        nonlocal tokens
+        tokens += count
+        if chunk:
+            stamps.append(time.perf_counter())
+
+    try:
+        queue_sec = await target.execute(item, on_token)
+    except Exception as exc:
+        logger.debug("loadgen_request_failed", extra={"error": str(exc)})
+        return _Sample(ok=False, schedule_lag_ms=lag_ms)
+    end = time.perf_counter()
+    if not stamps:
+        return _Sample(ok=False, schedule_lag_ms=lag_ms)
+    return _Sample(
+        ok=True,
+        e2e_ms=(end - start) * 1000,
+        ttft_ms=(stamps[0] - start) * 1000,
+        gaps_ms=[(b - a) * 1000 for a, b in itertools.pairwise(stamps)],
+        output_tokens=tokens,
+        schedule_lag_ms=lag_ms,
+        server_queue_ms=queue_sec * 1000 if queue_sec is not None else None,
+    )
+
+
+def _arrival_offsets(arrival: Arrival, rate_rps: float, requests: int, seed: int) -> list[float]:
+    if arrival == "constant":
+        return [i / rate_rps for i in range(requests)]
+    rng = random.Random(seed)
+    offsets: list[float] = []
+    t = 0.0
+    for _ in range(requests):
+        offsets.append(t)
+        t += rng.expovariate(rate_rps)
+    return offsets
+
+
+async def run_point(
+    target: LoadTarget,
+    items: Sequence[WorkloadItem],
+    *,
+    arrival: Arrival,
+    requests: int,
+    slo: LoadTestSLO,
+    concurrency: int | None = None,
+    rate_rps: float | None = None,
+    seed: int = 0,
+) -> LoadTestPoint:
+    """Run one sweep level: ``concurrency`` (closed loop) or ``rate_rps`` (open loop)."""
+    started = time.perf_counter()
+    if arrival == "closed":
+        if concurrency is None or concurrency < 1:
+            raise ValueError("closed-loop load needs concurrency >= 1")
+        next_index = itertools.count()
+        samples: list[_Sample] = []
+
+        async def _client() -> None:
+            while (i := next(next_index)) < requests:
+                samples.append(await _issue(target, items[i % len(items)], None))
+
+        await asyncio.gather(*(_client() for _ in range(concurrency)))
+    else:
+        if rate_rps is None or rate_rps <= 0:
+            raise ValueError("open-loop load needs rate_rps > 0")
+        tasks: list[asyncio.Task[_Sample]] = []
+        for i, offset in enumerate(_arrival_offsets(arrival, rate_rps, requests, seed)):
+            scheduled_at = started + offset
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(_issue(target, items[i % len(items)], scheduled_at)))
+        samples = list(await asyncio.gather(*tasks))
+    duration = max(time.perf_counter() - started, 1e-6)
+
+    ok = [s for s in samples if s.ok]
+    good = [s for s in ok if s.meets(slo)]
+    server_queue = [s.server_queue_ms for s in ok if s.server_queue_ms is not None]
+    point = LoadTestPoint(
+        mode="closed" if arrival == "closed" else "open",
+        concurrency=concurrency if arrival == "closed" else None,
+        rate_rps=rate_rps if arrival != "closed" else None,
+        requests=len(samples),
+        completed=len(ok),
+        errors=len(samples) - len(ok),
+        duration_sec=round(duration, 3),
+        throughput_rps=round(len(ok) / duration, 3),
+        output_tokens_per_sec=round(sum(s.output_tokens for s in ok) / duration, 2),
+        ttft_ms=percentiles([s.ttft_ms for s in ok]),
+        itl_ms=percentiles([gap for s in ok for gap in s.gaps_ms]),
+        tpot_ms=percentiles([s.tpot_ms for s in ok if s.output_tokens > 1]),
+        e2e_ms=percentiles([s.e2e_ms for s in ok]),
+        schedule_lag_ms=percentiles([s.schedule_lag_ms for s in samples]),
+        server_queue_wait_ms=percentiles(server_queue) if server_queue else None,
+        slo_attainment=round(len(good) / len(samples), 4) if samples else 0.0,
+        goodput_rps=round(len(good) / duration, 3),
+        goodput_tokens_per_sec=round(sum(s.output_tokens for s in good) / duration, 2),
+    )
+    logger.info(
+        "loadgen_point_complete",
+        extra={
+            "target": target.name,
+            "arrival": arrival,
+            "concurrency": point.concurrency,
+            "rate_rps": point.rate_rps,
+            "throughput_rps": point.throughput_rps,
+            "goodput_rps": point.goodput_rps,
+            "ttft_p95_ms": point.ttft_ms.p95,
+        },
+    )
+    return point
+
+
+async def run_load_test(
+    target: LoadTarget,
+    items: Sequence[WorkloadItem],
+    *,
+    arrival: Arrival = "closed",
+    concurrency_levels: Sequence[int] = (1, 8, 32),
+    rate_levels: Sequence[float] = (),
+    requests_per_point: int = 64,
+    slo: LoadTestSLO | None = None,
+    seed: int = 0,
+    workload: str = "mixed",
+) -> LoadTestReport:
+    """Sweep concurrency (closed loop) or arrival rate (open loop)."""
+    if not items:
+        raise ValueError("workload is empty")
+    slo = slo or LoadTestSLO()
+    ordered = list(items)
+    random.Random(seed).shuffle(ordered)
+    levels: Sequence[Any] = concurrency_levels if arrival == "closed" else rate_levels
+    if not levels:
+        raise ValueError(f"no sweep levels for arrival={arrival!r}")
+
+    points: list[LoadTestPoint] = []
+    for level in levels:
+        points.append(
+            await run_point(
+                target,
+                ordered,
+                arrival=arrival,
+                requests=requests_per_point,
+                slo=slo,
+                concurrency=int(level) if arrival == "closed" else None,
+                rate_rps=float(level) if arrival != "closed" else None,
+                seed=seed,
+            )
+        )
+    return LoadTestReport(
+        target=target.name,
+        workload=workload,
+        arrival=arrival,
+        seed=seed,
+        slo=slo,
+        points=points,
+    )
+
+
+def report_to_benchmark_result(
+    report: LoadTestReport,
+    *,
+    model_id: str,
+    backend: str,
+    hardware: str,
+    lmx_version: str,
+) -> BenchmarkResult:
+    """Wrap a report as a ``BenchmarkResult``.
+
+    ``stats`` summarizes the sweep level with the highest goodput; per-stream
+    token rates are derived from its TPOT.
+    """
+    best = max(report.points, key=lambda p: p.goodput_rps)
+
+    def _rate(tpot_ms: float) -> float:
+        return round(1000.0 / tpot_ms, 2) if tpot_ms > 0 else 0.0
+
+    stats = BenchmarkRunStats(
+        ttft_p50_sec=best.ttft_ms.p50 / 1000,
+        ttft_p95_sec=best.ttft_ms.p95 / 1000,
+        ttft_mean_sec=best.ttft_ms.mean / 1000,
+        toks_per_sec_p50=_rate(best.tpot_ms.p50),
+        toks_per_sec_p95=_rate(best.tpot_ms.p95),
+        toks_per_sec_mean=_rate(best.tpot_ms.mean),
+        prompt_tokens=0,
+        output_tokens=round(best.output_tokens_per_sec * best.duration_sec),
+        runs_completed=best.completed,
+        warmup_runs_discarded=0,
+        output_text="",
+        output_token_count=0,
+        completed_naturally=True,
+        repetition_ratio=0.0,
+        coherence_flag="ok",
+        tool_call=None,
+        skills=[],
+    )
+    return BenchmarkResult(
+        model_id=model_id,
+        backend=backend,
+        timestamp=datetime.now(UTC).isoformat(),
+        status="ok" if best.completed >= 2 else "insufficient_data",
+        hardware=hardware,
+        lmx_version=lmx_version,
+        prompt_preview=f"load test ({report.workload}, {report.arrival})",
+        stats=stats,
+        load_test=report,
+    )
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────
+
+
+def _float_list(value: str) -> list[float]:
+    return [float(v) for v in value.split(",") if v.strip()]
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def add_cli_arguments(parser: argparse.ArgumentParser) -> None:
+    """Arguments for ``opta-lmx loadtest``."""
+    parser.add_argument("--target", choices=["http", "simulated"], default="http")
+    parser.add_argument("--base-url", default="http://127.0.0.1:1234")
+    parser.add_argument("--model", default="default", help="Model ID to request")
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--arrival", choices=["closed", "poisson", "constant"], default="closed")
+    parser.add_argument(
+        "--concurrency", type=_int_list, default=[1, 8, 32], help="Closed-loop sweep, e.g. 1,8,32"
+    )
+    parser.add_argument(
+        "--rate", type=_float_list, default=[1.0, 2.0, 4.0], help="Open-loop req/s sweep"
+    )
+    parser.add_argument("--requests", type=int, default=64, help="Requests per sweep level")
+    parser.add_argument("--trace", type=Path, default=None, help="JSONL workload trace")
+    parser.add_argument("--max-tokens", type=int, default=128)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--slo-ttft-ms", type=float, default=2000.0)
+    parser.add_argument("--slo-tpot-ms", type=float, default=100.0)
+    parser.add_argument("--slo-e2e-ms", type=float, default=None)
+    parser.add_argument("--output", type=Path, default=None, help="Write the result JSON here")
+    parser.add_argument(
+        "--save", action="store_true", help="Also save into the benchmark result store"
+    )
+
+
+async def _run_cli(args: argparse.Namespace) -> BenchmarkResult:
+    from opta_lmx import __version__
+
+    items = (
+        load_trace(args.trace, default_max_tokens=args.max_tokens)
+        if args.trace
+        else mixed_workload(args.max_tokens)
+    )
+    target: LoadTarget
+    if args.target == "simulated":
+        target = SimulatedTarget()
+    else:
+        target = HTTPTarget(args.base_url, args.model, api_key=args.api_key)
+    try:
+        report = await run_load_test(
+            target,
+            items,
+            arrival=args.arrival,
+            concurrency_levels=args.concurrency,
+            rate_levels=args.rate,
+            requests_per_point=args.requests,
+            slo=LoadTestSLO(
+                ttft_ms=args.slo_ttft_ms, tpot_ms=args.slo_tpot_ms, e2e_ms=args.slo_e2e_ms
+            ),
+            seed=args.seed,
+            workload=args.trace.name if args.trace else "mixed",
+        )
+    finally:
+        if isinstance(target, HTTPTarget):
+            await target.aclose()
+    return report_to_benchmark_result(
+        report,
+        model_id=args.model,
+        backend=target.name,
+        hardware="client",
+        lmx_version=__version__,
+    )
+
+
+def format_report(report: LoadTestReport) -> str:
+    """Plain-text table, one row per sweep level."""
+    header = (
+        f"{'level':>8} {'ok/req':>9} {'rps':>7} {'tok/s':>8} {'ttft p50':>9} "
+        f"{'ttft p99':>9} {'tpot p50':>9} {'e2e p99':>9} {'slo':>6} {'goodput':>8}"
+    )
+    rows = [header]
+    for p in report.points:
+        level = f"c={p.concurrency}" if p.mode == "closed" else f"r={p.rate_rps:g}"
+        rows.append(
+            f"{level:>8} {f'{p.completed}/{p.requests}':>9} {p.throughput_rps:>7.2f} "
+            f"{p.output_tokens_per_sec:>8.1f} {p.ttft_ms.p50:>9.1f} {p.ttft_ms.p99:>9.1f} "
+            f"{p.tpot_ms.p50:>9.2f} {p.e2e_ms.p99:>9.1f} {p.slo_attainment:>6.0%} "
+            f"{p.goodput_rps:>8.2f}"
+        )
+    return "\n".join(rows)
+
+
+def run_cli(args: argparse.Namespace) -> int:
+    """Entry point for ``opta-lmx loadtest``; returns the process exit code."""
+    result = asyncio.run(_run_cli(args))
+    if result.load_test is not None:
+        sys.stdout.write(format_report(result.load_test) + "\n")
+    if args.output:
+        args.output.write_text(result.model_dump_json(indent=2), encoding="utf-8")
+    if args.save:
+        path = BenchmarkResultStore().save(result)
+        sys.stdout.write(f"saved {path}\n")
+    return 0 if result.status == "ok" else 1
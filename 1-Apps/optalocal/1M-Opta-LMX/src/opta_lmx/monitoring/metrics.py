@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+import logging
+import math
 import threading
 import time
 from collections import deque
-from dataclasses import dataclass
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from typing import Any
 
+logger = logging.getLogger(__name__)
+
+# Subsystem metric providers return flat {metric_name: number} snapshots.
+MetricsSource = Callable[[], dict[str, float | int]]
+
 
 @dataclass
 class AgentRunMetric:
@@ -18,6 +26,9 @@ class AgentRunMetric:
     duration_sec: float
     model_id: str
     role_count: int
+    # Streaming runs only: step ID -> seconds to first token, and run start -> first token.
+    step_ttft_sec: dict[str, float] = field(default_factory=dict)
+    first_token_sec: float | None = None
 
 
 @dataclass
@@ -62,6 +73,17 @@ class MetricsCollector:
         self._latency_sum: dict[str, float] = {}
         self._request_timestamps: deque[float] = deque()
         self._started_at: float = time.time()
+        # Subsystem gauges/counters (reranker, auth cache, pools, ...), keyed by prefix.
+        self._sources: dict[str, MetricsSource] = {}
+        self._agent_runs: dict[str, int] = {}
+        self._agent_step_ttft_sum: float = 0.0
+        self._agent_step_ttft_count: int = 0
+        # Run start -> first streamed token: histogram on the latency buckets,
+        # plus recent samples for summary percentiles.
+        self._agent_first_token_counts = [0] * len(self._latency_buckets)
+        self._agent_first_token_sum: float = 0.0
+        self._agent_first_token_count: int = 0
+        self._agent_first_token_recent: deque[float] = deque(maxlen=1024)
 
     @staticmethod
     def _coerce_non_negative_int(value: Any) -> int:
@@ -126,6 +148,35 @@ class MetricsCollector:
                     break
             # If latency exceeds all buckets, it only appears in +Inf
 
+    def record_agent_run(self, metric: AgentRunMetric) -> None:
+        """Record a finished agent run and its per-step time to first token."""
+        with self._lock:
+            self._agent_runs[metric.status] = self._agent_runs.get(metric.status, 0) + 1
+            for ttft in metric.step_ttft_sec.values():
+                self._agent_step_ttft_sum += ttft
+                self._agent_step_ttft_count += 1
+            if metric.first_token_sec is not None:
+                first_token = max(0.0, metric.first_token_sec)
+                self._agent_first_token_sum += first_token
+                self._agent_first_token_count += 1
+                self._agent_first_token_recent.append(first_token)
+                for i, boundary in enumerate(self._latency_buckets):
+                    if first_token <= boundary:
+                        self._agent_first_token_counts[i] += 1
+                        break
+
+    def _agent_step_ttft_avg(self) -> float | None:
+        if self._agent_step_ttft_count <= 0:
+            return None
+        return self._agent_step_ttft_sum / self._agent_step_ttft_count
+
+    def _agent_first_token_percentile(self, p: float) -> float | None:
+        """Nearest-rank percentile of recent runs' time to first token."""
+        ordered = sorted(self._agent_first_token_recent)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))]
+
     def record_speculative(
         self,
         accepted_tokens: int = 0,
@@ -144,6 +195,30 @@ class MetricsCollector:
                 ignored_tokens,
             )
 
+    def register_source(self, prefix: str, provider: MetricsSource) -> None:
+        """Register a subsystem metrics provider.
+
+        Each key returned by ``provider`` is exported as ``lmx_{prefix}_{key}``
+        in Prometheus output and under ``subsystems[prefix]`` in ``summary()``.
+        """
+        with self._lock:
+            self._sources[prefix] = provider
+
+    def unregister_source(self, prefix: str) -> None:
+        """Remove a previously registered subsystem metrics provider."""
+        with self._lock:
+            self._sources.pop(prefix, None)
+
+    def _collect_sources(self) -> dict[str, dict[str, float | int]]:
+        """Snapshot every registered source, skipping providers that fail."""
+        collected: dict[str, dict[str, float | int]] = {}
+        for prefix, provider in self._sources.items():
+            try:
+                collected[prefix] = dict(provider())
+            except Exception:
+                logger.warning("metrics_source_failed", extra={"prefix": prefix}, exc_info=True)
+        return collected
+
     def record_model_load(self, model_id: str, duration_sec: float) -> None:
         """Record model load time (for tracking startup performance)."""
         # Stub implementation - could be expanded to track load times
@@ -316,6 +391,45 @@ class MetricsCollector:
             lines.append("# TYPE lmx_queued_requests gauge")
             lines.append(f"lmx_queued_requests {queued_requests}")
 
+            lines.append("# HELP lmx_agent_runs_total Finished agent runs by status.")
+            lines.append("# TYPE lmx_agent_runs_total counter")
+            for status, count in sorted(self._agent_runs.items()):
+                lines.append(f'lmx_agent_runs_total{{status="{status}"}} {count}')
+
+            lines.append(
+                "# HELP lmx_agent_step_ttft_seconds_avg "
+                "Average time to first token of streamed agent steps.",
+            )
+            lines.append("# TYPE lmx_agent_step_ttft_seconds_avg gauge")
+            step_ttft_avg = self._agent_step_ttft_avg()
+            lines.append(
+                "lmx_agent_step_ttft_seconds_avg "
+                + ("NaN" if step_ttft_avg is None else f"{step_ttft_avg:.6f}"),
+            )
+
+            lines.append(
+                "# HELP lmx_agent_run_first_token_seconds "
+                "Time from agent run start to its first streamed token.",
+            )
+            lines.append("# TYPE lmx_agent_run_first_token_seconds histogram")
+            cumulative = 0
+            for i, boundary in enumerate(self._latency_buckets):
+                cumulative += self._agent_first_token_counts[i]
+                lines.append(
+                    f'lmx_agent_run_first_token_seconds_bucket{{le="{boundary}"}} {cumulative}'
+                )
+            lines.append(
+                'lmx_agent_run_first_token_seconds_bucket{le="+Inf"} '
+                f"{self._agent_first_token_count}"
+            )
+            lines.append(f"lmx_agent_run_first_token_seconds_sum {self._agent_first_token_sum:.6f}")
+            lines.append(f"lmx_agent_run_first_token_seconds_count {self._agent_first_token_count}")
+
+            for prefix, values in sorted(self._collect_sources().items()):
+                for key, value in sorted(values.items()):
+                    lines.append(f"# TYPE lmx_{prefix}_{key} gauge")
+                    lines.append(f"lmx_{prefix}_{key} {value}")
+
             lines.append("")  # trailing newline
             return "\n".join(lines)
 
@@ -334,6 +448,9 @@ class MetricsCollector:
                 else 0.0
             )
             speculative_ratio = self._speculative_acceptance_ratio()
+            step_ttft_avg = self._agent_step_ttft_avg()
+            first_token_p50 = self._agent_first_token_percentile(50)
+            first_token_p95 = self._agent_first_token_percentile(95)
             return {
                 "total_requests": self._total_requests,
                 "total_errors": self._total_errors,
@@ -377,6 +494,21 @@ class MetricsCollector:
                     }
                     for cid in sorted(self._client_requests.keys())
                 },
+                "agents": {
+                    "runs_by_status": dict(sorted(self._agent_runs.items())),
+                    "streamed_steps": self._agent_step_ttft_count,
+                    "step_ttft_avg_sec": (
+                        round(step_ttft_avg, 6) if step_ttft_avg is not None else None
+                    ),
+                    "streamed_runs": self._agent_first_token_count,
+                    "first_token_p50_sec": (
+                        round(first_token_p50, 6) if first_token_p50 is not None else None
+                    ),
+                    "first_token_p95_sec": (
+                        round(first_token_p95, 6) if first_token_p95 is not None else None
+                    ),
+                },
+                "subsystems": self._collect_sources(),
                 "schema_version": "2026-03-02",
             }
 
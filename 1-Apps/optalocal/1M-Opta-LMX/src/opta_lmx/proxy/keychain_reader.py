@@ -3,20 +3,33 @@ keychain_reader.py — Read subscription OAuth tokens from macOS Keychain.
 
 Tokens are stored by opta vault pull using the provider id as the service name.
 Falls back to env vars (OPTA_TOKEN_<PROVIDER_UPPER>) for non-macOS environments.
+
+The ``security`` CLI is a blocking subprocess, so request handlers use
+:func:`aget_subscription_token`, which reads off the event loop, and the
+server keeps the cache warm with :func:`start_background_refresh` so
+requests normally never wait on the keychain at all.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
 import os
 import subprocess
 import time
+from collections.abc import Iterable
 
 logger = logging.getLogger(__name__)
 
 # In-memory cache: provider_id → (token, fetched_at)
 _cache: dict[str, tuple[str, float]] = {}
 CACHE_TTL_SECONDS = 300  # Re-read keychain every 5 minutes max
+REFRESH_AHEAD_RATIO = 0.8  # Background refresh at 80% of the TTL
+
+# provider_id → in-flight off-loop read, shared by concurrent callers
+_inflight: dict[str, asyncio.Task[str | None]] = {}
+_refresher_task: asyncio.Task[None] | None = None
 
 
 def get_subscription_token(provider_id: str) -> str | None:
@@ -32,11 +45,90 @@ def get_subscription_token(provider_id: str) -> str | None:
     return token
 
 
+async def aget_subscription_token(provider_id: str) -> str | None:
+    """Async :func:`get_subscription_token` that never blocks the event loop.
+
+    While the background refresher runs, a stale cached token is served
+    as-is (the refresher replaces it shortly); otherwise expired or missing
+    entries are re-read in a worker thread.
+    """
+    cached = _cache.get(provider_id)
+    if cached is not None:
+        token, fetched_at = cached
+        if time.monotonic() - fetched_at < CACHE_TTL_SECONDS or background_refresh_running():
+            return token or None
+    return await refresh_token(provider_id)
+
+
+async def refresh_token(provider_id: str) -> str | None:
+    """Re-read a provider's token in a worker thread and update the cache."""
+    task = _inflight.get(provider_id)
+    if task is None or task.done():
+        task = asyncio.create_task(_refresh_off_loop(provider_id))
+        _inflight[provider_id] = task
+        task.add_done_callback(lambda done: _forget_inflight(provider_id, done))
+    return await asyncio.shield(task)
+
+
+def _forget_inflight(provider_id: str, task: asyncio.Task[str | None]) -> None:
+    if _inflight.get(provider_id) is task:
+        del _inflight[provider_id]
+
+
+async def _refresh_off_loop(provider_id: str) -> str | None:
+    token = await asyncio.to_thread(_read_token, provider_id)
+    _cache[provider_id] = (token or "", time.monotonic())
+    return token
+
+
 def invalidate_token(provider_id: str) -> None:
     """Remove cached token to force re-read on next call."""
     _cache.pop(provider_id, None)
 
 
+def background_refresh_running() -> bool:
+    """Whether the background token refresher task is active."""
+    return _refresher_task is not None and not _refresher_task.done()
+
+
+def start_background_refresh(provider_ids: Iterable[str]) -> None:
+    """Refresh the given providers' tokens ahead of TTL on the running loop.
+
+    The first pass runs immediately, so the cache is warm before the first
+    subscription request arrives.
+    """
+    global _refresher_task
+    if background_refresh_running():
+        return
+    _refresher_task = asyncio.create_task(_refresh_loop(tuple(provider_ids)))
+
+
+async def stop_background_refresh() -> None:
+    """Stop the background token refresher, if running."""
+    global _refresher_task
+    task = _refresher_task
+    _refresher_task = None
+    if task is not None and not task.done():
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+async def _refresh_loop(provider_ids: tuple[str, ...]) -> None:
+    refresh_every = CACHE_TTL_SECONDS * REFRESH_AHEAD_RATIO
+    while True:
+        for provider_id in provider_ids:
+            try:
+                await refresh_token(provider_id)
+            except Exception:
+                logger.warning(
+                    "subscription_token_refresh_error",
+                    extra={"provider_id": provider_id},
+                    exc_info=True,
+                )
+        await asyncio.sleep(refresh_every)
+
+
 def _read_token(provider_id: str) -> str | None:
     """Try env var first, then macOS Keychain."""
     # 1. Try env var first (CI, non-macOS, override)
@@ -3,10 +3,17 @@ subscription_proxy.py — Forward OpenAI-compatible requests to subscription pro
 
 GitHub Copilot: OpenAI-compatible endpoint, needs special headers + auth.
 Gemini CLI: Translates to Google's generateContent API and back to OpenAI format.
+
+The server passes a :class:`SubscriptionClientPool` so every request reuses
+a keep-alive (HTTP/2 when ``h2`` is installed) connection to the provider
+instead of paying a fresh TCP+TLS handshake; callers without a pool get a
+one-shot client.
 """
 
 from __future__ import annotations
 
+import contextlib
+import importlib.util
 import json
 import logging
 import time
@@ -15,7 +22,7 @@ from typing import Any
 
 import httpx
 
-from opta_lmx.proxy.keychain_reader import get_subscription_token, invalidate_token
+from opta_lmx.proxy.keychain_reader import invalidate_token
 from opta_lmx.proxy.subscription_providers import SubscriptionRoute
 
 logger = logging.getLogger(__name__)
@@ -23,6 +30,78 @@ logger = logging.getLogger(__name__)
 PROXY_TIMEOUT = httpx.Timeout(connect=5.0, read=120.0, write=10.0, pool=5.0)
 
 
+class SubscriptionClientPool:
+    """Long-lived upstream HTTP clients, one per subscription provider.
+
+    Args:
+        max_connections: Max open connections per provider.
+        max_keepalive_connections: Idle connections retained per provider.
+        keepalive_expiry_sec: Seconds an idle connection is kept open.
+        http2: Negotiate HTTP/2 with providers that offer it. Ignored when
+            the optional ``h2`` package is not installed.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 32,
+        max_keepalive_connections: int = 16,
+        keepalive_expiry_sec: float = 90.0,
+        http2: bool = True,
+    ) -> None:
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(max_keepalive_connections, max_connections),
+            keepalive_expiry=keepalive_expiry_sec,
+        )
+        self._http2 = http2 and importlib.util.find_spec("h2") is not None
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._requests_total = 0
+        self._clients_created_total = 0
+
+    def client(self, route: SubscriptionRoute) -> httpx.AsyncClient:
+        """Return the shared client for ``route``'s provider, creating it once."""
+        self._requests_total += 1
+        client = self._clients.get(route.provider_id)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=PROXY_TIMEOUT,
+                limits=self._limits,
+                http2=self._http2,
+            )
+            self._clients[route.provider_id] = client
+            self._clients_created_total += 1
+        return client
+
+    async def aclose(self) -> None:
+        """Close every provider client and its pooled connections."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    def stats(self) -> dict[str, float | int]:
+        """Open provider clients, HTTP/2 flag, and request/client-creation totals."""
+        return {
+            "http2": int(self._http2),
+            "clients_open": len(self._clients),
+            "requests_total": self._requests_total,
+            "clients_created_total": self._clients_created_total,
+        }
+
+
+@contextlib.asynccontextmanager
+async def _upstream_client(
+    route: SubscriptionRoute, clients: SubscriptionClientPool | None
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the pooled client for ``route``, or a one-shot client without a pool."""
+    if clients is not None:
+        yield clients.client(route)
+        return
+    async with httpx.AsyncClient(timeout=PROXY_TIMEOUT) as client:
+        yield client
+
+
 def build_auth_headers(route: SubscriptionRoute, token: str) -> dict[str, str]:
     """Build provider-specific auth headers from the route config and token."""
     if route.auth_scheme == "github_copilot":
@@ -39,9 +118,12 @@ async def proxy_chat_completion(
     token: str,
     request_body: dict[str, Any],
     stream: bool = False,
+    clients: SubscriptionClientPool | None = None,
 ) -> tuple[int, dict[str, Any] | None, AsyncIterator[bytes] | None]:
     """Forward a chat completion request to the subscription provider.
 
+    Streams are passed through byte-for-byte as the upstream sends them.
+
     Returns:
         (status_code, response_dict, stream_iterator)
         - Non-stream: (200, response_dict, None)
@@ -49,9 +131,9 @@ async def proxy_chat_completion(
         - Error:      (status_code, error_dict, None)
     """
     if route.provider_id == "gemini-cli":
-        return await _proxy_gemini(route, token, request_body, stream)
+        return await _proxy_gemini(route, token, request_body, stream, clients)
     # GitHub Copilot and other OpenAI-compatible providers
-    return await _proxy_openai_compatible(route, token, request_body, stream)
+    return await _proxy_openai_compatible(route, token, request_body, stream, clients)
 
 
 async def _proxy_openai_compatible(
@@ -59,6 +141,7 @@ async def _proxy_openai_compatible(
     token: str,
     request_body: dict[str, Any],
     stream: bool,
+    clients: SubscriptionClientPool | None = None,
 ) -> tuple[int, dict[str, Any] | None, AsyncIterator[bytes] | None]:
     """Forward to an OpenAI-compatible upstream (e.g. GitHub Copilot)."""
     url = f"{route.base_url}/v1/chat/completions"
@@ -72,45 +155,50 @@ async def _proxy_openai_compatible(
     if not body.get("model"):
         body["model"] = route.default_model
 
-    async with httpx.AsyncClient(timeout=PROXY_TIMEOUT) as client:
-        if stream:
-            async def _stream_iter() -> AsyncIterator[bytes]:
-                async with client.stream("POST", url, headers=headers, json=body) as resp:
-                    if resp.status_code != 200:
-                        error_body = await resp.aread()
-                        logger.warning(
-                            "subscription_proxy_stream_error",
-                            extra={
-                                "provider_id": route.provider_id,
-                                "status": resp.status_code,
-                                "body_prefix": error_body[:200].decode("utf-8", errors="replace"),
-                            },
-                        )
-                        error_payload = json.dumps(
-                            {"error": f"upstream {resp.status_code}"}
-                        ).encode()
-                        yield b"data: " + error_payload + b"\n\n"
-                        return
-                    async for chunk in resp.aiter_bytes():
-                        yield chunk
-
-            return 200, None, _stream_iter()
+    if stream:
+        # Identity encoding lets raw upstream frames go straight to the client.
+        headers["Accept-Encoding"] = "identity"
 
-        else:
-            resp = await client.post(url, headers=headers, json=body)
-            if resp.status_code == 401:
-                # Token may be stale — evict cache so next call re-reads keychain
-                invalidate_token(route.provider_id)
-            if resp.status_code != 200:
-                logger.warning(
-                    "subscription_proxy_error",
-                    extra={
-                        "provider_id": route.provider_id,
-                        "status": resp.status_code,
-                    },
-                )
-                return resp.status_code, {"error": resp.text[:500]}, None
-            return 200, resp.json(), None
+        async def _stream_iter() -> AsyncIterator[bytes]:
+            async with (
+                _upstream_client(route, clients) as client,
+                client.stream("POST", url, headers=headers, json=body) as resp,
+            ):
+                if resp.status_code != 200:
+                    error_body = await resp.aread()
+                    if resp.status_code == 401:
+                        invalidate_token(route.provider_id)
+                    logger.warning(
+                        "subscription_proxy_stream_error",
+                        extra={
+                            "provider_id": route.provider_id,
+                            "status": resp.status_code,
+                            "body_prefix": error_body[:200].decode("utf-8", errors="replace"),
+                        },
+                    )
+                    error_payload = json.dumps({"error": f"upstream {resp.status_code}"}).encode()
+                    yield b"data: " + error_payload + b"\n\n"
+                    return
+                async for chunk in resp.aiter_raw():
+                    yield chunk
+
+        return 200, None, _stream_iter()
+
+    async with _upstream_client(route, clients) as client:
+        resp = await client.post(url, headers=headers, json=body)
+        if resp.status_code == 401:
+            # Token may be stale — evict cache so next call re-reads keychain
+            invalidate_token(route.provider_id)
+        if resp.status_code != 200:
+            logger.warning(
+                "subscription_proxy_error",
+                extra={
+                    "provider_id": route.provider_id,
+                    "status": resp.status_code,
+                },
+            )
+            return resp.status_code, {"error": resp.text[:500]}, None
+        return 200, resp.json(), None
 
 
 async def _proxy_gemini(
@@ -118,6 +206,7 @@ async def _proxy_gemini(
     token: str,
     request_body: dict[str, Any],
     stream: bool,
+    clients: SubscriptionClientPool | None = None,
 ) -> tuple[int, dict[str, Any] | None, AsyncIterator[bytes] | None]:
     """Translate OpenAI chat completions request → Gemini generateContent format."""
     model = request_body.get("model") or route.default_model
@@ -161,60 +250,64 @@ async def _proxy_gemini(
     if max_tokens:
         gemini_body["generationConfig"] = {"maxOutputTokens": max_tokens}
 
-    async with httpx.AsyncClient(timeout=PROXY_TIMEOUT) as client:
-        if stream:
-            async def _gemini_stream() -> AsyncIterator[bytes]:
-                async with client.stream(
-                    "POST", url, headers=headers, json=gemini_body
-                ) as resp:
-                    if resp.status_code != 200:
-                        err = await resp.aread()
-                        logger.warning(
-                            "gemini_stream_error",
-                            extra={
-                                "status": resp.status_code,
-                                "body_prefix": err[:200].decode("utf-8", errors="replace"),
-                            },
-                        )
-                        yield b"data: [DONE]\n\n"
-                        return
-                    async for chunk in resp.aiter_bytes():
-                        # Gemini SSE passthrough — caller handles format differences
-                        yield chunk
-
-            return 200, None, _gemini_stream()
+    if stream:
+        headers["Accept-Encoding"] = "identity"
 
-        else:
-            resp = await client.post(url, headers=headers, json=gemini_body)
-            if resp.status_code == 401:
-                invalidate_token(route.provider_id)
-            if resp.status_code != 200:
-                logger.warning(
-                    "gemini_error",
-                    extra={"status": resp.status_code},
-                )
-                return resp.status_code, {"error": resp.text[:500]}, None
-
-            # --- Convert Gemini response → OpenAI chat completion format ---
-            g = resp.json()
-            candidates = g.get("candidates", [{}])
-            text = ""
-            if candidates:
-                parts = candidates[0].get("content", {}).get("parts", [])
-                text = "".join(p.get("text", "") for p in parts)
-
-            openai_resp: dict[str, Any] = {
-                "id": f"chatcmpl-gemini-{int(time.time())}",
-                "object": "chat.completion",
-                "created": int(time.time()),
-                "model": model,
-                "choices": [
-                    {
-                        "index": 0,
-                        "message": {"role": "assistant", "content": text},
-                        "finish_reason": "stop",
-                    }
-                ],
-                "usage": g.get("usageMetadata", {}),
-            }
-            return 200, openai_resp, None
+        async def _gemini_stream() -> AsyncIterator[bytes]:
+            async with (
+                _upstream_client(route, clients) as client,
+                client.stream("POST", url, headers=headers, json=gemini_body) as resp,
+            ):
+                if resp.status_code != 200:
+                    err = await resp.aread()
+                    if resp.status_code == 401:
+                        invalidate_token(route.provider_id)
+                    logger.warning(
+                        "gemini_stream_error",
+                        extra={
+                            "status": resp.status_code,
+                            "body_prefix": err[:200].decode("utf-8", errors="replace"),
+                        },
+                    )
+                    yield b"data: [DONE]\n\n"
+                    return
+                async for chunk in resp.aiter_raw():
+                    # Gemini SSE passthrough — caller handles format differences
+                    yield chunk
+
+        return 200, None, _gemini_stream()
+
+    async with _upstream_client(route, clients) as client:
+        resp = await client.post(url, headers=headers, json=gemini_body)
+        if resp.status_code == 401:
+            invalidate_token(route.provider_id)
+        if resp.status_code != 200:
+            logger.warning(
+                "gemini_error",
+                extra={"status": resp.status_code},
+            )
+            return resp.status_code, {"error": resp.text[:500]}, None
+
+        # --- Convert Gemini response → OpenAI chat completion format ---
+        g = resp.json()
+        candidates = g.get("candidates", [{}])
+        text = ""
+        if candidates:
+            parts = candidates[0].get("content", {}).get("parts", [])
+            text = "".join(p.get("text", "") for p in parts)
+
+        openai_resp: dict[str, Any] = {
+            "id": f"chatcmpl-gemini-{int(time.time())}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": g.get("usageMetadata", {}),
+        }
+        return 200, openai_resp, None
@@ -5,4 +5,5 @@ Submodules:
 - bm25: BM25 keyword search index and Reciprocal Rank Fusion
 - chunker: Token-aware text/code chunking
 - processors: Document processors for PDF, Markdown, HTML, code
+- extraction: Process-pool text extraction with page-parallel PDFs
 """
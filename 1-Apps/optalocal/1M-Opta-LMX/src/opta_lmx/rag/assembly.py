@@ -0,0 +1,190 @@
+"""Multi-collection context assembly for ``/v1/rag/context``.
+
+Pipeline stages:
+
+1. **Fan-out search** — every collection is searched concurrently in worker
+   threads; the per-collection result lists (already sorted) are merged
+   with a bounded heap so only the best ``limit`` candidates survive.
+2. **Diversity selection** — maximal marginal relevance (MMR) over the
+   stored chunk embeddings. Near-duplicates (cosine similarity above a
+   threshold, or one chunk's text contained in another's) are dropped.
+3. **Packing** — candidates are packed into the budget in selection order
+   using token counts from the target model's tokenizer (or the ~4
+   chars/token estimate). A chunk that does not fit is skipped, so smaller
+   later chunks can still use the remaining budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from opta_lmx.inference.context import TokenCounter
+from opta_lmx.rag.store import SearchResult, VectorStore
+
+CONTEXT_SEPARATOR = "\n\n---\n\n"
+
+
+@dataclass
+class ContextCandidate:
+    """A search hit tagged with the collection it came from."""
+
+    collection: str
+    result: SearchResult
+
+
+@dataclass
+class PackedContext:
+    """Context text assembled within a token budget."""
+
+    context: str
+    sources: list[dict[str, Any]] = field(default_factory=list)
+    tokens: int = 0
+
+
+async def fan_out_search(
+    store: VectorStore,
+    collections: list[str],
+    query_embedding: list[float],
+    *,
+    top_k: int,
+    min_score: float,
+    limit: int,
+) -> list[ContextCandidate]:
+    """Search ``collections`` concurrently and keep the ``limit`` best hits overall."""
+    names = list(dict.fromkeys(collections))
+    per_collection = await asyncio.gather(
+        *(
+            asyncio.to_thread(
+                store.search,
+                collection=name,
+                query_embedding=query_embedding,
+                top_k=top_k,
+                min_score=min_score,
+            )
+            for name in names
+        )
+    )
+    ranked = (
+        [ContextCandidate(collection=name, result=r) for r in results]
+        for name, results in zip(names, per_collection, strict=True)
+    )
+    merged = heapq.merge(*ranked, key=lambda c: c.result.score, reverse=True)
+    return list(itertools.islice(merged, limit))
+
+
+def select_diverse(
+    candidates: list[ContextCandidate],
+    *,
+    k: int,
+    diversity: float,
+    dedup_threshold: float,
+) -> tuple[list[ContextCandidate], int]:
+    """Pick up to ``k`` candidates by MMR, dropping near-duplicates.
+
+    Args:
+        candidates: Candidates in relevance order.
+        k: Maximum candidates to keep.
+        diversity: MMR trade-off — 1.0 ranks purely by relevance, lower
+            values penalise similarity to chunks already selected.
+        dedup_threshold: Cosine similarity at or above which a candidate is
+            treated as a duplicate of a selected chunk and dropped.
+
+    Returns:
+        Tuple of (selected candidates, number dropped as duplicates).
+    """
+    if not candidates or k <= 0:
+        return [], 0
+
+    scores = np.array([c.result.score for c in candidates], dtype=np.float64)
+    spread = float(scores.max() - scores.min())
+    relevance = (scores - scores.min()) / spread if spread > 0 else np.ones_like(scores)
+    similarity = _pairwise_cosine([c.result.document.embedding for c in candidates])
+
+    remaining = list(range(len(candidates)))
+    max_sim = np.zeros(len(candidates), dtype=np.float64)
+    selected: list[int] = []
+    suppressed = 0
+    while remaining and len(selected) < k:
+        best = max(remaining, key=lambda i: diversity * relevance[i] - (1 - diversity) * max_sim[i])
+        remaining.remove(best)
+        if selected and (
+            max_sim[best] >= dedup_threshold
+            or _text_overlaps(candidates[best], (candidates[i] for i in selected))
+        ):
+            suppressed += 1
+            continue
+        selected.append(best)
+        np.maximum(max_sim, similarity[best], out=max_sim)
+    return [candidates[i] for i in selected], suppressed
+
+
+def pack_context(
+    candidates: list[ContextCandidate],
+    *,
+    max_tokens: int,
+    count_tokens: TokenCounter,
+) -> PackedContext:
+    """Pack candidates into ``max_tokens`` in order, skipping any that overflow."""
+    if not candidates:
+        return PackedContext(context="")
+    entries = [_format_entry(c) for c in candidates]
+    *entry_tokens, separator_tokens = count_tokens([*entries, CONTEXT_SEPARATOR])
+
+    parts: list[str] = []
+    sources: list[dict[str, Any]] = []
+    used = 0
+    for candidate, entry, tokens in zip(candidates, entries, entry_tokens, strict=True):
+        cost = tokens + (separator_tokens if parts else 0)
+        if used + cost > max_tokens:
+            continue
+        parts.append(entry)
+        used += cost
+        sources.append(
+            {
+                "collection": candidate.collection,
+                "id": candidate.result.document.id,
+                "score": round(candidate.result.score, 4),
+                "metadata": candidate.result.document.metadata,
+            }
+        )
+    return PackedContext(context=CONTEXT_SEPARATOR.join(parts), sources=sources, tokens=used)
+
+
+def _format_entry(candidate: ContextCandidate) -> str:
+    document = candidate.result.document
+    header = f"[Source: {candidate.collection}"
+    if document.metadata.get("source"):
+        header += f" / {document.metadata['source']}"
+    header += f" | relevance: {candidate.result.score:.2f}]"
+    return f"{header}\n{document.text}"
+
+
+def _pairwise_cosine(vectors: list[NDArray[np.float32]]) -> NDArray[np.float64]:
+    """Cosine similarity matrix; vectors of different dimensions score 0."""
+    n = len(vectors)
+    similarity = np.zeros((n, n), dtype=np.float64)
+    by_dim: dict[int, list[int]] = {}
+    for i, vector in enumerate(vectors):
+        by_dim.setdefault(vector.shape[-1], []).append(i)
+    for indices in by_dim.values():
+        matrix = np.stack([vectors[i] for i in indices]).astype(np.float64)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        similarity[np.ix_(indices, indices)] = matrix @ matrix.T
+    return similarity
+
+
+def _text_overlaps(candidate: ContextCandidate, chosen: Any) -> bool:
+    text = candidate.result.document.text.strip()
+    for other in chosen:
+        other_text = other.result.document.text.strip()
+        if text in other_text or other_text in text:
+            return True
+    return False
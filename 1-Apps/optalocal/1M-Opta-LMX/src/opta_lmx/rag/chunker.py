@@ -47,69 +47,107 @@ def chunk_text(
     if not text.strip():
         return []
 
-    # Convert token targets to approximate char counts
-    chars_per_chunk = chunk_size * 4
-    chars_overlap = chunk_overlap * 4
+    chunker = StreamingChunker(chunk_size, chunk_overlap, separator)
+    return [*chunker.feed(text), *chunker.finish()]
 
-    # Split on separator first
-    segments = text.split(separator)
-    chunks: list[Chunk] = []
-    current_parts: list[str] = []
-    current_len = 0
-    chunk_start = 0
-    char_pos = 0
 
-    for i, segment in enumerate(segments):
-        seg_len = len(segment) + (len(separator) if i < len(segments) - 1 else 0)
+class StreamingChunker:
+    """Incremental :func:`chunk_text` for text that arrives in pieces.
+
+    Used when a document is extracted page by page: a chunk is emitted as
+    soon as the segment after it has been read, so the whole text never has
+    to be held at once. Feeding the pieces of a text and then calling
+    :meth:`finish` gives the same chunks as ``chunk_text`` on the joined text.
+    """
 
-        if current_len + seg_len > chars_per_chunk and current_parts:
+    def __init__(
+        self,
+        chunk_size: int = 512,
+        chunk_overlap: int = 64,
+        separator: str = "\n",
+    ) -> None:
+        # Convert token targets to approximate char counts
+        self._chars_per_chunk = chunk_size * 4
+        self._chars_overlap = chunk_overlap * 4
+        self._separator = separator
+        self._tail: list[str] = []  # Pieces of the segment still being read
+        self._parts: list[str] = []
+        self._current_len = 0
+        self._chunk_start = 0
+        self._char_pos = 0
+        self._next_index = 0
+
+    def feed(self, text: str) -> list[Chunk]:
+        """Add the next piece of text; returns the chunks it completed."""
+        if not text:
+            return []
+        probe = text
+        if len(self._separator) > 1 and self._tail:
+            # A multi-char separator may straddle the previous piece and this one.
+            probe = self._tail[-1][1 - len(self._separator) :] + text
+        self._tail.append(text)
+        if self._separator not in probe:
+            return []
+        *segments, rest = "".join(self._tail).split(self._separator)
+        self._tail = [rest]
+        chunks: list[Chunk] = []
+        for segment in segments:
+            self._add(segment, len(segment) + len(self._separator), chunks)
+        return chunks
+
+    def finish(self) -> list[Chunk]:
+        """Chunk the remaining text once the input has ended."""
+        chunks: list[Chunk] = []
+        last = "".join(self._tail)
+        self._tail = []
+        self._add(last, len(last), chunks)
+
+        # Emit remaining
+        if self._parts:
+            chunk_text_str = self._separator.join(self._parts)
+            if chunk_text_str.strip():
+                self._emit(chunk_text_str, chunks)
+            self._parts = []
+        return chunks
+
+    def _add(self, segment: str, seg_len: int, chunks: list[Chunk]) -> None:
+        separator = self._separator
+        if self._current_len + seg_len > self._chars_per_chunk and self._parts:
             # Emit current chunk
-            chunk_text_str = separator.join(current_parts)
-            chunks.append(
-                Chunk(
-                    text=chunk_text_str,
-                    index=len(chunks),
-                    start_char=chunk_start,
-                    end_char=chunk_start + len(chunk_text_str),
-                )
-            )
+            self._emit(separator.join(self._parts), chunks)
 
             # Calculate overlap: keep trailing parts that fit within overlap
             overlap_parts: list[str] = []
             overlap_len = 0
-            for part in reversed(current_parts):
-                if overlap_len + len(part) > chars_overlap:
+            for part in reversed(self._parts):
+                if overlap_len + len(part) > self._chars_overlap:
                     break
                 overlap_parts.insert(0, part)
                 overlap_len += len(part) + len(separator)
 
             if overlap_parts:
-                current_parts = overlap_parts
-                current_len = sum(len(p) + len(separator) for p in current_parts)
-                chunk_start = char_pos - current_len
+                self._parts = overlap_parts
+                self._current_len = sum(len(p) + len(separator) for p in self._parts)
+                self._chunk_start = self._char_pos - self._current_len
             else:
-                current_parts = []
-                current_len = 0
-                chunk_start = char_pos
-
-        current_parts.append(segment)
-        current_len += seg_len
-        char_pos += seg_len
-
-    # Emit remaining
-    if current_parts:
-        chunk_text_str = separator.join(current_parts)
-        if chunk_text_str.strip():
-            chunks.append(
-                Chunk(
-                    text=chunk_text_str,
-                    index=len(chunks),
-                    start_char=chunk_start,
-                    end_char=chunk_start + len(chunk_text_str),
-                )
+                self._parts = []
+                self._current_len = 0
+                self._chunk_start = self._char_pos
+
+        self._parts.append(segment)
+        self._current_len += seg_len
+        self._char_pos += seg_len
+
+    def _emit(self, text: str, chunks: list[Chunk]) -> None:
+        chunks.append(
+            Chunk(
+                text=text,
+                index=self._next_index,
+                start_char=self._chunk_start,
+                end_char=self._chunk_start + len(text),
             )
-
-    return chunks
+        )
+        self._next_index += 1
 
 
 def chunk_code(
@@ -0,0 +1,310 @@
+"""Off-loop, parallel text extraction for RAG file ingestion.
+
+:class:`DocumentExtractor` runs the :mod:`~opta_lmx.rag.processors` in a
+bounded pool of worker processes, so parsing a large PDF neither blocks the
+event loop nor competes with it for the GIL:
+
+- PDFs with at least ``pdf_parallel_min_pages`` pages are split into ranges
+  of ``pdf_pages_per_task`` pages that several workers extract at once.
+  Each document keeps at most ``max_workers`` ranges in flight and its text
+  is yielded in page order as ranges complete, so callers can chunk and
+  embed the first pages while later ones are still being extracted.
+  A PDF that pypdf cannot parse is logged and yields no more text, with the
+  error recorded in the document's metadata, as in
+  :func:`~opta_lmx.rag.processors.process_pdf`.
+- Other formats are extracted whole by one worker (the watcher already
+  caps file size).
+- Per-format counters (files, bytes, pages, chars, worker seconds) give
+  extraction throughput through :meth:`DocumentExtractor.stats`.
+
+Workers are started with ``spawn`` (safe alongside the server's threads)
+on first use.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import importlib.util
+import logging
+import multiprocessing
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+from opta_lmx.rag.processors import (
+    ProcessedDocument,
+    detect_processor,
+    extract_pdf_pages,
+    file_stats,
+    pdf_page_count,
+    process_file,
+)
+
+logger = logging.getLogger(__name__)
+
+# Matches the page join in processors.process_pdf.
+_PDF_PAGE_SEPARATOR = "\n\n"
+
+T = TypeVar("T")
+
+
+def _timed(fn: Callable[..., T], *args: Any) -> tuple[T, float]:  # noqa: UP047
+    """Worker-side wrapper: run ``fn`` and report how long it took."""
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def _open_pdf(path: Path) -> tuple[int, dict[str, Any]]:
+    """Worker-side: page count and file metadata of a PDF."""
+    return pdf_page_count(path), file_stats(path)
+
+
+@dataclass
+class _FormatStats:
+    """Extraction counters for one processor type."""
+
+    files: int = 0
+    errors: int = 0
+    bytes: int = 0
+    pages: int = 0
+    chars: int = 0
+    worker_sec: float = 0.0
+
+
+class ExtractedDocument:
+    """Text of one file, produced piece by piece.
+
+    Iterate it once for the text. ``metadata`` fills in as extraction
+    progresses and is complete when iteration ends.
+    """
+
+    def __init__(self, extractor: DocumentExtractor, path: Path) -> None:
+        self.path = path
+        self.processor = detect_processor(path.name)
+        self.metadata: dict[str, Any] = {}
+        self._extractor = extractor
+
+    def __aiter__(self) -> AsyncGenerator[str, None]:
+        return self._extractor._pieces(self)
+
+
+class DocumentExtractor:
+    """Extract text from files in a bounded pool of worker processes.
+
+    Args:
+        max_workers: Worker processes (and ranges of one PDF in flight).
+        pdf_parallel_min_pages: PDFs with at least this many pages are split
+            across workers; smaller ones are extracted by a single task.
+        pdf_pages_per_task: Pages per task when a PDF is split.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 2,
+        pdf_parallel_min_pages: int = 32,
+        pdf_pages_per_task: int = 8,
+    ) -> None:
+        self._max_workers = max(1, max_workers)
+        self._pdf_parallel_min_pages = max(1, pdf_parallel_min_pages)
+        self._pdf_pages_per_task = max(1, pdf_pages_per_task)
+        self._executor: ProcessPoolExecutor | None = None
+        # Bounds tasks queued in the pool across all documents being extracted.
+        self._slots = asyncio.Semaphore(self._max_workers * 2)
+
+        self._inflight = 0
+        self._tasks_total = 0
+        self._pool_restarts_total = 0
+        self._by_format: dict[str, _FormatStats] = {}
+
+    def open(self, path: Path) -> ExtractedDocument:
+        """Start extracting ``path``; iterate the result for its text."""
+        return ExtractedDocument(self, path)
+
+    async def extract(self, path: Path) -> ProcessedDocument:
+        """Extract a whole file (the pooled equivalent of ``process_file``)."""
+        document = self.open(path)
+        pieces = [piece async for piece in document]
+        return ProcessedDocument(
+            text="" if "error" in document.metadata else "".join(pieces),
+            metadata=document.metadata,
+            source=str(path),
+            processor=document.processor,
+        )
+
+    async def close(self) -> None:
+        """Stop the worker processes, cancelling queued tasks."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    # ── Internal ───────────────────────────────────────────────────────
+
+    async def _pieces(self, document: ExtractedDocument) -> AsyncGenerator[str, None]:
+        stats = self._by_format.setdefault(document.processor, _FormatStats())
+        if document.processor == "pdf":
+            pieces = self._pdf_pieces(document, stats)
+        else:
+            pieces = self._whole_file(document, stats)
+        chars = 0
+        try:
+            async with contextlib.aclosing(pieces):
+                async for piece in pieces:
+                    chars += len(piece)
+                    yield piece
+        except Exception as e:
+            stats.errors += 1
+            logger.warning(
+                "document_extraction_failed",
+                extra={
+                    "path": str(document.path),
+                    "processor": document.processor,
+                    "error": str(e),
+                },
+            )
+            raise
+        stats.files += 1
+        stats.chars += chars
+        stats.bytes += int(document.metadata.get("size_bytes", 0))
+
+    async def _whole_file(
+        self, document: ExtractedDocument, stats: _FormatStats
+    ) -> AsyncGenerator[str, None]:
+        doc = await self._run(stats, process_file, document.path)
+        document.metadata.update(doc.metadata)
+        if doc.text:
+            yield doc.text
+
+    async def _pdf_pieces(
+        self, document: ExtractedDocument, stats: _FormatStats
+    ) -> AsyncGenerator[str, None]:
+        path = document.path
+        if importlib.util.find_spec("pypdf") is None:
+            logger.warning("pypdf_not_installed_cannot_process_pdf")
+            document.metadata.update({"error": "pypdf not installed", "filename": path.name})
+            return
+
+        pending: deque[asyncio.Task[list[str]]] = deque()
+        separator = ""
+        chars = 0
+        try:
+            page_count, metadata = await self._run(stats, _open_pdf, path)
+            document.metadata.update(metadata)
+            document.metadata["page_count"] = page_count
+
+            if page_count >= self._pdf_parallel_min_pages:
+                step = self._pdf_pages_per_task
+            else:
+                step = max(1, page_count)
+            starts = iter(range(0, page_count, step))
+            while True:
+                while len(pending) < self._max_workers:
+                    start = next(starts, None)
+                    if start is None:
+                        break
+                    pending.append(
+                        await self._submit(stats, extract_pdf_pages, path, start, start + step)
+                    )
+                if not pending:
+                    break
+                page_texts = await pending.popleft()
+                stats.pages += len(page_texts)
+                for text in page_texts:
+                    if text:
+                        piece = separator + text
+                        separator = _PDF_PAGE_SEPARATOR
+                        chars += len(piece)
+                        yield piece
+        except BrokenProcessPool:
+            raise
+        except Exception as e:
+            stats.errors += 1
+            logger.error("pdf_processing_failed", extra={"path": str(path), "error": str(e)})
+            document.metadata.update({"error": str(e), "filename": path.name})
+            return
+        finally:
+            for task in pending:
+                task.cancel()
+        document.metadata["char_count"] = chars
+
+    async def _run(self, stats: _FormatStats, fn: Callable[..., T], *args: Any) -> T:
+        return await (await self._submit(stats, fn, *args))
+
+    async def _submit(
+        self, stats: _FormatStats, fn: Callable[..., T], *args: Any
+    ) -> asyncio.Task[T]:
+        """Queue ``fn(*args)`` in the pool once a slot is free."""
+        await self._slots.acquire()
+        try:
+            future = asyncio.wrap_future(self._ensure_executor().submit(_timed, fn, *args))
+        except BaseException:
+            self._slots.release()
+            raise
+        self._inflight += 1
+        self._tasks_total += 1
+        # Released when the pool finishes the task, even if nobody awaits it.
+        future.add_done_callback(self._task_done)
+        return asyncio.ensure_future(self._collect(future, stats))
+
+    def _task_done(self, _future: asyncio.Future[Any]) -> None:
+        self._inflight -= 1
+        self._slots.release()
+
+    async def _collect(self, future: asyncio.Future[tuple[T, float]], stats: _FormatStats) -> T:
+        try:
+            result, worker_sec = await future
+        except BrokenProcessPool:
+            self._discard_executor()
+            raise
+        stats.worker_sec += worker_sec
+        return result
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _discard_executor(self) -> None:
+        """Drop a pool whose worker died; the next task starts a fresh one."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._pool_restarts_total += 1
+            logger.warning("extraction_pool_broken", extra={"workers": self._max_workers})
+
+    def stats(self) -> dict[str, int | float]:
+        """Pool state plus per-format extraction totals and throughput.
+
+        Throughput is per worker-second: the time workers spent extracting,
+        which excludes queueing and the consumer's own processing.
+        """
+        stats: dict[str, int | float] = {
+            "workers": self._max_workers,
+            "pool_running": int(self._executor is not None),
+            "inflight_tasks": self._inflight,
+            "tasks_total": self._tasks_total,
+            "pool_restarts_total": self._pool_restarts_total,
+        }
+        for fmt, counters in sorted(self._by_format.items()):
+            busy = counters.worker_sec
+            stats[f"{fmt}_files_total"] = counters.files
+            stats[f"{fmt}_errors_total"] = counters.errors
+            stats[f"{fmt}_bytes_total"] = counters.bytes
+            stats[f"{fmt}_chars_total"] = counters.chars
+            stats[f"{fmt}_worker_seconds_total"] = round(busy, 3)
+            stats[f"{fmt}_mb_per_sec"] = round(counters.bytes / 1e6 / busy, 3) if busy else 0.0
+            stats[f"{fmt}_chars_per_sec"] = round(counters.chars / busy, 1) if busy else 0.0
+            if fmt == "pdf":
+                stats["pdf_pages_total"] = counters.pages
+                stats["pdf_pages_per_sec"] = round(counters.pages / busy, 1) if busy else 0.0
+        return stats
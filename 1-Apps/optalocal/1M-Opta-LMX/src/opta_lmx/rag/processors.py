@@ -12,7 +12,6 @@ import html
 import importlib
 import logging
 import re
-import time
 from collections.abc import Callable, Sequence
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -111,17 +110,18 @@ def detect_processor(filename: str) -> str:
     return _EXTENSION_MAP.get(ext, "text")
 
 
-def _file_stats(path: Path) -> dict[str, Any]:
-    """Return file system metadata for a path."""
+def file_stats(path: Path) -> dict[str, Any]:
+    """Return file system metadata for a path (the file is hashed in blocks)."""
     try:
         stat = path.stat()
-        raw = path.read_bytes()
+        with path.open("rb") as f:
+            digest = hashlib.file_digest(f, "sha256")
         return {
             "file_path": str(path),
             "filename": path.name,
             "size_bytes": stat.st_size,
             "file_modified_at": stat.st_mtime,
-            "file_hash": hashlib.sha256(raw).hexdigest()[:12],
+            "file_hash": digest.hexdigest()[:12],
         }
     except OSError:
         return {"file_path": str(path), "filename": path.name}
@@ -144,7 +144,7 @@ def process_file(path: Path) -> ProcessedDocument:
         raise FileNotFoundError(f"File not found: {path}")
 
     processor_type = detect_processor(path.name)
-    stats = _file_stats(path)
+    stats = file_stats(path)
 
     if processor_type == "pdf":
         doc = process_pdf(path)
@@ -188,6 +188,28 @@ def process_text(content: str, source: str = "") -> ProcessedDocument:
     )
 
 
+def _pdf_reader(path: Path) -> _PdfReaderLike:
+    """Open a PDF with pypdf. Raises ImportError if pypdf is not installed."""
+    module = cast(_PyPdfModule, importlib.import_module("pypdf"))
+    return module.PdfReader(str(path))
+
+
+def pdf_page_count(path: Path) -> int:
+    """Return the number of pages in a PDF (requires pypdf)."""
+    return len(_pdf_reader(path).pages)
+
+
+def extract_pdf_pages(path: Path, start: int = 0, stop: int | None = None) -> list[str]:
+    """Extract the text of pages ``[start, stop)`` of a PDF (requires pypdf).
+
+    Pages without extractable text give ``""`` so results stay aligned
+    with page numbers.
+    """
+    pages = _pdf_reader(path).pages
+    stop = len(pages) if stop is None else min(stop, len(pages))
+    return [pages[i].extract_text() or "" for i in range(start, stop)]
+
+
 def process_pdf(path: Path) -> ProcessedDocument:
     """Extract text from a PDF file.
 
@@ -195,8 +217,7 @@ def process_pdf(path: Path) -> ProcessedDocument:
     with a warning if pypdf is not installed.
     """
     try:
-        module = cast(_PyPdfModule, importlib.import_module("pypdf"))
-        pdf_reader_cls = module.PdfReader
+        page_texts = extract_pdf_pages(path)
     except ImportError:
         logger.warning("pypdf_not_installed_cannot_process_pdf")
         return ProcessedDocument(
@@ -205,26 +226,6 @@ def process_pdf(path: Path) -> ProcessedDocument:
             source=str(path),
             processor="pdf",
         )
-
-    try:
-        reader = pdf_reader_cls(str(path))
-        pages: list[str] = []
-        for page in reader.pages:
-            text = page.extract_text()
-            if text:
-                pages.append(text)
-
-        full_text = "\n\n".join(pages)
-        return ProcessedDocument(
-            text=full_text,
-            metadata={
-                "filename": path.name,
-                "page_count": len(reader.pages),
-                "char_count": len(full_text),
-            },
-            source=str(path),
-            processor="pdf",
-        )
     except Exception as e:
         logger.error(
             "pdf_processing_failed",
@@ -240,6 +241,18 @@ def process_pdf(path: Path) -> ProcessedDocument:
             processor="pdf",
         )
 
+    full_text = "\n\n".join(text for text in page_texts if text)
+    return ProcessedDocument(
+        text=full_text,
+        metadata={
+            "filename": path.name,
+            "page_count": len(page_texts),
+            "char_count": len(full_text),
+        },
+        source=str(path),
+        processor="pdf",
+    )
+
 
 def _parse_frontmatter(content: str) -> dict[str, Any]:
     """Extract YAML frontmatter fields as a metadata dict.
@@ -3,16 +3,47 @@
 Uses the AnswerDotAI/rerankers library for cross-encoder reranking.
 Supports Jina Reranker v3 MLX and other compatible models.
 Model is loaded on first rerank() call and cached for subsequent use.
+
+Async callers use ``rerank_async()``, which keeps scoring off the event loop:
+requests are queued, coalesced for a short window into one batch, and scored
+on a dedicated single-thread executor. Per-(query, document) scores are
+cached, and an optional lexical prefilter prunes candidates before the
+cross-encoder runs.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+import time
+from collections import OrderedDict, deque
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Any
 
+from opta_lmx.rag.bm25 import tokenize
+
 logger = logging.getLogger(__name__)
 
+# Rolling window of batch latencies for p95 reporting.
+_BATCH_LATENCY_WINDOW = 256
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+@dataclass
+class _RerankJob:
+    """One queued rerank call awaiting a batched scoring pass."""
+
+    query: str
+    documents: list[str]
+    future: asyncio.Future[list[float]]
+    enqueued_at: float = field(default_factory=time.monotonic)
+
 
 class RerankerEngine:
     """Lazy-loaded cross-encoder reranker.
@@ -21,11 +52,38 @@ class RerankerEngine:
     operations after loading (cross-encoder inference is stateless).
     """
 
-    def __init__(self, model_id: str | None = None) -> None:
+    def __init__(
+        self,
+        model_id: str | None = None,
+        *,
+        batch_window_ms: float = 5.0,
+        max_batch_docs: int = 256,
+        cache_size: int = 4096,
+        prefilter_k: int | None = None,
+    ) -> None:
         self._model_id = model_id
         self._reranker: Any | None = None
         self._rerank_fn: Callable[..., list[dict[str, Any]]] | None = None
 
+        self._batch_window_sec = max(0.0, batch_window_ms / 1000.0)
+        self._max_batch_docs = max(1, max_batch_docs)
+        self._prefilter_k = prefilter_k
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: list[_RerankJob] = []
+        self._drain_task: asyncio.Task[None] | None = None
+
+        self._cache_size = max(0, cache_size)
+        self._score_cache: OrderedDict[tuple[str | None, str, str], float] = OrderedDict()
+
+        self._batches_total = 0
+        self._batched_jobs_total = 0
+        self._scored_docs_total = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._prefiltered_docs_total = 0
+        self._batch_latencies: deque[float] = deque(maxlen=_BATCH_LATENCY_WINDOW)
+        self._queue_wait_latencies: deque[float] = deque(maxlen=_BATCH_LATENCY_WINDOW)
+
     @property
     def is_loaded(self) -> bool:
         """Whether the reranker model is loaded."""
@@ -72,8 +130,16 @@ class RerankerEngine:
         if self._reranker is not None:
             self._reranker = None
             self._rerank_fn = None
+            self._score_cache.clear()
             logger.info("reranker_unloaded", extra={"model_id": self._model_id})
 
+    def shutdown(self) -> None:
+        """Unload the model and stop the dedicated scoring executor."""
+        self.unload()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
     def rerank(
         self,
         query: str,
@@ -118,3 +184,225 @@ class RerankerEngine:
             ranked = ranked[:top_n]
 
         return ranked
+
+    # ── Off-event-loop batched scoring ──────────────────────────────────────
+
+    @property
+    def queue_depth(self) -> int:
+        """Rerank calls waiting for the next batched scoring pass."""
+        return len(self._pending)
+
+    async def rerank_async(
+        self,
+        query: str,
+        documents: list[str],
+        top_n: int | None = None,
+        *,
+        prefilter_k: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Rerank documents without blocking the event loop.
+
+        Cached (query, document) scores are reused; remaining documents are
+        queued and scored together with other concurrent calls on the
+        dedicated reranker executor.
+
+        Args:
+            query: Search query text.
+            documents: Candidate documents to rerank.
+            top_n: Maximum results to return (None = all).
+            prefilter_k: Keep only this many candidates by cheap lexical
+                overlap before cross-encoder scoring (None = engine default).
+
+        Returns:
+            List of {"index": int, "score": float} sorted by descending score.
+        """
+        candidates = self._prefilter(query, documents, prefilter_k or self._prefilter_k, top_n)
+
+        query_hash = _text_hash(query)
+        scores: dict[int, float] = {}
+        missing: list[int] = []
+        for index in candidates:
+            cached = self._cache_get((self._model_id, query_hash, _text_hash(documents[index])))
+            if cached is None:
+                missing.append(index)
+            else:
+                scores[index] = cached
+
+        if missing:
+            missing_docs = [documents[i] for i in missing]
+            fresh = await self._enqueue(query, missing_docs)
+            for index, score in zip(missing, fresh, strict=True):
+                scores[index] = score
+                self._cache_put((self._model_id, query_hash, _text_hash(documents[index])), score)
+
+        ranked = [{"index": index, "score": score} for index, score in scores.items()]
+        ranked.sort(key=lambda x: x["score"], reverse=True)
+        if top_n is not None:
+            ranked = ranked[:top_n]
+        return ranked
+
+    def _prefilter(
+        self,
+        query: str,
+        documents: list[str],
+        prefilter_k: int | None,
+        top_n: int | None,
+    ) -> list[int]:
+        """Return candidate indices, pruned by lexical overlap when configured."""
+        indices = list(range(len(documents)))
+        if prefilter_k is None:
+            return indices
+        keep = max(prefilter_k, top_n or 0)
+        if len(documents) <= keep:
+            return indices
+
+        query_terms = set(tokenize(query))
+        if not query_terms:
+            return indices[:keep]
+
+        def _overlap(index: int) -> int:
+            return len(query_terms.intersection(tokenize(documents[index])))
+
+        # Stable sort keeps original retrieval order among equal-overlap documents.
+        kept = sorted(indices, key=_overlap, reverse=True)[:keep]
+        self._prefiltered_docs_total += len(documents) - len(kept)
+        return sorted(kept)
+
+    def _cache_get(self, key: tuple[str | None, str, str]) -> float | None:
+        if self._cache_size == 0:
+            return None
+        score = self._score_cache.get(key)
+        if score is None:
+            self._cache_misses += 1
+            return None
+        self._score_cache.move_to_end(key)
+        self._cache_hits += 1
+        return score
+
+    def _cache_put(self, key: tuple[str | None, str, str], score: float) -> None:
+        if self._cache_size == 0:
+            return
+        self._score_cache[key] = score
+        self._score_cache.move_to_end(key)
+        while len(self._score_cache) > self._cache_size:
+            self._score_cache.popitem(last=False)
+
+    async def _enqueue(self, query: str, documents: list[str]) -> list[float]:
+        loop = asyncio.get_running_loop()
+        job = _RerankJob(query=query, documents=documents, future=loop.create_future())
+        self._pending.append(job)
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self._drain())
+        return await job.future
+
+    async def _drain(self) -> None:
+        """Coalesce queued jobs into batches and score them off the event loop."""
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lmx-rerank")
+
+        while self._pending:
+            queued_docs = sum(len(job.documents) for job in self._pending)
+            if queued_docs < self._max_batch_docs and self._batch_window_sec > 0:
+                await asyncio.sleep(self._batch_window_sec)
+
+            batch: list[_RerankJob] = []
+            batch_docs = 0
+            while self._pending and (
+                not batch or batch_docs + len(self._pending[0].documents) <= self._max_batch_docs
+            ):
+                job = self._pending.pop(0)
+                batch.append(job)
+                batch_docs += len(job.documents)
+
+            started = time.monotonic()
+            for job in batch:
+                self._queue_wait_latencies.append(started - job.enqueued_at)
+            try:
+                results = await loop.run_in_executor(self._executor, self._score_batch, batch)
+            except Exception as e:
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                continue
+            finally:
+                self._batch_latencies.append(time.monotonic() - started)
+                self._batches_total += 1
+                self._batched_jobs_total += len(batch)
+                self._scored_docs_total += batch_docs
+
+            for job, scores in zip(batch, results, strict=True):
+                if not job.future.done():
+                    job.future.set_result(scores)
+
+    def _score_batch(self, batch: list[_RerankJob]) -> list[list[float]]:
+        """Score a batch of jobs in one executor pass (runs on the rerank thread).
+
+        Jobs sharing a query are merged into a single forward pass over the
+        union of their documents, so repeated RAG queries cost one model call.
+        """
+        by_query: dict[str, list[str]] = {}
+        for job in batch:
+            docs = by_query.setdefault(job.query, [])
+            docs.extend(job.documents)
+
+        scored: dict[tuple[str, str], float] = {}
+        for query, docs in by_query.items():
+            unique_docs = list(dict.fromkeys(docs))
+            for doc, score in zip(unique_docs, self._score_query(query, unique_docs), strict=True):
+                scored[(query, doc)] = score
+
+        return [[scored[(job.query, doc)] for doc in job.documents] for job in batch]
+
+    def _score_query(self, query: str, documents: list[str]) -> list[float]:
+        """Return one relevance score per document, in input order."""
+        ranked = self.rerank(query, documents, top_n=None)
+        scores = [0.0] * len(documents)
+        for entry in ranked:
+            index = int(entry["index"])
+            if 0 <= index < len(documents):
+                scores[index] = float(entry["score"])
+        return scores
+
+    def stats(self) -> dict[str, float | int]:
+        """Queue depth, batch latency and cache counters for metrics export."""
+        latencies = sorted(self._batch_latencies)
+        waits = list(self._queue_wait_latencies)
+        p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] if latencies else 0.0
+        lookups = self._cache_hits + self._cache_misses
+        return {
+            "queue_depth": len(self._pending),
+            "batches_total": self._batches_total,
+            "batched_requests_total": self._batched_jobs_total,
+            "scored_docs_total": self._scored_docs_total,
+            "batch_latency_avg_ms": round(
+                sum(latencies) / len(latencies) * 1000 if latencies else 0.0, 3
+            ),
+            "batch_latency_p95_ms": round(p95 * 1000, 3),
+            "queue_wait_avg_ms": round(sum(waits) / len(waits) * 1000 if waits else 0.0, 3),
+            "cache_hits_total": self._cache_hits,
+            "cache_misses_total": self._cache_misses,
+            "cache_hit_ratio": round(self._cache_hits / lookups, 6) if lookups else 0.0,
+            "cache_entries": len(self._score_cache),
+            "prefiltered_docs_total": self._prefiltered_docs_total,
+        }
+
+
+async def rerank_off_loop(
+    reranker: Any,
+    query: str,
+    documents: list[str],
+    top_n: int | None = None,
+) -> list[dict[str, Any]]:
+    """Rerank with any local reranker without blocking the event loop.
+
+    RerankerEngine instances go through the batched, cached path; other
+    objects exposing a sync ``rerank(query, documents, top_n=...)`` run in
+    the default thread pool.
+    """
+    if isinstance(reranker, RerankerEngine):
+        return await reranker.rerank_async(query, documents, top_n=top_n)
+    result: list[dict[str, Any]] = await asyncio.to_thread(
+        reranker.rerank, query, documents, top_n=top_n
+    )
+    return result
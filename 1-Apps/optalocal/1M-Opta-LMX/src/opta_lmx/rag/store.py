@@ -18,6 +18,7 @@ from __future__ import annotations
 import importlib
 import json
 import logging
+import threading
 import time
 import uuid
 from dataclasses import dataclass, field
@@ -199,8 +200,10 @@ class VectorStore:
     - JSON persistence to disk
     - Collection management (create, list, delete, stats)
 
-    Thread safety: NOT thread-safe. Use from a single async context
-    (FastAPI runs on a single event loop, so this is fine).
+    Thread safety: mutations should come from one context (the event loop).
+    ``search`` may also run in worker threads (``asyncio.to_thread``):
+    mutations replace a collection's document list and indexes together
+    under a lock, and each search reads one consistent snapshot of them.
     """
 
     def __init__(self, persist_path: Path | None = None) -> None:
@@ -209,6 +212,7 @@ class VectorStore:
         self._faiss_indexes: dict[str, _FaissIndex] = {}
         self._bm25_indexes: dict[str, BM25Index] = {}
         self._persist_path = persist_path
+        self._lock = threading.Lock()
 
     @property
     def faiss_available(self) -> bool:
@@ -262,11 +266,9 @@ class VectorStore:
                 )
             self._collection_dims[collection] = new_dim
 
-        if collection not in self._collections:
-            self._collections[collection] = []
-
         metas = metadata_list or [{} for _ in texts]
         doc_ids: list[str] = []
+        new_docs: list[Document] = []
 
         for text, emb, meta in zip(texts, embeddings, metas, strict=False):
             doc_id = str(uuid.uuid4())[:12]
@@ -277,11 +279,13 @@ class VectorStore:
                 embedding=np.array(emb, dtype=np.float32),
                 metadata=meta,
             )
-            self._collections[collection].append(doc)
+            new_docs.append(doc)
             doc_ids.append(doc_id)
 
-        # Rebuild FAISS + BM25 indexes for this collection
-        self._rebuild_indexes(collection)
+        with self._lock:
+            self._collections[collection] = [*self._collections.get(collection, []), *new_docs]
+            # Rebuild FAISS + BM25 indexes for this collection
+            self._rebuild_indexes(collection)
 
         logger.info(
             "documents_added",
@@ -321,7 +325,10 @@ class VectorStore:
         Returns:
             Top matching documents sorted by descending relevance.
         """
-        docs = self._collections.get(collection, [])
+        with self._lock:
+            docs = self._collections.get(collection, [])
+            faiss_index = self._faiss_indexes.get(collection)
+            bm25 = self._bm25_indexes.get(collection)
         if not docs:
             return []
 
@@ -336,11 +343,12 @@ class VectorStore:
         query_vec = np.array(query_embedding, dtype=np.float32)
 
         if mode == "keyword":
-            return self._search_keyword(collection, query_text or "", top_k, docs)
+            return self._search_keyword(bm25, query_text or "", top_k, docs)
 
         if mode == "hybrid":
             return self._search_hybrid(
-                collection,
+                faiss_index,
+                bm25,
                 query_vec,
                 query_text or "",
                 top_k,
@@ -351,18 +359,17 @@ class VectorStore:
             )
 
         # Default: vector search
-        return self._search_vector(collection, query_vec, top_k, min_score, docs)
+        return self._search_vector(faiss_index, query_vec, top_k, min_score, docs)
 
     def _search_vector(
         self,
-        collection: str,
+        faiss_index: _FaissIndex | None,
         query_vec: NDArray[np.float32],
         top_k: int,
         min_score: float,
         docs: list[Document],
     ) -> list[SearchResult]:
         """Pure vector similarity search (FAISS or numpy)."""
-        faiss_index = self._faiss_indexes.get(collection)
         if faiss_index is not None:
             raw = _search_faiss(faiss_index, query_vec, top_k)
             results: list[SearchResult] = []
@@ -377,13 +384,12 @@ class VectorStore:
 
     def _search_keyword(
         self,
-        collection: str,
+        bm25: BM25Index | None,
         query_text: str,
         top_k: int,
         docs: list[Document],
     ) -> list[SearchResult]:
         """BM25 keyword search."""
-        bm25 = self._bm25_indexes.get(collection)
         if bm25 is None or not query_text:
             return []
 
@@ -396,7 +402,8 @@ class VectorStore:
 
     def _search_hybrid(
         self,
-        collection: str,
+        faiss_index: _FaissIndex | None,
+        bm25: BM25Index | None,
         query_vec: NDArray[np.float32],
         query_text: str,
         top_k: int,
@@ -411,7 +418,7 @@ class VectorStore:
 
         # Get vector results (double top_k to ensure good candidates)
         vector_results = self._search_vector(
-            collection,
+            faiss_index,
             query_vec,
             top_k * 2,
             min_score,
@@ -420,7 +427,6 @@ class VectorStore:
         vector_ranked = [(id_to_idx.get(r.document.id, -1), r.score) for r in vector_results]
 
         # Get keyword results
-        bm25 = self._bm25_indexes.get(collection)
         keyword_ranked: list[tuple[int, float]] = []
         if bm25 is not None and query_text:
             keyword_ranked = bm25.search(query_text, top_k * 2)
@@ -448,10 +454,11 @@ class VectorStore:
 
     def delete_collection(self, collection: str) -> int:
         """Delete a collection and all its documents. Returns count deleted."""
-        docs = self._collections.pop(collection, [])
-        self._collection_dims.pop(collection, None)
-        self._faiss_indexes.pop(collection, None)
-        self._bm25_indexes.pop(collection, None)
+        with self._lock:
+            docs = self._collections.pop(collection, [])
+            self._collection_dims.pop(collection, None)
+            self._faiss_indexes.pop(collection, None)
+            self._bm25_indexes.pop(collection, None)
         count = len(docs)
         if count:
             logger.info(
@@ -478,14 +485,16 @@ class VectorStore:
         total_deleted = 0
         for collection in list(self._collections.keys()):
             docs = self._collections[collection]
-            before = len(docs)
-            self._collections[collection] = [
-                d for d in docs if d.metadata.get("source") != source
-                and d.metadata.get("file_path") != source
+            kept = [
+                d
+                for d in docs
+                if d.metadata.get("source") != source and d.metadata.get("file_path") != source
             ]
-            deleted = before - len(self._collections[collection])
+            deleted = len(docs) - len(kept)
             if deleted:
-                self._rebuild_indexes(collection)
+                with self._lock:
+                    self._collections[collection] = kept
+                    self._rebuild_indexes(collection)
                 total_deleted += deleted
 
         if total_deleted:
@@ -502,12 +511,13 @@ class VectorStore:
             return 0
 
         id_set = set(doc_ids)
-        before = len(docs)
-        self._collections[collection] = [d for d in docs if d.id not in id_set]
-        deleted = before - len(self._collections[collection])
+        kept = [d for d in docs if d.id not in id_set]
+        deleted = len(docs) - len(kept)
 
         if deleted:
-            self._rebuild_indexes(collection)
+            with self._lock:
+                self._collections[collection] = kept
+                self._rebuild_indexes(collection)
             logger.info(
                 "documents_deleted",
                 extra={
@@ -539,7 +549,7 @@ class VectorStore:
     # ── Index management ─────────────────────────────────────────────────
 
     def _rebuild_indexes(self, collection: str) -> None:
-        """Rebuild FAISS and BM25 indexes for a collection."""
+        """Rebuild FAISS and BM25 indexes for a collection (caller holds ``_lock``)."""
         docs = self._collections.get(collection, [])
         if not docs:
             self._faiss_indexes.pop(collection, None)
@@ -594,18 +604,21 @@ class VectorStore:
         with open(target) as f:
             data = json.load(f)
 
-        self._collections.clear()
-        self._collection_dims.clear()
-        self._faiss_indexes.clear()
-        self._bm25_indexes.clear()
         total = 0
-        for collection, doc_dicts in data.items():
-            self._collections[collection] = [Document.from_dict(d) for d in doc_dicts]
-            total += len(doc_dicts)
-            # Restore embedding dimensions from loaded data
-            if self._collections[collection]:
-                self._collection_dims[collection] = len(self._collections[collection][0].embedding)
-            self._rebuild_indexes(collection)
+        with self._lock:
+            self._collections.clear()
+            self._collection_dims.clear()
+            self._faiss_indexes.clear()
+            self._bm25_indexes.clear()
+            for collection, doc_dicts in data.items():
+                self._collections[collection] = [Document.from_dict(d) for d in doc_dicts]
+                total += len(doc_dicts)
+                # Restore embedding dimensions from loaded data
+                if self._collections[collection]:
+                    self._collection_dims[collection] = len(
+                        self._collections[collection][0].embedding
+                    )
+                self._rebuild_indexes(collection)
 
         logger.info(
             "store_loaded",
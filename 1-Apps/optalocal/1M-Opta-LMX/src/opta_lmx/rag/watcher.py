@@ -11,6 +11,9 @@ Architecture:
       run_coroutine_threadsafe(), keeping the VectorStore single-threaded
     - Each file is deleted from the store before re-ingesting to prevent
       duplicate chunks accumulating across edits
+    - Text extraction runs in a worker process pool (DocumentExtractor);
+      text is chunked as it is extracted and embedded in batches, so large
+      PDFs neither block the event loop nor sit in memory whole
 
 Usage:
     watcher = WorkspaceWatcher(registry, store, embedding_engine, rag_config)
@@ -21,6 +24,7 @@ Usage:
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import fnmatch
 import logging
 import math
@@ -31,8 +35,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from opta_lmx.rag.chunker import chunk_code, chunk_markdown, chunk_text
-from opta_lmx.rag.processors import detect_processor, process_file
+from opta_lmx.rag.chunker import Chunk, StreamingChunker, chunk_code, chunk_markdown
+from opta_lmx.rag.extraction import DocumentExtractor
 from opta_lmx.rag.watch_registry import WatchEntry, WatchRegistry
 
 if TYPE_CHECKING:
@@ -42,6 +46,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Chunks per embedding call while a file is still being extracted.
+_EMBED_BATCH_CHUNKS = 64
+
 
 @dataclass
 class ReindexResult:
@@ -79,6 +86,16 @@ class WorkspaceWatcher:
         self._debounce_timers: dict[str, threading.Timer] = {}
         self._debounce_lock = threading.Lock()
         self._running = False
+        self._extractor = DocumentExtractor(
+            max_workers=rag_config.extraction_workers,
+            pdf_parallel_min_pages=rag_config.extraction_pdf_parallel_min_pages,
+            pdf_pages_per_task=rag_config.extraction_pdf_pages_per_task,
+        )
+
+    @property
+    def extractor(self) -> DocumentExtractor:
+        """Process pool that extracts text from files (see ``stats()`` for metrics)."""
+        return self._extractor
 
     # ── Lifecycle ────────────────────────────────────────────────────────
 
@@ -120,6 +137,8 @@ class WorkspaceWatcher:
             self._observer.join(timeout=5.0)
             self._observer = None
 
+        await self._extractor.close()
+
         logger.info("workspace_watcher_stopped")
 
     async def register(self, entry: WatchEntry) -> None:
@@ -142,14 +161,16 @@ class WorkspaceWatcher:
             prefix = path.rstrip("/") + "/"
             for collection in list(self._store._collections.keys()):
                 docs = self._store._collections.get(collection, [])
-                before = len(docs)
-                self._store._collections[collection] = [
-                    d for d in docs
+                kept = [
+                    d
+                    for d in docs
                     if not (d.metadata.get("file_path", "") or "").startswith(prefix)
                 ]
-                deleted = before - len(self._store._collections[collection])
+                deleted = len(docs) - len(kept)
                 if deleted:
-                    self._store._rebuild_indexes(collection)
+                    with self._store._lock:
+                        self._store._collections[collection] = kept
+                        self._store._rebuild_indexes(collection)
                     logger.info(
                         "purged_index_for_folder",
                         extra={"folder": path, "collection": collection, "count": deleted},
@@ -329,39 +350,51 @@ class WorkspaceWatcher:
             logger.info("file_unindexed", extra={"path": file_path, "chunks_removed": deleted})
 
     async def _ingest_file(self, file_path: str, collection: str) -> int:
-        """Process, chunk, embed, and store a single file. Returns chunk count."""
+        """Extract, chunk, embed, and store a single file. Returns chunk count.
+
+        Plain text, HTML and PDFs are chunked while pages are still being
+        extracted, and full batches are embedded as they become ready. The
+        file's chunks and vectors are held until the whole file has been
+        embedded, so the store never serves a half-indexed file. A PDF that
+        fails to parse is skipped and its previous chunks are kept.
+        """
         if self._embedding_engine is None:
             raise RuntimeError("No embedding engine available for file indexing")
 
-        path = Path(file_path)
-        doc = process_file(path)
-        if not doc.text.strip():
-            return 0
-
-        processor_type = detect_processor(path.name)
+        document = self._extractor.open(Path(file_path))
         chunk_size = self._rag_config.default_chunk_size
         chunk_overlap = self._rag_config.default_chunk_overlap
 
-        if processor_type == "code":
-            chunks = chunk_code(doc.text, chunk_size, chunk_overlap)
-        elif processor_type == "markdown":
-            chunks = chunk_markdown(doc.text, chunk_size, chunk_overlap)
+        chunks: list[Chunk] = []
+        embeddings: list[list[float]] = []
+        has_text = False
+        pieces = aiter(document)
+        if document.processor in ("code", "markdown"):
+            text = "".join([piece async for piece in pieces])
+            has_text = bool(text.strip())
+            if document.processor == "code":
+                chunks = chunk_code(text, chunk_size, chunk_overlap)
+            else:
+                chunks = chunk_markdown(text, chunk_size, chunk_overlap)
         else:
-            chunks = chunk_text(doc.text, chunk_size, chunk_overlap)
-
-        if not chunks:
+            chunker = StreamingChunker(chunk_size, chunk_overlap)
+            async with contextlib.aclosing(pieces):
+                async for piece in pieces:
+                    has_text = has_text or not piece.isspace()
+                    chunks.extend(chunker.feed(piece))
+                    embeddings.extend(await self._embed_batches(chunks[len(embeddings) :]))
+            chunks.extend(chunker.finish())
+
+        if "error" in document.metadata or not has_text or not chunks:
             return 0
-
-        chunk_texts = [c.text for c in chunks]
+        embeddings.extend(await self._embed_batches(chunks[len(embeddings) :], final=True))
 
         # Remove old chunks for this file before re-ingesting
         self._store.delete_by_source(file_path)
 
-        embeddings = await self._embedding_engine.embed(chunk_texts, model_id=None)
-
         metadata_list = [
             {
-                **doc.metadata,
+                **document.metadata,
                 "source": file_path,
                 "file_path": file_path,
                 "chunk_index": c.index,
@@ -371,9 +404,24 @@ class WorkspaceWatcher:
             for c in chunks
         ]
 
-        self._store.add(collection, chunk_texts, embeddings, metadata_list)
+        self._store.add(collection, [c.text for c in chunks], embeddings, metadata_list)
         return len(chunks)
 
+    async def _embed_batches(
+        self, chunks: list[Chunk], *, final: bool = False
+    ) -> list[list[float]]:
+        """Embed ``chunks`` in full batches; a partial last batch only when ``final``."""
+        assert self._embedding_engine is not None
+        embeddings: list[list[float]] = []
+        for start in range(0, len(chunks), _EMBED_BATCH_CHUNKS):
+            batch = chunks[start : start + _EMBED_BATCH_CHUNKS]
+            if len(batch) < _EMBED_BATCH_CHUNKS and not final:
+                break
+            embeddings.extend(
+                await self._embedding_engine.embed([c.text for c in batch], model_id=None)
+            )
+        return embeddings
+
     # ── Internal: helpers ────────────────────────────────────────────────
 
     def _should_index(self, file_path: str) -> bool:
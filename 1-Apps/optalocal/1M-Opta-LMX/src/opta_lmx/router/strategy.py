@@ -3,14 +3,21 @@
 from __future__ import annotations
 
 import logging
+import random
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
 
 from opta_lmx.config import RoutingConfig
+from opta_lmx.inference.types import ModelRoutingStats
 
 logger = logging.getLogger(__name__)
 
 # Built-in aliases that are always recognized (even if not in config).
 RESERVED_ALIASES = {"auto", "code", "reasoning", "chat"}
 
+RoutingStatsProvider = Callable[[list[str]], Mapping[str, ModelRoutingStats]]
+
 
 class TaskRouter:
     """Resolve model aliases to actual loaded model IDs.
@@ -21,29 +28,70 @@ class TaskRouter:
 
     Resolution rules:
     1. If model_id matches a loaded model exactly → return as-is.
-    2. If model_id is a known alias → walk its preference list,
-       return the first model that is currently loaded.
+    2. If model_id is a known alias → collect the loaded models from its
+       preference list and pick one using the alias's routing policy.
     3. "auto" alias → use config.default_model if set and loaded,
-       otherwise fall back to any loaded model.
+       otherwise pick among all loaded models using the "auto" policy.
     4. If nothing resolves → return the original model_id unchanged
        (the caller will handle the "not loaded" error).
+
+    Policies (per alias via ``routing.policies``, else ``default_policy``):
+    - ``first_loaded``: first loaded preference (original behaviour).
+    - ``least_outstanding``: fewest active + waiting requests per unit weight.
+    - ``power_of_two``: sample two candidates, keep the less loaded one.
+    - ``latency_ewma``: lowest latency EWMA scaled by outstanding requests.
+
+    With ``sticky_sessions`` enabled, a client keeps the model it was last
+    routed to for an alias while that model stays loaded, so repeated turns
+    hit the same prefix cache.
     """
 
-    def __init__(self, config: RoutingConfig) -> None:
+    def __init__(
+        self,
+        config: RoutingConfig,
+        *,
+        stats_provider: RoutingStatsProvider | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        self._stats_provider = stats_provider
+        self._rng = rng or random.Random()
+        self._affinity: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
+        self._apply_config(config)
+
+    def _apply_config(self, config: RoutingConfig) -> None:
         self._aliases = dict(config.aliases)
         self._default_model = config.default_model
+        self._default_policy = config.default_policy
+        self._policies = dict(config.policies)
+        self._model_weights = dict(config.model_weights)
+        self._sticky_sessions = config.sticky_sessions
+        self._sticky_ttl_sec = config.sticky_ttl_sec
+        self._sticky_max_entries = config.sticky_max_entries
+
+    def set_stats_provider(self, provider: RoutingStatsProvider | None) -> None:
+        """Attach the live per-model load source (usually the engine)."""
+        self._stats_provider = provider
+
+    def policy_for(self, alias: str) -> str:
+        """Return the routing policy configured for an alias."""
+        return self._policies.get(alias, self._default_policy)
 
     def resolve(
         self,
         model_id: str,
         loaded_model_ids: list[str],
         model_load_snapshot: dict[str, float] | None = None,
+        *,
+        client_id: str | None = None,
     ) -> str:
         """Resolve a model identifier to a loaded model ID.
 
         Args:
             model_id: Client-provided model name (may be alias or real ID).
             loaded_model_ids: Currently loaded model IDs from the engine.
+            model_load_snapshot: Optional per-model load score (lower is better),
+                used when no live stats provider is attached.
+            client_id: Optional client identity for sticky session affinity.
 
         Returns:
             Resolved model ID (may still be unloaded if nothing matched).
@@ -56,7 +104,7 @@ class TaskRouter:
 
         # Handle "auto" alias specially
         if model_id == "auto":
-            resolved = self._resolve_auto(loaded_set)
+            resolved = self._resolve_auto(loaded_set, model_load_snapshot, client_id)
             if resolved:
                 logger.info(
                     "route_resolved",
@@ -71,16 +119,19 @@ class TaskRouter:
         # Check configured aliases
         if model_id in self._aliases:
             preferences = self._aliases[model_id]
-            for candidate in preferences:
-                if candidate in loaded_set:
-                    logger.info(
-                        "route_resolved",
-                        extra={
-                            "alias": model_id,
-                            "resolved_to": candidate,
-                        },
-                    )
-                    return candidate
+            candidates = [candidate for candidate in preferences if candidate in loaded_set]
+            if candidates:
+                resolved = self._select(model_id, candidates, model_load_snapshot, client_id)
+                logger.info(
+                    "route_resolved",
+                    extra={
+                        "alias": model_id,
+                        "resolved_to": resolved,
+                        "policy": self.policy_for(model_id),
+                        "candidates": len(candidates),
+                    },
+                )
+                return resolved
 
             # Alias known but no preferred model is loaded
             logger.warning(
@@ -96,29 +147,138 @@ class TaskRouter:
         # Not an alias — return as-is (caller checks if loaded)
         return model_id
 
-    def _resolve_auto(self, loaded_set: set[str]) -> str | None:
+    def _resolve_auto(
+        self,
+        loaded_set: set[str],
+        model_load_snapshot: dict[str, float] | None = None,
+        client_id: str | None = None,
+    ) -> str | None:
         """Resolve the 'auto' alias.
 
         Priority:
         1. config.default_model (if set and loaded)
-        2. First loaded model (deterministic — sorted)
+        2. Policy pick over all loaded models (sorted for determinism)
         """
         if self._default_model and self._default_model in loaded_set:
             return self._default_model
 
         if loaded_set:
-            return sorted(loaded_set)[0]
+            return self._select("auto", sorted(loaded_set), model_load_snapshot, client_id)
 
         return None
 
+    # ── Policy selection ───────────────────────────────────────────────
+
+    def _select(
+        self,
+        alias: str,
+        candidates: list[str],
+        model_load_snapshot: dict[str, float] | None,
+        client_id: str | None,
+    ) -> str:
+        """Pick one of the loaded candidates (in preference order) for an alias."""
+        if len(candidates) == 1:
+            chosen = candidates[0]
+            self._remember_affinity(alias, client_id, chosen)
+            return chosen
+
+        sticky = self._sticky_choice(alias, client_id, candidates)
+        if sticky is not None:
+            return sticky
+
+        policy = self.policy_for(alias)
+        if policy == "first_loaded":
+            chosen = candidates[0]
+        else:
+            stats = self._stats_for(candidates)
+            if stats:
+                load = {m: float(entry.outstanding) for m, entry in stats.items()}
+            else:
+                load = dict(model_load_snapshot or {})
+            if policy == "power_of_two":
+                pair = self._rng.sample(candidates, 2)
+                pair.sort(key=candidates.index)
+                chosen = min(pair, key=lambda m: self._outstanding_score(m, load))
+            elif policy == "latency_ewma":
+                chosen = min(candidates, key=lambda m: self._latency_score(m, stats, load))
+            else:
+                chosen = min(candidates, key=lambda m: self._outstanding_score(m, load))
+
+        self._remember_affinity(alias, client_id, chosen)
+        return chosen
+
+    def _stats_for(self, candidates: list[str]) -> Mapping[str, ModelRoutingStats]:
+        """Collect live per-model stats from the attached provider, if any."""
+        if self._stats_provider is None:
+            return {}
+        try:
+            return self._stats_provider(candidates)
+        except Exception:
+            logger.warning("route_stats_unavailable", exc_info=True)
+            return {}
+
+    def _weight(self, model_id: str) -> float:
+        return self._model_weights.get(model_id, 1.0)
+
+    def _outstanding_score(self, model_id: str, load: Mapping[str, float]) -> float:
+        return (load.get(model_id, 0.0) + 1.0) / self._weight(model_id)
+
+    def _latency_score(
+        self,
+        model_id: str,
+        stats: Mapping[str, ModelRoutingStats],
+        load: Mapping[str, float],
+    ) -> float:
+        entry = stats.get(model_id)
+        latency = entry.latency_ewma_sec if entry is not None else None
+        if latency is None and entry is not None:
+            latency = entry.latency_p95_sec
+        if latency is None:
+            # Unmeasured models get traffic first so they acquire a latency signal.
+            return 0.0
+        return latency * self._outstanding_score(model_id, load)
+
+    # ── Sticky session affinity ────────────────────────────────────────
+
+    def _sticky_choice(
+        self,
+        alias: str,
+        client_id: str | None,
+        candidates: list[str],
+    ) -> str | None:
+        if not self._sticky_sessions or not client_id:
+            return None
+        key = (alias, client_id)
+        entry = self._affinity.get(key)
+        if entry is None:
+            return None
+        model_id, expires_at = entry
+        if expires_at <= time.monotonic() or model_id not in candidates:
+            self._affinity.pop(key, None)
+            return None
+        self._remember_affinity(alias, client_id, model_id)
+        return model_id
+
+    def _remember_affinity(self, alias: str, client_id: str | None, model_id: str) -> None:
+        if not self._sticky_sessions or not client_id:
+            return
+        key = (alias, client_id)
+        self._affinity[key] = (model_id, time.monotonic() + self._sticky_ttl_sec)
+        self._affinity.move_to_end(key)
+        while len(self._affinity) > self._sticky_max_entries:
+            self._affinity.popitem(last=False)
+
     def update_config(self, config: RoutingConfig) -> None:
         """Hot-reload routing configuration."""
-        self._aliases = dict(config.aliases)
-        self._default_model = config.default_model
+        self._apply_config(config)
+        if not self._sticky_sessions:
+            self._affinity.clear()
         logger.info(
             "routing_config_updated",
             extra={
                 "alias_count": len(self._aliases),
                 "default_model": self._default_model,
+                "default_policy": self._default_policy,
+                "sticky_sessions": self._sticky_sessions,
             },
         )
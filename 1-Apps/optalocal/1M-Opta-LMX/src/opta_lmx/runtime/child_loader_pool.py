@@ -0,0 +1,377 @@
+"""Pre-forked warm worker pool for isolated child loader execution.
+
+Spawning ``python -m opta_lmx.runtime.child_loader_worker`` per probe pays
+interpreter start-up and backend imports every time. The pool keeps a few
+workers running in ``--serve`` mode (backend modules already imported) and
+sends them LoadSpec lines over their stdin/stdout pipes.
+
+Failure handling matches the one-shot supervisor:
+- Structured worker failures keep the worker and report ``exit_code=1``,
+  as a one-shot worker exiting 1 would.
+- A worker that dies mid-job is classified from its exit status and
+  stderr (signal -> ``model_loader_crashed``), then replaced.
+- A job that exceeds its timeout kills the worker (``model_load_timeout``).
+
+Workers are recycled after ``max_jobs_per_worker`` jobs or any crash, and
+a replacement is forked in the background so the pool stays warm. A pool
+started with ``prefork=False`` forks nothing up front: each job that finds
+no idle worker forks one, which then stays warm for the next job.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from opta_lmx.model_safety import ErrorCodes
+from opta_lmx.runtime.child_loader_supervisor import (
+    LoaderSupervisorOutcome,
+    classify_worker_exit,
+    timeout_outcome,
+)
+from opta_lmx.runtime.loader_protocol import LoaderFailure, LoadResult, LoadSpec
+
+logger = logging.getLogger(__name__)
+
+# Lines of worker stderr kept for crash classification.
+_STDERR_TAIL_LINES = 50
+
+
+@dataclass
+class _PooledWorker:
+    """One warm worker process and its bookkeeping."""
+
+    proc: asyncio.subprocess.Process
+    spawned_at: float = field(default_factory=time.monotonic)
+    jobs: int = 0
+    stderr_tail: deque[bytes] = field(default_factory=lambda: deque(maxlen=_STDERR_TAIL_LINES))
+    stderr_task: asyncio.Task[None] | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+
+class LoaderWorkerPool:
+    """Supervised pool of pre-forked child loader workers."""
+
+    def __init__(
+        self,
+        size: int = 2,
+        *,
+        max_jobs_per_worker: int = 32,
+        preload_modules: list[str] | None = None,
+        spawn_timeout_sec: float = 60.0,
+        python_executable: str | None = None,
+        worker_module: str = "opta_lmx.runtime.child_loader_worker",
+    ) -> None:
+        if size < 1:
+            raise ValueError("Loader pool size must be at least 1")
+        self._size = size
+        self._max_jobs_per_worker = max(1, max_jobs_per_worker)
+        self._preload_modules = list(preload_modules or [])
+        self._spawn_timeout_sec = spawn_timeout_sec
+        self._python_executable = python_executable or sys.executable
+        self._worker_module = worker_module
+
+        self._idle: deque[_PooledWorker] = deque()
+        self._slots = asyncio.Semaphore(size)
+        self._background: set[asyncio.Task[Any]] = set()
+        self._running = False
+        self._started_at = 0.0
+
+        self._busy = 0
+        self._busy_sec_total = 0.0
+        self._jobs_total = 0
+        self._job_sec_total = 0.0
+        self._spawned_total = 0
+        self._spawn_failures = 0
+        self._recycled_total = 0
+        self._crashes_total = 0
+        self._timeouts_total = 0
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────
+
+    @property
+    def size(self) -> int:
+        """Maximum number of concurrent workers."""
+        return self._size
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the pool has been started and not closed."""
+        return self._running
+
+    async def start(self, *, prefork: bool = True) -> None:
+        """Start the pool, pre-forking every worker unless ``prefork`` is False.
+
+        Pre-fork failures are retried lazily on first use.
+        """
+        if self._running:
+            return
+        self._running = True
+        self._started_at = time.monotonic()
+        if not prefork:
+            logger.info("loader_pool_started", extra={"size": self._size, "warm_workers": 0})
+            return
+        spawned = await asyncio.gather(
+            *(self._spawn() for _ in range(self._size)), return_exceptions=True
+        )
+        for worker in spawned:
+            if not isinstance(worker, _PooledWorker):
+                continue
+            # Jobs that arrived during start-up may have forked their own workers.
+            if self._running and len(self._idle) + self._busy < self._size:
+                self._idle.append(worker)
+            else:
+                await self._retire(worker, recycle=False)
+        logger.info(
+            "loader_pool_started",
+            extra={"size": self._size, "warm_workers": len(self._idle)},
+        )
+
+    async def close(self) -> None:
+        """Stop every worker, waiting briefly for background retirements."""
+        self._running = False
+        # Let in-flight retirements reap their processes; cancel stragglers.
+        if self._background:
+            _, pending = await asyncio.wait(list(self._background), timeout=5.0)
+            for task in pending:
+                task.cancel()
+            for task in pending:
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await task
+        while self._idle:
+            await self._retire(self._idle.popleft(), recycle=False)
+        logger.info("loader_pool_closed", extra=self.stats())
+
+    # ── Job execution ─────────────────────────────────────────────────────
+
+    async def run(self, spec: LoadSpec, *, timeout_sec: float = 90.0) -> LoaderSupervisorOutcome:
+        """Execute one LoadSpec on a warm worker with timeout and crash classification."""
+        if not self._running:
+            raise RuntimeError("Loader worker pool is not running")
+
+        async with self._slots:
+            worker = self._take_idle()
+            if worker is None:
+                try:
+                    worker = await self._spawn()
+                except Exception as exc:
+                    return LoaderSupervisorOutcome(
+                        ok=False,
+                        failure=LoaderFailure(
+                            code=ErrorCodes.MODEL_LOADER_CRASHED,
+                            message=f"Loader worker failed to start: {exc}",
+                        ),
+                    )
+
+            self._busy += 1
+            started = time.monotonic()
+            try:
+                outcome, reusable = await self._exchange(worker, spec, timeout_sec)
+            except BaseException:
+                await self._retire(worker, recycle=True)
+                raise
+            finally:
+                elapsed = time.monotonic() - started
+                self._busy -= 1
+                self._busy_sec_total += elapsed
+                self._jobs_total += 1
+                self._job_sec_total += elapsed
+
+            if reusable and worker.jobs < self._max_jobs_per_worker and self._running:
+                self._idle.append(worker)
+            else:
+                self._schedule(self._retire(worker, recycle=True))
+            return outcome
+
+    def _take_idle(self) -> _PooledWorker | None:
+        while self._idle:
+            worker = self._idle.popleft()
+            if worker.alive:
+                return worker
+            # Died while idle: reap it and try the next one.
+            self._crashes_total += 1
+            self._schedule(self._retire(worker, recycle=True))
+        return None
+
+    async def _exchange(
+        self,
+        worker: _PooledWorker,
+        spec: LoadSpec,
+        timeout_sec: float,
+    ) -> tuple[LoaderSupervisorOutcome, bool]:
+        """Send one spec and read one reply; returns (outcome, worker_reusable)."""
+        assert worker.proc.stdin is not None and worker.proc.stdout is not None
+        line = json.dumps(spec.to_dict(), sort_keys=True).encode("utf-8") + b"\n"
+        worker.jobs += 1
+        # Crash classification should only see this job's stderr.
+        worker.stderr_tail.clear()
+        try:
+            async with asyncio.timeout(timeout_sec):
+                try:
+                    worker.proc.stdin.write(line)
+                    await worker.proc.stdin.drain()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                raw = await worker.proc.stdout.readline()
+        except TimeoutError:
+            self._timeouts_total += 1
+            await self._kill(worker)
+            return timeout_outcome(spec, timeout_sec), False
+
+        if not raw:
+            return await self._classify_death(worker), False
+
+        try:
+            reply = json.loads(raw)
+            if not isinstance(reply, dict):
+                raise ValueError("worker reply must be a JSON object")
+            if reply.get("ok"):
+                return LoaderSupervisorOutcome(
+                    ok=True, result=LoadResult.from_dict(reply["result"])
+                ), True
+            failure = LoaderFailure.from_dict(reply.get("failure") or {})
+        except Exception as exc:
+            outcome = LoaderSupervisorOutcome(
+                ok=False,
+                failure=LoaderFailure(
+                    code=ErrorCodes.MODEL_PROBE_FAILED,
+                    message=f"Invalid worker stdout payload: {exc}",
+                ),
+            )
+            return outcome, False
+
+        # A one-shot worker reports structured failures by exiting 1.
+        if failure.exit_code is None:
+            failure.exit_code = 1
+        return LoaderSupervisorOutcome(ok=False, failure=failure), True
+
+    async def _classify_death(self, worker: _PooledWorker) -> LoaderSupervisorOutcome:
+        self._crashes_total += 1
+        try:
+            rc = await asyncio.wait_for(worker.proc.wait(), timeout=5.0)
+        except TimeoutError:
+            await self._kill(worker)
+            rc = worker.proc.returncode if worker.proc.returncode is not None else 1
+        if worker.stderr_task is not None:
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await asyncio.wait_for(worker.stderr_task, timeout=1.0)
+        outcome = classify_worker_exit(rc, b"", b"\n".join(worker.stderr_tail))
+        logger.warning(
+            "loader_pool_worker_crashed",
+            extra={
+                "pid": worker.proc.pid,
+                "returncode": rc,
+                "code": outcome.failure.code if outcome.failure else None,
+            },
+        )
+        return outcome
+
+    # ── Worker management ─────────────────────────────────────────────────
+
+    async def _spawn(self) -> _PooledWorker:
+        proc = await asyncio.create_subprocess_exec(
+            self._python_executable,
+            "-m",
+            self._worker_module,
+            "--serve",
+            *self._preload_modules,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        worker = _PooledWorker(proc=proc)
+        worker.stderr_task = asyncio.create_task(self._drain_stderr(worker))
+        assert proc.stdout is not None
+        try:
+            ready = await asyncio.wait_for(proc.stdout.readline(), timeout=self._spawn_timeout_sec)
+            if not json.loads(ready or b"{}").get("ready"):
+                raise RuntimeError("worker exited before signalling ready")
+        except Exception:
+            self._spawn_failures += 1
+            await self._kill(worker)
+            raise
+        self._spawned_total += 1
+        return worker
+
+    async def _drain_stderr(self, worker: _PooledWorker) -> None:
+        """Keep the stderr pipe flowing and remember its tail for crash reports."""
+        stream = worker.proc.stderr
+        if stream is None:
+            return
+        while True:
+            line = await stream.readline()
+            if not line:
+                return
+            worker.stderr_tail.append(line.rstrip(b"\n"))
+
+    async def _kill(self, worker: _PooledWorker) -> None:
+        if worker.alive:
+            with contextlib.suppress(ProcessLookupError):
+                worker.proc.kill()
+        with contextlib.suppress(Exception):
+            await worker.proc.wait()
+        if worker.stderr_task is not None and not worker.stderr_task.done():
+            worker.stderr_task.cancel()
+
+    async def _retire(self, worker: _PooledWorker, *, recycle: bool) -> None:
+        """Stop a worker gracefully (EOF on stdin), then optionally fork a replacement."""
+        if worker.alive and worker.proc.stdin is not None:
+            with contextlib.suppress(Exception):
+                worker.proc.stdin.close()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(worker.proc.wait(), timeout=2.0)
+        await self._kill(worker)
+        if recycle:
+            self._recycled_total += 1
+            if self._running:
+                self._schedule(self._replenish())
+
+    async def _replenish(self) -> None:
+        if not self._running or len(self._idle) + self._busy >= self._size:
+            return
+        try:
+            worker = await self._spawn()
+        except Exception:
+            logger.warning("loader_pool_respawn_failed", exc_info=True)
+            return
+        if self._running:
+            self._idle.append(worker)
+        else:
+            await self._retire(worker, recycle=False)
+
+    def _schedule(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    # ── Reporting ─────────────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, float | int]:
+        """Pool utilization and worker churn counters for metrics export."""
+        uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+        capacity_sec = uptime * self._size
+        return {
+            "size": self._size,
+            "idle_workers": len(self._idle),
+            "busy_workers": self._busy,
+            "utilization": round(self._busy_sec_total / capacity_sec, 6) if capacity_sec else 0.0,
+            "jobs_total": self._jobs_total,
+            "job_wall_avg_ms": round(
+                self._job_sec_total / self._jobs_total * 1000 if self._jobs_total else 0.0, 3
+            ),
+            "spawned_total": self._spawned_total,
+            "spawn_failures_total": self._spawn_failures,
+            "recycled_total": self._recycled_total,
+            "crashes_total": self._crashes_total,
+            "timeouts_total": self._timeouts_total,
+        }
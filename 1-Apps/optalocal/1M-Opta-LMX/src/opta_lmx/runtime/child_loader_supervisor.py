@@ -7,10 +7,14 @@ import contextlib
 import json
 import sys
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from opta_lmx.model_safety import ErrorCodes
 from opta_lmx.runtime.loader_protocol import LoaderFailure, LoadResult, LoadSpec
 
+if TYPE_CHECKING:
+    from opta_lmx.runtime.child_loader_pool import LoaderWorkerPool
+
 
 @dataclass(slots=True)
 class LoaderSupervisorOutcome:
@@ -39,48 +43,41 @@ def _parse_worker_failure(stderr: bytes, *, default_code: str) -> LoaderFailure:
     return LoaderFailure(code=default_code, message=default_code)
 
 
-async def run_loader_supervisor(
-    spec: LoadSpec,
-    *,
-    timeout_sec: float = 90.0,
-    python_executable: str | None = None,
-    worker_module: str = "opta_lmx.runtime.child_loader_worker",
-) -> LoaderSupervisorOutcome:
-    """Run one child loader worker call with timeout and crash classification."""
-    executable = python_executable or sys.executable
-    proc = await asyncio.create_subprocess_exec(
-        executable,
-        "-m",
-        worker_module,
-        stdin=asyncio.subprocess.PIPE,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
+def timeout_outcome(spec: LoadSpec, timeout_sec: float) -> LoaderSupervisorOutcome:
+    """Outcome for a worker that did not answer within ``timeout_sec``."""
+    return LoaderSupervisorOutcome(
+        ok=False,
+        failure=LoaderFailure(
+            code=ErrorCodes.MODEL_LOAD_TIMEOUT,
+            message=f"Loader timed out after {timeout_sec}s",
+            metadata={"timeout_sec": timeout_sec, "model_id": spec.model_id},
+        ),
     )
 
-    payload = json.dumps(spec.to_dict(), sort_keys=True).encode("utf-8")
 
+def parse_worker_result(line: str) -> LoaderSupervisorOutcome:
+    """Decode one worker success line into an outcome."""
     try:
-        stdout, stderr = await asyncio.wait_for(proc.communicate(payload), timeout=timeout_sec)
-    except TimeoutError:
-        with contextlib.suppress(ProcessLookupError):
-            proc.terminate()
-        try:
-            await asyncio.wait_for(proc.wait(), timeout=1.0)
-        except TimeoutError:
-            with contextlib.suppress(ProcessLookupError):
-                proc.kill()
-            await proc.wait()
+        data = json.loads(line)
+        if not isinstance(data, dict):
+            raise ValueError("worker stdout payload must be a JSON object")
+        return LoaderSupervisorOutcome(ok=True, result=LoadResult.from_dict(data))
+    except Exception as exc:
         return LoaderSupervisorOutcome(
             ok=False,
             failure=LoaderFailure(
-                code=ErrorCodes.MODEL_LOAD_TIMEOUT,
-                message=f"Loader timed out after {timeout_sec}s",
-                metadata={"timeout_sec": timeout_sec, "model_id": spec.model_id},
+                code=ErrorCodes.MODEL_PROBE_FAILED,
+                message=f"Invalid worker stdout payload: {exc}",
             ),
         )
 
-    rc = proc.returncode if proc.returncode is not None else 1
 
+def classify_worker_exit(rc: int, stdout: bytes, stderr: bytes) -> LoaderSupervisorOutcome:
+    """Map a finished worker's exit status and output to an outcome.
+
+    Shared by the one-shot supervisor and the warm worker pool so both
+    report crashes, signals and structured failures identically.
+    """
     if rc == 0:
         lines = _decode_lines(stdout)
         if not lines:
@@ -91,19 +88,7 @@ async def run_loader_supervisor(
                     message="Worker produced no stdout payload",
                 ),
             )
-        try:
-            data = json.loads(lines[0])
-            if not isinstance(data, dict):
-                raise ValueError("worker stdout payload must be a JSON object")
-            return LoaderSupervisorOutcome(ok=True, result=LoadResult.from_dict(data))
-        except Exception as exc:
-            return LoaderSupervisorOutcome(
-                ok=False,
-                failure=LoaderFailure(
-                    code=ErrorCodes.MODEL_PROBE_FAILED,
-                    message=f"Invalid worker stdout payload: {exc}",
-                ),
-            )
+        return parse_worker_result(lines[0])
 
     if rc < 0:
         signal = abs(rc)
@@ -120,3 +105,48 @@ async def run_loader_supervisor(
     if failure.exit_code is None:
         failure.exit_code = rc
     return LoaderSupervisorOutcome(ok=False, failure=failure)
+
+
+async def run_loader_supervisor(
+    spec: LoadSpec,
+    *,
+    timeout_sec: float = 90.0,
+    python_executable: str | None = None,
+    worker_module: str = "opta_lmx.runtime.child_loader_worker",
+    pool: LoaderWorkerPool | None = None,
+) -> LoaderSupervisorOutcome:
+    """Run one child loader worker call with timeout and crash classification.
+
+    When a running warm worker ``pool`` is given the spec is executed on one
+    of its pre-forked workers; otherwise a fresh worker process is spawned.
+    """
+    if pool is not None and pool.is_running:
+        return await pool.run(spec, timeout_sec=timeout_sec)
+
+    executable = python_executable or sys.executable
+    proc = await asyncio.create_subprocess_exec(
+        executable,
+        "-m",
+        worker_module,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    payload = json.dumps(spec.to_dict(), sort_keys=True).encode("utf-8")
+
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(payload), timeout=timeout_sec)
+    except TimeoutError:
+        with contextlib.suppress(ProcessLookupError):
+            proc.terminate()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=1.0)
+        except TimeoutError:
+            with contextlib.suppress(ProcessLookupError):
+                proc.kill()
+            await proc.wait()
+        return timeout_outcome(spec, timeout_sec)
+
+    rc = proc.returncode if proc.returncode is not None else 1
+    return classify_worker_exit(rc, stdout, stderr)
@@ -1,9 +1,22 @@
-"""Isolated child-process worker for backend load probing."""
+"""Isolated child-process worker for backend load probing.
+
+Runs in one of two modes:
+
+- One-shot (default): read a single JSON LoadSpec from stdin, write one
+  result line to stdout (exit 0) or one failure line to stderr (exit 1).
+- Serve (``--serve [module ...]``): used by the warm worker pool. The
+  listed modules are imported up front, a ``{"ready": true}`` line is
+  written, then each stdin line is a LoadSpec answered by one stdout line
+  ``{"ok": true, "result": ...}`` or ``{"ok": false, "failure": ...}``.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import importlib
 import json
+import os
 import sys
 from collections.abc import Awaitable, Callable, Mapping
 from typing import Any
@@ -40,11 +53,18 @@ async def _probe_gguf(spec: LoadSpec) -> dict[str, Any]:
     return {"probe": "ok", "backend": "gguf", "canary": "ok"}
 
 
+async def _probe_fake(spec: LoadSpec) -> dict[str, Any]:
+    if not spec.model_id.strip():
+        raise ValueError("model_id is required")
+    return {"probe": "ok", "backend": "fake", "canary": "ok"}
+
+
 def _default_backend_probes() -> dict[str, BackendProbe]:
     return {
         "vllm-mlx": _probe_vllm_mlx,
         "mlx-lm": _probe_mlx_lm,
         "gguf": _probe_gguf,
+        "fake": _probe_fake,
     }
 
 
@@ -97,8 +117,54 @@ def _failure_for_exception(exc: Exception) -> LoaderFailure:
     )
 
 
-def main() -> int:
+def _preload_modules(modules: list[str]) -> list[str]:
+    """Import heavy backend modules once so later jobs start warm."""
+    loaded: list[str] = []
+    for name in modules:
+        with contextlib.suppress(Exception):
+            importlib.import_module(name)
+            loaded.append(name)
+    return loaded
+
+
+def serve(preload: list[str]) -> int:
+    """Answer LoadSpec lines from stdin until EOF (warm pool mode)."""
+    # Keep the protocol stream private: anything else printing to stdout
+    # (including native libraries) is redirected to stderr.
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    loaded = _preload_modules(preload)
+    _write_json_line(protocol, {"ready": True, "pid": os.getpid(), "preloaded": loaded})
+
+    loop = asyncio.new_event_loop()
+    try:
+        for raw in sys.stdin:
+            if not raw.strip():
+                continue
+            try:
+                payload = json.loads(raw)
+                if not isinstance(payload, dict):
+                    raise ValueError("load spec payload must be a JSON object")
+                spec = LoadSpec.from_dict(payload)
+                result = loop.run_until_complete(execute_load_spec(spec))
+            except Exception as exc:
+                failure = _failure_for_exception(exc).to_dict()
+                _write_json_line(protocol, {"ok": False, "failure": failure})
+                continue
+            _write_json_line(protocol, {"ok": True, "result": result.to_dict()})
+    finally:
+        loop.close()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
     """Read one JSON LoadSpec payload from stdin and emit one JSON response line."""
+    args = sys.argv[1:] if argv is None else argv
+    if args and args[0] == "--serve":
+        return serve(list(args[1:]))
+
     raw = sys.stdin.read()
     if not raw.strip():
         _write_json_line(
@@ -0,0 +1,726 @@
+"""Engine IPC — local Unix-socket channel between HTTP front-ends and the engine process.
+
+When ``server.workers > 1`` the model-owning process keeps the inference engine,
+metrics and event bus, while N stateless uvicorn front-end processes do request
+parsing, validation and SSE formatting. Front-ends reach the engine through this
+channel:
+
+Frame layout (network byte order)::
+
+    +----------------+--------+----------------+-------------------+
+    | payload length | kind   | stream id      | payload           |
+    | uint32         | uint8  | uint32         | length bytes      |
+    +----------------+--------+----------------+-------------------+
+
+``CHUNK`` payloads are raw UTF-8 token text so streaming pays no JSON cost per
+token; every other payload is compact JSON. Stream ids multiplex concurrent
+calls over one connection per front-end.
+
+Streams are credit-based: the engine sends at most ``STREAM_WINDOW_CHUNKS``
+chunks beyond what the front-end has acknowledged with ``CREDIT`` frames
+(payload: uint32 chunk count), which it sends as its consumer reads. A slow
+client therefore pauses generation for its own stream without blocking the
+other streams sharing the connection, and a stream that receives no credit for
+``stream_idle_timeout_sec`` is treated as abandoned and its generation closed.
+
+Engine exceptions are re-raised in the front-end as the same class when it is
+one of a few the API layer maps to a status code (see ``_REMOTE_EXCEPTIONS``);
+anything else arrives as :class:`EngineIPCError`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import enum
+import json
+import logging
+import os
+import struct
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+from opta_lmx.inference.admission import AdmissionRejectedError
+from opta_lmx.inference.schema import ChatCompletionResponse, ChatMessage
+from opta_lmx.inference.types import ModelInfo, ModelRoutingStats
+from opta_lmx.monitoring.events import EventBus, ServerEvent
+from opta_lmx.monitoring.metrics import MetricsCollector, RequestMetric
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("!IBI")
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+ENGINE_IPC_SOCKET = "engine.sock"
+ENGINE_HTTP_SOCKET = "engine-http.sock"
+# State and event frames are skipped for a front-end with this much unsent data.
+BROADCAST_HIGH_WATER_BYTES = 4 * 1024 * 1024
+# Unacknowledged chunks the engine may send per stream; front-ends return
+# credit in batches of half a window.
+STREAM_WINDOW_CHUNKS = 64
+_CREDIT_BATCH = STREAM_WINDOW_CHUNKS // 2
+_CREDIT = struct.Struct("!I")
+
+
+class FrameKind(enum.IntEnum):
+    """Frame types on the engine IPC channel."""
+
+    CALL = 1  # front-end -> engine: {"method", "kwargs"}
+    RESULT = 2  # engine -> front-end: JSON result of a unary call
+    ERROR = 3  # engine -> front-end: {"error", "message"}, ends the stream id
+    CHUNK = 4  # engine -> front-end: raw UTF-8 token text
+    END = 5  # engine -> front-end: stream finished
+    CANCEL = 6  # front-end -> engine: abandon the call on this stream id
+    NOTIFY = 7  # front-end -> engine: fire-and-forget {"method", ...}
+    STATE = 8  # engine -> front-end: loaded models and routing stats snapshot
+    EVENT = 9  # engine -> front-end: EventBus event for local SSE fan-out
+    CREDIT = 10  # front-end -> engine: uint32 count of stream chunks consumed
+
+
+class EngineIPCError(RuntimeError):
+    """A call over the engine IPC channel failed or the engine is unreachable."""
+
+
+# Exception classes re-raised as themselves in the front-end. An engine error
+# is sent as its nearest class in this table (by MRO), so e.g. a RuntimeError
+# subclass still reaches the API layer's ``except RuntimeError`` handling.
+_REMOTE_EXCEPTIONS: dict[str, type[Exception]] = {
+    cls.__name__: cls
+    for cls in (
+        AdmissionRejectedError,
+        KeyError,
+        ValueError,
+        TypeError,
+        TimeoutError,
+        RuntimeError,
+    )
+}
+# Attributes of the exception copied across the IPC hop when present.
+_REMOTE_EXCEPTION_ATTRS = ("retry_after_sec", "reason")
+
+
+def engine_socket_paths(ipc_dir: Path) -> tuple[Path, Path]:
+    """Return (IPC socket, engine HTTP socket) paths inside ``ipc_dir``."""
+    ipc_dir = ipc_dir.expanduser()
+    return ipc_dir / ENGINE_IPC_SOCKET, ipc_dir / ENGINE_HTTP_SOCKET
+
+
+def encode_frame(kind: FrameKind, stream_id: int, payload: bytes) -> bytes:
+    """Encode one frame."""
+    if len(payload) > MAX_FRAME_BYTES:
+        raise EngineIPCError(f"IPC frame too large ({len(payload)} bytes)")
+    return _HEADER.pack(len(payload), kind, stream_id) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[FrameKind, int, bytes]:
+    """Read one frame; raises ``asyncio.IncompleteReadError`` on EOF."""
+    header = await reader.readexactly(_HEADER.size)
+    length, kind, stream_id = _HEADER.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise EngineIPCError(f"IPC frame too large ({length} bytes)")
+    payload = await reader.readexactly(length) if length else b""
+    return FrameKind(kind), stream_id, payload
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+# ─── Engine side ─────────────────────────────────────────────────────────────
+
+
+class _StreamCredit:
+    """Send window of one stream: chunks the front-end is ready to receive."""
+
+    def __init__(self) -> None:
+        self.available = STREAM_WINDOW_CHUNKS
+        self._granted = asyncio.Event()
+
+    def grant(self, chunks: int) -> None:
+        self.available += chunks
+        self._granted.set()
+
+    async def take(self, idle_sec: float) -> bool:
+        """Consume one chunk of credit; returns ``True`` if it had to wait.
+
+        Raises ``TimeoutError`` if no credit arrives within ``idle_sec``.
+        """
+        waited = False
+        while self.available <= 0:
+            waited = True
+            self._granted.clear()
+            await asyncio.wait_for(self._granted.wait(), idle_sec)
+        self.available -= 1
+        return waited
+
+
+class _Connection:
+    """One connected front-end process."""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.calls: dict[int, asyncio.Task[None]] = {}
+        self.credits: dict[int, _StreamCredit] = {}
+        # Set when a state snapshot was skipped, so the next one is sent even
+        # if it did not change.
+        self.state_stale = False
+
+    def send(self, kind: FrameKind, stream_id: int, payload: bytes) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(encode_frame(kind, stream_id, payload))
+
+    def send_broadcast(self, kind: FrameKind, payload: bytes) -> bool:
+        """Send a state/event frame unless the front-end is not keeping up.
+
+        Broadcasts are not awaited per connection, so a front-end that stops
+        reading would otherwise grow the write buffer without bound.
+        """
+        if self.writer.is_closing():
+            return False
+        if self.writer.transport.get_write_buffer_size() >= BROADCAST_HIGH_WATER_BYTES:
+            return False
+        self.writer.write(encode_frame(kind, 0, payload))
+        return True
+
+    async def drain(self) -> None:
+        if not self.writer.is_closing():
+            await self.writer.drain()
+
+
+class EngineIPCServer:
+    """Serves generation, state snapshots and events to front-end processes.
+
+    Args:
+        engine: The process-local InferenceEngine (or anything with the same
+            ``generate``/``stream_generate``/status methods).
+        path: Unix socket path to listen on. A stale socket file is replaced.
+        metrics: Collector that front-end request metrics are folded into, so
+            ``/admin/metrics`` on the engine reports all workers.
+        event_bus: Bus whose events are forwarded to every front-end.
+        state_interval_sec: How often loaded-model/routing state is re-sent
+            when it changed.
+        stream_idle_timeout_sec: How long a stream may wait for credit before
+            the front-end is considered gone and generation is stopped.
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        path: Path,
+        *,
+        metrics: MetricsCollector | None = None,
+        event_bus: EventBus | None = None,
+        state_interval_sec: float = 0.25,
+        stream_idle_timeout_sec: float = 60.0,
+    ) -> None:
+        self._engine = engine
+        self._path = path
+        self._metrics = metrics
+        self._event_bus = event_bus
+        self._state_interval_sec = state_interval_sec
+        self._stream_idle_timeout_sec = stream_idle_timeout_sec
+        self._server: asyncio.AbstractServer | None = None
+        self._connections: set[_Connection] = set()
+        self._tasks: list[asyncio.Task[None]] = []
+        self._last_state: bytes = b""
+        self._calls_total = 0
+        self._streams_active = 0
+        self._events_forwarded_total = 0
+        self._metrics_forwarded_total = 0
+        self._broadcasts_dropped_total = 0
+        self._stream_credit_waits_total = 0
+        self._streams_abandoned_total = 0
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    async def start(self) -> None:
+        """Bind the socket and start the state and event broadcasters."""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            self._path.unlink()
+        self._server = await asyncio.start_unix_server(
+            self._handle_connection,
+            path=str(self._path),
+            limit=MAX_FRAME_BYTES,
+        )
+        os.chmod(self._path, 0o600)
+        self._tasks.append(asyncio.create_task(self._state_loop(), name="engine-ipc-state"))
+        if self._event_bus is not None:
+            self._tasks.append(asyncio.create_task(self._event_loop(), name="engine-ipc-events"))
+        logger.info("engine_ipc_started", extra={"path": str(self._path)})
+
+    async def close(self) -> None:
+        """Stop accepting, cancel in-flight calls and remove the socket."""
+        if self._server is not None:
+            self._server.close()
+        for task in self._tasks:
+            task.cancel()
+        for conn in list(self._connections):
+            for call in conn.calls.values():
+                call.cancel()
+            conn.writer.close()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks.clear()
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+        with contextlib.suppress(FileNotFoundError):
+            self._path.unlink()
+
+    def stats(self) -> dict[str, float | int]:
+        """Connection and traffic counters for the metrics collector."""
+        return {
+            "frontends_connected": len(self._connections),
+            "calls_total": self._calls_total,
+            "streams_active": self._streams_active,
+            "events_forwarded_total": self._events_forwarded_total,
+            "metrics_forwarded_total": self._metrics_forwarded_total,
+            "broadcasts_dropped_total": self._broadcasts_dropped_total,
+            "stream_credit_waits_total": self._stream_credit_waits_total,
+            "streams_abandoned_total": self._streams_abandoned_total,
+        }
+
+    async def _handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        conn = _Connection(writer)
+        self._connections.add(conn)
+        conn.send(FrameKind.STATE, 0, self._state_payload())
+        try:
+            while True:
+                kind, stream_id, payload = await read_frame(reader)
+                if kind == FrameKind.CALL:
+                    conn.calls[stream_id] = asyncio.create_task(
+                        self._serve_call(conn, stream_id, payload)
+                    )
+                elif kind == FrameKind.CANCEL:
+                    call = conn.calls.get(stream_id)
+                    if call is not None:
+                        call.cancel()
+                elif kind == FrameKind.CREDIT:
+                    credit = conn.credits.get(stream_id)
+                    if credit is not None and len(payload) == _CREDIT.size:
+                        credit.grant(_CREDIT.unpack(payload)[0])
+                elif kind == FrameKind.NOTIFY:
+                    self._handle_notify(payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except EngineIPCError as exc:
+            logger.warning("engine_ipc_bad_frame", extra={"error": str(exc)})
+        finally:
+            self._connections.discard(conn)
+            for call in conn.calls.values():
+                call.cancel()
+            writer.close()
+
+    async def _serve_call(self, conn: _Connection, stream_id: int, payload: bytes) -> None:
+        self._calls_total += 1
+        try:
+            request = json.loads(payload)
+            method = request.get("method")
+            kwargs = dict(request.get("kwargs") or {})
+            if "messages" in kwargs:
+                kwargs["messages"] = [ChatMessage.model_validate(m) for m in kwargs["messages"]]
+            if method == "generate":
+                response = await self._engine.generate(**kwargs)
+                conn.send(FrameKind.RESULT, stream_id, _dumps(response.model_dump(mode="json")))
+            elif method == "stream_generate":
+                await self._serve_stream(conn, stream_id, kwargs)
+                conn.send(FrameKind.END, stream_id, b"")
+            else:
+                raise EngineIPCError(f"Unknown engine IPC method: {method!r}")
+            await conn.drain()
+        except asyncio.CancelledError:
+            pass
+        except Exception as exc:
+            conn.send(FrameKind.ERROR, stream_id, _dumps(_error_payload(exc)))
+            with contextlib.suppress(ConnectionError):
+                await conn.drain()
+        finally:
+            conn.calls.pop(stream_id, None)
+
+    async def _serve_stream(
+        self, conn: _Connection, stream_id: int, kwargs: dict[str, Any]
+    ) -> None:
+        credit = conn.credits[stream_id] = _StreamCredit()
+        self._streams_active += 1
+        # aclosing: a cancelled or stalled stream is suspended at a yield, and
+        # only closing it stops generation and releases the engine slot.
+        try:
+            async with contextlib.aclosing(self._engine.stream_generate(**kwargs)) as tokens:
+                async for token in tokens:
+                    try:
+                        if await credit.take(self._stream_idle_timeout_sec):
+                            self._stream_credit_waits_total += 1
+                    except TimeoutError:
+                        self._streams_abandoned_total += 1
+                        logger.warning(
+                            "engine_ipc_stream_abandoned",
+                            extra={
+                                "stream_id": stream_id,
+                                "idle_sec": self._stream_idle_timeout_sec,
+                            },
+                        )
+                        raise TimeoutError("Front-end stopped reading the stream") from None
+                    conn.send(FrameKind.CHUNK, stream_id, token.encode())
+                    await conn.drain()
+        finally:
+            self._streams_active -= 1
+            conn.credits.pop(stream_id, None)
+
+    def _handle_notify(self, payload: bytes) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get("method") == "record_metric" and self._metrics is not None:
+            try:
+                self._metrics.record(RequestMetric(**message["metric"]))
+            except (KeyError, TypeError):
+                logger.debug("engine_ipc_bad_metric")
+                return
+            self._metrics_forwarded_total += 1
+
+    def _state_payload(self) -> bytes:
+        models = self._engine.get_loaded_models()
+        model_ids = [m.model_id for m in models]
+        stats_provider = getattr(self._engine, "get_model_routing_stats", None)
+        routing: dict[str, Any] = {}
+        if callable(stats_provider):
+            routing = {
+                model_id: dataclasses.asdict(stats)
+                for model_id, stats in stats_provider(model_ids).items()
+            }
+        return _dumps(
+            {
+                "models": [dataclasses.asdict(m) for m in models],
+                "routing_stats": routing,
+            }
+        )
+
+    async def _state_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._state_interval_sec)
+            if not self._connections:
+                continue
+            try:
+                payload = self._state_payload()
+            except Exception:
+                logger.debug("engine_ipc_state_failed", exc_info=True)
+                continue
+            changed = payload != self._last_state
+            self._last_state = payload
+            for conn in list(self._connections):
+                if not changed and not conn.state_stale:
+                    continue
+                conn.state_stale = not conn.send_broadcast(FrameKind.STATE, payload)
+                if conn.state_stale:
+                    self._broadcasts_dropped_total += 1
+
+    async def _event_loop(self) -> None:
+        assert self._event_bus is not None
+        while True:
+            queue = self._event_bus.subscribe()
+            try:
+                while True:
+                    try:
+                        event = await asyncio.wait_for(queue.get(), timeout=5.0)
+                    except TimeoutError:
+                        # EventBus silently drops full subscribers; resubscribe if that happened.
+                        if not self._event_bus.is_subscribed(queue):
+                            break
+                        continue
+                    payload = _dumps(
+                        {
+                            "event_type": event.event_type,
+                            "data": event.data,
+                            "timestamp": event.timestamp,
+                            "seq": event.seq,
+                        }
+                    )
+                    for conn in list(self._connections):
+                        if not conn.send_broadcast(FrameKind.EVENT, payload):
+                            self._broadcasts_dropped_total += 1
+                    self._events_forwarded_total += 1
+            finally:
+                self._event_bus.unsubscribe(queue)
+
+
+# ─── Front-end side ──────────────────────────────────────────────────────────
+
+
+class RemoteEngine:
+    """Engine stand-in for front-end processes, backed by the IPC channel.
+
+    Implements the subset of ``InferenceEngine`` used by the inference routes.
+    Status lookups (``get_loaded_models``, ``is_model_loaded``, routing stats)
+    are answered synchronously from the last state snapshot the engine pushed.
+
+    Args:
+        path: Engine IPC socket path.
+        event_bus: Local bus that engine events are republished on, so SSE
+            subscribers are fanned out per front-end instead of per client.
+        connect_timeout_sec: How long :meth:`connect` waits for the engine
+            process to come up; ``None`` waits indefinitely (the engine may be
+            auto-loading models).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        event_bus: EventBus | None = None,
+        connect_timeout_sec: float | None = None,
+        reconnect_delay_sec: float = 0.5,
+    ) -> None:
+        self._path = path
+        self._event_bus = event_bus
+        self._connect_timeout_sec = connect_timeout_sec
+        self._reconnect_delay_sec = reconnect_delay_sec
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task[None] | None = None
+        # Per-call inboxes; stream chunks in them are bounded by the credit window.
+        self._pending: dict[int, asyncio.Queue[tuple[FrameKind, bytes]]] = {}
+        self._next_stream_id = 1
+        self._models: list[ModelInfo] = []
+        self._routing_stats: dict[str, ModelRoutingStats] = {}
+        self._state_received = asyncio.Event()
+        self._closed = False
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> None:
+        """Connect (retrying until the engine is up) and wait for the first state."""
+        loop = asyncio.get_running_loop()
+        deadline = (
+            loop.time() + self._connect_timeout_sec
+            if self._connect_timeout_sec is not None
+            else None
+        )
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(
+                    str(self._path),
+                    limit=MAX_FRAME_BYTES,
+                )
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if deadline is not None and loop.time() >= deadline:
+                    raise EngineIPCError(f"Engine process not reachable at {self._path}") from None
+                await asyncio.sleep(self._reconnect_delay_sec)
+        self._writer = writer
+        self._reader_task = asyncio.create_task(self._read_loop(reader), name="engine-ipc-reader")
+        await asyncio.wait_for(self._state_received.wait(), timeout=self._connect_timeout_sec)
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._writer is not None:
+            self._writer.close()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader_task
+
+    # ── Status (served from the pushed snapshot) ──
+
+    def get_loaded_models(self) -> list[ModelInfo]:
+        return list(self._models)
+
+    def get_loaded_model_ids(self) -> list[str]:
+        return [m.model_id for m in self._models]
+
+    def is_model_loaded(self, model_id: str) -> bool:
+        return any(m.model_id == model_id for m in self._models)
+
+    def get_model_routing_stats(
+        self,
+        model_ids: list[str] | None = None,
+    ) -> dict[str, ModelRoutingStats]:
+        if model_ids is None:
+            return dict(self._routing_stats)
+        return {mid: self._routing_stats[mid] for mid in model_ids if mid in self._routing_stats}
+
+    # ── Generation ──
+
+    async def generate(self, model_id: str, messages: list[ChatMessage], **kwargs: Any) -> Any:
+        """Non-streaming generation in the engine process."""
+        stream_id, queue = self._call("generate", model_id, messages, kwargs)
+        try:
+            kind, payload = await queue.get()
+        except asyncio.CancelledError:
+            self._send(FrameKind.CANCEL, stream_id, b"")
+            raise
+        finally:
+            self._pending.pop(stream_id, None)
+        if kind == FrameKind.ERROR:
+            raise _remote_error(payload)
+        return ChatCompletionResponse.model_validate_json(payload)
+
+    async def stream_generate(
+        self,
+        model_id: str,
+        messages: list[ChatMessage],
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        """Streaming generation; yields token strings as the engine produces them.
+
+        Credit is returned as tokens are consumed, so the engine never runs
+        more than ``STREAM_WINDOW_CHUNKS`` ahead of this iterator's reader.
+        """
+        stream_id, queue = self._call("stream_generate", model_id, messages, kwargs)
+        finished = False
+        consumed = 0
+        try:
+            while True:
+                kind, payload = await queue.get()
+                if kind == FrameKind.CHUNK:
+                    yield payload.decode()
+                    consumed += 1
+                    if consumed >= _CREDIT_BATCH:
+                        self._send(FrameKind.CREDIT, stream_id, _CREDIT.pack(consumed))
+                        consumed = 0
+                elif kind == FrameKind.END:
+                    finished = True
+                    return
+                else:
+                    finished = True
+                    raise _remote_error(payload)
+        finally:
+            self._pending.pop(stream_id, None)
+            if not finished:
+                # Client went away mid-stream: stop generation in the engine too.
+                self._send(FrameKind.CANCEL, stream_id, b"")
+
+    def record_metric(self, metric: RequestMetric) -> None:
+        """Forward a request metric for aggregation in the engine process."""
+        self._send(
+            FrameKind.NOTIFY,
+            0,
+            _dumps({"method": "record_metric", "metric": dataclasses.asdict(metric)}),
+        )
+
+    # ── Plumbing ──
+
+    def _call(
+        self,
+        method: str,
+        model_id: str,
+        messages: list[ChatMessage],
+        kwargs: dict[str, Any],
+    ) -> tuple[int, asyncio.Queue[tuple[FrameKind, bytes]]]:
+        if not self.connected:
+            raise EngineIPCError("Engine process unavailable")
+        stream_id = self._next_stream_id
+        self._next_stream_id = (self._next_stream_id % 0xFFFFFFFF) + 1
+        queue: asyncio.Queue[tuple[FrameKind, bytes]] = asyncio.Queue()
+        self._pending[stream_id] = queue
+        call_kwargs = {
+            **kwargs,
+            "model_id": model_id,
+            "messages": [m.model_dump(mode="json", exclude_none=True) for m in messages],
+        }
+        self._send(FrameKind.CALL, stream_id, _dumps({"method": method, "kwargs": call_kwargs}))
+        return stream_id, queue
+
+    def _send(self, kind: FrameKind, stream_id: int, payload: bytes) -> None:
+        if self._writer is not None and not self._writer.is_closing():
+            self._writer.write(encode_frame(kind, stream_id, payload))
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                kind, stream_id, payload = await read_frame(reader)
+                if kind == FrameKind.STATE:
+                    self._apply_state(payload)
+                elif kind == FrameKind.EVENT:
+                    await self._republish(payload)
+                else:
+                    queue = self._pending.get(stream_id)
+                    if queue is not None:
+                        queue.put_nowait((kind, payload))
+        except (asyncio.IncompleteReadError, ConnectionError, EngineIPCError):
+            pass
+        finally:
+            self._writer = None
+            lost = _dumps({"error": "EngineIPCError", "message": "Engine connection lost"})
+            for queue in self._pending.values():
+                queue.put_nowait((FrameKind.ERROR, lost))
+            if not self._closed:
+                asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        logger.warning("engine_ipc_disconnected", extra={"path": str(self._path)})
+        self._state_received.clear()
+        try:
+            await self.connect()
+        except (EngineIPCError, TimeoutError):
+            logger.error("engine_ipc_reconnect_failed", extra={"path": str(self._path)})
+            return
+        logger.info("engine_ipc_reconnected", extra={"path": str(self._path)})
+
+    def _apply_state(self, payload: bytes) -> None:
+        state = json.loads(payload)
+        self._models = [ModelInfo(**m) for m in state.get("models", [])]
+        self._routing_stats = {
+            model_id: ModelRoutingStats(**stats)
+            for model_id, stats in state.get("routing_stats", {}).items()
+        }
+        self._state_received.set()
+
+    async def _republish(self, payload: bytes) -> None:
+        if self._event_bus is None:
+            return
+        event = json.loads(payload)
+        await self._event_bus.publish(
+            ServerEvent(
+                event_type=event["event_type"],
+                data=event["data"],
+                timestamp=event["timestamp"],
+            ),
+            seq=event.get("seq"),
+        )
+
+
+def _error_payload(exc: Exception) -> dict[str, Any]:
+    """ERROR frame body: the nearest re-raisable class, message and known attributes."""
+    name = next(
+        (cls.__name__ for cls in type(exc).__mro__ if cls.__name__ in _REMOTE_EXCEPTIONS),
+        EngineIPCError.__name__,
+    )
+    # KeyError's str() adds quotes; send the argument itself so it round-trips.
+    single_str = len(exc.args) == 1 and isinstance(exc.args[0], str)
+    message = exc.args[0] if single_str else str(exc)
+    error: dict[str, Any] = {"error": name, "message": message}
+    for attr in _REMOTE_EXCEPTION_ATTRS:
+        value = getattr(exc, attr, None)
+        if isinstance(value, int | float | str):
+            error[attr] = value
+    return error
+
+
+def _remote_error(payload: bytes) -> Exception:
+    """Rebuild the engine's exception from an ERROR frame."""
+    try:
+        error = json.loads(payload)
+        message = error.get("message", "")
+    except ValueError:
+        error = {}
+        message = payload.decode(errors="replace")
+    cls = _REMOTE_EXCEPTIONS.get(error.get("error", ""), EngineIPCError)
+    # Constructors differ (AdmissionRejectedError takes three arguments), so
+    # build the instance directly and restore its message and attributes.
+    exc = cls.__new__(cls)
+    exc.args = (message or "Engine call failed",)
+    for attr in _REMOTE_EXCEPTION_ATTRS:
+        if attr in error:
+            setattr(exc, attr, error[attr])
+    return exc
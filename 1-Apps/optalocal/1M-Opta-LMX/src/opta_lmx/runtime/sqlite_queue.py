@@ -0,0 +1,312 @@
+"""Shared plumbing for the SQLite-backed run and skill queues.
+
+- :func:`connect_queue_db` opens the one long-lived, WAL-tuned connection a
+  queue uses for all of its statements (serialized by the queue's lock).
+- :class:`QueueWakeup` wakes idle workers as soon as a job is enqueued
+  instead of leaving them to poll. In-process waiters share an
+  ``asyncio.Condition``; other processes using the same queue database
+  (multi-worker deployments) are signalled with a datagram on a per-process
+  Unix socket in a directory derived from the database path. Workers still
+  re-check the queue after ``max_wait`` as a safety net (e.g. when the
+  socket directory is unusable).
+- :class:`ClaimLease` records which queue instance claimed a row and until
+  when, so recovery only requeues rows that instance owns or whose owner
+  stopped renewing its lease (crashed), never rows a live peer is running.
+- :class:`LatencyWindow` keeps recent enqueue-to-start latencies for the
+  queues' ``stats()``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import itertools
+import logging
+import math
+import os
+import socket
+import sqlite3
+import tempfile
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_SOCKET_IDS = itertools.count()
+
+
+def connect_queue_db(path: Path) -> sqlite3.Connection:
+    """Open a persistent queue connection tuned for concurrent WAL access.
+
+    ``synchronous=NORMAL`` keeps commits durable across process crashes
+    (only a power loss can drop the last few), which suits a work queue.
+    The connection may be used from worker threads; callers serialize it.
+    """
+    con = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+    con.execute("PRAGMA journal_mode=WAL;")
+    con.execute("PRAGMA synchronous=NORMAL;")
+    con.execute("PRAGMA temp_store=MEMORY;")
+    con.execute("PRAGMA busy_timeout=5000;")
+    return con
+
+
+class QueueWakeup:
+    """Wake queue workers on enqueue, in this process and in its peers.
+
+    Args:
+        channel: Identifies the queue; processes using the same channel
+            (the database path) signal each other.
+        cross_process: Also signal/listen for other processes.
+    """
+
+    def __init__(self, channel: str, *, cross_process: bool = True) -> None:
+        digest = hashlib.sha1(channel.encode("utf-8")).hexdigest()[:10]
+        # Short path: AF_UNIX socket paths are limited to ~104 bytes on macOS.
+        self._socket_dir = Path(tempfile.gettempdir()) / f"olmx-{digest}"
+        self._cross_process = cross_process and hasattr(socket, "AF_UNIX")
+        self._generation = 0
+        self._condition: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._sock: socket.socket | None = None
+        self._sock_path: Path | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+        self._notifications_total = 0
+        self._peer_signals_sent_total = 0
+        self._peer_signals_received_total = 0
+        self._idle_timeouts_total = 0
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every wakeup; pass it to :meth:`wait`."""
+        return self._generation
+
+    def open(self) -> None:
+        """Bind to the running loop and start listening for peer signals."""
+        if self._condition is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._condition = asyncio.Condition()
+        if not self._cross_process:
+            return
+        path = self._socket_dir / f"{os.getpid()}.{next(_SOCKET_IDS)}.s"
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            self._socket_dir.mkdir(mode=0o700, exist_ok=True)
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+            sock.bind(str(path))
+            sock.setblocking(False)
+            self._loop.add_reader(sock.fileno(), self._on_peer_signal)
+        except OSError as exc:
+            sock.close()
+            logger.warning(
+                "queue_wakeup_cross_process_disabled",
+                extra={"path": str(path), "error": str(exc)},
+            )
+            return
+        self._sock = sock
+        self._sock_path = path
+
+    def close(self) -> None:
+        """Stop listening and remove this process's socket."""
+        if self._sock is not None and self._loop is not None:
+            with contextlib.suppress(Exception):
+                self._loop.remove_reader(self._sock.fileno())
+            self._sock.close()
+        if self._sock_path is not None:
+            with contextlib.suppress(OSError):
+                self._sock_path.unlink()
+        for task in self._tasks:
+            task.cancel()
+        self._sock = None
+        self._sock_path = None
+        self._condition = None
+        self._loop = None
+
+    async def notify(self) -> None:
+        """Wake local waiters and signal peer processes that work is queued."""
+        self._notifications_total += 1
+        await self.wake_local()
+        if self._sock is not None:
+            self._signal_peers()
+
+    async def wake_local(self) -> None:
+        """Wake waiters in this process only."""
+        condition = self._condition
+        self._generation += 1
+        if condition is None:
+            return
+        async with condition:
+            condition.notify_all()
+
+    async def wait(self, seen: int, *, max_wait: float) -> bool:
+        """Wait until the generation moves past ``seen`` or ``max_wait`` seconds elapse.
+
+        Returns:
+            True if woken, False on timeout.
+        """
+        condition = self._condition
+        if condition is None:
+            await asyncio.sleep(max_wait)
+            return False
+        async with condition:
+            try:
+                await asyncio.wait_for(
+                    condition.wait_for(lambda: self._generation != seen), max_wait
+                )
+            except TimeoutError:
+                self._idle_timeouts_total += 1
+                return False
+        return True
+
+    def _signal_peers(self) -> None:
+        assert self._sock is not None
+        try:
+            peers = list(self._socket_dir.glob("*.s"))
+        except OSError:
+            return
+        for peer in peers:
+            if peer == self._sock_path:
+                continue
+            try:
+                self._sock.sendto(b"\x01", str(peer))
+                self._peer_signals_sent_total += 1
+            except BlockingIOError:
+                pass  # Peer already has wakeups pending.
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Left behind by a process that exited without cleaning up.
+                with contextlib.suppress(OSError):
+                    peer.unlink()
+            except OSError:
+                pass
+
+    def _on_peer_signal(self) -> None:
+        assert self._sock is not None and self._loop is not None
+        received = 0
+        with contextlib.suppress(BlockingIOError, OSError):
+            while self._sock.recv(64):
+                received += 1
+        if not received:
+            return
+        self._peer_signals_received_total += received
+        task = self._loop.create_task(self.wake_local())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self) -> dict[str, int]:
+        """Wakeup counters for queue ``stats()``."""
+        return {
+            "cross_process": int(self._sock is not None),
+            "notifications_total": self._notifications_total,
+            "peer_signals_sent_total": self._peer_signals_sent_total,
+            "peer_signals_received_total": self._peer_signals_received_total,
+            "idle_timeouts_total": self._idle_timeouts_total,
+        }
+
+
+class ClaimLease:
+    """Owner id and renewable lease for the rows one queue instance claims.
+
+    Claimed rows carry ``owner`` and ``lease_until`` columns. The owning
+    queue calls :meth:`renew` every :attr:`renew_interval_sec` while it runs;
+    a row whose lease has lapsed belongs to a process that died and may be
+    reclaimed by any peer. Rows from before these columns existed have no
+    owner and count as expired.
+
+    Args:
+        table: Queue table name (an internal constant, not user input).
+        lease_sec: How long a claim stays valid without renewal.
+    """
+
+    def __init__(self, table: str, *, lease_sec: float = 60.0) -> None:
+        if lease_sec <= 0:
+            raise ValueError("lease_sec must be > 0")
+        self._table = table
+        self.lease_sec = lease_sec
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._renewals_total = 0
+        self._reclaimed_total = 0
+
+    @property
+    def renew_interval_sec(self) -> float:
+        """Renewal period; a third of the lease tolerates two missed renewals."""
+        return self.lease_sec / 3
+
+    def ensure_columns(self, con: sqlite3.Connection) -> None:
+        """Add the ``owner``/``lease_until`` columns to a pre-existing table."""
+        columns = {row[1] for row in con.execute(f"PRAGMA table_info({self._table})")}
+        if "owner" not in columns:
+            con.execute(f"ALTER TABLE {self._table} ADD COLUMN owner TEXT")
+        if "lease_until" not in columns:
+            con.execute(f"ALTER TABLE {self._table} ADD COLUMN lease_until REAL")
+
+    def claim_values(self) -> tuple[str, float]:
+        """``(owner, lease_until)`` to store on rows being claimed now."""
+        return self.owner, time.time() + self.lease_sec
+
+    def renew(self, con: sqlite3.Connection) -> int:
+        """Extend the lease on every row this instance holds; returns the row count."""
+        renewed = con.execute(
+            f"UPDATE {self._table} SET lease_until=? WHERE status='running' AND owner=?",
+            (time.time() + self.lease_sec, self.owner),
+        ).rowcount
+        self._renewals_total += 1
+        return renewed
+
+    def reclaim(self, con: sqlite3.Connection, *, own: bool) -> int:
+        """Requeue running rows whose lease lapsed, plus this instance's own if ``own``.
+
+        Returns:
+            Number of rows requeued.
+        """
+        reclaimed = con.execute(
+            f"""
+            UPDATE {self._table}
+            SET status='queued', claimed_at=NULL, owner=NULL, lease_until=NULL
+            WHERE status='running'
+              AND (owner IS NULL OR lease_until IS NULL OR lease_until < ? OR owner=?)
+            """,
+            (time.time(), self.owner if own else None),
+        ).rowcount
+        self._reclaimed_total += reclaimed
+        return reclaimed
+
+    def stats(self) -> dict[str, int]:
+        """Lease renewal and reclaim counters for queue ``stats()``."""
+        return {
+            "lease_renewals_total": self._renewals_total,
+            "lease_reclaimed_total": self._reclaimed_total,
+        }
+
+
+class LatencyWindow:
+    """Rolling window of recent latencies with nearest-rank percentiles."""
+
+    def __init__(self, size: int = 1024) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self._count = 0
+
+    def observe(self, seconds: float) -> None:
+        """Record one latency sample (negative clock skew is clamped to 0)."""
+        self._samples.append(max(0.0, seconds))
+        self._count += 1
+
+    def snapshot(self, prefix: str) -> dict[str, float | int]:
+        """``{prefix}_p50_ms``, ``{prefix}_p99_ms`` and ``{prefix}_count``."""
+        ordered = sorted(self._samples)
+        n = len(ordered)
+
+        def _rank(p: float) -> float:
+            if not n:
+                return 0.0
+            return round(ordered[min(n - 1, max(0, math.ceil(p / 100 * n) - 1))] * 1000, 3)
+
+        return {
+            f"{prefix}_p50_ms": _rank(50),
+            f"{prefix}_p99_ms": _rank(99),
+            f"{prefix}_count": self._count,
+        }
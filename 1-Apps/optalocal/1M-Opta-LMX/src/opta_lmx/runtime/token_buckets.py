@@ -0,0 +1,210 @@
+"""Token buckets shared by every worker process on a host.
+
+Buckets live in a small fixed-size table in a memory-mapped file (one per
+deployment, next to the engine IPC sockets), so all uvicorn front-ends
+enforce one budget per principal. A check is a hash, an ``flock`` round
+trip and a handful of ``struct`` reads/writes on the mapping — a few
+microseconds, with no I/O on the hot path.
+
+Table layout: a 16-byte header (magic, slot count) followed by slots of
+``(key hash, tokens, updated_at)``. Keys are found by linear probing over a
+short window; when the window is full the least recently touched slot is
+reused, which at worst hands that principal a fresh (full) bucket.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"OLMXTB01"
+_HEADER = struct.Struct("<8sI4x")
+_SLOT = struct.Struct("<Qdd")
+_PROBE_WINDOW = 16
+
+
+@functools.lru_cache(maxsize=4096)
+def _key_hash(key: str) -> int:
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1  # 0 marks an empty slot
+
+
+class SharedTokenBuckets:
+    """Token buckets keyed by principal, optionally shared across processes.
+
+    Args:
+        path: Backing file shared by cooperating processes. None keeps the
+            table in anonymous memory (this process only).
+        slots: Table size; bounds the number of concurrently tracked keys.
+        clock: Wall clock (comparable across processes), injectable for tests.
+    """
+
+    def __init__(
+        self,
+        path: Path | None,
+        *,
+        slots: int = 4096,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._slots = max(_PROBE_WINDOW, slots)
+        self._size = _HEADER.size + self._slots * _SLOT.size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._fd: int | None = None
+
+        self._allowed_total = 0
+        self._throttled_total = 0
+        self._refunded_tokens_total = 0
+        self._evictions_total = 0
+
+        if path is not None and fcntl is not None:
+            try:
+                self._map = self._open_shared(path)
+                return
+            except OSError as exc:
+                logger.warning(
+                    "token_buckets_shared_disabled",
+                    extra={"path": str(path), "error": str(exc)},
+                )
+        self._map = mmap.mmap(-1, self._size)
+        _HEADER.pack_into(self._map, 0, _MAGIC, self._slots)
+
+    def _open_shared(self, path: Path) -> mmap.mmap:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                header_ok = False
+                if os.fstat(fd).st_size == self._size:
+                    magic, slots = _HEADER.unpack(os.pread(fd, _HEADER.size, 0))
+                    header_ok = magic == _MAGIC and slots == self._slots
+                if not header_ok:
+                    # New file or one sized for a different table: start empty.
+                    os.ftruncate(fd, 0)
+                    os.ftruncate(fd, self._size)
+                    os.pwrite(fd, _HEADER.pack(_MAGIC, self._slots), 0)
+                mapping = mmap.mmap(fd, self._size)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        except OSError:
+            os.close(fd)
+            raise
+        self._fd = fd
+        return mapping
+
+    @property
+    def shared(self) -> bool:
+        """Whether the table is shared with other processes through a file."""
+        return self._fd is not None
+
+    def close(self) -> None:
+        """Unmap the table and close the backing file."""
+        with contextlib.suppress(BufferError, ValueError):
+            self._map.close()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def try_acquire(
+        self, key: str, cost: float, *, capacity: float, refill_per_sec: float
+    ) -> float:
+        """Take ``cost`` tokens from ``key``'s bucket.
+
+        Costs above ``capacity`` are clamped to it, so an oversized request
+        still runs once the bucket is full.
+
+        Returns:
+            0.0 if the tokens were taken, otherwise seconds until enough
+            tokens will have refilled (nothing is taken).
+        """
+        cost = min(max(0.0, cost), capacity)
+        with self._locked():
+            offset, tokens = self._load(key, capacity, refill_per_sec)
+            if tokens >= cost:
+                self._store(offset, key, tokens - cost)
+                self._allowed_total += 1
+                return 0.0
+            self._store(offset, key, tokens)
+            self._throttled_total += 1
+        if refill_per_sec <= 0:
+            return float("inf")
+        return (cost - tokens) / refill_per_sec
+
+    def refund(self, key: str, tokens: float, *, capacity: float, refill_per_sec: float) -> None:
+        """Return unused tokens to ``key``'s bucket (capped at ``capacity``)."""
+        if tokens <= 0:
+            return
+        with self._locked():
+            offset, current = self._load(key, capacity, refill_per_sec)
+            self._store(offset, key, min(capacity, current + tokens))
+        self._refunded_tokens_total += int(tokens)
+
+    def available(self, key: str, *, capacity: float, refill_per_sec: float) -> float:
+        """Tokens currently in ``key``'s bucket (after refill)."""
+        with self._locked():
+            _, tokens = self._load(key, capacity, refill_per_sec)
+        return tokens
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock:
+            if self._fd is None:
+                yield
+                return
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _load(self, key: str, capacity: float, refill_per_sec: float) -> tuple[int, float]:
+        """Find (or claim) the slot for ``key``; returns its offset and refilled tokens."""
+        wanted = _key_hash(key)
+        start = wanted % self._slots
+        now = self._clock()
+        victim_offset = -1
+        victim_updated = float("inf")
+        for i in range(_PROBE_WINDOW):
+            offset = _HEADER.size + ((start + i) % self._slots) * _SLOT.size
+            slot_hash, tokens, updated_at = _SLOT.unpack_from(self._map, offset)
+            if slot_hash == wanted:
+                elapsed = max(0.0, now - updated_at)
+                return offset, min(capacity, tokens + elapsed * refill_per_sec)
+            if slot_hash == 0:
+                # Slots are never emptied, so the key is not further along.
+                return offset, capacity
+            if updated_at < victim_updated:
+                victim_offset, victim_updated = offset, updated_at
+        self._evictions_total += 1
+        return victim_offset, capacity
+
+    def _store(self, offset: int, key: str, tokens: float) -> None:
+        _SLOT.pack_into(self._map, offset, _key_hash(key), tokens, self._clock())
+
+    def stats(self) -> dict[str, int]:
+        """Admission and refund counts for this process, plus whether the table is shared."""
+        return {
+            "shared": int(self.shared),
+            "slots": self._slots,
+            "allowed_total": self._allowed_total,
+            "throttled_total": self._throttled_total,
+            "refunded_tokens_total": self._refunded_tokens_total,
+            "evictions_total": self._evictions_total,
+        }
@@ -1,15 +1,33 @@
-"""Supabase JWT verification helpers with conservative dependency handling."""
+"""Supabase JWT verification helpers with conservative dependency handling.
+
+Verified tokens are remembered in a bounded LRU keyed by token hash until
+their ``exp`` claim, so repeat requests from the same client skip signature
+verification. The JWKS can be kept fresh by a background asyncio task that
+refreshes ahead of the cache TTL; request-path fetches only happen for an
+unknown ``kid`` (rate limited) or when no refresher is running. Refreshes
+are single-flighted across threads and tasks.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import hashlib
 import importlib
 import json
+import logging
 import threading
 import time
 import urllib.request
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any, Protocol
 
+logger = logging.getLogger(__name__)
+
+# Unknown kids remembered for forced-refresh rate limiting.
+_UNKNOWN_KID_CACHE_SIZE = 256
+
 
 @dataclass(frozen=True, slots=True)
 class JWTVerificationResult:
@@ -39,6 +57,9 @@ class SupabaseJWTVerifier:
         user_id_claim: str = "sub",
         cache_ttl_sec: float = 300.0,
         request_timeout_sec: float = 5.0,
+        token_cache_size: int = 1024,
+        refresh_ahead_ratio: float = 0.8,
+        min_forced_refresh_interval_sec: float = 10.0,
     ) -> None:
         self.issuer = issuer
         self.audience = audience
@@ -46,10 +67,32 @@ class SupabaseJWTVerifier:
         self.user_id_claim = user_id_claim
         self.cache_ttl_sec = cache_ttl_sec
         self.request_timeout_sec = request_timeout_sec
+        self.token_cache_size = max(0, token_cache_size)
+        self.refresh_ahead_ratio = min(max(refresh_ahead_ratio, 0.1), 1.0)
+        self.min_forced_refresh_interval_sec = min_forced_refresh_interval_sec
         self._jwks_by_kid: dict[str, dict[str, Any]] = {}
         self._jwks_cached_at = 0.0
         self._cache_lock = threading.Lock()
 
+        # Single-flight JWKS refresh: a caller that waited on the lock while
+        # another refresh completed reuses that result instead of refetching.
+        self._refresh_lock = threading.Lock()
+        self._jwks_generation = 0
+        # kid -> monotonic time a forced refresh last failed to find it.
+        self._unknown_kids: OrderedDict[str, float] = OrderedDict()
+        self._async_refresh: asyncio.Task[None] | None = None
+        self._refresher_task: asyncio.Task[None] | None = None
+
+        # token sha256 -> (result, kid, expires_at wall time)
+        self._token_cache: OrderedDict[str, tuple[JWTVerificationResult, str, float]] = (
+            OrderedDict()
+        )
+        self._token_lock = threading.Lock()
+        self._token_hits = 0
+        self._token_misses = 0
+        self._jwks_refreshes = 0
+        self._jwks_refresh_failures = 0
+
     def verify(self, token: str) -> JWTVerificationResult:
         """Verify JWT signature/claims and return resolved user id claim."""
         token_value = token.strip()
@@ -58,6 +101,11 @@ class SupabaseJWTVerifier:
         if not self.jwks_url:
             return JWTVerificationResult(valid=False, error="missing_jwks_url")
 
+        token_key = hashlib.sha256(token_value.encode("utf-8")).hexdigest()
+        cached = self._cached_result(token_key)
+        if cached is not None:
+            return cached
+
         jwt_module = self._load_pyjwt()
         if jwt_module is None:
             # Conservative fallback: do not accept unverifiable tokens.
@@ -73,8 +121,9 @@ class SupabaseJWTVerifier:
             return JWTVerificationResult(valid=False, error="missing_kid")
 
         jwk = self._get_jwk_for_kid(kid)
-        if jwk is None:
+        if jwk is None and self._may_force_refresh(kid):
             jwk = self._get_jwk_for_kid(kid, force_refresh=True)
+            self._record_forced_lookup(kid, found=jwk is not None)
         if jwk is None:
             return JWTVerificationResult(valid=False, error="unknown_kid")
 
@@ -110,7 +159,162 @@ class SupabaseJWTVerifier:
         if not user_id:
             return JWTVerificationResult(valid=False, error="empty_user_id_claim")
 
-        return JWTVerificationResult(valid=True, user_id=user_id)
+        result = JWTVerificationResult(valid=True, user_id=user_id)
+        self._remember_result(token_key, result, kid, claims.get("exp"))
+        return result
+
+    # ── Verified-token cache ──────────────────────────────────────────────
+
+    def _cached_result(self, token_key: str) -> JWTVerificationResult | None:
+        if self.token_cache_size == 0:
+            return None
+        now = time.time()
+        with self._token_lock:
+            entry = self._token_cache.get(token_key)
+            if entry is None:
+                self._token_misses += 1
+                return None
+            result, _kid, expires_at = entry
+            if expires_at <= now:
+                del self._token_cache[token_key]
+                self._token_misses += 1
+                return None
+            self._token_cache.move_to_end(token_key)
+            self._token_hits += 1
+            return result
+
+    def _remember_result(
+        self,
+        token_key: str,
+        result: JWTVerificationResult,
+        kid: str,
+        exp: Any,
+    ) -> None:
+        # Tokens without a numeric exp are never cached: there is no safe expiry.
+        if self.token_cache_size == 0 or not isinstance(exp, (int, float)):
+            return
+        if exp <= time.time():
+            return
+        with self._token_lock:
+            self._token_cache[token_key] = (result, kid, float(exp))
+            self._token_cache.move_to_end(token_key)
+            while len(self._token_cache) > self.token_cache_size:
+                self._token_cache.popitem(last=False)
+
+    def _evict_revoked_kids(self, live_kids: set[str]) -> None:
+        """Drop cached tokens signed by keys no longer published in the JWKS."""
+        with self._token_lock:
+            stale = [key for key, (_, kid, _) in self._token_cache.items() if kid not in live_kids]
+            for key in stale:
+                del self._token_cache[key]
+
+    def clear_token_cache(self) -> None:
+        """Forget every verified token (e.g. after a key rotation incident)."""
+        with self._token_lock:
+            self._token_cache.clear()
+
+    def stats(self) -> dict[str, float | int]:
+        """Token cache hit rate and JWKS refresh counters for metrics export."""
+        with self._token_lock:
+            hits = self._token_hits
+            misses = self._token_misses
+            entries = len(self._token_cache)
+        lookups = hits + misses
+        age = time.time() - self._jwks_cached_at if self._jwks_cached_at else 0.0
+        return {
+            "token_cache_hits_total": hits,
+            "token_cache_misses_total": misses,
+            "token_cache_hit_ratio": round(hits / lookups, 6) if lookups else 0.0,
+            "token_cache_entries": entries,
+            "jwks_keys": len(self._jwks_by_kid),
+            "jwks_age_sec": round(age, 3),
+            "jwks_refreshes_total": self._jwks_refreshes,
+            "jwks_refresh_failures_total": self._jwks_refresh_failures,
+        }
+
+    # ── JWKS refresh ──────────────────────────────────────────────────────
+
+    @property
+    def background_refresh_running(self) -> bool:
+        """Whether the background JWKS refresher task is active."""
+        return self._refresher_task is not None and not self._refresher_task.done()
+
+    def start_background_refresh(self) -> None:
+        """Start refreshing the JWKS ahead of TTL on the running event loop."""
+        if not self.jwks_url or self.background_refresh_running:
+            return
+        self._refresher_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop_background_refresh(self) -> None:
+        """Stop the background JWKS refresher, if running."""
+        task = self._refresher_task
+        self._refresher_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def refresh_jwks(self) -> None:
+        """Refresh the JWKS off the event loop; concurrent callers share one fetch."""
+        if self._async_refresh is None or self._async_refresh.done():
+            generation = self._jwks_generation
+            self._async_refresh = asyncio.create_task(
+                asyncio.to_thread(self._refresh_jwks, generation)
+            )
+        await asyncio.shield(self._async_refresh)
+
+    async def _refresh_loop(self) -> None:
+        refresh_every = self.cache_ttl_sec * self.refresh_ahead_ratio
+        # Retry sooner after a failure, but never spin.
+        retry_after = max(1.0, min(30.0, refresh_every))
+        while True:
+            failures_before = self._jwks_refresh_failures
+            try:
+                await self.refresh_jwks()
+            except Exception:
+                logger.warning("jwks_refresh_loop_error", exc_info=True)
+            failed = self._jwks_refresh_failures != failures_before
+            await asyncio.sleep(retry_after if failed else refresh_every)
+
+    def _may_force_refresh(self, kid: str) -> bool:
+        """Rate-limit refreshes per unknown kid so a bad token cannot hammer the JWKS URL.
+
+        A kid that was missing from a forced refresh is not refetched for
+        ``min_forced_refresh_interval_sec``; other kids (e.g. a real key
+        rotation) still trigger their own refresh.
+        """
+        with self._cache_lock:
+            missed_at = self._unknown_kids.get(kid)
+        if missed_at is None:
+            return True
+        return time.monotonic() - missed_at >= self.min_forced_refresh_interval_sec
+
+    def _record_forced_lookup(self, kid: str, *, found: bool) -> None:
+        with self._cache_lock:
+            if found:
+                self._unknown_kids.pop(kid, None)
+                return
+            self._unknown_kids[kid] = time.monotonic()
+            self._unknown_kids.move_to_end(kid)
+            while len(self._unknown_kids) > _UNKNOWN_KID_CACHE_SIZE:
+                self._unknown_kids.popitem(last=False)
+
+    def _refresh_jwks(self, seen_generation: int) -> None:
+        """Fetch and install the JWKS unless a newer one landed while waiting."""
+        with self._refresh_lock:
+            if self._jwks_generation != seen_generation:
+                return
+            fetched = self._fetch_jwks()
+            if not fetched:
+                self._jwks_refresh_failures += 1
+                logger.warning("jwks_refresh_failed", extra={"jwks_url": self.jwks_url})
+                return
+            with self._cache_lock:
+                self._jwks_by_kid = fetched
+                self._jwks_cached_at = time.time()
+                self._jwks_generation += 1
+                self._jwks_refreshes += 1
+        self._evict_revoked_kids(set(fetched))
 
     def _load_pyjwt(self) -> Any | None:
         """Load PyJWT lazily so the project can run without hard dependency."""
@@ -131,20 +335,17 @@ class SupabaseJWTVerifier:
     def _get_cached_jwks(self, *, force_refresh: bool = False) -> dict[str, dict[str, Any]]:
         now = time.time()
         with self._cache_lock:
-            has_fresh_cache = (
-                self._jwks_by_kid
-                and not force_refresh
-                and (now - self._jwks_cached_at) < self.cache_ttl_sec
-            )
-            if has_fresh_cache:
-                return dict(self._jwks_by_kid)
-
-            fetched = self._fetch_jwks()
-            if fetched:
-                self._jwks_by_kid = fetched
-                self._jwks_cached_at = now
-
-            return dict(self._jwks_by_kid)
+            generation = self._jwks_generation
+            keys = self._jwks_by_kid
+            is_fresh = (now - self._jwks_cached_at) < self.cache_ttl_sec
+            # With a background refresher running, a stale set is served rather
+            # than blocking the request; the refresher replaces it shortly.
+            if keys and not force_refresh and (is_fresh or self.background_refresh_running):
+                return keys
+
+        self._refresh_jwks(generation)
+        with self._cache_lock:
+            return self._jwks_by_kid
 
     def _fetch_jwks(self) -> dict[str, dict[str, Any]]:
         if not self.jwks_url:
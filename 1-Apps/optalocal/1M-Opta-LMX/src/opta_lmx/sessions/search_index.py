@@ -0,0 +1,341 @@
+"""Sidecar SQLite FTS5 index over CLI session files.
+
+The CLI owns ``~/.config/opta/sessions/``; this index lives elsewhere (by
+default ``~/.opta-lmx/sessions-index.sqlite``) and is rebuilt from the session
+files alone, so it can be deleted at any time.
+
+``sync()`` is incremental: it stats every ``<id>.json`` and re-parses only files
+whose mtime or size changed since the last sync, and drops rows for files that
+disappeared. Listing is served from the ``sessions`` table and search from the
+``sessions_fts`` table, ranked by bm25 with title and tag hits weighted above
+message text.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from opta_lmx.sessions.models import SessionListResponse, SessionSummary
+from opta_lmx.sessions.store import _as_str, _as_str_list
+
+logger = logging.getLogger(__name__)
+
+# bm25 column weights: id, title, tags, model, body
+_BM25_WEIGHTS = (2.0, 10.0, 5.0, 5.0, 1.0)
+_QUERY_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_SORT_KEY = "COALESCE(NULLIF(updated, ''), created)"
+
+
+def _message_text(messages: object) -> str:
+    """Concatenate the text of every message (string or text-part content)."""
+    if not isinstance(messages, list):
+        return ""
+    parts: list[str] = []
+    for msg in messages:
+        if not isinstance(msg, dict):
+            continue
+        content = msg.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            for part in content:
+                if isinstance(part, dict) and part.get("type") == "text":
+                    text = part.get("text")
+                    if isinstance(text, str):
+                        parts.append(text)
+    return "\n".join(parts)
+
+
+def fts_query(query: str) -> str | None:
+    """Turn free text into an FTS5 query: every word, as a prefix, must match.
+
+    Returns None when the query has no searchable words.
+    """
+    tokens = _QUERY_TOKEN_RE.findall(query)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+class SessionSearchIndex:
+    """Incrementally synced FTS5 index of session summaries and message text."""
+
+    def __init__(self, db_path: Path, sessions_dir: Path) -> None:
+        self.db_path = Path(db_path).expanduser()
+        self.sessions_dir = sessions_dir
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._con = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._init_db()
+        self._synced = False
+        self._syncs_total = 0
+        self._files_parsed_total = 0
+        self._last_sync_ms = 0.0
+
+    def _init_db(self) -> None:
+        with self._lock:
+            self._con.execute("PRAGMA journal_mode=WAL;")
+            self._con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    rowid INTEGER PRIMARY KEY,
+                    file_id TEXT NOT NULL UNIQUE,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    id TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    tags TEXT NOT NULL,
+                    created TEXT NOT NULL,
+                    updated TEXT NOT NULL,
+                    message_count INTEGER NOT NULL
+                )
+                """
+            )
+            self._con.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_sessions_sort ON sessions({_SORT_KEY} DESC)"
+            )
+            self._con.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS sessions_fts USING fts5(
+                    id, title, tags, model, body,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+                """
+            )
+            self._con.commit()
+
+    def close(self) -> None:
+        """Close the connection once any running sync has finished."""
+        with self._sync_lock, self._lock:
+            self._con.close()
+
+    # ── Sync ──────────────────────────────────────────────────────────────
+
+    def sync(self) -> dict[str, int]:
+        """Bring the index up to date with the session files on disk.
+
+        Returns counts of added, updated and removed sessions.
+        """
+        with self._sync_lock:
+            return self._sync()
+
+    def _sync(self) -> dict[str, int]:
+        started = time.monotonic()
+        on_disk: dict[str, tuple[int, int, str]] = {}
+        if self.sessions_dir.is_dir():
+            with os.scandir(self.sessions_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not name.endswith(".json") or name == "index.json":
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    on_disk[name[: -len(".json")]] = (st.st_mtime_ns, st.st_size, entry.path)
+
+        with self._lock:
+            known = {
+                file_id: (rowid, mtime_ns, size)
+                for rowid, file_id, mtime_ns, size in self._con.execute(
+                    "SELECT rowid, file_id, mtime_ns, size FROM sessions"
+                )
+            }
+        removed = [known[fid][0] for fid in known.keys() - on_disk.keys()]
+        changed = [
+            (fid, meta)
+            for fid, meta in on_disk.items()
+            if fid not in known or known[fid][1:] != meta[:2]
+        ]
+
+        # Parse outside the lock so searches are not blocked by file I/O.
+        parsed: list[tuple[str, tuple[int, int, str], dict[str, Any] | None]] = [
+            (fid, meta, self._read_session(Path(meta[2]))) for fid, meta in changed
+        ]
+
+        added = updated = 0
+        with self._lock:
+            for rowid in removed:
+                self._delete_row(rowid)
+            for fid, (mtime_ns, size, _), raw in parsed:
+                previous = known.get(fid)
+                if previous is not None:
+                    self._delete_row(previous[0])
+                if raw is None:
+                    continue
+                self._insert(fid, mtime_ns, size, raw)
+                if previous is None:
+                    added += 1
+                else:
+                    updated += 1
+            self._con.commit()
+            self._synced = True
+            self._syncs_total += 1
+            self._files_parsed_total += len(parsed)
+            self._last_sync_ms = (time.monotonic() - started) * 1000.0
+
+        if removed or parsed:
+            logger.info(
+                "session_index_synced",
+                extra={
+                    "added": added,
+                    "updated": updated,
+                    "removed": len(removed),
+                    "duration_ms": round(self._last_sync_ms, 1),
+                },
+            )
+        return {"added": added, "updated": updated, "removed": len(removed)}
+
+    def ensure_synced(self) -> None:
+        """Run a first sync if none has happened yet."""
+        if not self._synced:
+            self.sync()
+
+    def remove(self, file_id: str) -> None:
+        """Drop a session from the index (e.g. right after deleting its file)."""
+        with self._lock:
+            row = self._con.execute(
+                "SELECT rowid FROM sessions WHERE file_id = ?", (file_id,)
+            ).fetchone()
+            if row is not None:
+                self._delete_row(row[0])
+                self._con.commit()
+
+    @staticmethod
+    def _read_session(path: Path) -> dict[str, Any] | None:
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError) as exc:
+            logger.warning("session_scan_error", extra={"file": path.name, "error": str(exc)})
+            return None
+        return raw if isinstance(raw, dict) else None
+
+    def _delete_row(self, rowid: int) -> None:
+        self._con.execute("DELETE FROM sessions WHERE rowid = ?", (rowid,))
+        self._con.execute("DELETE FROM sessions_fts WHERE rowid = ?", (rowid,))
+
+    def _insert(self, file_id: str, mtime_ns: int, size: int, raw: dict[str, Any]) -> None:
+        messages = raw.get("messages", [])
+        session_id = _as_str(raw.get("id", file_id), file_id)
+        title = _as_str(raw.get("title", ""))
+        model = _as_str(raw.get("model", ""))
+        tags = _as_str_list(raw.get("tags", []))
+        created = _as_str(raw.get("created", ""))
+        cursor = self._con.execute(
+            """
+            INSERT INTO sessions (
+                file_id, mtime_ns, size, id, title, model, tags, created, updated, message_count
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                file_id,
+                mtime_ns,
+                size,
+                session_id,
+                title,
+                model,
+                json.dumps(tags),
+                created,
+                _as_str(raw.get("updated", created)),
+                len(messages) if isinstance(messages, list) else 0,
+            ),
+        )
+        self._con.execute(
+            "INSERT INTO sessions_fts (rowid, id, title, tags, model, body)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (cursor.lastrowid, session_id, title, " ".join(tags), model, _message_text(messages)),
+        )
+
+    # ── Queries ───────────────────────────────────────────────────────────
+
+    def list_sessions(
+        self,
+        *,
+        limit: int = 50,
+        offset: int = 0,
+        model: str | None = None,
+        tag: str | None = None,
+        since: str | None = None,
+    ) -> SessionListResponse:
+        """Same contract as ``SessionStore.list_sessions``, served from the index."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        if model:
+            clauses.append("instr(lower(model), ?) > 0")
+            params.append(model.lower())
+        if tag:
+            clauses.append("EXISTS (SELECT 1 FROM json_each(sessions.tags) WHERE value = ?)")
+            params.append(tag)
+        if since:
+            clauses.append("(updated >= ? OR created >= ?)")
+            params.extend([since, since])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            total = self._con.execute(f"SELECT COUNT(*) FROM sessions {where}", params).fetchone()[
+                0
+            ]
+            rows = self._con.execute(
+                f"""
+                SELECT id, title, model, tags, created, updated, message_count
+                FROM sessions {where}
+                ORDER BY {_SORT_KEY} DESC, rowid
+                LIMIT ? OFFSET ?
+                """,
+                [*params, limit, offset],
+            ).fetchall()
+        return SessionListResponse(sessions=[self._summary(row) for row in rows], total=total)
+
+    def search(self, query: str, *, limit: int = 20, offset: int = 0) -> list[SessionSummary]:
+        """Ranked full-text search over ids, titles, tags, models and message text."""
+        match = fts_query(query)
+        if match is None:
+            return []
+        weights = ", ".join(str(w) for w in _BM25_WEIGHTS)
+        with self._lock:
+            rows = self._con.execute(
+                f"""
+                SELECT s.id, s.title, s.model, s.tags, s.created, s.updated, s.message_count
+                FROM sessions_fts
+                JOIN sessions AS s ON s.rowid = sessions_fts.rowid
+                WHERE sessions_fts MATCH ?
+                ORDER BY bm25(sessions_fts, {weights}), {_SORT_KEY} DESC
+                LIMIT ? OFFSET ?
+                """,
+                (match, limit, offset),
+            ).fetchall()
+        return [self._summary(row) for row in rows]
+
+    @staticmethod
+    def _summary(row: tuple[Any, ...]) -> SessionSummary:
+        session_id, title, model, tags, created, updated, message_count = row
+        return SessionSummary(
+            id=session_id,
+            title=title,
+            model=model,
+            tags=json.loads(tags),
+            created=created,
+            updated=updated,
+            message_count=message_count,
+        )
+
+    def stats(self) -> dict[str, float | int]:
+        """Index size and sync activity: syncs run, files re-parsed, last sync time."""
+        with self._lock:
+            indexed = self._con.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+            return {
+                "sessions_indexed": indexed,
+                "syncs_total": self._syncs_total,
+                "files_parsed_total": self._files_parsed_total,
+                "last_sync_ms": round(self._last_sync_ms, 3),
+            }
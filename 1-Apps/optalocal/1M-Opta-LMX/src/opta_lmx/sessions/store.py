@@ -9,15 +9,24 @@ File layout::
     ~/.config/opta/sessions/
         index.json          # Fast listing index (optional)
         <session-id>.json   # Individual session files
+
+With ``search_index_path`` set, listing and search are served from a sidecar
+SQLite FTS5 index (see :mod:`opta_lmx.sessions.search_index`) that a
+background task keeps in sync with the session files. Without it, summaries
+are held in a stat-validated in-memory cache (see
+:mod:`opta_lmx.sessions.summary_cache`).
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
 import logging
 import re
+import sqlite3
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from opta_lmx.sessions.models import (
     SessionFull,
@@ -25,6 +34,10 @@ from opta_lmx.sessions.models import (
     SessionMessage,
     SessionSummary,
 )
+from opta_lmx.sessions.summary_cache import SessionSummaryCache
+
+if TYPE_CHECKING:
+    from opta_lmx.sessions.search_index import SessionSearchIndex
 
 logger = logging.getLogger(__name__)
 
@@ -65,10 +78,87 @@ class SessionStore:
     Args:
         sessions_dir: Path to the CLI sessions directory.
             Defaults to ``~/.config/opta/sessions/``.
+        search_index_path: SQLite file for the FTS5 search index. None keeps
+            the index-free behaviour (substring search over summaries).
     """
 
-    def __init__(self, sessions_dir: Path | None = None) -> None:
+    def __init__(
+        self,
+        sessions_dir: Path | None = None,
+        *,
+        search_index_path: Path | None = None,
+    ) -> None:
         self.sessions_dir = sessions_dir or _DEFAULT_SESSIONS_DIR
+        self._index: SessionSearchIndex | None = None
+        self._sync_task: asyncio.Task[None] | None = None
+        # The index.sync() call currently running in a worker thread.
+        self._sync_call: asyncio.Future[dict[str, int]] | None = None
+        self._summary_cache = SessionSummaryCache(
+            self.sessions_dir,
+            load_index=self._load_from_index,
+            load_file=self._summary_from_file,
+        )
+        if search_index_path is not None:
+            from opta_lmx.sessions.search_index import SessionSearchIndex
+
+            try:
+                self._index = SessionSearchIndex(search_index_path, self.sessions_dir)
+            except (sqlite3.Error, OSError) as exc:
+                # e.g. SQLite built without FTS5 — keep serving from the files
+                logger.warning(
+                    "session_index_unavailable",
+                    extra={"path": str(search_index_path), "error": str(exc)},
+                )
+
+    @property
+    def search_index(self) -> SessionSearchIndex | None:
+        """The FTS5 index, when enabled."""
+        return self._index
+
+    @property
+    def summary_cache(self) -> SessionSummaryCache:
+        """The in-memory summary cache behind index-free listing."""
+        return self._summary_cache
+
+    # ── Background index sync ─────────────────────────────────────────────
+
+    def start_background_sync(self, interval_sec: float = 5.0) -> None:
+        """Keep the search index in sync on the running event loop."""
+        if self._index is None or self._sync_task is not None:
+            return
+        self._sync_task = asyncio.create_task(self._sync_loop(self._index, interval_sec))
+
+    async def stop_background_sync(self) -> None:
+        """Stop the background index sync, waiting for a sync already in progress.
+
+        Cancelling the task does not stop a sync running in a worker thread,
+        so that call is awaited too; :meth:`close` is then safe to call.
+        """
+        task = self._sync_task
+        self._sync_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        call, self._sync_call = self._sync_call, None
+        if call is not None:
+            with contextlib.suppress(Exception):
+                await call
+
+    def close(self) -> None:
+        """Close the search index connection."""
+        if self._index is not None:
+            self._index.close()
+
+    async def _sync_loop(self, index: SessionSearchIndex, interval_sec: float) -> None:
+        while True:
+            self._sync_call = asyncio.ensure_future(asyncio.to_thread(index.sync))
+            try:
+                # Shielded so cancellation leaves the call for stop_background_sync.
+                await asyncio.shield(self._sync_call)
+            except Exception:
+                logger.warning("session_index_sync_failed", exc_info=True)
+            await asyncio.sleep(interval_sec)
 
     # ── Validation ─────────────────────────────────────────────────────────
 
@@ -106,7 +196,9 @@ class SessionStore:
         """Return paginated session summaries, newest first.
 
         Uses ``index.json`` for fast listing when available, falling back
-        to scanning individual session files.
+        to scanning individual session files. Either way the parsed summaries
+        are cached and revalidated by mtime, so repeated pages are slices of
+        one pre-sorted list.
 
         Args:
             limit: Maximum number of sessions to return.
@@ -115,23 +207,15 @@ class SessionStore:
             tag: Filter by tag (exact match).
             since: ISO 8601 date cutoff — only sessions updated on or after.
         """
-        summaries = self._load_summaries()
-
-        # Apply filters
-        if model:
-            model_lower = model.lower()
-            summaries = [s for s in summaries if model_lower in s.model.lower()]
-        if tag:
-            summaries = [s for s in summaries if tag in s.tags]
-        if since:
-            summaries = [s for s in summaries if s.updated >= since or s.created >= since]
-
-        # Sort by updated descending (ISO dates sort lexicographically)
-        summaries.sort(key=lambda s: s.updated or s.created, reverse=True)
+        if self._index is not None:
+            self._index.ensure_synced()
+            return self._index.list_sessions(
+                limit=limit, offset=offset, model=model, tag=tag, since=since
+            )
 
-        total = len(summaries)
-        page = summaries[offset : offset + limit]
-        return SessionListResponse(sessions=page, total=total)
+        return self._summary_cache.snapshot().page(
+            limit=limit, offset=offset, model=model, tag=tag, since=since
+        )
 
     # ── Get ───────────────────────────────────────────────────────────────
 
@@ -191,18 +275,29 @@ class SessionStore:
 
         # Update index.json if it exists
         self._remove_from_index(session_id)
+        if self._index is not None:
+            self._index.remove(path.stem)
 
         logger.info("session_deleted", extra={"session_id": session_id})
         return True
 
     # ── Search ────────────────────────────────────────────────────────────
 
-    def search_sessions(self, query: str, *, limit: int = 20) -> list[SessionSummary]:
-        """Search sessions by title, model, tags, and first user message.
+    def search_sessions(
+        self, query: str, *, limit: int = 20, offset: int = 0
+    ) -> list[SessionSummary]:
+        """Search sessions by title, model, tags, and message text.
 
-        Simple case-insensitive substring matching across fields.
-        Acts as a server-side fallback to client-side Fuse.js.
+        With the search index, every word of ``query`` must prefix-match a
+        word in the session and results are ranked by relevance. Without it,
+        this is case-insensitive substring matching over the summaries and the
+        first user message, newest first.
         """
+        if self._index is not None:
+            self._index.ensure_synced()
+            return self._index.search(query, limit=limit, offset=offset)
+
+        limit += offset
         q = query.lower()
         summaries = self._load_summaries()
         matches: list[SessionSummary] = []
@@ -232,24 +327,20 @@ class SessionStore:
 
         # Sort by updated descending
         matches.sort(key=lambda s: s.updated or s.created, reverse=True)
-        return matches
+        return matches[offset:]
 
     # ── Internal helpers ──────────────────────────────────────────────────
 
     def _load_summaries(self) -> list[SessionSummary]:
         """Load session summaries from index.json or by scanning files."""
-        if not self.sessions_dir.is_dir():
-            return []
+        return self._summary_cache.snapshot().summaries
 
-        index_path = self.sessions_dir / "index.json"
-        if index_path.is_file():
-            return self._load_from_index(index_path)
-
-        return self._scan_session_files()
-
-    def _load_from_index(self, index_path: Path) -> list[SessionSummary]:
+    def _load_from_index(self, index_path: Path) -> list[SessionSummary] | None:
         """Parse index.json for fast session listing.
 
+        Returns None when the index is unreadable or malformed, so callers
+        fall back to scanning the session files.
+
         Index schema (from CLI)::
 
             {
@@ -269,11 +360,11 @@ class SessionStore:
             raw = json.loads(index_path.read_text(encoding="utf-8"))
         except (json.JSONDecodeError, OSError) as exc:
             logger.warning("index_read_error", extra={"error": str(exc)})
-            return self._scan_session_files()
+            return None
 
-        raw_entries = raw.get("entries", {})
+        raw_entries = raw.get("entries", {}) if isinstance(raw, dict) else None
         if not isinstance(raw_entries, dict):
-            return self._scan_session_files()
+            return None
 
         entries: dict[str, object] = {
             str(session_id): entry for session_id, entry in raw_entries.items()
@@ -297,45 +388,35 @@ class SessionStore:
 
         return summaries
 
-    def _scan_session_files(self) -> list[SessionSummary]:
-        """Scan individual session JSON files (slow path)."""
-        summaries: list[SessionSummary] = []
-
-        for path in self.sessions_dir.glob("*.json"):
-            if path.name == "index.json":
-                continue
-
-            try:
-                raw = json.loads(path.read_text(encoding="utf-8"))
-            except (json.JSONDecodeError, OSError) as exc:
-                logger.warning(
-                    "session_scan_error",
-                    extra={
-                        "file": path.name,
-                        "error": str(exc),
-                    },
-                )
-                continue
-
-            if not isinstance(raw, dict):
-                continue
+    def _summary_from_file(self, path: Path) -> SessionSummary | None:
+        """Parse one session JSON file into a summary (slow path)."""
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError) as exc:
+            logger.warning(
+                "session_scan_error",
+                extra={
+                    "file": path.name,
+                    "error": str(exc),
+                },
+            )
+            return None
 
-            sid = raw.get("id", path.stem)
-            messages = raw.get("messages", [])
+        if not isinstance(raw, dict):
+            return None
 
-            summaries.append(
-                SessionSummary(
-                    id=_as_str(sid, path.stem),
-                    title=_as_str(raw.get("title", "")),
-                    model=_as_str(raw.get("model", "")),
-                    tags=_as_str_list(raw.get("tags", [])),
-                    created=_as_str(raw.get("created", "")),
-                    updated=_as_str(raw.get("updated", raw.get("created", ""))),
-                    message_count=len(messages) if isinstance(messages, list) else 0,
-                )
-            )
+        sid = raw.get("id", path.stem)
+        messages = raw.get("messages", [])
 
-        return summaries
+        return SessionSummary(
+            id=_as_str(sid, path.stem),
+            title=_as_str(raw.get("title", "")),
+            model=_as_str(raw.get("model", "")),
+            tags=_as_str_list(raw.get("tags", [])),
+            created=_as_str(raw.get("created", "")),
+            updated=_as_str(raw.get("updated", raw.get("created", ""))),
+            message_count=len(messages) if isinstance(messages, list) else 0,
+        )
 
     def _parse_full_session(self, session_id: str, raw: dict[str, Any]) -> SessionFull:
         """Parse a raw session dict into a SessionFull model."""
@@ -0,0 +1,199 @@
+"""Process-level cache of session summaries for index-free listing.
+
+``SessionStore.list_sessions`` without the FTS index used to re-read
+``index.json`` (or re-parse every session file) and re-sort everything on each
+page request. :class:`SessionSummaryCache` keeps the last result as a
+:class:`SummarySnapshot` — summaries pre-sorted newest first, with positions
+indexed by tag and by model — so a page is a slice.
+
+Validation is by stat only:
+
+- ``index.json`` mode: the snapshot is reused while the index file's mtime and
+  size are unchanged.
+- Scan mode (no usable ``index.json``): the directory is re-listed only when its
+  mtime changes, every known file is stat'ed, and only files whose mtime or
+  size changed are re-parsed.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+from opta_lmx.sessions.models import SessionListResponse, SessionSummary
+
+_StatSig = tuple[int, int]
+
+
+def _stat_sig(path: Path) -> _StatSig | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class SummarySnapshot:
+    """Immutable, pre-sorted view of all session summaries."""
+
+    __slots__ = ("_by_model", "_by_tag", "ordered", "summaries")
+
+    def __init__(self, summaries: list[SessionSummary]) -> None:
+        self.summaries = summaries
+        # Stable sort, so ties keep load order exactly as the unsorted path did.
+        self.ordered = sorted(summaries, key=lambda s: s.updated or s.created, reverse=True)
+        self._by_tag: dict[str, list[int]] = {}
+        self._by_model: dict[str, list[int]] = {}
+        for position, summary in enumerate(self.ordered):
+            for tag in dict.fromkeys(summary.tags):
+                self._by_tag.setdefault(tag, []).append(position)
+            self._by_model.setdefault(summary.model.lower(), []).append(position)
+
+    def page(
+        self,
+        *,
+        limit: int,
+        offset: int,
+        model: str | None = None,
+        tag: str | None = None,
+        since: str | None = None,
+    ) -> SessionListResponse:
+        """Filter and paginate, newest first."""
+        positions: list[int] | None = None
+        if tag:
+            positions = self._by_tag.get(tag, [])
+        if model:
+            needle = model.lower()
+            matching = [p for m, p in self._by_model.items() if needle in m]
+            by_model = list(heapq.merge(*matching))
+            if positions is None:
+                positions = by_model
+            else:
+                allowed = set(by_model)
+                positions = [p for p in positions if p in allowed]
+
+        candidates = self.ordered if positions is None else [self.ordered[p] for p in positions]
+        if since:
+            candidates = [s for s in candidates if s.updated >= since or s.created >= since]
+        return SessionListResponse(
+            sessions=candidates[offset : offset + limit],
+            total=len(candidates),
+        )
+
+
+_EMPTY = SummarySnapshot([])
+
+
+class SessionSummaryCache:
+    """Lazily revalidated summary snapshot for one sessions directory.
+
+    Args:
+        sessions_dir: The CLI sessions directory.
+        load_index: Parses ``index.json``; returns None when it is unusable.
+        load_file: Parses one session file; returns None to skip it.
+    """
+
+    def __init__(
+        self,
+        sessions_dir: Path,
+        *,
+        load_index: Callable[[Path], list[SessionSummary] | None],
+        load_file: Callable[[Path], SessionSummary | None],
+    ) -> None:
+        self.sessions_dir = sessions_dir
+        self._load_index = load_index
+        self._load_file = load_file
+        self._lock = threading.Lock()
+        self._snapshot: SummarySnapshot | None = None
+        self._index_sig: _StatSig | None = None
+        self._dir_mtime_ns: int | None = None
+        self._names: list[str] = []
+        self._files: dict[str, tuple[_StatSig, SessionSummary | None]] = {}
+        self._rebuilds_total = 0
+        self._files_parsed_total = 0
+
+    def snapshot(self) -> SummarySnapshot:
+        """Return the current snapshot, reloading only what changed on disk."""
+        with self._lock:
+            if not self.sessions_dir.is_dir():
+                self._reset()
+                return _EMPTY
+
+            index_path = self.sessions_dir / "index.json"
+            index_sig = _stat_sig(index_path)
+            if index_sig is not None:
+                if index_sig == self._index_sig and self._snapshot is not None:
+                    return self._snapshot
+                summaries = self._load_index(index_path)
+                if summaries is not None:
+                    self._index_sig = index_sig
+                    return self._rebuild(summaries)
+
+            # Scan mode: no index.json, or one that could not be used.
+            was_index = self._index_sig is not None
+            self._index_sig = None
+            if self._refresh_files() or was_index or self._snapshot is None:
+                return self._rebuild([s for _, s in self._files.values() if s is not None])
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Drop everything; the next snapshot reloads from disk."""
+        with self._lock:
+            self._reset()
+
+    def stats(self) -> dict[str, float | int]:
+        """Snapshot rebuilds, session files parsed, and files currently cached."""
+        with self._lock:
+            return {
+                "rebuilds_total": self._rebuilds_total,
+                "files_parsed_total": self._files_parsed_total,
+                "files_cached": len(self._files),
+            }
+
+    def _reset(self) -> None:
+        self._snapshot = None
+        self._index_sig = None
+        self._dir_mtime_ns = None
+        self._names = []
+        self._files = {}
+
+    def _rebuild(self, summaries: list[SessionSummary]) -> SummarySnapshot:
+        self._snapshot = SummarySnapshot(summaries)
+        self._rebuilds_total += 1
+        return self._snapshot
+
+    def _refresh_files(self) -> bool:
+        """Re-stat session files, re-parsing changed ones. Returns True on any change."""
+        dir_sig = _stat_sig(self.sessions_dir)
+        dir_mtime_ns = dir_sig[0] if dir_sig is not None else None
+        if dir_mtime_ns is None or dir_mtime_ns != self._dir_mtime_ns:
+            with os.scandir(self.sessions_dir) as entries:
+                self._names = [
+                    entry.name
+                    for entry in entries
+                    if entry.name.endswith(".json") and entry.name != "index.json"
+                ]
+            self._dir_mtime_ns = dir_mtime_ns
+
+        changed = False
+        files: dict[str, tuple[_StatSig, SessionSummary | None]] = {}
+        for name in self._names:
+            path = self.sessions_dir / name
+            sig = _stat_sig(path)
+            if sig is None:
+                changed = True
+                continue
+            cached = self._files.get(name)
+            if cached is not None and cached[0] == sig:
+                files[name] = cached
+                continue
+            files[name] = (sig, self._load_file(path))
+            self._files_parsed_total += 1
+            changed = True
+        if files.keys() != self._files.keys():
+            changed = True
+        self._files = files
+        return changed
@@ -4,17 +4,27 @@ from __future__ import annotations
 
 import asyncio
 import json
+import logging
 import sqlite3
 import time
 import uuid
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
 from threading import Lock
-from typing import Literal, Protocol
-
+from typing import Any, Literal, Protocol
+
+from opta_lmx.runtime.sqlite_queue import (
+    ClaimLease,
+    LatencyWindow,
+    QueueWakeup,
+    connect_queue_db,
+)
 from opta_lmx.skills.executors import SkillExecutionResult, SkillExecutor
 from opta_lmx.skills.manifest import SkillManifest
 
+logger = logging.getLogger(__name__)
+
 
 class SkillDispatchOverloadedError(RuntimeError):
     """Raised when skill dispatch queue is saturated."""
@@ -76,6 +86,7 @@ class _QueuedDispatchCall:
     approved: bool
     timeout_sec: float | None
     future: asyncio.Future[SkillExecutionResult]
+    enqueued_at: float = 0.0
 
 
 @dataclass(slots=True)
@@ -83,12 +94,19 @@ class _ClaimedSQLiteCall:
     row_id: int
     job_id: str
     payload_json: str
+    enqueued_at: float = 0.0
 
 
 class QueuedSkillDispatcher:
     """Queue-backed dispatcher for heavier skill workloads.
 
-    Supports in-memory queueing and SQLite-backed persistence.
+    Supports in-memory queueing and SQLite-backed persistence. The SQLite
+    backend wakes idle workers on enqueue (including in other processes
+    sharing the database) and claims calls in one ``UPDATE ... RETURNING``
+    batch per wakeup; ``poll_interval_sec`` is only the idle re-check
+    interval. Claimed rows record this dispatcher as owner under a lease
+    renewed while it runs; recovery requeues only its own rows and rows
+    whose lease expired after ``lease_sec``.
     """
 
     def __init__(
@@ -99,7 +117,8 @@ class QueuedSkillDispatcher:
         max_queue_size: int = 256,
         backend: Literal["memory", "sqlite"] = "memory",
         persist_path: Path | None = None,
-        poll_interval_sec: float = 0.05,
+        poll_interval_sec: float = 1.0,
+        lease_sec: float = 60.0,
     ) -> None:
         if worker_count < 1:
             raise ValueError("worker_count must be >= 1")
@@ -121,7 +140,17 @@ class QueuedSkillDispatcher:
         self._queue: asyncio.Queue[_QueuedDispatchCall | None] | None = None
         self._persist_path: Path | None = None
         self._db_lock = Lock()
+        self._con: sqlite3.Connection | None = None
         self._sqlite_futures: dict[str, asyncio.Future[SkillExecutionResult]] = {}
+        self._wakeup: QueueWakeup | None = None
+        self._lease: ClaimLease | None = None
+        self._lease_task: asyncio.Task[None] | None = None
+        self._claimed: deque[_ClaimedSQLiteCall] = deque()
+        self._claim_lock: asyncio.Lock | None = None
+        self._idle_workers = 0
+        self._claim_batches_total = 0
+        self._claimed_total = 0
+        self._start_latency = LatencyWindow()
 
         if backend == "memory":
             self._queue = asyncio.Queue(maxsize=max_queue_size)
@@ -129,6 +158,8 @@ class QueuedSkillDispatcher:
             if persist_path is None:
                 raise ValueError("persist_path is required when backend='sqlite'")
             self._persist_path = Path(persist_path).expanduser()
+            self._wakeup = QueueWakeup(str(self._persist_path.resolve()))
+            self._lease = ClaimLease("skill_queue", lease_sec=lease_sec)
             self._init_db()
             self._recover_running_rows()
 
@@ -136,6 +167,12 @@ class QueuedSkillDispatcher:
         if self._started:
             return
         self._started = True
+        if self._wakeup is not None:
+            self._wakeup.open()
+            self._claim_lock = asyncio.Lock()
+            self._lease_task = asyncio.create_task(
+                self._lease_loop(), name="skills-dispatcher-lease"
+            )
         self._workers = [
             asyncio.create_task(self._worker_loop(index), name=f"skills-dispatcher-{index}")
             for index in range(self._worker_count)
@@ -164,6 +201,7 @@ class QueuedSkillDispatcher:
                 approved=approved,
                 timeout_sec=timeout_sec,
                 future=future,
+                enqueued_at=time.monotonic(),
             )
             try:
                 queue.put_nowait(call)
@@ -188,9 +226,12 @@ class QueuedSkillDispatcher:
             "timeout_sec": timeout_sec,
         }
         payload_json = json.dumps(payload, separators=(",", ":"))
-        await asyncio.to_thread(self._db_enqueue, job_id, payload_json)
+        # Register first: a woken worker can finish the call before enqueue returns.
         self._sqlite_futures[job_id] = future
         try:
+            await asyncio.to_thread(self._db_enqueue, job_id, payload_json)
+            if self._wakeup is not None:
+                await self._wakeup.notify()
             return await future
         finally:
             self._sqlite_futures.pop(job_id, None)
@@ -211,9 +252,36 @@ class QueuedSkillDispatcher:
 
         for worker in self._workers:
             worker.cancel()
+        if self._lease_task is not None:
+            self._lease_task.cancel()
         await asyncio.gather(*self._workers, return_exceptions=True)
+        if self._lease_task is not None:
+            await asyncio.gather(self._lease_task, return_exceptions=True)
+            self._lease_task = None
         self._workers = []
-        self._recover_running_rows()
+        # Claimed-but-unstarted calls go back to the queue with the rest.
+        self._claimed.clear()
+        self._recover_running_rows(own=True)
+        self._close_db()
+        if self._wakeup is not None:
+            self._wakeup.close()
+
+    def stats(self) -> dict[str, Any]:
+        """Skill queue backend, batched claims, and how long calls waited for a worker."""
+        stats: dict[str, Any] = {
+            "sqlite_backend": int(self._backend == "sqlite"),
+            "workers": self._worker_count,
+            **self._start_latency.snapshot("enqueue_to_start"),
+        }
+        if self._wakeup is not None:
+            stats.update(
+                claim_batches_total=self._claim_batches_total,
+                claimed_total=self._claimed_total,
+                **self._wakeup.stats(),
+            )
+        if self._lease is not None:
+            stats.update(self._lease.stats())
+        return stats
 
     async def _worker_loop(self, worker_index: int) -> None:
         if self._backend == "memory":
@@ -230,6 +298,7 @@ class QueuedSkillDispatcher:
             try:
                 if call is None:
                     return
+                self._start_latency.observe(time.monotonic() - call.enqueued_at)
                 result = await asyncio.to_thread(
                     self._executor.execute,
                     call.manifest,
@@ -252,11 +321,11 @@ class QueuedSkillDispatcher:
                 return
             try:
                 if claimed is None:
-                    claimed = await asyncio.to_thread(self._db_claim_next)
+                    claimed = await self._next_claimed()
                     if claimed is None:
-                        await asyncio.sleep(self._poll_interval_sec)
                         continue
 
+                self._start_latency.observe(time.time() - claimed.enqueued_at)
                 payload = json.loads(claimed.payload_json)
                 manifest = SkillManifest.model_validate(payload.get("manifest", {}))
                 arguments_obj = payload.get("arguments")
@@ -301,144 +370,191 @@ class QueuedSkillDispatcher:
                     f"Unexpected sqlite dispatch worker error on worker {worker_index}"
                 ) from exc
 
+    async def _next_claimed(self) -> _ClaimedSQLiteCall | None:
+        """Next claimed call, or None after an idle wait (so the caller re-checks state)."""
+        if self._claimed:
+            return self._claimed.popleft()
+        wakeup = self._wakeup
+        claim_lock = self._claim_lock
+        if wakeup is None or claim_lock is None:
+            return None
+        seen = wakeup.generation
+        self._idle_workers += 1
+        try:
+            async with claim_lock:
+                if not self._claimed:
+                    batch = await asyncio.to_thread(self._db_claim_batch, self._idle_workers)
+                    self._claimed.extend(batch)
+            if self._claimed:
+                if len(self._claimed) > 1:
+                    # Hand the rest of the batch to the other idle workers.
+                    await wakeup.wake_local()
+                return self._claimed.popleft()
+            await wakeup.wait(seen, max_wait=self._poll_interval_sec)
+            return None
+        finally:
+            self._idle_workers -= 1
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._con is None:
+            self._con = connect_queue_db(self._require_persist_path())
+        return self._con
+
+    def _close_db(self) -> None:
+        with self._db_lock:
+            if self._con is not None:
+                self._con.close()
+                self._con = None
+
     def _init_db(self) -> None:
         path = self._require_persist_path()
         path.parent.mkdir(parents=True, exist_ok=True)
         with self._db_lock:
-            con = sqlite3.connect(path)
-            try:
-                con.execute("PRAGMA journal_mode=WAL;")
-                con.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS skill_queue (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        job_id TEXT NOT NULL UNIQUE,
-                        payload_json TEXT NOT NULL,
-                        status TEXT NOT NULL DEFAULT 'queued',
-                        enqueued_at REAL NOT NULL,
-                        claimed_at REAL
-                    )
-                    """
-                )
-                con.execute(
-                    """
-                    CREATE INDEX IF NOT EXISTS idx_skill_queue_status_id
-                    ON skill_queue(status, id)
-                    """
+            con = self._connection()
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS skill_queue (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL UNIQUE,
+                    payload_json TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    enqueued_at REAL NOT NULL,
+                    claimed_at REAL,
+                    owner TEXT,
+                    lease_until REAL
                 )
-                con.commit()
-            finally:
-                con.close()
+                """
+            )
+            self._require_lease().ensure_columns(con)
+            con.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_skill_queue_status_id
+                ON skill_queue(status, id)
+                """
+            )
+            con.commit()
 
-    def _recover_running_rows(self) -> None:
-        path = self._require_persist_path()
+    def _recover_running_rows(self, *, own: bool = False) -> int:
+        """Requeue rows whose claim lease lapsed, plus this instance's own if ``own``.
+
+        Rows claimed by another live process keep running.
+        """
         with self._db_lock:
-            con = sqlite3.connect(path)
+            con = self._connection()
+            reclaimed = self._require_lease().reclaim(con, own=own)
+            con.commit()
+        if reclaimed:
+            logger.warning(
+                "skill_queue_rows_reclaimed",
+                extra={"rows": reclaimed, "own": own},
+            )
+        return reclaimed
+
+    async def _lease_loop(self) -> None:
+        """Renew leases on held rows and pick up rows from crashed peers."""
+        lease = self._require_lease()
+        while True:
+            await asyncio.sleep(lease.renew_interval_sec)
             try:
-                con.execute(
-                    """
-                    UPDATE skill_queue
-                    SET status='queued', claimed_at=NULL
-                    WHERE status='running'
-                    """
-                )
-                con.commit()
-            finally:
-                con.close()
+                await asyncio.to_thread(self._db_renew_leases)
+                reclaimed = await asyncio.to_thread(self._recover_running_rows)
+            except sqlite3.Error:
+                logger.warning("skill_queue_lease_renewal_failed", exc_info=True)
+                continue
+            if reclaimed and self._wakeup is not None:
+                await self._wakeup.notify()
+
+    def _db_renew_leases(self) -> None:
+        with self._db_lock:
+            con = self._connection()
+            self._require_lease().renew(con)
+            con.commit()
 
     def _db_count_queued(self) -> int:
-        path = self._require_persist_path()
         with self._db_lock:
-            con = sqlite3.connect(path)
-            try:
-                row = con.execute(
-                    "SELECT COUNT(1) FROM skill_queue WHERE status='queued'"
-                ).fetchone()
-                if row is None:
-                    return 0
-                return int(row[0])
-            finally:
-                con.close()
+            row = (
+                self._connection()
+                .execute("SELECT COUNT(1) FROM skill_queue WHERE status='queued'")
+                .fetchone()
+            )
+            if row is None:
+                return 0
+            return int(row[0])
 
     def _db_enqueue(self, job_id: str, payload_json: str) -> None:
-        path = self._require_persist_path()
         with self._db_lock:
-            con = sqlite3.connect(path)
-            try:
-                con.execute(
-                    """
-                    INSERT INTO skill_queue(job_id, payload_json, status, enqueued_at)
-                    VALUES (?, ?, 'queued', ?)
-                    """,
-                    (job_id, payload_json, time.time()),
-                )
-                con.commit()
-            finally:
-                con.close()
+            con = self._connection()
+            con.execute(
+                """
+                INSERT INTO skill_queue(job_id, payload_json, status, enqueued_at)
+                VALUES (?, ?, 'queued', ?)
+                """,
+                (job_id, payload_json, time.time()),
+            )
+            con.commit()
 
-    def _db_claim_next(self) -> _ClaimedSQLiteCall | None:
-        path = self._require_persist_path()
+    def _db_claim_batch(self, limit: int) -> list[_ClaimedSQLiteCall]:
+        """Claim up to ``limit`` queued calls in FIFO order with one statement."""
         with self._db_lock:
-            con = sqlite3.connect(path)
+            con = self._connection()
             try:
-                con.execute("BEGIN IMMEDIATE")
-                row = con.execute(
-                    """
-                    SELECT id, job_id, payload_json
-                    FROM skill_queue
-                    WHERE status='queued'
-                    ORDER BY id ASC
-                    LIMIT 1
-                    """
-                ).fetchone()
-                if row is None:
-                    con.commit()
-                    return None
-                row_id = int(row[0])
-                job_id = str(row[1])
-                payload_json = str(row[2])
-                con.execute(
+                rows = con.execute(
                     """
                     UPDATE skill_queue
-                    SET status='running', claimed_at=?
-                    WHERE id=?
+                    SET status='running', claimed_at=?, owner=?, lease_until=?
+                    WHERE id IN (
+                        SELECT id FROM skill_queue
+                        WHERE status='queued'
+                        ORDER BY id ASC
+                        LIMIT ?
+                    )
+                    RETURNING id, job_id, payload_json, enqueued_at
                     """,
-                    (time.time(), row_id),
-                )
+                    (time.time(), *self._require_lease().claim_values(), max(1, limit)),
+                ).fetchall()
                 con.commit()
-                return _ClaimedSQLiteCall(row_id=row_id, job_id=job_id, payload_json=payload_json)
             except Exception:
                 con.rollback()
                 raise
-            finally:
-                con.close()
+        if rows:
+            self._claim_batches_total += 1
+            self._claimed_total += len(rows)
+        # RETURNING order is unspecified; restore queue order.
+        rows.sort(key=lambda row: row[0])
+        return [
+            _ClaimedSQLiteCall(
+                row_id=int(row[0]),
+                job_id=str(row[1]),
+                payload_json=str(row[2]),
+                enqueued_at=float(row[3]),
+            )
+            for row in rows
+        ]
 
     def _db_complete_claimed(self, row_id: int) -> None:
-        path = self._require_persist_path()
         with self._db_lock:
-            con = sqlite3.connect(path)
-            try:
-                con.execute("DELETE FROM skill_queue WHERE id=?", (row_id,))
-                con.commit()
-            finally:
-                con.close()
+            con = self._connection()
+            con.execute("DELETE FROM skill_queue WHERE id=?", (row_id,))
+            con.commit()
 
     def _db_requeue_claimed(self, row_id: int) -> None:
-        path = self._require_persist_path()
         with self._db_lock:
-            con = sqlite3.connect(path)
-            try:
-                con.execute(
-                    """
-                    UPDATE skill_queue
-                    SET status='queued', claimed_at=NULL
-                    WHERE id=?
-                    """,
-                    (row_id,),
-                )
-                con.commit()
-            finally:
-                con.close()
+            con = self._connection()
+            con.execute(
+                """
+                UPDATE skill_queue
+                SET status='queued', claimed_at=NULL, owner=NULL, lease_until=NULL
+                WHERE id=?
+                """,
+                (row_id,),
+            )
+            con.commit()
+
+    def _require_lease(self) -> ClaimLease:
+        lease = self._lease
+        if lease is None:
+            raise RuntimeError("SQLite skill queue backend requires a claim lease")
+        return lease
 
     def _require_persist_path(self) -> Path:
         path = self._persist_path
@@ -24,6 +24,7 @@ from opta_lmx.skills.manifest import (
     validate_skill_arguments,
 )
 from opta_lmx.skills.policy import PolicyDecision, SkillsPolicy
+from opta_lmx.skills.worker_pool import SkillWorkerPool
 
 
 class SkillExecutionResult(BaseModel):
@@ -44,7 +45,12 @@ class SkillExecutionResult(BaseModel):
 
 
 class SkillExecutor:
-    """Execute skills using either template rendering or Python entrypoints."""
+    """Execute skills using either template rendering or Python entrypoints.
+
+    With a ``worker_pool``, entrypoints run in warm worker processes that are
+    killed on timeout. Without one they run in-process on a helper thread,
+    which cannot be stopped once its timeout expires.
+    """
 
     def __init__(
         self,
@@ -57,8 +63,10 @@ class SkillExecutor:
         sandbox_allowed_entrypoint_modules: Sequence[str] | None = None,
         otel_enabled: bool = False,
         otel_service_name: str = "opta-lmx",
+        worker_pool: SkillWorkerPool | None = None,
     ) -> None:
         self._policy = policy or SkillsPolicy()
+        self._worker_pool = worker_pool
         self._default_timeout_sec = default_timeout_sec
         self._semaphore = threading.BoundedSemaphore(value=max(1, max_concurrent_calls))
         self._module_search_paths = tuple(
@@ -241,6 +249,13 @@ class SkillExecutor:
             raise ValueError("entrypoint is required for entrypoint kind")
 
         module_name, function_name = manifest.entrypoint.split(":", maxsplit=1)
+        if self._worker_pool is not None:
+            return self._worker_pool.call(
+                manifest.name,
+                manifest.entrypoint,
+                arguments,
+                timeout_sec=timeout_sec,
+            )
 
         with self._temporary_module_paths():
             module = importlib.import_module(module_name)
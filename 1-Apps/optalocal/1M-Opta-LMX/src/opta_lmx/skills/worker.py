@@ -0,0 +1,127 @@
+"""Isolated child-process worker for entrypoint skills.
+
+Started by :class:`~opta_lmx.skills.worker_pool.SkillWorkerPool` as
+``python -m opta_lmx.skills.worker --serve [--path DIR ...]``. The listed
+directories are put on ``sys.path``, a ``{"ready": true}`` line is written,
+then each stdin line ``{"entrypoint": "module:function", "arguments": {...}}``
+is answered by one stdout line ``{"ok": true, "output": ...}`` or
+``{"ok": false, "error": "..."}``.
+
+Imported skill modules stay in ``sys.modules`` for the life of the worker,
+and async entrypoints run on one long-lived event loop, so repeat calls
+skip both import and loop set-up. Replies carry ``cold_import_ms`` when the
+call had to import its module first.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any, cast
+
+from pydantic_core import to_jsonable_python
+
+
+def _resolve(entrypoint: str) -> tuple[Callable[..., object], float | None]:
+    """Import the entrypoint's module (if needed) and return (function, import_ms)."""
+    module_name, function_name = entrypoint.split(":", maxsplit=1)
+    import_ms: float | None = None
+    module = sys.modules.get(module_name)
+    if module is None:
+        started = time.perf_counter()
+        module = importlib.import_module(module_name)
+        import_ms = (time.perf_counter() - started) * 1000
+
+    function_candidate = getattr(module, function_name, None)
+    if function_candidate is None or not callable(function_candidate):
+        raise ValueError(f"entrypoint function not found: {entrypoint}")
+    return cast(Callable[..., object], function_candidate), import_ms
+
+
+def _invoke(
+    loop: asyncio.AbstractEventLoop,
+    function: Callable[..., object],
+    arguments: Mapping[str, object],
+) -> object:
+    result = function(**arguments)
+    if inspect.isawaitable(result):
+        return loop.run_until_complete(_await_result(cast(Awaitable[object], result)))
+    return result
+
+
+async def _await_result(awaitable: Awaitable[object]) -> object:
+    return await awaitable
+
+
+def _handle(loop: asyncio.AbstractEventLoop, raw: str) -> dict[str, Any]:
+    import_ms: float | None = None
+    try:
+        request = json.loads(raw)
+        if not isinstance(request, dict):
+            raise ValueError("skill call payload must be a JSON object")
+        function, import_ms = _resolve(str(request["entrypoint"]))
+        arguments = request.get("arguments") or {}
+        output = _invoke(loop, function, arguments)
+        reply: dict[str, Any] = {
+            "ok": True,
+            "output": to_jsonable_python(output, fallback=str),
+        }
+    except Exception as exc:
+        reply = {"ok": False, "error": str(exc)}
+    if import_ms is not None:
+        reply["cold_import_ms"] = round(import_ms, 3)
+    return reply
+
+
+def serve(paths: list[str]) -> int:
+    """Answer skill call lines from stdin until EOF."""
+    # Keep the protocol stream private: skills printing to stdout (including
+    # native libraries) are redirected to stderr.
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    for path in reversed(paths):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    _write_json_line(protocol, {"ready": True, "pid": os.getpid()})
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        for raw in sys.stdin:
+            if raw.strip():
+                _write_json_line(protocol, _handle(loop, raw))
+    finally:
+        loop.close()
+    return 0
+
+
+def _write_json_line(stream: Any, payload: dict[str, Any]) -> None:
+    stream.write(json.dumps(payload, sort_keys=True))
+    stream.write("\n")
+    stream.flush()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse ``--serve [--path DIR ...]`` and run the serve loop."""
+    args = sys.argv[1:] if argv is None else argv
+    if not args or args[0] != "--serve":
+        sys.stderr.write("usage: python -m opta_lmx.skills.worker --serve [--path DIR ...]\n")
+        return 2
+    paths: list[str] = []
+    rest = iter(args[1:])
+    for arg in rest:
+        if arg == "--path":
+            paths.append(next(rest, ""))
+    return serve([p for p in paths if p])
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,491 @@
+"""Persistent process pool for entrypoint skills.
+
+Running skills on throwaway threads cannot enforce a timeout: Python threads
+cannot be cancelled, so a skill that hangs keeps burning CPU until the
+server restarts. The pool instead keeps ``size`` long-lived
+``python -m opta_lmx.skills.worker --serve`` processes and sends them skill
+calls as JSON lines over their stdin/stdout pipes.
+
+- Workers keep skill modules imported and run async entrypoints on their own
+  event loop; calls are routed to an idle worker that has already imported
+  the skill's module when there is one.
+- A call that exceeds its timeout kills its worker (the only way to stop
+  it). A replacement is spawned in the background so the pool stays warm.
+  The timeout also bounds spawning a worker for the call and reading its
+  reply, which is read without blocking so a partial line cannot hang it.
+- A worker that dies mid-call is reported as a failed call and replaced.
+- Workers are recycled after ``max_calls_per_worker`` calls to bound leaks.
+- Worker stderr (where skill output and tracebacks go) is read line by line
+  and logged as ``skill_worker_stderr`` instead of sharing the server's stderr.
+- ``per_skill_max_concurrency`` (with ``per_skill_concurrency`` overrides by
+  skill name) caps how many workers one skill can occupy at once.
+
+The pool is synchronous and thread-safe: :class:`SkillExecutor` calls it
+from dispatcher threads.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import select
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _SkillWorker:
+    """One warm skill worker process and its bookkeeping."""
+
+    proc: subprocess.Popen[bytes]
+    spawned_at: float = field(default_factory=time.monotonic)
+    calls: int = 0
+    modules: set[str] = field(default_factory=set)
+    buffer: bytearray = field(default_factory=bytearray)
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+
+class SkillWorkerPool:
+    """Supervised pool of warm skill worker processes with hard timeouts."""
+
+    def __init__(
+        self,
+        size: int = 4,
+        *,
+        module_search_paths: Sequence[Path] | None = None,
+        per_skill_max_concurrency: int | None = None,
+        per_skill_concurrency: Mapping[str, int] | None = None,
+        max_calls_per_worker: int = 256,
+        spawn_timeout_sec: float = 30.0,
+        python_executable: str | None = None,
+        worker_module: str = "opta_lmx.skills.worker",
+    ) -> None:
+        if size < 1:
+            raise ValueError("Skill worker pool size must be at least 1")
+        self._size = size
+        self._module_search_paths = [
+            str(Path(path).expanduser()) for path in (module_search_paths or [])
+        ]
+        self._per_skill_max = per_skill_max_concurrency
+        self._per_skill_overrides = dict(per_skill_concurrency or {})
+        self._max_calls_per_worker = max(1, max_calls_per_worker)
+        self._spawn_timeout_sec = spawn_timeout_sec
+        self._python_executable = python_executable or sys.executable
+        self._worker_module = worker_module
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._skill_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._idle: list[_SkillWorker] = []
+        self._running = False
+
+        self._busy = 0
+        self._spawning = 0
+        self._calls_total = 0
+        self._reused_total = 0
+        self._warm_calls_total = 0
+        self._cold_imports_total = 0
+        self._cold_import_ms_total = 0.0
+        self._spawned_total = 0
+        self._spawn_failures = 0
+        self._killed_total = 0
+        self._crashes_total = 0
+        self._recycled_total = 0
+        self._throttled_total = 0
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────
+
+    @property
+    def size(self) -> int:
+        """Maximum number of concurrent workers."""
+        return self._size
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the pool has been started and not closed."""
+        return self._running
+
+    def start(self, *, prewarm: bool = True) -> None:
+        """Open the pool, spawning every worker up front when ``prewarm`` is set.
+
+        Workers that fail to start (or are not pre-warmed) are spawned on first use.
+        """
+        if self._running:
+            return
+        self._running = True
+        if not prewarm:
+            return
+        # Launch all processes before waiting so their start-up overlaps.
+        procs = [self._popen() for _ in range(self._size)]
+        for proc in procs:
+            try:
+                worker = self._await_ready(proc, self._spawn_timeout_sec)
+            except Exception:
+                continue
+            with self._lock:
+                if len(self._idle) + self._busy < self._size:
+                    self._idle.append(worker)
+                    continue
+            self._retire(worker)
+        logger.info(
+            "skill_pool_started",
+            extra={"size": self._size, "warm_workers": len(self._idle)},
+        )
+
+    def close(self) -> None:
+        """Stop every idle worker; busy workers are stopped as their calls finish."""
+        self._running = False
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            self._retire(worker)
+        logger.info("skill_pool_closed", extra=self.stats())
+
+    # ── Calls ─────────────────────────────────────────────────────────────
+
+    def call(
+        self,
+        skill_name: str,
+        entrypoint: str,
+        arguments: Mapping[str, object],
+        *,
+        timeout_sec: float,
+    ) -> object:
+        """Run ``entrypoint`` on a warm worker and return its output.
+
+        ``timeout_sec`` covers waiting for a slot as well as the call itself.
+
+        Raises:
+            TimeoutError: No slot freed up in time, or the call overran and
+                its worker was killed.
+            RuntimeError: The skill raised, or its worker crashed.
+        """
+        if not self._running:
+            raise RuntimeError("Skill worker pool is not running")
+        deadline = time.monotonic() + timeout_sec
+        skill_slot = self._skill_slot(skill_name)
+        if skill_slot is not None and not skill_slot.acquire(blocking=False):
+            with self._lock:
+                self._throttled_total += 1
+            if not skill_slot.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                raise TimeoutError(
+                    f"skill '{skill_name}' concurrency limit reached for {timeout_sec:.3f}s"
+                )
+        try:
+            if not self._slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                raise TimeoutError(f"no skill worker available within {timeout_sec:.3f}s")
+            try:
+                return self._call_on_worker(entrypoint, arguments, deadline, timeout_sec)
+            finally:
+                self._slots.release()
+        finally:
+            if skill_slot is not None:
+                skill_slot.release()
+
+    def _call_on_worker(
+        self,
+        entrypoint: str,
+        arguments: Mapping[str, object],
+        deadline: float,
+        timeout_sec: float,
+    ) -> object:
+        module_name = entrypoint.split(":", maxsplit=1)[0]
+        worker = self._take_idle(module_name)
+        reused = worker is not None
+        if worker is None:
+            try:
+                worker = self._spawn(deadline)
+            except TimeoutError:
+                self._replenish_in_background()
+                raise
+        with self._lock:
+            self._busy += 1
+            self._calls_total += 1
+            self._reused_total += int(reused)
+
+        try:
+            reply = self._exchange(worker, entrypoint, arguments, deadline, timeout_sec)
+        except BaseException:
+            self._kill(worker)
+            with self._lock:
+                self._busy -= 1
+            self._replenish_in_background()
+            raise
+        with self._lock:
+            self._busy -= 1
+        self._release(worker)
+
+        worker.modules.add(module_name)
+        with self._lock:
+            if "cold_import_ms" in reply:
+                self._cold_imports_total += 1
+                self._cold_import_ms_total += float(reply["cold_import_ms"])
+            else:
+                self._warm_calls_total += 1
+        if not reply.get("ok"):
+            raise RuntimeError(str(reply.get("error") or "skill failed"))
+        return reply.get("output")
+
+    def _exchange(
+        self,
+        worker: _SkillWorker,
+        entrypoint: str,
+        arguments: Mapping[str, object],
+        deadline: float,
+        timeout_sec: float,
+    ) -> dict[str, Any]:
+        """Send one call and read one reply, killing the worker on timeout."""
+        assert worker.proc.stdin is not None and worker.proc.stdout is not None
+        payload = {"entrypoint": entrypoint, "arguments": dict(arguments)}
+        line = json.dumps(payload, default=str).encode("utf-8") + b"\n"
+        worker.calls += 1
+        try:
+            worker.proc.stdin.write(line)
+            worker.proc.stdin.flush()
+            raw = self._read_line(worker, deadline)
+        except OSError:
+            raw = b""
+
+        if raw is None:
+            self._kill(worker)
+            with self._lock:
+                self._killed_total += 1
+            logger.warning(
+                "skill_worker_killed",
+                extra={
+                    "pid": worker.proc.pid,
+                    "entrypoint": entrypoint,
+                    "timeout_sec": timeout_sec,
+                },
+            )
+            raise TimeoutError(f"skill execution exceeded timeout ({timeout_sec:.3f}s)")
+        if not raw:
+            self._kill(worker)
+            with self._lock:
+                self._crashes_total += 1
+            logger.warning(
+                "skill_worker_crashed",
+                extra={"pid": worker.proc.pid, "returncode": worker.proc.returncode},
+            )
+            raise RuntimeError(
+                f"skill worker exited unexpectedly (exit code {worker.proc.returncode})"
+            )
+
+        try:
+            reply = json.loads(raw)
+            if not isinstance(reply, dict):
+                raise ValueError("worker reply must be a JSON object")
+        except ValueError as exc:
+            self._kill(worker)
+            raise RuntimeError(f"Invalid skill worker reply: {exc}") from exc
+        return reply
+
+    @staticmethod
+    def _read_line(worker: _SkillWorker, deadline: float) -> bytes | None:
+        """Read one line from the worker's stdout without blocking past ``deadline``.
+
+        Returns None on timeout and ``b""`` if the worker closed its stdout.
+        """
+        assert worker.proc.stdout is not None
+        fd = worker.proc.stdout.fileno()
+        while (end := worker.buffer.find(b"\n")) < 0:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                return None
+            try:
+                chunk = os.read(fd, 65536)
+            except BlockingIOError:
+                continue
+            if not chunk:
+                return b""
+            worker.buffer += chunk
+        line = bytes(worker.buffer[: end + 1])
+        del worker.buffer[: end + 1]
+        return line
+
+    def _release(self, worker: _SkillWorker) -> None:
+        """Return a worker to the idle list, or retire it if it is due for recycling."""
+        with self._lock:
+            recycle = worker.calls >= self._max_calls_per_worker
+            if self._running and not recycle and len(self._idle) + self._busy < self._size:
+                self._idle.append(worker)
+                return
+            self._recycled_total += int(recycle)
+        self._retire(worker)
+        if recycle:
+            self._replenish_in_background()
+
+    def _skill_slot(self, skill_name: str) -> threading.BoundedSemaphore | None:
+        limit = self._per_skill_overrides.get(skill_name, self._per_skill_max)
+        if limit is None or limit >= self._size:
+            return None
+        with self._lock:
+            slot = self._skill_slots.get(skill_name)
+            if slot is None:
+                slot = self._skill_slots[skill_name] = threading.BoundedSemaphore(max(1, limit))
+            return slot
+
+    # ── Worker management ─────────────────────────────────────────────────
+
+    def _take_idle(self, module_name: str) -> _SkillWorker | None:
+        """Pop an idle worker, preferring one that already imported ``module_name``."""
+        dead: list[_SkillWorker] = []
+        with self._lock:
+            for worker in [w for w in self._idle if not w.alive]:
+                self._idle.remove(worker)
+                dead.append(worker)
+            self._crashes_total += len(dead)
+            chosen: _SkillWorker | None = None
+            if self._idle:
+                warm = [w for w in self._idle if module_name in w.modules]
+                chosen = warm[-1] if warm else self._idle[-1]
+                self._idle.remove(chosen)
+        for worker in dead:
+            self._kill(worker)
+        return chosen
+
+    def _popen(self) -> subprocess.Popen[bytes]:
+        args = [self._python_executable, "-m", self._worker_module, "--serve"]
+        for path in self._module_search_paths:
+            args += ["--path", path]
+        proc = subprocess.Popen(
+            args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        assert proc.stdout is not None
+        os.set_blocking(proc.stdout.fileno(), False)
+        threading.Thread(
+            target=self._log_stderr, args=(proc,), name="skill-worker-stderr", daemon=True
+        ).start()
+        return proc
+
+    @staticmethod
+    def _log_stderr(proc: subprocess.Popen[bytes]) -> None:
+        """Log a worker's stderr line by line until the worker closes it."""
+        assert proc.stderr is not None
+        with proc.stderr, contextlib.suppress(ValueError, OSError):
+            for raw in proc.stderr:
+                line = raw.decode("utf-8", errors="replace").rstrip()
+                if line:
+                    logger.info("skill_worker_stderr", extra={"pid": proc.pid, "line": line})
+
+    def _await_ready(self, proc: subprocess.Popen[bytes], timeout_sec: float) -> _SkillWorker:
+        worker = _SkillWorker(proc=proc)
+        try:
+            line = self._read_line(worker, time.monotonic() + timeout_sec)
+            if line is None:
+                raise TimeoutError(f"skill worker not ready within {timeout_sec:.3f}s")
+            if not json.loads(line or b"{}").get("ready"):
+                raise RuntimeError("skill worker exited before signalling ready")
+        except Exception:
+            with self._lock:
+                self._spawn_failures += 1
+            self._kill(worker)
+            raise
+        with self._lock:
+            self._spawned_total += 1
+        return worker
+
+    def _spawn(self, deadline: float | None = None) -> _SkillWorker:
+        """Start a worker, waiting no longer than ``deadline`` when a call is waiting on it.
+
+        Raises:
+            TimeoutError: ``deadline`` passed before the worker was ready.
+            RuntimeError: The worker failed to start.
+        """
+        timeout = self._spawn_timeout_sec
+        if deadline is not None:
+            timeout = min(timeout, max(0.0, deadline - time.monotonic()))
+        try:
+            return self._await_ready(self._popen(), timeout)
+        except TimeoutError as exc:
+            if timeout < self._spawn_timeout_sec:
+                raise TimeoutError(
+                    f"no skill worker started before the call timed out: {exc}"
+                ) from exc
+            raise RuntimeError(f"Skill worker failed to start: {exc}") from exc
+        except Exception as exc:
+            raise RuntimeError(f"Skill worker failed to start: {exc}") from exc
+
+    def _replenish_in_background(self) -> None:
+        """Spawn a replacement off the caller's thread if the pool is short a worker."""
+        with self._lock:
+            if not self._running or len(self._idle) + self._busy + self._spawning >= self._size:
+                return
+            self._spawning += 1
+        threading.Thread(target=self._replenish, name="skill-pool-replenish", daemon=True).start()
+
+    def _replenish(self) -> None:
+        try:
+            worker = self._spawn()
+        except RuntimeError:
+            return
+        finally:
+            with self._lock:
+                self._spawning -= 1
+        with self._lock:
+            if self._running and len(self._idle) + self._busy < self._size:
+                self._idle.append(worker)
+                return
+        self._retire(worker)
+
+    def _kill(self, worker: _SkillWorker) -> None:
+        if worker.alive:
+            with contextlib.suppress(ProcessLookupError):
+                worker.proc.kill()
+        with contextlib.suppress(Exception):
+            worker.proc.wait(timeout=5.0)
+        self._close_pipes(worker)
+
+    def _retire(self, worker: _SkillWorker) -> None:
+        """Stop a worker gracefully (EOF on stdin), killing it if it lingers."""
+        if worker.alive and worker.proc.stdin is not None:
+            with contextlib.suppress(Exception):
+                worker.proc.stdin.close()
+            with contextlib.suppress(subprocess.TimeoutExpired):
+                worker.proc.wait(timeout=2.0)
+        self._kill(worker)
+
+    @staticmethod
+    def _close_pipes(worker: _SkillWorker) -> None:
+        for stream in (worker.proc.stdin, worker.proc.stdout):
+            if stream is not None:
+                with contextlib.suppress(Exception):
+                    stream.close()
+
+    # ── Metrics ───────────────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, float | int]:
+        """Idle/busy workers plus call, reuse, cold-import, spawn and failure totals."""
+        with self._lock:
+            return {
+                "size": self._size,
+                "workers_idle": len(self._idle),
+                "workers_busy": self._busy,
+                "calls_total": self._calls_total,
+                "worker_reuse_total": self._reused_total,
+                "warm_calls_total": self._warm_calls_total,
+                "cold_imports_total": self._cold_imports_total,
+                "cold_import_ms_total": round(self._cold_import_ms_total, 3),
+                "workers_spawned_total": self._spawned_total,
+                "spawn_failures_total": self._spawn_failures,
+                "workers_killed_total": self._killed_total,
+                "workers_crashed_total": self._crashes_total,
+                "workers_recycled_total": self._recycled_total,
+                "skill_throttled_total": self._throttled_total,
+            }
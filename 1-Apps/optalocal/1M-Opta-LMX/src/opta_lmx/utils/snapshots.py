@@ -0,0 +1,25 @@
+"""Locating a model's weights on local disk."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+
+def resolve_snapshot_path(model_id: str) -> Path | None:
+    """Local directory holding ``model_id``'s weights, if it is on disk.
+
+    ``model_id`` may be a directory path or a Hugging Face repo ID already in
+    the local hub cache; nothing is downloaded.
+    """
+    direct = Path(model_id).expanduser()
+    if direct.is_dir():
+        return direct
+    try:
+        from huggingface_hub import try_to_load_from_cache
+
+        config_path = try_to_load_from_cache(model_id, "config.json")
+    except Exception:
+        return None
+    if isinstance(config_path, str):
+        return Path(config_path).parent
+    return None
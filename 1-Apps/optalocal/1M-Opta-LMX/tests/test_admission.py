@@ -0,0 +1,283 @@
+"""Tests for latency-aware admission control."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from opta_lmx.inference.admission import AdmissionController, AdmissionRejectedError
+from opta_lmx.inference.engine import InferenceEngine
+from opta_lmx.inference.fake_backend import FakeBackendProfile
+from opta_lmx.inference.schema import ChatMessage
+from opta_lmx.manager.memory import MemoryMonitor
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _controller(clock: _Clock, **kwargs: object) -> AdmissionController:
+    params: dict[str, object] = {
+        "max_queue_depth": 4,
+        "max_queue_wait_sec": 10.0,
+        "codel_target_sec": 1.0,
+        "codel_interval_sec": 5.0,
+        "clock": clock,
+    }
+    params.update(kwargs)
+    return AdmissionController(**params)  # type: ignore[arg-type]
+
+
+def _admit(ctrl: AdmissionController, **kwargs: object):  # type: ignore[no-untyped-def]
+    params: dict[str, object] = {
+        "model_id": "m",
+        "priority": "normal",
+        "prompt_tokens": 0,
+        "max_tokens": 100,
+        "capacity": 1,
+    }
+    params.update(kwargs)
+    return ctrl.admit(**params)  # type: ignore[arg-type]
+
+
+def test_queue_depth_limit_and_low_priority_share() -> None:
+    ctrl = _controller(_Clock())
+    _admit(ctrl)
+    _admit(ctrl)
+    with pytest.raises(AdmissionRejectedError) as low:
+        _admit(ctrl, priority="low")
+    assert low.value.reason == "queue_full"
+
+    _admit(ctrl)
+    _admit(ctrl)
+    with pytest.raises(AdmissionRejectedError, match="Server is busy") as full:
+        _admit(ctrl)
+    assert full.value.reason == "queue_full"
+    assert ctrl.stats()["rejected_queue_full_total"] == 2
+    assert ctrl.stats()["admitted_total"] == 4
+
+
+def test_service_time_model_drives_wait_prediction_and_retry_after() -> None:
+    clock = _Clock()
+    ctrl = _controller(clock)
+    # 2s for 100 output tokens + 100 prompt tokens (110 units).
+    ctrl.record_service("m", 2.2, prompt_tokens=100, completion_tokens=100)
+    assert ctrl.predict_service_sec("m", 0, 100) == pytest.approx(2.0)
+    assert ctrl.predict_service_sec("other", 0, 100) is None
+
+    running = _admit(ctrl)
+    ctrl.start(running, capacity=1)
+    for _ in range(3):
+        _admit(ctrl)
+    clock.now += 0.5
+    # 1.5s left on the running request + 3 queued at 2s each.
+    assert ctrl.predicted_queue_wait_sec("m", capacity=1) == pytest.approx(7.5)
+    assert ctrl.retry_after_sec("m", capacity=1) == 8
+    assert ctrl.retry_after_sec("m", capacity=4) == 2
+
+    ctrl.finish(running)
+    assert ctrl.stats()["running"] == 0
+
+
+def test_wait_counts_only_until_the_earliest_slot_frees() -> None:
+    clock = _Clock()
+    ctrl = _controller(clock, max_queue_wait_sec=30.0)
+    # 0.03s per token, and completions typically stop at 100 tokens.
+    ctrl.record_service("m", 3.0, prompt_tokens=0, completion_tokens=100)
+    long_budget = _admit(ctrl, max_tokens=4096)
+    ctrl.start(long_budget, capacity=4)
+    assert long_budget.predicted_service_sec == pytest.approx(3.0)
+
+    # Three slots are still free: a short request does not wait at all.
+    assert ctrl.predicted_queue_wait_sec("m", capacity=4) == 0.0
+    short = _admit(ctrl, max_tokens=16, capacity=4)
+    assert short.predicted_service_sec == pytest.approx(0.48)
+
+    for _ in range(2):
+        ctrl.start(_admit(ctrl, capacity=4), capacity=4)
+    ctrl.start(short, capacity=4)
+    clock.now += 0.2
+    # All four slots busy: the wait ends when the 16-token request frees its slot.
+    assert ctrl.predicted_queue_wait_sec("m", capacity=4) == pytest.approx(0.28)
+
+
+def test_predicted_wait_and_deadline_rejections() -> None:
+    ctrl = _controller(_Clock(), max_queue_depth=64)
+    ctrl.record_service("m", 3.0, prompt_tokens=0, completion_tokens=100)
+    for _ in range(3):
+        _admit(ctrl)
+
+    # 9s queued ahead + 3s to run misses a 10s client timeout...
+    with pytest.raises(AdmissionRejectedError) as deadline:
+        _admit(ctrl, deadline_sec=10.0)
+    assert deadline.value.reason == "deadline_unreachable"
+    # ...but a shorter output budget fits.
+    _admit(ctrl, max_tokens=30, deadline_sec=10.0)
+
+    _admit(ctrl)
+    with pytest.raises(AdmissionRejectedError) as wait:
+        _admit(ctrl)
+    assert wait.value.reason == "predicted_queue_wait"
+    assert wait.value.retry_after_sec == 13
+
+
+def test_models_queue_against_their_own_capacity() -> None:
+    clock = _Clock()
+    ctrl = _controller(clock, max_queue_depth=2)
+    ctrl.record_service("slow", 5.0, prompt_tokens=0, completion_tokens=100)
+    ctrl.record_service("fast", 0.5, prompt_tokens=0, completion_tokens=100)
+    ctrl.start(_admit(ctrl, model_id="slow"), capacity=1)
+    for _ in range(2):
+        _admit(ctrl, model_id="slow")
+    with pytest.raises(AdmissionRejectedError) as full:
+        _admit(ctrl, model_id="slow")
+    assert full.value.reason == "queue_full"
+    assert full.value.retry_after_sec == 15
+
+    # The slow model's backlog neither fills nor delays the fast model's queue.
+    assert ctrl.predicted_queue_wait_sec("fast", capacity=1) == 0.0
+    fast = _admit(ctrl, model_id="fast")
+    ctrl.start(fast, capacity=1)
+    _admit(ctrl, model_id="fast")
+    clock.now += 0.1
+    assert ctrl.predicted_queue_wait_sec("fast", capacity=1) == pytest.approx(0.9)
+    assert ctrl.predicted_queue_wait_sec("slow", capacity=1) == pytest.approx(14.9)
+    assert ctrl.predicted_queue_wait_sec(None, capacity=1) == pytest.approx(14.9)
+    assert ctrl.retry_after_sec("fast", capacity=1) == 1
+
+    ctrl.finish(fast)
+    stats = ctrl.stats()
+    assert stats["queued"] == 3 and stats["running"] == 1
+    assert stats["admitted_total"] == 5
+
+
+def test_codel_detects_standing_queue_and_sheds() -> None:
+    clock = _Clock()
+    ctrl = _controller(clock)
+    assert ctrl.queue_timeout_sec() == 10.0
+
+    # Every request waits 1.5s, past the 1s target, for a whole interval.
+    for _ in range(4):
+        ticket = _admit(ctrl)
+        clock.now += 1.5
+        ctrl.start(ticket, capacity=1)
+        ctrl.finish(ticket)
+    assert ctrl.overloaded is True
+    assert ctrl.queue_timeout_sec() == 2.0
+
+    with pytest.raises(AdmissionRejectedError) as low:
+        _admit(ctrl, priority="low")
+    assert low.value.reason == "overloaded"
+
+    stale = _admit(ctrl)
+    clock.now += 2.5
+    with pytest.raises(AdmissionRejectedError) as shed:
+        ctrl.start(stale, capacity=1)
+    assert shed.value.reason == "codel_shed"
+    assert ctrl.queued_count == 0
+
+    # A short queue for a whole interval clears the overload state.
+    for _ in range(3):
+        ticket = _admit(ctrl)
+        clock.now += 2.0
+        ctrl.start(ticket, capacity=1)
+        ctrl.finish(ticket)
+        ticket = _admit(ctrl)
+        ctrl.start(ticket, capacity=1)
+        ctrl.finish(ticket)
+    assert ctrl.overloaded is False
+    stats = ctrl.stats()
+    assert stats["overloaded"] == 0
+    assert stats["rejected_codel_shed_total"] == 1
+    assert all(isinstance(v, int | float) for v in stats.values())
+
+
+async def test_engine_sheds_burst_fast_on_fake_backend() -> None:
+    engine = InferenceEngine(
+        memory_monitor=MemoryMonitor(max_percent=100),
+        use_batching=False,
+        warmup_on_load=False,
+        max_concurrent_requests=1,
+        semaphore_timeout_sec=30.0,
+        adaptive_concurrency_enabled=False,
+        admission_max_queue_depth=2,
+        backend_preference_order=["fake"],
+        fake_backend_profile=FakeBackendProfile(
+            load_sec=0.0,
+            prefill_tokens_per_sec=1e6,
+            decode_tokens_per_sec=100.0,
+            jitter=0.0,
+        ),
+    )
+    model_id = "org/Llama-3-8B-4bit"
+    await engine.load_model(model_id)
+    messages = [ChatMessage(role="user", content="hello there")]
+    # A frozen clock keeps CoDel and wait predictions independent of machine speed.
+    engine._concurrency._admission = AdmissionController(
+        max_queue_depth=2, max_queue_wait_sec=30.0, clock=_Clock()
+    )
+
+    # Learn the model's service time from one request.
+    await engine.generate(model_id, messages, max_tokens=10)
+
+    results = await asyncio.gather(
+        *(engine.generate(model_id, messages, max_tokens=10) for _ in range(6)),
+        return_exceptions=True,
+    )
+    rejected = [r for r in results if isinstance(r, AdmissionRejectedError)]
+    served = [r for r in results if not isinstance(r, BaseException)]
+    assert len(served) == 3  # One running plus a queue of two.
+    assert len(rejected) == 3
+    # Shed at admission, not by waiting out the 30s slot timeout.
+    assert all(r.reason == "queue_full" and r.retry_after_sec >= 1 for r in rejected)
+
+    stats = engine.admission_stats()
+    assert stats["rejected_queue_full_total"] == 3
+    assert stats["queued"] == 0 and stats["running"] == 0
+    assert engine.admission_retry_after_sec() is not None
+    await engine.unload_model(model_id)
+
+
+async def test_engine_admits_each_model_against_its_own_queue() -> None:
+    engine = InferenceEngine(
+        memory_monitor=MemoryMonitor(max_percent=100),
+        use_batching=False,
+        warmup_on_load=False,
+        max_concurrent_requests=2,
+        semaphore_timeout_sec=30.0,
+        adaptive_concurrency_enabled=False,
+        admission_max_queue_depth=2,
+        backend_preference_order=["fake"],
+        fake_backend_profile=FakeBackendProfile(
+            load_sec=0.0,
+            prefill_tokens_per_sec=1e6,
+            decode_tokens_per_sec=100.0,
+            jitter=0.0,
+        ),
+    )
+    busy, quiet = "org/Llama-3-8B-4bit", "org/Qwen2-1.5B-4bit"
+    await engine.load_model(busy)
+    await engine.load_model(quiet)
+    messages = [ChatMessage(role="user", content="hello there")]
+    engine._concurrency._admission = AdmissionController(
+        max_queue_depth=2, max_queue_wait_sec=30.0, clock=_Clock()
+    )
+
+    results = await asyncio.gather(
+        *(engine.generate(busy, messages, max_tokens=10) for _ in range(8)),
+        *(engine.generate(quiet, messages, max_tokens=10) for _ in range(2)),
+        return_exceptions=True,
+    )
+    busy_results, quiet_results = results[:8], results[8:]
+    # The busy model's full queue sheds only its own requests.
+    assert any(isinstance(r, AdmissionRejectedError) for r in busy_results)
+    assert not any(isinstance(r, BaseException) for r in quiet_results)
+    stats = engine.admission_stats()
+    assert stats["queued"] == 0 and stats["running"] == 0
+    await engine.unload_model(busy)
+    await engine.unload_model(quiet)
@@ -3,11 +3,18 @@
 from __future__ import annotations
 
 import asyncio
+import time
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import cast
 
+import pytest
+
+from opta_lmx.agents.graph import GraphExecutor, StepInput
 from opta_lmx.agents.models import (
     AgentRequest,
+    AgentRun,
+    AgentStep,
     ExecutionStrategy,
     RunStatus,
     StepStatus,
@@ -24,6 +31,7 @@ from opta_lmx.inference.schema import (
     ResponseMessage,
     Usage,
 )
+from opta_lmx.monitoring.metrics import AgentRunMetric
 from opta_lmx.router.strategy import TaskRouter
 
 TERMINAL_RUN_STATES = {
@@ -684,3 +692,238 @@ async def test_runtime_tracks_token_usage(tmp_path: Path) -> None:
     assert run.status == RunStatus.COMPLETED
     # 3 steps * (5 prompt + 3 completion) = 24 tokens
     assert run.tokens_used == 24
+
+
+class StreamingEngine(FakeEngine):
+    """FakeEngine that also streams `role:input` one character at a time."""
+
+    def __init__(self, *, loaded_models: list[str], token_delay_sec: float = 0.0) -> None:
+        super().__init__(loaded_models=loaded_models)
+        self.token_delay_sec = token_delay_sec
+        self.stream_started: list[tuple[str, float]] = []
+        self.stream_finished: list[tuple[str, float]] = []
+        self.fail_before_first_token = 0
+
+    async def stream_generate(
+        self,
+        model_id: str,
+        messages: list[ChatMessage],
+        priority: str = "normal",
+        **_: object,
+    ) -> AsyncIterator[str]:
+        role = _extract_role(messages)
+        self.calls.append(role)
+        self.model_calls.append(model_id)
+        self.stream_started.append((role, time.monotonic()))
+        if self.fail_before_first_token > 0:
+            self.fail_before_first_token -= 1
+            raise RuntimeError("server is busy")
+        for char in f"{role}:{_extract_user_input(messages)}":
+            await asyncio.sleep(self.token_delay_sec)
+            yield char
+        self.stream_finished.append((role, time.monotonic()))
+
+
+class CollectingMetrics:
+    def __init__(self) -> None:
+        self.runs: list[AgentRunMetric] = []
+
+    def record_agent_run(self, metric: AgentRunMetric) -> None:
+        self.runs.append(metric)
+
+
+class CountingStateStore(AgentsStateStore):
+    def __init__(self, path: Path) -> None:
+        super().__init__(path=path)
+        self.upserts = 0
+
+    def upsert_run(self, run: AgentRun) -> None:
+        self.upserts += 1
+        super().upsert_run(run)
+
+
+async def test_streaming_steps_publish_deltas_and_ttft(tmp_path: Path) -> None:
+    engine = StreamingEngine(loaded_models=["model-a"])
+    metrics = CollectingMetrics()
+    runtime = _make_runtime(
+        tmp_path,
+        engine=engine,
+        runtime_overrides={"metrics_collector": metrics},
+    )
+    await runtime.start()
+    try:
+        submitted = await runtime.submit(
+            AgentRequest(
+                strategy=ExecutionStrategy.HANDOFF,
+                prompt="go",
+                roles=["planner", "coder"],
+                stream_steps=True,
+            )
+        )
+        deltas = runtime.subscribe_step_deltas(submitted.id)
+        await _wait_for_status(runtime, submitted.id, TERMINAL_RUN_STATES)
+        run = runtime.get(submitted.id)
+    finally:
+        await runtime.stop()
+
+    assert run is not None
+    assert run.status == RunStatus.COMPLETED
+    assert run.result == "coder:planner:go"
+    assert all(step.ttft_sec is not None for step in run.steps)
+    assert run.tokens_used > 0
+
+    received: dict[str, str] = {}
+    while not deltas.empty():
+        payload = deltas.get_nowait()
+        text = received.get(payload["step_id"], "")
+        assert payload["offset"] == len(text)
+        received[payload["step_id"]] = text + payload["delta"]
+    assert received == {step.id: step.output for step in run.steps}
+
+    assert len(metrics.runs) == 1
+    assert set(metrics.runs[0].step_ttft_sec) == {step.id for step in run.steps}
+    assert metrics.runs[0].first_token_sec is not None
+
+
+async def test_streaming_throttles_state_store_writes(tmp_path: Path) -> None:
+    engine = StreamingEngine(loaded_models=["model-a"], token_delay_sec=0.001)
+    store = CountingStateStore(tmp_path / "agent-runs.json")
+    runtime = AgentsRuntime(
+        engine=engine,
+        router=TaskRouter(RoutingConfig(aliases={}, default_model=None)),
+        state_store=store,
+        scheduler=RunScheduler(max_queue_size=4, worker_count=1),
+        stream_persist_interval_sec=10.0,
+    )
+    await runtime.start()
+    try:
+        submitted = await runtime.submit(
+            AgentRequest(
+                strategy=ExecutionStrategy.HANDOFF,
+                prompt="x" * 200,
+                roles=["planner"],
+                stream_steps=True,
+            )
+        )
+        await _wait_for_status(runtime, submitted.id, TERMINAL_RUN_STATES)
+        run = runtime.get(submitted.id)
+    finally:
+        await runtime.stop()
+
+    assert run is not None and run.status == RunStatus.COMPLETED
+    assert len(run.steps[0].output or "") > 200
+    # Submit, start, model resolution, step start/finish, usage, finish and a
+    # single throttled delta write — not one write per token.
+    assert store.upserts < 20
+
+
+async def test_streaming_retries_only_before_first_token(tmp_path: Path) -> None:
+    engine = StreamingEngine(loaded_models=["model-a"])
+    engine.fail_before_first_token = 1
+    runtime = _make_runtime(
+        tmp_path,
+        engine=engine,
+        runtime_overrides={"step_retry_attempts": 1, "step_retry_backoff_sec": 0.0},
+    )
+    await runtime.start()
+    try:
+        submitted = await runtime.submit(
+            AgentRequest(
+                strategy=ExecutionStrategy.HANDOFF,
+                prompt="go",
+                roles=["planner"],
+                stream_steps=True,
+            )
+        )
+        await _wait_for_status(runtime, submitted.id, TERMINAL_RUN_STATES)
+        run = runtime.get(submitted.id)
+    finally:
+        await runtime.stop()
+
+    assert run is not None
+    assert run.status == RunStatus.COMPLETED
+    assert run.result == "planner:go"
+    assert engine.calls == ["planner", "planner"]
+
+
+async def test_pipelined_handoff_matches_sequential_output(tmp_path: Path) -> None:
+    engine = StreamingEngine(loaded_models=["model-a"], token_delay_sec=0.001)
+    runtime = _make_runtime(tmp_path, engine=engine)
+    await runtime.start()
+    try:
+        submitted = await runtime.submit(
+            AgentRequest(
+                strategy=ExecutionStrategy.HANDOFF,
+                prompt="go",
+                roles=["planner", "coder", "reviewer"],
+                stream_steps=True,
+                pipeline_handoff=True,
+            )
+        )
+        await _wait_for_status(runtime, submitted.id, TERMINAL_RUN_STATES)
+        run = runtime.get(submitted.id)
+    finally:
+        await runtime.stop()
+
+    assert run is not None
+    assert run.status == RunStatus.COMPLETED
+    assert run.result == "reviewer:coder:planner:go"
+    assert [step.input for step in run.steps] == ["go", "planner:go", "coder:planner:go"]
+    assert [step.status for step in run.steps] == [StepStatus.COMPLETED] * 3
+
+
+async def test_pipelined_handoff_feeds_incremental_consumers() -> None:
+    run = AgentRun(
+        id="run-pipe",
+        request=AgentRequest(
+            strategy=ExecutionStrategy.HANDOFF,
+            prompt="abc",
+            roles=["upstream", "downstream"],
+            pipeline_handoff=True,
+        ),
+    )
+    events: list[str] = []
+
+    async def _stream(step: AgentStep, step_input: StepInput) -> AsyncIterator[str]:
+        async for chunk in step_input:
+            for char in chunk:
+                await asyncio.sleep(0.01)
+                events.append(f"{step.role}:{char}")
+                yield char.upper() if step.role == "downstream" else char * 2
+
+    async def _unused(role: str, step_input: str) -> str:
+        raise AssertionError("non-streaming runner called")
+
+    result = await GraphExecutor().execute(run, runner=_unused, stream_runner=_stream)
+
+    assert result == "AABBCC"
+    assert run.steps[1].input == "aabbcc"
+    # The downstream step starts before the upstream one has finished.
+    assert events.index("downstream:a") < events.index("upstream:c")
+
+
+async def test_pipelined_handoff_propagates_upstream_failure() -> None:
+    run = AgentRun(
+        id="run-pipe-fail",
+        request=AgentRequest(
+            strategy=ExecutionStrategy.HANDOFF,
+            prompt="abc",
+            roles=["upstream", "downstream"],
+            pipeline_handoff=True,
+        ),
+    )
+
+    async def _stream(step: AgentStep, step_input: StepInput) -> AsyncIterator[str]:
+        text = await step_input.text()
+        if step.role == "upstream":
+            yield text[0]
+            raise RuntimeError("upstream exploded")
+        yield text
+
+    async def _unused(role: str, step_input: str) -> str:
+        raise AssertionError("non-streaming runner called")
+
+    with pytest.raises(RuntimeError, match="upstream exploded"):
+        await GraphExecutor().execute(run, runner=_unused, stream_runner=_stream)
+    assert run.steps[0].status == StepStatus.FAILED
+    assert run.steps[1].status in {StepStatus.QUEUED, StepStatus.FAILED, StepStatus.CANCELLED}
@@ -108,3 +108,110 @@ async def test_sqlite_scheduler_preserves_queued_runs_across_restart(tmp_path: P
         await second.stop()
 
     assert processed == ["run-persist"]
+
+
+async def test_sqlite_scheduler_wakes_workers_on_submit(tmp_path: Path) -> None:
+    scheduler = RunScheduler(
+        max_queue_size=16,
+        worker_count=2,
+        backend="sqlite",
+        persist_path=tmp_path / "agents-queue.db",
+        poll_interval_sec=30.0,
+    )
+    processed: list[str] = []
+    done = asyncio.Event()
+
+    async def _handler(run_id: str) -> None:
+        processed.append(run_id)
+        if len(processed) == 3:
+            done.set()
+
+    await scheduler.start(_handler)
+    try:
+        # Let both workers go idle, then submit: a poll-based worker would
+        # not look again for poll_interval_sec.
+        await asyncio.sleep(0.05)
+        await scheduler.submit("run-a")
+        await scheduler.submit("run-b", priority="interactive")
+        await scheduler.submit("run-c")
+        await asyncio.wait_for(done.wait(), timeout=2.0)
+        stats = scheduler.stats()
+    finally:
+        await scheduler.stop()
+
+    assert sorted(processed) == ["run-a", "run-b", "run-c"]
+    assert stats["claimed_total"] == 3
+    assert stats["enqueue_to_start_count"] == 3
+    assert stats["enqueue_to_start_p99_ms"] < 2000
+    assert stats["idle_timeouts_total"] == 0
+
+
+async def test_sqlite_scheduler_claims_batch_in_priority_order(tmp_path: Path) -> None:
+    scheduler = RunScheduler(
+        max_queue_size=16,
+        worker_count=3,
+        backend="sqlite",
+        persist_path=tmp_path / "agents-queue.db",
+    )
+    for index, priority in enumerate([2, 1, 0, 1]):
+        await asyncio.to_thread(scheduler._db_enqueue, f"run-{index}", priority, index)
+
+    batch = await asyncio.to_thread(scheduler._db_claim_batch, 3)
+
+    assert [run_id for _, run_id, _ in batch] == ["run-2", "run-1", "run-3"]
+    assert scheduler.queue_size == 1
+    scheduler._close_db()
+
+
+async def test_sqlite_scheduler_reclaims_only_expired_peer_rows(tmp_path: Path) -> None:
+    queue_path = tmp_path / "agents-queue.db"
+    owner = RunScheduler(backend="sqlite", persist_path=queue_path, lease_sec=30.0)
+    await asyncio.to_thread(owner._db_enqueue, "run-live", 1, 0)
+    await asyncio.to_thread(owner._db_enqueue, "run-crashed", 1, 1)
+    claimed = await asyncio.to_thread(owner._db_claim_batch, 2)
+    assert [run_id for _, run_id, _ in claimed] == ["run-live", "run-crashed"]
+
+    # A peer starting up leaves rows under a live lease alone.
+    peer = RunScheduler(backend="sqlite", persist_path=queue_path, lease_sec=30.0)
+    assert peer.queue_size == 0
+
+    # Once the owner stops renewing, its rows are reclaimed.
+    with owner._db_lock:
+        owner._connection().execute("UPDATE run_queue SET lease_until=0 WHERE run_id='run-crashed'")
+        owner._connection().commit()
+    assert await asyncio.to_thread(peer._recover_running_rows) == 1
+    assert peer.queue_size == 1
+    assert peer.stats()["lease_reclaimed_total"] == 1
+
+    # The owner renews and, on shutdown, requeues only its own rows.
+    await asyncio.to_thread(owner._db_renew_leases)
+    assert await asyncio.to_thread(peer._recover_running_rows) == 0
+    assert await asyncio.to_thread(owner._recover_running_rows, own=True) == 1
+    assert peer.queue_size == 2
+    owner._close_db()
+    peer._close_db()
+
+
+async def test_sqlite_scheduler_renews_lease_while_run_is_active(tmp_path: Path) -> None:
+    queue_path = tmp_path / "agents-queue.db"
+    scheduler = RunScheduler(backend="sqlite", persist_path=queue_path, lease_sec=0.06)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _handler(_: str) -> None:
+        started.set()
+        await release.wait()
+
+    await scheduler.start(_handler)
+    try:
+        await scheduler.submit("run-long")
+        await asyncio.wait_for(started.wait(), timeout=2.0)
+        # Several lease periods pass; renewals keep a peer from reclaiming the run.
+        await asyncio.sleep(0.2)
+        peer = RunScheduler(backend="sqlite", persist_path=queue_path, lease_sec=0.06)
+        assert peer.queue_size == 0
+        peer._close_db()
+        assert scheduler.stats()["lease_renewals_total"] >= 2
+    finally:
+        release.set()
+        await scheduler.stop()
@@ -0,0 +1,214 @@
+"""Tests for the successive-halving autotune search."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from opta_lmx.inference.autotune_registry import AutotuneRegistry
+from opta_lmx.inference.autotune_search import (
+    AutotuneSearch,
+    Knob,
+    candidate_profiles,
+    measure_under_load,
+    split_hot,
+)
+from opta_lmx.inference.engine_autotune import EngineAutotuneDelegator
+
+
+class FakeEngine:
+    """Token delay shrinks with kv_bits and max_num_seqs; one profile fails to load."""
+
+    def __init__(self, *, hot_supported: bool = True) -> None:
+        self.hot_supported = hot_supported
+        self.profile: dict[str, Any] | None = None
+        self.loads: list[dict[str, Any]] = []
+        self.active = 0
+        self.peak_active = 0
+
+    def is_model_loaded(self, model_id: str) -> bool:
+        return self.profile is not None
+
+    async def unload_model(self, model_id: str, *, reason: str = "manual") -> float:
+        self.profile = None
+        return 0.0
+
+    async def load_model(self, model_id: str, **kwargs: Any) -> None:
+        profile = kwargs["performance_overrides"] or {}
+        if profile.get("kv_bits") == 2:
+            raise MemoryError("no room")
+        self.loads.append(profile)
+        self.profile = profile
+
+    def apply_hot_overrides(self, model_id: str, overrides: dict[str, Any]) -> bool:
+        if not self.hot_supported or self.profile is None:
+            return False
+        self.profile = {**self.profile, **overrides}
+        return True
+
+    async def stream_generate(self, **kwargs: Any) -> AsyncIterator[str]:
+        assert self.profile is not None
+        speed = self.profile.get("kv_bits", 1) * self.profile.get("scheduler", {}).get(
+            "max_num_seqs", 1
+        )
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            for _ in range(4):
+                await asyncio.sleep(0.02 / speed)
+                yield "t"
+        finally:
+            self.active -= 1
+
+    def pop_queue_wait_seconds(self) -> float | None:
+        return 0.004
+
+
+def _search(engine: FakeEngine, **kwargs: Any) -> AutotuneSearch:
+    return AutotuneSearch(
+        engine,
+        compose=lambda candidate: dict(candidate),
+        prompt="hi",
+        max_tokens=4,
+        temperature=0.0,
+        **kwargs,
+    )
+
+
+def test_candidate_profiles_seeds_first_and_deterministic() -> None:
+    space = (Knob("kv_bits", (None, 4, 8)), Knob("scheduler.max_num_seqs", (8, 16), hot=True))
+    seed = {"kv_bits": 8, "scheduler": {"max_num_seqs": 16}}
+    first = candidate_profiles(space, max_candidates=4, seeds=[seed])
+    assert first[0] == seed
+    assert len(first) == 4
+    assert first == candidate_profiles(space, max_candidates=4, seeds=[seed])
+    assert {"scheduler": {"max_num_seqs": 8}} in candidate_profiles(space, max_candidates=6)
+
+
+def test_split_hot_separates_reload_free_knobs() -> None:
+    profile = {"kv_bits": 4, "stream_interval": 2, "scheduler": {"max_num_seqs": 8}}
+    cold, hot = split_hot(profile)
+    assert cold == {"kv_bits": 4}
+    assert hot == {"stream_interval": 2, "scheduler": {"max_num_seqs": 8}}
+    assert profile["scheduler"] == {"max_num_seqs": 8}
+
+
+async def test_measure_under_load_runs_at_target_concurrency() -> None:
+    engine = FakeEngine()
+    engine.profile = {"kv_bits": 4}
+    metrics = await measure_under_load(
+        engine, "m", requests=8, concurrency=4, prompt="hi", max_tokens=4, temperature=0.0
+    )
+    assert engine.peak_active == 4
+    assert metrics["error_rate"] == 0.0
+    # The engine-reported slot wait feeds the score instead of a hardcoded zero.
+    assert metrics["queue_wait_ms"] == 4.0
+    assert metrics["avg_tokens_per_second"] > metrics["per_stream_tokens_per_second"]
+
+
+async def test_successive_halving_finds_best_and_applies_hot_knobs() -> None:
+    engine = FakeEngine()
+    candidates = [
+        {"kv_bits": bits, "scheduler": {"max_num_seqs": seqs}} for bits in (4, 8) for seqs in (1, 4)
+    ]
+    outcome = await _search(engine, concurrency=2, base_requests=2).run("m", candidates)
+
+    assert outcome.best is not None
+    assert outcome.best.profile == {"kv_bits": 8, "scheduler": {"max_num_seqs": 4}}
+    assert [t.rung for t in outcome.trials] == [0, 0, 0, 0, 1, 1, 2]
+    # Rung 0: one load per kv_bits group, the other max_num_seqs value applied hot.
+    assert outcome.hot_applies >= 2
+    assert outcome.reloads < len(outcome.trials)
+    assert outcome.best.metrics["requests"] == 8.0
+
+
+async def test_reloads_when_hot_apply_is_unsupported() -> None:
+    engine = FakeEngine(hot_supported=False)
+    candidates = [{"kv_bits": 4, "scheduler": {"max_num_seqs": seqs}} for seqs in (1, 4)]
+    outcome = await _search(engine, concurrency=1, base_requests=1).run("m", candidates)
+    assert outcome.hot_applies == 0
+    assert outcome.reloads == len(outcome.trials)
+
+
+async def test_failed_load_drops_candidate() -> None:
+    engine = FakeEngine()
+    outcome = await _search(engine, concurrency=1, base_requests=1).run(
+        "m", [{"kv_bits": 2}, {"kv_bits": 4}]
+    )
+    assert outcome.best is not None
+    assert outcome.best.profile == {"kv_bits": 4}
+    assert [t.failed for t in outcome.trials] == [True, False]
+
+
+def _metrics(tok_s: float) -> dict[str, float]:
+    return {"avg_tokens_per_second": tok_s, "avg_ttft_ms": 10.0, "avg_total_ms": 100.0}
+
+
+def test_registry_find_stale(tmp_path) -> None:
+    registry = AutotuneRegistry(path=tmp_path / "registry.json")
+    registry.save_scored_profile(
+        model_id="m",
+        backend="vllm-mlx",
+        backend_version="1.0",
+        profile={"kv_bits": 4},
+        metrics=_metrics(10.0),
+    )
+    stale = registry.find_stale(model_id="m", backend="vllm-mlx", backend_version="2.0")
+    assert stale is not None
+    assert stale["profile"] == {"kv_bits": 4}
+    assert registry.find_stale(model_id="m", backend="vllm-mlx", backend_version="1.0") is None
+    assert registry.find_stale(model_id="m", backend="gguf", backend_version="2.0") is None
+
+
+@pytest.mark.parametrize(
+    ("overrides", "applied"),
+    [
+        ({"stream_interval": 4, "scheduler": {"max_num_seqs": 8}}, True),
+        ({"kv_bits": 4}, False),
+        ({"scheduler": {"prefill_batch_size": 4}}, False),
+    ],
+)
+def test_apply_hot_overrides(overrides: dict[str, Any], applied: bool) -> None:
+    live = SimpleNamespace(
+        stream_interval=1, scheduler=SimpleNamespace(config=SimpleNamespace(max_num_seqs=256))
+    )
+    loaded = SimpleNamespace(engine=live, backend=None, performance_overrides={"kv_bits": 8})
+    delegator = EngineAutotuneDelegator(_engine_with(loaded))
+
+    assert delegator.apply_hot_overrides("m", overrides) is applied
+    if applied:
+        assert live.stream_interval == 4
+        assert live.scheduler.config.max_num_seqs == 8
+        assert loaded.performance_overrides == {"kv_bits": 8, **overrides}
+    else:
+        assert live.stream_interval == 1
+        assert loaded.performance_overrides == {"kv_bits": 8}
+
+
+def _engine_with(loaded: SimpleNamespace) -> Any:
+    return SimpleNamespace(_models={"m": loaded}, _stream_interval=1, _scheduler_max_num_seqs=256)
+
+
+def test_apply_hot_overrides_resets_knobs_missing_from_profile() -> None:
+    live = SimpleNamespace(
+        stream_interval=1, scheduler=SimpleNamespace(config=SimpleNamespace(max_num_seqs=256))
+    )
+    loaded = SimpleNamespace(engine=live, backend=None, performance_overrides={"kv_bits": 8})
+    delegator = EngineAutotuneDelegator(_engine_with(loaded))
+
+    assert delegator.apply_hot_overrides(
+        "m", {"stream_interval": 4, "scheduler": {"max_num_seqs": 8}}
+    )
+    # The next trial only sets max_num_seqs; stream_interval must not carry over.
+    assert delegator.apply_hot_overrides("m", {"scheduler": {"max_num_seqs": 32}})
+    assert live.stream_interval == 1
+    assert live.scheduler.config.max_num_seqs == 32
+    assert loaded.performance_overrides == {"kv_bits": 8, "scheduler": {"max_num_seqs": 32}}
+
+    assert delegator.apply_hot_overrides("m", {})
+    assert live.scheduler.config.max_num_seqs == 256
+    assert loaded.performance_overrides == {"kv_bits": 8}
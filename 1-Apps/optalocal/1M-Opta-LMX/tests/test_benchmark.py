@@ -290,3 +290,31 @@ async def test_benchmark_router_mounted() -> None:
     routes = [r.path for r in app.routes]
     assert "/admin/benchmark/run" in routes
     assert "/admin/benchmark/results" in routes
+
+
+async def test_loadtest_endpoint_saves_result_with_sweep(mock_engine, tmp_path) -> None:
+    from opta_lmx.config import LMXConfig
+    from opta_lmx.main import create_app
+    from opta_lmx.monitoring.benchmark import BenchmarkResultStore
+
+    store = BenchmarkResultStore(directory=tmp_path / "benchmarks")
+    app = create_app(LMXConfig())
+    app.state.engine = mock_engine
+    app.state.benchmark_store = store
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post(
+            "/admin/benchmark/loadtest",
+            json={
+                "model_id": "simulated",
+                "target": "simulated",
+                "concurrency": [1, 4],
+                "requests_per_point": 4,
+                "max_tokens": 4,
+            },
+        )
+
+    assert resp.status_code == 200
+    points = resp.json()["load_test"]["points"]
+    assert [p["concurrency"] for p in points] == [1, 4]
+    assert store.load_all()[0].load_test is not None
@@ -0,0 +1,252 @@
+"""Tests for the pre-forked warm child loader worker pool.
+
+Workers are real subprocesses. A small wrapper worker module written to a
+temp dir adds test-only backends that crash, hang, exit or report their pid.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from opta_lmx.inference.engine import InferenceEngine
+from opta_lmx.manager.memory import MemoryMonitor
+from opta_lmx.runtime.child_loader_pool import LoaderWorkerPool
+from opta_lmx.runtime.child_loader_supervisor import LoaderSupervisorOutcome, run_loader_supervisor
+from opta_lmx.runtime.loader_protocol import LoadSpec
+
+_TEST_WORKER = """
+import asyncio
+import os
+import signal
+import sys
+import time
+
+from opta_lmx.runtime import child_loader_worker as worker
+
+
+async def _crash(spec):
+    os.kill(os.getpid(), signal.SIGABRT)
+
+
+async def _hang(spec):
+    time.sleep(30)
+
+
+async def _exit(spec):
+    sys.stderr.write('{"code": "model_probe_failed", "message": "exit_boom"}\\n')
+    sys.stderr.flush()
+    os._exit(3)
+
+
+async def _pid(spec):
+    return {"pid": os.getpid()}
+
+
+async def _sleep(spec):
+    await asyncio.sleep(0.3)
+    return {"pid": os.getpid()}
+
+
+_base = worker._default_backend_probes
+worker._default_backend_probes = lambda: {
+    **_base(),
+    "crash": _crash,
+    "hang": _hang,
+    "exit": _exit,
+    "pid": _pid,
+    "sleep": _sleep,
+}
+
+if __name__ == "__main__":
+    raise SystemExit(worker.main())
+"""
+
+
+@pytest.fixture
+def worker_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> str:
+    (tmp_path / "lmx_test_loader_worker.py").write_text(_TEST_WORKER)
+    existing = os.environ.get("PYTHONPATH")
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path) + (os.pathsep + existing if existing else ""))
+    return "lmx_test_loader_worker"
+
+
+def _make_pool(worker_module: str, **kwargs: Any) -> LoaderWorkerPool:
+    return LoaderWorkerPool(worker_module=worker_module, **kwargs)
+
+
+@pytest.fixture
+async def pool(worker_module: str) -> AsyncIterator[LoaderWorkerPool]:
+    p = _make_pool(worker_module, size=1)
+    await p.start()
+    yield p
+    await p.close()
+
+
+def _spec(backend: str) -> LoadSpec:
+    return LoadSpec("test/model", backend, False, {}, probe_only=True)
+
+
+async def _pid(pool: LoaderWorkerPool) -> int:
+    outcome = await pool.run(_spec("pid"), timeout_sec=10.0)
+    assert outcome.ok and outcome.result is not None
+    return int(outcome.result.telemetry["pid"])
+
+
+# ─── Warm reuse and recycling ────────────────────────────────────────────────
+
+
+async def test_warm_worker_is_reused(pool: LoaderWorkerPool) -> None:
+    first = await _pid(pool)
+    second = await _pid(pool)
+    assert first == second
+    stats = pool.stats()
+    assert stats["spawned_total"] == 1
+    assert stats["jobs_total"] == 2
+
+
+async def test_worker_recycled_after_max_jobs(worker_module: str) -> None:
+    pool = _make_pool(worker_module, size=1, max_jobs_per_worker=2)
+    await pool.start()
+    try:
+        pids = [await _pid(pool) for _ in range(3)]
+    finally:
+        await pool.close()
+    assert pids[0] == pids[1]
+    assert pids[2] != pids[0]
+    assert pool.stats()["recycled_total"] >= 1
+
+
+async def test_structured_failure_keeps_worker(pool: LoaderWorkerPool) -> None:
+    before = await _pid(pool)
+    outcome = await pool.run(_spec("unsupported"), timeout_sec=10.0)
+    assert outcome.ok is False and outcome.failure is not None
+    assert outcome.failure.code == "model_probe_failed"
+    assert outcome.failure.exit_code == 1
+    assert await _pid(pool) == before
+
+
+# ─── Crash classification ────────────────────────────────────────────────────
+
+
+async def test_signal_crash_is_classified_and_worker_replaced(pool: LoaderWorkerPool) -> None:
+    before = await _pid(pool)
+    outcome = await pool.run(_spec("crash"), timeout_sec=10.0)
+    assert outcome.ok is False and outcome.failure is not None
+    assert outcome.failure.code == "model_loader_crashed"
+    assert outcome.failure.signal == 6
+
+    assert await _pid(pool) != before
+    assert pool.stats()["crashes_total"] == 1
+
+
+async def test_nonzero_exit_uses_stderr_failure(pool: LoaderWorkerPool) -> None:
+    outcome = await pool.run(_spec("exit"), timeout_sec=10.0)
+    assert outcome.failure is not None
+    assert outcome.failure.code == "model_probe_failed"
+    assert outcome.failure.message == "exit_boom"
+    assert outcome.failure.exit_code == 3
+
+
+async def test_timeout_kills_worker(pool: LoaderWorkerPool) -> None:
+    outcome = await pool.run(_spec("hang"), timeout_sec=0.3)
+    assert outcome.failure is not None
+    assert outcome.failure.code == "model_load_timeout"
+    assert pool.stats()["timeouts_total"] == 1
+    assert (await pool.run(_spec("gguf"), timeout_sec=10.0)).ok
+
+
+async def test_failures_match_one_shot_supervisor(
+    pool: LoaderWorkerPool, worker_module: str
+) -> None:
+    for backend in ("unsupported", "crash"):
+        pooled = await pool.run(_spec(backend), timeout_sec=10.0)
+        one_shot = await run_loader_supervisor(
+            _spec(backend), timeout_sec=10.0, worker_module=worker_module
+        )
+        assert pooled.failure is not None and one_shot.failure is not None
+        assert pooled.failure.to_dict() == one_shot.failure.to_dict()
+
+
+async def test_supervisor_delegates_to_running_pool(pool: LoaderWorkerPool) -> None:
+    outcome = await run_loader_supervisor(_spec("pid"), timeout_sec=10.0, pool=pool)
+    assert outcome.ok
+    assert pool.stats()["jobs_total"] == 1
+
+
+# ─── Parallelism and reporting ───────────────────────────────────────────────
+
+
+async def test_jobs_run_in_parallel_across_workers(worker_module: str) -> None:
+    pool = _make_pool(worker_module, size=2)
+    await pool.start()
+    try:
+        started = time.monotonic()
+        outcomes = await asyncio.gather(
+            pool.run(_spec("sleep"), timeout_sec=10.0),
+            pool.run(_spec("sleep"), timeout_sec=10.0),
+        )
+        elapsed = time.monotonic() - started
+        stats = pool.stats()
+    finally:
+        await pool.close()
+
+    pids = {o.result.telemetry["pid"] for o in outcomes if o.result is not None}
+    assert len(pids) == 2
+    assert elapsed < 0.55
+    assert stats["utilization"] > 0.0
+
+
+async def test_lazy_pool_forks_on_first_job(worker_module: str) -> None:
+    pool = _make_pool(worker_module, size=2)
+    await pool.start(prefork=False)
+    try:
+        assert pool.stats()["spawned_total"] == 0
+        first = await _pid(pool)
+        assert await _pid(pool) == first
+        stats = pool.stats()
+    finally:
+        await pool.close()
+    assert stats["spawned_total"] == 1
+    assert stats["idle_workers"] == 1
+
+
+async def test_run_requires_started_pool(worker_module: str) -> None:
+    pool = _make_pool(worker_module, size=1)
+    with pytest.raises(RuntimeError, match="not running"):
+        await pool.run(_spec("pid"))
+
+
+async def test_engine_probe_reports_wall_time_and_order() -> None:
+    engine = InferenceEngine(
+        memory_monitor=MemoryMonitor(max_percent=90),
+        use_batching=False,
+        warmup_on_load=False,
+    )
+
+    async def _slow_supervisor(*_args: Any, **_kwargs: Any) -> LoaderSupervisorOutcome:
+        await asyncio.sleep(0.05)
+        return LoaderSupervisorOutcome(ok=True)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            "opta_lmx.inference.engine_lifecycle.backend_candidates",
+            lambda *_args, **_kwargs: ["vllm-mlx", "gguf"],
+        )
+        mp.setattr(
+            "opta_lmx.inference.engine_lifecycle.run_loader_supervisor",
+            AsyncMock(side_effect=_slow_supervisor),
+        )
+        result = await engine.probe_model_backends("test/model")
+
+    assert [row["backend"] for row in result["candidates"]] == ["vllm-mlx", "gguf"]
+    assert result["candidates"][0]["duration_ms"] >= 50.0
+    assert result["probe_wall_ms"] >= result["candidates"][0]["duration_ms"]
+    assert "loader_pool" not in result
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from opta_lmx.rag.chunker import Chunk, chunk_code, chunk_text
+import random
+
+import pytest
+
+from opta_lmx.rag.chunker import Chunk, StreamingChunker, chunk_code, chunk_text
 
 # ─── chunk_text ──────────────────────────────────────────────────────────────
 
@@ -76,6 +80,38 @@ class TestChunkText:
         assert chunk.end_char == 5
 
 
+# ─── StreamingChunker ────────────────────────────────────────────────────────
+
+
+class TestStreamingChunker:
+    @pytest.mark.parametrize("separator", ["\n", "\n\n"])
+    @pytest.mark.parametrize("seed", range(20))
+    def test_pieces_match_chunk_text(self, seed: int, separator: str) -> None:
+        rng = random.Random(seed)
+        words = ["alpha", "beta\n", "gamma", "delta\n\n", "epsilon", "x" * 90]
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(50, 1500)))
+        chunk_size, chunk_overlap = rng.choice([(16, 0), (16, 8), (32, 4), (64, 12)])
+
+        chunker = StreamingChunker(chunk_size, chunk_overlap, separator)
+        streamed: list[Chunk] = []
+        pos = 0
+        while pos < len(text):
+            # Random piece sizes, including empty pieces and split separators.
+            step = rng.randint(0, 200)
+            streamed.extend(chunker.feed(text[pos : pos + step]))
+            pos += step
+        streamed.extend(chunker.finish())
+
+        assert streamed == chunk_text(text, chunk_size, chunk_overlap, separator)
+
+    def test_emits_chunks_before_input_ends(self) -> None:
+        chunker = StreamingChunker(chunk_size=10, chunk_overlap=0)
+        emitted = [chunker.feed(f"page {i} " + "y" * 30 + "\n") for i in range(10)]
+        assert sum(len(batch) for batch in emitted) >= 8
+        # Only the current chunk is held back.
+        assert [c.index for c in chunker.finish()] == [sum(len(b) for b in emitted)]
+
+
 # ─── chunk_code ──────────────────────────────────────────────────────────────
 
 
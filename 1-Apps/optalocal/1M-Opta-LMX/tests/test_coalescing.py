@@ -0,0 +1,163 @@
+"""Tests for adaptive token coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+
+from opta_lmx.api.stream_handlers import _StreamEndMarker
+from opta_lmx.inference.coalescing import CoalescePolicy, StreamCoalescer
+from opta_lmx.inference.streaming import format_sse_stream
+
+
+async def _source(items: list[Any], delay_sec: float = 0.0) -> AsyncIterator[Any]:
+    for item in items:
+        if delay_sec:
+            await asyncio.sleep(delay_sec)
+        yield item
+
+
+async def _collect(stream: AsyncIterator[Any], consumer_delay_sec: float = 0.0) -> list[Any]:
+    frames = []
+    async for frame in stream:
+        frames.append(frame)
+        if consumer_delay_sec:
+            await asyncio.sleep(consumer_delay_sec)
+    return frames
+
+
+TOKENS = [f"t{i} " for i in range(40)]
+
+
+async def test_paced_tokens_stay_one_frame_each() -> None:
+    coalescer = StreamCoalescer(CoalescePolicy(burst_tokens=8, window_ms=5.0))
+    frames = await _collect(coalescer.wrap(_source(TOKENS[:10], delay_sec=0.01)))
+    assert frames == TOKENS[:10]
+    stats = coalescer.stats()
+    assert stats["frames_per_token"] == 1.0
+    assert stats["coalesced_frames_total"] == 0
+
+
+async def test_burst_is_merged_but_first_token_is_alone() -> None:
+    coalescer = StreamCoalescer(CoalescePolicy(burst_tokens=4, window_ms=20.0))
+    frames = await _collect(coalescer.wrap(_source(TOKENS)))
+    assert frames[0] == TOKENS[0]
+    assert "".join(frames) == "".join(TOKENS)
+    assert len(frames) < len(TOKENS) // 2
+    stats = coalescer.stats()
+    assert stats["tokens_total"] == len(TOKENS)
+    assert stats["frames_per_token"] < 0.5
+
+
+async def test_small_instant_streams_are_not_merged() -> None:
+    coalescer = StreamCoalescer(CoalescePolicy(burst_tokens=8))
+    assert await _collect(coalescer.wrap(_source(TOKENS[:4]))) == TOKENS[:4]
+
+
+async def test_backpressure_merges_tokens_and_records_stalls() -> None:
+    coalescer = StreamCoalescer(
+        CoalescePolicy(burst_tokens=100, window_ms=1.0, stall_threshold_ms=20.0)
+    )
+    frames = await _collect(
+        coalescer.wrap(_source(TOKENS[:20], delay_sec=0.005)), consumer_delay_sec=0.04
+    )
+    assert frames[0] == TOKENS[0]
+    assert "".join(frames) == "".join(TOKENS[:20])
+    assert len(frames) < 10
+    stats = coalescer.stats()
+    assert stats["send_stalls_total"] >= 1
+    assert stats["send_stall_seconds_total"] >= 0.02
+
+
+async def test_frame_size_is_capped() -> None:
+    coalescer = StreamCoalescer(CoalescePolicy(burst_tokens=2, max_frame_tokens=5))
+    frames = await _collect(coalescer.wrap(_source(TOKENS)))
+    assert max(len(f.split()) for f in frames) <= 5
+
+
+async def test_markers_pass_through_in_order() -> None:
+    marker = _StreamEndMarker(completion_tokens=12)
+    coalescer = StreamCoalescer(CoalescePolicy(burst_tokens=2))
+    frames = await _collect(coalescer.wrap(_source([*TOKENS[:12], marker])))
+    assert frames[-1] is marker
+    assert "".join(frames[:-1]) == "".join(TOKENS[:12])
+
+
+async def test_source_error_is_raised_after_buffered_text() -> None:
+    async def failing() -> AsyncIterator[str]:
+        yield "a"
+        yield "b"
+        raise RuntimeError("boom")
+
+    coalescer = StreamCoalescer()
+    frames: list[str] = []
+    with pytest.raises(RuntimeError, match="boom"):
+        async for frame in coalescer.wrap(failing()):
+            frames.append(frame)
+    assert "".join(frames) == "ab"
+
+
+async def test_closing_the_stream_cancels_the_source() -> None:
+    cancelled = asyncio.Event()
+
+    async def endless() -> AsyncIterator[str]:
+        try:
+            while True:
+                await asyncio.sleep(0.005)
+                yield "x"
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    stream = StreamCoalescer().wrap(endless())
+    assert await anext(stream) == "x"
+    await stream.aclose()  # type: ignore[attr-defined]
+    await asyncio.wait_for(cancelled.wait(), timeout=1.0)
+
+
+async def test_stalled_client_pauses_the_source() -> None:
+    pulled = 0
+
+    async def counting() -> AsyncIterator[str]:
+        nonlocal pulled
+        for token in TOKENS:
+            pulled += 1
+            yield token
+
+    policy = CoalescePolicy(burst_tokens=2, max_frame_tokens=3, buffer_frames=2)
+    stream = StreamCoalescer(policy).wrap(counting())
+    assert await anext(stream) == TOKENS[0]
+    await asyncio.sleep(0.05)
+    # One token was sent; the producer stops once two frames are buffered
+    assert pulled <= 1 + 2 * 3
+    frames = [TOKENS[0]] + await _collect(stream)
+    assert "".join(frames) == "".join(TOKENS)
+    assert pulled == len(TOKENS)
+
+
+async def test_disabled_policy_returns_source() -> None:
+    source = _source(TOKENS)
+    assert StreamCoalescer(CoalescePolicy(enabled=False)).wrap(source) is source
+
+
+async def test_sse_stream_content_and_usage_unchanged() -> None:
+    marker = _StreamEndMarker(completion_tokens=len(TOKENS))
+    coalescer = StreamCoalescer(CoalescePolicy(burst_tokens=2))
+    lines = await _collect(
+        format_sse_stream(
+            coalescer.wrap(_source([*TOKENS, marker])),
+            "req",
+            "m",
+            include_usage=True,
+            prompt_tokens=3,
+        )
+    )
+    payloads = [json.loads(line[6:]) for line in lines if line.startswith("data: {")]
+    text = "".join(p["choices"][0]["delta"].get("content") or "" for p in payloads if p["choices"])
+    assert text == "".join(TOKENS)
+    assert payloads[-1]["usage"]["completion_tokens"] == len(TOKENS)
+    assert len(lines) < len(TOKENS)
@@ -42,6 +42,8 @@ def test_legacy_inference_api_key_still_works() -> None:
     )
 
     assert getattr(request.state, "supabase_user_id", None) is None
+    assert request.state.inference_principal.startswith("key:")
+    assert "infer-secret-key" not in request.state.inference_principal
 
 
 def test_bearer_jwt_sets_request_state_user_id() -> None:
@@ -63,6 +65,7 @@ def test_bearer_jwt_sets_request_state_user_id() -> None:
 
     assert verifier.calls == ["valid.jwt.token"]
     assert request.state.supabase_user_id == "user-123"
+    assert request.state.inference_principal == "sub:user-123"
 
 
 def test_invalid_jwt_falls_back_to_inference_api_key() -> None:
@@ -0,0 +1,369 @@
+"""Tests for the parallel, resumable model downloader against a local HTTP server."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from opta_lmx.inference.types import DownloadTask
+from opta_lmx.manager.downloader import (
+    BandwidthLimiter,
+    DownloadIntegrityError,
+    ParallelDownloader,
+    RemoteFile,
+    RepoManifest,
+    _FileJob,
+)
+from opta_lmx.manager.model import ModelManager
+
+_RANGE_RE = re.compile(r"bytes=(\d+)-(\d*)")
+_COMMIT = "0123456789abcdef0123456789abcdef01234567"
+
+
+class _ShardServer:
+    """Serves in-memory files with optional Range support and injected failures."""
+
+    def __init__(self, files: dict[str, bytes], *, ranges: bool = True) -> None:
+        self.files = files
+        self.ranges = ranges
+        self.requests: list[tuple[str, str, str | None]] = []
+        self.fail_next: dict[str, int] = {}
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *_args: Any) -> None:
+                pass
+
+            def _body(self) -> bytes | None:
+                name = self.path.lstrip("/")
+                data = server.files.get(name)
+                if data is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                return data
+
+            def do_HEAD(self) -> None:
+                data = self._body()
+                if data is None:
+                    return
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(data)))
+                if server.ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                self.end_headers()
+
+            def do_GET(self) -> None:
+                name = self.path.lstrip("/")
+                range_header = self.headers.get("Range")
+                with server.lock:
+                    server.requests.append(("GET", name, range_header))
+                    failures = server.fail_next.get(name, 0)
+                    if failures:
+                        server.fail_next[name] = failures - 1
+                if failures:
+                    self.send_response(503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                data = self._body()
+                if data is None:
+                    return
+                match = _RANGE_RE.fullmatch(range_header or "")
+                if server.ranges and match:
+                    start = int(match.group(1))
+                    end = int(match.group(2)) if match.group(2) else len(data) - 1
+                    body = data[start : end + 1]
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+                else:
+                    body = data
+                    self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def gets(self, name: str) -> list[str | None]:
+        return [rng for method, n, rng in self.requests if method == "GET" and n == name]
+
+
+@pytest.fixture
+def shards() -> dict[str, bytes]:
+    return {
+        "config.json": json.dumps({"model_type": "llama"}).encode(),
+        "model-00001-of-00002.safetensors": os.urandom(300 * 1024),
+        "model-00002-of-00002.safetensors": os.urandom(200 * 1024),
+    }
+
+
+@pytest.fixture
+def server(shards: dict[str, bytes]) -> Iterator[_ShardServer]:
+    srv = _ShardServer(shards)
+    srv.thread.start()
+    yield srv
+    srv.httpd.shutdown()
+    srv.httpd.server_close()
+
+
+def _manifest(server: _ShardServer, *, corrupt: str | None = None) -> RepoManifest:
+    files = []
+    for name, data in server.files.items():
+        if name.endswith(".safetensors"):
+            digest = hashlib.sha256(data).hexdigest()
+            if name == corrupt:
+                digest = "0" * 64
+            files.append(
+                RemoteFile(
+                    path=name, url=f"{server.base_url}/{name}", size=len(data), sha256=digest
+                )
+            )
+        else:
+            blob_id = hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+            files.append(
+                RemoteFile(
+                    path=name, url=f"{server.base_url}/{name}", size=len(data), blob_id=blob_id
+                )
+            )
+    return RepoManifest(repo_id="org/model", commit=_COMMIT, files=tuple(files))
+
+
+def _downloader(server: _ShardServer, **kwargs: Any) -> ParallelDownloader:
+    manifest = kwargs.pop("manifest", None) or _manifest(server)
+    return ParallelDownloader(manifest_fn=lambda *_a: manifest, **kwargs)
+
+
+def _snapshot(cache: Path) -> Path:
+    return cache / "models--org--model" / "snapshots" / _COMMIT
+
+
+class TestParallelDownloader:
+    def test_downloads_into_hf_cache_layout(
+        self, tmp_path: Path, server: _ShardServer, shards: dict[str, bytes]
+    ) -> None:
+        task = DownloadTask(download_id="d1", repo_id="org/model")
+        path = _downloader(server).download("org/model", cache_dir=tmp_path, task=task)
+
+        assert Path(path) == _snapshot(tmp_path)
+        for name, data in shards.items():
+            link = Path(path) / name
+            assert link.is_symlink()
+            assert link.read_bytes() == data
+        refs = tmp_path / "models--org--model" / "refs" / "main"
+        assert refs.read_text() == _COMMIT
+        assert task.files_completed == task.files_total == 3
+        assert task.downloaded_bytes == task.total_bytes == sum(map(len, shards.values()))
+        assert task.progress_percent == 100.0
+        assert not list((tmp_path / "models--org--model" / "blobs").glob("*.part*"))
+
+    def test_large_files_fetched_as_parallel_ranges(
+        self, tmp_path: Path, server: _ShardServer, shards: dict[str, bytes]
+    ) -> None:
+        downloader = _downloader(server, chunk_bytes=64 * 1024, max_workers=4)
+        path = downloader.download("org/model", cache_dir=tmp_path)
+
+        ranges = server.gets("model-00001-of-00002.safetensors")
+        assert len(ranges) == 5  # ceil(300 KiB / 64 KiB)
+        assert all(r and r.startswith("bytes=") for r in ranges)
+        name = "model-00001-of-00002.safetensors"
+        assert (Path(path) / name).read_bytes() == shards[name]
+
+    def test_resumes_from_verified_offsets(
+        self, tmp_path: Path, server: _ShardServer, shards: dict[str, bytes]
+    ) -> None:
+        name = "model-00001-of-00002.safetensors"
+        data = shards[name]
+        etag = hashlib.sha256(data).hexdigest()
+        blobs = tmp_path / "models--org--model" / "blobs"
+        blobs.mkdir(parents=True)
+        chunk = 64 * 1024
+        # A previous run finished part 0 and half of part 1.
+        partial = bytearray(len(data))
+        partial[: chunk + chunk // 2] = data[: chunk + chunk // 2]
+        (blobs / f"{etag}.part").write_bytes(bytes(partial))
+        done = [chunk, chunk // 2, 0, 0, 0]
+        (blobs / f"{etag}.part.json").write_text(
+            json.dumps({"etag": etag, "size": len(data), "chunk_bytes": chunk, "done": done})
+        )
+
+        downloader = _downloader(server, chunk_bytes=chunk)
+        path = downloader.download("org/model", cache_dir=tmp_path)
+
+        ranges = server.gets(name)
+        assert f"bytes=0-{chunk - 1}" not in ranges
+        assert f"bytes={chunk + chunk // 2}-{2 * chunk - 1}" in ranges
+        assert (Path(path) / name).read_bytes() == data
+        assert downloader.stats()["bytes_resumed_total"] == chunk + chunk // 2
+
+    def test_corrupt_resume_fails_integrity_and_discards_partial(
+        self, tmp_path: Path, server: _ShardServer, shards: dict[str, bytes]
+    ) -> None:
+        name = "model-00002-of-00002.safetensors"
+        data = shards[name]
+        etag = hashlib.sha256(data).hexdigest()
+        blobs = tmp_path / "models--org--model" / "blobs"
+        blobs.mkdir(parents=True)
+        # Sidecar claims the bytes are on disk, but they are garbage.
+        (blobs / f"{etag}.part").write_bytes(b"\xff" * len(data))
+        (blobs / f"{etag}.part.json").write_text(
+            json.dumps(
+                {"etag": etag, "size": len(data), "chunk_bytes": 0, "done": [len(data) // 2]}
+            )
+        )
+
+        downloader = _downloader(server)
+        with pytest.raises(DownloadIntegrityError):
+            downloader.download("org/model", cache_dir=tmp_path)
+        assert not (blobs / f"{etag}.part").exists()
+        assert downloader.stats()["integrity_failures_total"] == 1
+
+        # The next attempt starts the file over and succeeds.
+        path = downloader.download("org/model", cache_dir=tmp_path)
+        assert (Path(path) / name).read_bytes() == data
+
+    def test_hash_mismatch_from_server_is_rejected(
+        self, tmp_path: Path, server: _ShardServer
+    ) -> None:
+        bad = "model-00001-of-00002.safetensors"
+        downloader = _downloader(server, manifest=_manifest(server, corrupt=bad))
+        with pytest.raises(DownloadIntegrityError, match="hash"):
+            downloader.download("org/model", cache_dir=tmp_path)
+        assert not (_snapshot(tmp_path) / bad).exists()
+
+    def test_server_without_ranges_streams_whole_files(
+        self, tmp_path: Path, shards: dict[str, bytes]
+    ) -> None:
+        srv = _ShardServer(shards, ranges=False)
+        srv.thread.start()
+        try:
+            path = _downloader(srv, chunk_bytes=64 * 1024).download("org/model", cache_dir=tmp_path)
+        finally:
+            srv.httpd.shutdown()
+            srv.httpd.server_close()
+        name = "model-00001-of-00002.safetensors"
+        assert srv.gets(name) == [None]
+        assert (Path(path) / name).read_bytes() == shards[name]
+
+    def test_transient_errors_are_retried(
+        self, tmp_path: Path, server: _ShardServer, shards: dict[str, bytes]
+    ) -> None:
+        name = "model-00002-of-00002.safetensors"
+        server.fail_next[name] = 2
+        downloader = _downloader(server, retries=3)
+        path = downloader.download("org/model", cache_dir=tmp_path)
+        assert (Path(path) / name).read_bytes() == shards[name]
+        assert downloader.stats()["retries_total"] == 2
+
+    def test_present_blobs_are_skipped(self, tmp_path: Path, server: _ShardServer) -> None:
+        downloader = _downloader(server)
+        downloader.download("org/model", cache_dir=tmp_path)
+        before = len(server.requests)
+        downloader.download("org/model", cache_dir=tmp_path)
+        assert len(server.requests) == before
+        assert downloader.stats()["files_skipped_total"] == 3
+
+    def test_cancel_stops_without_completing(self, tmp_path: Path, server: _ShardServer) -> None:
+        cancel = threading.Event()
+        cancel.set()
+        with pytest.raises(RuntimeError, match="cancelled"):
+            _downloader(server).download("org/model", cache_dir=tmp_path, cancel=cancel)
+        assert not (_snapshot(tmp_path) / "config.json").exists()
+
+    def test_hashing_does_not_block_other_parts(self, tmp_path: Path) -> None:
+        data = os.urandom(4096)
+        remote = RemoteFile(
+            path="w.bin",
+            url="http://unused",
+            size=len(data),
+            sha256=hashlib.sha256(data).hexdigest(),
+        )
+        job = _FileJob(remote, tmp_path, chunk_bytes=1024)
+        job.prepare()
+        with job.part_path.open("r+b") as fh:
+            fh.write(data)
+        hashing, release = threading.Event(), threading.Event()
+        real = job._hasher
+
+        class _SlowHasher:
+            def update(self, chunk: bytes) -> None:
+                hashing.set()
+                release.wait(5.0)
+                real.update(chunk)
+
+            def hexdigest(self) -> str:
+                return str(real.hexdigest())
+
+        job._hasher = _SlowHasher()
+        job.record(0, 1024)
+        finished: list[bool] = []
+        hasher = threading.Thread(target=lambda: finished.append(job.part_complete(0)))
+        hasher.start()
+        assert hashing.wait(5.0)
+
+        # Other parts record progress and complete while part 0 is being hashed.
+        started = time.monotonic()
+        for part in (1, 2, 3):
+            job.record(part, 1024)
+            assert job.part_complete(part) is False
+        assert time.monotonic() - started < 1.0
+
+        release.set()
+        hasher.join(5.0)
+        assert finished == [True]
+        assert job.blob_path.read_bytes() == data
+
+
+class TestBandwidthLimiter:
+    def test_sleeps_to_hold_the_rate(self) -> None:
+        now = [0.0]
+        slept: list[float] = []
+
+        def _sleep(sec: float) -> None:
+            slept.append(sec)
+            now[0] += sec
+
+        limiter = BandwidthLimiter(1000.0, burst_bytes=1000, clock=lambda: now[0], sleep=_sleep)
+        limiter.acquire(1000)
+        assert slept == []
+        limiter.acquire(500)
+        assert sum(slept) == pytest.approx(0.5)
+        limiter.acquire(2000)
+        assert sum(slept) == pytest.approx(2.5)
+
+    def test_disabled_never_sleeps(self) -> None:
+        limiter = BandwidthLimiter(None, sleep=lambda _s: pytest.fail("slept"))
+        limiter.acquire(10**9)
+
+
+async def test_model_manager_uses_parallel_downloader(
+    tmp_path: Path, server: _ShardServer, shards: dict[str, bytes]
+) -> None:
+    manager = ModelManager(models_directory=tmp_path, downloader=_downloader(server))
+    task = DownloadTask(download_id="dl-par", repo_id="org/model", started_at=1.0)
+    manager._downloads[task.download_id] = task
+
+    await manager._run_download(task.download_id, task.repo_id, None, None, None)
+
+    assert task.status == "completed"
+    assert task.local_path == str(_snapshot(tmp_path))
+    assert task.files_completed == len(shards)
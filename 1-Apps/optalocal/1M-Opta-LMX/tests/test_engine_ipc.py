@@ -0,0 +1,441 @@
+"""Tests for the engine IPC channel and multi-worker front-end app.
+
+The engine side runs a real EngineIPCServer on a Unix socket in front of a
+small fake engine; front-ends talk to it through RemoteEngine.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import shutil
+import struct
+import tempfile
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+import uvicorn
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from opta_lmx.config import LMXConfig
+from opta_lmx.frontend import create_frontend_app
+from opta_lmx.inference.admission import AdmissionRejectedError
+from opta_lmx.inference.schema import (
+    ChatCompletionResponse,
+    ChatMessage,
+    Choice,
+    ResponseMessage,
+    Usage,
+)
+from opta_lmx.inference.types import ModelInfo, ModelRoutingStats
+from opta_lmx.monitoring.events import EventBus, ServerEvent
+from opta_lmx.monitoring.metrics import MetricsCollector, RequestMetric
+from opta_lmx.proxy import keychain_reader
+from opta_lmx.proxy.subscription_proxy import SubscriptionClientPool
+from opta_lmx.runtime import engine_ipc
+from opta_lmx.runtime.engine_ipc import (
+    EngineIPCError,
+    EngineIPCServer,
+    FrameKind,
+    RemoteEngine,
+    encode_frame,
+    engine_socket_paths,
+    read_frame,
+)
+
+
+class _FakeEngine:
+    def __init__(self) -> None:
+        self.models = [ModelInfo(model_id="model-a", memory_used_gb=1.5)]
+        self.stream_cancelled = asyncio.Event()
+        self.stream_closed = asyncio.Event()
+        self.stream_tokens = ["héllo", " ", "wörld"]
+        self.tokens_generated = 0
+        self.token_delay_sec = 0.0
+        self.shed_streams = False
+
+    def get_loaded_models(self) -> list[ModelInfo]:
+        return list(self.models)
+
+    def get_model_routing_stats(self, model_ids: list[str]) -> dict[str, ModelRoutingStats]:
+        return {mid: ModelRoutingStats(active=1, capacity=4) for mid in model_ids}
+
+    async def generate(
+        self, model_id: str, messages: list[ChatMessage], **kwargs: Any
+    ) -> ChatCompletionResponse:
+        if model_id == "busy":
+            raise RuntimeError("Server is busy, try again")
+        if model_id == "shed":
+            raise AdmissionRejectedError("queue_full", "queue is full", retry_after_sec=7)
+        if model_id == "bad-args":
+            raise ValueError("temperature out of range")
+        if model_id == "gone":
+            raise KeyError("Model 'gone' is not loaded")
+        if model_id == "odd":
+            raise OSError("disk on fire")
+        text = f"{messages[-1].content}|t={kwargs.get('temperature')}"
+        return ChatCompletionResponse(
+            id="cmpl-1",
+            created=0,
+            model=model_id,
+            choices=[Choice(message=ResponseMessage(content=text), finish_reason="stop")],
+            usage=Usage(prompt_tokens=3, completion_tokens=2, total_tokens=5),
+        )
+
+    async def stream_generate(
+        self, model_id: str, messages: list[ChatMessage], **_: Any
+    ) -> AsyncIterator[str]:
+        if self.shed_streams:
+            raise AdmissionRejectedError("queue_full", "queue is full", retry_after_sec=7)
+        try:
+            for token in self.stream_tokens:
+                await asyncio.sleep(self.token_delay_sec)
+                self.tokens_generated += 1
+                yield token
+        except asyncio.CancelledError:
+            self.stream_cancelled.set()
+            raise
+        finally:
+            self.stream_closed.set()
+
+
+@pytest.fixture
+def ipc_dir() -> Iterator[Path]:
+    # Unix socket paths are length-limited; keep them short.
+    path = Path(tempfile.mkdtemp(prefix="lmx", dir="/tmp"))
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+async def engine_side(
+    ipc_dir: Path,
+) -> AsyncIterator[tuple[_FakeEngine, EngineIPCServer, MetricsCollector, EventBus]]:
+    engine = _FakeEngine()
+    metrics = MetricsCollector()
+    bus = EventBus()
+    server = EngineIPCServer(
+        engine,
+        engine_socket_paths(ipc_dir)[0],
+        metrics=metrics,
+        event_bus=bus,
+        state_interval_sec=0.02,
+        stream_idle_timeout_sec=1.0,
+    )
+    await server.start()
+    yield engine, server, metrics, bus
+    await server.close()
+
+
+@pytest.fixture
+async def remote(ipc_dir: Path, engine_side: Any) -> AsyncIterator[RemoteEngine]:
+    client = RemoteEngine(
+        engine_socket_paths(ipc_dir)[0], event_bus=EventBus(), connect_timeout_sec=5.0
+    )
+    await client.connect()
+    yield client
+    await client.close()
+
+
+def _messages(text: str = "hi") -> list[ChatMessage]:
+    return [ChatMessage(role="user", content=text)]
+
+
+# ─── Framing ─────────────────────────────────────────────────────────────────
+
+
+async def test_frame_roundtrip_and_layout() -> None:
+    raw = encode_frame(FrameKind.CHUNK, 7, "tök".encode())
+    assert raw[:9] == struct.pack("!IBI", 4, FrameKind.CHUNK, 7)
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(raw + encode_frame(FrameKind.END, 7, b""))
+    reader.feed_eof()
+    assert await read_frame(reader) == (FrameKind.CHUNK, 7, "tök".encode())
+    assert await read_frame(reader) == (FrameKind.END, 7, b"")
+    with pytest.raises(asyncio.IncompleteReadError):
+        await read_frame(reader)
+
+
+# ─── Calls ───────────────────────────────────────────────────────────────────
+
+
+async def test_generate_roundtrip(remote: RemoteEngine) -> None:
+    response = await remote.generate("model-a", _messages("ping"), temperature=0.2)
+    assert isinstance(response, ChatCompletionResponse)
+    assert response.choices[0].message.content == "ping|t=0.2"
+    assert response.usage.total_tokens == 5
+
+
+async def test_engine_errors_surface_as_runtime_errors(remote: RemoteEngine) -> None:
+    with pytest.raises(RuntimeError, match="Server is busy"):
+        await remote.generate("busy", _messages())
+
+
+async def test_engine_errors_keep_their_class(remote: RemoteEngine) -> None:
+    with pytest.raises(AdmissionRejectedError, match="Server is busy") as shed:
+        await remote.generate("shed", _messages())
+    assert shed.value.retry_after_sec == 7
+    assert shed.value.reason == "queue_full"
+    with pytest.raises(ValueError, match="temperature out of range"):
+        await remote.generate("bad-args", _messages())
+    with pytest.raises(KeyError) as gone:
+        await remote.generate("gone", _messages())
+    assert gone.value.args == ("Model 'gone' is not loaded",)
+    # Classes the API layer does not map arrive as EngineIPCError.
+    with pytest.raises(EngineIPCError, match="disk on fire"):
+        await remote.generate("odd", _messages())
+
+
+async def test_stream_generate_yields_tokens(remote: RemoteEngine) -> None:
+    tokens = [t async for t in remote.stream_generate("model-a", _messages())]
+    assert tokens == ["héllo", " ", "wörld"]
+
+
+async def test_abandoned_stream_cancels_engine_generation(
+    remote: RemoteEngine, engine_side: Any
+) -> None:
+    engine: _FakeEngine = engine_side[0]
+    engine.token_delay_sec = 0.2
+    stream = remote.stream_generate("model-a", _messages())
+    assert await anext(stream) == "héllo"
+    await stream.aclose()
+    await asyncio.wait_for(engine.stream_cancelled.wait(), timeout=2.0)
+
+
+async def test_slow_consumer_pauses_engine_stream(remote: RemoteEngine, engine_side: Any) -> None:
+    engine: _FakeEngine = engine_side[0]
+    server: EngineIPCServer = engine_side[1]
+    engine.stream_tokens = [f"t{i}" for i in range(500)]
+    stream = remote.stream_generate("model-a", _messages())
+    assert await anext(stream) == "t0"
+    await asyncio.sleep(0.2)
+    # Generation stops one window ahead of what the reader has consumed.
+    assert engine.tokens_generated <= engine_ipc.STREAM_WINDOW_CHUNKS + 1
+    # Other streams on the same connection are unaffected.
+    response = await remote.generate("model-a", _messages("ping"))
+    assert response.choices[0].message.content.startswith("ping")
+    rest = [t async for t in stream]
+    assert rest == engine.stream_tokens[1:]
+    assert server.stats()["stream_credit_waits_total"] >= 1
+
+
+async def test_stream_without_credit_is_abandoned(ipc_dir: Path, engine_side: Any) -> None:
+    engine: _FakeEngine = engine_side[0]
+    server: EngineIPCServer = engine_side[1]
+    engine.stream_tokens = [f"t{i}" for i in range(500)]
+    reader, writer = await asyncio.open_unix_connection(str(server.path))
+    call = {"method": "stream_generate", "kwargs": {"model_id": "model-a", "messages": []}}
+    writer.write(encode_frame(FrameKind.CALL, 1, json.dumps(call).encode()))
+    chunks = 0
+    while True:
+        kind, stream_id, payload = await asyncio.wait_for(read_frame(reader), timeout=5.0)
+        if kind == FrameKind.CHUNK:
+            chunks += 1
+        elif stream_id == 1:
+            break
+    assert kind == FrameKind.ERROR
+    assert json.loads(payload)["error"] == "TimeoutError"
+    assert chunks == engine_ipc.STREAM_WINDOW_CHUNKS
+    await asyncio.wait_for(engine.stream_closed.wait(), timeout=1.0)
+    assert server.stats()["streams_abandoned_total"] == 1
+    writer.close()
+
+
+async def test_concurrent_calls_are_multiplexed(remote: RemoteEngine) -> None:
+    results = await asyncio.gather(
+        *(remote.generate("model-a", _messages(str(i))) for i in range(10))
+    )
+    assert [r.choices[0].message.content.split("|")[0] for r in results] == [
+        str(i) for i in range(10)
+    ]
+
+
+# ─── State, events and metrics ───────────────────────────────────────────────
+
+
+async def test_state_snapshot_answers_status_locally(
+    remote: RemoteEngine, engine_side: Any
+) -> None:
+    engine: _FakeEngine = engine_side[0]
+    assert remote.get_loaded_model_ids() == ["model-a"]
+    assert remote.get_loaded_models()[0].memory_used_gb == 1.5
+    assert remote.get_model_routing_stats(["model-a"])["model-a"].capacity == 4
+
+    engine.models.append(ModelInfo(model_id="model-b"))
+    for _ in range(100):
+        if remote.is_model_loaded("model-b"):
+            break
+        await asyncio.sleep(0.01)
+    assert remote.is_model_loaded("model-b")
+
+
+async def test_events_fan_out_to_frontend_bus(remote: RemoteEngine, engine_side: Any) -> None:
+    bus: EventBus = engine_side[3]
+    local = remote._event_bus
+    assert local is not None
+    queue = local.subscribe()
+    await asyncio.sleep(0.05)  # let the server subscribe
+    bus._last_seq = 41  # engine ids differ from what a fresh local bus would assign
+    await bus.publish(ServerEvent(event_type="model_loaded", data={"model_id": "m"}))
+    event = await asyncio.wait_for(queue.get(), timeout=2.0)
+    assert event.event_type == "model_loaded"
+    assert event.data == {"model_id": "m"}
+    assert event.seq == local.last_event_id == 42
+
+
+async def test_broadcasts_skip_frontend_past_high_water_mark(
+    remote: RemoteEngine, engine_side: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    engine: _FakeEngine = engine_side[0]
+    server: EngineIPCServer = engine_side[1]
+    bus: EventBus = engine_side[3]
+    await asyncio.sleep(0.05)  # let the server subscribe
+
+    monkeypatch.setattr(engine_ipc, "BROADCAST_HIGH_WATER_BYTES", 0)
+    engine.models.append(ModelInfo(model_id="model-b"))
+    await bus.publish(ServerEvent(event_type="model_loaded", data={"model_id": "model-b"}))
+    await asyncio.sleep(0.1)
+    assert server.stats()["broadcasts_dropped_total"] >= 2
+    assert not remote.is_model_loaded("model-b")
+
+    # Once the front-end catches up the skipped snapshot is re-sent, even
+    # though the state has not changed since.
+    monkeypatch.setattr(engine_ipc, "BROADCAST_HIGH_WATER_BYTES", 1 << 20)
+    for _ in range(100):
+        if remote.is_model_loaded("model-b"):
+            break
+        await asyncio.sleep(0.01)
+    assert remote.is_model_loaded("model-b")
+
+
+async def test_frontend_metrics_aggregate_in_engine(
+    remote: RemoteEngine, engine_side: Any, ipc_dir: Path
+) -> None:
+    metrics: MetricsCollector = engine_side[2]
+    second = RemoteEngine(engine_socket_paths(ipc_dir)[0], connect_timeout_sec=5.0)
+    await second.connect()
+    try:
+        remote.record_metric(RequestMetric("model-a", 0.1, 3, 2, False))
+        second.record_metric(RequestMetric("model-a", 0.2, 3, 2, True))
+        for _ in range(100):
+            if metrics.summary()["total_requests"] == 2:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await second.close()
+    summary = metrics.summary()
+    assert summary["total_requests"] == 2
+    assert summary["total_stream_requests"] == 1
+    assert summary["subsystems"] == {}
+    assert engine_side[1].stats()["metrics_forwarded_total"] == 2
+
+
+async def test_connect_times_out_without_engine(ipc_dir: Path) -> None:
+    client = RemoteEngine(
+        engine_socket_paths(ipc_dir)[0], connect_timeout_sec=0.1, reconnect_delay_sec=0.02
+    )
+    with pytest.raises(EngineIPCError, match="not reachable"):
+        await client.connect()
+
+
+# ─── Front-end app ───────────────────────────────────────────────────────────
+
+
+async def _serve_engine_http(ipc_dir: Path) -> tuple[uvicorn.Server, asyncio.Task[None]]:
+    engine_app = FastAPI()
+
+    @engine_app.get("/admin/status")
+    async def _status(q: str = "") -> dict[str, str]:
+        return {"served_by": "engine", "q": q}
+
+    server = uvicorn.Server(
+        uvicorn.Config(engine_app, uds=str(engine_socket_paths(ipc_dir)[1]), log_level="error")
+    )
+    task = asyncio.create_task(server.serve())
+    for _ in range(500):
+        if server.started:
+            break
+        await asyncio.sleep(0.01)
+    return server, task
+
+
+async def test_frontend_serves_inference_and_proxies_the_rest(
+    ipc_dir: Path, engine_side: Any
+) -> None:
+    http_server, http_task = await _serve_engine_http(ipc_dir)
+    app = create_frontend_app(LMXConfig(), ipc_dir=ipc_dir)
+    try:
+        async with app.router.lifespan_context(app):
+            assert isinstance(app.state.subscription_clients, SubscriptionClientPool)
+            assert keychain_reader.background_refresh_running()
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://fe") as client:
+                models = await client.get("/v1/models")
+                assert [m["id"] for m in models.json()["data"]] == ["model-a"]
+
+                body = {
+                    "model": "model-a",
+                    "messages": [{"role": "user", "content": "hi"}],
+                    "stream": True,
+                }
+                streamed = await client.post("/v1/chat/completions", json=body)
+                assert streamed.status_code == 200
+                chunks = [
+                    json.loads(line[len("data: ") :])
+                    for line in streamed.text.splitlines()
+                    if line.startswith("data: {")
+                ]
+                text = "".join(
+                    c["choices"][0]["delta"].get("content") or "" for c in chunks if c["choices"]
+                )
+                assert text == "héllo wörld"
+
+                # Admission runs before the response starts, so a shed stream is a 429.
+                engine_side[0].shed_streams = True
+                shed = await client.post("/v1/chat/completions", json=body)
+                assert shed.status_code == 429
+                assert shed.headers["retry-after"] == "7"
+                engine_side[0].shed_streams = False
+
+                proxied = await client.get("/admin/status", params={"q": "x"})
+                assert proxied.json() == {"served_by": "engine", "q": "x"}
+        assert not keychain_reader.background_refresh_running()
+
+        metrics: MetricsCollector = engine_side[2]
+        for _ in range(100):
+            if metrics.summary()["total_stream_requests"] == 2:
+                break
+            await asyncio.sleep(0.01)
+        # The served stream and the shed one.
+        assert metrics.summary()["total_stream_requests"] == 2
+    finally:
+        http_server.should_exit = True
+        await http_task
+
+
+async def test_frontend_serves_chat_websocket(ipc_dir: Path, engine_side: Any) -> None:
+    app = create_frontend_app(LMXConfig(), ipc_dir=ipc_dir)
+
+    def _chat() -> list[dict[str, Any]]:
+        # TestClient runs the app on its own loop; the engine keeps serving on ours.
+        with TestClient(app) as client, client.websocket_connect("/v1/chat/stream") as ws:
+            ws.send_json(
+                {
+                    "type": "chat.request",
+                    "model": "model-a",
+                    "messages": [{"role": "user", "content": "hi"}],
+                }
+            )
+            frames = []
+            while not frames or frames[-1]["type"] not in ("chat.done", "chat.error"):
+                frames.append(ws.receive_json())
+            return frames
+
+    frames = await asyncio.to_thread(_chat)
+    assert frames[-1]["type"] == "chat.done"
+    assert "".join(f["content"] for f in frames if f["type"] == "chat.token") == "héllo wörld"
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 
+import pytest
 from httpx import AsyncClient
 
 from opta_lmx.monitoring.events import EventBus, ServerEvent
@@ -91,6 +93,129 @@ async def test_event_timestamp() -> None:
     assert event.timestamp > 0
 
 
+# ─── Unit Tests: shared frame ring ─────────────────────────────────────────
+
+
+async def test_streams_share_one_encoded_frame() -> None:
+    """Every stream reads the same pre-encoded frame object."""
+    bus = EventBus()
+    s1 = bus.open_stream()
+    s2 = bus.open_stream()
+
+    await bus.publish(ServerEvent(event_type="model_loaded", data={"model_id": "m"}))
+
+    (f1,) = await s1.next_frames(max_wait=1)
+    (f2,) = await s2.next_frames(max_wait=1)
+    assert f1 is f2
+    assert f1.text == 'id: 1\nevent: model_loaded\ndata: {"model_id": "m"}\n\n'
+
+
+async def test_stream_resumes_after_last_event_id() -> None:
+    """A reconnect with Last-Event-ID replays only what it missed."""
+    bus = EventBus()
+    for n in range(5):
+        await bus.publish(ServerEvent(event_type="tick", data={"n": n}))
+
+    stream = bus.open_stream(last_event_id="3")
+    frames = await stream.next_frames(max_wait=1)
+    assert [f.seq for f in frames] == [4, 5]
+
+
+async def test_stream_without_id_starts_live() -> None:
+    """Without (or with an unknown) Last-Event-ID, only new events are sent."""
+    bus = EventBus()
+    await bus.publish(ServerEvent(event_type="old", data={}))
+    fresh = bus.open_stream()
+    future = bus.open_stream(last_event_id="999")
+    garbage = bus.open_stream(last_event_id="not-a-number")
+
+    await bus.publish(ServerEvent(event_type="new", data={}))
+
+    for stream in (fresh, future, garbage):
+        assert [f.event_type for f in await stream.next_frames(max_wait=1)] == ["new"]
+
+
+async def test_slow_stream_resyncs_instead_of_being_dropped() -> None:
+    """A stream that falls behind the ring skips ahead with a resync frame."""
+    bus = EventBus(ring_size=4)
+    stream = bus.open_stream()
+    for n in range(10):
+        await bus.publish(ServerEvent(event_type="tick", data={"n": n}))
+
+    frames = await stream.next_frames(max_wait=1)
+    assert frames[0].event_type == "resync"
+    assert '"missed": 6' in frames[0].text
+    assert not frames[0].text.startswith("id:")
+    assert [f.seq for f in frames[1:]] == [7, 8, 9, 10]
+    assert bus.stats()["stream_resyncs_total"] == 1
+    assert bus.stats()["stream_subscribers"] == 1
+
+
+async def test_relayed_ids_keep_gaps_and_restarts() -> None:
+    """A relaying bus keeps upstream ids, skips gaps and rewinds on restart."""
+    bus = EventBus()
+    stream = bus.open_stream()
+    for seq in (5, 6, 9):
+        await bus.publish(ServerEvent(event_type="tick", data={}), seq=seq)
+    assert [f.seq for f in await stream.next_frames(max_wait=1)] == [5, 6, 9]
+    assert [f.seq for f in await bus.open_stream(last_event_id="6").next_frames(1)] == [9]
+
+    await bus.publish(ServerEvent(event_type="restarted", data={}), seq=1)
+    frames = await stream.next_frames(max_wait=1)
+    assert [(f.seq, f.event_type) for f in frames] == [(1, "restarted")]
+    assert bus.stats()["events_published_total"] == 4
+
+
+async def test_backlog_coalesces_high_frequency_types_per_key() -> None:
+    """Only the newest download_progress per download survives a backlog."""
+    bus = EventBus()
+    stream = bus.open_stream()
+    for pct in (10, 20, 30):
+        await bus.publish(
+            ServerEvent(event_type="download_progress", data={"download_id": "a", "pct": pct})
+        )
+        await bus.publish(
+            ServerEvent(event_type="download_progress", data={"download_id": "b", "pct": pct})
+        )
+    await bus.publish(ServerEvent(event_type="download_completed", data={"download_id": "a"}))
+
+    frames = await stream.next_frames(max_wait=1)
+    assert [f.event_type for f in frames] == [
+        "download_progress",
+        "download_progress",
+        "download_completed",
+    ]
+    assert '"download_id": "a", "pct": 30' in frames[0].text
+    assert '"download_id": "b", "pct": 30' in frames[1].text
+    assert bus.stats()["frames_coalesced_total"] == 4
+
+
+async def test_next_frames_waits_for_publish_and_times_out() -> None:
+    """next_frames blocks until a publish, and raises TimeoutError when idle."""
+    bus = EventBus()
+    stream = bus.open_stream()
+
+    with pytest.raises(TimeoutError):
+        await stream.next_frames(max_wait=0.01)
+
+    waiter = asyncio.create_task(stream.next_frames(max_wait=1))
+    await asyncio.sleep(0)
+    await bus.publish(ServerEvent(event_type="wake", data={}))
+    assert [f.event_type for f in await waiter] == ["wake"]
+
+
+async def test_streams_count_toward_subscriber_limit() -> None:
+    """Queues and streams share the 50-subscriber cap."""
+    bus = EventBus()
+    streams = [bus.open_stream() for _ in range(25)]
+    for _ in range(25):
+        bus.subscribe()
+    with pytest.raises(ValueError):
+        bus.open_stream()
+    bus.close_stream(streams[0])
+    bus.open_stream()
+
+
 # ─── API Tests: SSE Endpoint ──────────────────────────────────────────────
 
 
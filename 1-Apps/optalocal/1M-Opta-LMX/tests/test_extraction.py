@@ -0,0 +1,248 @@
+"""Tests for pooled document extraction (rag/extraction.py) and streamed ingestion."""
+
+from __future__ import annotations
+
+import importlib.util
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+
+from opta_lmx.config import RAGConfig
+from opta_lmx.rag.chunker import chunk_text
+from opta_lmx.rag.extraction import DocumentExtractor
+from opta_lmx.rag.processors import process_file
+from opta_lmx.rag.store import VectorStore
+from opta_lmx.rag.watch_registry import WatchRegistry
+from opta_lmx.rag.watcher import WorkspaceWatcher
+
+# Extraction runs in worker processes; pypdf is never imported by the test process.
+needs_pypdf = pytest.mark.skipif(
+    importlib.util.find_spec("pypdf") is None, reason="pypdf (rag extra) not installed"
+)
+
+# ─── Generated corpus ────────────────────────────────────────────────────────
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _write_pdf(path: Path, pages: list[str]) -> Path:
+    """Write a minimal text PDF (Helvetica, one text object per page).
+
+    pypdf extracts each page's text back exactly, so the joined pages are the
+    expected extraction result.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids ["
+        + b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(len(pages)))
+        + b"] /Count %d >>" % len(pages),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(pages):
+        ops = ["BT /F1 11 Tf 14 TL 72 740 Td"]
+        ops += [f"({_pdf_escape(line)}) '" for line in text.split("\n")]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (5 + 2 * i)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    path.write_bytes(bytes(out))
+    return path
+
+
+def _pdf_pages(count: int, lines: int = 6) -> list[str]:
+    return [
+        "\n".join(
+            f"Page {page} line {line} about topic {page * lines + line}" for line in range(lines)
+        )
+        for page in range(count)
+    ]
+
+
+def _write_html(path: Path, sections: int) -> Path:
+    body = "".join(
+        f"<h2>Section {i}</h2><p>Paragraph {i} &amp; notes</p><script>var x = {i};</script>"
+        for i in range(sections)
+    )
+    path.write_text(f"<html><head><style>p {{}}</style></head><body>{body}</body></html>")
+    return path
+
+
+@pytest.fixture
+async def extractor() -> AsyncIterator[DocumentExtractor]:
+    pool = DocumentExtractor(max_workers=2, pdf_parallel_min_pages=10, pdf_pages_per_task=4)
+    yield pool
+    await pool.close()
+
+
+# ─── DocumentExtractor ───────────────────────────────────────────────────────
+
+
+@needs_pypdf
+async def test_large_pdf_streams_page_ranges_in_order(
+    tmp_path: Path, extractor: DocumentExtractor
+) -> None:
+    pages = _pdf_pages(40)
+    path = _write_pdf(tmp_path / "big.pdf", pages)
+    document = extractor.open(path)
+
+    pieces: list[str] = []
+    async for piece in document:
+        if not pieces:
+            # One task opened the file; at most two page ranges are in flight.
+            assert extractor.stats()["tasks_total"] <= 1 + 2
+        pieces.append(piece)
+
+    assert pieces == [pages[0], *("\n\n" + page for page in pages[1:])]
+    assert document.metadata["page_count"] == 40
+    assert document.metadata["char_count"] == len("\n\n".join(pages))
+    assert document.metadata["filename"] == "big.pdf"
+
+    stats = extractor.stats()
+    assert stats["tasks_total"] == 1 + 10  # open + 40 pages / 4 per task
+    assert stats["pdf_pages_total"] == 40
+    assert stats["pdf_files_total"] == 1
+    assert stats["inflight_tasks"] == 0
+
+
+@needs_pypdf
+async def test_small_pdf_is_one_task(tmp_path: Path, extractor: DocumentExtractor) -> None:
+    pages = _pdf_pages(3)
+    doc = await extractor.extract(_write_pdf(tmp_path / "small.pdf", pages))
+    assert doc.text == "\n\n".join(pages)
+    assert doc.processor == "pdf"
+    assert extractor.stats()["tasks_total"] == 2
+
+
+async def test_text_formats_match_process_file(
+    tmp_path: Path, extractor: DocumentExtractor
+) -> None:
+    html = _write_html(tmp_path / "page.html", sections=50)
+    markdown = tmp_path / "notes.md"
+    markdown.write_text("# Title\n\n![img](a.png) See [docs](https://example.com).\n")
+    code = tmp_path / "mod.py"
+    code.write_text("def f():\n    return 1\n")
+
+    for path in (html, markdown, code):
+        doc = await extractor.extract(path)
+        expected = process_file(path)
+        assert (doc.text, doc.metadata, doc.processor) == (
+            expected.text,
+            expected.metadata,
+            expected.processor,
+        )
+    assert "Paragraph 49 & notes" in (await extractor.extract(html)).text
+
+    stats = extractor.stats()
+    assert stats["html_files_total"] == 2
+    assert stats["markdown_files_total"] == stats["code_files_total"] == 1
+    assert stats["html_bytes_total"] == 2 * html.stat().st_size
+    assert stats["html_worker_seconds_total"] > 0
+    assert stats["html_mb_per_sec"] > 0
+    assert all(isinstance(value, int | float) for value in stats.values())
+
+
+@needs_pypdf
+async def test_failures_are_counted(tmp_path: Path, extractor: DocumentExtractor) -> None:
+    corrupt = tmp_path / "corrupt.pdf"
+    corrupt.write_bytes(b"%PDF-1.4\nnot really a pdf")
+    # Unparseable PDFs are logged and skipped, as process_pdf does.
+    doc = await extractor.extract(corrupt)
+    assert doc.text == ""
+    assert doc.metadata["error"]
+    assert doc.metadata["filename"] == "corrupt.pdf"
+    with pytest.raises(FileNotFoundError):
+        await extractor.extract(tmp_path / "missing.md")
+
+    stats = extractor.stats()
+    assert stats["pdf_errors_total"] == 1
+    assert stats["markdown_errors_total"] == 1
+    assert stats["inflight_tasks"] == 0
+
+
+# ─── WorkspaceWatcher ingestion ──────────────────────────────────────────────
+
+
+class _FakeEmbeddingEngine:
+    def __init__(self) -> None:
+        self.batches: list[int] = []
+
+    async def embed(self, texts: list[str], model_id: str | None = None) -> list[list[float]]:
+        self.batches.append(len(texts))
+        return [[float(len(text)), 1.0, 0.0, 0.0] for text in texts]
+
+
+@needs_pypdf
+async def test_watcher_ingests_pdf_while_streaming(tmp_path: Path) -> None:
+    config = RAGConfig(
+        default_chunk_size=64,
+        default_chunk_overlap=8,
+        extraction_workers=2,
+        extraction_pdf_parallel_min_pages=8,
+        extraction_pdf_pages_per_task=4,
+    )
+    embedder = _FakeEmbeddingEngine()
+    store = VectorStore()
+    watcher = WorkspaceWatcher(
+        WatchRegistry(tmp_path / "registry.json"),
+        store,
+        embedder,  # type: ignore[arg-type]
+        config,
+    )
+    pages = _pdf_pages(120, lines=12)
+    path = _write_pdf(tmp_path / "manual.pdf", pages)
+    try:
+        count = await watcher._ingest_file(str(path), "docs")
+        # Re-ingesting replaces the file's chunks instead of duplicating them.
+        assert await watcher._ingest_file(str(path), "docs") == count
+    finally:
+        await watcher.stop()
+
+    expected = chunk_text("\n\n".join(pages), 64, 8)
+    assert count == len(expected)
+    docs = store._collections["docs"]
+    assert [d.text for d in docs] == [c.text for c in expected]
+    assert docs[0].metadata["page_count"] == 120
+    assert docs[-1].metadata["end_char"] == expected[-1].end_char
+    # Embedded in batches as text arrived, not in one call per file.
+    assert max(embedder.batches) == 64
+    assert len(embedder.batches) >= 2 * (count // 64)
+
+
+@needs_pypdf
+async def test_watcher_skips_unparseable_pdf_and_keeps_old_chunks(tmp_path: Path) -> None:
+    store = VectorStore()
+    watcher = WorkspaceWatcher(
+        WatchRegistry(tmp_path / "registry.json"),
+        store,
+        _FakeEmbeddingEngine(),  # type: ignore[arg-type]
+        RAGConfig(default_chunk_size=64, default_chunk_overlap=8, extraction_workers=1),
+    )
+    path = _write_pdf(tmp_path / "notes.pdf", _pdf_pages(2))
+    try:
+        count = await watcher._ingest_file(str(path), "docs")
+        assert count > 0
+        path.write_bytes(b"%PDF-1.4\nnot really a pdf")
+        assert await watcher._ingest_file(str(path), "docs") == 0
+    finally:
+        await watcher.stop()
+
+    assert store.collection_count("docs") == count
@@ -0,0 +1,188 @@
+"""Tests for the deterministic simulated inference backend."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from opta_lmx.inference.backend_policy import backend_candidates
+from opta_lmx.inference.engine import InferenceEngine
+from opta_lmx.inference.fake_backend import (
+    FakeBackend,
+    FakeBackendError,
+    FakeBackendProfile,
+    estimate_memory_gb,
+)
+from opta_lmx.inference.schema import ChatMessage
+from opta_lmx.manager.memory import MemoryMonitor
+from opta_lmx.model_safety import CompatibilityRegistry
+
+_MESSAGES = [{"role": "user", "content": "one two three four five six seven"}]
+
+
+class _RecordingSleep:
+    """Records requested delays and yields to the loop instead of waiting."""
+
+    def __init__(self) -> None:
+        self.delays: list[float] = []
+
+    async def __call__(self, delay: float) -> None:
+        self.delays.append(delay)
+        await asyncio.sleep(0)
+
+
+def _backend(**profile: object) -> tuple[FakeBackend, _RecordingSleep]:
+    sleep = _RecordingSleep()
+    return FakeBackend("org/model", FakeBackendProfile(**profile), sleep=sleep), sleep  # type: ignore[arg-type]
+
+
+async def _collect(backend: FakeBackend, **kwargs: object) -> list[str]:
+    params: dict[str, object] = {
+        "messages": _MESSAGES,
+        "temperature": 0.7,
+        "max_tokens": 64,
+        "top_p": 1.0,
+        "stop": None,
+        "tools": None,
+    }
+    params.update(kwargs)
+    return [chunk async for chunk in backend.stream(**params)]  # type: ignore[arg-type, misc]
+
+
+class TestFakeBackendTiming:
+    async def test_prefill_scales_with_prompt_and_decode_with_rate(self) -> None:
+        backend, sleep = _backend(
+            prefill_tokens_per_sec=100.0, decode_tokens_per_sec=50.0, jitter=0.0
+        )
+        tokens = await _collect(backend, max_tokens=5)
+
+        # "user: one ... seven\nassistant:" is 9 whitespace tokens.
+        assert sleep.delays[0] == pytest.approx(9 / 100.0)
+        assert len(tokens) == 5
+        assert sleep.delays[1:] == pytest.approx([1 / 50.0] * 5)
+
+    async def test_jitter_stays_within_bounds(self) -> None:
+        backend, sleep = _backend(decode_tokens_per_sec=10.0, jitter=0.2)
+        await _collect(backend)
+        decode = sleep.delays[1:]
+        assert all(0.08 <= d <= 0.12 for d in decode)
+        assert len(set(decode)) > 1
+
+    async def test_concurrent_streams_slow_each_other(self) -> None:
+        backend, sleep = _backend(decode_tokens_per_sec=10.0, jitter=0.0, batch_slowdown=0.5)
+        await asyncio.gather(_collect(backend, max_tokens=8), _collect(backend, max_tokens=8))
+        assert max(sleep.delays) == pytest.approx(0.15)
+
+    async def test_load_reports_footprint(self) -> None:
+        sleep = _RecordingSleep()
+        backend = FakeBackend(
+            "mlx-community/Qwen2.5-7B-Instruct-4bit",
+            FakeBackendProfile(load_sec=1.5),
+            sleep=sleep,
+        )
+        await backend.load()
+        assert sleep.delays == [1.5]
+        assert backend.memory_footprint_gb == estimate_memory_gb(backend._model_id)
+
+
+class TestFakeBackendOutput:
+    async def test_identical_requests_are_deterministic(self) -> None:
+        first, _ = _backend()
+        second, _ = _backend()
+        assert await _collect(first) == await _collect(second)
+
+        reseeded, _ = _backend(seed=7)
+        assert await _collect(reseeded) != await _collect(first)
+
+    async def test_generate_matches_stream_and_counts_tokens(self) -> None:
+        backend, _ = _backend(completion_tokens=20)
+        content, prompt_tokens, completion_tokens = await backend.generate(
+            _MESSAGES, 0.7, 64, 1.0, None, None
+        )
+        streamed = await _collect(backend)
+        assert content == "".join(streamed)
+        assert prompt_tokens == 9
+        assert completion_tokens == len(streamed)
+        assert 15 <= completion_tokens <= 25
+
+    async def test_max_tokens_caps_completion(self) -> None:
+        backend, _ = _backend(completion_tokens=500)
+        assert len(await _collect(backend, max_tokens=3)) == 3
+
+    async def test_stop_sequence_truncates(self) -> None:
+        backend, _ = _backend()
+        full = "".join(await _collect(backend))
+        stop = full.split()[3]
+        cut = "".join(await _collect(backend, stop=[stop]))
+        assert cut == full[: full.index(stop)]
+
+    async def test_json_response_format_is_valid_json(self) -> None:
+        backend, _ = _backend()
+        text = "".join(await _collect(backend, response_format={"type": "json_object"}))
+        assert isinstance(json.loads(text)["response"], str)
+
+    async def test_failure_rate_injects_errors(self) -> None:
+        backend, _ = _backend(failure_rate=1.0)
+        with pytest.raises(FakeBackendError):
+            await _collect(backend)
+        with pytest.raises(FakeBackendError):
+            await backend.generate(_MESSAGES, 0.7, 64, 1.0, None, None)
+
+
+def test_estimate_memory_gb() -> None:
+    assert estimate_memory_gb("org/Llama-3-8B-4bit") == pytest.approx(4.4)
+    assert estimate_memory_gb("org/Qwen2.5-0.5B-Instruct") == pytest.approx(1.1)
+    assert estimate_memory_gb("org/unsized-model", default_gb=2.0) == 2.0
+
+
+class TestFakeBackendSelection:
+    def test_first_in_preference_order_takes_every_model(self, tmp_path: Path) -> None:
+        cfg = SimpleNamespace(backend_preference_order=["fake", "vllm-mlx"])
+        registry = CompatibilityRegistry(path=tmp_path / "compat.json")
+        assert backend_candidates("org/model", cfg, registry) == ["fake"]
+        assert backend_candidates("org/model-GGUF", cfg, registry) == ["fake"]
+
+    def test_explicit_override(self, tmp_path: Path) -> None:
+        cfg = SimpleNamespace(backend_preference_order=["vllm-mlx", "mlx-lm"])
+        registry = CompatibilityRegistry(path=tmp_path / "compat.json")
+        assert backend_candidates("org/model", cfg, registry, preferred_backend="fake") == ["fake"]
+
+    async def test_engine_loads_and_serves_through_fake_backend(self) -> None:
+        engine = InferenceEngine(
+            memory_monitor=MemoryMonitor(max_percent=100),
+            use_batching=False,
+            warmup_on_load=False,
+            backend_preference_order=["fake"],
+            fake_backend_profile=FakeBackendProfile(
+                load_sec=0.0,
+                prefill_tokens_per_sec=1e6,
+                decode_tokens_per_sec=1e6,
+                completion_tokens=12,
+            ),
+        )
+        model_id = "org/Llama-3-8B-4bit"
+        await engine.load_model(model_id)
+
+        loaded = engine._models[model_id]
+        assert loaded.backend_type == "fake"
+        assert loaded.estimated_memory_gb == pytest.approx(4.4)
+        assert engine.get_loaded_backend_label(model_id) == "fake"
+
+        response = await engine.generate(
+            model_id, [ChatMessage(role="user", content="hello there")], max_tokens=8
+        )
+        assert response.choices[0].message.content
+        assert response.usage.completion_tokens == 8
+
+        chunks = [
+            chunk
+            async for chunk in engine.stream_generate(
+                model_id, [ChatMessage(role="user", content="hello there")], max_tokens=8
+            )
+        ]
+        assert len(chunks) == 8
+        await engine.unload_model(model_id)
@@ -0,0 +1,287 @@
+"""Tests for HelperNodePool — balancing, sharding, hedging and failover.
+
+Each helper node is a real local HTTP stub server so the pool exercises its
+actual httpx clients, keep-alive pools and circuit breakers.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from opta_lmx.config import HelperNodeEndpoint, HelperNodePoolConfig, HelperNodesConfig
+from opta_lmx.helpers.client import HelperNodeClient, HelperNodeError
+from opta_lmx.helpers.pool import HelperNodePool
+
+
+class _StubNode:
+    """Local OpenAI-compatible embedding/rerank stub with tunable delay and failure."""
+
+    def __init__(self, marker: float) -> None:
+        self.marker = marker
+        self.delay_sec = 0.0
+        self.fail = False
+        self.batches: list[int] = []
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _reply(self, status: int, body: dict[str, Any]) -> None:
+                raw = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def do_GET(self) -> None:
+                self._reply(200, {"status": "ok"})
+
+            def do_POST(self) -> None:
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                time.sleep(node.delay_sec)
+                if node.fail:
+                    self._reply(500, {"error": "boom"})
+                    return
+                if self.path == "/v1/embeddings":
+                    node.batches.append(len(payload["input"]))
+                    data = [
+                        {"embedding": [node.marker, float(len(text))], "index": i}
+                        for i, text in enumerate(payload["input"])
+                    ]
+                    self._reply(200, {"data": data})
+                else:
+                    results = [
+                        {"index": i, "relevance_score": node.marker}
+                        for i, _ in enumerate(payload["documents"])
+                    ]
+                    self._reply(200, {"results": results})
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def nodes() -> Iterator[list[_StubNode]]:
+    stubs = [_StubNode(1.0), _StubNode(2.0), _StubNode(3.0)]
+    yield stubs
+    for stub in stubs:
+        stub.stop()
+
+
+def _pool(nodes: list[_StubNode], **overrides: Any) -> HelperNodePool:
+    weights = overrides.pop("weights", [1.0] * len(nodes))
+    endpoint_overrides = overrides.pop("endpoint", {})
+    config = HelperNodePoolConfig(
+        endpoints=[
+            HelperNodeEndpoint(url=node.url, model="embed", weight=weight, **endpoint_overrides)
+            for node, weight in zip(nodes, weights, strict=True)
+        ],
+        **overrides,
+    )
+    return HelperNodePool(config)
+
+
+# ─── Config ──────────────────────────────────────────────────────────────────
+
+
+def test_pool_config_requires_endpoints() -> None:
+    with pytest.raises(ValidationError):
+        HelperNodePoolConfig(endpoints=[])
+
+
+def test_single_and_pool_are_mutually_exclusive() -> None:
+    endpoint = HelperNodeEndpoint(url="http://10.0.0.1:1234", model="m")
+    with pytest.raises(ValidationError):
+        HelperNodesConfig(
+            embedding=endpoint,
+            embedding_pool=HelperNodePoolConfig(endpoints=[endpoint]),
+        )
+
+
+def test_client_uses_configured_pool_limits_and_breaker() -> None:
+    client = HelperNodeClient(
+        HelperNodeEndpoint(
+            url="http://10.0.0.1:1234",
+            model="m",
+            max_connections=16,
+            max_keepalive_connections=8,
+            circuit_failure_threshold=1,
+        )
+    )
+    pool = client._client._transport._pool  # type: ignore[attr-defined]
+    assert pool._max_connections == 16
+    assert pool._max_keepalive_connections == 8
+    client.circuit_breaker.record_failure()
+    assert client.circuit_breaker.allows_request is False
+
+
+# ─── Balancing ───────────────────────────────────────────────────────────────
+
+
+async def test_weighted_strategy_follows_weights(nodes: list[_StubNode]) -> None:
+    pool = _pool(nodes[:2], strategy="weighted", weights=[3.0, 1.0])
+    try:
+        for _ in range(8):
+            await pool.embed(["x"])
+        assert len(nodes[0].batches) == 6
+        assert len(nodes[1].batches) == 2
+    finally:
+        await pool.close()
+
+
+async def test_least_latency_prefers_fast_node(nodes: list[_StubNode]) -> None:
+    nodes[0].delay_sec = 0.05
+    pool = _pool(nodes[:2], strategy="least_latency")
+    try:
+        for _ in range(10):
+            await pool.embed(["x"])
+        # Both get probed once, after which the fast node wins every pick.
+        assert len(nodes[1].batches) >= 8
+    finally:
+        await pool.close()
+
+
+# ─── Sharding ────────────────────────────────────────────────────────────────
+
+
+async def test_large_batch_is_sharded_in_order(nodes: list[_StubNode]) -> None:
+    pool = _pool(nodes, shard_min_batch=4)
+    texts = ["a" * (i + 1) for i in range(9)]
+    try:
+        vectors = await pool.embed(texts)
+    finally:
+        await pool.close()
+
+    assert [stub.batches for stub in nodes] == [[3], [3], [3]]
+    # Order preserved: second component encodes the input length.
+    assert [v[1] for v in vectors] == [float(i + 1) for i in range(9)]
+    assert [v[0] for v in vectors] == [1.0] * 3 + [2.0] * 3 + [3.0] * 3
+    assert pool.get_health_stats()["sharded_batches"] == 1
+
+
+async def test_failed_shard_is_retried_on_another_node(nodes: list[_StubNode]) -> None:
+    nodes[1].fail = True
+    pool = _pool(nodes, shard_min_batch=2)
+    try:
+        vectors = await pool.embed(["a", "bb", "ccc", "dddd", "eeeee", "ffffff"])
+    finally:
+        await pool.close()
+    assert [v[1] for v in vectors] == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    assert all(v[0] != 2.0 for v in vectors)
+
+
+# ─── Failover and circuit breakers ───────────────────────────────────────────
+
+
+async def test_failover_to_healthy_node(nodes: list[_StubNode]) -> None:
+    nodes[0].fail = True
+    pool = _pool(nodes[:2], strategy="weighted")
+    try:
+        for _ in range(4):
+            vectors = await pool.embed(["x"])
+            assert vectors[0][0] == 2.0
+    finally:
+        await pool.close()
+    assert pool.get_health_stats()["failovers"] >= 1
+
+
+async def test_open_circuit_node_is_skipped(nodes: list[_StubNode]) -> None:
+    nodes[0].fail = True
+    pool = _pool(
+        nodes[:2],
+        strategy="weighted",
+        endpoint={"circuit_failure_threshold": 1},
+    )
+    try:
+        await pool.embed(["x"])
+        assert pool.clients[0].circuit_breaker.allows_request is False
+        calls_before = len(nodes[0].batches)
+        for _ in range(3):
+            await pool.embed(["x"])
+        assert len(nodes[0].batches) == calls_before
+    finally:
+        await pool.close()
+
+
+async def test_all_nodes_failing_uses_pool_fallback(nodes: list[_StubNode]) -> None:
+    for stub in nodes[:2]:
+        stub.fail = True
+    pool = _pool(nodes[:2], fallback="skip")
+    try:
+        with pytest.raises(HelperNodeError) as exc_info:
+            await pool.embed(["x"])
+    finally:
+        await pool.close()
+    assert exc_info.value.fallback == "skip"
+
+
+# ─── Hedging ─────────────────────────────────────────────────────────────────
+
+
+async def test_hedged_request_wins_on_second_node(nodes: list[_StubNode]) -> None:
+    nodes[0].delay_sec = 0.5
+    pool = _pool(
+        nodes[:2],
+        strategy="weighted",
+        weights=[10.0, 1.0],
+        hedge_enabled=True,
+        hedge_min_delay_ms=20.0,
+    )
+    try:
+        started = time.monotonic()
+        results = await pool.rerank("q", ["d1", "d2"])
+        elapsed = time.monotonic() - started
+    finally:
+        await pool.close()
+
+    assert results[0]["relevance_score"] == 2.0
+    assert elapsed < 0.4
+    stats = pool.get_health_stats()
+    assert stats["hedged_requests"] == 1
+    assert stats["hedge_wins"] == 1
+
+
+async def test_fast_primary_does_not_hedge(nodes: list[_StubNode]) -> None:
+    pool = _pool(nodes[:2], hedge_enabled=True, hedge_min_delay_ms=500.0)
+    try:
+        await pool.embed(["x"])
+    finally:
+        await pool.close()
+    assert pool.get_health_stats()["hedged_requests"] == 0
+    assert sum(len(stub.batches) for stub in nodes[:2]) == 1
+
+
+# ─── Health surface ──────────────────────────────────────────────────────────
+
+
+async def test_pool_health_surface(nodes: list[_StubNode]) -> None:
+    pool = _pool(nodes[:2])
+    try:
+        assert await pool.health_check() is True
+        stats = pool.get_health_stats()
+    finally:
+        await pool.close()
+    assert stats["url"] == f"{nodes[0].url},{nodes[1].url}"
+    assert len(stats["nodes"]) == 2
+    assert stats["circuit_state"] == "closed"
+    assert pool.is_healthy is True
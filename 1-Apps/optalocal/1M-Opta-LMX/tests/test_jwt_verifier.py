@@ -0,0 +1,245 @@
+"""Tests for SupabaseJWTVerifier — verified-token cache and JWKS refresh.
+
+Keys are served by a real local JWKS stub server so the verifier exercises
+its actual fetch path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+from opta_lmx.security.jwt_verifier import SupabaseJWTVerifier
+
+jwt = pytest.importorskip("jwt")
+rsa = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.rsa")
+
+
+class _JWKSServer:
+    """Serves a mutable JWKS document and counts fetches."""
+
+    def __init__(self) -> None:
+        self.keys: list[dict[str, Any]] = []
+        self.fetches = 0
+        self.delay_sec = 0.0
+        self.fail = False
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                server.fetches += 1
+                time.sleep(server.delay_sec)
+                if server.fail:
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                raw = json.dumps({"keys": server.keys}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/.well-known/jwks.json"
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class _SigningKey:
+    def __init__(self, kid: str) -> None:
+        self.kid = kid
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(self.private_key.public_key()))
+        self.jwk = {**jwk, "kid": kid, "alg": "RS256", "use": "sig"}
+
+    def token(self, sub: str = "user-1", exp_in: float | None = 3600.0) -> str:
+        claims: dict[str, Any] = {"sub": sub, "iss": "https://issuer.test"}
+        if exp_in is not None:
+            claims["exp"] = int(time.time() + exp_in)
+        return jwt.encode(claims, self.private_key, algorithm="RS256", headers={"kid": self.kid})
+
+
+@pytest.fixture(scope="module")
+def signing_key() -> _SigningKey:
+    return _SigningKey("kid-1")
+
+
+@pytest.fixture
+def jwks(signing_key: _SigningKey) -> Iterator[_JWKSServer]:
+    server = _JWKSServer()
+    server.keys = [signing_key.jwk]
+    yield server
+    server.stop()
+
+
+def _verifier(jwks: _JWKSServer, **overrides: Any) -> SupabaseJWTVerifier:
+    return SupabaseJWTVerifier(
+        issuer="https://issuer.test",
+        audience=None,
+        jwks_url=jwks.url,
+        **overrides,
+    )
+
+
+# ─── Verified-token cache ────────────────────────────────────────────────────
+
+
+def test_repeat_token_hits_cache(jwks: _JWKSServer, signing_key: _SigningKey) -> None:
+    verifier = _verifier(jwks)
+    token = signing_key.token()
+
+    first = verifier.verify(token)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(verifier, "_load_pyjwt", lambda: pytest.fail("signature re-verified"))
+        second = verifier.verify(token)
+
+    assert first.valid and first.user_id == "user-1"
+    assert second == first
+    stats = verifier.stats()
+    assert stats["token_cache_hits_total"] == 1
+    assert stats["token_cache_misses_total"] == 1
+    assert stats["token_cache_hit_ratio"] == 0.5
+
+
+def test_cache_entry_expires_with_token(jwks: _JWKSServer, signing_key: _SigningKey) -> None:
+    verifier = _verifier(jwks)
+    token = signing_key.token()
+    assert verifier.verify(token).valid
+
+    key = next(iter(verifier._token_cache))
+    result, kid, _ = verifier._token_cache[key]
+    verifier._token_cache[key] = (result, kid, time.time() - 1)
+
+    assert verifier.verify(token).valid
+    assert verifier.stats()["token_cache_hits_total"] == 0
+
+
+def test_invalid_and_expless_tokens_are_not_cached(
+    jwks: _JWKSServer, signing_key: _SigningKey
+) -> None:
+    verifier = _verifier(jwks)
+    assert not verifier.verify(signing_key.token(exp_in=-60)).valid
+    assert verifier.verify(signing_key.token(exp_in=None)).valid
+    assert verifier.stats()["token_cache_entries"] == 0
+
+
+def test_token_cache_is_bounded_lru(jwks: _JWKSServer, signing_key: _SigningKey) -> None:
+    verifier = _verifier(jwks, token_cache_size=2)
+    tokens = [signing_key.token(sub=f"user-{i}") for i in range(3)]
+    for token in tokens:
+        verifier.verify(token)
+    assert verifier.stats()["token_cache_entries"] == 2
+
+    verifier.verify(tokens[0])
+    assert verifier.stats()["token_cache_hits_total"] == 0
+
+
+def test_key_rotation_evicts_tokens_from_removed_kid(
+    jwks: _JWKSServer, signing_key: _SigningKey
+) -> None:
+    verifier = _verifier(jwks)
+    assert verifier.verify(signing_key.token()).valid
+
+    jwks.keys = [_SigningKey("kid-2").jwk]
+    verifier._refresh_jwks(verifier._jwks_generation)
+    assert verifier.stats()["token_cache_entries"] == 0
+
+
+# ─── JWKS refresh ────────────────────────────────────────────────────────────
+
+
+def test_concurrent_stale_refreshes_are_single_flighted(
+    jwks: _JWKSServer, signing_key: _SigningKey
+) -> None:
+    verifier = _verifier(jwks, token_cache_size=0)
+    jwks.delay_sec = 0.1
+    tokens = [signing_key.token(sub=f"user-{i}") for i in range(8)]
+    results: list[bool] = []
+
+    def _verify(token: str) -> None:
+        results.append(verifier.verify(token).valid)
+
+    threads = [threading.Thread(target=_verify, args=(t,)) for t in tokens]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 8
+    assert jwks.fetches == 1
+
+
+def test_unknown_kid_refresh_is_rate_limited(jwks: _JWKSServer, signing_key: _SigningKey) -> None:
+    verifier = _verifier(jwks)
+    assert verifier.verify(signing_key.token()).valid
+    stranger = _SigningKey("kid-unknown")
+
+    assert verifier.verify(stranger.token()).error == "unknown_kid"
+    assert verifier.verify(stranger.token(sub="other")).error == "unknown_kid"
+    # Initial fetch plus a single forced refresh.
+    assert jwks.fetches == 2
+
+    # A different kid (e.g. a real rotation) is not blocked by the first one.
+    rotated = _SigningKey("kid-rotated")
+    jwks.keys.append(rotated.jwk)
+    assert verifier.verify(rotated.token()).valid
+    assert verifier.verify(stranger.token()).error == "unknown_kid"
+    assert jwks.fetches == 3
+
+
+async def test_concurrent_async_refreshes_share_one_fetch(jwks: _JWKSServer) -> None:
+    verifier = _verifier(jwks)
+    jwks.delay_sec = 0.05
+    await asyncio.gather(*(verifier.refresh_jwks() for _ in range(5)))
+    assert jwks.fetches == 1
+    assert verifier.stats()["jwks_refreshes_total"] == 1
+
+
+async def test_background_refresh_keeps_request_path_off_network(
+    jwks: _JWKSServer, signing_key: _SigningKey
+) -> None:
+    verifier = _verifier(jwks, cache_ttl_sec=0.2, refresh_ahead_ratio=0.5, token_cache_size=0)
+    verifier.start_background_refresh()
+    try:
+        await asyncio.sleep(0.05)
+        assert jwks.fetches == 1
+        await asyncio.sleep(0.3)
+        assert jwks.fetches >= 3
+
+        # Even with the JWKS endpoint down, a stale set is served without a fetch.
+        jwks.fail = True
+        verifier._jwks_cached_at = 0.0
+        fetches = jwks.fetches
+        assert verifier.verify(signing_key.token()).valid
+        assert jwks.fetches == fetches
+    finally:
+        await verifier.stop_background_refresh()
+    assert not verifier.background_refresh_running
+
+
+async def test_background_refresh_failure_is_counted(jwks: _JWKSServer) -> None:
+    jwks.fail = True
+    verifier = _verifier(jwks)
+    await verifier.refresh_jwks()
+    stats = verifier.stats()
+    assert stats["jwks_refresh_failures_total"] == 1
+    assert stats["jwks_keys"] == 0
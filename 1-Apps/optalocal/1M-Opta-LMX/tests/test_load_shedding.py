@@ -76,3 +76,31 @@ async def test_load_shedding_exempts_health_endpoints(
 
     response = await shed_client.get("/healthz")
     assert response.status_code == 200
+
+
+class _FakeEngine:
+    def __init__(self, retry_after: int | None) -> None:
+        self.retry_after = retry_after
+
+    def admission_retry_after_sec(self) -> int | None:
+        return self.retry_after
+
+
+@pytest.mark.asyncio
+async def test_load_shedding_retry_after_tracks_engine_backlog(
+    shed_client: AsyncClient,
+) -> None:
+    """Retry-After should follow the engine's backlog estimate, else the default."""
+    state = shed_client._transport.app.state  # type: ignore[union-attr]
+
+    response = await shed_client.get("/work")
+    assert response.headers["retry-after"] == "30"
+
+    state.engine = _FakeEngine(retry_after=12)
+    response = await shed_client.get("/work")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "12"
+
+    state.engine = _FakeEngine(retry_after=None)
+    response = await shed_client.get("/work")
+    assert response.headers["retry-after"] == "30"
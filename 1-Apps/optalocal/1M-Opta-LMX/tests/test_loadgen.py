@@ -0,0 +1,216 @@
+"""Tests for the closed/open-loop load generator."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from opta_lmx.api.benchmark import LoadTestRequest
+from opta_lmx.monitoring.benchmark import BenchmarkResultStore, LoadTestSLO
+from opta_lmx.monitoring.loadgen import (
+    EngineTarget,
+    HTTPTarget,
+    SimulatedTarget,
+    WorkloadItem,
+    _arrival_offsets,
+    _issue,
+    load_trace,
+    mixed_workload,
+    percentiles,
+    report_to_benchmark_result,
+    run_load_test,
+    run_point,
+)
+
+ITEMS = [WorkloadItem("short prompt", 4), WorkloadItem("a much longer prompt " * 20, 8)]
+
+
+def _fast_target(**kwargs: Any) -> SimulatedTarget:
+    return SimulatedTarget(base_ttft_ms=2.0, decode_tokens_per_sec=2000.0, **kwargs)
+
+
+def test_percentiles_nearest_rank() -> None:
+    result = percentiles([float(v) for v in range(1, 101)])
+    assert (result.p50, result.p90, result.p99, result.mean) == (50.0, 90.0, 99.0, 50.5)
+    assert percentiles([]).p99 == 0.0
+
+
+def test_load_trace_accepts_prompts_and_messages(tmp_path: Path) -> None:
+    trace = tmp_path / "trace.jsonl"
+    trace.write_text(
+        "\n".join(
+            [
+                json.dumps({"prompt": "hello", "max_tokens": 7}),
+                json.dumps(
+                    {"messages": [{"role": "user", "content": "hi"}], "completion_tokens": 3}
+                ),
+                "not json",
+                json.dumps({"prompt": ""}),
+            ]
+        ),
+        encoding="utf-8",
+    )
+    assert load_trace(trace) == [WorkloadItem("hello", 7), WorkloadItem("hi", 3)]
+
+
+def test_mixed_workload_varies_lengths() -> None:
+    workload = mixed_workload(100)
+    assert len({item.max_tokens for item in workload}) > 1
+    assert len({len(item.prompt) for item in workload}) > 1
+
+
+def test_arrival_schedules() -> None:
+    assert _arrival_offsets("constant", 4.0, 3, seed=0) == [0.0, 0.25, 0.5]
+    poisson = _arrival_offsets("poisson", 10.0, 200, seed=1)
+    assert poisson == _arrival_offsets("poisson", 10.0, 200, seed=1)
+    assert 15.0 < poisson[-1] < 25.0
+
+
+async def test_closed_loop_sweep_reports_per_level() -> None:
+    report = await run_load_test(
+        _fast_target(slots=2), ITEMS, concurrency_levels=(1, 4), requests_per_point=8
+    )
+    low, high = report.points
+    assert (low.concurrency, high.concurrency) == (1, 4)
+    assert low.completed == high.completed == 8
+    assert low.server_queue_wait_ms is not None and low.server_queue_wait_ms.p99 < 1.0
+    # Four clients on two slots: half the requests wait for a slot.
+    assert high.server_queue_wait_ms is not None and high.server_queue_wait_ms.p99 > 1.0
+    assert high.ttft_ms.p99 > low.ttft_ms.p99
+    assert high.itl_ms.p50 > 0
+
+
+async def test_open_loop_tracks_schedule_and_goodput() -> None:
+    point = await run_point(
+        _fast_target(),
+        ITEMS,
+        arrival="constant",
+        rate_rps=200.0,
+        requests=10,
+        slo=LoadTestSLO(ttft_ms=1000.0, tpot_ms=None),
+    )
+    assert point.mode == "open"
+    assert point.rate_rps == 200.0
+    assert point.duration_sec >= 0.045
+    assert point.slo_attainment == 1.0
+    assert point.goodput_rps == point.throughput_rps
+
+    strict = await run_point(
+        _fast_target(),
+        ITEMS,
+        arrival="poisson",
+        rate_rps=200.0,
+        requests=10,
+        slo=LoadTestSLO(ttft_ms=0.001),
+    )
+    assert strict.slo_attainment == 0.0
+    assert strict.goodput_rps == 0.0
+
+
+async def test_errors_are_counted_not_raised() -> None:
+    class Flaky:
+        name = "flaky"
+
+        def __init__(self) -> None:
+            self.calls = 0
+
+        async def execute(self, item: WorkloadItem, on_token: Any) -> float | None:
+            self.calls += 1
+            if self.calls % 2:
+                raise RuntimeError("boom")
+            on_token()
+            return None
+
+    point = await run_point(
+        Flaky(), ITEMS, arrival="closed", concurrency=2, requests=6, slo=LoadTestSLO()
+    )
+    assert (point.completed, point.errors) == (3, 3)
+    assert point.slo_attainment == 0.5
+    assert point.server_queue_wait_ms is None
+
+
+async def test_engine_target_reports_queue_wait() -> None:
+    class FakeEngine:
+        def __init__(self) -> None:
+            self._queue_wait: dict[int, float] = {}
+
+        async def stream_generate(self, **kwargs: Any) -> AsyncIterator[str]:
+            self._queue_wait[id(asyncio.current_task())] = 0.005
+            for _ in range(kwargs["max_tokens"]):
+                yield "t"
+
+        def pop_queue_wait_seconds(self) -> float | None:
+            return self._queue_wait.pop(id(asyncio.current_task()), None)
+
+    point = await run_point(
+        EngineTarget(FakeEngine(), "m"),
+        ITEMS,
+        arrival="closed",
+        concurrency=2,
+        requests=4,
+        slo=LoadTestSLO(),
+    )
+    assert point.completed == 4
+    assert point.server_queue_wait_ms is not None
+    assert point.server_queue_wait_ms.p50 == 5.0
+
+
+async def test_http_target_counts_tokens_from_usage() -> None:
+    frames = [
+        {"choices": [{"delta": {"content": "one two three"}}]},
+        {"choices": [{"delta": {"content": " four five"}}]},
+        {"choices": [], "usage": {"completion_tokens": 5}},
+    ]
+    sse = "".join(f"data: {json.dumps(frame)}\n\n" for frame in frames) + "data: [DONE]\n\n"
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["stream_options"] == {"include_usage": True}
+        return httpx.Response(200, text=sse, headers={"content-type": "text/event-stream"})
+
+    target = HTTPTarget("http://lmx.test", "m")
+    target._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(_handler), base_url="http://lmx.test"
+    )
+    try:
+        sample = await _issue(target, WorkloadItem("hi", 8), None)
+    finally:
+        await target.aclose()
+    assert sample.ok
+    assert sample.output_tokens == 5
+    assert len(sample.gaps_ms) == 1
+
+
+def test_load_test_request_rejects_non_positive_levels() -> None:
+    with pytest.raises(ValidationError):
+        LoadTestRequest(model_id="m", concurrency=[0])
+    with pytest.raises(ValidationError):
+        LoadTestRequest(model_id="m", arrival="poisson", rate_rps=[0.0])
+    assert LoadTestRequest(model_id="m", concurrency=[1, 4]).concurrency == [1, 4]
+
+
+async def test_report_round_trips_through_result_store(tmp_path: Path) -> None:
+    report = await run_load_test(
+        _fast_target(), ITEMS, concurrency_levels=(1, 2), requests_per_point=4
+    )
+    result = report_to_benchmark_result(
+        report, model_id="m", backend="simulated", hardware="ci", lmx_version="0"
+    )
+    assert result.status == "ok"
+    assert result.stats.toks_per_sec_mean > 0
+
+    store = BenchmarkResultStore(directory=tmp_path)
+    store.save(result)
+    loaded = store.load_all()[0]
+    assert loaded.load_test == report
+
+
+def test_sweep_needs_levels() -> None:
+    with pytest.raises(ValueError, match="no sweep levels"):
+        asyncio.run(run_load_test(_fast_target(), ITEMS, arrival="poisson", rate_levels=()))
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from opta_lmx.monitoring.metrics import MetricsCollector, RequestMetric
+from opta_lmx.monitoring.metrics import AgentRunMetric, MetricsCollector, RequestMetric
 
 
 def test_empty_metrics_has_zero_counters() -> None:
@@ -115,3 +115,59 @@ def test_latency_histogram_buckets() -> None:
     # Cumulative: 0.1 bucket should have 1, 5.0 bucket should have 2
     assert 'lmx_request_duration_seconds_bucket{model="m",le="0.1"} 1' in output
     assert 'lmx_request_duration_seconds_bucket{model="m",le="5.0"} 2' in output
+
+
+def test_registered_source_exported() -> None:
+    """Subsystem sources appear as gauges in Prometheus output and summary."""
+    collector = MetricsCollector()
+    collector.register_source("rerank", lambda: {"queue_depth": 3, "cache_hit_ratio": 0.5})
+
+    output = collector.prometheus()
+    assert "# TYPE lmx_rerank_queue_depth gauge" in output
+    assert "lmx_rerank_queue_depth 3" in output
+    assert collector.summary()["subsystems"]["rerank"]["cache_hit_ratio"] == 0.5
+
+    collector.unregister_source("rerank")
+    assert "lmx_rerank_queue_depth" not in collector.prometheus()
+
+
+def test_failing_source_is_skipped() -> None:
+    collector = MetricsCollector()
+
+    def _broken() -> dict[str, float | int]:
+        raise RuntimeError("boom")
+
+    collector.register_source("broken", _broken)
+    assert "lmx_broken" not in collector.prometheus()
+
+
+def test_record_agent_run_tracks_status_and_step_ttft() -> None:
+    collector = MetricsCollector()
+    collector.record_agent_run(
+        AgentRunMetric(
+            "r1",
+            "completed",
+            2.0,
+            "m",
+            2,
+            step_ttft_sec={"a": 0.1, "b": 0.3},
+            first_token_sec=0.2,
+        )
+    )
+    collector.record_agent_run(AgentRunMetric("r2", "failed", 1.0, "m", 1))
+    collector.record_agent_run(AgentRunMetric("r3", "completed", 3.0, "m", 1, first_token_sec=3.0))
+
+    output = collector.prometheus()
+    assert 'lmx_agent_runs_total{status="completed"} 2' in output
+    assert 'lmx_agent_runs_total{status="failed"} 1' in output
+    assert "lmx_agent_step_ttft_seconds_avg 0.200000" in output
+    agents = collector.summary()["agents"]
+    assert agents["streamed_steps"] == 2
+    assert agents["step_ttft_avg_sec"] == 0.2
+    # Run start -> first token is exported as a histogram and as percentiles.
+    assert 'lmx_agent_run_first_token_seconds_bucket{le="0.25"} 1' in output
+    assert 'lmx_agent_run_first_token_seconds_bucket{le="5.0"} 2' in output
+    assert "lmx_agent_run_first_token_seconds_count 2" in output
+    assert agents["streamed_runs"] == 2
+    assert agents["first_token_p50_sec"] == 0.2
+    assert agents["first_token_p95_sec"] == 3.0
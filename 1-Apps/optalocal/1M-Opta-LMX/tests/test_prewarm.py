@@ -0,0 +1,193 @@
+"""Tests for page-cache shard prewarming."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from opta_lmx.manager import prewarm as prewarm_mod
+from opta_lmx.manager.prewarm import (
+    ModelPrewarmer,
+    resolve_method,
+    warm_files,
+    weight_files,
+)
+
+_SHARD_BYTES = 256 * 1024
+
+
+def _make_snapshot(root: Path, shards: int = 3, *, index: bool = True) -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    weight_map: dict[str, str] = {}
+    for i in range(shards):
+        name = f"model-{i + 1:05d}-of-{shards:05d}.safetensors"
+        (root / name).write_bytes(os.urandom(_SHARD_BYTES))
+        weight_map[f"layers.{i}.a"] = name
+        weight_map[f"layers.{i}.b"] = name
+    if index:
+        (root / "model.safetensors.index.json").write_text(json.dumps({"weight_map": weight_map}))
+    (root / "config.json").write_text("{}")
+    return root
+
+
+def _prewarmer(snapshot: Path, **kwargs: object) -> ModelPrewarmer:
+    return ModelPrewarmer(resolve_fn=lambda _m: snapshot, chunk_bytes=64 * 1024, **kwargs)  # type: ignore[arg-type]
+
+
+class TestWeightFiles:
+    def test_index_order_deduplicated(self, tmp_path: Path) -> None:
+        snap = _make_snapshot(tmp_path / "m", shards=3)
+        files = weight_files(snap)
+        assert [f.name for f in files] == [
+            "model-00001-of-00003.safetensors",
+            "model-00002-of-00003.safetensors",
+            "model-00003-of-00003.safetensors",
+        ]
+
+    def test_glob_fallback_without_index(self, tmp_path: Path) -> None:
+        snap = _make_snapshot(tmp_path / "m", shards=2, index=False)
+        assert len(weight_files(snap)) == 2
+
+    def test_missing_shards_skipped(self, tmp_path: Path) -> None:
+        snap = _make_snapshot(tmp_path / "m", shards=2)
+        (snap / "model-00002-of-00002.safetensors").unlink()
+        assert [f.name for f in weight_files(snap)] == ["model-00001-of-00002.safetensors"]
+
+
+class TestWarmFiles:
+    @pytest.mark.parametrize("method", ["read", "auto", "madvise"])
+    def test_warms_every_byte(self, tmp_path: Path, method: str) -> None:
+        files = weight_files(_make_snapshot(tmp_path / "m", shards=4))
+        warmed, errors = warm_files(files, method=method, workers=4, chunk_bytes=32 * 1024)
+        assert errors == 0
+        assert warmed == 4 * _SHARD_BYTES
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="posix_fadvise is Linux-only")
+    def test_fadvise_issues_willneed(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        files = weight_files(_make_snapshot(tmp_path / "m", shards=2))
+        calls: list[int] = []
+        real = os.posix_fadvise
+
+        def _spy(fd: int, offset: int, length: int, advice: int) -> None:
+            calls.append(advice)
+            real(fd, offset, length, advice)
+
+        monkeypatch.setattr(prewarm_mod.os, "posix_fadvise", _spy)
+        assert resolve_method("auto") == "fadvise"
+        warmed, errors = warm_files(files, method="fadvise")
+        assert (warmed, errors) == (2 * _SHARD_BYTES, 0)
+        assert calls == [os.POSIX_FADV_WILLNEED] * 2
+
+    def test_auto_prefers_madvise_without_fadvise(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delattr(prewarm_mod.os, "posix_fadvise", raising=False)
+        expected = "madvise" if hasattr(prewarm_mod.mmap, "MADV_WILLNEED") else "read"
+        assert resolve_method("auto") == expected
+        monkeypatch.delattr(prewarm_mod.mmap, "MADV_WILLNEED", raising=False)
+        assert resolve_method("auto") == "read"
+
+    def test_cancel_stops_reads(self, tmp_path: Path) -> None:
+        files = weight_files(_make_snapshot(tmp_path / "m", shards=2))
+        cancel = threading.Event()
+        cancel.set()
+        warmed, errors = warm_files(files, method="read", cancel=cancel)
+        assert (warmed, errors) == (0, 0)
+
+
+class TestModelPrewarmer:
+    async def test_prewarm_reports_bytes_and_time(self, tmp_path: Path) -> None:
+        snap = _make_snapshot(tmp_path / "m", shards=3)
+        prewarmer = _prewarmer(snap, method="read")
+        result = await prewarmer.prewarm("org/model")
+        assert result is not None
+        assert result.files == 3
+        assert result.bytes_total == result.bytes_warmed == 3 * _SHARD_BYTES
+        assert result.complete
+        stats = prewarmer.stats()
+        assert stats["prewarms_total"] == 1
+        assert stats["bytes_warmed_total"] == 3 * _SHARD_BYTES
+
+    async def test_madvise_bytes_reported_as_hints(self, tmp_path: Path) -> None:
+        if not hasattr(prewarm_mod.mmap, "MADV_WILLNEED"):
+            pytest.skip("madvise(MADV_WILLNEED) unavailable")
+        prewarmer = _prewarmer(_make_snapshot(tmp_path / "m", shards=2), method="madvise")
+        result = await prewarmer.prewarm("org/model")
+        assert result is not None
+        assert result.hinted
+        assert result.as_dict()["bytes_hinted"] == 2 * _SHARD_BYTES
+        assert "bytes_warmed" not in result.as_dict()
+        stats = prewarmer.stats()
+        assert (stats["bytes_hinted_total"], stats["bytes_warmed_total"]) == (2 * _SHARD_BYTES, 0)
+
+    async def test_unknown_model_is_noop(self) -> None:
+        prewarmer = ModelPrewarmer(resolve_fn=lambda _m: None)
+        assert await prewarmer.prewarm("missing/model") is None
+        assert prewarmer.stats()["prewarms_total"] == 0
+
+    async def test_disabled_does_not_warm(self, tmp_path: Path) -> None:
+        prewarmer = _prewarmer(_make_snapshot(tmp_path / "m"), enabled=False)
+        assert prewarmer.begin("org/model") is None
+
+    async def test_concurrent_begin_joins_in_flight(self, tmp_path: Path) -> None:
+        prewarmer = _prewarmer(_make_snapshot(tmp_path / "m"), method="read")
+        first = prewarmer.begin("org/model")
+        second = prewarmer.begin("org/model")
+        assert first is second
+        assert first is not None
+        await first.result()
+        assert prewarmer.stats()["prewarms_total"] == 1
+
+    async def test_warm_predicted_skips_loaded_and_recent(self, tmp_path: Path) -> None:
+        snap = _make_snapshot(tmp_path / "m")
+        prewarmer = _prewarmer(snap, method="read")
+        results = await prewarmer.warm_predicted(
+            ["loaded/model", "next/model"],
+            is_loaded_fn=lambda m: m == "loaded/model",
+            rewarm_after_sec=60.0,
+        )
+        assert [r.model_id for r in results] == ["next/model"]
+        assert results[0].trigger == "predicted"
+        assert prewarmer.warmed_ahead("next/model")
+        again = await prewarmer.warm_predicted(
+            ["next/model"], is_loaded_fn=lambda _m: False, rewarm_after_sec=60.0
+        )
+        assert again == []
+
+    async def test_warm_predicted_stops_under_memory_pressure(self, tmp_path: Path) -> None:
+        prewarmer = _prewarmer(_make_snapshot(tmp_path / "m"), method="read")
+        results = await prewarmer.warm_predicted(
+            ["a/model"], is_loaded_fn=lambda _m: False, memory_ok_fn=lambda: False
+        )
+        assert results == []
+
+    async def test_background_predictive_loop(self, tmp_path: Path) -> None:
+        prewarmer = _prewarmer(_make_snapshot(tmp_path / "m"), method="read")
+        prewarmer.start_background_predictive(
+            candidates_fn=lambda n: ["next/model"][:n],
+            is_loaded_fn=lambda _m: False,
+            interval_sec=0.01,
+        )
+        for _ in range(200):
+            if prewarmer.last_result("next/model") is not None:
+                break
+            await asyncio.sleep(0.01)
+        await prewarmer.stop_background_predictive()
+        assert prewarmer.warmed_ahead("next/model")
+
+    def test_load_time_reduction(self) -> None:
+        prewarmer = ModelPrewarmer()
+        assert prewarmer.load_time_reduction_pct() is None
+        prewarmer.record_load("a", 10.0, mode="cold")
+        prewarmer.record_load("b", 4.0, mode="concurrent")
+        prewarmer.record_load("c", 2.0, mode="ahead")
+        assert prewarmer.load_time_reduction_pct() == 70.0
+        stats = prewarmer.stats()
+        assert stats["loads_cold_total"] == 1
+        assert stats["load_ahead_avg_sec"] == 2.0
+        with pytest.raises(ValueError):
+            prewarmer.record_load("d", 1.0, mode="lukewarm")
@@ -0,0 +1,145 @@
+"""Tests for multi-collection context assembly (fan-out, MMR, packing)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from opta_lmx.inference import context as context_mod
+from opta_lmx.inference.context import token_counter
+from opta_lmx.rag.assembly import (
+    CONTEXT_SEPARATOR,
+    ContextCandidate,
+    fan_out_search,
+    pack_context,
+    select_diverse,
+)
+from opta_lmx.rag.store import Document, SearchResult, VectorStore
+
+
+def _candidate(
+    text: str, embedding: list[float], score: float, collection: str = "docs"
+) -> ContextCandidate:
+    document = Document(
+        id=text[:8],
+        collection=collection,
+        text=text,
+        embedding=np.array(embedding, dtype=np.float32),
+    )
+    return ContextCandidate(
+        collection=collection, result=SearchResult(document=document, score=score)
+    )
+
+
+class TestFanOutSearch:
+    async def test_merges_collections_by_score_and_bounds_the_pool(self) -> None:
+        store = VectorStore()
+        store.add("a", ["a-close", "a-far"], [[1.0, 0.0], [0.6, 0.8]])
+        store.add("b", ["b-mid", "b-other"], [[0.9, 0.436], [0.0, 1.0]])
+
+        merged = await fan_out_search(
+            store, ["a", "b", "a"], [1.0, 0.0], top_k=5, min_score=0.1, limit=3
+        )
+
+        assert [c.result.document.text for c in merged] == ["a-close", "b-mid", "a-far"]
+        assert [c.collection for c in merged] == ["a", "b", "a"]
+        scores = [c.result.score for c in merged]
+        assert scores == sorted(scores, reverse=True)
+
+    async def test_missing_collection_contributes_nothing(self) -> None:
+        store = VectorStore()
+        store.add("a", ["only"], [[1.0, 0.0]])
+        merged = await fan_out_search(
+            store, ["a", "missing"], [1.0, 0.0], top_k=3, min_score=0.0, limit=10
+        )
+        assert [c.result.document.text for c in merged] == ["only"]
+
+
+class TestSelectDiverse:
+    def test_drops_near_duplicate_embeddings(self) -> None:
+        candidates = [
+            _candidate("first chunk", [1.0, 0.0, 0.0], 0.9),
+            _candidate("same chunk, reworded", [0.99, 0.01, 0.0], 0.89),
+            _candidate("different topic", [0.0, 1.0, 0.0], 0.5),
+        ]
+        selected, suppressed = select_diverse(candidates, k=3, diversity=0.7, dedup_threshold=0.95)
+        assert [c.result.document.text for c in selected] == ["first chunk", "different topic"]
+        assert suppressed == 1
+
+    def test_drops_chunks_contained_in_a_selected_chunk(self) -> None:
+        candidates = [
+            _candidate("alpha beta gamma delta", [1.0, 0.0], 0.9),
+            _candidate("beta gamma", [0.0, 1.0], 0.8),
+        ]
+        selected, suppressed = select_diverse(candidates, k=2, diversity=0.7, dedup_threshold=0.99)
+        assert len(selected) == 1
+        assert suppressed == 1
+
+    def test_mmr_prefers_novel_chunk_over_similar_one(self) -> None:
+        candidates = [
+            _candidate("top", [1.0, 0.0], 0.9),
+            _candidate("similar", [0.9, 0.436], 0.85),
+            _candidate("novel", [0.0, 1.0], 0.8),
+        ]
+        selected, _ = select_diverse(candidates, k=2, diversity=0.5, dedup_threshold=0.99)
+        assert [c.result.document.text for c in selected] == ["top", "novel"]
+
+        relevance_only, _ = select_diverse(candidates, k=2, diversity=1.0, dedup_threshold=0.99)
+        assert [c.result.document.text for c in relevance_only] == ["top", "similar"]
+
+    def test_mixed_embedding_dimensions_are_not_compared(self) -> None:
+        candidates = [
+            _candidate("wide", [1.0, 0.0, 0.0], 0.9),
+            _candidate("narrow", [1.0, 0.0], 0.8),
+        ]
+        selected, suppressed = select_diverse(candidates, k=2, diversity=0.7, dedup_threshold=0.5)
+        assert len(selected) == 2
+        assert suppressed == 0
+
+
+class TestPackContext:
+    def test_skips_entries_that_overflow_and_keeps_filling(self) -> None:
+        candidates = [
+            _candidate("short one", [1.0, 0.0], 0.9),
+            _candidate(" ".join(["word"] * 40), [0.0, 1.0], 0.8),
+            _candidate("short two", [0.7, 0.7], 0.7),
+        ]
+
+        def _count(texts: list[str]) -> list[int]:
+            return [len(t.split()) for t in texts]
+
+        packed = pack_context(candidates, max_tokens=20, count_tokens=_count)
+
+        assert [s["id"] for s in packed.sources] == ["short on", "short tw"]
+        assert packed.context.count(CONTEXT_SEPARATOR) == 1
+        assert "[Source: docs | relevance: 0.90]" in packed.context
+        entries = packed.context.split(CONTEXT_SEPARATOR)
+        assert packed.tokens == sum(_count(entries)) + _count([CONTEXT_SEPARATOR])[0]
+        assert packed.tokens <= 20
+
+    def test_empty(self) -> None:
+        packed = pack_context([], max_tokens=100, count_tokens=lambda t: [1] * len(t))
+        assert packed.context == ""
+        assert packed.sources == []
+
+
+class TestTokenCounter:
+    def test_falls_back_to_estimate(self, tmp_path: Path) -> None:
+        count, method = token_counter(str(tmp_path))
+        assert method == "estimate"
+        assert count(["abcdefgh", "a"]) == [2, 1]
+        assert token_counter(None)[1] == "estimate"
+
+    def test_uses_loaded_tokenizer(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        class _Tokenizer:
+            def encode_batch(self, texts: list[str], add_special_tokens: bool) -> list[object]:
+                assert add_special_tokens is False
+                return [SimpleNamespace(ids=list(t)) for t in texts]
+
+        monkeypatch.setattr(context_mod, "_load_tokenizer", lambda _model_id: _Tokenizer())
+        count, method = token_counter("org/model")
+        assert method == "tokenizer"
+        assert count(["abc", "hello"]) == [3, 5]
@@ -2,9 +2,24 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
-from opta_lmx.api.rate_limit import _chat_completions_limit, _embeddings_limit, request_ctx
+import pytest
+from fastapi import FastAPI
+from starlette.requests import Request
+
+from opta_lmx.api.deps import verify_inference_key
+from opta_lmx.api.rate_limit import (
+    TokenBudgetExceededError,
+    _chat_completions_limit,
+    _embeddings_limit,
+    configure_token_budget,
+    request_ctx,
+    reserve_tokens,
+)
+from opta_lmx.config import LMXConfig
 
 
 def _make_request(config: object | None = None) -> MagicMock:
@@ -80,3 +95,94 @@ class TestEmbeddingsLimit:
             assert _embeddings_limit("127.0.0.1") == "60/minute"
         finally:
             request_ctx.reset(token)
+
+
+def _budget_app(tmp_path: Path, *, tokens_per_minute: int = 6000) -> FastAPI:
+    config = LMXConfig()
+    config.security.rate_limit.token_budget_enabled = True
+    config.security.rate_limit.tokens_per_minute = tokens_per_minute
+    config.server.ipc_dir = tmp_path
+    app = FastAPI()
+    app.state.config = config
+    configure_token_budget(app, config)
+    return app
+
+
+def _budget_request(app: FastAPI, headers: dict[str, str] | None = None) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "app": app,
+            "client": ("10.0.0.7", 5000),
+            "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        }
+    )
+
+
+class TestTokenBudget:
+    def test_disabled_by_default(self) -> None:
+        app = FastAPI()
+        app.state.config = LMXConfig()
+        configure_token_budget(app, app.state.config)
+        assert reserve_tokens(_budget_request(app), prompt_tokens=10, max_tokens=10) is None
+
+    def test_charges_prompt_plus_max_tokens_and_refunds_unused(self, tmp_path: Path) -> None:
+        app = _budget_app(tmp_path)
+        buckets = app.state.token_buckets
+        assert buckets.shared is True
+        assert (tmp_path / "token-buckets.bin").exists()
+        headers = {"Authorization": "Bearer sk-alice"}
+
+        reservation = reserve_tokens(
+            _budget_request(app, headers), prompt_tokens=1000, max_tokens=4000
+        )
+        assert reservation is not None
+        assert reservation.charged == 5000
+        with pytest.raises(TokenBudgetExceededError) as exc:
+            reserve_tokens(_budget_request(app, headers), prompt_tokens=1000, max_tokens=1000)
+        # 1000 left, 2000 needed at 100 tokens/sec.
+        assert exc.value.retry_after_sec == 10
+
+        reservation.settle(1200)
+        reservation.settle(0)  # Settling twice refunds once.
+        assert buckets.available(
+            reservation.key, capacity=6000.0, refill_per_sec=100.0
+        ) == pytest.approx(4800.0, abs=5.0)
+        assert reserve_tokens(_budget_request(app, headers), prompt_tokens=1000, max_tokens=1000)
+
+    def test_keys_on_verified_principal_else_address(self, tmp_path: Path) -> None:
+        app = _budget_app(tmp_path)
+        app.state.inference_api_key = "sk-secret"
+
+        request = _budget_request(app, {"X-Api-Key": "sk-secret"})
+        verify_inference_key(request, authorization=None, x_api_key="sk-secret")
+        by_key = reserve_tokens(request, prompt_tokens=1, max_tokens=1)
+        assert by_key is not None
+        assert by_key.key.startswith("key:")
+        assert "sk-secret" not in by_key.key
+
+        # In LAN mode any bearer token is accepted, so it must not pick the bucket.
+        del app.state.inference_api_key
+        for token in ("made-up-1", "made-up-2"):
+            request = _budget_request(app, {"Authorization": f"Bearer {token}"})
+            verify_inference_key(request, authorization=f"Bearer {token}", x_api_key=None)
+            unverified = reserve_tokens(request, prompt_tokens=1, max_tokens=1)
+            assert unverified is not None
+            assert unverified.key == "ip:10.0.0.7"
+
+        request = _budget_request(app, {"Authorization": "Bearer jwt"})
+        request.state.inference_principal = "sub:user-42"
+        by_subject = reserve_tokens(request, prompt_tokens=1, max_tokens=None, n=2)
+        assert by_subject is not None
+        assert by_subject.key == "sub:user-42"
+        # No max_tokens: charged the default output budget for each choice.
+        assert by_subject.charged == 2 * (1 + 1024)
+
+    def test_config_state_path_override(self, tmp_path: Path) -> None:
+        config = LMXConfig()
+        config.security.rate_limit.token_budget_enabled = True
+        config.security.rate_limit.token_state_path = tmp_path / "custom" / "buckets.bin"
+        app = SimpleNamespace(state=SimpleNamespace())
+        configure_token_budget(app, config)  # type: ignore[arg-type]
+        assert app.state.token_buckets.shared is True
+        assert (tmp_path / "custom" / "buckets.bin").exists()
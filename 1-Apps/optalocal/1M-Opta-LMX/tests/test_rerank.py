@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
 from types import SimpleNamespace
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -141,6 +144,129 @@ class TestRerankerEngine:
         assert result[0]["score"] == 0.3  # injected fn result, not sorted by engine
 
 
+# ─── Batched async reranking ─────────────────────────────────────────────────
+
+
+def _length_scorer(calls: list[tuple[str, list[str], str]]) -> Any:
+    """Injected rerank fn scoring each document by its length, recording calls."""
+
+    def _fn(query: str, docs: list[str], top_n: int | None) -> list[dict[str, Any]]:
+        calls.append((query, list(docs), threading.current_thread().name))
+        return [{"index": i, "score": float(len(doc))} for i, doc in enumerate(docs)]
+
+    return _fn
+
+
+class TestRerankerBatching:
+    async def test_rerank_async_runs_off_event_loop(self) -> None:
+        calls: list[tuple[str, list[str], str]] = []
+        engine = RerankerEngine(batch_window_ms=0)
+        engine._rerank_fn = _length_scorer(calls)
+        try:
+            result = await engine.rerank_async("q", ["a", "ccc", "bb"], top_n=2)
+        finally:
+            engine.shutdown()
+
+        assert result == [{"index": 1, "score": 3.0}, {"index": 2, "score": 2.0}]
+        assert calls[0][2].startswith("lmx-rerank")
+
+    async def test_concurrent_calls_are_coalesced(self) -> None:
+        calls: list[tuple[str, list[str], str]] = []
+        engine = RerankerEngine(batch_window_ms=20)
+        engine._rerank_fn = _length_scorer(calls)
+        try:
+            results = await asyncio.gather(
+                engine.rerank_async("q", ["a", "bb"]),
+                engine.rerank_async("q", ["bb", "cccc"]),
+                engine.rerank_async("other", ["ddd"]),
+            )
+        finally:
+            engine.shutdown()
+
+        # Same query scored once over the union of documents; one batch overall.
+        assert sorted((query, docs) for query, docs, _ in calls) == [
+            ("other", ["ddd"]),
+            ("q", ["a", "bb", "cccc"]),
+        ]
+        assert results[1] == [{"index": 1, "score": 4.0}, {"index": 0, "score": 2.0}]
+        stats = engine.stats()
+        assert stats["batches_total"] == 1
+        assert stats["batched_requests_total"] == 3
+
+    async def test_max_batch_docs_splits_batches(self) -> None:
+        calls: list[tuple[str, list[str], str]] = []
+        engine = RerankerEngine(batch_window_ms=20, max_batch_docs=2)
+        engine._rerank_fn = _length_scorer(calls)
+        try:
+            await asyncio.gather(
+                engine.rerank_async("q1", ["a", "b"]),
+                engine.rerank_async("q2", ["c", "d"]),
+            )
+        finally:
+            engine.shutdown()
+        assert engine.stats()["batches_total"] == 2
+
+    async def test_score_cache_skips_repeat_documents(self) -> None:
+        calls: list[tuple[str, list[str], str]] = []
+        engine = RerankerEngine(batch_window_ms=0)
+        engine._rerank_fn = _length_scorer(calls)
+        try:
+            await engine.rerank_async("q", ["a", "bb"])
+            result = await engine.rerank_async("q", ["bb", "ccc", "a"])
+        finally:
+            engine.shutdown()
+
+        assert [docs for _, docs, _ in calls] == [["a", "bb"], ["ccc"]]
+        assert [entry["index"] for entry in result] == [1, 0, 2]
+        stats = engine.stats()
+        assert stats["cache_hits_total"] == 2
+        assert stats["cache_misses_total"] == 3
+
+    async def test_cache_disabled_rescores(self) -> None:
+        calls: list[tuple[str, list[str], str]] = []
+        engine = RerankerEngine(batch_window_ms=0, cache_size=0)
+        engine._rerank_fn = _length_scorer(calls)
+        try:
+            await engine.rerank_async("q", ["a"])
+            await engine.rerank_async("q", ["a"])
+        finally:
+            engine.shutdown()
+        assert len(calls) == 2
+
+    async def test_prefilter_prunes_by_term_overlap(self) -> None:
+        calls: list[tuple[str, list[str], str]] = []
+        engine = RerankerEngine(batch_window_ms=0, prefilter_k=2)
+        engine._rerank_fn = _length_scorer(calls)
+        docs = [
+            "unrelated text about cooking",
+            "memory bandwidth on apple silicon",
+            "gardening tips",
+            "apple silicon unified memory",
+        ]
+        try:
+            result = await engine.rerank_async("apple silicon memory", docs)
+        finally:
+            engine.shutdown()
+
+        assert calls[0][1] == [docs[1], docs[3]]
+        assert {entry["index"] for entry in result} == {1, 3}
+        assert engine.stats()["prefiltered_docs_total"] == 2
+
+    async def test_batch_failure_propagates_to_callers(self) -> None:
+        engine = RerankerEngine(batch_window_ms=0)
+
+        def _boom(query: str, docs: list[str], top_n: int | None) -> list[dict[str, Any]]:
+            raise RuntimeError("model crashed")
+
+        engine._rerank_fn = _boom
+        try:
+            with pytest.raises(RuntimeError, match="model crashed"):
+                await engine.rerank_async("q", ["a"])
+        finally:
+            engine.shutdown()
+        assert engine.stats()["queue_depth"] == 0
+
+
 async def test_rerank_no_backend(client: AsyncClient) -> None:
     """Returns 503 when no reranking backend is configured."""
     app = client._transport.app  # type: ignore[union-attr]
@@ -2,7 +2,14 @@
 
 from __future__ import annotations
 
+import random
+
+import pytest
+from pydantic import ValidationError
+
 from opta_lmx.config import RoutingConfig
+from opta_lmx.inference.engine_concurrency import ConcurrencyController
+from opta_lmx.inference.types import ModelRoutingStats
 from opta_lmx.router.strategy import TaskRouter
 
 
@@ -103,3 +110,215 @@ def test_update_config_changes_routing() -> None:
 
     result = router.resolve("code", ["old-model", "new-model"])
     assert result == "new-model"
+
+
+# ── Load-aware policies ──────────────────────────────────────────────────────
+
+
+class _FakeStats:
+    """Mutable stats provider standing in for InferenceEngine.get_model_routing_stats."""
+
+    def __init__(self) -> None:
+        self.stats: dict[str, ModelRoutingStats] = {}
+
+    def __call__(self, model_ids: list[str]) -> dict[str, ModelRoutingStats]:
+        return {m: self.stats.get(m, ModelRoutingStats()) for m in model_ids}
+
+
+def _make_load_aware_router(
+    policy: str,
+    *,
+    aliases: dict[str, list[str]] | None = None,
+    **config_overrides: object,
+) -> tuple[TaskRouter, _FakeStats]:
+    provider = _FakeStats()
+    config = RoutingConfig(
+        aliases=aliases or {"code": ["model-a", "model-b", "model-c"]},
+        default_policy=policy,
+        **config_overrides,
+    )
+    return TaskRouter(config, stats_provider=provider, rng=random.Random(7)), provider
+
+
+def test_first_loaded_policy_ignores_load() -> None:
+    """Default policy keeps the original first-preference behaviour."""
+    router, provider = _make_load_aware_router("first_loaded")
+    provider.stats["model-a"] = ModelRoutingStats(active=10, waiting=5)
+    assert router.resolve("code", ["model-a", "model-b"]) == "model-a"
+
+
+def test_least_outstanding_picks_idle_model() -> None:
+    """least_outstanding routes away from the busiest candidate."""
+    router, provider = _make_load_aware_router("least_outstanding")
+    provider.stats["model-a"] = ModelRoutingStats(active=3, waiting=2)
+    provider.stats["model-b"] = ModelRoutingStats(active=1)
+    provider.stats["model-c"] = ModelRoutingStats(active=2)
+    assert router.resolve("code", ["model-a", "model-b", "model-c"]) == "model-b"
+
+
+def test_least_outstanding_ties_follow_preference_order() -> None:
+    """Equal load falls back to alias preference order."""
+    router, _ = _make_load_aware_router("least_outstanding")
+    assert router.resolve("code", ["model-c", "model-b"]) == "model-b"
+
+
+def test_least_outstanding_respects_model_weights() -> None:
+    """A heavier-weighted model absorbs proportionally more outstanding requests."""
+    router, provider = _make_load_aware_router(
+        "least_outstanding",
+        model_weights={"model-b": 3.0},
+    )
+    provider.stats["model-a"] = ModelRoutingStats(active=1)
+    provider.stats["model-b"] = ModelRoutingStats(active=3)
+    # a: (1+1)/1 = 2.0, b: (3+1)/3 = 1.33
+    assert router.resolve("code", ["model-a", "model-b"]) == "model-b"
+
+
+def test_least_outstanding_uses_snapshot_without_provider() -> None:
+    """Without live stats the caller's model_load_snapshot drives the choice."""
+    config = RoutingConfig(
+        aliases={"code": ["model-a", "model-b"]},
+        default_policy="least_outstanding",
+    )
+    router = TaskRouter(config)
+    result = router.resolve(
+        "code",
+        ["model-a", "model-b"],
+        model_load_snapshot={"model-a": 4.0, "model-b": 0.5},
+    )
+    assert result == "model-b"
+
+
+def test_power_of_two_never_picks_busier_of_pair() -> None:
+    """With two candidates, power-of-two degenerates to least loaded."""
+    router, provider = _make_load_aware_router(
+        "power_of_two",
+        aliases={"code": ["model-a", "model-b"]},
+    )
+    provider.stats["model-a"] = ModelRoutingStats(active=4)
+    for _ in range(20):
+        assert router.resolve("code", ["model-a", "model-b"]) == "model-b"
+
+
+def test_power_of_two_spreads_equal_load() -> None:
+    """Equal load over three candidates reaches more than one model."""
+    router, _ = _make_load_aware_router("power_of_two")
+    chosen = {router.resolve("code", ["model-a", "model-b", "model-c"]) for _ in range(50)}
+    assert len(chosen) >= 2
+
+
+def test_latency_ewma_prefers_faster_model() -> None:
+    """latency_ewma routes to the lower latency * outstanding score."""
+    router, provider = _make_load_aware_router("latency_ewma")
+    provider.stats["model-a"] = ModelRoutingStats(active=1, latency_ewma_sec=2.0)
+    provider.stats["model-b"] = ModelRoutingStats(active=1, latency_ewma_sec=0.5)
+    assert router.resolve("code", ["model-a", "model-b"]) == "model-b"
+
+
+def test_latency_ewma_explores_unmeasured_model() -> None:
+    """A model with no latency signal yet is tried before measured ones."""
+    router, provider = _make_load_aware_router("latency_ewma")
+    provider.stats["model-a"] = ModelRoutingStats(latency_ewma_sec=0.1)
+    assert router.resolve("code", ["model-a", "model-b"]) == "model-b"
+
+
+def test_latency_ewma_falls_back_to_p95() -> None:
+    """p95 is used when no EWMA has been recorded."""
+    router, provider = _make_load_aware_router("latency_ewma")
+    provider.stats["model-a"] = ModelRoutingStats(latency_p95_sec=3.0)
+    provider.stats["model-b"] = ModelRoutingStats(latency_p95_sec=1.0)
+    assert router.resolve("code", ["model-a", "model-b"]) == "model-b"
+
+
+def test_per_alias_policy_override() -> None:
+    """policies[alias] overrides default_policy for that alias only."""
+    router, provider = _make_load_aware_router(
+        "first_loaded",
+        aliases={"code": ["model-a", "model-b"], "chat": ["model-a", "model-b"]},
+        policies={"code": "least_outstanding"},
+    )
+    provider.stats["model-a"] = ModelRoutingStats(active=5)
+    assert router.resolve("code", ["model-a", "model-b"]) == "model-b"
+    assert router.resolve("chat", ["model-a", "model-b"]) == "model-a"
+
+
+def test_auto_uses_policy_over_loaded_models() -> None:
+    """'auto' without default_model balances across every loaded model."""
+    router, provider = _make_load_aware_router(
+        "first_loaded",
+        policies={"auto": "least_outstanding"},
+    )
+    provider.stats["a-model"] = ModelRoutingStats(active=2)
+    assert router.resolve("auto", ["a-model", "z-model"]) == "z-model"
+
+
+def test_sticky_sessions_pin_client_to_model() -> None:
+    """A client keeps its model even after load shifts, preserving prefix cache."""
+    router, provider = _make_load_aware_router("least_outstanding", sticky_sessions=True)
+    provider.stats["model-a"] = ModelRoutingStats(active=3)
+    loaded = ["model-a", "model-b"]
+    assert router.resolve("code", loaded, client_id="client-1") == "model-b"
+
+    provider.stats["model-b"] = ModelRoutingStats(active=10)
+    assert router.resolve("code", loaded, client_id="client-1") == "model-b"
+    assert router.resolve("code", loaded, client_id="client-2") == "model-a"
+
+
+def test_sticky_affinity_dropped_when_model_unloaded() -> None:
+    """Affinity falls back to the policy when the pinned model disappears."""
+    router, provider = _make_load_aware_router("least_outstanding", sticky_sessions=True)
+    provider.stats["model-a"] = ModelRoutingStats(active=3)
+    assert router.resolve("code", ["model-a", "model-b"], client_id="c") == "model-b"
+    assert router.resolve("code", ["model-a", "model-c"], client_id="c") == "model-c"
+
+
+def test_sticky_affinity_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Affinity entries expire after sticky_ttl_sec."""
+    router, provider = _make_load_aware_router(
+        "least_outstanding",
+        sticky_sessions=True,
+        sticky_ttl_sec=10.0,
+    )
+    now = [1000.0]
+    monkeypatch.setattr("opta_lmx.router.strategy.time.monotonic", lambda: now[0])
+    provider.stats["model-a"] = ModelRoutingStats(active=3)
+    assert router.resolve("code", ["model-a", "model-b"], client_id="c") == "model-b"
+
+    provider.stats["model-b"] = ModelRoutingStats(active=10)
+    now[0] += 11.0
+    assert router.resolve("code", ["model-a", "model-b"], client_id="c") == "model-a"
+
+
+def test_sticky_affinity_is_bounded() -> None:
+    """Affinity table evicts least-recently-used clients past sticky_max_entries."""
+    router, _ = _make_load_aware_router(
+        "least_outstanding",
+        sticky_sessions=True,
+        sticky_max_entries=2,
+    )
+    for client in ("c1", "c2", "c3"):
+        router.resolve("code", ["model-a", "model-b"], client_id=client)
+    assert len(router._affinity) == 2
+    assert ("code", "c1") not in router._affinity
+
+
+def test_invalid_policy_rejected() -> None:
+    """Unknown policy names fail config validation."""
+    with pytest.raises(ValidationError):
+        RoutingConfig(policies={"code": "random"})
+    with pytest.raises(ValidationError):
+        RoutingConfig(default_policy="random")
+
+
+def test_concurrency_controller_routing_stats() -> None:
+    """ConcurrencyController exposes per-model counts, p95 and EWMA."""
+    controller = ConcurrencyController(max_concurrent_requests=4)
+    controller.enter_inference("model-a")
+    for latency in (1.0, 1.0, 3.0):
+        controller._record_latency_sample(latency, model_id="model-a")
+
+    stats = controller.get_model_routing_stats(["model-a", "model-b"])
+    assert stats["model-a"].active == 1
+    assert stats["model-a"].latency_p95_sec == 1.0
+    assert stats["model-a"].latency_ewma_sec == pytest.approx(1.6)
+    assert stats["model-b"] == ModelRoutingStats(capacity=4)
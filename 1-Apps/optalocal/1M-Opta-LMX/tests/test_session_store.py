@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import os
+import threading
+import time
 from pathlib import Path
 
 import pytest
@@ -490,3 +494,206 @@ class TestEdgeCases:
         store = SessionStore(tmp_path)
         results = store.search_sessions("keyword", limit=2)
         assert len(results) == 2
+
+
+# ── FTS5 search index ─────────────────────────────────────────────────────────
+
+
+class TestSearchIndex:
+    @pytest.fixture
+    def sessions_dir(self, tmp_path: Path) -> Path:
+        path = tmp_path / "sessions"
+        path.mkdir()
+        return path
+
+    @pytest.fixture
+    def store(self, tmp_path: Path, sessions_dir: Path):
+        store = SessionStore(sessions_dir, search_index_path=tmp_path / "index.sqlite")
+        yield store
+        store.close()
+
+    def test_list_matches_index_free_listing(self, sessions_dir: Path, store) -> None:
+        for i in range(6):
+            _write_session(
+                sessions_dir,
+                f"s{i}",
+                model="claude-opus" if i % 2 else "qwen-coder",
+                tags=["work"] if i < 3 else [],
+                updated=f"2024-01-0{i + 1}T00:00:00Z",
+            )
+        plain = SessionStore(sessions_dir)
+        for kwargs in (
+            {},
+            {"limit": 2, "offset": 1},
+            {"model": "OPUS"},
+            {"tag": "work"},
+            {"since": "2024-01-04"},
+        ):
+            assert store.list_sessions(**kwargs) == plain.list_sessions(**kwargs)
+
+    def test_search_covers_all_message_text_and_ranks_title_first(
+        self, sessions_dir: Path, store
+    ) -> None:
+        _write_session(
+            sessions_dir,
+            "body",
+            title="Unrelated",
+            messages=[
+                {"role": "user", "content": "hello"},
+                {
+                    "role": "assistant",
+                    "content": [{"type": "text", "text": "use a kubernetes job"}],
+                },
+            ],
+        )
+        _write_session(sessions_dir, "title", title="Kubernetes upgrade plan")
+        results = store.search_sessions("kubern")
+        assert [r.id for r in results] == ["title", "body"]
+        assert [r.id for r in store.search_sessions("kubernetes", offset=1)] == ["body"]
+        assert store.search_sessions("kubernetes upgrade")[0].id == "title"
+        assert store.search_sessions('"*') == []
+
+    def test_sync_is_incremental(self, sessions_dir: Path, store) -> None:
+        for i in range(3):
+            _write_session(sessions_dir, f"s{i}", title=f"first {i}")
+        index = store.search_index
+        assert index.sync() == {"added": 3, "updated": 0, "removed": 0}
+        assert index.sync() == {"added": 0, "updated": 0, "removed": 0}
+
+        path = _write_session(sessions_dir, "s1", title="renamed zebra")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        (sessions_dir / "s2.json").unlink()
+        parsed_before = index.stats()["files_parsed_total"]
+        assert index.sync() == {"added": 0, "updated": 1, "removed": 1}
+        assert index.stats()["files_parsed_total"] == parsed_before + 1
+        assert [r.id for r in store.search_sessions("zebra")] == ["s1"]
+        assert store.list_sessions().total == 2
+
+    def test_delete_updates_index_immediately(self, sessions_dir: Path, store) -> None:
+        _write_session(sessions_dir, "s1", title="gone soon")
+        assert len(store.search_sessions("gone")) == 1
+        assert store.delete_session("s1") is True
+        assert store.search_sessions("gone") == []
+        assert store.list_sessions().total == 0
+
+    async def test_background_sync_picks_up_new_sessions(self, sessions_dir: Path, store) -> None:
+        store.start_background_sync(0.02)
+        try:
+            _write_session(sessions_dir, "late", title="arrived later")
+            for _ in range(100):
+                if store.search_index.stats()["sessions_indexed"] == 1:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await store.stop_background_sync()
+        assert [r.id for r in store.search_sessions("arrived")] == ["late"]
+
+    async def test_stop_waits_for_sync_running_in_thread(
+        self, sessions_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        store = SessionStore(sessions_dir, search_index_path=tmp_path / "slow.sqlite")
+        index = store.search_index
+        assert index is not None
+        _write_session(sessions_dir, "s1", title="slow parse")
+        parsing = threading.Event()
+        read_session = index._read_session
+
+        def slow_read(path: Path) -> dict | None:
+            parsing.set()
+            time.sleep(0.2)
+            return read_session(path)
+
+        monkeypatch.setattr(index, "_read_session", slow_read)
+        store.start_background_sync(60.0)
+        assert await asyncio.to_thread(parsing.wait, 5.0)
+        await store.stop_background_sync()
+        # The in-flight sync completed before stop returned, so closing is safe.
+        assert index.stats()["sessions_indexed"] == 1
+        store.close()
+
+
+def _touch_later(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class TestSummaryCache:
+    def test_repeated_listing_does_not_reparse(self, tmp_path: Path) -> None:
+        for i in range(4):
+            _write_session(tmp_path, f"s{i}")
+        store = SessionStore(tmp_path)
+        first = store.list_sessions()
+        stats = store.summary_cache.stats()
+        assert stats["files_parsed_total"] == 4
+        assert store.list_sessions(limit=2, offset=1).sessions == first.sessions[1:3]
+        assert store.summary_cache.stats() == stats
+
+    def test_changed_file_is_reparsed_alone(self, tmp_path: Path) -> None:
+        for i in range(4):
+            _write_session(tmp_path, f"s{i}", title=f"old {i}")
+        store = SessionStore(tmp_path)
+        store.list_sessions()
+
+        _touch_later(_write_session(tmp_path, "s2", title="new 2"))
+        (tmp_path / "s3.json").unlink()
+        _write_session(tmp_path, "s4", title="added")
+        result = store.list_sessions()
+
+        assert store.summary_cache.stats()["files_parsed_total"] == 4 + 2
+        assert {s.id: s.title for s in result.sessions} == {
+            "s0": "old 0",
+            "s1": "old 1",
+            "s2": "new 2",
+            "s4": "added",
+        }
+
+    def test_index_json_change_reloads(self, tmp_path: Path) -> None:
+        index_path = _write_index(tmp_path, {"a": {"title": "A", "created": "2024-01-01"}})
+        store = SessionStore(tmp_path)
+        assert [s.id for s in store.list_sessions().sessions] == ["a"]
+
+        _write_index(
+            tmp_path,
+            {
+                "a": {"title": "A", "created": "2024-01-01"},
+                "b": {"title": "B", "created": "2024-01-02"},
+            },
+        )
+        _touch_later(index_path)
+        assert [s.id for s in store.list_sessions().sessions] == ["b", "a"]
+
+        index_path.unlink()
+        _write_session(tmp_path, "c")
+        assert [s.id for s in store.list_sessions().sessions] == ["c"]
+
+    def test_filters_match_linear_scan(self, tmp_path: Path) -> None:
+        for i in range(12):
+            _write_session(
+                tmp_path,
+                f"s{i:02d}",
+                model=["claude-opus", "Qwen-Coder", "claude-haiku"][i % 3],
+                tags=["work", "work"] if i % 2 else ["home"],
+                updated=f"2024-01-{i % 5 + 1:02d}T00:00:00Z",
+            )
+        store = SessionStore(tmp_path)
+        everything = sorted(
+            store._load_summaries(), key=lambda s: s.updated or s.created, reverse=True
+        )
+        for kwargs in (
+            {"model": "CLAUDE"},
+            {"model": "coder", "tag": "work"},
+            {"tag": "home", "since": "2024-01-03", "limit": 2, "offset": 1},
+            {"model": "missing"},
+        ):
+            expected = [
+                s
+                for s in everything
+                if kwargs.get("model", "").lower() in s.model.lower()
+                and ("tag" not in kwargs or kwargs["tag"] in s.tags)
+                and s.updated >= kwargs.get("since", "")
+            ]
+            offset = kwargs.get("offset", 0)
+            result = store.list_sessions(**kwargs)
+            assert result.total == len(expected)
+            assert result.sessions == expected[offset : offset + kwargs.get("limit", 50)]
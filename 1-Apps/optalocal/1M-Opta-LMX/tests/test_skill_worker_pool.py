@@ -0,0 +1,230 @@
+"""Tests for the process-isolated skill worker pool."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from opta_lmx.skills.executors import SkillExecutor
+from opta_lmx.skills.manifest import SkillManifest
+from opta_lmx.skills.worker_pool import SkillWorkerPool
+
+_SKILLS = """
+import asyncio
+import os
+import time
+
+
+def greet(name: str) -> str:
+    print("noise on stdout")
+    return f"Hi {name}"
+
+
+async def greet_async(name: str) -> dict[str, object]:
+    await asyncio.sleep(0)
+    return {"greeting": f"Hi {name}", "pid": os.getpid()}
+
+
+def pid() -> int:
+    return os.getpid()
+
+
+def spin() -> None:
+    while True:
+        pass
+
+
+def nap(delay: float) -> str:
+    time.sleep(delay)
+    return "rested"
+
+
+def boom() -> None:
+    raise ValueError("skill exploded")
+
+
+def crash() -> None:
+    os._exit(3)
+"""
+
+
+@pytest.fixture
+def skills_dir(tmp_path: Path) -> Path:
+    (tmp_path / "pool_skills.py").write_text(_SKILLS)
+    return tmp_path
+
+
+@pytest.fixture
+def pool(skills_dir: Path) -> Iterator[SkillWorkerPool]:
+    worker_pool = SkillWorkerPool(size=2, module_search_paths=[skills_dir])
+    worker_pool.start()
+    yield worker_pool
+    worker_pool.close()
+
+
+def _manifest(name: str, entrypoint: str, timeout_sec: float = 10.0) -> SkillManifest:
+    return SkillManifest.model_validate(
+        {
+            "schema": "opta.skills.manifest/v1",
+            "name": name,
+            "kind": "entrypoint",
+            "description": name,
+            "entrypoint": entrypoint,
+            "timeout_sec": timeout_sec,
+        }
+    )
+
+
+def _wait_for(predicate: object, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():  # type: ignore[operator]
+            return
+        time.sleep(0.02)
+    raise AssertionError("condition not met in time")
+
+
+def test_executor_runs_sync_and_async_entrypoints_on_warm_workers(
+    pool: SkillWorkerPool,
+) -> None:
+    executor = SkillExecutor(worker_pool=pool)
+
+    first = executor.execute(_manifest("greet", "pool_skills:greet"), arguments={"name": "Ada"})
+    assert first.ok is True
+    assert first.output == "Hi Ada"
+
+    second = executor.execute(
+        _manifest("greet_async", "pool_skills:greet_async"), arguments={"name": "Bo"}
+    )
+    assert second.ok is True
+    assert second.output["greeting"] == "Hi Bo"
+
+    stats = pool.stats()
+    assert stats["workers_spawned_total"] == 2
+    assert stats["worker_reuse_total"] == 2
+    assert stats["cold_imports_total"] == 1
+    assert stats["warm_calls_total"] == 1
+
+
+def test_calls_prefer_worker_with_module_imported(pool: SkillWorkerPool) -> None:
+    pids = {pool.call("pid", "pool_skills:pid", {}, timeout_sec=10.0) for _ in range(5)}
+    assert len(pids) == 1
+    assert pool.stats()["cold_imports_total"] == 1
+
+
+def test_worker_stderr_is_logged(pool: SkillWorkerPool, caplog: pytest.LogCaptureFixture) -> None:
+    caplog.set_level(logging.INFO, logger="opta_lmx.skills.worker_pool")
+    assert pool.call("greet", "pool_skills:greet", {"name": "Ada"}, timeout_sec=10.0) == "Hi Ada"
+    # Skill stdout is redirected to the worker's stderr, which the pool logs.
+    _wait_for(
+        lambda: any(getattr(record, "line", None) == "noise on stdout" for record in caplog.records)
+    )
+    assert {record.msg for record in caplog.records} >= {"skill_worker_stderr"}
+
+
+def test_timeout_kills_worker_and_replaces_it(pool: SkillWorkerPool) -> None:
+    executor = SkillExecutor(worker_pool=pool)
+    spinning_pid = pool.call("pid", "pool_skills:pid", {}, timeout_sec=10.0)
+
+    result = executor.execute(_manifest("spin", "pool_skills:spin", timeout_sec=0.3))
+    assert result.ok is False
+    assert result.timed_out is True
+    assert "timeout" in (result.error or "")
+
+    stats = pool.stats()
+    assert stats["workers_killed_total"] == 1
+    _wait_for(lambda: pool.stats()["workers_idle"] == 2)
+    assert pool.stats()["workers_spawned_total"] == 3
+    with pytest.raises(ProcessLookupError):
+        os.kill(spinning_pid, 0)
+
+    assert pool.call("greet", "pool_skills:greet", {"name": "again"}, timeout_sec=10.0) == (
+        "Hi again"
+    )
+
+
+def test_skill_errors_keep_worker_and_crashes_replace_it(pool: SkillWorkerPool) -> None:
+    with pytest.raises(RuntimeError, match="skill exploded"):
+        pool.call("boom", "pool_skills:boom", {}, timeout_sec=10.0)
+    with pytest.raises(RuntimeError, match="entrypoint function not found"):
+        pool.call("missing", "pool_skills:missing", {}, timeout_sec=10.0)
+    assert pool.stats()["workers_crashed_total"] == 0
+
+    with pytest.raises(RuntimeError, match="exited unexpectedly"):
+        pool.call("crash", "pool_skills:crash", {}, timeout_sec=10.0)
+    assert pool.stats()["workers_crashed_total"] == 1
+    _wait_for(lambda: pool.stats()["workers_idle"] == 2)
+
+
+def test_per_skill_concurrency_cap(skills_dir: Path) -> None:
+    worker_pool = SkillWorkerPool(
+        size=2, module_search_paths=[skills_dir], per_skill_concurrency={"nap": 1}
+    )
+    worker_pool.start()
+    try:
+        outcome: list[object] = []
+        holder = threading.Thread(
+            target=lambda: outcome.append(
+                worker_pool.call("nap", "pool_skills:nap", {"delay": 1.0}, timeout_sec=10.0)
+            )
+        )
+        holder.start()
+        _wait_for(lambda: worker_pool.stats()["workers_busy"] == 1)
+
+        with pytest.raises(TimeoutError, match="concurrency limit"):
+            worker_pool.call("nap", "pool_skills:nap", {"delay": 0.0}, timeout_sec=0.2)
+        # Other skills still get the second worker.
+        assert worker_pool.call("pid", "pool_skills:pid", {}, timeout_sec=10.0) > 0
+
+        holder.join()
+        assert outcome == ["rested"]
+        assert worker_pool.stats()["skill_throttled_total"] == 1
+    finally:
+        worker_pool.close()
+
+
+def test_workers_recycled_after_max_calls(skills_dir: Path) -> None:
+    worker_pool = SkillWorkerPool(size=1, module_search_paths=[skills_dir], max_calls_per_worker=1)
+    worker_pool.start(prewarm=False)
+    try:
+        first = worker_pool.call("pid", "pool_skills:pid", {}, timeout_sec=10.0)
+        _wait_for(lambda: worker_pool.stats()["workers_idle"] == 1)
+        second = worker_pool.call("pid", "pool_skills:pid", {}, timeout_sec=10.0)
+        assert first != second
+        assert worker_pool.stats()["workers_recycled_total"] >= 1
+    finally:
+        worker_pool.close()
+
+
+def _fake_worker(tmp_path: Path, body: str) -> str:
+    script = tmp_path / "fake_worker.sh"
+    script.write_text(f"#!/bin/sh\n{body}\n")
+    script.chmod(0o755)
+    return str(script)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        "sleep 30",  # never signals ready
+        "echo '{\"ready\": true}'; read line; printf '{\"ok\": tr'; sleep 30",  # partial reply
+    ],
+)
+def test_call_deadline_bounds_spawn_and_partial_replies(tmp_path: Path, body: str) -> None:
+    worker_pool = SkillWorkerPool(
+        size=1, python_executable=_fake_worker(tmp_path, body), spawn_timeout_sec=3.0
+    )
+    worker_pool.start(prewarm=False)
+    try:
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            worker_pool.call("pid", "pool_skills:pid", {}, timeout_sec=0.5)
+        assert time.monotonic() - started < 2.0
+    finally:
+        worker_pool.close()
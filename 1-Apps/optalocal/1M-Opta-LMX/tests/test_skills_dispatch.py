@@ -120,3 +120,49 @@ async def test_sqlite_queued_dispatcher_executes_manifest(tmp_path: Path) -> Non
         assert result.output == {"echo": {"topic": "sqlite"}}
     finally:
         await dispatcher.close()
+
+
+async def test_sqlite_queued_dispatcher_wakes_on_enqueue(tmp_path: Path) -> None:
+    _write_module(tmp_path / "wake_skill.py", "def run() -> str:\n    return 'awake'\n")
+    manifest = _entrypoint_manifest("wake_skill", "run")
+
+    dispatcher = QueuedSkillDispatcher(
+        executor=SkillExecutor(module_search_paths=[tmp_path]),
+        worker_count=2,
+        max_queue_size=8,
+        backend="sqlite",
+        persist_path=tmp_path / "skills-queue.db",
+        poll_interval_sec=30.0,
+    )
+    await dispatcher.start()
+    try:
+        await asyncio.sleep(0.05)
+        results = await asyncio.wait_for(
+            asyncio.gather(*(dispatcher.execute(manifest) for _ in range(4))), timeout=5.0
+        )
+        stats = dispatcher.stats()
+    finally:
+        await dispatcher.close()
+
+    assert [r.output for r in results] == ["awake"] * 4
+    assert stats["claimed_total"] == 4
+    assert stats["enqueue_to_start_count"] == 4
+
+
+async def test_sqlite_dispatcher_leaves_live_peer_claims_running(tmp_path: Path) -> None:
+    queue_path = tmp_path / "skills-queue.db"
+    executor = SkillExecutor(module_search_paths=[tmp_path])
+    owner = QueuedSkillDispatcher(executor=executor, backend="sqlite", persist_path=queue_path)
+    await asyncio.to_thread(owner._db_enqueue, "job-1", "{}")
+    assert len(await asyncio.to_thread(owner._db_claim_batch, 1)) == 1
+
+    peer = QueuedSkillDispatcher(executor=executor, backend="sqlite", persist_path=queue_path)
+    assert await asyncio.to_thread(peer._db_count_queued) == 0
+
+    with owner._db_lock:
+        owner._connection().execute("UPDATE skill_queue SET lease_until=0")
+        owner._connection().commit()
+    assert await asyncio.to_thread(peer._recover_running_rows) == 1
+    assert await asyncio.to_thread(peer._db_count_queued) == 1
+    owner._close_db()
+    peer._close_db()
@@ -0,0 +1,76 @@
+"""Tests for the shared SQLite queue wakeup and latency helpers."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from opta_lmx.runtime.sqlite_queue import ClaimLease, LatencyWindow, QueueWakeup, connect_queue_db
+
+
+async def test_wakeup_notify_releases_local_waiter() -> None:
+    wakeup = QueueWakeup("local-test", cross_process=False)
+    wakeup.open()
+    try:
+        seen = wakeup.generation
+        waiter = asyncio.create_task(wakeup.wait(seen, max_wait=5.0))
+        await asyncio.sleep(0)
+        await wakeup.notify()
+        assert await asyncio.wait_for(waiter, timeout=1.0) is True
+        # A stale generation returns immediately; the current one times out.
+        assert await wakeup.wait(seen, max_wait=0.01) is True
+        assert await wakeup.wait(wakeup.generation, max_wait=0.01) is False
+        assert wakeup.stats()["idle_timeouts_total"] == 1
+    finally:
+        wakeup.close()
+
+
+async def test_wakeup_signals_peer_on_same_channel(tmp_path: Path) -> None:
+    channel = str(tmp_path / "queue.db")
+    producer = QueueWakeup(channel)
+    consumer = QueueWakeup(channel)
+    producer.open()
+    consumer.open()
+    try:
+        assert consumer.stats()["cross_process"] == 1
+        seen = consumer.generation
+        await producer.notify()
+        assert await consumer.wait(seen, max_wait=2.0) is True
+        assert producer.stats()["peer_signals_sent_total"] == 1
+        assert consumer.stats()["peer_signals_received_total"] == 1
+    finally:
+        producer.close()
+        consumer.close()
+
+
+def test_latency_window_percentiles() -> None:
+    window = LatencyWindow(size=100)
+    assert window.snapshot("lat") == {"lat_p50_ms": 0.0, "lat_p99_ms": 0.0, "lat_count": 0}
+    for ms in range(1, 101):
+        window.observe(ms / 1000)
+    # Evicts the 1ms sample; negative skew is clamped to 0.
+    window.observe(-1.0)
+
+    snapshot = window.snapshot("lat")
+    assert snapshot["lat_count"] == 101
+    assert snapshot["lat_p50_ms"] == 50.0
+    assert snapshot["lat_p99_ms"] == 99.0
+
+
+def test_claim_lease_adds_columns_to_existing_table(tmp_path: Path) -> None:
+    con = connect_queue_db(tmp_path / "queue.db")
+    con.execute("CREATE TABLE jobs (id INTEGER PRIMARY KEY, status TEXT NOT NULL, claimed_at REAL)")
+    # A row claimed before leases existed has no owner and counts as expired.
+    con.execute("INSERT INTO jobs(status, claimed_at) VALUES ('running', 1.0)")
+    lease = ClaimLease("jobs", lease_sec=30.0)
+    lease.ensure_columns(con)
+    lease.ensure_columns(con)
+    assert lease.reclaim(con, own=False) == 1
+
+    owner, lease_until = lease.claim_values()
+    con.execute("UPDATE jobs SET status='running', owner=?, lease_until=?", (owner, lease_until))
+    assert lease.reclaim(con, own=False) == 0
+    assert lease.renew(con) == 1
+    assert lease.reclaim(con, own=True) == 1
+    assert lease.stats() == {"lease_renewals_total": 1, "lease_reclaimed_total": 2}
+    con.close()
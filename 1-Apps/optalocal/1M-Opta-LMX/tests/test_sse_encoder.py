@@ -0,0 +1,225 @@
+"""Byte-parity tests for the precompiled SSE frame templates.
+
+Each test rebuilds the frames the way the streams serialized them before the
+templates existed (Pydantic chunk -> model_dump -> json.dumps) and compares
+the complete output byte for byte.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+
+from opta_lmx.api.anthropic import _anthropic_sse_stream
+from opta_lmx.api.stream_handlers import _responses_sse_stream
+from opta_lmx.inference.schema import (
+    ChatCompletionChunk,
+    ChunkChoice,
+    DeltaMessage,
+    FunctionCallDelta,
+    ToolCallDelta,
+)
+from opta_lmx.inference.sse_encoder import (
+    DELTA,
+    SSEFrameTemplate,
+    chat_content_template,
+    chat_tool_arguments_template,
+)
+from opta_lmx.inference.streaming import format_sse_stream, format_sse_tool_stream
+from opta_lmx.inference.tool_parser import StreamChunk
+from opta_lmx.inference.tool_parser import ToolCallDelta as ParsedToolCallDelta
+from opta_lmx.monitoring.metrics import MetricsCollector
+
+TRICKY_TOKENS = [
+    "Hello",
+    "",
+    " wörld",
+    "日本語",
+    "😀",
+    '"quoted"',
+    "back\\slash",
+    "\n\t\r\b\f",
+    "\x00\x1f\x7f",
+    "\u2028\u2029",
+    "\ud800",
+    "</script>",
+    DELTA,
+]
+
+
+async def _aiter(items: list[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+def _legacy_chat_frame(
+    request_id: str,
+    model: str,
+    created: int,
+    delta: DeltaMessage,
+    *,
+    choice_index: int = 0,
+    logprobs: bool = False,
+) -> str:
+    payload = ChatCompletionChunk(
+        id=request_id,
+        created=created,
+        model=model,
+        choices=[ChunkChoice(index=choice_index, delta=delta, finish_reason=None)],
+    ).model_dump()
+    if logprobs:
+        for choice in payload["choices"]:
+            choice["logprobs"] = None
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+# ─── Templates ───────────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("logprobs", [False, True])
+@pytest.mark.parametrize("token", TRICKY_TOKENS)
+def test_chat_content_frame_matches_pydantic_path(token: str, logprobs: bool) -> None:
+    frame = chat_content_template(
+        'chatcmpl-ü"1',
+        "org/módel",
+        1700000000,
+        choice_index=2,
+        include_logprobs_placeholder=logprobs,
+    )
+    expected = _legacy_chat_frame(
+        'chatcmpl-ü"1',
+        "org/módel",
+        1700000000,
+        DeltaMessage(content=token),
+        choice_index=2,
+        logprobs=logprobs,
+    )
+    assert frame.encode(token) == expected
+
+
+@pytest.mark.parametrize("token", TRICKY_TOKENS)
+def test_chat_tool_arguments_frame_matches_pydantic_path(token: str) -> None:
+    frame = chat_tool_arguments_template("req", "m", 1, 3)
+    delta = DeltaMessage(
+        tool_calls=[ToolCallDelta(index=3, function=FunctionCallDelta(arguments=token))]
+    )
+    assert frame.encode(token) == _legacy_chat_frame("req", "m", 1, delta)
+
+
+def test_named_event_template() -> None:
+    frame = SSEFrameTemplate.from_payload({"item_id": "c", "delta": DELTA}, event="x.delta")
+    payload = json.dumps({"item_id": "c", "delta": '{"a": 1}'})
+    assert frame.encode('{"a": 1}') == f"event: x.delta\ndata: {payload}\n\n"
+
+
+def test_template_requires_placeholder() -> None:
+    with pytest.raises(ValueError, match="placeholder"):
+        SSEFrameTemplate.from_payload({"delta": "fixed"})
+
+
+# ─── Streams ─────────────────────────────────────────────────────────────────
+
+
+async def test_format_sse_stream_output_is_unchanged() -> None:
+    frames = [
+        f
+        async for f in format_sse_stream(
+            _aiter(TRICKY_TOKENS), "req-9", "m", created=42, include_logprobs_placeholder=True
+        )
+    ]
+    expected_content = [
+        _legacy_chat_frame("req-9", "m", 42, DeltaMessage(content=t), logprobs=True)
+        for t in TRICKY_TOKENS
+    ]
+    assert frames[1:-2] == expected_content
+
+
+async def test_format_sse_tool_stream_output_is_unchanged() -> None:
+    chunks = [
+        StreamChunk(content="Sure"),
+        StreamChunk(tool_call_delta=ParsedToolCallDelta(index=0, id="call_1", name="f")),
+        StreamChunk(tool_call_delta=ParsedToolCallDelta(index=0, arguments_delta='{"q": ')),
+        StreamChunk(tool_call_delta=ParsedToolCallDelta(index=0, arguments_delta='"日"}')),
+    ]
+    frames = [f async for f in format_sse_tool_stream(_aiter(chunks), "r", "m", created=7)]
+    expected = [
+        _legacy_chat_frame("r", "m", 7, DeltaMessage(content="Sure")),
+        _legacy_chat_frame(
+            "r",
+            "m",
+            7,
+            DeltaMessage(
+                tool_calls=[
+                    ToolCallDelta(
+                        index=0,
+                        id="call_1",
+                        type="function",
+                        function=FunctionCallDelta(name="f", arguments=""),
+                    )
+                ]
+            ),
+        ),
+        *(
+            _legacy_chat_frame(
+                "r",
+                "m",
+                7,
+                DeltaMessage(
+                    tool_calls=[ToolCallDelta(index=0, function=FunctionCallDelta(arguments=a))]
+                ),
+            )
+            for a in ('{"q": ', '"日"}')
+        ),
+    ]
+    assert frames[1:5] == expected
+
+
+async def test_anthropic_deltas_are_unchanged() -> None:
+    frames = [
+        f
+        async for f in _anthropic_sse_stream(
+            _aiter(TRICKY_TOKENS), "msg_1", "m", 3, MetricsCollector(), time.monotonic()
+        )
+    ]
+    expected = [
+        "event: content_block_delta\ndata: "
+        + json.dumps(
+            {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": t}}
+        )
+        + "\n\n"
+        for t in TRICKY_TOKENS
+    ]
+    assert frames[2:-3] == expected
+
+
+class _ResponsesEngine:
+    def __init__(self, tokens: list[str]) -> None:
+        self._tokens = tokens
+
+    def stream_generate(self, **_: Any) -> AsyncIterator[str]:
+        return _aiter(self._tokens)
+
+
+async def test_responses_deltas_are_unchanged() -> None:
+    frames = [
+        f
+        async for f in _responses_sse_stream(
+            _ResponsesEngine(TRICKY_TOKENS),  # type: ignore[arg-type]
+            "m",
+            [],
+            "resp_1",
+            0.7,
+            None,
+            1.0,
+            None,
+        )
+    ]
+    expected = [
+        f"event: response.output_text.delta\ndata: {json.dumps({'delta': t})}\n\n"
+        for t in TRICKY_TOKENS
+    ]
+    assert frames[1:-2] == expected
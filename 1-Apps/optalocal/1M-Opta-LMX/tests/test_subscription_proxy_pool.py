@@ -0,0 +1,200 @@
+"""Tests for pooled subscription proxy clients and off-loop token reads."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+
+import pytest
+
+from opta_lmx.proxy import keychain_reader
+from opta_lmx.proxy.subscription_providers import SubscriptionRoute
+from opta_lmx.proxy.subscription_proxy import SubscriptionClientPool, proxy_chat_completion
+
+_SSE_CHUNKS = [b'data: {"n": 1}\n\n', b'data: {"n": 2}\n\n', b"data: [DONE]\n\n"]
+
+
+class _FakeUpstream:
+    """Minimal keep-alive HTTP/1.1 upstream counting TCP connections."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.requests = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def close(self) -> None:
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.decode("latin-1").split("\r\n"):
+                    name, _, value = line.partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value)
+                body = json.loads(await reader.readexactly(length))
+                self.requests += 1
+                if body.get("stream"):
+                    await self._write_stream(writer)
+                else:
+                    payload = json.dumps({"object": "chat.completion", "n": self.requests})
+                    writer.write(
+                        b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                        + f"Content-Length: {len(payload)}\r\n\r\n{payload}".encode()
+                    )
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _write_stream(self, writer: asyncio.StreamWriter) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        for chunk in _SSE_CHUNKS:
+            writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            await writer.drain()
+            await asyncio.sleep(0.05)
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+@pytest.fixture
+async def upstream() -> AsyncIterator[_FakeUpstream]:
+    server = _FakeUpstream()
+    await server.start()
+    yield server
+    await server.close()
+
+
+def _route(base_url: str) -> SubscriptionRoute:
+    return SubscriptionRoute(
+        provider_id="fake-provider",
+        base_url=base_url,
+        auth_scheme="bearer",
+        default_model="fake-model",
+    )
+
+
+async def test_pooled_client_reuses_one_upstream_connection(upstream: _FakeUpstream) -> None:
+    route = _route(upstream.base_url)
+    pool = SubscriptionClientPool(http2=False)
+    try:
+        for _ in range(3):
+            status, resp, stream = await proxy_chat_completion(
+                route, "tok", {"messages": []}, stream=False, clients=pool
+            )
+            assert status == 200
+            assert resp is not None and resp["object"] == "chat.completion"
+            assert stream is None
+    finally:
+        await pool.aclose()
+
+    assert upstream.requests == 3
+    assert upstream.connections == 1
+    assert pool.stats()["clients_created_total"] == 1
+
+
+async def test_without_pool_each_request_opens_a_connection(upstream: _FakeUpstream) -> None:
+    route = _route(upstream.base_url)
+    for _ in range(2):
+        status, _, _ = await proxy_chat_completion(route, "tok", {"messages": []})
+        assert status == 200
+
+    assert upstream.connections == 2
+
+
+async def test_stream_is_passed_through_unmodified(upstream: _FakeUpstream) -> None:
+    route = _route(upstream.base_url)
+    pool = SubscriptionClientPool(http2=False)
+    try:
+        status, _, stream = await proxy_chat_completion(
+            route, "tok", {"messages": [], "stream": True}, stream=True, clients=pool
+        )
+        assert status == 200 and stream is not None
+        chunks = [chunk async for chunk in stream]
+        # The pooled connection survives the stream for the next request.
+        await proxy_chat_completion(route, "tok", {"messages": []}, clients=pool)
+    finally:
+        await pool.aclose()
+
+    assert chunks == _SSE_CHUNKS
+    assert upstream.connections == 1
+
+
+@pytest.fixture
+def token_state() -> Iterator[None]:
+    keychain_reader._cache.clear()
+    yield
+    keychain_reader._cache.clear()
+
+
+async def test_async_token_lookup_reads_off_loop_once(
+    token_state: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    reads: list[str] = []
+
+    def _slow_read(provider_id: str) -> str:
+        reads.append(threading.current_thread().name)
+        time.sleep(0.05)
+        return f"token-{provider_id}"
+
+    monkeypatch.setattr(keychain_reader, "_read_token", _slow_read)
+
+    tokens = await asyncio.gather(*(keychain_reader.aget_subscription_token("p") for _ in range(5)))
+
+    assert tokens == ["token-p"] * 5
+    assert len(reads) == 1
+    assert reads[0] != threading.main_thread().name
+    # Cached now: no further reads.
+    assert await keychain_reader.aget_subscription_token("p") == "token-p"
+    assert len(reads) == 1
+
+
+async def test_background_refresh_warms_cache_and_serves_stale(
+    token_state: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    reads: list[str] = []
+
+    def _read(provider_id: str) -> str:
+        reads.append(provider_id)
+        return f"token-{len(reads)}"
+
+    monkeypatch.setattr(keychain_reader, "_read_token", _read)
+
+    keychain_reader.start_background_refresh(["p"])
+    try:
+        for _ in range(100):
+            if "p" in keychain_reader._cache:
+                break
+            await asyncio.sleep(0.01)
+        assert keychain_reader._cache["p"][0] == "token-1"
+
+        # Expired entry is served as-is while the refresher owns renewal.
+        keychain_reader._cache["p"] = ("token-1", time.monotonic() - 10_000)
+        assert await keychain_reader.aget_subscription_token("p") == "token-1"
+        assert reads == ["p"]
+    finally:
+        await keychain_reader.stop_background_refresh()
+
+    assert not keychain_reader.background_refresh_running()
+    assert await keychain_reader.aget_subscription_token("p") == "token-2"
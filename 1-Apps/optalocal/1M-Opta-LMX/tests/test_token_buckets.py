@@ -0,0 +1,117 @@
+"""Tests for the cross-process shared token buckets."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from opta_lmx.runtime.token_buckets import SharedTokenBuckets
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_charge_refill_and_refund() -> None:
+    clock = _Clock()
+    buckets = SharedTokenBuckets(None, clock=clock)
+    limits = {"capacity": 1000.0, "refill_per_sec": 10.0}
+
+    assert buckets.try_acquire("alice", 800, **limits) == 0.0
+    # 200 left; 500 more needs 30s of refill and takes nothing.
+    assert buckets.try_acquire("alice", 500, **limits) == pytest.approx(30.0)
+    assert buckets.available("alice", **limits) == pytest.approx(200.0)
+    # Other principals have their own bucket.
+    assert buckets.try_acquire("bob", 1000, **limits) == 0.0
+
+    clock.now += 30.0
+    assert buckets.try_acquire("alice", 500, **limits) == 0.0
+
+    buckets.refund("alice", 450, **limits)
+    assert buckets.available("alice", **limits) == pytest.approx(450.0)
+    buckets.refund("alice", 10_000, **limits)
+    assert buckets.available("alice", **limits) == pytest.approx(1000.0)
+
+    # Costs above capacity are clamped so huge requests still run on a full bucket.
+    assert buckets.try_acquire("carol", 50_000, **limits) == 0.0
+    stats = buckets.stats()
+    assert stats["allowed_total"] == 4
+    assert stats["throttled_total"] == 1
+    assert stats["shared"] == 0
+
+
+def test_full_probe_window_reuses_least_recent_slot() -> None:
+    clock = _Clock()
+    buckets = SharedTokenBuckets(None, slots=16, clock=clock)
+    limits = {"capacity": 100.0, "refill_per_sec": 0.0}
+    for i in range(16):
+        clock.now += 1.0
+        assert buckets.try_acquire(f"user-{i}", 100, **limits) == 0.0
+
+    clock.now += 1.0
+    assert buckets.try_acquire("newcomer", 100, **limits) == 0.0
+    assert buckets.stats()["evictions_total"] == 1
+    # The oldest principal lost its slot (and so got a fresh bucket) ...
+    assert buckets.available("user-0", **limits) == pytest.approx(100.0)
+    # ... while recent ones are still drained.
+    assert buckets.available("user-15", **limits) == 0.0
+
+
+def test_state_is_shared_across_processes(tmp_path: Path) -> None:
+    path = tmp_path / "token-buckets.bin"
+    buckets = SharedTokenBuckets(path, slots=64)
+    assert buckets.shared is True
+    limits = {"capacity": 1000.0, "refill_per_sec": 0.001}
+    assert buckets.try_acquire("alice", 300, **limits) == 0.0
+
+    script = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from opta_lmx.runtime.token_buckets import SharedTokenBuckets\n"
+        "b = SharedTokenBuckets(Path(sys.argv[1]), slots=64)\n"
+        "assert b.shared\n"
+        "print(b.try_acquire('alice', 600, capacity=1000.0, refill_per_sec=0.001))\n"
+        "print(b.try_acquire('alice', 600, capacity=1000.0, refill_per_sec=0.001) > 0)\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script, str(path)],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=30,
+    ).stdout.split()
+    assert out == ["0.0", "True"]
+    assert buckets.available("alice", **limits) == pytest.approx(100.0, abs=1.0)
+    buckets.close()
+
+
+def test_mismatched_table_is_reinitialized(tmp_path: Path) -> None:
+    path = tmp_path / "token-buckets.bin"
+    path.write_bytes(b"garbage")
+    buckets = SharedTokenBuckets(path, slots=32)
+    assert buckets.try_acquire("alice", 10, capacity=10.0, refill_per_sec=0.0) == 0.0
+    buckets.close()
+
+    resized = SharedTokenBuckets(path, slots=64)
+    assert resized.available("alice", capacity=10.0, refill_per_sec=0.0) == 10.0
+    resized.close()
+
+
+def test_hot_path_stays_in_microseconds(tmp_path: Path) -> None:
+    buckets = SharedTokenBuckets(tmp_path / "token-buckets.bin")
+    keys = [f"user-{i}" for i in range(64)]
+    calls = 5000
+    started = time.perf_counter()
+    for i in range(calls):
+        buckets.try_acquire(keys[i % 64], 10, capacity=1e9, refill_per_sec=1e6)
+    per_call_us = (time.perf_counter() - started) / calls * 1e6
+    assert per_call_us < 50.0
+    buckets.close()
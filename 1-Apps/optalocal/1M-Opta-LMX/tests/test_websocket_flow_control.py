@@ -0,0 +1,260 @@
+"""Flow control on the /v1/chat/stream WebSocket: credits, caps, slow consumers."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from fastapi import FastAPI, WebSocketDisconnect
+from starlette.testclient import TestClient
+
+from opta_lmx.api.websocket import (
+    WebSocketFlowLimits,
+    _Connection,
+    _initial_credits,
+    router,
+    websocket_chat,
+)
+from opta_lmx.config import LMXConfig
+from opta_lmx.monitoring.metrics import MetricsCollector
+
+
+class _FakeEngine:
+    """Streams ``tokens`` one-character tokens, tracking how far generation got."""
+
+    def __init__(self, tokens: int = 50, delay: float = 0.0) -> None:
+        self.tokens = tokens
+        self.delay = delay
+        self.produced = 0
+        self.closed = 0
+
+    def is_model_loaded(self, model_id: str) -> bool:
+        return True
+
+    async def stream_generate(self, **_kwargs: object) -> AsyncIterator[str]:
+        try:
+            for i in range(self.tokens):
+                await asyncio.sleep(self.delay)
+                self.produced += 1
+                yield "abcdefghij"[i % 10]
+        finally:
+            self.closed += 1
+
+
+def _config(**server: object) -> LMXConfig:
+    config = LMXConfig()
+    for key, value in server.items():
+        setattr(config.server, f"websocket_{key}", value)
+    return config
+
+
+def _state(engine: _FakeEngine, config: LMXConfig) -> dict[str, Any]:
+    return {"engine": engine, "config": config, "metrics": MetricsCollector()}
+
+
+def _app(engine: _FakeEngine, config: LMXConfig) -> FastAPI:
+    app = FastAPI()
+    app.include_router(router)
+    for key, value in _state(engine, config).items():
+        setattr(app.state, key, value)
+    return app
+
+
+def _request(**extra: object) -> dict[str, object]:
+    return {
+        "type": "chat.request",
+        "model": "m",
+        "messages": [{"role": "user", "content": "hi"}],
+        **extra,
+    }
+
+
+def _expected(tokens: int) -> str:
+    return "".join("abcdefghij"[i % 10] for i in range(tokens))
+
+
+# ─── Protocol over a real WebSocket ──────────────────────────────────────────
+
+
+def test_without_credits_streams_every_token() -> None:
+    engine = _FakeEngine(tokens=20)
+    with TestClient(_app(engine, _config())).websocket_connect("/v1/chat/stream") as ws:
+        ws.send_json(_request())
+        content = ""
+        while (msg := ws.receive_json())["type"] == "chat.token":
+            content += msg["content"]
+    assert msg["type"] == "chat.done"
+    assert msg["usage"]["completion_tokens"] == 20
+    assert content == _expected(20)
+
+
+def test_credits_bound_frames_and_pause_generation() -> None:
+    engine = _FakeEngine(tokens=200)
+    config = _config(max_pending_chars=8)
+    with TestClient(_app(engine, config)).websocket_connect("/v1/chat/stream") as ws:
+        ws.send_json(_request(credits=2))
+        first = ws.receive_json()
+        second = ws.receive_json()
+        assert [first["type"], second["type"]] == ["chat.token", "chat.token"]
+        request_id = first["request_id"]
+
+        # Out of credit: tokens coalesce up to 8 chars, then generation pauses.
+        time.sleep(0.3)
+        assert engine.produced <= 2 + 8
+
+        content = first["content"] + second["content"]
+        ws.send_json({"type": "chat.credit", "request_id": request_id, "credits": 1})
+        coalesced = ws.receive_json()
+        assert coalesced["type"] == "chat.token"
+        assert len(coalesced["content"]) == 8
+        content += coalesced["content"]
+
+        ws.send_json({"type": "chat.credit", "request_id": request_id, "credits": 1000})
+        while (msg := ws.receive_json())["type"] == "chat.token":
+            content += msg["content"]
+    assert msg["type"] == "chat.done"
+    assert content == _expected(200)
+
+
+def test_concurrent_requests_per_connection_are_capped() -> None:
+    engine = _FakeEngine(tokens=1000, delay=0.01)
+    config = _config(max_concurrent_requests=2)
+    with TestClient(_app(engine, config)).websocket_connect("/v1/chat/stream") as ws:
+        for index in range(3):
+            ws.send_json(_request(credits=1, client_request_id=f"client-{index}"))
+        accepted: dict[str, str] = {}
+        tokens_for: set[str] = set()
+        while (msg := ws.receive_json())["type"] != "chat.error":
+            if msg["type"] == "chat.accepted":
+                accepted[msg["client_request_id"]] = msg["request_id"]
+            elif msg["type"] == "chat.token":
+                # Every request is acknowledged before its first token.
+                assert msg["request_id"] in accepted.values()
+                tokens_for.add(msg["request_id"])
+        assert msg["code"] == "too_many_requests"
+        assert msg["request_id"] is None
+        assert msg["client_request_id"] == "client-2"
+        assert set(accepted) == {"client-0", "client-1"}
+        assert len(set(accepted.values())) == 2
+
+
+def test_stalled_client_is_shed_and_generation_released() -> None:
+    engine = _FakeEngine(tokens=1000)
+    config = _config(max_pending_chars=4, stall_timeout_sec=0.3)
+    with TestClient(_app(engine, config)).websocket_connect("/v1/chat/stream") as ws:
+        ws.send_json(_request(credits=1))
+        assert ws.receive_json()["type"] == "chat.token"
+        error = ws.receive_json()
+    assert error["type"] == "chat.error"
+    assert error["code"] == "slow_consumer"
+    assert engine.produced <= 1 + 4
+    assert engine.closed == 1
+
+
+async def test_close_survives_a_failed_writer() -> None:
+    class _BrokenSocket:
+        async def send_json(self, frame: dict[str, Any]) -> None:
+            raise RuntimeError("client went away")
+
+    connection = _Connection(_BrokenSocket(), WebSocketFlowLimits())  # type: ignore[arg-type]
+    connection.start()
+    assert connection.try_send({"type": "chat.token"})
+    # The writer fails while close() is waiting for it to flush.
+    await connection.close()
+
+
+# ─── Load: many streams into a slow socket ──────────────────────────────────
+
+
+class _SlowSocket:
+    """Minimal WebSocket whose client drains one frame per ``send_delay`` seconds.
+
+    ``send_delay=None`` models a client that never reads again. Otherwise the
+    client disconnects once every request has finished.
+    """
+
+    def __init__(self, state: dict[str, Any], requests: int, send_delay: float | None) -> None:
+        self.app = SimpleNamespace(state=SimpleNamespace(**state))
+        self.send_delay = send_delay
+        self.frames: list[dict[str, Any]] = []
+        self._incoming: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+        for _ in range(requests):
+            self._incoming.put_nowait(_request())
+        self._requests = requests
+        self.max_backlog = 0
+        self.engine: _FakeEngine = state["engine"]
+
+    async def accept(self) -> None:
+        pass
+
+    async def receive_json(self) -> dict[str, Any]:
+        msg = await self._incoming.get()
+        if msg is None:
+            raise WebSocketDisconnect()
+        return msg
+
+    async def send_json(self, frame: dict[str, Any]) -> None:
+        if self.send_delay is None:
+            await asyncio.Event().wait()  # Client never reads again.
+        await asyncio.sleep(self.send_delay)
+        self.frames.append(frame)
+        delivered = sum(len(f.get("content") or "") for f in self.frames)
+        self.max_backlog = max(self.max_backlog, self.engine.produced - delivered)
+        if sum(f["type"] != "chat.token" for f in self.frames) == self._requests:
+            self._incoming.put_nowait(None)
+
+    async def close(self) -> None:
+        pass
+
+
+async def test_slow_consumer_load_keeps_buffering_bounded() -> None:
+    requests, tokens = 8, 400
+    engine = _FakeEngine(tokens=tokens)
+    config = _config(send_queue_frames=4, max_pending_chars=16)
+    socket = _SlowSocket(_state(engine, config), requests, send_delay=0.002)
+
+    await asyncio.wait_for(websocket_chat(socket), 30)  # type: ignore[arg-type]
+
+    done = [f for f in socket.frames if f["type"] == "chat.done"]
+    assert len(done) == requests
+    by_request: dict[str, str] = {}
+    for frame in socket.frames:
+        if frame["type"] == "chat.token":
+            by_request[frame["request_id"]] = (
+                by_request.get(frame["request_id"], "") + frame["content"]
+            )
+    assert len(by_request) == requests
+    assert all(content == _expected(tokens) for content in by_request.values())
+    # Tokens were merged into far fewer frames than were generated ...
+    token_frames = sum(f["type"] == "chat.token" for f in socket.frames)
+    assert token_frames < requests * tokens / 4
+    # ... and generation never ran far ahead of what the client had read:
+    # at most one pending buffer per request plus a full send queue.
+    assert socket.max_backlog <= requests * 16 + 4 * 16 + requests
+    assert engine.produced == requests * tokens
+
+
+async def test_dead_socket_sheds_every_stream() -> None:
+    requests = 4
+    engine = _FakeEngine(tokens=10_000)
+    config = _config(send_queue_frames=2, max_pending_chars=32, stall_timeout_sec=0.2)
+    socket = _SlowSocket(_state(engine, config), requests, send_delay=None)
+
+    task = asyncio.create_task(websocket_chat(socket))  # type: ignore[arg-type]
+    # Well past the 0.2s stall timeout for every stream.
+    await asyncio.sleep(1.0)
+    assert engine.closed == requests
+    assert engine.produced < requests * 200
+    socket._incoming.put_nowait(None)
+    await asyncio.wait_for(task, 5)
+
+
+@pytest.mark.parametrize(
+    ("credits", "expected"), [(None, None), (0, 1), (-3, 1), (5, 5), (True, None), ("5", None)]
+)
+def test_initial_credits(credits: object, expected: int | None) -> None:
+    assert _initial_credits({"credits": credits}) == expected